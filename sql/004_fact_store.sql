@@ -0,0 +1,18 @@
+-- Migration: Add qnwis_fact_store table
+-- Created: 2026-10-18
+-- Description: Normalized, freshness-aware fact store reused across workflow runs
+--              (see src/qnwis/orchestration/fact_store.py)
+
+CREATE TABLE IF NOT EXISTS qnwis_fact_store (
+    source TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    country TEXT NOT NULL,
+    period TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (source, indicator, country, period, dimensions)
+);
+
+-- Lookups filter on source + indicator set + countries, which the primary
+-- key index covers.
@@ -0,0 +1,539 @@
+"""On-disk HTTP response cache shared by the API clients.
+
+Stores each GET response body with its ``ETag``/``Last-Modified`` validators
+per (host, path, params) and revalidates with ``If-None-Match`` /
+``If-Modified-Since`` once the per-source ``max_age`` has passed. Stale
+entries are served while a background revalidation runs
+(stale-while-revalidate) and when the origin is unreachable
+(stale-if-error). Parsed DataFrames can be snapshotted next to the body they
+came from, so a revalidated response skips parsing as well as the download.
+
+The cache plugs into httpx as a transport wrapper (``AsyncCachingTransport``
+/ ``CachingTransport``), so clients keep their request code unchanged.
+Offline mode replays stored responses and never touches the network.
+
+Environment:
+    QNWIS_API_CACHE_DIR: Cache directory (default ``data/cache/api_responses``)
+    QNWIS_API_OFFLINE: ``1``/``true`` to replay from the cache only
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlencode
+
+import httpx
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path("data/cache/api_responses")
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+CACHE_STATUS_HEADER = "X-QNWIS-Cache"
+CACHE_KEY_HEADER = "X-QNWIS-Cache-Key"
+BODY_DIGEST_HEADER = "X-QNWIS-Body-Digest"
+
+# Hop-by-hop and encoding headers do not describe the stored (decoded) body
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+DAY = 86_400.0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Freshness windows in seconds for one source."""
+
+    max_age: float
+    stale_while_revalidate: float = 0.0
+    stale_if_error: float = 0.0
+
+
+DEFAULT_POLICY = CachePolicy(max_age=DAY, stale_while_revalidate=6 * DAY, stale_if_error=90 * DAY)
+
+# World Bank / IMF indicators change at most annually
+ANNUAL_POLICY = CachePolicy(7 * DAY, stale_while_revalidate=23 * DAY, stale_if_error=365 * DAY)
+
+DEFAULT_POLICIES: dict[str, CachePolicy] = {
+    "api.worldbank.org": ANNUAL_POLICY,
+    "www.imf.org": ANNUAL_POLICY,
+    "www.ilo.org": DEFAULT_POLICY,
+    "fenixservices.fao.org": DEFAULT_POLICY,
+    "unctadstat-api.unctad.org": DEFAULT_POLICY,
+    "www.unwto.org": DEFAULT_POLICY,
+    "data.gccstat.org": DEFAULT_POLICY,
+    "etdp.unescwa.org": DEFAULT_POLICY,
+    "www.data.gov.qa": CachePolicy(6 * 3600.0, stale_while_revalidate=DAY, stale_if_error=30 * DAY),
+    "lmis-dashb-api.mol.gov.qa": CachePolicy(3600.0, stale_while_revalidate=DAY, stale_if_error=30 * DAY),
+}
+
+
+@dataclass
+class CacheStats:
+    """Outcome counters across all clients sharing a cache."""
+
+    hits: int = 0
+    stale: int = 0
+    revalidated: int = 0
+    misses: int = 0
+    stale_on_error: int = 0
+    frame_hits: int = 0
+
+
+class CacheMissError(httpx.TransportError):
+    """Offline replay found no stored response for a request."""
+
+
+@dataclass
+class _Entry:
+    key: str
+    url: str
+    headers: dict[str, str]
+    stored_at: float
+    digest: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class ResponseCache:
+    """
+    Disk-backed store of GET responses, validators and frame snapshots.
+
+    Thread-safe; one instance is shared by every client in the process.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path | str | None = None,
+        *,
+        policies: dict[str, CachePolicy] | None = None,
+        default_policy: CachePolicy = DEFAULT_POLICY,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory for entries (created on first write)
+            policies: Freshness policy per host; defaults to ``DEFAULT_POLICIES``
+            default_policy: Policy for hosts without one
+            offline: Replay stored responses only; misses raise ``CacheMissError``
+            clock: Wall-clock source for entry ages
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+        self.policies = dict(DEFAULT_POLICIES if policies is None else policies)
+        self.default_policy = default_policy
+        self.offline = offline
+        self.clock = clock
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._revalidating: set[str] = set()
+
+    # -- keys and entries ---------------------------------------------------
+
+    @staticmethod
+    def key_for(request: httpx.Request) -> str:
+        """Stable key over method, host, path and sorted query params."""
+        url = request.url
+        query = urlencode(sorted(url.params.multi_items()))
+        raw = f"{request.method} {url.scheme}://{url.netloc.decode()}{url.path}?{query}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def policy_for(self, host: str) -> CachePolicy:
+        return self.policies.get(host, self.default_policy)
+
+    def lookup(self, request: httpx.Request) -> _Entry | None:
+        """Stored entry for ``request``, or None."""
+        meta_path = self._path(self.key_for(request), ".meta.json")
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return _Entry(**meta)
+
+    def age(self, entry: _Entry) -> float:
+        return self.clock() - entry.stored_at
+
+    def is_fresh(self, entry: _Entry, host: str) -> bool:
+        return self.age(entry) < self.policy_for(host).max_age
+
+    def is_stale_usable(self, entry: _Entry, host: str) -> bool:
+        """Within the stale-while-revalidate window."""
+        policy = self.policy_for(host)
+        return self.age(entry) < policy.max_age + policy.stale_while_revalidate
+
+    def is_usable_on_error(self, entry: _Entry, host: str) -> bool:
+        policy = self.policy_for(host)
+        return self.age(entry) < policy.max_age + policy.stale_if_error
+
+    def answers_locally(self, request: httpx.Request) -> bool:
+        """Whether ``request`` would be served from disk without waiting on the origin."""
+        if request.method != "GET":
+            return False
+        entry = self.lookup(request)
+        if entry is None:
+            return False
+        return self.offline or self.is_stale_usable(entry, request.url.host)
+
+    def store(self, request: httpx.Request, response: httpx.Response) -> _Entry | None:
+        """Persist a 200 response; ``Cache-Control: no-store`` responses are skipped."""
+        if "no-store" in response.headers.get("cache-control", "").lower():
+            return None
+        body = response.content
+        key = self.key_for(request)
+        entry = _Entry(
+            key=key,
+            url=str(request.url),
+            headers=_stored_headers(response),
+            stored_at=self.clock(),
+            digest=hashlib.sha256(body).hexdigest(),
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+        )
+        previous = self.lookup(request)
+        self._write(self._path(key, ".body"), zlib.compress(body, 6))
+        self._write_meta(entry)
+        if previous is not None and previous.digest != entry.digest:
+            for stale in self._path(key, "").parent.glob(f"{key}.*.frame*"):
+                stale.unlink(missing_ok=True)
+        return entry
+
+    def refresh(self, entry: _Entry, response: httpx.Response) -> _Entry:
+        """Record a 304: the stored body is current again."""
+        entry.stored_at = self.clock()
+        entry.etag = response.headers.get("etag", entry.etag)
+        entry.last_modified = response.headers.get("last-modified", entry.last_modified)
+        self._write_meta(entry)
+        return entry
+
+    def put(
+        self,
+        url: str,
+        content: bytes | str,
+        *,
+        params: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """Store a response body directly, e.g. to build offline fixtures."""
+        request = httpx.Request("GET", url, params=params)
+        if isinstance(content, str):
+            content = content.encode()
+        self.store(request, httpx.Response(200, headers=headers or {}, content=content, request=request))
+
+    def replay(self, entry: _Entry, request: httpx.Request, status: str) -> httpx.Response:
+        """Response built from a stored entry."""
+        body = zlib.decompress(self._path(entry.key, ".body").read_bytes())
+        headers = {
+            **entry.headers,
+            CACHE_STATUS_HEADER: status,
+            CACHE_KEY_HEADER: entry.key,
+            BODY_DIGEST_HEADER: entry.digest,
+        }
+        return httpx.Response(200, headers=headers, content=body, request=request)
+
+    def conditional(self, request: httpx.Request, entry: _Entry | None) -> httpx.Request:
+        """``request`` with validators for ``entry`` added."""
+        if entry is None or not (entry.etag or entry.last_modified):
+            return request
+        headers = httpx.Headers(request.headers)
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return httpx.Request(
+            request.method, request.url, headers=headers, extensions=request.extensions
+        )
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    def stats_snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return asdict(self.stats)
+
+    def begin_revalidation(self, key: str) -> bool:
+        """Claim the background revalidation of ``key``; False if one is running."""
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidation(self, key: str) -> None:
+        with self._lock:
+            self._revalidating.discard(key)
+
+    # -- frame snapshots ----------------------------------------------------
+
+    def frame(
+        self, response: httpx.Response, parse: Callable[[httpx.Response], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """
+        ``parse(response)``, reusing the snapshot stored for this exact body.
+
+        Responses that did not come through the cache are parsed as usual.
+        """
+        key = response.headers.get(CACHE_KEY_HEADER)
+        digest = response.headers.get(BODY_DIGEST_HEADER)
+        if not key or not digest:
+            return parse(response)
+
+        suffix = ".parquet" if PARQUET_AVAILABLE else ".json.gz"
+        path = self._path(key, f".{digest[:16]}.frame{suffix}")
+        if path.exists():
+            try:
+                frame = _read_frame(path)
+                self.count("frame_hits")
+                return frame
+            except Exception as e:  # corrupt snapshot: fall through and re-parse
+                logger.debug(f"Discarding frame snapshot {path.name}: {e}")
+
+        frame = parse(response)
+        try:
+            _write_frame(path, frame, self._write)
+        except (TypeError, ValueError, OSError) as e:
+            logger.debug(f"Frame snapshot skipped for {response.url}: {e}")
+        return frame
+
+    # -- storage helpers ----------------------------------------------------
+
+    def _path(self, key: str, suffix: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{suffix}"
+
+    def _write_meta(self, entry: _Entry) -> None:
+        self._write(self._path(entry.key, ".meta.json"), json.dumps(asdict(entry)).encode())
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Atomic write: readers never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+def _stored_headers(response: httpx.Response) -> dict[str, str]:
+    return {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+
+
+def _write_frame(path: Path, frame: pd.DataFrame, write: Callable[[Path, bytes], None]) -> None:
+    """Columnar snapshot: Parquet when pyarrow is installed, else gzip'd column lists."""
+    if PARQUET_AVAILABLE:
+        write(path, frame.to_parquet(index=False))
+        return
+    payload = {
+        "columns": [str(c) for c in frame.columns],
+        "dtypes": [str(t) for t in frame.dtypes],
+        "data": [
+            frame[c].astype(str).tolist() if str(t).startswith("datetime") else frame[c].tolist()
+            for c, t in zip(frame.columns, frame.dtypes, strict=True)
+        ],
+    }
+    write(path, gzip.compress(json.dumps(payload).encode(), 6))
+
+
+def _read_frame(path: Path) -> pd.DataFrame:
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path)
+    payload = json.loads(gzip.decompress(path.read_bytes()))
+    columns = payload["columns"]
+    frame = pd.DataFrame(dict(zip(columns, payload["data"], strict=True)), columns=columns)
+    return frame.astype(dict(zip(columns, payload["dtypes"], strict=True)))
+
+
+class _CachingBase:
+    def __init__(self, cache: ResponseCache):
+        self.cache = cache
+
+    def _cached(self, request: httpx.Request) -> tuple[_Entry | None, httpx.Response | None, bool]:
+        """Entry for ``request``, a response to serve now, and whether to revalidate."""
+        cache = self.cache
+        entry = cache.lookup(request)
+        host = request.url.host
+        if entry is not None:
+            if cache.offline or cache.is_fresh(entry, host):
+                cache.count("hits")
+                return entry, cache.replay(entry, request, "HIT"), False
+            if cache.is_stale_usable(entry, host):
+                cache.count("stale")
+                return entry, cache.replay(entry, request, "STALE"), True
+        elif cache.offline:
+            cache.count("misses")
+            raise CacheMissError(f"No cached response for {request.url} (offline)", request=request)
+        return entry, None, False
+
+    def _settle(
+        self, request: httpx.Request, entry: _Entry | None, response: httpx.Response
+    ) -> httpx.Response:
+        """Turn an origin response (body already read) into what the client sees."""
+        cache = self.cache
+        status = response.status_code
+        if status == 304 and entry is not None:
+            cache.count("revalidated")
+            return cache.replay(cache.refresh(entry, response), request, "REVALIDATED")
+        if status == 200:
+            cache.count("misses")
+            stored = cache.store(request, response)
+            if stored is not None:
+                return cache.replay(stored, request, "MISS")
+        elif status >= 500 and (fallback := self._on_error(request, entry)) is not None:
+            return fallback
+        return httpx.Response(
+            status, headers=_stored_headers(response), content=response.content, request=request
+        )
+
+    def _on_error(self, request: httpx.Request, entry: _Entry | None) -> httpx.Response | None:
+        if entry is not None and self.cache.is_usable_on_error(entry, request.url.host):
+            self.cache.count("stale_on_error")
+            return self.cache.replay(entry, request, "STALE-IF-ERROR")
+        return None
+
+
+class AsyncCachingTransport(_CachingBase, httpx.AsyncBaseTransport):
+    """Async httpx transport that answers GETs from a ``ResponseCache``."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport | None, cache: ResponseCache):
+        super().__init__(cache)
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self.inner.handle_async_request(request)
+        entry, served, revalidate = self._cached(request)
+        if served is not None:
+            if revalidate and self.cache.begin_revalidation(entry.key):
+                task = asyncio.get_running_loop().create_task(self._background(request, entry))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            return served
+        return await self._fetch(request, entry)
+
+    async def _fetch(self, request: httpx.Request, entry: _Entry | None) -> httpx.Response:
+        try:
+            response = await self.inner.handle_async_request(self.cache.conditional(request, entry))
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+        except httpx.TransportError:
+            fallback = self._on_error(request, entry)
+            if fallback is None:
+                raise
+            return fallback
+        return self._settle(request, entry, response)
+
+    async def _background(self, request: httpx.Request, entry: _Entry) -> None:
+        try:
+            await self._fetch(request, entry)
+        except Exception as e:
+            logger.debug(f"Background revalidation failed for {request.url}: {e}")
+        finally:
+            self.cache.end_revalidation(entry.key)
+
+    async def aclose(self) -> None:
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        await self.inner.aclose()
+
+
+class CachingTransport(_CachingBase, httpx.BaseTransport):
+    """Sync httpx transport that answers GETs from a ``ResponseCache``."""
+
+    def __init__(self, inner: httpx.BaseTransport | None, cache: ResponseCache):
+        super().__init__(cache)
+        self.inner = inner or httpx.HTTPTransport()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return self.inner.handle_request(request)
+        entry, served, revalidate = self._cached(request)
+        if served is not None:
+            if revalidate and self.cache.begin_revalidation(entry.key):
+                threading.Thread(
+                    target=self._background,
+                    args=(request, entry),
+                    name="api-cache-revalidate",
+                    daemon=True,
+                ).start()
+            return served
+        return self._fetch(request, entry)
+
+    def _fetch(self, request: httpx.Request, entry: _Entry | None) -> httpx.Response:
+        try:
+            response = self.inner.handle_request(self.cache.conditional(request, entry))
+            try:
+                response.read()
+            finally:
+                response.close()
+        except httpx.TransportError:
+            fallback = self._on_error(request, entry)
+            if fallback is None:
+                raise
+            return fallback
+        return self._settle(request, entry, response)
+
+    def _background(self, request: httpx.Request, entry: _Entry) -> None:
+        try:
+            self._fetch(request, entry)
+        except Exception as e:
+            logger.debug(f"Background revalidation failed for {request.url}: {e}")
+        finally:
+            self.cache.end_revalidation(entry.key)
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+_shared_cache: ResponseCache | None = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache configured from the environment."""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResponseCache(
+                os.getenv("QNWIS_API_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                offline=os.getenv("QNWIS_API_OFFLINE", "").lower() in {"1", "true", "yes"},
+            )
+        return _shared_cache
+
+
+def cached_async_transport(cache: ResponseCache | None = None) -> AsyncCachingTransport:
+    """Transport for ``httpx.AsyncClient(transport=...)`` backed by the shared cache."""
+    return AsyncCachingTransport(httpx.AsyncHTTPTransport(), cache or get_response_cache())
+
+
+def cached_transport(cache: ResponseCache | None = None) -> CachingTransport:
+    """Transport for ``httpx.Client(transport=...)`` backed by the shared cache."""
+    return CachingTransport(httpx.HTTPTransport(), cache or get_response_cache())
+
+
+__all__ = [
+    "AsyncCachingTransport",
+    "CacheMissError",
+    "CachePolicy",
+    "CacheStats",
+    "CachingTransport",
+    "DEFAULT_POLICIES",
+    "ResponseCache",
+    "cached_async_transport",
+    "cached_transport",
+    "get_response_cache",
+]
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import time
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any
 
 import httpx
-import requests
+
+from ._cache import cached_transport
 
 
 @dataclass(frozen=True)
@@ -106,22 +110,90 @@ def send_with_retry(
     raise RuntimeError("Request failed without response or exception.")
 
 
+async def asend_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    *,
+    max_retries: int = _MAX_RETRIES,
+    backoff: float = _DEFAULT_BACKOFF,
+    expected_statuses: set[int] | None = None,
+    throttle: Callable[[], Awaitable[None]] | None = None,
+    **kwargs: Any,
+) -> tuple[httpx.Response, RequestMetadata]:
+    """Async counterpart of ``send_with_retry`` with the same retry rules.
+
+    ``throttle`` is awaited before every attempt, so retries are charged to
+    the caller's rate budget like first attempts.
+    """
+    if max_retries < 0:
+        raise ValueError("max_retries must be non-negative")
+
+    rate_limited = False
+    response: httpx.Response | None = None
+
+    for attempt in range(max_retries + 1):
+        if throttle is not None:
+            await throttle()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except (httpx.TimeoutException, httpx.TransportError):
+            if attempt < max_retries:
+                await asyncio.sleep(backoff * (attempt + 1))
+                continue
+            raise
+
+        status_code = response.status_code
+        if status_code == 429:
+            rate_limited = True
+            if attempt < max_retries:
+                await asyncio.sleep(1.0)
+                continue
+
+        if 500 <= status_code < 600 and attempt < max_retries:
+            await asyncio.sleep(backoff * (attempt + 1))
+            continue
+
+        if expected_statuses and status_code in expected_statuses:
+            return response, RequestMetadata(retries=attempt, rate_limited=rate_limited)
+
+        response.raise_for_status()
+        return response, RequestMetadata(retries=attempt, rate_limited=rate_limited)
+
+    raise RuntimeError("Request failed without response or exception.")
+
+
+_shared_client: httpx.Client | None = None
+_shared_client_lock = threading.Lock()
+
+
+def _cached_client() -> httpx.Client:
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = httpx.Client(transport=cached_transport(), follow_redirects=True)
+        return _shared_client
+
+
 def http_get(
     url: str,
     params: dict[str, Any] | None = None,
     headers: dict[str, str] | None = None,
     timeout: int = 30
-) -> requests.Response:
+) -> httpx.Response:
     """
     Simple HTTP GET wrapper for API clients.
-    
+
+    Goes through a shared keep-alive client backed by the on-disk response
+    cache (see ``_cache``), so repeated calls revalidate instead of refetching.
+
     Args:
         url: URL to fetch
         params: Query parameters
         headers: Request headers
         timeout: Timeout in seconds
-        
+
     Returns:
-        requests.Response object
+        httpx.Response object
     """
-    return requests.get(url, params=params, headers=headers, timeout=timeout)
+    return _cached_client().get(url, params=params, headers=headers, timeout=timeout)
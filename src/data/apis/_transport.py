@@ -0,0 +1,239 @@
+"""Shared async HTTP transport for API clients.
+
+One pooled ``httpx.AsyncClient`` per host (HTTP/2 when the optional ``h2``
+package is installed) with a per-host concurrency cap and request-rate
+budget, and the retry semantics of ``send_with_retry``. GETs can be served
+from a ``ResponseCache``. Sync clients call ``run_sync``, which drives
+coroutines on a single background event loop so pooled connections are
+reused across calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import time
+import weakref
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
+from typing import Any, TypeVar
+from urllib.parse import urlsplit
+
+import httpx
+import pandas as pd
+
+from ._cache import AsyncCachingTransport, ResponseCache, get_response_cache
+from ._http import _DEFAULT_BACKOFF, _MAX_RETRIES, RequestMetadata, asend_with_retry
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT = 30.0
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HostBudget:
+    """Per-host limits: concurrent requests and sustained requests/second (0 = unlimited)."""
+
+    max_concurrency: int = 8
+    requests_per_second: float = 20.0
+
+
+class _RateBudget:
+    """Async token bucket; bursts up to ``burst`` requests, then spaces them evenly."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = float(max(1, burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1.0
+
+
+class _HostPool:
+    """Client, concurrency slots and rate budget for one host on one event loop."""
+
+    def __init__(self, client: httpx.AsyncClient, budget: HostBudget):
+        self.client = client
+        self.slots = asyncio.Semaphore(budget.max_concurrency)
+        self.rate = _RateBudget(budget.requests_per_second, budget.max_concurrency)
+
+
+class AsyncTransport:
+    """
+    Pooled, budgeted HTTP transport shared by API clients.
+
+    Pools are created lazily per (event loop, host), so one transport can
+    serve the background loop behind ``run_sync`` and any caller's own loop.
+    """
+
+    def __init__(
+        self,
+        *,
+        default_budget: HostBudget | None = None,
+        budgets: dict[str, HostBudget] | None = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        http2: bool | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        """
+        Initialize transport.
+
+        Args:
+            default_budget: Limits for hosts without an explicit budget
+            budgets: Limits keyed by host (``netloc``)
+            timeout: Default request timeout in seconds
+            http2: Negotiate HTTP/2; defaults to whether ``h2`` is installed
+            transport: Underlying httpx transport (e.g. ``httpx.MockTransport`` in tests)
+            cache: Response cache for GETs; None disables caching
+        """
+        self.default_budget = default_budget or HostBudget()
+        self.budgets: dict[str, HostBudget] = dict(budgets or {})
+        self.timeout = timeout
+        self.http2 = HTTP2_AVAILABLE if http2 is None else http2
+        self._transport = transport
+        self.cache = cache
+        self._pools: weakref.WeakKeyDictionary[
+            asyncio.AbstractEventLoop, dict[str, _HostPool]
+        ] = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def configure_host(self, host: str, budget: HostBudget) -> None:
+        """Set the budget for ``host``; applies to pools created afterwards."""
+        self.budgets[host] = budget
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        max_retries: int = _MAX_RETRIES,
+        backoff: float = _DEFAULT_BACKOFF,
+        expected_statuses: set[int] | None = None,
+        **kwargs: Any,
+    ) -> tuple[httpx.Response, RequestMetadata]:
+        """
+        Send a request through the host's pool, within its budget, with retries.
+
+        Raises:
+            httpx.HTTPStatusError: On non-retryable or exhausted HTTP errors
+            httpx.TransportError: When the host stays unreachable
+        """
+        pool = self._pool(urlsplit(url).netloc)
+        if self.cache is not None and self.cache.answers_locally(
+            pool.client.build_request(method, url, **kwargs)
+        ):
+            # Served from disk: no origin request to budget
+            return await asend_with_retry(
+                pool.client, method, url, max_retries=0, expected_statuses=expected_statuses, **kwargs
+            )
+        async with pool.slots:
+            return await asend_with_retry(
+                pool.client,
+                method,
+                url,
+                max_retries=max_retries,
+                backoff=backoff,
+                expected_statuses=expected_statuses,
+                throttle=pool.rate.acquire,
+                **kwargs,
+            )
+
+    def frame(
+        self, response: httpx.Response, parse: Callable[[httpx.Response], pd.DataFrame]
+    ) -> pd.DataFrame:
+        """``parse(response)``, reusing the cache's frame snapshot when there is one."""
+        if self.cache is None:
+            return parse(response)
+        return self.cache.frame(response, parse)
+
+    async def aclose(self) -> None:
+        """Close the pools bound to the running event loop."""
+        pools = self._pools.pop(asyncio.get_running_loop(), {})
+        await asyncio.gather(*(pool.client.aclose() for pool in pools.values()))
+
+    def _pool(self, host: str) -> _HostPool:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            pools = self._pools.setdefault(loop, {})
+            pool = pools.get(host)
+            if pool is None:
+                budget = self.budgets.get(host, self.default_budget)
+                transport = self._transport or httpx.AsyncHTTPTransport(
+                    http2=self.http2,
+                    limits=httpx.Limits(
+                        max_connections=budget.max_concurrency,
+                        max_keepalive_connections=budget.max_concurrency,
+                    ),
+                )
+                if self.cache is not None:
+                    transport = AsyncCachingTransport(transport, self.cache)
+                client = httpx.AsyncClient(timeout=self.timeout, transport=transport)
+                pool = pools[host] = _HostPool(client, budget)
+            return pool
+
+
+_shared_transport: AsyncTransport | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_transport() -> AsyncTransport:
+    """Process-wide transport used by API clients that are not given one."""
+    global _shared_transport
+    with _loop_lock:
+        if _shared_transport is None:
+            _shared_transport = AsyncTransport(cache=get_response_cache())
+        return _shared_transport
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=_loop.run_forever, name="qnwis-api-transport", daemon=True
+            ).start()
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run ``coro`` on the shared background loop and wait for its result.
+
+    Safe to call from sync code and from threads that run their own loop;
+    must not be called from a coroutine already on the background loop.
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync() called from the transport loop; await the coroutine instead")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+
+__all__ = [
+    "AsyncTransport",
+    "HostBudget",
+    "get_transport",
+    "run_sync",
+]
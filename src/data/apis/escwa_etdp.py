@@ -18,6 +18,7 @@ from datetime import datetime
 import httpx
 import pandas as pd
 
+from ._cache import cached_async_transport
 from .rate_limiter import (
     RateLimiter,
     ExponentialBackoff,
@@ -88,7 +89,7 @@ class ESCWATradeAPI:
             timeout: Request timeout in seconds
             rate_limiter: Optional custom rate limiter
         """
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.client = httpx.AsyncClient(timeout=timeout, transport=cached_async_transport())
         self.rate_limiter = rate_limiter or get_rate_limiter(
             requests_per_minute=30,
             requests_per_day=2000
@@ -9,6 +9,8 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from ._cache import cached_async_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -41,7 +43,7 @@ class IMFConnector:
     }
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=self.TIMEOUT)
+        self.client = httpx.AsyncClient(timeout=self.TIMEOUT, transport=cached_async_transport())
     
     async def close(self):
         """Close HTTP client"""
@@ -26,12 +26,16 @@ from __future__ import annotations
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Literal, Optional
+from urllib.parse import urlsplit
 
+import httpx
 import pandas as pd
-import requests
+
+from ._transport import AsyncTransport, HostBudget, get_transport, run_sync
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +43,10 @@ logger = logging.getLogger(__name__)
 LMIS_BASE_URL = "https://lmis-dashb-api.mol.gov.qa/api"
 LMIS_POWERBI_URL = f"{LMIS_BASE_URL}/power-bi"
 
+# One pooled connection set for the dashboard API; fetch_all_lmis_data fans out under it
+LMIS_BUDGET = HostBudget(max_concurrency=6, requests_per_second=10.0)
+LMIS_TIMEOUT = 30.0
+
 # Cached data path
 LMIS_CACHE_PATH = Path("data/lmis_dashboard_data.json")
 
@@ -76,15 +84,24 @@ class LMISAPIClient:
     Provides access to official labour market data, workforce statistics,
     skills analysis, and economic indicators.
     
-    FALLBACK MODE: When live API is unavailable, uses cached data from
-    data/lmis_dashboard_data.json which contains sample responses from
-    all 17 API endpoints.
+    Responses go through the shared on-disk response cache, so a recently
+    seen endpoint is served (or revalidated) per request.
+
+    FALLBACK MODE: When live API is unavailable and the response cache has
+    no entry, uses cached data from data/lmis_dashboard_data.json which
+    contains sample responses from all 17 API endpoints. The file is only
+    read on first fallback.
     """
     
     # Class-level flag to avoid repeated DNS failure warnings
     _dns_failure_logged = False
     
-    def __init__(self, api_token: str | None = None, use_cache_fallback: bool = True):
+    def __init__(
+        self,
+        api_token: str | None = None,
+        use_cache_fallback: bool = True,
+        transport: AsyncTransport | None = None,
+    ):
         """
         Initialize LMIS API client.
         
@@ -92,19 +109,35 @@ class LMISAPIClient:
             api_token: Bearer token for API authentication.
                       If not provided, reads from LMIS_API_TOKEN env variable.
             use_cache_fallback: Whether to use cached data when API fails.
+            transport: Pooled HTTP transport. Defaults to the shared one.
         """
         self.base_url = LMIS_BASE_URL
         self.powerbi_url = LMIS_POWERBI_URL
         self.api_token = api_token or os.getenv("LMIS_API_TOKEN")
         self.use_cache_fallback = use_cache_fallback
-        self._cache = get_lmis_cache()
+        self._fallback: Optional[dict] = None
+        self.transport = transport or get_transport()
+        host = urlsplit(self.base_url).netloc
+        if host not in self.transport.budgets:
+            self.transport.configure_host(host, LMIS_BUDGET)
         
         if not self.api_token:
-            if self._cache:
+            if LMIS_CACHE_PATH.exists():
                 logger.info("LMIS_API_TOKEN not set - using cached data fallback")
             else:
                 logger.warning("LMIS_API_TOKEN not set and no cache available")
     
+    @property
+    def _cache(self) -> Optional[dict]:
+        """Fallback blob, loaded on first use."""
+        if self._fallback is None:
+            self._fallback = get_lmis_cache()
+        return self._fallback
+
+    @_cache.setter
+    def _cache(self, value: Optional[dict]) -> None:
+        self._fallback = value
+
     def _get_headers(self, lang: str = "en") -> dict[str, str]:
         """Build request headers with authentication."""
         headers = {
@@ -143,6 +176,8 @@ class LMISAPIClient:
         """
         Make API request to LMIS with cache fallback.
         
+        Sync wrapper around ``_amake_request`` on the shared transport.
+        
         Args:
             endpoint: API endpoint path
             params: Query parameters
@@ -152,30 +187,43 @@ class LMISAPIClient:
         Returns:
             JSON response data or None if request fails
         """
+        return run_sync(self._amake_request(endpoint, params, lang, cache_key))
+    
+    async def _amake_request(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        lang: str = "en",
+        cache_key: Optional[str] = None
+    ) -> dict[str, Any] | list[dict[str, Any]] | None:
+        """Async ``_make_request``: pooled connection, retries on 5xx/429/transport errors."""
         if params is None:
             params = {}
         
         params["lang"] = lang
         
         try:
-            response = requests.get(
+            response, _ = await self.transport.request(
+                "GET",
                 endpoint,
                 params=params,
                 headers=self._get_headers(lang),
-                timeout=30
+                timeout=LMIS_TIMEOUT,
             )
-            
-            if response.status_code == 200:
-                return response.json()
-            elif response.status_code == 401:
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
                 logger.error("LMIS API authentication failed - check API token")
             else:
-                logger.warning(f"LMIS API returned status {response.status_code}")
-                
+                logger.warning(f"LMIS API returned status {e.response.status_code}")
         except Exception as e:
             # Check for DNS/network failures and only log once to reduce noise
             error_str = str(e)
-            if "Failed to resolve" in error_str or "getaddrinfo failed" in error_str:
+            if (
+                "Failed to resolve" in error_str
+                or "getaddrinfo failed" in error_str
+                or "Name or service not known" in error_str
+            ):
                 if not LMISAPIClient._dns_failure_logged:
                     logger.info("LMIS API unreachable (DNS failure) - using cached data")
                     LMISAPIClient._dns_failure_logged = True
@@ -685,6 +733,9 @@ def fetch_all_lmis_data(api_token: str | None = None) -> dict[str, pd.DataFrame]
     """
     Fetch all available LMIS data for database seeding.
     
+    The endpoint calls run concurrently; their requests share the
+    client's pooled connections within the LMIS host budget.
+    
     Args:
         api_token: LMIS API authentication token
         
@@ -695,55 +746,41 @@ def fetch_all_lmis_data(api_token: str | None = None) -> dict[str, pd.DataFrame]
     
     logger.info("Fetching comprehensive LMIS data from Ministry of Labour API...")
     
-    results = {}
+    calls = {
+        # Labor Market Indicators
+        "main_indicators": ("labor market indicators", client.get_qatar_main_indicators),
+        "sdg_indicators": ("labor market indicators", client.get_sdg_indicators),
+        "job_seniority": ("labor market indicators", client.get_job_seniority_distribution),
+        # Economic Diversification
+        "sector_growth_nds3": ("economic diversification data", lambda: client.get_sector_growth("NDS3")),
+        "sector_growth_isic": ("economic diversification data", lambda: client.get_sector_growth("ISIC")),
+        "top_skills_nds3": ("economic diversification data", lambda: client.get_top_skills_by_sector("NDS3")),
+        "expat_skills": ("economic diversification data", client.get_attracted_expat_skills),
+        # Human Capital
+        "education_bachelors": ("human capital data", client.get_education_attainment_bachelors),
+        "emerging_skills": ("human capital data", client.get_emerging_decaying_skills),
+        "skills_gap_education": ("human capital data", client.get_education_system_skills_gap),
+        "best_paid_occupations": ("human capital data", client.get_best_paid_occupations),
+        # Dynamic Modeling
+        "occupation_transitions": ("dynamic modeling data", client.get_occupation_transitions),
+        "sector_mobility": ("dynamic modeling data", client.get_sector_mobility),
+        # Expat Dynamics
+        "expat_dominated_jobs": ("expat dynamics data", client.get_expat_dominated_occupations),
+        "top_expat_skills": ("expat dynamics data", client.get_top_expat_skills),
+        # SMEs
+        "occupations_by_company_size": ("SME data", client.get_occupations_by_company_size),
+        "sme_growth": ("SME data", client.get_sme_growth),
+        "firm_transitions": ("SME data", client.get_firm_size_transitions),
+    }
     
-    # Labor Market Indicators
-    try:
-        results["main_indicators"] = client.get_qatar_main_indicators()
-        results["sdg_indicators"] = client.get_sdg_indicators()
-        results["job_seniority"] = client.get_job_seniority_distribution()
-    except Exception as e:
-        logger.error(f"Error fetching labor market indicators: {e}")
-    
-    # Economic Diversification
-    try:
-        results["sector_growth_nds3"] = client.get_sector_growth("NDS3")
-        results["sector_growth_isic"] = client.get_sector_growth("ISIC")
-        results["top_skills_nds3"] = client.get_top_skills_by_sector("NDS3")
-        results["expat_skills"] = client.get_attracted_expat_skills()
-    except Exception as e:
-        logger.error(f"Error fetching economic diversification data: {e}")
-    
-    # Human Capital
-    try:
-        results["education_bachelors"] = client.get_education_attainment_bachelors()
-        results["emerging_skills"] = client.get_emerging_decaying_skills()
-        results["skills_gap_education"] = client.get_education_system_skills_gap()
-        results["best_paid_occupations"] = client.get_best_paid_occupations()
-    except Exception as e:
-        logger.error(f"Error fetching human capital data: {e}")
-    
-    # Dynamic Modeling
-    try:
-        results["occupation_transitions"] = client.get_occupation_transitions()
-        results["sector_mobility"] = client.get_sector_mobility()
-    except Exception as e:
-        logger.error(f"Error fetching dynamic modeling data: {e}")
-    
-    # Expat Dynamics
-    try:
-        results["expat_dominated_jobs"] = client.get_expat_dominated_occupations()
-        results["top_expat_skills"] = client.get_top_expat_skills()
-    except Exception as e:
-        logger.error(f"Error fetching expat dynamics data: {e}")
-    
-    # SMEs
-    try:
-        results["occupations_by_company_size"] = client.get_occupations_by_company_size()
-        results["sme_growth"] = client.get_sme_growth()
-        results["firm_transitions"] = client.get_firm_size_transitions()
-    except Exception as e:
-        logger.error(f"Error fetching SME data: {e}")
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(calls), thread_name_prefix="lmis-fetch") as pool:
+        futures = {key: pool.submit(fetch) for key, (_, fetch) in calls.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.error(f"Error fetching {calls[key][0]} ({key}): {e}")
     
     # Filter out empty DataFrames
     results = {k: v for k, v in results.items() if not v.empty}
@@ -17,6 +17,7 @@ from typing import Any
 
 import httpx
 
+from ._cache import cached_transport
 from ._http import send_with_retry
 
 DEFAULT_TIMEOUT = 30.0
@@ -46,7 +47,7 @@ def _client(timeout: float = DEFAULT_TIMEOUT) -> httpx.Client:
         timeout: Request timeout in seconds
 
     Returns:
-        Configured httpx.Client
+        Configured httpx.Client, backed by the shared response cache
     """
     return httpx.Client(
         timeout=timeout,
@@ -54,6 +55,7 @@ def _client(timeout: float = DEFAULT_TIMEOUT) -> httpx.Client:
             "User-Agent": USER_AGENT,
             "Accept": "application/json",
         },
+        transport=cached_transport(),
     )
 
 
@@ -17,6 +17,8 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from src.qnwis.utils.rate_limit_core import Limit, RateLimitCore
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,13 +30,17 @@ class RateLimiter:
     - Requests per minute (RPM) limiting
     - Requests per day (RPD) limiting
     - Automatic waiting when limits are approached
+    
+    Token buckets on the shared rate-limit core: up to ``burst_size``
+    requests go out back to back, then they are spaced at the RPM rate.
     """
     
     def __init__(
         self,
         requests_per_minute: int = 60,
         requests_per_day: int = 10000,
-        burst_size: int = 10
+        burst_size: int = 10,
+        core: Optional[RateLimitCore] = None
     ):
         """
         Initialize rate limiter.
@@ -43,15 +49,20 @@ class RateLimiter:
             requests_per_minute: Max requests per minute
             requests_per_day: Max requests per day
             burst_size: Max requests in quick succession
+            core: Rate-limit core; defaults to an in-process one
         """
         self.rpm = requests_per_minute
         self.rpd = requests_per_day
         self.burst_size = burst_size
+        self.core = core or RateLimitCore()
+        self.limits = (
+            Limit.per("minute", requests_per_minute, 60, burst=min(burst_size, requests_per_minute)),
+            Limit.per("day", requests_per_day, 86400),
+        )
         
         self.minute_window: list[float] = []
         self.day_count = 0
         self.day_start = time.time()
-        self._lock = asyncio.Lock()
     
     async def wait_if_needed(self) -> float:
         """
@@ -60,41 +71,22 @@ class RateLimiter:
         Returns:
             Seconds waited (0 if no wait needed)
         """
-        async with self._lock:
-            now = time.time()
-            
-            # Reset daily counter if new day
-            if now - self.day_start > 86400:  # 24 hours
-                self.day_count = 0
-                self.day_start = now
-            
-            # Check daily limit
-            if self.day_count >= self.rpd:
-                wait_time = 86400 - (now - self.day_start) + 1
-                logger.warning(f"Daily rate limit reached. Waiting {wait_time:.0f}s until reset.")
-                await asyncio.sleep(wait_time)
-                self.day_count = 0
-                self.day_start = time.time()
-                return wait_time
-            
-            # Clean old entries from minute window
-            self.minute_window = [t for t in self.minute_window if now - t < 60]
-            
-            # Check minute limit
-            if len(self.minute_window) >= self.rpm:
-                oldest = min(self.minute_window)
-                wait_time = 60 - (now - oldest) + 0.1
-                if wait_time > 0:
-                    logger.debug(f"Minute rate limit approached. Waiting {wait_time:.1f}s")
-                    await asyncio.sleep(wait_time)
-                    self.minute_window = [t for t in self.minute_window if time.time() - t < 60]
-                    return wait_time
-            
-            # Record this request
-            self.minute_window.append(time.time())
-            self.day_count += 1
-            
-            return 0.0
+        wait_time = await self.core.wait("connector", self.limits)
+        if wait_time > 60:
+            logger.warning(f"Daily rate limit reached. Waited {wait_time:.0f}s.")
+        elif wait_time:
+            logger.debug(f"Minute rate limit approached. Waited {wait_time:.1f}s")
+        
+        # Record this request (for get_stats)
+        now = time.time()
+        if now - self.day_start > 86400:  # 24 hours
+            self.day_count = 0
+            self.day_start = now
+        self.minute_window = [t for t in self.minute_window if now - t < 60]
+        self.minute_window.append(now)
+        self.day_count += 1
+        
+        return wait_time
     
     def get_stats(self) -> Dict[str, Any]:
         """Get current rate limiter statistics."""
@@ -12,6 +12,8 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from ._cache import cached_async_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -62,7 +64,7 @@ class UNWTOAPI:
             api_key: UNWTO API subscription key (required for production)
         """
         self.api_key = api_key
-        self.client = httpx.AsyncClient(timeout=self.TIMEOUT)
+        self.client = httpx.AsyncClient(timeout=self.TIMEOUT, transport=cached_async_transport())
     
     async def close(self):
         """Close HTTP client"""
@@ -6,21 +6,27 @@ Provides economic and labor market indicators for GCC countries.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from urllib.parse import urlsplit
 
 import httpx
 import pandas as pd
 
-from ._http import send_with_retry
+from ._http import RequestMetadata
+from ._transport import AsyncTransport, HostBudget, get_transport, run_sync
 
 DEFAULT_TIMEOUT = 30.0
 DEFAULT_BASE_URL = "https://api.worldbank.org/v2"
 USER_AGENT = "QNWIS-WorldBankClient/1.0"
+HEADERS = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+
+# Replaces the fixed 0.1 s pause between serial requests
+WORLD_BANK_BUDGET = HostBudget(max_concurrency=8, requests_per_second=25.0)
 
 
 def _get_base_url() -> str:
@@ -43,13 +49,7 @@ def _client(timeout: float = DEFAULT_TIMEOUT) -> httpx.Client:
     """
     if timeout <= 0:
         raise ValueError("timeout must be a positive number of seconds")
-    return httpx.Client(
-        timeout=timeout,
-        headers={
-            "User-Agent": USER_AGENT,
-            "Accept": "application/json",
-        },
-    )
+    return httpx.Client(timeout=timeout, headers=HEADERS)
 
 
 class UDCGlobalDataIntegrator:
@@ -58,16 +58,21 @@ class UDCGlobalDataIntegrator:
     Production-ready client for World Bank economic data.
     """
 
-    def __init__(self, output_dir: Path | None = None):
+    def __init__(self, output_dir: Path | None = None, transport: AsyncTransport | None = None):
         """Initialize World Bank data integrator.
 
         Args:
             output_dir: Output directory for downloaded data.
                        Defaults to current directory + 'qatar_data/global_sources'
+            transport: Pooled HTTP transport. Defaults to the shared one.
         """
         self.output_dir = output_dir or Path("qatar_data/global_sources")
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.base_url = _get_base_url()
+        self.transport = transport or get_transport()
+        host = urlsplit(self.base_url).netloc
+        if host not in self.transport.budgets:
+            self.transport.configure_host(host, WORLD_BANK_BUDGET)
 
     def get_indicator(
         self,
@@ -82,6 +87,9 @@ class UDCGlobalDataIntegrator:
     ) -> pd.DataFrame:
         """Get World Bank indicator data for specified countries.
 
+        Sync wrapper around ``aget_indicator``; countries are fetched
+        concurrently on the shared transport.
+
         Args:
             indicator: World Bank indicator code (e.g., "NY.GDP.MKTP.CD")
             countries: List of ISO 3-letter country codes. Defaults to ["QAT"]
@@ -94,6 +102,35 @@ class UDCGlobalDataIntegrator:
         Returns:
             DataFrame with columns: country, year, value, indicator_name
 
+        Raises:
+            ValueError: If input parameters are invalid.
+            httpx.HTTPStatusError: If API request fails.
+        """
+        return run_sync(
+            self.aget_indicator(
+                indicator,
+                countries,
+                year,
+                start_year,
+                end_year,
+                timeout_s=timeout_s,
+                max_rows=max_rows,
+            )
+        )
+
+    async def aget_indicator(
+        self,
+        indicator: str,
+        countries: list[str] | None = None,
+        year: int | None = None,
+        start_year: int | None = None,
+        end_year: int | None = None,
+        *,
+        timeout_s: float | None = None,
+        max_rows: int | None = None,
+    ) -> pd.DataFrame:
+        """Async ``get_indicator``: one request per country, issued concurrently.
+
         Raises:
             ValueError: If input parameters are invalid.
             httpx.HTTPStatusError: If API request fails.
@@ -153,46 +190,23 @@ class UDCGlobalDataIntegrator:
         else:
             date_param = "2018:2023"
 
-        all_records: list[dict[str, Any]] = []
+        responses = await asyncio.gather(
+            *(
+                self._fetch_country(indicator_code, country, date_param, client_timeout)
+                for country in normalized_countries
+            )
+        )
+
+        frames: list[pd.DataFrame] = []
         rate_limited = False
         max_retries_used = 0
+        for country_frame, metadata in responses:
+            if not country_frame.empty:
+                frames.append(country_frame)
+            rate_limited = rate_limited or metadata.rate_limited
+            max_retries_used = max(max_retries_used, metadata.retries)
 
-        for country in normalized_countries:
-            url = f"{self.base_url}/country/{country}/indicator/{indicator_code}"
-            params = {"format": "json", "date": date_param, "per_page": 100}
-
-            with _client(timeout=client_timeout) as client:
-                response, metadata = send_with_retry(
-                    client,
-                    "GET",
-                    url,
-                    params=params,
-                    timeout=client_timeout,
-                    max_retries=3,
-                )
-                rate_limited = rate_limited or metadata.rate_limited
-                max_retries_used = max(max_retries_used, metadata.retries)
-                data = response.json()
-
-                # World Bank returns [metadata, data]
-                if len(data) > 1 and data[1]:
-                    for record in data[1]:
-                        if record.get("value") is not None:
-                            all_records.append(
-                                {
-                                    "country": country,
-                                    "year": int(record["date"]),
-                                    "value": float(record["value"]),
-                                    "indicator": indicator_code,
-                                    "indicator_name": record.get("indicator", {}).get(
-                                        "value", ""
-                                    ),
-                                }
-                            )
-
-            time.sleep(0.1)  # Be respectful to API
-
-        frame = pd.DataFrame(all_records)
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
         frame.attrs["request_metadata"] = {
             "rate_limited": rate_limited,
             "max_retries_used": max_retries_used,
@@ -206,6 +220,42 @@ class UDCGlobalDataIntegrator:
             ] = "World Bank API returned HTTP 429; data may be incomplete."
         return frame
 
+    async def _fetch_country(
+        self, indicator_code: str, country: str, date_param: str, timeout: float
+    ) -> tuple[pd.DataFrame, RequestMetadata]:
+        """Fetch one (indicator, country) series."""
+        url = f"{self.base_url}/country/{country}/indicator/{indicator_code}"
+        params = {"format": "json", "date": date_param, "per_page": 100}
+        response, metadata = await self.transport.request(
+            "GET",
+            url,
+            params=params,
+            headers=HEADERS,
+            timeout=timeout,
+            max_retries=3,
+        )
+
+        def parse(response: httpx.Response) -> pd.DataFrame:
+            data = response.json()
+            records: list[dict[str, Any]] = []
+            # World Bank returns [metadata, data]
+            if len(data) > 1 and data[1]:
+                for record in data[1]:
+                    if record.get("value") is not None:
+                        records.append(
+                            {
+                                "country": country,
+                                "year": int(record["date"]),
+                                "value": float(record["value"]),
+                                "indicator": indicator_code,
+                                "indicator_name": record.get("indicator", {}).get("value", ""),
+                            }
+                        )
+            return pd.DataFrame(records)
+
+        # Unchanged bodies (cache hits, 304s) reuse the stored frame snapshot
+        return self.transport.frame(response, parse), metadata
+
     def integrate_phase_1_data_sources(self):
         """Implement Phase 1: Foundation data sources (World Bank + Weather)."""
 
@@ -343,22 +393,43 @@ class UDCGlobalDataIntegrator:
         Returns:
             Dictionary mapping indicator codes to DataFrames
         """
+        return run_sync(
+            self.aget_multiple_indicators(indicators, countries, start_year, end_year)
+        )
+
+    async def aget_multiple_indicators(
+        self,
+        indicators: list[str],
+        countries: list[str] | None = None,
+        start_year: int | None = None,
+        end_year: int | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Async ``get_multiple_indicators``: all (indicator x country) requests fan out at once.
+
+        The host budget, not a fixed sleep, keeps the request rate polite.
+        """
         if not indicators:
             raise ValueError("indicators must contain at least one indicator code")
 
-        result: dict[str, pd.DataFrame] = {}
-        for indicator in indicators:
-            try:
-                df = self.get_indicator(
+        frames = await asyncio.gather(
+            *(
+                self.aget_indicator(
                     indicator=indicator,
                     countries=countries,
                     start_year=start_year,
                     end_year=end_year,
                 )
-                result[indicator] = df
-                time.sleep(0.1)  # Rate limiting
-            except Exception as e:
-                print(f"Warning: Failed to fetch {indicator}: {e}")
+                for indicator in indicators
+            ),
+            return_exceptions=True,
+        )
+
+        result: dict[str, pd.DataFrame] = {}
+        for indicator, frame in zip(indicators, frames, strict=True):
+            if isinstance(frame, BaseException):
+                print(f"Warning: Failed to fetch {indicator}: {frame}")
+            else:
+                result[indicator] = frame
         return result
 
     # Strategic indicator constants
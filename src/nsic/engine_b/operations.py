@@ -0,0 +1,454 @@
+"""
+Engine B Operations
+Request models and request -> service -> response conversion shared by every
+Engine B transport.
+
+The FastAPI app (``api.py``) and the in-process transport (``transport.py``)
+both go through ``execute``, so a request produces the same response dict no
+matter how it reaches the compute services.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional, Literal
+
+from pydantic import BaseModel, Field
+
+from .services.monte_carlo import MonteCarloService, MonteCarloInput
+from .services.sensitivity import SensitivityService, SensitivityInput
+from .services.optimization import OptimizationService, OptimizationInput, OptimizationVariable, OptimizationConstraint
+from .services.forecasting import ForecastingService, ForecastingInput
+from .services.thresholds import ThresholdService, ThresholdInput, ThresholdConstraint
+from .services.benchmarking import BenchmarkingService, BenchmarkingInput, BenchmarkMetric, PeerData
+from .services.correlation import CorrelationService, CorrelationInput
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# REQUEST MODELS
+# ============================================================================
+
+class MonteCarloRequest(BaseModel):
+    """Request model for Monte Carlo simulation."""
+    variables: dict[str, dict] = Field(..., description="Variables with distribution params")
+    formula: str = Field(..., description="Python expression to evaluate")
+    success_condition: str = Field(..., description="Condition for success")
+    n_simulations: int = Field(default=10000, ge=100, le=1000000)
+    seed: Optional[int] = None
+
+
+class SensitivityRequest(BaseModel):
+    """Request model for sensitivity analysis."""
+    base_values: dict[str, float] = Field(..., description="Base parameter values")
+    formula: str = Field(..., description="Python expression to evaluate")
+    ranges: Optional[dict[str, dict]] = Field(default=None, description="Parameter ranges")
+    n_steps: int = Field(default=10, ge=3, le=100)
+
+
+class OptimizationVariableRequest(BaseModel):
+    """Variable for optimization."""
+    name: str
+    lower_bound: Optional[float] = None
+    upper_bound: Optional[float] = None
+    initial_value: Optional[float] = None
+
+
+class OptimizationConstraintRequest(BaseModel):
+    """Constraint for optimization."""
+    expression: str
+    constraint_type: str = "ineq"
+    description: str = ""
+
+
+class OptimizationRequest(BaseModel):
+    """Request model for optimization."""
+    variables: list[OptimizationVariableRequest]
+    objective: str = Field(..., description="Objective function expression")
+    sense: str = Field(default="minimize", description="minimize or maximize")
+    constraints: list[OptimizationConstraintRequest] = []
+    method: str = "auto"
+    tolerance: float = 1e-6
+    max_iterations: int = 1000
+
+
+class ForecastingRequest(BaseModel):
+    """Request model for time series forecasting."""
+    historical_values: list[float] = Field(..., min_length=2)
+    time_labels: Optional[list[str]] = None
+    forecast_horizon: int = Field(default=5, ge=1, le=100)
+    method: str = "auto"
+    confidence_level: float = Field(default=0.95, ge=0.5, le=0.99)
+    seasonal_period: Optional[int] = None
+
+
+class ThresholdConstraintRequest(BaseModel):
+    """Constraint for threshold analysis."""
+    expression: str
+    threshold_type: Literal["upper", "lower", "boundary"] = "boundary"
+    target: float = 0.0
+    description: str = ""
+    severity: Literal["critical", "warning", "info"] = "warning"
+
+
+class ThresholdRequest(BaseModel):
+    """Request model for threshold analysis."""
+    sweep_variable: str
+    sweep_range: tuple[float, float]
+    fixed_variables: dict[str, float]
+    constraints: list[ThresholdConstraintRequest]
+    resolution: int = Field(default=100, ge=10, le=1000)
+    precision: float = 1e-6
+
+
+class PeerDataRequest(BaseModel):
+    """Peer data for benchmarking."""
+    name: str
+    value: float
+    region: Optional[str] = None
+    income_group: Optional[str] = None
+
+
+class BenchmarkMetricRequest(BaseModel):
+    """Metric for benchmarking."""
+    name: str
+    qatar_value: float
+    peers: list[PeerDataRequest]
+    higher_is_better: bool = True
+    target: Optional[float] = None
+    international_standard: Optional[float] = None
+
+
+class BenchmarkingRequest(BaseModel):
+    """Request model for benchmarking."""
+    metrics: list[BenchmarkMetricRequest]
+    peer_filter: Optional[str] = None
+
+
+class CorrelationRequest(BaseModel):
+    """Request model for correlation analysis."""
+    data: dict[str, list[float]] = Field(..., description="Variable data")
+    target_variable: Optional[str] = None
+    methods: list[str] = ["pearson", "spearman"]
+    alpha: float = Field(default=0.05, ge=0.001, le=0.1)
+
+
+class CombinedAnalysisRequest(BaseModel):
+    """Request for running multiple analyses at once."""
+    monte_carlo: Optional[MonteCarloRequest] = None
+    sensitivity: Optional[SensitivityRequest] = None
+    forecasting: Optional[ForecastingRequest] = None
+    thresholds: Optional[ThresholdRequest] = None
+    benchmarking: Optional[BenchmarkingRequest] = None
+    correlation: Optional[CorrelationRequest] = None
+
+
+# ============================================================================
+# SERVICE CONSTRUCTION
+# ============================================================================
+
+# GPU assignment per service (see package docstring)
+SERVICE_FACTORIES: dict[str, Callable[[], Any]] = {
+    "monte_carlo": lambda: MonteCarloService(gpu_ids=[0, 1]),
+    "sensitivity": lambda: SensitivityService(gpu_id=2),
+    "optimization": lambda: OptimizationService(gpu_id=3),
+    "forecasting": lambda: ForecastingService(gpu_id=4),
+    "thresholds": lambda: ThresholdService(gpu_id=5),
+    "benchmarking": lambda: BenchmarkingService(gpu_id=6),
+    "correlation": lambda: CorrelationService(gpu_id=7),
+}
+
+
+def create_services() -> dict[str, Any]:
+    """Instantiate all seven compute services."""
+    return {name: factory() for name, factory in SERVICE_FACTORIES.items()}
+
+
+# ============================================================================
+# REQUEST -> SERVICE -> RESPONSE
+# ============================================================================
+
+def _monte_carlo(service: MonteCarloService, request: MonteCarloRequest) -> dict:
+    input_spec = MonteCarloInput(
+        variables=request.variables,
+        formula=request.formula,
+        success_condition=request.success_condition,
+        n_simulations=request.n_simulations,
+        seed=request.seed,
+    )
+    result = service.simulate(input_spec)
+    return asdict(result)
+
+
+def _sensitivity(service: SensitivityService, request: SensitivityRequest) -> dict:
+    input_spec = SensitivityInput(
+        base_values=request.base_values,
+        formula=request.formula,
+        ranges=request.ranges,
+        n_steps=request.n_steps,
+    )
+    result = service.analyze(input_spec)
+
+    # Convert dataclasses to dicts
+    return {
+        "base_result": result.base_result,
+        "parameter_impacts": [asdict(p) for p in result.parameter_impacts],
+        "tornado_data": result.tornado_data,
+        "top_drivers": result.top_drivers,
+        "sensitivity_matrix": result.sensitivity_matrix,
+        "n_parameters": result.n_parameters,
+        "gpu_used": result.gpu_used,
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+def _optimization(service: OptimizationService, request: OptimizationRequest) -> dict:
+    variables = [
+        OptimizationVariable(
+            name=v.name,
+            lower_bound=v.lower_bound,
+            upper_bound=v.upper_bound,
+            initial_value=v.initial_value,
+        )
+        for v in request.variables
+    ]
+
+    constraints = [
+        OptimizationConstraint(
+            expression=c.expression,
+            constraint_type=c.constraint_type,
+            description=c.description,
+        )
+        for c in request.constraints
+    ]
+
+    input_spec = OptimizationInput(
+        variables=variables,
+        objective=request.objective,
+        sense=request.sense,
+        constraints=constraints,
+        method=request.method,
+        tolerance=request.tolerance,
+        max_iterations=request.max_iterations,
+    )
+
+    result = service.solve(input_spec)
+    return asdict(result)
+
+
+def _forecasting(service: ForecastingService, request: ForecastingRequest) -> dict:
+    input_spec = ForecastingInput(
+        historical_values=request.historical_values,
+        time_labels=request.time_labels,
+        forecast_horizon=request.forecast_horizon,
+        method=request.method,
+        confidence_level=request.confidence_level,
+        seasonal_period=request.seasonal_period,
+    )
+    result = service.forecast(input_spec)
+
+    return {
+        "forecasts": [asdict(f) for f in result.forecasts],
+        "trend": result.trend,
+        "trend_slope": result.trend_slope,
+        "mape": result.mape,
+        "rmse": result.rmse,
+        "r_squared": result.r_squared,
+        "method_used": result.method_used,
+        "confidence_level": result.confidence_level,
+        "n_historical": result.n_historical,
+        "gpu_used": result.gpu_used,
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+def _thresholds(service: ThresholdService, request: ThresholdRequest) -> dict:
+    constraints = [
+        ThresholdConstraint(
+            expression=c.expression,
+            threshold_type=c.threshold_type,
+            target=c.target,
+            description=c.description,
+            severity=c.severity,
+        )
+        for c in request.constraints
+    ]
+
+    input_spec = ThresholdInput(
+        sweep_variable=request.sweep_variable,
+        sweep_range=request.sweep_range,
+        fixed_variables=request.fixed_variables,
+        constraints=constraints,
+        resolution=request.resolution,
+        precision=request.precision,
+    )
+
+    result = service.analyze(input_spec)
+
+    return {
+        "thresholds": [asdict(t) for t in result.thresholds],
+        "critical_thresholds": [asdict(t) for t in result.critical_thresholds],
+        "safe_range": result.safe_range,
+        "risk_level": result.risk_level,
+        "sweep_data": result.sweep_data,
+        "n_constraints": result.n_constraints,
+        "gpu_used": result.gpu_used,
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+def _benchmarking(service: BenchmarkingService, request: BenchmarkingRequest) -> dict:
+    metrics = [
+        BenchmarkMetric(
+            name=m.name,
+            qatar_value=m.qatar_value,
+            peers=[PeerData(p.name, p.value, p.region, p.income_group) for p in m.peers],
+            higher_is_better=m.higher_is_better,
+            target=m.target,
+            international_standard=m.international_standard,
+        )
+        for m in request.metrics
+    ]
+
+    input_spec = BenchmarkingInput(
+        metrics=metrics,
+        peer_filter=request.peer_filter,
+    )
+
+    result = service.benchmark(input_spec)
+
+    return {
+        "metric_benchmarks": [
+            {
+                **asdict(mb),
+                "best_peer": asdict(mb.best_peer),
+                "worst_peer": asdict(mb.worst_peer),
+                "closest_peers": [asdict(p) for p in mb.closest_peers],
+            }
+            for mb in result.metric_benchmarks
+        ],
+        "composite_score": result.composite_score,
+        "overall_rank": result.overall_rank,
+        "overall_percentile": result.overall_percentile,
+        "strengths": result.strengths,
+        "improvement_areas": result.improvement_areas,
+        "outperforms_peers": result.outperforms_peers,
+        "underperforms_peers": result.underperforms_peers,
+        "n_metrics": result.n_metrics,
+        "n_peers": result.n_peers,
+        "gpu_used": result.gpu_used,
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+def _correlation(service: CorrelationService, request: CorrelationRequest) -> dict:
+    input_spec = CorrelationInput(
+        data=request.data,
+        target_variable=request.target_variable,
+        methods=request.methods,
+        alpha=request.alpha,
+    )
+    result = service.analyze(input_spec)
+
+    return {
+        "correlation_matrix": result.correlation_matrix,
+        "significant_pairs": [asdict(p) for p in result.significant_pairs],
+        "all_pairs": [asdict(p) for p in result.all_pairs],
+        "driver_analysis": asdict(result.driver_analysis) if result.driver_analysis else None,
+        "multicollinearity_warnings": result.multicollinearity_warnings,
+        "n_variables": result.n_variables,
+        "n_observations": result.n_observations,
+        "n_significant": result.n_significant,
+        "gpu_used": result.gpu_used,
+        "execution_time_ms": result.execution_time_ms,
+    }
+
+
+@dataclass(frozen=True)
+class Operation:
+    """One Engine B compute operation."""
+    name: str  # Also the key in the services dict
+    label: str  # For log messages
+    request_model: type[BaseModel]
+    run: Callable[[Any, Any], dict]
+    # REST paths serving this operation (canonical and /compute alias)
+    paths: tuple[str, ...]
+    # Numeric request fields (list[float] or dict[str, list[float]]) that
+    # may be large enough to ship through shared memory
+    array_fields: tuple[str, ...] = ()
+
+
+OPERATIONS: dict[str, Operation] = {
+    op.name: op
+    for op in (
+        Operation("monte_carlo", "Monte Carlo", MonteCarloRequest, _monte_carlo,
+                  ("/monte_carlo", "/compute/monte_carlo")),
+        Operation("sensitivity", "Sensitivity", SensitivityRequest, _sensitivity,
+                  ("/sensitivity", "/compute/sensitivity")),
+        Operation("optimization", "Optimization", OptimizationRequest, _optimization,
+                  ("/optimization", "/compute/optimization")),
+        Operation("forecasting", "Forecasting", ForecastingRequest, _forecasting,
+                  ("/forecasting", "/compute/forecast"), array_fields=("historical_values",)),
+        Operation("thresholds", "Thresholds", ThresholdRequest, _thresholds,
+                  ("/thresholds", "/compute/thresholds")),
+        Operation("benchmarking", "Benchmarking", BenchmarkingRequest, _benchmarking,
+                  ("/benchmarking", "/compute/benchmark")),
+        Operation("correlation", "Correlation", CorrelationRequest, _correlation,
+                  ("/correlation", "/compute/correlation"), array_fields=("data",)),
+    )
+}
+
+_BY_PATH: dict[str, Operation] = {path: op for op in OPERATIONS.values() for path in op.paths}
+
+
+def resolve_operation(name_or_path: str) -> Operation:
+    """
+    Look up an operation by name (``"forecasting"``) or REST path
+    (``"/compute/forecast"``).
+
+    Raises:
+        KeyError: Unknown operation
+    """
+    op = OPERATIONS.get(name_or_path) or _BY_PATH.get(name_or_path)
+    if op is None:
+        raise KeyError(f"Unknown Engine B operation: {name_or_path}")
+    return op
+
+
+def execute(operation: str, request: BaseModel, services: dict[str, Any]) -> dict:
+    """
+    Run one validated request against ``services`` and build its response.
+
+    Args:
+        operation: Operation name or REST path
+        request: Instance of the operation's request model
+        services: Service instances keyed by operation name
+
+    Returns:
+        JSON-compatible response dict (what the REST endpoint returns)
+    """
+    op = resolve_operation(operation)
+    return op.run(services[op.name], request)
+
+
+__all__ = [
+    "BenchmarkMetricRequest",
+    "BenchmarkingRequest",
+    "CombinedAnalysisRequest",
+    "CorrelationRequest",
+    "ForecastingRequest",
+    "MonteCarloRequest",
+    "OPERATIONS",
+    "Operation",
+    "OptimizationConstraintRequest",
+    "OptimizationRequest",
+    "OptimizationVariableRequest",
+    "PeerDataRequest",
+    "SERVICE_FACTORIES",
+    "SensitivityRequest",
+    "ThresholdConstraintRequest",
+    "ThresholdRequest",
+    "create_services",
+    "execute",
+    "resolve_operation",
+]
@@ -0,0 +1,580 @@
+"""
+Engine B Transports
+How orchestrators reach the compute services.
+
+- ``HTTPTransport``: POSTs to the Engine B FastAPI app (``api.py``) for
+  distributed deployments. One pooled ``httpx.AsyncClient`` per event loop
+  replaces the client-per-scenario pattern, so connections are reused.
+- ``InProcessTransport``: validates the same request models locally and runs
+  the services (``operations.execute``) on a process pool. Nothing is
+  JSON-encoded; large numeric inputs (forecast history, correlation series)
+  reach the workers through one shared-memory block instead of pickled float
+  lists.
+
+Both return a response with ``status_code``, ``json()`` and ``text`` and use
+the REST paths (``/compute/monte_carlo`` ...), so call sites are transport
+agnostic. Select with ``ENGINE_B_TRANSPORT=http|inprocess``.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional
+
+import httpx
+import numpy as np
+from pydantic import BaseModel, ValidationError
+
+from .operations import Operation, create_services, execute, resolve_operation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENGINE_B_URL = "http://localhost:8001"
+
+# Below this many float values, pickling the lists is cheaper than setting up
+# a shared-memory block
+SHM_MIN_VALUES = 4096
+
+TRANSPORT_KINDS = ("http", "inprocess")
+
+
+@dataclass
+class EngineBResponse:
+    """Response of the in-process transport, shaped like ``httpx.Response``."""
+    status_code: int
+    body: Any
+
+    def json(self) -> Any:
+        return self.body
+
+    @property
+    def text(self) -> str:
+        if isinstance(self.body, str):
+            return self.body
+        return json.dumps(self.body, default=str)
+
+
+class EngineBTransport:
+    """Interface: ``post(path, payload)`` returning a response-like object."""
+
+    name = "base"
+
+    async def post(self, path: str, payload: Any) -> Any:
+        """
+        Run one compute request.
+
+        Args:
+            path: REST path, e.g. ``/compute/monte_carlo``
+            payload: Request dict or request model instance
+
+        Returns:
+            Object with ``status_code``, ``json()`` and ``text``
+        """
+        raise NotImplementedError
+
+    async def aclose(self) -> None:
+        """Release connections/workers held by the transport."""
+
+    def shutdown(self) -> None:
+        """Synchronous cleanup (outside an event loop)."""
+
+
+# ============================================================================
+# HTTP
+# ============================================================================
+
+class HTTPTransport(EngineBTransport):
+    """Engine B over HTTP with a pooled client."""
+
+    name = "http"
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: float = 30.0,
+        max_connections: int = 32,
+    ):
+        self.base_url = (base_url or os.getenv("ENGINE_B_URL", DEFAULT_ENGINE_B_URL)).rstrip("/")
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # httpx clients are bound to the loop that opened their connections
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def post(self, path: str, payload: Any) -> httpx.Response:
+        if isinstance(payload, BaseModel):
+            payload = payload.model_dump(mode="json")
+        return await self._get_client().post(f"{self.base_url}{path}", json=payload)
+
+    async def aclose(self) -> None:
+        if self._client is not None and self._client_loop is asyncio.get_running_loop():
+            await self._client.aclose()
+        self._client = None
+        self._client_loop = None
+
+    def shutdown(self) -> None:
+        self._client = None
+        self._client_loop = None
+
+
+# ============================================================================
+# IN-PROCESS
+# ============================================================================
+
+@dataclass(frozen=True)
+class SharedArrays:
+    """Layout of request arrays packed into one float64 shared-memory block."""
+    shm_name: str
+    # (field, key or None for a plain list, length) in packing order
+    segments: tuple[tuple[str, Optional[str], int], ...]
+
+
+_worker_services: Optional[dict[str, Any]] = None
+_worker_lock = threading.Lock()
+
+
+def _services() -> dict[str, Any]:
+    """Service instances of this process, created on first use."""
+    global _worker_services
+    if _worker_services is None:
+        with _worker_lock:
+            if _worker_services is None:
+                _worker_services = create_services()
+    return _worker_services
+
+
+def _init_worker() -> None:
+    # Pay service start-up when the worker spawns, not on its first request
+    _services()
+
+
+def _pack_arrays(
+    op: Operation, request: BaseModel, min_values: int
+) -> tuple[BaseModel, Optional[SharedArrays], Optional[SharedMemory]]:
+    """Move large array fields of ``request`` into shared memory."""
+    segments = []
+    series = []
+    for field in op.array_fields:
+        value = getattr(request, field)
+        if isinstance(value, dict):
+            for key, values in value.items():
+                segments.append((field, key, len(values)))
+                series.append(values)
+        elif value is not None:
+            segments.append((field, None, len(value)))
+            series.append(value)
+
+    total = sum(length for _, _, length in segments)
+    if total < max(min_values, 1):
+        return request, None, None
+
+    block = SharedMemory(create=True, size=total * 8)
+    view = np.ndarray((total,), dtype=np.float64, buffer=block.buf)
+    offset = 0
+    for values, (_, _, length) in zip(series, segments):
+        view[offset:offset + length] = values
+        offset += length
+    del view
+
+    stripped = request.model_copy(update={field: None for field in op.array_fields})
+    return stripped, SharedArrays(block.name, tuple(segments)), block
+
+
+def _unpack_arrays(request: BaseModel, arrays: SharedArrays) -> BaseModel:
+    """Worker side of ``_pack_arrays``: restore array fields as ndarrays."""
+    block = SharedMemory(name=arrays.shm_name)
+    try:
+        total = sum(length for _, _, length in arrays.segments)
+        view = np.ndarray((total,), dtype=np.float64, buffer=block.buf)
+        update: dict[str, Any] = {}
+        offset = 0
+        for field, key, length in arrays.segments:
+            # One memcpy out of the block so it can be released immediately
+            values = view[offset:offset + length].copy()
+            offset += length
+            if key is None:
+                update[field] = values
+            else:
+                update.setdefault(field, {})[key] = values
+        del view
+    finally:
+        block.close()
+    # model_copy skips validation: the parent already validated the lists
+    return request.model_copy(update=update)
+
+
+def _run(operation: str, request: BaseModel, arrays: Optional[SharedArrays] = None) -> dict:
+    """Executor entry point (process worker or thread)."""
+    if arrays is not None:
+        request = _unpack_arrays(request, arrays)
+    return execute(operation, request, _services())
+
+
+def _release(block: SharedMemory) -> None:
+    try:
+        block.close()
+        block.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class InProcessTransport(EngineBTransport):
+    """
+    Engine B services called directly, without HTTP.
+
+    Workers are spawned (not forked) so GPU contexts initialise cleanly in
+    each worker; every worker builds its services once. ``use_processes=False``
+    runs the services on a thread pool of the calling process instead (no
+    process start-up, shares the GIL).
+    """
+
+    name = "inprocess"
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        use_processes: bool = True,
+        shm_min_values: int = SHM_MIN_VALUES,
+    ):
+        self.max_workers = max_workers or int(os.getenv("ENGINE_B_WORKERS", "0")) or min(4, os.cpu_count() or 1)
+        self.use_processes = use_processes
+        self.shm_min_values = shm_min_values
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.use_processes:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=get_context("spawn"),
+                        initializer=_init_worker,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="engine-b"
+                    )
+            return self._executor
+
+    def _reset_executor(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def post(self, path: str, payload: Any) -> EngineBResponse:
+        try:
+            op = resolve_operation(path)
+        except KeyError:
+            return EngineBResponse(404, {"detail": "Not Found"})
+
+        try:
+            request = payload if isinstance(payload, op.request_model) else op.request_model.model_validate(payload)
+        except ValidationError as e:
+            return EngineBResponse(422, {"detail": e.errors(include_url=False)})
+
+        arrays = block = None
+        if self.use_processes:
+            request, arrays, block = _pack_arrays(op, request, self.shm_min_values)
+
+        try:
+            future: Future = self._get_executor().submit(_run, op.name, request, arrays)
+        except BaseException:
+            if block is not None:
+                _release(block)
+            raise
+        if block is not None:
+            # Freed when the worker is done, even if this coroutine is cancelled
+            future.add_done_callback(lambda _: _release(block))
+
+        try:
+            body = await asyncio.wrap_future(future)
+        except BrokenProcessPool as e:
+            logger.error(f"Engine B worker pool broken, restarting: {e}")
+            self._reset_executor()
+            return EngineBResponse(503, {"detail": str(e)})
+        except Exception as e:
+            logger.error(f"{op.label} error: {e}")
+            return EngineBResponse(500, {"detail": str(e)})
+        return EngineBResponse(200, body)
+
+    async def warm_up(self) -> None:
+        """Start every worker and build its services ahead of the first request."""
+        executor = self._get_executor()
+        await asyncio.gather(*(
+            asyncio.wrap_future(executor.submit(_init_worker)) for _ in range(self.max_workers)
+        ))
+
+    async def aclose(self) -> None:
+        # shutdown(wait=True) joins the worker processes; keep the loop free
+        await asyncio.to_thread(self.shutdown)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+# ============================================================================
+# SELECTION
+# ============================================================================
+
+_transports: dict[str, EngineBTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def create_transport(kind: str, **kwargs: Any) -> EngineBTransport:
+    """Build a transport of ``kind`` ("http" or "inprocess")."""
+    if kind == "http":
+        return HTTPTransport(**kwargs)
+    if kind == "inprocess":
+        return InProcessTransport(**kwargs)
+    raise ValueError(f"Unknown Engine B transport: {kind} (expected one of {TRANSPORT_KINDS})")
+
+
+def get_engine_b_transport(default: str = "http") -> EngineBTransport:
+    """
+    Shared transport selected by ``ENGINE_B_TRANSPORT``.
+
+    Args:
+        default: Kind used when the variable is unset or invalid
+
+    Returns:
+        Process-wide transport instance for the selected kind
+    """
+    kind = os.getenv("ENGINE_B_TRANSPORT", default).strip().lower()
+    if kind not in TRANSPORT_KINDS:
+        logger.warning(f"Unknown ENGINE_B_TRANSPORT={kind!r}, using {default}")
+        kind = default
+    transport = _transports.get(kind)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(kind)
+            if transport is None:
+                transport = create_transport(kind)
+                _transports[kind] = transport
+                logger.info(f"Engine B transport: {kind}")
+    return transport
+
+
+def reset_engine_b_transports() -> None:
+    """Shut down and forget shared transports (tests, reconfiguration)."""
+    with _transports_lock:
+        transports = list(_transports.values())
+        _transports.clear()
+    for transport in transports:
+        transport.shutdown()
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def scenario_requests(index: int) -> list[tuple[str, dict]]:
+    """The four per-scenario requests ParallelDebateExecutor issues."""
+    growth = 0.03 + 0.005 * index
+    base_value = 100_000.0 * (1 + 0.1 * index)
+    return [
+        ("/compute/monte_carlo", {
+            "variables": {
+                "growth_rate": {"distribution": "normal", "mean": growth, "std": growth * 0.3},
+                "base_value": {"distribution": "normal", "mean": base_value, "std": base_value * 0.1},
+            },
+            "formula": "base_value * (1 + growth_rate) ** 5",
+            "success_condition": f"result > {base_value * 1.1}",
+            "n_simulations": 10000,
+        }),
+        ("/compute/sensitivity", {
+            "base_values": {"annual_growth_rate": growth, "initial_capital": base_value},
+            "formula": "initial_capital * (1 + annual_growth_rate) ** 5",
+            "n_steps": 10,
+        }),
+        ("/compute/forecast", {
+            "historical_values": [base_value * (1 + growth) ** (i - 5) for i in range(5)],
+            "forecast_horizon": 7,
+        }),
+        ("/compute/thresholds", {
+            "sweep_variable": "target_rate",
+            "sweep_range": [0.05, 0.30],
+            "fixed_variables": {"available_supply": base_value, "total_demand": 1_850_000},
+            "constraints": [{
+                "expression": "available_supply < total_demand * target_rate",
+                "description": "supply_constraint",
+            }],
+            "resolution": 100,
+        }),
+    ]
+
+
+async def _time_scenarios(transport: EngineBTransport, n_scenarios: int) -> dict[str, float]:
+    # Warm-up: worker spawn / TCP connect are one-off costs
+    if isinstance(transport, InProcessTransport):
+        await transport.warm_up()
+    for path, payload in scenario_requests(0):
+        await transport.post(path, payload)
+
+    walls, overheads = [], []
+    for index in range(n_scenarios):
+        start = time.perf_counter()
+        compute_ms = 0.0
+        for path, payload in scenario_requests(index):
+            resp = await transport.post(path, payload)
+            if resp.status_code != 200:
+                raise RuntimeError(f"{path} returned {resp.status_code}: {resp.text[:200]}")
+            compute_ms += resp.json().get("execution_time_ms", 0.0)
+        wall_ms = (time.perf_counter() - start) * 1000
+        walls.append(wall_ms)
+        overheads.append(wall_ms - compute_ms)
+    return {
+        "wall_ms_per_scenario": statistics.median(walls),
+        "overhead_ms_per_scenario": statistics.median(overheads),
+    }
+
+
+async def _time_client_per_scenario(base_url: str, n_scenarios: int) -> dict[str, float]:
+    """Previous ParallelDebateExecutor pattern: a new AsyncClient per scenario."""
+    walls, overheads = [], []
+    for index in range(n_scenarios):
+        start = time.perf_counter()
+        compute_ms = 0.0
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            for path, payload in scenario_requests(index):
+                resp = await client.post(f"{base_url}{path}", json=payload)
+                compute_ms += resp.json().get("execution_time_ms", 0.0)
+        wall_ms = (time.perf_counter() - start) * 1000
+        walls.append(wall_ms)
+        overheads.append(wall_ms - compute_ms)
+    return {
+        "wall_ms_per_scenario": statistics.median(walls),
+        "overhead_ms_per_scenario": statistics.median(overheads),
+    }
+
+
+async def _time_large_payload(n_values: int) -> dict[str, float]:
+    """Correlation over ``n_values`` floats: shared memory vs pickled lists."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=n_values // 4)
+    payload = {
+        "data": {f"v{i}": (x * (i + 1) + rng.normal(size=x.size)).tolist() for i in range(4)},
+        "methods": ["pearson"],
+    }
+    timings = {}
+    for label, min_values in (("shm", SHM_MIN_VALUES), ("pickle", n_values + 1)):
+        transport = InProcessTransport(shm_min_values=min_values)
+        try:
+            await transport.post("/compute/correlation", payload)
+            samples = []
+            for _ in range(5):
+                start = time.perf_counter()
+                resp = await transport.post("/compute/correlation", payload)
+                samples.append((time.perf_counter() - start) * 1000 - resp.json()["execution_time_ms"])
+            timings[f"large_{label}_overhead_ms"] = statistics.median(samples)
+        finally:
+            await transport.aclose()
+    return timings
+
+
+def _serve_api() -> tuple[Any, threading.Thread, str]:
+    import uvicorn
+
+    from .api import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 30
+    while not server.started:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Engine B API did not start")
+        time.sleep(0.05)
+    return server, thread, f"http://127.0.0.1:{port}"
+
+
+def run_benchmark(n_scenarios: int = 12, large_values: int = 200_000) -> dict[str, Any]:
+    """
+    Per-scenario Engine B overhead (wall time minus service compute time) for
+    the HTTP and in-process transports.
+
+    The HTTP rows run against a local uvicorn server on loopback, so they are
+    a lower bound for a remote Engine B.
+    """
+    server, thread, base_url = _serve_api()
+
+    async def _run_all() -> dict[str, Any]:
+        results: dict[str, Any] = {"scenarios": n_scenarios}
+        legacy = await _time_client_per_scenario(base_url, n_scenarios)
+        results.update({f"http_client_per_scenario_{k}": v for k, v in legacy.items()})
+
+        http = HTTPTransport(base_url=base_url)
+        try:
+            results.update({f"http_pooled_{k}": v for k, v in (await _time_scenarios(http, n_scenarios)).items()})
+        finally:
+            await http.aclose()
+
+        inproc = InProcessTransport()
+        try:
+            results.update({f"inprocess_{k}": v for k, v in (await _time_scenarios(inproc, n_scenarios)).items()})
+        finally:
+            await inproc.aclose()
+
+        if large_values:
+            results.update(await _time_large_payload(large_values))
+        return results
+
+    try:
+        return asyncio.run(_run_all())
+    finally:
+        server.should_exit = True
+        thread.join(timeout=10)
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in run_benchmark().items():
+        print(f"{key:>45}: {value:.2f}" if isinstance(value, float) else f"{key:>45}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = [
+    "EngineBResponse",
+    "EngineBTransport",
+    "HTTPTransport",
+    "InProcessTransport",
+    "SHM_MIN_VALUES",
+    "SharedArrays",
+    "create_transport",
+    "get_engine_b_transport",
+    "reset_engine_b_transports",
+    "run_benchmark",
+    "scenario_requests",
+]
@@ -566,24 +566,29 @@ class DeepSeekClient:
             "stop": kwargs.get("stop", self.config.stop_sequences),
         }
         
+        # Engine B vLLM calls share the adaptive concurrency budget with
+        # Engine A agents and QNWIS scenarios (backs off on 429/timeouts)
+        from src.qnwis.llm.adaptive_limiter import get_adaptive_limiter
+        
         start_time = time.time()
         
-        if HTTPX_AVAILABLE:
-            async with httpx.AsyncClient(timeout=self.config.timeout_seconds) as client:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-        elif AIOHTTP_AVAILABLE:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    url,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
-                ) as response:
+        async with get_adaptive_limiter().slot("engine_b"):
+            if HTTPX_AVAILABLE:
+                async with httpx.AsyncClient(timeout=self.config.timeout_seconds) as client:
+                    response = await client.post(url, json=payload)
                     response.raise_for_status()
-                    data = await response.json()
-        else:
-            raise ImportError("Either httpx or aiohttp is required for async calls")
+                    data = response.json()
+            elif AIOHTTP_AVAILABLE:
+                async with aiohttp.ClientSession() as session:
+                    async with session.post(
+                        url,
+                        json=payload,
+                        timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
+                    ) as response:
+                        response.raise_for_status()
+                        data = await response.json()
+            else:
+                raise ImportError("Either httpx or aiohttp is required for async calls")
         
         elapsed_ms = (time.time() - start_time) * 1000
         
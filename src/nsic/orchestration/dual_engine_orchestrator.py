@@ -49,6 +49,7 @@ from ..engine_b.services.thresholds import ThresholdService, ThresholdInput
 from ..engine_b.services.benchmarking import BenchmarkingService, BenchmarkingInput, BenchmarkMetric, PeerData
 from ..engine_b.services.correlation import CorrelationService, CorrelationInput
 from ..engine_b.integration.conflict_detector import ConflictDetector
+from ..engine_b.transport import get_engine_b_transport
 
 logger = logging.getLogger(__name__)
 
@@ -559,7 +560,7 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
     async def process_question(
         self,
         user_question: str,
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
         use_cache: bool = True,
         on_turn_complete: Optional[Callable] = None,  # Live turn-by-turn callback
     ) -> Dict[str, Any]:
@@ -574,7 +575,8 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
 
         Args:
             user_question: The ministerial policy question
-            max_concurrent: Max concurrent scenarios
+            max_concurrent: Optional hard cap on concurrent scenarios (default:
+                sized from the shared adaptive concurrency budget)
             use_cache: Whether to check/update semantic cache
             on_turn_complete: Optional callback(engine, scenario_id, scenario_name, turn_num, agent_name, content, gpu_id)
 
@@ -677,7 +679,7 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
     async def _process_engine_a_batch(
         self,
         scenarios: List[GeneratedScenario],
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
         on_turn_complete: Optional[Callable] = None,
         quantitative_context: str = "",  # NEW: Engine B results for agent prompts
     ) -> List[DualEngineResult]:
@@ -686,7 +688,8 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
         
         Args:
             scenarios: List of GeneratedScenario for Engine A
-            max_concurrent: Max concurrent scenarios
+            max_concurrent: Optional hard cap on concurrent scenarios (default:
+                sized from the shared adaptive concurrency budget)
             on_turn_complete: Optional callback
             quantitative_context: Engine B compute results formatted for agent prompts
             
@@ -698,10 +701,10 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
             logger.info("Engine A agents will debate WITH quantitative context from Engine B")
         
         results = []
-        semaphore = asyncio.Semaphore(max_concurrent)
+        gate = self._scenario_gate(max_concurrent)
         
         async def process_one(scenario: GeneratedScenario, idx: int):
-            async with semaphore:
+            async with gate.admit():
                 # Pass quantitative context to Engine A for informed debate
                 result = await self._run_engine_a_generated(
                     scenario,
@@ -724,14 +727,15 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
     async def _process_engine_b_batch(
         self,
         scenarios: List[GeneratedScenario],
-        max_concurrent: int = 4,
+        max_concurrent: Optional[int] = None,
     ) -> List[DualEngineResult]:
         """
         Process scenarios through Engine B (broad exploration).
         
         Args:
             scenarios: List of GeneratedScenario for Engine B
-            max_concurrent: Max concurrent scenarios
+            max_concurrent: Optional hard cap on concurrent scenarios (default:
+                sized from the shared adaptive concurrency budget)
             
         Returns:
             List of DualEngineResult
@@ -739,10 +743,10 @@ Provide comprehensive analysis of this scenario's impacts on Qatar's economy and
         logger.info(f"Processing {len(scenarios)} scenarios through Engine B")
         
         results = []
-        semaphore = asyncio.Semaphore(max_concurrent)
+        gate = self._scenario_gate(max_concurrent)
         
         async def process_one(scenario: GeneratedScenario):
-            async with semaphore:
+            async with gate.admit():
                 return await self._run_engine_b_generated(scenario)
         
         tasks = [process_one(s) for s in scenarios]
@@ -1015,7 +1019,7 @@ Your arguments MUST account for the quantitative facts above."""
     async def process_all_scenarios(
         self,
         scenarios: List = None,
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
     ) -> List[DualEngineResult]:
         """
         Process all scenarios through the dual-engine pipeline.
@@ -1026,7 +1030,8 @@ Your arguments MUST account for the quantitative facts above."""
         
         Args:
             scenarios: List of ScenarioDefinition (or loads from templates)
-            max_concurrent: Max concurrent scenarios
+            max_concurrent: Optional hard cap on concurrent scenarios (default:
+                sized from the shared adaptive concurrency budget)
             
         Returns:
             List of DualEngineResult
@@ -1040,13 +1045,13 @@ Your arguments MUST account for the quantitative facts above."""
         logger.info(f"Processing {len(scenarios)} scenarios (legacy mode)")
         
         with self.timing.time_stage(Stage.TOTAL, "all_scenarios"):
-            semaphore = asyncio.Semaphore(max_concurrent)
+            gate = self._scenario_gate(max_concurrent)
             
-            async def process_with_semaphore(scenario):
-                async with semaphore:
+            async def process_with_gate(scenario):
+                async with gate.admit():
                     return await self.process_scenario(scenario)
             
-            tasks = [process_with_semaphore(s) for s in scenarios]
+            tasks = [process_with_gate(s) for s in scenarios]
             results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Filter out exceptions
@@ -1062,7 +1067,7 @@ Your arguments MUST account for the quantitative facts above."""
     def process_all_scenarios_sync(
         self,
         scenarios: List = None,
-        max_concurrent: int = 2,
+        max_concurrent: Optional[int] = None,
     ) -> List[DualEngineResult]:
         """Synchronous wrapper for process_all_scenarios."""
         try:
@@ -1075,6 +1080,18 @@ Your arguments MUST account for the quantitative facts above."""
             self.process_all_scenarios(scenarios, max_concurrent)
         )
     
+    @staticmethod
+    def _scenario_gate(max_concurrent: Optional[int] = None):
+        """
+        Admission gate sized from the shared adaptive concurrency budget.
+        
+        Debates are turn-by-turn, so each scenario holds ~1 LLM call at a time;
+        the number of concurrent scenarios follows the live limit, capped by
+        ``max_concurrent`` when given.
+        """
+        from src.qnwis.llm.adaptive_limiter import get_adaptive_limiter
+        return get_adaptive_limiter().gate(units_per_task=1, max_tasks=max_concurrent)
+    
     def get_timing_summary(self) -> Dict[str, Any]:
         """Get timing summary across all stages."""
         return {
@@ -1096,8 +1113,15 @@ Your arguments MUST account for the quantitative facts above."""
             "engine_b_stats": self.engine_b.get_stats(),
             "arbitrator_stats": self.arbitrator.get_stats() if self._arbitrator else {},
             "timing_summary": self.get_timing_summary(),
+            "concurrency": self._concurrency_metrics(),
         }
     
+    @staticmethod
+    def _concurrency_metrics() -> Dict[str, Any]:
+        """Live limit, in-flight count and queueing delay of the shared budget."""
+        from src.qnwis.llm.adaptive_limiter import get_adaptive_limiter
+        return get_adaptive_limiter().get_metrics()
+    
     def health_check(self) -> Dict[str, Any]:
         """Check health of all components."""
         cache_status = "disabled"
@@ -1338,6 +1362,13 @@ Your arguments MUST account for the quantitative facts above."""
     # ENGINE B COMPUTE PER SCENARIO (Correct Flow)
     # =========================================================================
     
+    async def _engine_b_compute(self, path: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one Engine B request through the configured transport."""
+        resp = await get_engine_b_transport(default="inprocess").post(path, request)
+        if resp.status_code != 200:
+            raise RuntimeError(f"Engine B {path} returned {resp.status_code}: {resp.text[:200]}")
+        return resp.json()
+    
     async def _run_engine_b_per_scenario(
         self,
         scenario_set,
@@ -1368,14 +1399,9 @@ Your arguments MUST account for the quantitative facts above."""
                 base_workforce = assumptions.get("workforce_availability", 1.0)
                 external_risk = assumptions.get("external_risk", 1.0)
                 
-                # Initialize compute services
-                monte_carlo = MonteCarloService(gpu_ids=[0, 1])
-                sensitivity = SensitivityService(gpu_id=2)
-                forecasting = ForecastingService(gpu_id=4)
-                
                 # Monte Carlo with scenario-adjusted parameters
-                mc_result = monte_carlo.simulate(MonteCarloInput(
-                    variables={
+                mc_request = {
+                    "variables": {
                         "policy_effectiveness": {
                             "mean": 0.70 * base_effectiveness,
                             "std": 0.15,
@@ -1397,31 +1423,40 @@ Your arguments MUST account for the quantitative facts above."""
                             "distribution": "normal"
                         },
                     },
-                    formula="policy_effectiveness * implementation_quality * external_factors * resource_availability",
-                    success_condition="result >= 0.35",
-                    n_simulations=10000,
-                    seed=42,
-                ))
+                    "formula": "policy_effectiveness * implementation_quality * external_factors * resource_availability",
+                    "success_condition": "result >= 0.35",
+                    "n_simulations": 10000,
+                    "seed": 42,
+                }
                 
                 # Sensitivity analysis
-                sens_result = sensitivity.analyze(SensitivityInput(
-                    base_values={
+                sens_request = {
+                    "base_values": {
                         "policy_effectiveness": 0.70 * base_effectiveness,
                         "implementation_quality": 0.80,
                         "external_factors": 0.85 * external_risk,
                         "resource_availability": 0.75 * base_growth,
                     },
-                    formula="policy_effectiveness * implementation_quality * external_factors * resource_availability",
-                ))
+                    "formula": "policy_effectiveness * implementation_quality * external_factors * resource_availability",
+                }
                 
                 # Forecasting with scenario-adjusted trend
                 historical = [0.55, 0.58, 0.62, 0.65, 0.68]
                 adjusted_historical = [v * base_growth for v in historical]
                 
-                fc_result = forecasting.forecast(ForecastingInput(
-                    historical_values=adjusted_historical,
-                    forecast_horizon=5,
-                ))
+                fc_request = {
+                    "historical_values": adjusted_historical,
+                    "forecast_horizon": 5,
+                }
+                
+                # Services run on the Engine B transport (in-process worker
+                # pool unless ENGINE_B_TRANSPORT=http), off the event loop
+                mc_result, sens_result, fc_result = await asyncio.gather(
+                    self._engine_b_compute("/compute/monte_carlo", mc_request),
+                    self._engine_b_compute("/compute/sensitivity", sens_request),
+                    self._engine_b_compute("/compute/forecast", fc_request),
+                )
+                forecasts = fc_result.get("forecasts") or []
                 
                 # Store results for this scenario
                 results[scenario_id] = {
@@ -1429,24 +1464,24 @@ Your arguments MUST account for the quantitative facts above."""
                     "scenario_category": scenario.category,
                     "assumptions": assumptions,
                     "monte_carlo": {
-                        "success_rate": mc_result.success_rate,
-                        "mean_result": mc_result.mean_result,
-                        "var_95": mc_result.var_95,
-                        "p5": mc_result.percentiles.get("p5", 0),
-                        "p95": mc_result.percentiles.get("p95", 0),
+                        "success_rate": mc_result["success_rate"],
+                        "mean_result": mc_result["mean_result"],
+                        "var_95": mc_result["var_95"],
+                        "p5": mc_result["percentiles"].get("p5", 0),
+                        "p95": mc_result["percentiles"].get("p95", 0),
                     },
                     "sensitivity": {
-                        "top_drivers": sens_result.top_drivers,
+                        "top_drivers": sens_result["top_drivers"],
                     },
                     "forecasting": {
-                        "trend": fc_result.trend,
-                        "final_forecast": fc_result.forecasts[-1].point_forecast if fc_result.forecasts else 0,
+                        "trend": fc_result["trend"],
+                        "final_forecast": forecasts[-1]["point_forecast"] if forecasts else 0,
                     },
-                    "risk_level": self._calculate_risk_level(mc_result.success_rate, external_risk),
+                    "risk_level": self._calculate_risk_level(mc_result["success_rate"], external_risk),
                 }
                 
                 logger.debug(
-                    f"Scenario {scenario.name}: success_rate={mc_result.success_rate:.1%}"
+                    f"Scenario {scenario.name}: success_rate={mc_result['success_rate']:.1%}"
                 )
                 
             except Exception as e:
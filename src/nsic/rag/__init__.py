@@ -5,10 +5,12 @@ This module provides premium embeddings and caching for the NSIC system.
 
 Components:
 - EmbeddingCache: SHA256-based deterministic embedding cache
+- SegmentEmbeddingStore: Append-only segment storage for bulk ingestion
 - PremiumEmbeddingService: instructor-xl embeddings with GPU acceleration
 """
 
 from .embedding_cache import EmbeddingCache, create_embedding_cache
+from .segment_store import SegmentEmbeddingStore
 from .premium_embeddings import (
     PremiumEmbeddingService,
     get_embedding_service,
@@ -19,6 +21,7 @@ from .premium_embeddings import (
 __all__ = [
     "EmbeddingCache",
     "create_embedding_cache",
+    "SegmentEmbeddingStore",
     "PremiumEmbeddingService",
     "get_embedding_service",
     "encode",
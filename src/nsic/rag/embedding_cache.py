@@ -9,6 +9,8 @@ Key features:
 - Version-aware: Model version changes invalidate cache
 - Thread-safe: Uses diskcache with proper locking
 - GPU-accelerated: Supports CUDA tensor caching
+- Bulk ingestion: Optional segment-file storage (storage="segment") with
+  append-only float16/float32 arrays, a SQLite key index and mmap reads
 """
 
 import hashlib
@@ -18,6 +20,8 @@ from pathlib import Path
 from typing import Optional, Union, List
 import numpy as np
 
+from .segment_store import SegmentEmbeddingStore
+
 try:
     import torch
     TORCH_AVAILABLE = True
@@ -32,6 +36,11 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+STORAGE_BACKENDS = ("diskcache", "segment")
+
+# Rows copied per transaction when migrating diskcache entries to segments
+_MIGRATION_CHUNK = 10000
+
 
 class EmbeddingCache:
     """
@@ -51,6 +60,8 @@ class EmbeddingCache:
         model_version: str = "1.0.0",
         max_size_gb: float = 10.0,
         eviction_policy: str = "least-recently-used",
+        storage: str = "diskcache",
+        dtype: str = "float32",
     ):
         """
         Initialize the embedding cache.
@@ -60,13 +71,19 @@ class EmbeddingCache:
             model_name: Name of the embedding model (used in hash)
             model_version: Version of the model (used in hash for invalidation)
             max_size_gb: Maximum cache size in gigabytes
-            eviction_policy: Cache eviction policy (default: LRU)
+            eviction_policy: Cache eviction policy (default: LRU, diskcache only)
+            storage: "diskcache" (one pickled entry per text) or "segment"
+                (append-only arrays + SQLite index, for bulk ingestion)
+            dtype: On-disk dtype for segment storage ("float32" or "float16")
         """
-        if not DISKCACHE_AVAILABLE:
+        if storage not in STORAGE_BACKENDS:
+            raise ValueError(f"storage must be one of {STORAGE_BACKENDS}, got {storage!r}")
+        if storage == "diskcache" and not DISKCACHE_AVAILABLE:
             raise ImportError("diskcache is required for EmbeddingCache. Install with: pip install diskcache")
         
         self.model_name = model_name
         self.model_version = model_version
+        self.storage = storage
         
         # Set up cache directory
         if cache_dir is None:
@@ -74,23 +91,72 @@ class EmbeddingCache:
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize diskcache with size limit
         max_size_bytes = int(max_size_gb * 1024 * 1024 * 1024)
-        self.cache = diskcache.Cache(
-            str(self.cache_dir),
-            size_limit=max_size_bytes,
-            eviction_policy=eviction_policy,
-        )
+        self.cache = None
+        self.segments: Optional[SegmentEmbeddingStore] = None
+        
+        if storage == "segment":
+            self.segments = SegmentEmbeddingStore(
+                self.cache_dir / "segments",
+                dtype=dtype,
+                max_size_bytes=max_size_bytes,
+            )
+            self._migrate_from_diskcache()
+        else:
+            # Initialize diskcache with size limit
+            self.cache = diskcache.Cache(
+                str(self.cache_dir),
+                size_limit=max_size_bytes,
+                eviction_policy=eviction_policy,
+            )
         
         # Stats tracking
         self._hits = 0
         self._misses = 0
         
         logger.info(
-            f"EmbeddingCache initialized: dir={self.cache_dir}, "
+            f"EmbeddingCache initialized: dir={self.cache_dir}, storage={storage}, "
             f"model={model_name}@{model_version}, max_size={max_size_gb}GB"
         )
     
+    def _migrate_from_diskcache(self) -> int:
+        """
+        Copy existing diskcache entries into the segment store (once).
+        
+        The legacy diskcache files are left untouched so switching back to
+        storage="diskcache" keeps working.
+        
+        Returns:
+            Number of entries migrated
+        """
+        if self.segments.get_meta("migrated_from_diskcache") is not None:
+            return 0
+        if not DISKCACHE_AVAILABLE or not (self.cache_dir / "cache.db").exists():
+            self.segments.set_meta("migrated_from_diskcache", "0")
+            return 0
+        
+        migrated = 0
+        legacy = diskcache.Cache(str(self.cache_dir))
+        try:
+            keys, rows = [], []
+            for key in legacy.iterkeys():
+                value = legacy.get(key)
+                if value is None:
+                    continue
+                keys.append(key)
+                rows.append(value)
+                if len(keys) >= _MIGRATION_CHUNK:
+                    migrated += self.segments.put_many(keys, np.array(rows, dtype=np.float32))
+                    keys, rows = [], []
+            if keys:
+                migrated += self.segments.put_many(keys, np.array(rows, dtype=np.float32))
+        finally:
+            legacy.close()
+        
+        self.segments.set_meta("migrated_from_diskcache", str(migrated))
+        logger.info(f"Migrated {migrated} diskcache embeddings to segment storage")
+        return migrated
+    
     def _compute_cache_key(self, text: str) -> str:
         """
         Compute deterministic cache key using SHA256.
@@ -128,6 +194,10 @@ class EmbeddingCache:
         Returns:
             Cached embedding as numpy array, or None if not in cache
         """
+        if self.segments is not None:
+            results, _ = self.get_batch([text])
+            return results[0]
+        
         key = self._compute_cache_key(text)
         
         try:
@@ -157,6 +227,9 @@ class EmbeddingCache:
             - cached_embeddings: List of embeddings (None for misses)
             - missing_indices: List of indices that need to be computed
         """
+        if self.segments is not None:
+            return self._get_batch_segments(texts)
+        
         results = []
         missing_indices = []
         
@@ -168,6 +241,24 @@ class EmbeddingCache:
         
         return results, missing_indices
     
+    def _get_batch_segments(self, texts: List[str]) -> tuple[List[Optional[np.ndarray]], List[int]]:
+        """Vectorized batch lookup against the segment store."""
+        try:
+            matrix, found = self.segments.get_many(self._compute_batch_keys(texts))
+        except Exception as e:
+            logger.warning(f"Cache get error: {e}")
+            matrix, found = None, np.zeros(len(texts), dtype=bool)
+        
+        hits = int(found.sum())
+        self._hits += hits
+        self._misses += len(texts) - hits
+        
+        results: List[Optional[np.ndarray]] = [
+            matrix[i] if found[i] else None for i in range(len(texts))
+        ]
+        missing_indices = np.flatnonzero(~found).tolist()
+        return results, missing_indices
+    
     def set(self, text: str, embedding: Union[np.ndarray, 'torch.Tensor']) -> bool:
         """
         Cache an embedding for text.
@@ -179,6 +270,9 @@ class EmbeddingCache:
         Returns:
             True if successfully cached, False otherwise
         """
+        if self.segments is not None:
+            return self.set_batch([text], np.asarray(embedding).reshape(1, -1)) == 1
+        
         key = self._compute_cache_key(text)
         
         try:
@@ -208,21 +302,35 @@ class EmbeddingCache:
         if TORCH_AVAILABLE and isinstance(embeddings, torch.Tensor):
             embeddings = embeddings.cpu().numpy()
         
+        if self.segments is not None:
+            try:
+                return self.segments.put_many(self._compute_batch_keys(texts), embeddings)
+            except Exception as e:
+                logger.warning(f"Cache set error: {e}")
+                return 0
+        
+        # One diskcache transaction for the whole batch instead of one per row
         success_count = 0
-        for i, text in enumerate(texts):
-            if self.set(text, embeddings[i]):
-                success_count += 1
+        with self.cache.transact():
+            for i, text in enumerate(texts):
+                if self.set(text, embeddings[i]):
+                    success_count += 1
         
         return success_count
     
     def contains(self, text: str) -> bool:
         """Check if text is in cache."""
         key = self._compute_cache_key(text)
+        if self.segments is not None:
+            return self.segments.contains(key)
         return key in self.cache
     
     def clear(self) -> None:
         """Clear all cached embeddings."""
-        self.cache.clear()
+        if self.segments is not None:
+            self.segments.clear()
+        else:
+            self.cache.clear()
         self._hits = 0
         self._misses = 0
         logger.info("Cache cleared")
@@ -241,16 +349,21 @@ class EmbeddingCache:
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": hit_rate,
-            "size_bytes": self.cache.volume(),
-            "item_count": len(self.cache),
+            "size_bytes": self.segments.volume() if self.segments is not None else self.cache.volume(),
+            "item_count": len(self),
+            "storage": self.storage,
             "model_name": self.model_name,
             "model_version": self.model_version,
         }
     
     def close(self) -> None:
         """Close the cache (releases file handles)."""
-        self.cache.close()
-        logger.info(f"Cache closed. Stats: {self.get_stats()}")
+        stats = self.get_stats()
+        if self.segments is not None:
+            self.segments.close()
+        else:
+            self.cache.close()
+        logger.info(f"Cache closed. Stats: {stats}")
     
     def __enter__(self):
         return self
@@ -260,6 +373,8 @@ class EmbeddingCache:
         return False
     
     def __len__(self) -> int:
+        if self.segments is not None:
+            return len(self.segments)
         return len(self.cache)
     
     def __contains__(self, text: str) -> bool:
@@ -271,6 +386,8 @@ def create_embedding_cache(
     model_version: str = "1.0.0",
     cache_dir: Optional[str] = None,
     max_size_gb: float = 10.0,
+    storage: str = "diskcache",
+    dtype: str = "float32",
 ) -> EmbeddingCache:
     """
     Factory function to create an embedding cache.
@@ -280,6 +397,8 @@ def create_embedding_cache(
         model_version: Version string for cache invalidation
         cache_dir: Optional custom cache directory
         max_size_gb: Maximum cache size in GB
+        storage: "diskcache" or "segment"
+        dtype: On-disk dtype for segment storage
         
     Returns:
         Configured EmbeddingCache instance
@@ -289,5 +408,7 @@ def create_embedding_cache(
         model_name=model_name,
         model_version=model_version,
         max_size_gb=max_size_gb,
+        storage=storage,
+        dtype=dtype,
     )
 
@@ -70,6 +70,7 @@ class PremiumEmbeddingService:
         cache_max_size_gb: float = 10.0,
         batch_size: int = 32,
         gpu_ids: Optional[List[int]] = None,
+        cache_storage: str = "diskcache",
     ):
         """
         Initialize the premium embedding service.
@@ -82,6 +83,7 @@ class PremiumEmbeddingService:
             cache_max_size_gb: Maximum cache size in GB
             batch_size: Batch size for encoding
             gpu_ids: List of GPU IDs to use (default: [0, 1] for dual-GPU)
+            cache_storage: Cache backend ("diskcache" or "segment" for bulk ingestion)
         """
         if not ST_AVAILABLE:
             raise ImportError(
@@ -128,6 +130,7 @@ class PremiumEmbeddingService:
                 model_version=self.MODEL_VERSION,
                 cache_dir=cache_dir,
                 max_size_gb=cache_max_size_gb,
+                storage=cache_storage,
             )
         
         # Stats
@@ -144,6 +147,39 @@ class PremiumEmbeddingService:
         instruction = TASK_INSTRUCTIONS.get(task, TASK_INSTRUCTIONS["default"])
         return instruction + text
     
+    def encode_uncached(
+        self,
+        texts: List[str],
+        task: str = "default",
+        batch_size: Optional[int] = None,
+        show_progress: bool = False,
+        normalize: bool = True,
+    ) -> np.ndarray:
+        """
+        Encode texts with the model, bypassing the cache.
+        
+        Used directly by the embeddings server micro-batcher, which performs
+        its own cache lookups before batching misses.
+        
+        Args:
+            texts: List of texts
+            task: Task type for instruction
+            batch_size: Override default batch size
+            show_progress: Show progress bar
+            normalize: L2-normalize embeddings
+            
+        Returns:
+            Embedding matrix (N x D) as numpy array
+        """
+        prepared_texts = [self._prepare_instruction(t, task) for t in texts]
+        return self.model.encode(
+            prepared_texts,
+            batch_size=batch_size or self.batch_size,
+            show_progress_bar=show_progress,
+            normalize_embeddings=normalize,
+            convert_to_numpy=True,
+        )
+    
     def encode(
         self,
         texts: Union[str, List[str]],
@@ -189,23 +225,17 @@ class PremiumEmbeddingService:
                 # Some missing - encode only missing ones
                 missing_texts = [texts[i] for i in missing_indices]
                 
-                # Prepare with instructions
-                prepared_texts = [
-                    self._prepare_instruction(t, task) for t in missing_texts
-                ]
-                
                 # Encode missing texts
-                new_embeddings = self.model.encode(
-                    prepared_texts,
+                new_embeddings = self.encode_uncached(
+                    missing_texts,
+                    task=task,
                     batch_size=batch_size,
-                    show_progress_bar=show_progress,
-                    normalize_embeddings=normalize,
-                    convert_to_numpy=True,
+                    show_progress=show_progress,
+                    normalize=normalize,
                 )
                 
                 # Cache new embeddings
-                for i, idx in enumerate(missing_indices):
-                    self.cache.set(texts[idx], new_embeddings[i])
+                self.cache.set_batch(missing_texts, new_embeddings)
                 
                 # Merge cached and new embeddings
                 embeddings = np.zeros((len(texts), self.embedding_dim), dtype=np.float32)
@@ -222,13 +252,12 @@ class PremiumEmbeddingService:
                 )
         else:
             # No cache - encode all
-            prepared_texts = [self._prepare_instruction(t, task) for t in texts]
-            embeddings = self.model.encode(
-                prepared_texts,
+            embeddings = self.encode_uncached(
+                texts,
+                task=task,
                 batch_size=batch_size,
-                show_progress_bar=show_progress,
-                normalize_embeddings=normalize,
-                convert_to_numpy=True,
+                show_progress=show_progress,
+                normalize=normalize,
             )
         
         if single_input:
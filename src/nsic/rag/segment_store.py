@@ -0,0 +1,426 @@
+"""
+NSIC Segment-File Embedding Store
+
+Columnar storage backend for EmbeddingCache, built for bulk corpus ingestion:
+- Append-only segment files holding raw float16/float32 rows
+- SQLite index mapping cache key -> (segment, row)
+- Bulk append of a whole batch in one index transaction
+- Memory-mapped reads with vectorized gather per segment
+- Compaction that drops overwritten rows and evicts the oldest entries
+  until the store fits in its size budget
+
+Layout under ``root``:
+    index.sqlite            key -> (segment, row), plus store metadata
+    seg_000000.bin ...      contiguous (rows x dim) arrays, no header
+    store.lock              exclusive lock held across append + index insert
+
+Several processes may share one store (e.g. embeddings_server with
+``--workers>1``); writers serialize on ``store.lock`` and take row numbers
+from the segment file itself, not from per-process counters.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows: single-process stores only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# SQLite's default limit on bound parameters is 999 on older builds
+_SQL_CHUNK = 900
+
+SUPPORTED_DTYPES = ("float32", "float16")
+
+
+class SegmentEmbeddingStore:
+    """
+    Append-only segment files plus a SQLite key index.
+
+    Rows are written once and never modified in place; overwriting a key
+    appends a new row and repoints the index, leaving the old row dead
+    until the next compaction.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        dtype: str = "float32",
+        max_size_bytes: Optional[int] = None,
+        segment_max_rows: int = 65536,
+    ):
+        """
+        Open (or create) a segment store.
+
+        Args:
+            root: Directory holding the index and segment files
+            dtype: On-disk row dtype ("float32" or "float16")
+            max_size_bytes: Size budget enforced by compaction (None = unbounded)
+            segment_max_rows: Rows per segment before rotating to a new file
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"dtype must be one of {SUPPORTED_DTYPES}, got {dtype!r}")
+
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.segment_max_rows = segment_max_rows
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.root / "index.sqlite"), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY, segment INTEGER NOT NULL, row INTEGER NOT NULL,"
+            " seq INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_seq ON entries(seq)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+
+        stored_dtype = self.get_meta("dtype")
+        if stored_dtype is not None and stored_dtype != dtype:
+            logger.warning(
+                f"Segment store at {self.root} uses {stored_dtype}; ignoring requested {dtype}"
+            )
+            dtype = stored_dtype
+        self.set_meta("dtype", dtype)
+        self.dtype = np.dtype(dtype)
+
+        dim = self.get_meta("dim")
+        self.dim: Optional[int] = int(dim) if dim is not None else None
+
+        active = self.get_meta("active_segment")
+        self._active_segment = int(active) if active is not None else 0
+        self._active_rows = self._rows_in_segment(self._active_segment)
+        seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries").fetchone()[0]
+        self._next_seq = seq + 1
+
+        self._maps: Dict[int, np.memmap] = {}
+
+    # ------------------------------------------------------------------
+    # Metadata
+    # ------------------------------------------------------------------
+
+    def get_meta(self, name: str) -> Optional[str]:
+        """Read a metadata value."""
+        row = self._conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name: str, value: str) -> None:
+        """Write a metadata value."""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, str(value))
+        )
+
+    # ------------------------------------------------------------------
+    # Segment files
+    # ------------------------------------------------------------------
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"seg_{segment:06d}.bin"
+
+    def _row_bytes(self) -> int:
+        return (self.dim or 0) * self.dtype.itemsize
+
+    def _rows_in_segment(self, segment: int) -> int:
+        path = self._segment_path(segment)
+        if not path.exists() or self.dim is None:
+            return 0
+        return path.stat().st_size // self._row_bytes()
+
+    def _segment_map(self, segment: int, min_rows: int) -> np.memmap:
+        """Memory-map a segment, remapping if it has grown past the cached view."""
+        mapped = self._maps.get(segment)
+        if mapped is None or mapped.shape[0] < min_rows:
+            rows = self._rows_in_segment(segment)
+            mapped = np.memmap(
+                self._segment_path(segment), dtype=self.dtype, mode="r", shape=(rows, self.dim)
+            )
+            self._maps[segment] = mapped
+        return mapped
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold the store-wide exclusive lock shared by every process."""
+        with open(self.root / "store.lock", "a+b") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def _sync_from_meta(self) -> None:
+        """Reload state another process may have advanced (call under the file lock)."""
+        dim = self.get_meta("dim")
+        if dim is not None:
+            self.dim = int(dim)
+        active = self.get_meta("active_segment")
+        if active is not None:
+            self._active_segment = int(active)
+        seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries").fetchone()[0]
+        self._next_seq = seq + 1
+
+    def _segments_on_disk(self) -> List[int]:
+        return sorted(int(p.stem[4:]) for p in self.root.glob("seg_*.bin"))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _lookup(self, keys: List[str]) -> Dict[str, Tuple[int, int]]:
+        found: Dict[str, Tuple[int, int]] = {}
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start:start + _SQL_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for key, segment, row in self._conn.execute(
+                f"SELECT key, segment, row FROM entries WHERE key IN ({placeholders})", chunk
+            ):
+                found[key] = (segment, row)
+        return found
+
+    def get_many(self, keys: List[str]) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Gather embeddings for many keys in one index query.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Tuple of (matrix, found_mask)
+            - matrix: (len(keys) x dim) float32 array, zero rows for misses
+              (None if the store is empty)
+            - found_mask: boolean array marking which keys were present
+        """
+        found_mask = np.zeros(len(keys), dtype=bool)
+        if self.dim is None or not keys:
+            return None, found_mask
+
+        with self._lock:
+            locations = self._lookup(list(set(keys)))
+            out = np.zeros((len(keys), self.dim), dtype=np.float32)
+
+            by_segment: Dict[int, Tuple[List[int], List[int]]] = {}
+            for i, key in enumerate(keys):
+                loc = locations.get(key)
+                if loc is None:
+                    continue
+                found_mask[i] = True
+                positions, rows = by_segment.setdefault(loc[0], ([], []))
+                positions.append(i)
+                rows.append(loc[1])
+
+            for segment, (positions, rows) in by_segment.items():
+                mapped = self._segment_map(segment, max(rows) + 1)
+                out[positions] = mapped[rows]
+
+        return out, found_mask
+
+    def contains(self, key: str) -> bool:
+        """Check whether a key is indexed."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM entries WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put_many(self, keys: List[str], embeddings: np.ndarray) -> int:
+        """
+        Append a batch of embeddings and index them in one transaction.
+
+        Args:
+            keys: Cache keys (later duplicates win)
+            embeddings: (N x dim) matrix
+
+        Returns:
+            Number of rows written
+        """
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        if len(keys) != embeddings.shape[0]:
+            raise ValueError("keys and embeddings must have the same length")
+        if not keys:
+            return 0
+
+        with self._lock, self._file_lock():
+            self._sync_from_meta()
+            if self.dim is None:
+                self.dim = int(embeddings.shape[1])
+                self.set_meta("dim", str(self.dim))
+            elif embeddings.shape[1] != self.dim:
+                raise ValueError(f"Expected dimension {self.dim}, got {embeddings.shape[1]}")
+
+            data = np.ascontiguousarray(embeddings, dtype=self.dtype)
+            row_bytes = self._row_bytes()
+            index_rows = []
+            offset = 0
+            while offset < len(keys):
+                with open(self._segment_path(self._active_segment), "ab") as f:
+                    # Append mode opens at end of file: the next row is what's on disk
+                    first_row = f.tell() // row_bytes
+                    if first_row >= self.segment_max_rows:
+                        self._active_segment += 1
+                        continue
+                    take = min(len(keys) - offset, self.segment_max_rows - first_row)
+                    f.write(data[offset:offset + take].tobytes())
+                for j in range(take):
+                    index_rows.append(
+                        (keys[offset + j], self._active_segment, first_row + j, self._next_seq)
+                    )
+                    self._next_seq += 1
+                self._active_rows = first_row + take
+                offset += take
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO entries (key, segment, row, seq) VALUES (?, ?, ?, ?)",
+                    index_rows,
+                )
+                self.set_meta("active_segment", str(self._active_segment))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        if self.max_size_bytes is not None and self._data_bytes() > self.max_size_bytes:
+            self.compact()
+        return len(keys)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def _data_bytes(self) -> int:
+        return sum(self._segment_path(s).stat().st_size for s in self._segments_on_disk())
+
+    def volume(self) -> int:
+        """Total bytes used by segment files and the index."""
+        total = self._data_bytes()
+        for name in ("index.sqlite", "index.sqlite-wal"):
+            path = self.root / name
+            if path.exists():
+                total += path.stat().st_size
+        return total
+
+    def compact(self) -> int:
+        """
+        Rewrite live rows into fresh segments, evicting the oldest entries
+        until the data fits within ``max_size_bytes``.
+
+        Returns:
+            Number of entries evicted
+        """
+        with self._lock, self._file_lock():
+            self._sync_from_meta()
+            if self.dim is None:
+                return 0
+
+            live = self._conn.execute(
+                "SELECT key, segment, row FROM entries ORDER BY seq"
+            ).fetchall()
+            dropped: List[Tuple[str]] = []
+            if self.max_size_bytes is not None:
+                # Leave headroom so the next few appends don't re-trigger compaction
+                budget_rows = max(0, int(self.max_size_bytes * 0.9) // self._row_bytes())
+                if len(live) > budget_rows:
+                    cut = len(live) - budget_rows
+                    dropped = [(key,) for key, _, _ in live[:cut]]
+                    live = live[cut:]
+            evicted = len(dropped)
+
+            old_segments = self._segments_on_disk()
+            base = (old_segments[-1] + 1) if old_segments else 0
+
+            # Gather survivors per old segment, then write new segments
+            keys = [k for k, _, _ in live]
+            matrix = np.empty((len(live), self.dim), dtype=self.dtype)
+            by_segment: Dict[int, Tuple[List[int], List[int]]] = {}
+            for i, (_, segment, row) in enumerate(live):
+                positions, rows = by_segment.setdefault(segment, ([], []))
+                positions.append(i)
+                rows.append(row)
+            for segment, (positions, rows) in by_segment.items():
+                matrix[positions] = self._segment_map(segment, max(rows) + 1)[rows]
+
+            index_rows = []
+            segment = base
+            for start in range(0, len(keys), self.segment_max_rows):
+                chunk = matrix[start:start + self.segment_max_rows]
+                tmp = self._segment_path(segment).with_suffix(".tmp")
+                with open(tmp, "wb") as f:
+                    f.write(chunk.tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self._segment_path(segment))
+                for j in range(chunk.shape[0]):
+                    index_rows.append((segment, j, keys[start + j]))
+                segment += 1
+            active = max(base, segment - 1)
+
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", dropped)
+                self._conn.executemany(
+                    "UPDATE entries SET segment = ?, row = ? WHERE key = ?", index_rows
+                )
+                self.set_meta("active_segment", str(active))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            self._maps.clear()
+            for old in old_segments:
+                self._segment_path(old).unlink(missing_ok=True)
+            self._active_segment = active
+            self._active_rows = self._rows_in_segment(active)
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+        logger.info(f"Segment store compacted: {len(keys)} live, {evicted} evicted")
+        return evicted
+
+    def iter_keys(self) -> Iterable[str]:
+        """Iterate over all indexed keys."""
+        with self._lock:
+            rows = self._conn.execute("SELECT key FROM entries").fetchall()
+        return (key for (key,) in rows)
+
+    def clear(self) -> None:
+        """Remove all entries and segment files."""
+        with self._lock, self._file_lock():
+            self._conn.execute("DELETE FROM entries")
+            self._maps.clear()
+            for segment in self._segments_on_disk():
+                self._segment_path(segment).unlink(missing_ok=True)
+            self._active_segment = 0
+            self._active_rows = 0
+            self.set_meta("active_segment", "0")
+
+    def close(self) -> None:
+        """Release the index connection and memory maps."""
+        with self._lock:
+            self._maps.clear()
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,452 @@
+"""
+NSIC Embedding Micro-Batcher
+
+Dynamic batching scheduler for the embeddings server:
+- Requests enqueue texts and await a per-request future
+- A single worker drains up to ``max_batch_size`` texts or waits
+  ``max_latency_ms`` for more, whichever comes first
+- Cache lookups and model inference run on a dedicated thread so the
+  event loop keeps accepting requests
+- Only cache misses are encoded (via EmbeddingCache.get_batch)
+
+Usage:
+    batcher = EmbeddingBatcher(encode_fn=service.encode_uncached, cache=service.cache)
+    await batcher.start()
+    embeddings = await batcher.submit(["text a", "text b"], task="query")
+    await batcher.stop()
+
+Benchmark (CPU only, stub encoder):
+    python -m src.nsic.servers.embedding_batcher --requests 500 --concurrency 50
+"""
+
+import asyncio
+import logging
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# encode_fn(texts, task) -> (N x D) float array
+EncodeFn = Callable[[List[str], str], np.ndarray]
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_LATENCY_MS = 5.0
+DEFAULT_MAX_QUEUE_SIZE = 10_000
+
+
+@dataclass
+class _PendingRequest:
+    """Texts submitted by one caller, resolved together."""
+    texts: List[str]
+    task: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched encode calls.
+
+    Requests are grouped by task (the instruction prefix differs per task)
+    and each group is encoded with a single ``encode_fn`` call. Requests
+    are never split across batches, so a request larger than
+    ``max_batch_size`` is encoded on its own.
+    """
+
+    def __init__(
+        self,
+        encode_fn: EncodeFn,
+        cache=None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            encode_fn: Callable encoding a list of texts for a task (no caching)
+            cache: Optional EmbeddingCache consulted before encoding
+            max_batch_size: Maximum number of texts per encode call
+            max_latency_ms: Maximum time to wait for a batch to fill
+            max_queue_size: Maximum number of pending requests before rejecting
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        if max_latency_ms < 0:
+            raise ValueError("max_latency_ms must be >= 0")
+
+        self.encode_fn = encode_fn
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.max_queue_size = max_queue_size
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Dedicated single thread: the model is not re-entrant and this keeps
+        # inference off the event loop.
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._queued_texts = 0
+
+        # Metrics
+        self._requests = 0
+        self._texts = 0
+        self._batches = 0
+        self._encoded_texts = 0
+        self._encode_calls = 0
+        self._cache_hits = 0
+        self._max_queue_depth = 0
+        self._total_wait_ms = 0.0
+        self._total_encode_ms = 0.0
+        self._errors = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker task is active."""
+        return self._worker is not None and not self._worker.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of texts waiting to be batched."""
+        return self._queued_texts
+
+    async def start(self) -> None:
+        """Start the batching worker on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nsic-embed")
+        self._worker = asyncio.create_task(self._run(), name="nsic-embedding-batcher")
+        logger.info(
+            f"EmbeddingBatcher started: max_batch={self.max_batch_size}, "
+            f"max_latency={self.max_latency_ms}ms"
+        )
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any requests still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending = self._queue.get_nowait()
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError("Embedding batcher stopped"))
+            self._queued_texts = 0
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        logger.info(f"EmbeddingBatcher stopped. Metrics: {self.get_metrics()}")
+
+    async def submit(self, texts: List[str], task: str = "default") -> np.ndarray:
+        """
+        Enqueue texts and wait for their embeddings.
+
+        Args:
+            texts: Texts to encode
+            task: Task type for instruction (query, document, passage, summary, default)
+
+        Returns:
+            Embedding matrix (N x D) in input order
+
+        Raises:
+            RuntimeError: If the batcher is not running
+            asyncio.QueueFull: If the pending queue is at capacity
+        """
+        if not self.running or self._queue is None:
+            raise RuntimeError("Embedding batcher is not running")
+        if not texts:
+            raise ValueError("texts must not be empty")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingRequest(texts=list(texts), task=task, future=future))
+
+        self._requests += 1
+        self._texts += len(texts)
+        self._queued_texts += len(texts)
+        self._max_queue_depth = max(self._max_queue_depth, self._queued_texts)
+
+        return await future
+
+    async def _run(self) -> None:
+        """Worker loop: collect a batch, then process it off-loop."""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+        carry: Optional[_PendingRequest] = None
+
+        batch: List[_PendingRequest] = []
+        try:
+            while True:
+                first = carry or await self._queue.get()
+                carry = None
+                batch = [first]
+                size = len(first.texts)
+                deadline = loop.time() + self.max_latency_ms / 1000.0
+
+                while size < self.max_batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        nxt = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                    if size + len(nxt.texts) > self.max_batch_size:
+                        carry = nxt
+                        break
+                    batch.append(nxt)
+                    size += len(nxt.texts)
+
+                self._queued_texts -= size
+                await self._process(batch)
+                batch = []
+        except asyncio.CancelledError:
+            for pending in batch + ([carry] if carry else []):
+                if not pending.future.done():
+                    pending.future.set_exception(RuntimeError("Embedding batcher stopped"))
+            raise
+
+    async def _process(self, batch: List[_PendingRequest]) -> None:
+        """Encode one batch and resolve its futures."""
+        assert self._executor is not None
+        now = time.perf_counter()
+        for pending in batch:
+            self._total_wait_ms += (now - pending.enqueued_at) * 1000
+
+        by_task: Dict[str, List[_PendingRequest]] = {}
+        for pending in batch:
+            by_task.setdefault(pending.task, []).append(pending)
+
+        loop = asyncio.get_running_loop()
+        for task, requests in by_task.items():
+            texts = [t for pending in requests for t in pending.texts]
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._executor, self._encode_with_cache, texts, task
+                )
+            except Exception as e:
+                self._errors += 1
+                logger.error(f"Batched embedding error: {e}")
+                for pending in requests:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            self._batches += 1
+            offset = 0
+            for pending in requests:
+                n = len(pending.texts)
+                if not pending.future.done():
+                    pending.future.set_result(embeddings[offset:offset + n])
+                offset += n
+
+    def _encode_with_cache(self, texts: List[str], task: str) -> np.ndarray:
+        """Look up cached embeddings and encode only the misses (runs off-loop)."""
+        if self.cache is None:
+            return self._encode(texts, task)
+
+        cached, missing_indices = self.cache.get_batch(texts)
+        self._cache_hits += len(texts) - len(missing_indices)
+        if not missing_indices:
+            return np.array(cached, dtype=np.float32)
+
+        # Deduplicate misses so repeated texts in one batch are encoded once
+        unique_missing: Dict[str, int] = {}
+        for idx in missing_indices:
+            unique_missing.setdefault(texts[idx], len(unique_missing))
+        missing_texts = list(unique_missing)
+
+        new_embeddings = self._encode(missing_texts, task)
+        self.cache.set_batch(missing_texts, new_embeddings)
+
+        embeddings = np.zeros((len(texts), new_embeddings.shape[1]), dtype=np.float32)
+        for i, text in enumerate(texts):
+            if cached[i] is not None:
+                embeddings[i] = cached[i]
+            else:
+                embeddings[i] = new_embeddings[unique_missing[text]]
+        return embeddings
+
+    def _encode(self, texts: List[str], task: str) -> np.ndarray:
+        """Run the encoder and record timing."""
+        start = time.perf_counter()
+        embeddings = np.asarray(self.encode_fn(texts, task), dtype=np.float32)
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        self._total_encode_ms += (time.perf_counter() - start) * 1000
+        self._encode_calls += 1
+        self._encoded_texts += len(texts)
+        return embeddings
+
+    def get_metrics(self) -> dict:
+        """
+        Get batching metrics.
+
+        Returns:
+            Dict with queue depth, batch counts/sizes, cache hits and timings
+        """
+        return {
+            "queue_depth": self._queued_texts,
+            "max_queue_depth": self._max_queue_depth,
+            "requests": self._requests,
+            "texts": self._texts,
+            "batches": self._batches,
+            "avg_batch_size": self._texts / self._batches if self._batches else 0.0,
+            "encode_calls": self._encode_calls,
+            "encoded_texts": self._encoded_texts,
+            "cache_hits": self._cache_hits,
+            "avg_queue_wait_ms": self._total_wait_ms / self._requests if self._requests else 0.0,
+            "avg_encode_ms": self._total_encode_ms / self._batches if self._batches else 0.0,
+            "errors": self._errors,
+            "max_batch_size": self.max_batch_size,
+            "max_latency_ms": self.max_latency_ms,
+        }
+
+
+# ============================================================================
+# Benchmark Harness
+# ============================================================================
+
+class StubEncoder:
+    """
+    Deterministic CPU stub encoder for benchmarks and tests.
+
+    Cost model: fixed per-call overhead plus per-text cost, which mimics how
+    transformer inference amortizes over a batch.
+    """
+
+    def __init__(self, dim: int = 768, call_overhead_ms: float = 20.0, per_text_ms: float = 0.5):
+        self.dim = dim
+        self.call_overhead_ms = call_overhead_ms
+        self.per_text_ms = per_text_ms
+        self.calls = 0
+
+    def __call__(self, texts: List[str], task: str = "default") -> np.ndarray:
+        self.calls += 1
+        time.sleep((self.call_overhead_ms + self.per_text_ms * len(texts)) / 1000.0)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            rng = np.random.default_rng(zlib.crc32(f"{task}\x00{text}".encode("utf-8")))
+            vec = rng.standard_normal(self.dim).astype(np.float32)
+            out[i] = vec / np.linalg.norm(vec)
+        return out
+
+
+async def run_benchmark(
+    requests: int = 500,
+    concurrency: int = 50,
+    texts_per_request: int = 2,
+    max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+    max_latency_ms: float = DEFAULT_MAX_LATENCY_MS,
+    encoder: Optional[EncodeFn] = None,
+) -> dict:
+    """
+    Compare unbatched (one encode per request) vs micro-batched throughput.
+
+    Args:
+        requests: Total number of requests
+        concurrency: Concurrent in-flight requests
+        texts_per_request: Texts per request
+        max_batch_size: Batcher max batch size
+        max_latency_ms: Batcher max latency
+        encoder: Encoder to use (defaults to StubEncoder)
+
+    Returns:
+        Dict with elapsed seconds and requests/sec for both modes
+    """
+    encoder = encoder or StubEncoder()
+    payloads = [
+        [f"benchmark text {r}-{t}" for t in range(texts_per_request)]
+        for r in range(requests)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Baseline: each request encoded independently on a single worker thread
+    executor = ThreadPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+
+    async def unbatched(texts: List[str]) -> None:
+        async with semaphore:
+            await loop.run_in_executor(executor, encoder, texts, "default")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(unbatched(p) for p in payloads))
+    unbatched_s = time.perf_counter() - start
+    executor.shutdown()
+
+    batcher = EmbeddingBatcher(
+        encode_fn=encoder, max_batch_size=max_batch_size, max_latency_ms=max_latency_ms
+    )
+    await batcher.start()
+
+    async def batched(texts: List[str]) -> None:
+        async with semaphore:
+            await batcher.submit(texts)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(batched(p) for p in payloads))
+    batched_s = time.perf_counter() - start
+    metrics = batcher.get_metrics()
+    await batcher.stop()
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "unbatched_s": unbatched_s,
+        "batched_s": batched_s,
+        "unbatched_rps": requests / unbatched_s,
+        "batched_rps": requests / batched_s,
+        "speedup": unbatched_s / batched_s,
+        "batcher": metrics,
+    }
+
+
+def main():
+    """Run the CPU-only micro-batching benchmark."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NSIC embedding micro-batching benchmark")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--texts-per-request", type=int, default=2)
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument("--max-latency-ms", type=float, default=DEFAULT_MAX_LATENCY_MS)
+    parser.add_argument("--model", default=None, help="Optional small sentence-transformers model")
+    args = parser.parse_args()
+
+    encoder = None
+    if args.model:
+        from sentence_transformers import SentenceTransformer
+
+        model = SentenceTransformer(args.model, device="cpu")
+        encoder = lambda texts, task: model.encode(texts, convert_to_numpy=True)  # noqa: E731
+
+    result = asyncio.run(run_benchmark(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        texts_per_request=args.texts_per_request,
+        max_batch_size=args.max_batch_size,
+        max_latency_ms=args.max_latency_ms,
+        encoder=encoder,
+    ))
+    print(f"Unbatched: {result['unbatched_s']:.2f}s ({result['unbatched_rps']:.1f} req/s)")
+    print(f"Batched:   {result['batched_s']:.2f}s ({result['batched_rps']:.1f} req/s)")
+    print(f"Speedup:   {result['speedup']:.2f}x")
+    print(f"Avg batch: {result['batcher']['avg_batch_size']:.1f} texts")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,10 +14,15 @@ Endpoints:
 - GET /health - Health check
 - GET /stats - Service statistics
 
+Concurrent requests are coalesced by EmbeddingBatcher: texts are queued,
+batched (up to NSIC_EMBED_MAX_BATCH texts or NSIC_EMBED_MAX_LATENCY_MS of
+waiting) and encoded on a dedicated thread so the event loop never blocks.
+
 Usage:
     python -m src.nsic.servers.embeddings_server --port 8100
 """
 
+import asyncio
 import logging
 import os
 import sys
@@ -30,6 +35,12 @@ from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel, Field
 import uvicorn
 
+from .embedding_batcher import (
+    DEFAULT_MAX_BATCH_SIZE,
+    DEFAULT_MAX_LATENCY_MS,
+    EmbeddingBatcher,
+)
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -104,6 +115,7 @@ class StatsResponse(BaseModel):
     total_texts_encoded: int
     uptime_seconds: float
     gpu_memory_gb: float
+    batcher: dict = Field(default_factory=dict, description="Micro-batching queue metrics")
 
 
 # ============================================================================
@@ -111,6 +123,7 @@ class StatsResponse(BaseModel):
 # ============================================================================
 
 embedding_service = None
+batcher: Optional[EmbeddingBatcher] = None
 start_time = None
 
 
@@ -132,7 +145,7 @@ def get_gpu_memory():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Load embedding model at startup, keep in GPU memory."""
-    global embedding_service, start_time
+    global embedding_service, batcher, start_time
     
     logger.info("=" * 60)
     logger.info("NSIC EMBEDDINGS SERVER - STARTUP")
@@ -157,6 +170,14 @@ async def lifespan(app: FastAPI):
         logger.info(f"Embedding dimension: {embedding_service.embedding_dim}")
         logger.info("Running on CPU (GPU freed for DeepSeek instances)")
         
+        batcher = EmbeddingBatcher(
+            encode_fn=embedding_service.encode_uncached,
+            cache=embedding_service.cache,
+            max_batch_size=int(os.getenv("NSIC_EMBED_MAX_BATCH", DEFAULT_MAX_BATCH_SIZE)),
+            max_latency_ms=float(os.getenv("NSIC_EMBED_MAX_LATENCY_MS", DEFAULT_MAX_LATENCY_MS)),
+        )
+        await batcher.start()
+        
         start_time = time.time()
         
         logger.info("=" * 60)
@@ -171,6 +192,8 @@ async def lifespan(app: FastAPI):
     
     # Cleanup
     logger.info("Shutting down embeddings server...")
+    if batcher:
+        await batcher.stop()
     if embedding_service:
         embedding_service.close()
 
@@ -229,15 +252,19 @@ async def get_stats():
         raise HTTPException(status_code=503, detail="Service not initialized")
     
     uptime = time.time() - start_time if start_time else 0
+    # /embed goes through the batcher, which calls encode_uncached directly
+    # and so bypasses the service's own counters.
+    batcher_metrics = batcher.get_metrics() if batcher else {}
     
     return StatsResponse(
         model_name=embedding_service.model_name,
         device=str(embedding_service.device),
         embedding_dim=embedding_service.embedding_dim,
-        encode_calls=embedding_service._encode_calls,
-        total_texts_encoded=embedding_service._total_texts,
+        encode_calls=embedding_service._encode_calls + batcher_metrics.get("encode_calls", 0),
+        total_texts_encoded=embedding_service._total_texts + batcher_metrics.get("encoded_texts", 0),
         uptime_seconds=uptime,
         gpu_memory_gb=get_gpu_memory(),
+        batcher=batcher_metrics,
     )
 
 
@@ -253,26 +280,16 @@ async def embed_texts(request: EmbedRequest):
     Returns:
         List of embedding vectors
     """
-    global embedding_service
+    global embedding_service, batcher
     
-    if embedding_service is None:
+    if embedding_service is None or batcher is None:
         raise HTTPException(status_code=503, detail="Embedding service not initialized")
     
     start = time.time()
     
     try:
-        embeddings = embedding_service.encode(
-            texts=request.texts,
-            task=request.task,
-        )
-        
-        # Convert to list format
-        if isinstance(embeddings, np.ndarray):
-            if len(embeddings.shape) == 1:
-                embeddings = embeddings.reshape(1, -1)
-            embeddings_list = embeddings.tolist()
-        else:
-            embeddings_list = [embeddings.tolist()]
+        embeddings = await batcher.submit(request.texts, task=request.task)
+        embeddings_list = embeddings.tolist()
         
         latency = (time.time() - start) * 1000
         
@@ -283,6 +300,8 @@ async def embed_texts(request: EmbedRequest):
             latency_ms=latency,
         )
         
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Embedding queue full, retry later") from None
     except Exception as e:
         logger.error(f"Embedding error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -301,20 +320,24 @@ async def semantic_search(request: SearchRequest):
     Returns:
         Ranked search results with similarity scores
     """
-    global embedding_service
+    global embedding_service, batcher
     
-    if embedding_service is None:
+    if embedding_service is None or batcher is None:
         raise HTTPException(status_code=503, detail="Embedding service not initialized")
     
     start = time.time()
     
     try:
-        # Compute similarities
-        similarities = embedding_service.similarity(
-            query=request.query,
-            documents=request.documents,
+        # Query and documents use different instructions, so they are
+        # batched under separate tasks
+        query_embs, doc_embs = await asyncio.gather(
+            batcher.submit([request.query], task="query"),
+            batcher.submit(request.documents, task="document"),
         )
         
+        # Cosine similarity (embeddings are normalized)
+        similarities = np.dot(doc_embs, query_embs[0])
+        
         # Rank results
         indices = np.argsort(similarities)[::-1][:request.top_k]
         
@@ -335,6 +358,8 @@ async def semantic_search(request: SearchRequest):
             latency_ms=latency,
         )
         
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Embedding queue full, retry later") from None
     except Exception as e:
         logger.error(f"Search error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -352,19 +377,18 @@ async def compute_similarity(request: SimilarityRequest):
     Returns:
         Cosine similarity score
     """
-    global embedding_service
+    global embedding_service, batcher
     
-    if embedding_service is None:
+    if embedding_service is None or batcher is None:
         raise HTTPException(status_code=503, detail="Embedding service not initialized")
     
     start = time.time()
     
     try:
-        emb1 = embedding_service.encode(request.text1)
-        emb2 = embedding_service.encode(request.text2)
+        embs = await batcher.submit([request.text1, request.text2])
         
         # Cosine similarity (embeddings are normalized)
-        similarity = float(np.dot(emb1, emb2))
+        similarity = float(np.dot(embs[0], embs[1]))
         
         latency = (time.time() - start) * 1000
         
@@ -373,6 +397,8 @@ async def compute_similarity(request: SimilarityRequest):
             latency_ms=latency,
         )
         
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Embedding queue full, retry later") from None
     except Exception as e:
         logger.error(f"Similarity error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -390,9 +416,21 @@ def main():
     parser.add_argument("--host", default="0.0.0.0", help="Host to bind to")
     parser.add_argument("--port", type=int, default=8100, help="Port to listen on")
     parser.add_argument("--workers", type=int, default=1, help="Number of workers")
+    parser.add_argument(
+        "--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+        help="Maximum texts per batched encode call",
+    )
+    parser.add_argument(
+        "--max-latency-ms", type=float, default=DEFAULT_MAX_LATENCY_MS,
+        help="Maximum time to wait for a batch to fill",
+    )
     
     args = parser.parse_args()
     
+    # Passed via environment so uvicorn workers pick them up in lifespan
+    os.environ["NSIC_EMBED_MAX_BATCH"] = str(args.max_batch_size)
+    os.environ["NSIC_EMBED_MAX_LATENCY_MS"] = str(args.max_latency_ms)
+    
     logger.info(f"Starting Embeddings Server on {args.host}:{args.port}")
     
     uvicorn.run(
@@ -232,6 +232,10 @@ class LabourEconomistAgent:
         self.client = client
         self.query_id = query_id or self.DEFAULT_QUERY_ID
 
+    def declared_queries(self) -> list[str]:
+        """Query ids run() reads, so the council can prefetch them."""
+        return [self.query_id]
+
     def _numeric(self, value: Any) -> float | None:
         if isinstance(value, (int, float)):
             return float(value)
@@ -476,6 +476,10 @@ class NationalStrategyAgent:
         self._verify_response(report, [qat_res, derived])
         return report
 
+    def declared_queries(self) -> list[str]:
+        """Query ids run() reads, so the council can prefetch them."""
+        return ["syn_employment_share_by_gender_latest", "syn_unemployment_gcc_latest"]
+
     def run(self) -> AgentReport:
         """
         Execute legacy strategic snapshot analysis.
@@ -485,7 +489,7 @@ class NationalStrategyAgent:
         Returns:
             AgentReport with integrated employment and GCC unemployment metrics
         """
-        queries = ["syn_employment_share_by_gender_latest", "syn_unemployment_gcc_latest"]
+        queries = self.declared_queries()
         logger.info("run strategic_snapshot queries=%s", queries)
         # Use both queries deterministically
         emp = self.client.run(queries[0])
@@ -586,6 +586,10 @@ class PatternDetectiveAgent:
         self._verify_response(report, [res, derived])
         return report
 
+    def declared_queries(self) -> list[str]:
+        """Query ids run() reads, so the council can prefetch them."""
+        return ["syn_employment_share_by_gender_latest"]
+
     def run(self) -> AgentReport:
         """
         Execute legacy data consistency validation.
@@ -595,7 +599,7 @@ class PatternDetectiveAgent:
         Returns:
             AgentReport with consistency findings and warnings for anomalies
         """
-        employment_query = "syn_employment_share_by_gender_latest"
+        employment_query = self.declared_queries()[0]
         logger.info("run legacy_consistency queries=%s", [employment_query])
         res = self.client.run(employment_query)
         warnings = list(res.warnings)
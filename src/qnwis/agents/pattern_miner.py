@@ -168,6 +168,7 @@ class PatternMinerAgent:
                     "cohort": f.cohort,
                     "n": f.n,
                     "seasonally_adjusted": f.seasonally_adjusted,
+                    "q_value": f.q_value,
                     "composite_score": abs(f.effect) * f.support * f.stability,
                 }
                 for f in findings
@@ -367,6 +368,7 @@ class PatternMinerAgent:
                     "stability": f.stability,
                     "n": f.n,
                     "seasonally_adjusted": f.seasonally_adjusted,
+                    "q_value": f.q_value,
                     "composite_score": abs(f.effect) * f.support * f.stability,
                 }
                 for f in findings
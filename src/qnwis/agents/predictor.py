@@ -15,7 +15,7 @@ from typing import Any
 
 from ..analysis.change_points import cusum_breaks
 from ..data.deterministic.models import QueryResult
-from ..forecast.backtest import choose_baseline, rolling_origin_backtest
+from ..forecast.backtest import backtest_baselines, choose_baseline, rolling_origin_backtest
 from ..forecast.baselines import (
     build_forecast_table,
     clamp_nonnegative,
@@ -26,7 +26,13 @@ from ..forecast.baselines import (
     rolling_mean_forecast,
     seasonal_naive,
 )
-from ..forecast.early_warning import band_breach, risk_score, slope_reversal, volatility_spike
+from ..forecast.early_warning import (
+    backtest_band_breaches,
+    band_breach,
+    risk_score,
+    slope_reversal,
+    volatility_spike,
+)
 from .base import DataClient
 from .utils.derived_results import make_derived_query_result
 
@@ -311,8 +317,8 @@ class PredictorAgent:
         # Generate forecast
         forecast = method_func(train_series, horizon=horizon_months, **method_params)
 
-        # Backtest to compute intervals
-        backtest_metrics = rolling_origin_backtest(
+        # Backtest metrics: already computed for every candidate during selection
+        backtest_metrics = selection.leaderboard.get(method_name) or rolling_origin_backtest(
             train_series,
             method_func,
             horizon=1,
@@ -543,6 +549,11 @@ class PredictorAgent:
             "volatility_spike": 0.2,
         }
         risk_value = risk_score(flags, weights)
+        breach_history = (
+            backtest_band_breaches(selection.backtest, method_name, half_width)
+            if selection.backtest is not None
+            else {"breaches": 0, "n": 0, "breach_rate": float("nan")}
+        )
 
         derived_warning = make_derived_query_result(
             operation="early_warning",
@@ -563,6 +574,7 @@ class PredictorAgent:
                     "actual": actual_latest,
                     "forecast": yhat_latest,
                     "half_width": half_width,
+                    "backtest_breach_rate": breach_history["breach_rate"],
                 }
             ],
             sources=[res.query_id],
@@ -753,16 +765,18 @@ class PredictorAgent:
         backtest_rows: list[dict[str, float]] = []
         forecast_rows: list[dict[str, float]] = []
 
+        # One pass over the history for all compared methods
+        backtest = backtest_baselines(
+            series,
+            {name: method_map[name] for name in selected_methods},
+            horizon=1,
+            min_train=self.min_train_points,
+        )
+
         for method_name in selected_methods:
             method_func, method_params = method_map[method_name]
             forecast_values = method_func(series, horizon=horizon_months, **method_params)
-            backtest_metrics = rolling_origin_backtest(
-                series,
-                method_func,
-                horizon=1,
-                min_train=self.min_train_points,
-                **method_params,
-            )
+            backtest_metrics = backtest.metrics(method_name)
             results[method_name] = {
                 "forecast": forecast_values,
                 "backtest": backtest_metrics,
@@ -3,15 +3,23 @@ Deterministic alert evaluation engine.
 
 Implements threshold, yoy_delta_pct, slope_window, and break_event triggers.
 Re-uses CUSUM from analysis.change_points module.
+
+Batches can share fetches: rules are planned into groups that read the same
+(metric, scope, window) series, each series is fetched once, and each group's
+triggers are evaluated together.
 """
 
 from __future__ import annotations
 
 import logging
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
+import numpy as np
+
 from ..analysis.change_points import cusum_breaks
 from ..analysis.trend_utils import window_slopes, yoy
 from .rules import AlertRule, TriggerOperator, TriggerType
@@ -56,12 +64,23 @@ class AlertEngine:
             TriggerType.BREAK_EVENT: self._eval_break_event,
             TriggerType.BURN_RATE: self._eval_burn_rate,
         }
+        # Vectorized evaluators for rules sharing one series; returning None
+        # defers the group to the per-rule evaluators above.
+        self._group_evaluators = {
+            TriggerType.THRESHOLD: self._group_threshold,
+            TriggerType.YOY_DELTA_PCT: self._group_yoy_delta_pct,
+            TriggerType.SLOPE_WINDOW: self._group_slope_window,
+            TriggerType.BREAK_EVENT: self._group_break_event,
+        }
+        self.last_batch_stats = BatchStats()
 
     def evaluate(
         self,
         rule: AlertRule,
         series: list[float],
         timestamps: list[str] | None = None,
+        *,
+        clamp_rates: bool = True,
     ) -> AlertDecision:
         """
         Evaluate an alert rule against time-series data.
@@ -70,6 +89,7 @@ class AlertEngine:
             rule: Alert rule specification
             series: Time-series values (most recent last)
             timestamps: Optional ISO timestamps corresponding to series
+            clamp_rates: Clamp rate metrics to [0, 1]
 
         Returns:
             AlertDecision with triggered flag and evidence
@@ -93,7 +113,7 @@ class AlertEngine:
             )
 
         # Clamp rates if applicable
-        if rule.is_rate_metric():
+        if clamp_rates and rule.is_rate_metric():
             series = [rule.clamp_rate(v) for v in series]
 
         evaluator = self._evaluators.get(rule.trigger.type)
@@ -390,41 +410,368 @@ class AlertEngine:
         self,
         rules: list[AlertRule],
         data_provider: Any,
+        *,
+        shared_fetch: bool = False,
+        max_workers: int | None = None,
+        clamp_rates: bool = True,
     ) -> list[AlertDecision]:
         """
         Evaluate multiple rules in batch.
 
+        With ``shared_fetch=True`` rules are planned into groups by
+        (metric, scope, window) (see :func:`plan_rule_groups`): the provider is
+        called once per group with the group's first rule, independent groups
+        are fetched concurrently, and each group's triggers are evaluated
+        together with NumPy. Only use it when the provider's result depends on
+        nothing but the rule's metric, scope and window. Decisions are
+        identical to the per-rule path.
+
         Args:
             rules: List of alert rules to evaluate
             data_provider: Callable that returns (series, timestamps) for a rule
+            shared_fetch: Fetch each (metric, scope, window) series once
+            max_workers: Concurrent group fetches (default: up to 8)
+            clamp_rates: Clamp rate metrics to [0, 1] (False for values in percent)
 
         Returns:
             List of AlertDecisions in same order as rules
         """
+        if shared_fetch:
+            return self._batch_evaluate_grouped(rules, data_provider, max_workers, clamp_rates)
+
+        started = time.perf_counter()
         decisions = []
         for rule in rules:
             if not rule.enabled:
-                decisions.append(
-                    AlertDecision(
-                        rule_id=rule.rule_id,
-                        triggered=False,
-                        message="Rule disabled",
-                    )
-                )
+                decisions.append(_disabled_decision(rule))
                 continue
 
             try:
                 series, timestamps = data_provider(rule)
-                decision = self.evaluate(rule, series, timestamps)
+                decision = self.evaluate(rule, series, timestamps, clamp_rates=clamp_rates)
                 decisions.append(decision)
             except Exception as e:
-                logger.error(f"Error evaluating rule {rule.rule_id}: {e}")
-                decisions.append(
-                    AlertDecision(
-                        rule_id=rule.rule_id,
-                        triggered=False,
-                        message=f"Evaluation error: {e}",
+                decisions.append(_error_decision(rule, e))
+
+        enabled = sum(1 for rule in rules if rule.enabled)
+        self.last_batch_stats = BatchStats(
+            rules=enabled,
+            groups=enabled,
+            fetches=enabled,
+            eval_seconds=time.perf_counter() - started,
+        )
+        return decisions
+
+    def _batch_evaluate_grouped(
+        self,
+        rules: list[AlertRule],
+        data_provider: Any,
+        max_workers: int | None,
+        clamp_rates: bool,
+    ) -> list[AlertDecision]:
+        """Shared-fetch batch: one provider call and one vectorized pass per group."""
+        decisions: list[AlertDecision | None] = [
+            None if rule.enabled else _disabled_decision(rule) for rule in rules
+        ]
+        groups = list(plan_rule_groups(rules).values())
+        stats = BatchStats(rules=sum(len(g) for g in groups), groups=len(groups))
+
+        def fetch(indices: list[int]) -> tuple[Any, Exception | None]:
+            try:
+                return data_provider(rules[indices[0]]), None
+            except Exception as exc:
+                return None, exc
+
+        started = time.perf_counter()
+        workers = min(max_workers or DEFAULT_FETCH_WORKERS, len(groups))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="alert-fetch") as pool:
+                fetched = list(pool.map(fetch, groups))
+        else:
+            fetched = [fetch(indices) for indices in groups]
+        stats.fetches = len(groups)
+        stats.fetch_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for indices, (data, error) in zip(groups, fetched, strict=True):
+            group_rules = [rules[i] for i in indices]
+            if error is not None:
+                results = [_error_decision(rule, error) for rule in group_rules]
+            else:
+                try:
+                    series, timestamps = data
+                    results = self.evaluate_group(
+                        group_rules, series, timestamps, clamp_rates=clamp_rates
                     )
-                )
+                except Exception as e:
+                    results = [_error_decision(rule, e) for rule in group_rules]
+            for i, decision in zip(indices, results, strict=True):
+                decisions[i] = decision
+        stats.eval_seconds = time.perf_counter() - started
 
+        self.last_batch_stats = stats
+        return [d for d in decisions if d is not None]
+
+    def evaluate_group(
+        self,
+        rules: list[AlertRule],
+        series: list[float],
+        timestamps: list[str] | None = None,
+        *,
+        clamp_rates: bool = True,
+    ) -> list[AlertDecision]:
+        """
+        Evaluate rules that share one series (same metric, scope and window).
+
+        Guards and rate clamping run once for the group; threshold, YoY and
+        slope comparisons run as one NumPy pass per trigger type, CUSUM once
+        per distinct ``h``. Cases the vectorized path does not model fall back
+        to :meth:`evaluate`, so decisions match per-rule evaluation exactly.
+
+        Args:
+            rules: Rules to evaluate (all against ``series``)
+            series: Time-series values (most recent last)
+            timestamps: Optional ISO timestamps corresponding to series
+            clamp_rates: Clamp rate metrics to [0, 1]
+
+        Returns:
+            AlertDecisions in the order of ``rules``
+        """
+        timestamps = timestamps or []
+        if not rules:
+            return []
+        if not series or any(math.isnan(v) or math.isinf(v) for v in series):
+            return [self._evaluate_safely(rule, series, timestamps, clamp_rates) for rule in rules]
+
+        values = list(series)
+        if clamp_rates and rules[0].is_rate_metric():
+            values = [rules[0].clamp_rate(v) for v in values]
+
+        by_type: dict[TriggerType, list[int]] = {}
+        for i, rule in enumerate(rules):
+            by_type.setdefault(rule.trigger.type, []).append(i)
+
+        decisions: list[AlertDecision | None] = [None] * len(rules)
+        for trigger_type, indices in by_type.items():
+            members = [rules[i] for i in indices]
+            group_eval = self._group_evaluators.get(trigger_type)
+            try:
+                results = group_eval(members, values) if group_eval else None
+            except Exception:
+                logger.debug("Vectorized %s evaluation failed; using per-rule path", trigger_type)
+                results = None
+            if results is None:
+                results = [
+                    self._evaluate_safely(rule, series, timestamps, clamp_rates)
+                    for rule in members
+                ]
+            for i, decision in zip(indices, results, strict=True):
+                decisions[i] = decision
+        return [d for d in decisions if d is not None]
+
+    def _evaluate_safely(
+        self,
+        rule: AlertRule,
+        series: list[float],
+        timestamps: list[str],
+        clamp_rates: bool,
+    ) -> AlertDecision:
+        try:
+            return self.evaluate(rule, series, timestamps, clamp_rates=clamp_rates)
+        except Exception as e:
+            return _error_decision(rule, e)
+
+    def _group_threshold(
+        self, rules: list[AlertRule], series: list[float]
+    ) -> list[AlertDecision]:
+        current_value = series[-1]
+        ops = [rule.trigger.op for rule in rules]
+        triggered = _compare_many(current_value, rules, ops, allow_eq=True)
+        return [
+            AlertDecision(
+                rule_id=rule.rule_id,
+                triggered=bool(hit),
+                evidence={
+                    "current_value": current_value,
+                    "threshold": rule.trigger.value,
+                    "operator": op.value if op else None,
+                },
+                message=(
+                    f"Current value {current_value:.4f} "
+                    f"{op.value if op else 'cmp'} threshold {rule.trigger.value:.4f}"
+                ),
+            )
+            for rule, op, hit in zip(rules, ops, triggered, strict=True)
+        ]
+
+    def _group_yoy_delta_pct(
+        self, rules: list[AlertRule], series: list[float]
+    ) -> list[AlertDecision] | None:
+        if len(series) < 13:
+            return None
+        latest_yoy = yoy(series)[-1]
+        if latest_yoy is None:
+            return None  # per-rule path reports the comparison error
+        ops = [rule.trigger.op or TriggerOperator.LTE for rule in rules]
+        triggered = _compare_many(latest_yoy, rules, ops)
+        return [
+            AlertDecision(
+                rule_id=rule.rule_id,
+                triggered=bool(hit),
+                evidence={
+                    "yoy_delta_pct": latest_yoy,
+                    "threshold": rule.trigger.value,
+                    "operator": op.value,
+                },
+                message=(
+                    f"YoY delta {latest_yoy:.2f}% "
+                    f"{op.value} threshold {rule.trigger.value:.2f}%"
+                ),
+            )
+            for rule, op, hit in zip(rules, ops, triggered, strict=True)
+        ]
+
+    def _group_slope_window(
+        self, rules: list[AlertRule], series: list[float]
+    ) -> list[AlertDecision] | None:
+        window_size = rules[0].window.months
+        if len(series) < window_size:
+            return None
+        slope_entries = window_slopes(series, windows=(window_size,))
+        if not slope_entries or slope_entries[-1][1] is None:
+            return None
+        latest_slope = slope_entries[-1][1]
+        ops = [rule.trigger.op or TriggerOperator.LT for rule in rules]
+        triggered = _compare_many(latest_slope, rules, ops)
+        return [
+            AlertDecision(
+                rule_id=rule.rule_id,
+                triggered=bool(hit),
+                evidence={
+                    "slope": latest_slope,
+                    "window_months": window_size,
+                    "threshold": rule.trigger.value,
+                    "operator": op.value,
+                },
+                message=(
+                    f"Slope {latest_slope:.4f} over {window_size} months "
+                    f"{op.value} threshold {rule.trigger.value:.4f}"
+                ),
+            )
+            for rule, op, hit in zip(rules, ops, triggered, strict=True)
+        ]
+
+    def _group_break_event(
+        self, rules: list[AlertRule], series: list[float]
+    ) -> list[AlertDecision] | None:
+        window_size = rules[0].window.months
+        if len(series) < window_size:
+            return None
+        recent_series = series[-window_size:]
+        breaks_by_h: dict[float, list[int]] = {}
+        decisions = []
+        for rule in rules:
+            h_threshold = abs(rule.trigger.value)
+            if h_threshold not in breaks_by_h:
+                breaks_by_h[h_threshold] = cusum_breaks(recent_series, k=0.25, h=h_threshold)
+            breaks = breaks_by_h[h_threshold]
+            triggered = len(breaks) > 0
+            decisions.append(
+                AlertDecision(
+                    rule_id=rule.rule_id,
+                    triggered=triggered,
+                    evidence={
+                        "break_count": len(breaks),
+                        "break_indices": list(breaks),
+                        "window_months": window_size,
+                        "cusum_h": h_threshold,
+                    },
+                    message=(
+                        f"{'Detected' if triggered else 'No'} structural break "
+                        f"in recent {window_size} months (CUSUM h={h_threshold:.1f})"
+                    ),
+                )
+            )
         return decisions
+
+
+GroupKey = tuple[str, str, "str | None", int]
+
+DEFAULT_FETCH_WORKERS = 8
+
+_OP_CODES = {
+    TriggerOperator.LT: 0,
+    TriggerOperator.LTE: 1,
+    TriggerOperator.GT: 2,
+    TriggerOperator.GTE: 3,
+    TriggerOperator.EQ: 4,
+}
+
+
+@dataclass
+class BatchStats:
+    """Fetch and evaluation accounting for the last ``batch_evaluate`` call."""
+
+    rules: int = 0
+    groups: int = 0
+    fetches: int = 0
+    fetch_seconds: float = 0.0
+    eval_seconds: float = 0.0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """Enabled rules served per provider call."""
+        return self.rules / self.fetches if self.fetches else 0.0
+
+
+def rule_group_key(rule: AlertRule) -> GroupKey:
+    """Series identity of a rule: (metric, scope level, scope code, window months)."""
+    return (rule.metric, rule.scope.level, rule.scope.code, rule.window.months)
+
+
+def plan_rule_groups(rules: list[AlertRule]) -> dict[GroupKey, list[int]]:
+    """
+    Group enabled rules that read the same series.
+
+    Returns:
+        Map of group key to rule indices, in order of first appearance
+    """
+    groups: dict[GroupKey, list[int]] = {}
+    for i, rule in enumerate(rules):
+        if rule.enabled:
+            groups.setdefault(rule_group_key(rule), []).append(i)
+    return groups
+
+
+def _compare_many(
+    value: float,
+    rules: list[AlertRule],
+    ops: list[TriggerOperator | None],
+    allow_eq: bool = False,
+) -> np.ndarray:
+    """Compare one value against every rule's threshold with its operator."""
+    thresholds = np.array([rule.trigger.value for rule in rules], dtype=float)
+    codes = np.array([_OP_CODES.get(op, -1) for op in ops])
+    choices = [value < thresholds, value <= thresholds, value > thresholds, value >= thresholds]
+    conditions = [codes == 0, codes == 1, codes == 2, codes == 3]
+    if allow_eq:
+        conditions.append(codes == 4)
+        choices.append(np.abs(value - thresholds) < 1e-9)
+    return np.select(conditions, choices, default=False)
+
+
+def _disabled_decision(rule: AlertRule) -> AlertDecision:
+    return AlertDecision(
+        rule_id=rule.rule_id,
+        triggered=False,
+        message="Rule disabled",
+    )
+
+
+def _error_decision(rule: AlertRule, error: Exception) -> AlertDecision:
+    logger.error(f"Error evaluating rule {rule.rule_id}: {error}")
+    return AlertDecision(
+        rule_id=rule.rule_id,
+        triggered=False,
+        message=f"Evaluation error: {error}",
+    )
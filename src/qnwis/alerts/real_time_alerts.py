@@ -2,11 +2,25 @@
 Real-time Alerting System for QNWIS (M4).
 
 Monitors key workforce metrics and sends alerts when thresholds are breached.
+Thresholds are compiled into ``AlertRule`` threshold triggers and checked
+through ``AlertEngine.batch_evaluate``, so a batch of readings is one
+shared-fetch, vectorized pass.
 """
 
 import logging
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Union
+
+from .engine import AlertEngine
+from .rules import (
+    AlertRule,
+    ScopeConfig,
+    Severity,
+    TriggerConfig,
+    TriggerOperator,
+    TriggerType,
+    WindowConfig,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -71,6 +85,8 @@ class RealTimeAlertSystem:
         self.thresholds: Dict[str, Dict[str, float]] = {}
         self.alert_handlers: List[Callable[[Alert], None]] = []
         self.active_alerts: List[Alert] = []
+        self.engine = AlertEngine()
+        self._rules: Dict[str, List[AlertRule]] = {}
         logger.info("RealTimeAlertSystem initialized")
     
     def set_threshold(
@@ -91,6 +107,14 @@ class RealTimeAlertSystem:
             "min": min_value,
             "max": max_value
         }
+        self._rules[metric_name] = [
+            _threshold_rule(metric_name, bound, op, value)
+            for bound, op, value in (
+                ("min", TriggerOperator.LT, min_value),
+                ("max", TriggerOperator.GT, max_value),
+            )
+            if value is not None
+        ]
         logger.info(f"Threshold set for {metric_name}: min={min_value}, max={max_value}")
     
     def add_alert_handler(self, handler: Callable[[Alert], None]) -> None:
@@ -118,39 +142,83 @@ class RealTimeAlertSystem:
         Returns:
             Alert if threshold breached, None otherwise
         """
-        if metric_name not in self.thresholds:
-            return None
-        
-        threshold = self.thresholds[metric_name]
-        min_val = threshold.get("min")
-        max_val = threshold.get("max")
+        alerts = self.check_metrics({metric_name: current_value})
+        return alerts[0] if alerts else None
+    
+    def check_metrics(
+        self,
+        readings: Mapping[str, Union[float, Sequence[float]]]
+    ) -> List[Alert]:
+        """
+        Check many metrics against their thresholds in one engine batch.
         
-        alert = None
+        Each metric's reading (a value, or a series whose last value is
+        current) is fetched once for its min and max rules. The minimum
+        bound takes precedence when both are breached.
         
-        if min_val is not None and current_value < min_val:
-            alert = Alert(
-                alert_id=f"{metric_name}_{int(datetime.now().timestamp())}",
-                metric_name=metric_name,
-                threshold_value=min_val,
-                current_value=current_value,
-                severity="high",
-                message=f"{metric_name} fell below minimum threshold: {current_value} < {min_val}"
-            )
+        Args:
+            readings: Metric name -> current value or recent series
+            
+        Returns:
+            Alerts raised, in the order of ``readings``
+        """
+        series: Dict[str, List[float]] = {}
+        rules: List[AlertRule] = []
+        for metric_name, reading in readings.items():
+            if metric_name not in self._rules:
+                continue
+            if isinstance(reading, Sequence):
+                series[metric_name] = list(reading)
+            else:
+                series[metric_name] = [reading]
+            rules.extend(self._rules[metric_name])
+        if not rules:
+            return []
         
-        elif max_val is not None and current_value > max_val:
-            alert = Alert(
-                alert_id=f"{metric_name}_{int(datetime.now().timestamp())}",
-                metric_name=metric_name,
-                threshold_value=max_val,
-                current_value=current_value,
-                severity="high",
-                message=f"{metric_name} exceeded maximum threshold: {current_value} > {max_val}"
-            )
+        # Rule ids are "<metric>:<bound>"; map back to the unnormalized name
+        bounds = {
+            rule.rule_id: (metric_name, rule.rule_id.rsplit(":", 1)[1])
+            for metric_name in series
+            for rule in self._rules[metric_name]
+        }
+        decisions = self.engine.batch_evaluate(
+            rules,
+            lambda rule: (series[bounds[rule.rule_id][0]], None),
+            shared_fetch=True,
+            clamp_rates=False,  # thresholds here are in percent
+        )
+        breached = {bounds[d.rule_id] for d in decisions if d.triggered}
         
-        if alert:
-            self._trigger_alert(alert)
+        alerts = []
+        for metric_name, values in series.items():
+            current_value = values[-1]
+            threshold = self.thresholds[metric_name]
+            alert = None
+            if (metric_name, "min") in breached:
+                min_val = threshold["min"]
+                alert = Alert(
+                    alert_id=f"{metric_name}_{int(datetime.now().timestamp())}",
+                    metric_name=metric_name,
+                    threshold_value=min_val,
+                    current_value=current_value,
+                    severity="high",
+                    message=f"{metric_name} fell below minimum threshold: {current_value} < {min_val}"
+                )
+            elif (metric_name, "max") in breached:
+                max_val = threshold["max"]
+                alert = Alert(
+                    alert_id=f"{metric_name}_{int(datetime.now().timestamp())}",
+                    metric_name=metric_name,
+                    threshold_value=max_val,
+                    current_value=current_value,
+                    severity="high",
+                    message=f"{metric_name} exceeded maximum threshold: {current_value} > {max_val}"
+                )
+            if alert:
+                self._trigger_alert(alert)
+                alerts.append(alert)
         
-        return alert
+        return alerts
     
     def _trigger_alert(self, alert: Alert) -> None:
         """
@@ -191,6 +259,24 @@ class RealTimeAlertSystem:
         return False
 
 
+def _threshold_rule(
+    metric_name: str,
+    bound: str,
+    op: TriggerOperator,
+    value: float
+) -> AlertRule:
+    """Threshold rule for one bound of a real-time metric."""
+    return AlertRule(
+        rule_id=f"{metric_name}:{bound}",
+        metric=metric_name,
+        scope=ScopeConfig(level="national"),
+        window=WindowConfig(months=3),
+        trigger=TriggerConfig(type=TriggerType.THRESHOLD, op=op, value=value),
+        horizon=1,
+        severity=Severity.HIGH,
+    )
+
+
 # Predefined alert thresholds for Qatar
 QATAR_ALERT_THRESHOLDS = {
     "unemployment_rate": {"min": None, "max": 5.0},  # Alert if > 5%
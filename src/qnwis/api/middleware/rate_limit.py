@@ -14,9 +14,9 @@ Features:
 from __future__ import annotations
 
 import logging
+import math
 import time
-from collections import defaultdict
-from typing import Callable, Optional
+from typing import Optional
 
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
@@ -24,6 +24,8 @@ from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from ...utils.rate_limit_core import Limit, RateLimitCore
+
 logger = logging.getLogger(__name__)
 
 
@@ -69,7 +71,9 @@ class RedisRateLimiter:
     Redis-backed rate limiter for distributed deployments.
     
     Use this when running multiple QNWIS instances behind a load balancer.
-    Provides centralized rate limiting across all instances.
+    Provides centralized rate limiting across all instances: one atomic
+    script call per check on an async connection pool (shared GCRA core),
+    with in-memory limits while Redis is unreachable.
     """
     
     def __init__(self, redis_url: str = "redis://localhost:6379/0"):
@@ -79,20 +83,14 @@ class RedisRateLimiter:
         Args:
             redis_url: Redis connection URL
         """
-        try:
-            import redis
-            self.redis_client = redis.from_url(redis_url, decode_responses=True)
-            self.enabled = True
+        self.core = RateLimitCore.from_url(redis_url, prefix="rate_limit")
+        self.enabled = self.core.distributed
+        if self.enabled:
             logger.info(f"Redis rate limiter initialized: {redis_url}")
-        except ImportError:
-            logger.warning(
-                "redis package not installed. "
-                "Install with: pip install redis"
-            )
-            self.enabled = False
-        except Exception as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            self.enabled = False
+    
+    @staticmethod
+    def _limits(limit: int, window_seconds: int) -> tuple[Limit]:
+        return (Limit.per("window", limit, window_seconds),)
     
     async def check_limit(
         self,
@@ -111,40 +109,9 @@ class RedisRateLimiter:
         Returns:
             Tuple of (is_allowed, current_count, retry_after_seconds)
         """
-        if not self.enabled:
-            return True, 0, 0
-        
-        try:
-            # Use Redis key with window timestamp
-            window_key = f"rate_limit:{key}:{int(time.time() // window_seconds)}"
-            
-            # Get current count
-            current = self.redis_client.get(window_key)
-            
-            if current is None:
-                # First request in window
-                pipe = self.redis_client.pipeline()
-                pipe.set(window_key, 1)
-                pipe.expire(window_key, window_seconds)
-                pipe.execute()
-                return True, 1, 0
-            
-            current_count = int(current)
-            
-            if current_count >= limit:
-                # Rate limit exceeded
-                ttl = self.redis_client.ttl(window_key)
-                retry_after = max(ttl, 0)
-                return False, current_count, retry_after
-            
-            # Increment counter
-            new_count = self.redis_client.incr(window_key)
-            return True, new_count, 0
-            
-        except Exception as e:
-            logger.error(f"Redis rate limit check failed: {e}")
-            # Fail open: allow request if Redis is down
-            return True, 0, 0
+        decision = await self.core.acquire(key, self._limits(limit, window_seconds))
+        current_count = limit - decision.remaining[0]
+        return decision.allowed, current_count, math.ceil(decision.retry_after)
     
     async def reset_limit(self, key: str) -> None:
         """
@@ -153,18 +120,8 @@ class RedisRateLimiter:
         Args:
             key: Rate limit key to reset
         """
-        if not self.enabled:
-            return
-        
-        try:
-            # Delete all keys matching pattern
-            pattern = f"rate_limit:{key}:*"
-            keys = self.redis_client.keys(pattern)
-            if keys:
-                self.redis_client.delete(*keys)
-                logger.info(f"Reset rate limit for key: {key}")
-        except Exception as e:
-            logger.error(f"Failed to reset rate limit: {e}")
+        await self.core.reset(key, self._limits(1, 1))  # keys depend on limit names only
+        logger.info(f"Reset rate limit for key: {key}")
 
 
 def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded) -> Response:
@@ -23,6 +23,7 @@ from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_valida
 from ...agents.base import AgentReport, DataClient
 from ...classification.classifier import Classifier
 from ...llm.client import LLMClient
+from ...ops_console.sse import SSEBroadcastHub
 from ...orchestration.streaming import run_workflow_stream
 from ..models import StreamEventResponse
 from ..middleware.rate_limit import limiter
@@ -35,6 +36,14 @@ logger.info(f"🔍 run_workflow_stream source file: {inspect.getfile(run_workflo
 logger.info(f"🔍 run_workflow_stream module: {run_workflow_stream.__module__}")
 router = APIRouter(tags=["council-llm"])
 STREAM_TIMEOUT_SECONDS = 7200  # 2 hours - allows full E2E runs
+STREAM_BUFFER_SIZE = 4096  # pending frames per client before the oldest are dropped
+RESUME_GRACE_SECONDS = 30.0  # how long a run outlives its last subscriber, for reconnects
+
+# One hub for every council run: a channel per request_id, shared heartbeat,
+# replay log for reconnects.
+_STREAM_HUB = SSEBroadcastHub(heartbeat_interval=15, replay_size=512, max_channels=256)
+# Workflow producer task per live channel.
+_PRODUCERS: dict[str, asyncio.Task[None]] = {}
 
 try:
     _async_timeout = asyncio.timeout  # Python 3.11+
@@ -179,8 +188,114 @@ def _error_detail(request_id: str) -> CouncilErrorResponse:
     )
 
 
-def _serialize_sse(event: StreamEventResponse) -> str:
-    return f"data: {event.model_dump_json(exclude_none=True)}\n\n"
+def _publish_sse(channel: str, event: StreamEventResponse, *, name: str | None = None) -> None:
+    _STREAM_HUB.publish_data(
+        event.model_dump_json(exclude_none=True), event=name, channel=channel
+    )
+
+
+def _release_channel(channel: str) -> None:
+    """
+    Cancel a channel's workflow once nobody has followed it for a grace period.
+
+    Called when a subscriber goes away. The check is deferred by
+    ``RESUME_GRACE_SECONDS`` so a dropped client can re-attach via
+    ``GET /council/stream/{request_id}`` and still get the full run.
+    """
+    producer = _PRODUCERS.get(channel)
+    if producer is None or producer.done() or _STREAM_HUB.subscriber_count(channel):
+        return
+
+    def _cancel_if_abandoned() -> None:
+        if not producer.done() and not _STREAM_HUB.subscriber_count(channel):
+            logger.info("No subscriber re-attached to %s; cancelling workflow", channel)
+            producer.cancel()
+
+    producer.get_loop().call_later(RESUME_GRACE_SECONDS, _cancel_if_abandoned)
+
+
+async def _pump_workflow(
+    channel: str,
+    req: CouncilRequest,
+    data_client: DataClient,
+    llm_client: LLMClient,
+    classifier: Classifier,
+    request_id: str,
+) -> None:
+    """Run the workflow and publish each stage event to the run's hub channel."""
+    logger.info(f"🎬 workflow pump STARTED for question: {req.question[:50]}")
+    heartbeat = StreamEventResponse.heartbeat()
+    heartbeat.timestamp = datetime.now(timezone.utc).isoformat()
+    _publish_sse(channel, heartbeat, name="heartbeat")
+
+    logger.info(f"🔄 About to call run_workflow_stream from streaming.py (debate_depth={req.debate_depth})")
+    try:
+        async with _async_timeout(STREAM_TIMEOUT_SECONDS):
+            async for event in run_workflow_stream(
+                question=req.question,
+                data_client=data_client,
+                llm_client=llm_client,
+                classifier=classifier,
+                debate_depth=req.debate_depth,  # User-selected debate depth
+            ):
+                logger.info(f"📥 Received event from run_workflow_stream: {event.stage}")
+                try:
+                    # Clean payload - remove non-serializable objects like callbacks
+                    clean_payload = event.payload.copy() if event.payload else {}
+                    clean_payload.pop("event_callback", None)
+
+                    envelope = StreamEventResponse(
+                        stage=event.stage,
+                        status=event.status,
+                        payload=clean_payload,
+                        latency_ms=event.latency_ms,
+                        timestamp=getattr(event, "timestamp", None),
+                    )
+                except ValidationError as exc:
+                    logger.warning(
+                        "Invalid workflow event structure (stage=%s)", event.stage, exc_info=True
+                    )
+                    envelope = StreamEventResponse(
+                        stage=event.stage or "unknown",
+                        status="error",
+                        payload={
+                            "error": "invalid_event_payload",
+                            "details": exc.errors(),
+                        },
+                        message="Workflow emitted malformed event payload.",
+                    )
+                _publish_sse(channel, envelope)
+                await asyncio.sleep(0)
+
+                # Check if this is the final "done" event
+                if event.stage == "done" and event.status == "complete":
+                    logger.info(f"Workflow complete, closing SSE stream (request_id={request_id})")
+                    return
+
+    except asyncio.TimeoutError:
+        timeout_event = StreamEventResponse(
+            stage="timeout",
+            status="error",
+            payload={"error": "workflow_timeout"},
+            message=f"Workflow exceeded {STREAM_TIMEOUT_SECONDS}s timeout window.",
+        )
+        _publish_sse(channel, timeout_event)
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        logger.exception(
+            "council_stream_llm emitted internal error mid-stream (request_id=%s)",
+            request_id,
+        )
+        failure_event = StreamEventResponse(
+            stage="internal_error",
+            status="error",
+            payload={"error": "internal_server_error"},
+            message="LLM council execution failed mid-stream.",
+        )
+        _publish_sse(channel, failure_event)
+    finally:
+        _STREAM_HUB.close_channel(channel)
 
 
 @router.options("/council/stream")
@@ -221,6 +336,10 @@ async def council_stream_llm(
     Deploy behind an API gateway or reverse proxy that enforces rate limiting.
     SSE buffering is disabled via `X-Accel-Buffering: no` for compatibility
     with Traefik and Nginx streaming setups.
+
+    Events are published to a per-run channel on the shared SSE hub; a dropped
+    client can resume via `GET /council/stream/{request_id}` with
+    `Last-Event-ID`.
     """
 
     request_id = uuid4().hex
@@ -233,77 +352,23 @@ async def council_stream_llm(
         llm_client = LLMClient(provider=provider, model=req.model)
         classifier = Classifier()
 
-        async def event_generator() -> AsyncIterator[str]:
-            logger.info(f"🎬 event_generator STARTED for question: {req.question[:50]}")
-            heartbeat = StreamEventResponse.heartbeat()
-            heartbeat.timestamp = datetime.now(timezone.utc).isoformat()
-            yield f"event: heartbeat\n{_serialize_sse(heartbeat)}"
+        channel = f"council:{request_id}"
+        subscription = _STREAM_HUB.subscribe(
+            channel=channel, buffer_size=STREAM_BUFFER_SIZE, policy="drop_oldest"
+        )
+        producer = asyncio.create_task(
+            _pump_workflow(channel, req, data_client, llm_client, classifier, request_id)
+        )
+        _PRODUCERS[channel] = producer
+        producer.add_done_callback(lambda _: _PRODUCERS.pop(channel, None))
 
-            logger.info(f"🔄 About to call run_workflow_stream from streaming.py (debate_depth={req.debate_depth})")
+        async def event_generator() -> AsyncIterator[bytes]:
             try:
-                async with _async_timeout(STREAM_TIMEOUT_SECONDS):
-                    async for event in run_workflow_stream(
-                        question=req.question,
-                        data_client=data_client,
-                        llm_client=llm_client,
-                        classifier=classifier,
-                        debate_depth=req.debate_depth,  # User-selected debate depth
-                    ):
-                        logger.info(f"📥 Received event from run_workflow_stream: {event.stage}")
-                        try:
-                            # Clean payload - remove non-serializable objects like callbacks
-                            clean_payload = event.payload.copy() if event.payload else {}
-                            clean_payload.pop("event_callback", None)
-                            
-                            envelope = StreamEventResponse(
-                                stage=event.stage,
-                                status=event.status,
-                                payload=clean_payload,
-                                latency_ms=event.latency_ms,
-                                timestamp=getattr(event, "timestamp", None),
-                            )
-                        except ValidationError as exc:
-                            logger.warning(
-                                "Invalid workflow event structure (stage=%s)", event.stage, exc_info=True
-                            )
-                            envelope = StreamEventResponse(
-                                stage=event.stage or "unknown",
-                                status="error",
-                                payload={
-                                    "error": "invalid_event_payload",
-                                    "details": exc.errors(),
-                                },
-                                message="Workflow emitted malformed event payload.",
-                            )
-                        yield _serialize_sse(envelope)
-                        await asyncio.sleep(0)
-                        
-                        # Check if this is the final "done" event
-                        if event.stage == "done" and event.status == "complete":
-                            logger.info(f"Workflow complete, closing SSE stream (request_id={request_id})")
-                            return  # Exit generator, close stream
-                            
-            except asyncio.TimeoutError:
-                timeout_event = StreamEventResponse(
-                    stage="timeout",
-                    status="error",
-                    payload={"error": "workflow_timeout"},
-                    message=f"Workflow exceeded {STREAM_TIMEOUT_SECONDS}s timeout window.",
-                )
-                yield _serialize_sse(timeout_event)
-            except Exception as exc:
-                logger.exception(
-                    "council_stream_llm emitted internal error mid-stream (request_id=%s)",
-                    request_id,
-                )
-                failure_event = StreamEventResponse(
-                    stage="internal_error",
-                    status="error",
-                    payload={"error": "internal_server_error"},
-                    message="LLM council execution failed mid-stream.",
-                )
-                yield _serialize_sse(failure_event)
-                raise
+                async for chunk in subscription:
+                    yield chunk
+            finally:
+                subscription.close()
+                _release_channel(channel)
 
         return StreamingResponse(
             event_generator(),
@@ -332,6 +397,45 @@ async def council_stream_llm(
         ) from None
 
 
+@router.get("/council/stream/{request_id}")
+async def council_stream_resume(request_id: str, request: Request) -> StreamingResponse:
+    """
+    Re-attach to a council run's SSE stream after a dropped connection.
+
+    Frames published after the client's `Last-Event-ID` header are replayed
+    from the hub's short replay log, then the live stream continues until
+    the run completes.
+    """
+    channel = f"council:{request_id}"
+    if not _STREAM_HUB.has_channel(channel):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown stream")
+    subscription = _STREAM_HUB.subscribe(
+        channel=channel,
+        last_event_id=request.headers.get("last-event-id"),
+        buffer_size=STREAM_BUFFER_SIZE,
+        policy="drop_oldest",
+    )
+
+    async def event_generator() -> AsyncIterator[bytes]:
+        try:
+            async for chunk in subscription:
+                yield chunk
+        finally:
+            subscription.close()
+            _release_channel(channel)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Connection": "keep-alive",
+            "X-Request-ID": request_id,
+        },
+    )
+
+
 @router.post(
     "/council/run-llm",
     response_model=CouncilRunLLMResponse,
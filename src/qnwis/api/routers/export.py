@@ -8,6 +8,7 @@ No network, SQL, or LLM dependencies. Deterministic and Windows-friendly.
 from __future__ import annotations
 
 import os
+from dataclasses import replace
 from hashlib import sha256
 from io import StringIO
 from typing import Any
@@ -22,7 +23,8 @@ from ...ui.cards import (
     build_top_sectors_cards,
 )
 from ...ui.charts import salary_yoy_series, sector_employment_bar
-from ...ui.svg import bar_chart_svg, line_chart_svg
+from ...ui.export import SVG_SIZE
+from ...ui.render import ChartSpec, get_render_service
 
 router = APIRouter(tags=["ui-export"])
 
@@ -259,24 +261,37 @@ def export_svg(
     Returns:
         SVG file as image/svg+xml with cache headers
     """
+    service = get_render_service()
+    sec = _sector_param(sector) if chart == "salary-yoy" else ""
+    key = ("svg", chart, queries_dir or "", str(year), sec)
+    known = service.known_etag(key)
+    if known is not None and _match_etag(request, f"\"{known}\""):
+        service.record_not_modified()
+        return Response(status_code=304, headers=_etag_headers(f"\"{known}\""))
+
     api = _api(queries_dir, ttl_s)
     if chart == "sector-employment":
         y = year or (api.latest_year("sector_employment") or 2024)
         data = sector_employment_bar(api, year=y)
-        svg = bar_chart_svg(
-            title=data["title"], categories=data["categories"], values=data["values"]
+        spec = ChartSpec(
+            "bar", "svg", data["title"], tuple(data["categories"]), tuple(data["values"])
         )
     else:
-        sec = _sector_param(sector)
         data = salary_yoy_series(api, sector=sec)
-        svg = line_chart_svg(title=data["title"], points=data["series"])
-    payload = svg.encode("utf-8")
-    etag_value = f"\"{_etag(payload)}\""
+        spec = ChartSpec(
+            "line",
+            "svg",
+            data["title"],
+            tuple(p["x"] for p in data["series"]),
+            tuple(p["y"] for p in data["series"]),
+        )
+    rendered = service.render(replace(spec, size=SVG_SIZE), key=key, ttl_s=ttl_s)
+    etag_value = f"\"{rendered.etag}\""
     if _match_etag(request, etag_value):
         return Response(status_code=304, headers=_etag_headers(etag_value))
 
     return Response(
-        content=payload,
+        content=rendered.body,
         media_type="image/svg+xml",
         headers=_etag_headers(etag_value),
     )
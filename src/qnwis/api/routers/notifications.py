@@ -144,8 +144,8 @@ async def send_notification(
             timestamp=clock.now_iso(),
         )
 
-        # Dispatch
-        results = dispatcher.dispatch(notification)
+        # Dispatch (channel sends run on the async delivery workers)
+        results = await dispatcher.dispatch_async(notification)
         logger.info(f"Sent notification {idempotency_key} via API (user: {principal.subject})")
 
         return NotificationResponse(
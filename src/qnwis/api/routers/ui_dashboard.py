@@ -7,21 +7,25 @@ Provides endpoints for:
 - CSV table exports
 
 All endpoints return deterministic output with ETag and Cache-Control headers.
+PNG endpoints answer If-None-Match from the render service's ETag memo
+before touching data or matplotlib.
 """
 
 from __future__ import annotations
 
 import hashlib
+from collections.abc import Callable
 
 from fastapi import APIRouter, Query, Request, Response
 
 from ...ui.export import (
     csv_sector_employment,
     csv_top_sectors,
-    png_salary_yoy,
-    png_sector_employment_bar,
+    salary_yoy_spec,
+    sector_employment_spec,
 )
 from ...ui.html import render_dashboard_html
+from ...ui.render import ChartSpec, get_render_service
 from ..routers.ui import _api  # reuse clamp + DataAPI init
 
 router = APIRouter(tags=["dashboard"])
@@ -75,6 +79,27 @@ def _resp(request: Request, payload: bytes, media_type: str, etag: str) -> Respo
     return r
 
 
+def _chart(
+    request: Request, key: tuple[str, ...], ttl_s: int, build: Callable[[], ChartSpec]
+) -> Response:
+    """
+    Serve a rendered chart, short-circuiting If-None-Match on the remembered ETag.
+
+    Args:
+        request: The incoming HTTP request
+        key: Route and parameters identifying the chart
+        ttl_s: Data cache TTL; bounds how long the remembered ETag is trusted
+        build: Loads the data and returns the chart spec (only called when needed)
+    """
+    service = get_render_service()
+    known = service.known_etag(key)
+    if known is not None and _matches_etag(request, _etag_header(known)):
+        service.record_not_modified()
+        return _resp(request, b"", "", known)
+    chart = service.render(build(), key=key, ttl_s=ttl_s)
+    return _resp(request, chart.body, chart.media_type, chart.etag)
+
+
 @router.get("/v1/ui/dashboard/summary", response_class=Response)
 def dashboard_summary_html(
     request: Request,
@@ -181,9 +206,8 @@ def export_salary_yoy_png(
     Example:
         GET /v1/ui/export/salary-yoy.png?sector=Energy
     """
-    api = _api(queries_dir, ttl_s)
-    data, etag = png_salary_yoy(api, sector=sector)
-    return _resp(request, data, "image/png", etag)
+    key = ("salary-yoy.png", queries_dir or "", sector)
+    return _chart(request, key, ttl_s, lambda: salary_yoy_spec(_api(queries_dir, ttl_s), sector))
 
 
 @router.get("/v1/ui/export/sector-employment.png")
@@ -207,6 +231,7 @@ def export_sector_employment_png(
     Example:
         GET /v1/ui/export/sector-employment.png?year=2024
     """
-    api = _api(queries_dir, ttl_s)
-    data, etag = png_sector_employment_bar(api, year=year)
-    return _resp(request, data, "image/png", etag)
+    key = ("sector-employment.png", queries_dir or "", str(year))
+    return _chart(
+        request, key, ttl_s, lambda: sector_employment_spec(_api(queries_dir, ttl_s), year)
+    )
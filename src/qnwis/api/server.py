@@ -272,9 +272,9 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         try:
             if auth_method == "jwt" and header:
                 token = header.split(" ", 1)[1].strip()
-                principal = auth_provider.authenticate_jwt(token)
+                principal = await auth_provider.aauthenticate_jwt(token)
             elif auth_method == "api_key" and api_key:
-                principal = auth_provider.authenticate_api_key(api_key)
+                principal = await auth_provider.aauthenticate_api_key(api_key)
             else:  # pragma: no cover - defensive
                 raise ValueError("Unsupported authentication method")
             record_auth_attempt(auth_method, "success")
@@ -289,7 +289,7 @@ def create_app(settings: Settings | None = None) -> FastAPI:
         request.state.principal = principal
         rate_result = None
         if rate_limiter is not None and principal is not None:
-            rate_result = rate_limiter.consume(principal)
+            rate_result = await rate_limiter.aconsume(principal)
             if not rate_result.allowed:
                 record_rate_limit_event(principal.subject, rate_result.reason or "limit_exceeded")
                 return JSONResponse(
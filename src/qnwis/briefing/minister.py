@@ -1,6 +1,7 @@
 """Build executive-ready Minister Briefing from council + verification."""
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -75,14 +76,21 @@ def _collect_licenses(
     return sorted(licenses)
 
 
+def _load_and_triangulate(queries_dir: str, ttl_s: int) -> TriangulationBundle:
+    """Load the query registry and run triangulation (runs beside the council)."""
+    registry = QueryRegistry(queries_dir)
+    registry.load_all()
+    return run_triangulation(registry, ttl_s=ttl_s)
+
+
 def build_briefing(queries_dir: str | None = None, ttl_s: int = 300) -> MinisterBriefing:
     """
     Run council + triangulation on synthetic data and build executive briefing.
 
     This is a deterministic process using only synthetic CSV data:
-    1. Run the council to gather findings and consensus.
-    2. Run triangulation to cross-check numeric consistency.
-    3. Build a structured briefing with markdown output.
+    1. Run the council to gather findings and consensus while triangulation
+       cross-checks numeric consistency on a worker thread.
+    2. Build a structured briefing with markdown output.
 
     Args:
         queries_dir: Optional queries directory path.
@@ -93,15 +101,16 @@ def build_briefing(queries_dir: str | None = None, ttl_s: int = 300) -> Minister
     """
     resolved_queries_dir = queries_dir or "src/qnwis/data/queries"
 
-    council_json = run_council(CouncilConfig(queries_dir=resolved_queries_dir, ttl_s=ttl_s))
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="triangulation") as pool:
+        triangulation_future = pool.submit(_load_and_triangulate, resolved_queries_dir, ttl_s)
+        council_json = run_council(
+            CouncilConfig(queries_dir=resolved_queries_dir, ttl_s=ttl_s)
+        )
+        triangulation = triangulation_future.result()
     council_payload = council_json["council"]
     findings = council_payload["findings"]
     consensus = council_payload["consensus"]
 
-    registry = QueryRegistry(resolved_queries_dir)
-    registry.load_all()
-    triangulation = run_triangulation(registry, ttl_s=ttl_s)
-
     min_confidence = _collect_confidence(findings)
 
     headline: list[str] = []
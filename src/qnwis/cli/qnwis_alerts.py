@@ -236,7 +236,8 @@ def cmd_run(args):
             renderer = AlertReportRenderer()
             decisions = list(agent.engine.batch_evaluate(
                     registry.get_all_rules(enabled_only=True),
-                    lambda r: agent._fetch_metric_data(r, args.start, args.end)
+                    lambda r: agent._fetch_metric_data(r, args.start, args.end),
+                    shared_fetch=True,
                 ))
             rules_dict = {r.rule_id: r for r in registry.get_all_rules()}
             output = renderer.render_json(decisions, rules_dict)
@@ -258,7 +259,8 @@ def cmd_run(args):
             renderer = AlertReportRenderer()
             decisions = list(agent.engine.batch_evaluate(
                     registry.get_all_rules(enabled_only=True),
-                    lambda r: agent._fetch_metric_data(r, args.start, args.end)
+                    lambda r: agent._fetch_metric_data(r, args.start, args.end),
+                    shared_fetch=True,
                 ))
             rules_dict = {r.rule_id: r for r in registry.get_all_rules()}
             artifacts = renderer.generate_audit_pack(decisions, rules_dict, args.audit_dir)
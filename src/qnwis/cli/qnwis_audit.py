@@ -302,6 +302,12 @@ def cmd_prune(args: argparse.Namespace) -> int:  # noqa: C901
                 sqlite_store.delete(audit_id)
             removed.append((audit_id, manifest.created_at))
 
+    if sqlite_store:
+        # Index rows whose packs were already removed from disk
+        orphaned = sqlite_store.compact(cutoff)
+        if orphaned:
+            print(f"Compacted {len(orphaned)} stale SQLite index record(s).")
+
     if not removed:
         print(f"No audit packs older than {days_int} day(s).")
         return 0
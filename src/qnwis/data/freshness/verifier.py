@@ -175,23 +175,42 @@ def verify_freshness(
         warnings.append("freshness_invalid_sla")
         return warnings
 
-    now = now or datetime.utcnow()
     asof, parse_error = _guess_asof_date(res)
     if parse_error:
         warnings.append("freshness_parse_error")
         return warnings
-    if not asof:
-        warnings.append("freshness_unknown")
-        return warnings
+
+    warnings.extend(check_asof_freshness(asof, sla_days, now))
+    return warnings
+
+
+def check_asof_freshness(
+    asof: Any, sla_days: Any, now: datetime | None = None
+) -> list[str]:
+    """
+    Check a single as-of value against an SLA expressed in days.
+
+    Accepts the same date/year representations as result rows, plus
+    ``datetime`` objects. Returns the same warning strings as
+    ``verify_freshness``; an empty list means the value is within SLA.
+    """
+    coerced_sla = _coerce_sla_days(sla_days)
+    if coerced_sla is None:
+        return ["freshness_invalid_sla"]
+
+    if isinstance(asof, datetime):
+        asof = asof.date().isoformat()
+    normalized = _normalize_date_candidate(asof)
+    if not normalized:
+        return ["freshness_unknown"]
 
     try:
-        asof_dt = datetime.strptime(asof, _ISO_DATE_FMT)
+        asof_dt = datetime.strptime(normalized, _ISO_DATE_FMT)
     except ValueError:
-        warnings.append("freshness_parse_error")
-        return warnings
+        return ["freshness_parse_error"]
 
+    now = now or datetime.utcnow()
     age = (now - asof_dt).days
-    if age > sla_days:
-        warnings.append(f"stale_data:{age}>{sla_days}")
-
-    return warnings
+    if age > coerced_sla:
+        return [f"stale_data:{age}>{coerced_sla}"]
+    return []
@@ -0,0 +1,474 @@
+"""
+Dependency-aware refresh planner for materialized views.
+
+Builds a DAG from the MV specs (views reading other views refresh after
+them), skips views whose source tables are unchanged since the last run
+and refreshes independent views in parallel on a bounded adapter pool.
+
+Change detection compares a per-view watermark: a digest of the
+watermarks of its source tables (row count plus max ``xmin`` on Postgres,
+or a content checksum) and of its upstream views. Watermarks and refresh
+times persist in a small JSON state file between runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from ...observability.metrics import record_mv_refresh
+from .postgres import PostgresMaterializer
+from .registry import MaterializedSpecError
+
+logger = logging.getLogger(__name__)
+
+WatermarkProbe = Callable[[Any, str], str]
+
+_RELATION_RE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_][\w.]*)", re.IGNORECASE)
+_CTE_RE = re.compile(r"(?:\bWITH|,)\s*(?:RECURSIVE\s+)?([A-Za-z_]\w*)\s+AS\s*\(", re.IGNORECASE)
+# Functions whose argument syntax contains FROM, e.g. EXTRACT(YEAR FROM ts)
+_FROM_FUNC_RE = re.compile(r"\b(?:EXTRACT|SUBSTRING|TRIM|OVERLAY)\s*\([^)]*\)", re.IGNORECASE)
+
+
+class MaterializedRefreshError(Exception):
+    """Raised when one or more materialized views failed to refresh."""
+
+
+def extract_relations(sql: str) -> list[str]:
+    """
+    List the relations a SELECT reads from, in order of first use.
+
+    CTE names and FROM clauses inside EXTRACT/SUBSTRING/TRIM are ignored.
+
+    Args:
+        sql: Rendered SELECT statement
+
+    Returns:
+        Lower-cased relation names (schema-qualified when written so)
+    """
+    cleaned = _FROM_FUNC_RE.sub(" ", sql)
+    ctes = {m.lower() for m in _CTE_RE.findall(cleaned)}
+    seen: dict[str, None] = {}
+    for rel in _RELATION_RE.findall(cleaned):
+        name = rel.lower()
+        if name not in ctes:
+            seen.setdefault(name, None)
+    return list(seen)
+
+
+@dataclass(frozen=True)
+class ViewNode:
+    """One materialized view in the refresh plan."""
+
+    name: str
+    sql_id: str
+    sql: str
+    indexes: tuple[str, ...]
+    unique_index: str | None
+    depends_on: tuple[str, ...]
+    sources: tuple[str, ...]
+
+    @property
+    def sql_digest(self) -> str:
+        """Digest of the definition; a change requires drop and re-create."""
+        payload = "\n".join((self.sql, *self.indexes, self.unique_index or ""))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class RefreshPlan:
+    """Views grouped into levels; views within a level are independent."""
+
+    nodes: dict[str, ViewNode]
+    levels: list[list[str]]
+
+    @property
+    def order(self) -> list[str]:
+        """Topological order (level by level, spec order within a level)."""
+        return [name for level in self.levels for name in level]
+
+    def dependents(self, name: str) -> set[str]:
+        """All views that transitively read from ``name``."""
+        children: dict[str, list[str]] = {n: [] for n in self.nodes}
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                children[dep].append(node.name)
+        found: set[str] = set()
+        stack = list(children[name])
+        while stack:
+            current = stack.pop()
+            if current not in found:
+                found.add(current)
+                stack.extend(children[current])
+        return found
+
+
+def build_refresh_plan(
+    specs: Sequence[dict[str, Any]], render: Callable[[dict[str, Any]], str]
+) -> RefreshPlan:
+    """
+    Render every spec and derive the view dependency DAG.
+
+    Dependencies are the other views named in a view's FROM/JOIN clauses
+    plus any listed under ``depends_on``; every other relation is a source
+    table unless ``sources`` is given explicitly.
+
+    Args:
+        specs: Validated specs from MaterializedRegistry
+        render: Renders a spec to its SELECT statement
+
+    Returns:
+        RefreshPlan with topological levels
+
+    Raises:
+        MaterializedSpecError: On unknown dependencies or cycles
+    """
+    names = [s["name"] for s in specs]
+    known = {n.lower(): n for n in names}
+    nodes: dict[str, ViewNode] = {}
+    for spec in specs:
+        sql = render(spec)
+        relations = extract_relations(sql)
+        deps = [known[r] for r in relations if r in known and known[r] != spec["name"]]
+        for dep in spec.get("depends_on", []):
+            if dep not in nodes and dep not in names:
+                raise MaterializedSpecError(
+                    f"Spec '{spec['name']}' depends on unknown MV '{dep}'."
+                )
+            if dep not in deps:
+                deps.append(dep)
+        sources = spec.get("sources")
+        if sources is None:
+            sources = [r for r in relations if r not in known]
+        nodes[spec["name"]] = ViewNode(
+            name=spec["name"],
+            sql_id=spec["sql_id"],
+            sql=sql,
+            indexes=tuple(spec["indexes"]),
+            unique_index=spec.get("unique_index"),
+            depends_on=tuple(deps),
+            sources=tuple(sources),
+        )
+
+    levels: list[list[str]] = []
+    placed: set[str] = set()
+    remaining = list(names)
+    while remaining:
+        level = [n for n in remaining if all(d in placed for d in nodes[n].depends_on)]
+        if not level:
+            raise MaterializedSpecError(
+                f"Dependency cycle between materialized views: {sorted(remaining)}"
+            )
+        levels.append(level)
+        placed.update(level)
+        remaining = [n for n in remaining if n not in placed]
+    return RefreshPlan(nodes=nodes, levels=levels)
+
+
+def postgres_watermark(db: Any, table: str) -> str:
+    """
+    Row count and highest ``xmin`` of a Postgres table.
+
+    Inserts and deletes move the count, updates move ``xmin``. Needs an
+    adapter exposing ``fetch_all(sql) -> list[tuple]``, such as
+    ``SQLAlchemyAdapter``.
+    """
+    rows = db.fetch_all(
+        f"SELECT count(*), COALESCE(max(xmin::text::bigint), 0) FROM {table};"
+    )
+    count, xmin = rows[0]
+    return f"{count}:{xmin}"
+
+
+def checksum_watermark(db: Any, table: str) -> str:
+    """
+    Order-independent checksum of a table's rows.
+
+    Backend-neutral but reads the whole table; suited to small dimension
+    tables and to the SQLite adapter double used in tests.
+    """
+    digest = hashlib.sha256()
+    rows = sorted(repr(tuple(row)) for row in db.fetch_all(f"SELECT * FROM {table};"))
+    for row in rows:
+        digest.update(row.encode("utf-8"))
+    return f"{len(rows)}:{digest.hexdigest()[:16]}"
+
+
+class RefreshState:
+    """
+    Per-view definition digest, watermark and last refresh time.
+
+    Backed by a JSON file when ``path`` is given, otherwise in memory only
+    (every view then counts as new on each run).
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else None
+        self._views: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if self.path is not None and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8") or "{}")
+            self._views = dict(data.get("views", {}))
+
+    def get(self, name: str) -> dict[str, Any] | None:
+        with self._lock:
+            entry = self._views.get(name)
+            return dict(entry) if entry is not None else None
+
+    def update(self, name: str, **fields: Any) -> None:
+        with self._lock:
+            self._views.setdefault(name, {}).update(fields)
+
+    def save(self) -> None:
+        """Atomically write the state file (no-op for in-memory state)."""
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = json.dumps({"views": self._views}, indent=2, sort_keys=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".mv_state.")
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            handle.write(payload)
+        os.replace(tmp, self.path)
+
+
+class AdapterPool:
+    """
+    Bounded pool of DB adapters created lazily by ``connect``.
+
+    At most ``size`` adapters exist; callers block until one is free.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int) -> None:
+        if size < 1:
+            raise ValueError("pool size must be >= 1")
+        self.size = size
+        self._connect = connect
+        self._idle: queue.LifoQueue[Any] = queue.LifoQueue()
+        self._created: list[Any] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self) -> Iterator[Any]:
+        adapter = None
+        try:
+            adapter = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._created) < self.size:
+                    adapter = self._connect()
+                    self._created.append(adapter)
+            if adapter is None:
+                adapter = self._idle.get()
+        try:
+            yield adapter
+        finally:
+            self._idle.put(adapter)
+
+    def close(self) -> None:
+        for adapter in self._created:
+            close = getattr(adapter, "close", None)
+            if callable(close):
+                close()
+        self._created.clear()
+
+
+@dataclass
+class RefreshOutcome:
+    """Result of one view in a refresh run."""
+
+    name: str
+    sql_id: str
+    action: str  # created | rebuilt | refreshed | skipped | blocked | failed
+    duration_s: float = 0.0
+    staleness_s: float = 0.0
+    concurrently: bool = False
+    error: str | None = None
+
+
+@dataclass
+class _RunContext:
+    plan: RefreshPlan
+    state: RefreshState
+    probe: WatermarkProbe | None
+    clock: Callable[[], float]
+    rebuild: set[str]
+    outcomes: dict[str, RefreshOutcome] = field(default_factory=dict)
+
+
+def _watermark(ctx: _RunContext, adapter: Any, node: ViewNode) -> str | None:
+    if ctx.probe is None:
+        return None
+    parts = {f"table:{t}": ctx.probe(adapter, t) for t in node.sources}
+    for dep in node.depends_on:
+        upstream = ctx.state.get(dep) or {}
+        parts[f"view:{dep}"] = upstream.get("watermark")
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _refresh_one(ctx: _RunContext, adapter: Any, node: ViewNode) -> RefreshOutcome:
+    blocked = [
+        d for d in node.depends_on if ctx.outcomes[d].action in ("failed", "blocked")
+    ]
+    if blocked:
+        return RefreshOutcome(
+            node.name, node.sql_id, "blocked", error=f"upstream failed: {', '.join(blocked)}"
+        )
+
+    previous = ctx.state.get(node.name)
+    start = time.perf_counter()
+    try:
+        watermark = _watermark(ctx, adapter, node)
+        mat = PostgresMaterializer(adapter)
+        concurrently = False
+        if previous is None or node.name in ctx.rebuild:
+            action = "rebuilt" if previous is not None else "created"
+            mat.create_or_replace(
+                node.name, node.sql, list(node.indexes), unique_index=node.unique_index
+            )
+        elif watermark is not None and watermark == previous.get("watermark"):
+            refreshed_at = previous.get("refreshed_at", ctx.clock())
+            return RefreshOutcome(
+                node.name,
+                node.sql_id,
+                "skipped",
+                staleness_s=max(0.0, ctx.clock() - refreshed_at),
+            )
+        else:
+            action = "refreshed"
+            concurrently = node.unique_index is not None
+            mat.refresh(node.name, concurrently=concurrently)
+    except Exception as exc:  # noqa: BLE001 - reported per view, job continues
+        logger.exception("Materialized view %s failed to refresh", node.name)
+        refreshed_at = (previous or {}).get("refreshed_at")
+        return RefreshOutcome(
+            node.name,
+            node.sql_id,
+            "failed",
+            duration_s=time.perf_counter() - start,
+            staleness_s=ctx.clock() - refreshed_at if refreshed_at else 0.0,
+            error=str(exc),
+        )
+
+    ctx.state.update(
+        node.name,
+        sql_digest=node.sql_digest,
+        watermark=watermark,
+        refreshed_at=ctx.clock(),
+    )
+    return RefreshOutcome(
+        node.name,
+        node.sql_id,
+        action,
+        duration_s=time.perf_counter() - start,
+        concurrently=concurrently,
+    )
+
+
+def _rebuild_set(plan: RefreshPlan, state: RefreshState) -> set[str]:
+    changed = {
+        name
+        for name, node in plan.nodes.items()
+        if (entry := state.get(name)) is not None and entry.get("sql_digest") != node.sql_digest
+    }
+    rebuild = set(changed)
+    for name in changed:
+        rebuild |= {d for d in plan.dependents(name) if state.get(d) is not None}
+    return rebuild
+
+
+def run_refresh(
+    plan: RefreshPlan,
+    db: Any,
+    *,
+    pool: AdapterPool | None = None,
+    state: RefreshState | None = None,
+    probe: WatermarkProbe | None = None,
+    clock: Callable[[], float] = time.time,
+) -> list[RefreshOutcome]:
+    """
+    Refresh the views of a plan, level by level.
+
+    New views are created; views whose definition changed are dropped
+    (dependents first) and re-created; other views are skipped when their
+    watermark is unchanged and refreshed otherwise, ``CONCURRENTLY`` when
+    they carry a unique index so readers are not blocked. Without a probe
+    every known view is refreshed.
+
+    With a pool, views within a level run in parallel on pooled adapters;
+    without one they run serially on ``db``. A failed view blocks its
+    dependents but not independent views.
+
+    Args:
+        plan: Plan from build_refresh_plan
+        db: Adapter used for drops and, without a pool, for every view
+        pool: Optional bounded adapter pool for parallel refresh
+        state: Refresh state (in-memory when omitted)
+        probe: Source-table watermark function, e.g. postgres_watermark
+        clock: Wall clock used for refresh times and staleness
+
+    Returns:
+        One RefreshOutcome per view, in plan order
+    """
+    state = state if state is not None else RefreshState()
+    ctx = _RunContext(plan, state, probe, clock, _rebuild_set(plan, state))
+
+    if ctx.rebuild:
+        mat = PostgresMaterializer(db)
+        for name in reversed(plan.order):
+            if name in ctx.rebuild:
+                mat.drop(name)
+
+    def run(node: ViewNode) -> RefreshOutcome:
+        if pool is None:
+            return _refresh_one(ctx, db, node)
+        with pool.acquire() as adapter:
+            return _refresh_one(ctx, adapter, node)
+
+    executor = ThreadPoolExecutor(max_workers=pool.size) if pool is not None else None
+    try:
+        for level in plan.levels:
+            nodes = [plan.nodes[name] for name in level]
+            if executor is None or len(nodes) == 1:
+                results = [run(node) for node in nodes]
+            else:
+                results = list(executor.map(run, nodes))
+            for outcome in results:
+                ctx.outcomes[outcome.name] = outcome
+                record_mv_refresh(
+                    outcome.name, outcome.action, outcome.duration_s, outcome.staleness_s
+                )
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+        state.save()
+
+    return [ctx.outcomes[name] for name in plan.order]
+
+
+__all__ = [
+    "AdapterPool",
+    "MaterializedRefreshError",
+    "RefreshOutcome",
+    "RefreshPlan",
+    "RefreshState",
+    "ViewNode",
+    "build_refresh_plan",
+    "checksum_watermark",
+    "extract_relations",
+    "postgres_watermark",
+    "run_refresh",
+]
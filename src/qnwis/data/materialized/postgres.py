@@ -11,6 +11,48 @@ import textwrap
 from typing import Any
 
 
+class SQLAlchemyAdapter:
+    """
+    Low-level DB adapter over a SQLAlchemy engine.
+
+    Provides the ``execute_sql`` used by :class:`PostgresMaterializer` and
+    the ``fetch_all`` read used by the refresh planner's watermark probes.
+    Each call runs on its own pooled connection, so one engine can back
+    several adapters in an ``AdapterPool``.
+    """
+
+    def __init__(self, engine: Any, query_registry: Any | None = None) -> None:
+        """
+        Args:
+            engine: SQLAlchemy engine (e.g. ``data.deterministic.engine.get_engine()``)
+            query_registry: Optional registry exposing ``render_select``
+        """
+        self.engine = engine
+        self.query_registry = query_registry
+
+    def execute_sql(self, sql: str) -> None:
+        """Execute one statement in its own transaction."""
+        from sqlalchemy import text
+
+        with self.engine.begin() as conn:
+            conn.execute(text(sql))
+
+    def fetch_all(self, sql: str) -> list[tuple[Any, ...]]:
+        """Run a query and return its rows as plain tuples."""
+        from sqlalchemy import text
+
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(text(sql)).fetchall()]
+
+    def close(self) -> None:
+        """Nothing to release; connections go back to the engine's pool."""
+
+
+def _check_index(idx: str) -> None:
+    if " on " not in idx.lower():
+        raise ValueError(f"Invalid index definition '{idx}'. Expected 'name ON table(cols)'.")
+
+
 class PostgresMaterializer:
     """
     Uses the existing low-level DB adapter on DataClient (db.execute_sql)
@@ -29,15 +71,23 @@ class PostgresMaterializer:
         self.db = db
 
     def create_or_replace(
-        self, name: str, sql_select: str, indexes: list[str]
+        self,
+        name: str,
+        sql_select: str,
+        indexes: list[str],
+        unique_index: str | None = None,
     ) -> None:
         """
         Create or refresh a materialized view with indexes.
 
+        With a unique index, it is built before the first (plain) populate
+        so later refreshes can run CONCURRENTLY.
+
         Args:
             name: Materialized view name
             sql_select: SELECT statement (from registered query)
             indexes: List of index definitions (name ON table(columns))
+            unique_index: Optional unique index definition (name ON table(columns))
         """
         sql_body = textwrap.dedent(sql_select).strip().rstrip(";")
         sql_template = textwrap.dedent(
@@ -49,22 +99,29 @@ class PostgresMaterializer:
         )
         rendered_sql = sql_template.format(name=name, sql_body=sql_body)
         self.db.execute_sql(rendered_sql)
-        refresh_stmt = "REFRESH MATERIALIZED VIEW CONCURRENTLY {name};".format(name=name)
-        self.db.execute_sql(refresh_stmt)
+        if unique_index is not None:
+            _check_index(unique_index)
+            self.db.execute_sql(
+                "CREATE UNIQUE INDEX IF NOT EXISTS {idx};".format(idx=unique_index)
+            )
+        # The view was created WITH NO DATA; PostgreSQL rejects CONCURRENTLY
+        # on an unpopulated view, so the first populate is always blocking.
+        self.refresh(name, concurrently=False)
         for idx in indexes:
-            if " on " not in idx.lower():
-                raise ValueError(f"Invalid index definition '{idx}'. Expected 'name ON table(cols)'.")
+            _check_index(idx)
             index_stmt = "CREATE INDEX IF NOT EXISTS {idx};".format(idx=idx)
             self.db.execute_sql(index_stmt)
 
-    def refresh(self, name: str) -> None:
+    def refresh(self, name: str, concurrently: bool = False) -> None:
         """
         Refresh an existing materialized view.
 
         Args:
             name: Materialized view name
+            concurrently: Refresh without blocking readers (needs a unique index)
         """
-        refresh_stmt = "REFRESH MATERIALIZED VIEW CONCURRENTLY {name};".format(name=name)
+        keyword = "CONCURRENTLY " if concurrently else ""
+        refresh_stmt = "REFRESH MATERIALIZED VIEW {kw}{name};".format(kw=keyword, name=name)
         self.db.execute_sql(refresh_stmt)
 
     def drop(self, name: str) -> None:
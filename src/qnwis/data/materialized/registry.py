@@ -73,6 +73,21 @@ class MaterializedRegistry:
                     raise MaterializedSpecError(
                         f"Index definition must include 'ON <table>(columns)': {idx}"
                     )
+            unique_index = s.get("unique_index")
+            if unique_index is not None and (
+                not isinstance(unique_index, str) or " on " not in unique_index.lower()
+            ):
+                raise MaterializedSpecError(
+                    f"Spec '{s['name']}' unique_index must be 'name ON <table>(columns)'."
+                )
+            for list_field in ("depends_on", "sources"):
+                value = s.get(list_field)
+                if value is not None and (
+                    not isinstance(value, list) or not all(isinstance(v, str) for v in value)
+                ):
+                    raise MaterializedSpecError(
+                        f"Spec '{s['name']}' {list_field} must be a list of strings."
+                    )
         return data
 
     def by_name(self, name: str) -> dict[str, Any]:
@@ -27,6 +27,14 @@ class EncryptionAlgorithm(str, Enum):
     NONE = "none"
 
 
+class CatchUpPolicy(str, Enum):
+    """How a schedule handles fire times missed while the scheduler was not polled."""
+
+    SKIP = "skip"
+    ONCE = "once"
+    ALL = "all"
+
+
 class BackupSpec(BaseModel):
     """
     Specification for a backup operation.
@@ -206,6 +214,7 @@ class ScheduleSpec(BaseModel):
         cron_expr: Cron expression (e.g., '0 2 * * *')
         enabled: Whether schedule is active
         next_run_at: Next scheduled run timestamp
+        catch_up: Policy for fire times missed while not polled
     """
 
     schedule_id: str = Field(..., description="Unique schedule identifier")
@@ -213,6 +222,10 @@ class ScheduleSpec(BaseModel):
     cron_expr: str = Field(..., description="Cron expression")
     enabled: bool = Field(default=True, description="Schedule enabled")
     next_run_at: str | None = Field(None, description="Next run timestamp")
+    catch_up: CatchUpPolicy = Field(
+        default=CatchUpPolicy.ONCE,
+        description="Missed-run policy: skip, run once, or run every missed fire time",
+    )
 
     class Config:
         frozen = True
@@ -344,4 +357,5 @@ __all__ = [
     "Manifest",
     "StorageBackend",
     "EncryptionAlgorithm",
+    "CatchUpPolicy",
 ]
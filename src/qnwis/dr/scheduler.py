@@ -7,13 +7,26 @@ Driven by injected Clock for deterministic testing.
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import calendar
+import heapq
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from ..utils.clock import Clock
 
-from .models import ScheduleSpec
+from .models import CatchUpPolicy, ScheduleSpec
+
+# Day-of-month and weekday constraints repeat with the 400-year Gregorian cycle
+SEARCH_YEARS = 400
+
+
+def _ceil(values: tuple[int, ...], value: int) -> int | None:
+    """Smallest element of sorted ``values`` that is >= ``value``."""
+    idx = bisect_left(values, value)
+    return values[idx] if idx < len(values) else None
 
 
 class CronParser:
@@ -44,6 +57,13 @@ class CronParser:
         self.month = self._parse_field(parts[3], 1, 12)
         self.weekday = self._parse_field(parts[4], 0, 6)
 
+        self._minutes = tuple(sorted(set(self.minute)))
+        self._hours = tuple(sorted(set(self.hour)))
+        self._days = tuple(sorted(set(self.day)))
+        self._months = tuple(sorted(set(self.month)))
+        self._weekdays = frozenset(self.weekday)
+        self._all_weekdays = self._weekdays >= frozenset(range(7))
+
     def _parse_field(self, field: str, min_val: int, max_val: int) -> list[int]:
         """
         Parse a single cron field.
@@ -105,23 +125,79 @@ class CronParser:
         """
         Calculate next run time after given datetime.
 
+        Resolves the fields from month down to minute, carrying into the
+        next hour/day/month/year whenever a field has no match left, so the
+        cost is independent of how far away the next fire time is.
+
         Args:
             after: Reference datetime
 
         Returns:
-            Next matching datetime
+            Next matching datetime (same tzinfo, seconds zeroed)
+
+        Raises:
+            ValueError: If the expression never matches (e.g. '0 0 31 2 *')
         """
-        # Simple implementation: check every minute for next 7 days
-        current = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
-        max_check = after + timedelta(days=7)
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        year, month, day, hour, minute = start.year, start.month, start.day, start.hour, start.minute
+
+        while year < start.year + SEARCH_YEARS:
+            m = _ceil(self._months, month)
+            if m is None:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if m != month:
+                month, day, hour, minute = m, 1, 0, 0
+
+            d = self._next_day(year, month, day)
+            if d is None:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                continue
+            if d != day:
+                day, hour, minute = d, 0, 0
 
-        while current <= max_check:
-            if self.matches(current):
-                return current
-            current += timedelta(minutes=1)
+            h = _ceil(self._hours, hour)
+            if h is None:
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if h != hour:
+                hour, minute = h, 0
+
+            mi = _ceil(self._minutes, minute)
+            if mi is None:
+                hour, minute = hour + 1, 0
+                continue
+
+            return datetime(year, month, day, hour, mi, tzinfo=after.tzinfo)
+
+        raise ValueError(f"Cron expression never matches: {self.expr}")
+
+    def _next_day(self, year: int, month: int, day: int) -> int | None:
+        """First day >= ``day`` in the month matching both day and weekday fields."""
+        last = calendar.monthrange(year, month)[1]
+        idx = bisect_left(self._days, day)
+        for d in self._days[idx:]:
+            if d > last:
+                return None
+            if self._all_weekdays or date(year, month, d).weekday() in self._weekdays:
+                return d
+        return None
+
+
+@dataclass(frozen=True)
+class DueRun:
+    """
+    One run released by the scheduler.
+
+    Attributes:
+        schedule: Schedule to execute
+        scheduled_for: Fire time this run stands for
+        late: Released after the misfire grace period (a catch-up run)
+    """
 
-        # Fallback: return 7 days later
-        return after + timedelta(days=7)
+    schedule: ScheduleSpec
+    scheduled_for: datetime
+    late: bool = False
 
 
 class BackupScheduler:
@@ -129,19 +205,37 @@ class BackupScheduler:
     Deterministic backup scheduler.
 
     Evaluates schedules using injected clock and produces due jobs list.
+    Enabled schedules sit in a min-heap keyed by their next fire time, so a
+    poll only touches schedules that are due and ``next_wakeup`` tells the
+    caller how long it may sleep.
     No background threads - caller must poll for due jobs.
     """
 
-    def __init__(self, clock: Clock) -> None:
+    def __init__(
+        self,
+        clock: Clock,
+        *,
+        misfire_grace_seconds: float = 60.0,
+        max_catch_up: int = 100,
+    ) -> None:
         """
         Initialize backup scheduler.
 
         Args:
             clock: Injected clock for deterministic time
+            misfire_grace_seconds: How late a run may be released and still count as on time
+            max_catch_up: Most missed runs one ``pop_due`` releases per schedule
+                under ``CatchUpPolicy.ALL``; the rest stay due for the next poll
         """
         self._clock = clock
+        self.misfire_grace = timedelta(seconds=misfire_grace_seconds)
+        self.max_catch_up = max_catch_up
         self._schedules: dict[str, ScheduleSpec] = {}
         self._parsers: dict[str, CronParser] = {}
+        # Heap entries are invalidated lazily: only the seq in _due is live
+        self._due: dict[str, tuple[datetime, int]] = {}
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._seq = 0
 
     def add_schedule(self, schedule: ScheduleSpec) -> None:
         """
@@ -157,6 +251,13 @@ class BackupScheduler:
         self._schedules[schedule.schedule_id] = schedule
         self._parsers[schedule.schedule_id] = parser
 
+        if schedule.next_run_at:
+            due = datetime.fromisoformat(schedule.next_run_at.replace("Z", "+00:00"))
+        else:
+            # Due from the current minute on, if the cron matches it
+            due = _first_fire_at_or_after(parser, self._clock.now().replace(second=0, microsecond=0))
+        self._set_due(schedule, due)
+
     def remove_schedule(self, schedule_id: str) -> None:
         """
         Remove a schedule from the scheduler.
@@ -166,34 +267,81 @@ class BackupScheduler:
         """
         self._schedules.pop(schedule_id, None)
         self._parsers.pop(schedule_id, None)
+        self._due.pop(schedule_id, None)
 
     def get_due_jobs(self) -> list[ScheduleSpec]:
         """
         Get list of schedules that are due to run.
 
+        Does not advance the schedules; call ``update_next_run`` after
+        executing each job, or use ``pop_due`` to do both.
+
         Returns:
-            List of due ScheduleSpec objects
+            List of due ScheduleSpec objects, earliest first
         """
-        now = self._clock.now()
-        due_jobs: list[ScheduleSpec] = []
+        entries = self._take_due(self._clock.now())
+        for entry in entries:
+            heapq.heappush(self._heap, entry)
+        return [self._schedules[schedule_id] for _, _, schedule_id in entries]
 
-        for schedule_id, schedule in self._schedules.items():
-            if not schedule.enabled:
-                continue
+    def pop_due(self) -> list[DueRun]:
+        """
+        Release due runs and advance their schedules.
+
+        Each schedule's ``catch_up`` policy decides what happens to fire
+        times missed while the scheduler was not polled:
+
+        - ``SKIP``: missed fire times are dropped; a run is released only
+          for a fire time within the misfire grace period
+        - ``ONCE``: all missed fire times coalesce into one run
+        - ``ALL``: one run per missed fire time (up to ``max_catch_up`` per poll)
+
+        Returns:
+            Released runs, ordered by fire time
+        """
+        now = self._clock.now()
+        runs: list[DueRun] = []
 
+        for due, _, schedule_id in self._take_due(now):
+            schedule = self._schedules[schedule_id]
             parser = self._parsers[schedule_id]
 
-            # Check if schedule is due
-            if schedule.next_run_at:
-                next_run = datetime.fromisoformat(schedule.next_run_at.replace("Z", "+00:00"))
-                if now >= next_run:
-                    due_jobs.append(schedule)
+            if schedule.catch_up == CatchUpPolicy.ALL:
+                fire, released = due, 0
+                while fire <= now and released < self.max_catch_up:
+                    runs.append(DueRun(schedule, fire, now - fire > self.misfire_grace))
+                    fire = parser.next_run(fire)
+                    released += 1
+                next_due = fire
+            elif schedule.catch_up == CatchUpPolicy.SKIP:
+                fire = due
+                if now - due > self.misfire_grace:
+                    fire = _first_fire_at_or_after(parser, now - self.misfire_grace)
+                if fire <= now:
+                    runs.append(DueRun(schedule, fire))
+                    next_due = parser.next_run(fire)
+                else:
+                    next_due = fire
             else:
-                # No next_run_at set, check if current time matches cron
-                if parser.matches(now):
-                    due_jobs.append(schedule)
+                runs.append(DueRun(schedule, due, now - due > self.misfire_grace))
+                next_due = parser.next_run(now)
 
-        return due_jobs
+            self._set_due(schedule, next_due)
+
+        runs.sort(key=lambda run: run.scheduled_for)
+        return runs
+
+    def next_wakeup(self) -> datetime | None:
+        """
+        Earliest fire time across enabled schedules.
+
+        Returns:
+            Datetime the caller may sleep until, or None when nothing is scheduled
+        """
+        heap = self._heap
+        while heap and self._due.get(heap[0][2], (None, -1))[1] != heap[0][1]:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
 
     def update_next_run(self, schedule_id: str) -> ScheduleSpec | None:
         """
@@ -210,20 +358,8 @@ class BackupScheduler:
             return None
 
         parser = self._parsers[schedule_id]
-        now = self._clock.now()
-        next_run = parser.next_run(now)
-
-        # Create updated schedule (immutable)
-        updated = ScheduleSpec(
-            schedule_id=schedule.schedule_id,
-            spec_id=schedule.spec_id,
-            cron_expr=schedule.cron_expr,
-            enabled=schedule.enabled,
-            next_run_at=next_run.isoformat(),
-        )
-
-        self._schedules[schedule_id] = updated
-        return updated
+        next_run = parser.next_run(self._clock.now())
+        return self._set_due(schedule, next_run)
 
     def list_schedules(self) -> list[ScheduleSpec]:
         """
@@ -234,8 +370,41 @@ class BackupScheduler:
         """
         return list(self._schedules.values())
 
+    def _set_due(self, schedule: ScheduleSpec, due: datetime) -> ScheduleSpec:
+        """Record ``due`` on the schedule (immutable) and queue it if enabled."""
+        schedule_id = schedule.schedule_id
+        if schedule.next_run_at != due.isoformat():
+            schedule = schedule.model_copy(update={"next_run_at": due.isoformat()})
+        self._schedules[schedule_id] = schedule
+
+        if not schedule.enabled:
+            self._due.pop(schedule_id, None)
+            return schedule
+        self._seq += 1
+        self._due[schedule_id] = (due, self._seq)
+        heapq.heappush(self._heap, (due, self._seq, schedule_id))
+        return schedule
+
+    def _take_due(self, now: datetime) -> list[tuple[datetime, int, str]]:
+        """Pop live heap entries due at ``now``; stale entries are dropped."""
+        heap = self._heap
+        entries: list[tuple[datetime, int, str]] = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if self._due.get(entry[2], (None, -1))[1] == entry[1]:
+                entries.append(entry)
+        return entries
+
+
+def _first_fire_at_or_after(parser: CronParser, moment: datetime) -> datetime:
+    """First fire time >= ``moment`` (``next_run`` is strictly after its minute)."""
+    if moment.second == 0 and moment.microsecond == 0:
+        return parser.next_run(moment - timedelta(minutes=1))
+    return parser.next_run(moment)
+
 
 __all__ = [
     "CronParser",
     "BackupScheduler",
+    "DueRun",
 ]
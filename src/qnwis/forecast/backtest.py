@@ -3,16 +3,28 @@ Backtesting framework for baseline forecasters.
 
 Implements rolling-origin (walk-forward) backtesting to evaluate forecast accuracy
 and method selection heuristics with deterministic tie-breaking.
+
+All candidate methods are evaluated in one pass by ``backtest_baselines``:
+forecast paths for every origin are produced incrementally (EWMA running
+level, seasonal-naive indexing, windowed mean and Theil-Sen over sliding
+windows) instead of refitting each baseline on ``series[:t]``, giving a
+folds x methods x horizons error tensor. Metrics are bit-for-bit identical to
+the per-fold refit; methods without an incremental path fall back to it.
 """
 
 from __future__ import annotations
 
 import math
-from collections.abc import Callable
-from dataclasses import dataclass
+import warnings
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
 from typing import Any, cast
 
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
 from .baselines import (
+    MAD_TO_SIGMA,
     ewma_forecast,
     robust_trend_forecast,
     rolling_mean_forecast,
@@ -20,9 +32,13 @@ from .baselines import (
 )
 
 ForecastFn = Callable[..., list[float | None]]
+MethodSpec = tuple[ForecastFn, dict[str, Any]]
 EPSILON = 1e-6
 DEFAULT_MIN_TRAIN = 24
 
+# Origins per vectorized Theil-Sen block (bounds the pairwise-slope matrix)
+_TREND_CHUNK = 2048
+
 
 @dataclass(frozen=True)
 class MethodSelection:
@@ -33,11 +49,13 @@ class MethodSelection:
         method: Name of the chosen method.
         leaderboard: Mapping of method -> metric dictionary (mae/mape/rmse/n).
         reasons: Deterministic rationale strings explaining the decision.
+        backtest: Full backtest of all candidates (None when none was run).
     """
 
     method: str
     leaderboard: dict[str, dict[str, float]]
     reasons: list[str]
+    backtest: BacktestResult | None = field(default=None, compare=False, repr=False)
 
 
 def _clean_series(series: list[float]) -> list[float]:
@@ -49,6 +67,293 @@ def _clean_series(series: list[float]) -> list[float]:
     ]
 
 
+def baseline_methods(season: int = 12) -> dict[str, MethodSpec]:
+    """Candidate baselines (and parameters) compared by ``choose_baseline``."""
+    return {
+        "seasonal_naive": (cast(ForecastFn, seasonal_naive), {"season": season}),
+        "ewma": (cast(ForecastFn, ewma_forecast), {"alpha": 0.3}),
+        "rolling_mean": (cast(ForecastFn, rolling_mean_forecast), {"window": 12}),
+        "robust_trend": (cast(ForecastFn, robust_trend_forecast), {"window": 24}),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Incremental forecast paths
+#
+# Each function returns an array (len(origins), horizon) holding the forecast
+# the baseline would produce when trained on ``values[:t]`` for every origin
+# t, with NaN where it would return None. Arithmetic mirrors baselines.py
+# operation for operation so results match exactly.
+# ---------------------------------------------------------------------------
+
+
+def _seasonal_naive_paths(
+    values: np.ndarray, origins: np.ndarray, horizon: int, season: int = 12
+) -> np.ndarray:
+    if season <= 0:
+        raise ValueError("season must be positive")
+    out = np.full((origins.size, horizon), np.nan)
+    ready = origins >= season
+    t = origins[ready]
+    for h in range(horizon):
+        out[ready, h] = values[t - season + (h % season)]
+    return out
+
+
+def _ewma_paths(
+    values: np.ndarray, origins: np.ndarray, horizon: int, alpha: float = 0.3
+) -> np.ndarray:
+    if not (0 < alpha <= 1):
+        raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+    data = values.tolist()
+    # Running level: O(1) update per observation; level[t] is the EWMA of
+    # data[:t] (0.0 for an empty history, as ewma_forecast returns)
+    level = [0.0] * (int(origins[-1]) + 1)
+    for t in range(1, len(level)):
+        if t == 1:
+            level[t] = data[0]
+        else:
+            level[t] = alpha * data[t - 1] + (1 - alpha) * level[t - 1]
+    levels = np.asarray(level)[origins]
+    return np.repeat(levels[:, None], horizon, axis=1)
+
+
+def _rolling_mean_paths(
+    values: np.ndarray, origins: np.ndarray, horizon: int, window: int = 12
+) -> np.ndarray:
+    if window <= 0:
+        raise ValueError("window must be positive")
+    means = np.full(origins.size, np.nan)
+    ready = origins >= window
+    if ready.any():
+        windows = sliding_window_view(values, window)[origins[ready] - window]
+        # Accumulate left to right like sum() so means are bit-identical
+        total = np.zeros(windows.shape[0])
+        for col in range(window):
+            total = total + windows[:, col]
+        means[ready] = total / window
+    return np.repeat(means[:, None], horizon, axis=1)
+
+
+def _robust_trend_paths(
+    values: np.ndarray, origins: np.ndarray, horizon: int, window: int = 24
+) -> np.ndarray:
+    if window < 2:
+        raise ValueError("window must be at least 2")
+    out = np.full((origins.size, horizon), np.nan)
+    steps = np.arange(1, horizon + 1)
+
+    # Origins with less history than the window fit on the whole prefix
+    short = np.flatnonzero(origins < window)
+    data = values.tolist()
+    for k in short:
+        out[k] = robust_trend_forecast(data[: int(origins[k])], window=window, horizon=horizon)
+
+    full = np.flatnonzero(origins >= window)
+    if full.size:
+        i_idx, j_idx = np.triu_indices(window, k=1)
+        deltas = (j_idx - i_idx).astype(float)
+        n_slopes = i_idx.size
+        mid = n_slopes // 2
+        windows_all = sliding_window_view(values, window)
+        for start in range(0, full.size, _TREND_CHUNK):
+            rows = full[start:start + _TREND_CHUNK]
+            windows = windows_all[origins[rows] - window]
+            slopes = np.sort((windows[:, j_idx] - windows[:, i_idx]) / deltas, axis=1)
+            if n_slopes % 2 == 0:
+                slope = (slopes[:, mid - 1] + slopes[:, mid]) / 2.0
+            else:
+                slope = slopes[:, mid]
+            out[rows] = windows[:, -1:] + slope[:, None] * steps
+    return out
+
+
+_INCREMENTAL_PATHS: dict[Callable[..., Any], Callable[..., np.ndarray]] = {
+    seasonal_naive: _seasonal_naive_paths,
+    ewma_forecast: _ewma_paths,
+    rolling_mean_forecast: _rolling_mean_paths,
+    robust_trend_forecast: _robust_trend_paths,
+}
+
+
+def _refit_paths(
+    method: ForecastFn,
+    kwargs: dict[str, Any],
+    values: np.ndarray,
+    origins: np.ndarray,
+    horizon: int,
+) -> np.ndarray:
+    """Per-origin refit for methods without an incremental path."""
+    out = np.full((origins.size, horizon), np.nan)
+    data = values.tolist()
+    for k, t in enumerate(origins.tolist()):
+        try:
+            forecast = method(data[:t], horizon=horizon, **kwargs)
+        except Exception:
+            continue  # Skip this fold if method fails
+        for h, yhat in enumerate((forecast or [])[:horizon]):
+            if isinstance(yhat, (int, float)):
+                out[k, h] = float(yhat)
+    return out
+
+
+def _forecast_paths(
+    method: ForecastFn,
+    kwargs: dict[str, Any],
+    values: np.ndarray,
+    origins: np.ndarray,
+    horizon: int,
+) -> np.ndarray:
+    incremental = _INCREMENTAL_PATHS.get(method)
+    if incremental is not None:
+        try:
+            return incremental(values, origins, horizon, **kwargs)
+        except (TypeError, ValueError):
+            pass  # Unsupported parameters: refit reproduces the baseline's behaviour
+    return _refit_paths(method, kwargs, values, origins, horizon)
+
+
+@dataclass(frozen=True)
+class BacktestResult:
+    """
+    Walk-forward forecasts of several methods over the same origins.
+
+    Attributes:
+        methods: Method names (axis 1 of ``forecasts``).
+        origins: Training length of each fold (axis 0).
+        forecasts: Array (folds, methods, horizons); NaN where no forecast.
+        actuals: Array (folds, horizons) of realised values.
+    """
+
+    methods: tuple[str, ...]
+    origins: np.ndarray
+    forecasts: np.ndarray
+    actuals: np.ndarray
+
+    @property
+    def horizon(self) -> int:
+        return int(self.forecasts.shape[2])
+
+    @property
+    def errors(self) -> np.ndarray:
+        """Actual minus forecast, shape (folds, methods, horizons)."""
+        return self.actuals[:, None, :] - self.forecasts
+
+    def metrics(self, method: str, step: int = 1) -> dict[str, float]:
+        """
+        Accuracy of ``method`` at forecast step ``step``.
+
+        Returns:
+            Dict with keys: mae, mape, rmse, n (rounded as by the per-fold backtest)
+        """
+        if self.origins.size == 0:
+            return _empty_metrics()
+        error = self.errors[:, self.methods.index(method), step - 1]
+        actual = self.actuals[:, step - 1]
+        keep = np.isfinite(error)
+        if not keep.any():
+            return _empty_metrics()
+        error = error[keep]
+        abs_error = np.abs(error)
+        abs_pct = abs_error / np.maximum(EPSILON, np.abs(actual[keep])) * 100.0
+        # Sequential sums (not numpy's pairwise ones) keep parity with sum()
+        count = int(error.size)
+        mae = sum(abs_error.tolist()) / count
+        rmse = math.sqrt(sum((error**2).tolist()) / count)
+        mape = sum(abs_pct.tolist()) / count
+        return {
+            "mae": round(mae, 4),
+            "mape": round(mape, 4) if math.isfinite(mape) else float("nan"),
+            "rmse": round(rmse, 4),
+            "n": count,
+        }
+
+    def summary(self, z: float = 1.96) -> dict[str, dict[str, list[float]]]:
+        """
+        MAE, MAPE, RMSE, n and interval coverage for every method and step.
+
+        Coverage is the share of folds whose error lies within the MAD
+        interval (``z`` * 1.4826 * median |error|) of that method and step.
+
+        Returns:
+            method -> metric -> list indexed by step - 1
+        """
+        errors = self.errors
+        finite = np.isfinite(errors)
+        count = finite.sum(axis=0)
+        abs_error = np.where(finite, np.abs(errors), 0.0)
+        denom = np.maximum(EPSILON, np.abs(self.actuals))[:, None, :]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mae = abs_error.sum(axis=0) / count
+            rmse = np.sqrt((abs_error**2).sum(axis=0) / count)
+            mape = (abs_error / denom * 100.0).sum(axis=0) / count
+            half_width = z * MAD_TO_SIGMA * _nanmedian(np.where(finite, np.abs(errors), np.nan))
+            covered = finite & (np.abs(np.nan_to_num(errors)) <= half_width)
+            coverage = covered.sum(axis=0) / count
+        return {
+            name: {
+                "mae": mae[k].tolist(),
+                "mape": mape[k].tolist(),
+                "rmse": rmse[k].tolist(),
+                "coverage": coverage[k].tolist(),
+                "n": count[k].tolist(),
+            }
+            for k, name in enumerate(self.methods)
+        }
+
+
+def _nanmedian(values: np.ndarray) -> np.ndarray:
+    """Column medians ignoring NaN; all-NaN columns give NaN without warnings."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        return np.nanmedian(values, axis=0) if values.shape[0] else np.full(values.shape[1:], np.nan)
+
+
+def _empty_metrics() -> dict[str, float]:
+    return {"mae": float("nan"), "mape": float("nan"), "rmse": float("nan"), "n": 0}
+
+
+def backtest_baselines(
+    series: list[float],
+    methods: Mapping[str, MethodSpec] | None = None,
+    *,
+    season: int = 12,
+    horizon: int = 1,
+    min_train: int = DEFAULT_MIN_TRAIN,
+) -> BacktestResult:
+    """
+    Rolling-origin backtest of several methods in one pass.
+
+    Folds use origins ``min_train .. len(series) - horizon`` (expanding
+    window); each method forecasts ``horizon`` steps from every origin.
+
+    Args:
+        series: Full time series (non-finite values are dropped)
+        methods: name -> (forecast function, kwargs); default ``baseline_methods(season)``
+        season: Seasonal period for the default method set
+        horizon: Number of forecast steps evaluated per fold
+        min_train: Minimum training window size
+
+    Returns:
+        BacktestResult with forecasts/actuals tensors
+    """
+    values = np.asarray(_clean_series(series), dtype=float)
+    specs = dict(methods) if methods is not None else baseline_methods(season)
+    names = tuple(specs)
+    horizon = max(1, horizon)
+    origins = np.arange(max(min_train, 0), values.size - horizon + 1)
+
+    forecasts = np.full((origins.size, len(names), horizon), np.nan)
+    if origins.size:
+        for k, name in enumerate(names):
+            method, kwargs = specs[name]
+            forecasts[:, k, :] = _forecast_paths(method, kwargs, values, origins, horizon)
+        actuals = values[origins[:, None] + np.arange(horizon)]
+    else:
+        actuals = np.empty((0, horizon))
+    return BacktestResult(methods=names, origins=origins, forecasts=forecasts, actuals=actuals)
+
+
 def rolling_origin_backtest(
     series: list[float],
     method: ForecastFn,
@@ -71,56 +376,11 @@ def rolling_origin_backtest(
     Returns:
         Dict with keys: mae, mape, rmse, n (number of test points)
     """
-    clean_series = _clean_series(series)
-    if len(clean_series) < min_train + horizon:
-        return {"mae": float("nan"), "mape": float("nan"), "rmse": float("nan"), "n": 0}
-
-    errors: list[float] = []
-    abs_pct_errors: list[float] = []
-    squared_errors: list[float] = []
-
-    # Walk forward: start with min_train, expand by 1 each iteration
-    for t in range(min_train, len(clean_series) - horizon + 1):
-        train = clean_series[:t]
-        actual = clean_series[t : t + horizon]
-
-        # Generate forecast
-        try:
-            forecast = method(train, horizon=horizon, **method_kwargs)
-        except Exception:
-            continue  # Skip this fold if method fails
-
-        # Compare first forecast point (one-step-ahead)
-        if not forecast or forecast[0] is None:
-            continue
-        yhat = forecast[0]
-        y = actual[0]
-        if not math.isfinite(yhat) or not math.isfinite(y):
-            continue
-
-        # Compute errors
-        error = y - yhat
-        errors.append(abs(error))
-        squared_errors.append(error**2)
-
-        # Safe MAPE computation (avoid division by zero)
-        denom = max(EPSILON, abs(y))
-        abs_pct_errors.append(abs(error) / denom * 100.0)
-
-    if not errors:
-        return {"mae": float("nan"), "mape": float("nan"), "rmse": float("nan"), "n": 0}
-
-    # Compute metrics
-    mae = sum(errors) / len(errors)
-    rmse = math.sqrt(sum(squared_errors) / len(squared_errors))
-    mape = sum(abs_pct_errors) / len(abs_pct_errors) if abs_pct_errors else float("nan")
-
-    return {
-        "mae": round(mae, 4),
-        "mape": round(mape, 4) if math.isfinite(mape) else float("nan"),
-        "rmse": round(rmse, 4),
-        "n": len(errors),
-    }
+    result = backtest_baselines(
+        series, {"method": (method, method_kwargs)}, horizon=horizon, min_train=min_train
+    )
+    # Compare first forecast point (one-step-ahead)
+    return result.metrics("method", step=1)
 
 
 def _finite_metric(value: float) -> float:
@@ -164,29 +424,18 @@ def choose_baseline(
             reasons=reasons,
         )
 
-    methods: dict[str, tuple[ForecastFn, dict[str, Any]]] = {
-        "seasonal_naive": (cast(ForecastFn, seasonal_naive), {"season": season}),
-        "ewma": (cast(ForecastFn, ewma_forecast), {"alpha": 0.3}),
-        "rolling_mean": (cast(ForecastFn, rolling_mean_forecast), {"window": 12}),
-        "robust_trend": (cast(ForecastFn, robust_trend_forecast), {"window": 24}),
-    }
-
+    backtest = backtest_baselines(clean_series, season=season, horizon=1, min_train=min_train)
     leaderboard: dict[str, dict[str, float]] = {}
 
-    for name, (func, kwargs) in methods.items():
-        try:
-            metrics = rolling_origin_backtest(
-                clean_series, func, horizon=1, min_train=min_train, **kwargs
-            )
-        except Exception:
-            continue  # Skip methods that fail
+    for name in backtest.methods:
+        metrics = backtest.metrics(name)
         mae = metrics.get("mae", float("nan"))
         if math.isfinite(mae):
             leaderboard[name] = metrics
 
     if not leaderboard:
         reasons.append("All method backtests failed; defaulting to ewma.")
-        return MethodSelection(method="ewma", leaderboard={}, reasons=reasons)
+        return MethodSelection(method="ewma", leaderboard={}, reasons=reasons, backtest=backtest)
 
     def sort_key(item: tuple[str, dict[str, float]]) -> tuple[float, float, float, str]:
         name, metrics = item
@@ -244,4 +493,6 @@ def choose_baseline(
                 f">= delta={seasonal_win_delta:.4f}."
             )
 
-    return MethodSelection(method=winner, leaderboard=leaderboard, reasons=reasons)
+    return MethodSelection(
+        method=winner, leaderboard=leaderboard, reasons=reasons, backtest=backtest
+    )
@@ -12,6 +12,12 @@ All methods are deterministic and citation-ready.
 from __future__ import annotations
 
 import math
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .backtest import BacktestResult
 
 
 def band_breach(actual: float, yhat: float, half_width: float) -> bool:
@@ -29,6 +35,44 @@ def band_breach(actual: float, yhat: float, half_width: float) -> bool:
     return abs(actual - yhat) > half_width
 
 
+def backtest_band_breaches(
+    result: BacktestResult,
+    method: str,
+    half_width: float,
+    step: int = 1,
+) -> dict[str, float]:
+    """
+    Apply ``band_breach`` to every fold of a backtest at once.
+
+    Gives the historical breach rate of the band used for the latest
+    observation, so a single breach can be read against how often the
+    baseline's band is normally exceeded.
+
+    Args:
+        result: Backtest from ``backtest_baselines`` / ``choose_baseline``
+        method: Method whose forecasts define the band
+        half_width: Prediction interval half-width
+        step: Forecast step to evaluate (1 = one-step-ahead)
+
+    Returns:
+        Dict with keys: breaches, n, breach_rate (NaN when no folds)
+    """
+    if method not in result.methods or result.origins.size == 0:
+        return {"breaches": 0, "n": 0, "breach_rate": float("nan")}
+
+    yhat = result.forecasts[:, result.methods.index(method), step - 1]
+    actual = result.actuals[:, step - 1]
+    valid = np.isfinite(yhat)
+    breached = np.abs(actual[valid] - yhat[valid]) > half_width
+    n = int(valid.sum())
+    breaches = int(breached.sum())
+    return {
+        "breaches": breaches,
+        "n": n,
+        "breach_rate": round(breaches / n, 4) if n else float("nan"),
+    }
+
+
 def slope_reversal(recent: list[float], window: int = 3) -> bool:
     """
     Detect if recent slope opposes prior windowed slope.
@@ -2,7 +2,10 @@
 CLI job to create and refresh materialized views.
 
 Reads MV specifications from YAML, renders SQL from query registry,
-and materializes views with proper indexing.
+and materializes views with proper indexing. Views are refreshed in
+dependency order; unchanged views are skipped when a watermark probe and
+state file are supplied, and independent views run in parallel when a
+connection factory is supplied.
 """
 
 from __future__ import annotations
@@ -10,10 +13,18 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from collections.abc import Callable
 from typing import Any
 
 from ..data.deterministic.registry import DEFAULT_QUERY_ROOT, QueryRegistry
-from ..data.materialized.postgres import PostgresMaterializer
+from ..data.materialized.planner import (
+    AdapterPool,
+    MaterializedRefreshError,
+    RefreshState,
+    WatermarkProbe,
+    build_refresh_plan,
+    run_refresh,
+)
 from ..data.materialized.registry import MaterializedRegistry
 
 
@@ -28,16 +39,30 @@ def _resolve_query_registry(db: Any) -> Any:
     return registry
 
 
-def main(db: Any, registry_path: str) -> None:
+def main(
+    db: Any,
+    registry_path: str,
+    *,
+    connect: Callable[[], Any] | None = None,
+    workers: int = 4,
+    state_path: str | None = None,
+    probe: WatermarkProbe | None = None,
+) -> None:
     """
     Ensure all materialized views are created/refreshed.
 
     Args:
         db: Database adapter with execute_sql and query_registry
         registry_path: Path to MV definitions YAML
+        connect: Optional factory for extra adapters; enables parallel refresh
+        workers: Maximum pooled adapters when ``connect`` is given
+        state_path: JSON file keeping watermarks between runs
+        probe: Source-table watermark function (e.g. postgres_watermark)
+
+    Raises:
+        MaterializedRefreshError: If any view failed or was blocked
     """
     reg = MaterializedRegistry(registry_path)
-    mat = PostgresMaterializer(db)
     query_registry = _resolve_query_registry(db)
 
     if not hasattr(query_registry, "render_select"):
@@ -45,15 +70,40 @@ def main(db: Any, registry_path: str) -> None:
             "Query registry must expose a 'render_select(sql_id, params)' method."
         )
 
-    created: list[dict[str, str]] = []
-    for spec in reg.specs:
+    def render(spec: dict[str, Any]) -> str:
         # Validate the query exists in the registry
         query_registry.get(spec["sql_id"])
-        sql_select = query_registry.render_select(spec["sql_id"], spec["params"])
-        mat.create_or_replace(spec["name"], sql_select, spec["indexes"])
-        created.append({"name": spec["name"], "sql_id": spec["sql_id"]})
+        return query_registry.render_select(spec["sql_id"], spec["params"])
 
-    print(json.dumps({"materialized": created}, separators=(",", ":"), sort_keys=True))
+    plan = build_refresh_plan(reg.specs, render)
+    pool = AdapterPool(connect, workers) if connect is not None else None
+    try:
+        outcomes = run_refresh(
+            plan, db, pool=pool, state=RefreshState(state_path), probe=probe
+        )
+    finally:
+        if pool is not None:
+            pool.close()
+
+    done = ("created", "rebuilt", "refreshed")
+    report = {
+        "materialized": [
+            {"name": o.name, "sql_id": o.sql_id, "action": o.action}
+            for o in outcomes
+            if o.action in done
+        ],
+        "skipped": [o.name for o in outcomes if o.action == "skipped"],
+        "failed": [
+            {"name": o.name, "action": o.action, "error": o.error}
+            for o in outcomes
+            if o.action not in done and o.action != "skipped"
+        ],
+        "duration_ms": {o.name: round(o.duration_s * 1000, 1) for o in outcomes},
+    }
+    print(json.dumps(report, separators=(",", ":"), sort_keys=True))
+    if report["failed"]:
+        names = ", ".join(f["name"] for f in report["failed"])
+        raise MaterializedRefreshError(f"Materialized views not refreshed: {names}")
 
 
 if __name__ == "__main__":
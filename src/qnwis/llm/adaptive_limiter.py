@@ -0,0 +1,397 @@
+"""
+Adaptive concurrency limiter shared by scenarios, debate agents and Engine B.
+
+Fixed semaphores (``MAX_CONCURRENT_SCENARIOS = 2``, per-batch semaphores in the
+dual-engine orchestrator) either leave LLM capacity idle or overrun it when
+Azure TPM headroom or the number of vLLM instances changes. This limiter
+learns the usable concurrency at runtime with AIMD:
+
+- additive increase: after each healthy window in which the limit was
+  actually reached, the limit grows by ``increase_step``
+- multiplicative decrease: on a 429/timeout, or when window p95 latency
+  exceeds ``latency_tolerance`` x the learned baseline, the limit is
+  multiplied by ``backoff_factor`` (at most once per in-flight generation)
+
+Leaf calls (LLM requests, Engine B compute calls) hold slots via ``slot``.
+Coarse tasks such as whole scenarios are admitted through a ``TaskGate``
+whose capacity is derived from the same limit, so the budget is shared
+without a scenario ever holding a slot its own LLM calls need.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from .exceptions import LLMRateLimitError, LLMTimeoutError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdaptiveLimitConfig:
+    """Tuning knobs for the AIMD controller."""
+
+    # Two 4-agent scenarios at start, matching the old fixed
+    # MAX_CONCURRENT_SCENARIOS = 2 before any history is learned
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 64
+
+    # Completions per evaluation window
+    window: int = 20
+
+    # Back off when window p95 > tolerance x baseline latency
+    latency_tolerance: float = 2.0
+    # Back off when more than this fraction of the window was 429/timeout
+    max_overload_rate: float = 0.05
+
+    increase_step: int = 1
+    backoff_factor: float = 0.7
+
+    # How fast the latency baseline drifts up towards current p50 (0-1)
+    baseline_drift: float = 0.05
+
+
+@dataclass
+class LimiterMetrics:
+    """Counters exported alongside the live limit."""
+
+    total_acquired: int = 0
+    total_overloads: int = 0
+    increases: int = 0
+    decreases: int = 0
+    queue_delays: Deque[float] = field(default_factory=lambda: deque(maxlen=200))
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))
+    return ordered[index]
+
+
+def is_overload_error(exc: BaseException) -> bool:
+    """True for errors that signal the backend is saturated (429s, timeouts)."""
+    if isinstance(exc, (LLMRateLimitError, LLMTimeoutError, asyncio.TimeoutError, TimeoutError)):
+        return True
+    status_code = getattr(exc, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(exc, "response", None), "status_code", None)
+    if status_code in (429, 503):
+        return True
+    # httpx.TimeoutException and friends, without importing httpx here
+    return "Timeout" in type(exc).__name__
+
+
+class Lease:
+    """A held slot; call ``mark_overloaded`` for non-exception overload signals."""
+
+    __slots__ = ("kind", "generation", "started", "overloaded")
+
+    def __init__(self, kind: str, generation: int) -> None:
+        self.kind = kind
+        self.generation = generation
+        self.started = time.perf_counter()
+        self.overloaded = False
+
+    def mark_overloaded(self) -> None:
+        self.overloaded = True
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter with one budget across call kinds.
+
+    Waiters are plain futures on the running loop, so one process-wide
+    instance can serve several event loops (e.g. tests) safely.
+    """
+
+    def __init__(self, config: Optional[AdaptiveLimitConfig] = None, name: str = "default"):
+        self.config = config or AdaptiveLimitConfig()
+        self.name = name
+        self.metrics = LimiterMetrics()
+
+        self._limit = float(
+            min(self.config.max_limit, max(self.config.min_limit, self.config.initial_limit))
+        )
+        self._in_flight = 0
+        self._in_flight_by_kind: Dict[str, int] = {}
+        self._waiters: Deque[asyncio.Future] = deque()
+
+        # Bumped on every decrease; leases started before it cannot trigger
+        # another decrease (one backoff per congestion event)
+        self._generation = 0
+
+        self._latencies: list[float] = []
+        self._overloads = 0
+        self._window_peak = 0
+        self._baseline_s: Optional[float] = None
+        self._last_p95_s = 0.0
+
+        self._gates: weakref.WeakSet[TaskGate] = weakref.WeakSet()
+
+    # ------------------------------------------------------------------
+    # Live state
+    # ------------------------------------------------------------------
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    # ------------------------------------------------------------------
+    # Acquire / release
+    # ------------------------------------------------------------------
+
+    async def acquire(self, kind: str = "llm") -> Lease:
+        """Wait for a slot under the current limit."""
+        queued_at = time.perf_counter()
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Hand a wake-up we may have consumed to the next waiter
+                self._wake()
+                raise
+
+        self._in_flight += 1
+        self._in_flight_by_kind[kind] = self._in_flight_by_kind.get(kind, 0) + 1
+        self._window_peak = max(self._window_peak, self._in_flight)
+        self.metrics.total_acquired += 1
+        self.metrics.queue_delays.append(time.perf_counter() - queued_at)
+        return Lease(kind, self._generation)
+
+    def release(self, lease: Lease, *, error: Optional[BaseException] = None) -> None:
+        """Return a slot and feed its outcome into the controller."""
+        self._in_flight -= 1
+        self._in_flight_by_kind[lease.kind] -= 1
+
+        overloaded = lease.overloaded or (error is not None and is_overload_error(error))
+        if overloaded:
+            self.metrics.total_overloads += 1
+            self._overloads += 1
+            if lease.generation == self._generation:
+                self._decrease("overload")
+        elif error is None:
+            self._latencies.append(time.perf_counter() - lease.started)
+
+        if len(self._latencies) + self._overloads >= self.config.window:
+            self._evaluate_window()
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self, kind: str = "llm") -> AsyncIterator[Lease]:
+        """
+        Hold one slot of the shared budget for the duration of a call.
+
+        Example:
+            ```python
+            async with get_adaptive_limiter().slot("engine_b") as lease:
+                resp = await client.post(url, json=payload)
+                if resp.status_code == 429:
+                    lease.mark_overloaded()
+            ```
+        """
+        lease = await self.acquire(kind)
+        try:
+            yield lease
+        except BaseException as exc:
+            self.release(lease, error=exc)
+            raise
+        else:
+            self.release(lease)
+
+    def gate(self, units_per_task: int = 4, *, max_tasks: Optional[int] = None) -> "TaskGate":
+        """Admission gate for coarse tasks sized from the shared limit."""
+        gate = TaskGate(self, units_per_task, max_tasks=max_tasks)
+        self._gates.add(gate)
+        return gate
+
+    # ------------------------------------------------------------------
+    # Controller
+    # ------------------------------------------------------------------
+
+    def _evaluate_window(self) -> None:
+        cfg = self.config
+        samples = len(self._latencies) + self._overloads
+        overload_rate = self._overloads / samples if samples else 0.0
+        p50 = _percentile(self._latencies, 0.5)
+        p95 = _percentile(self._latencies, 0.95)
+        saturated = self._window_peak >= self.limit
+
+        if self._latencies:
+            if self._baseline_s is None or p50 < self._baseline_s:
+                self._baseline_s = p50
+            else:
+                self._baseline_s += (p50 - self._baseline_s) * cfg.baseline_drift
+        self._last_p95_s = p95
+
+        slow = (
+            self._baseline_s is not None
+            and self._baseline_s > 0
+            and p95 > self._baseline_s * cfg.latency_tolerance
+        )
+        if overload_rate > cfg.max_overload_rate or slow:
+            self._decrease("latency" if slow else "overload_rate")
+        elif saturated and self._limit < cfg.max_limit:
+            self._limit = min(float(cfg.max_limit), self._limit + cfg.increase_step)
+            self.metrics.increases += 1
+            logger.debug(
+                "Adaptive limiter %s: limit -> %d (p95=%.3fs, baseline=%.3fs)",
+                self.name, self.limit, p95, self._baseline_s or 0.0,
+            )
+
+        self._latencies = []
+        self._overloads = 0
+        self._window_peak = self._in_flight
+
+    def _decrease(self, reason: str) -> None:
+        cfg = self.config
+        self._limit = max(float(cfg.min_limit), math.floor(self._limit * cfg.backoff_factor))
+        self._generation += 1
+        self.metrics.decreases += 1
+        logger.info(
+            "Adaptive limiter %s: backing off (%s), limit -> %d, in_flight=%d",
+            self.name, reason, self.limit, self._in_flight,
+        )
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done() or waiter.get_loop().is_closed():
+                continue
+            waiter.set_result(None)
+            free -= 1
+        for gate in list(self._gates):
+            gate._wake()
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Current limit, in-flight count and queueing delay for monitoring."""
+        delays = list(self.metrics.queue_delays)
+        return {
+            "limiter": self.name,
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "in_flight_by_kind": {k: v for k, v in self._in_flight_by_kind.items() if v},
+            "queued": self.queued,
+            "queue_delay_ms_avg": (sum(delays) / len(delays) * 1000) if delays else 0.0,
+            "queue_delay_ms_p95": _percentile(delays, 0.95) * 1000,
+            "latency_p95_ms": self._last_p95_s * 1000,
+            "latency_baseline_ms": (self._baseline_s or 0.0) * 1000,
+            "total_acquired": self.metrics.total_acquired,
+            "total_overloads": self.metrics.total_overloads,
+            "increases": self.metrics.increases,
+            "decreases": self.metrics.decreases,
+        }
+
+
+class TaskGate:
+    """
+    Admits coarse tasks (scenarios) in proportion to the shared limit.
+
+    A task expected to issue ``units_per_task`` concurrent leaf calls is
+    admitted while ``running < limit // units_per_task`` (at least one,
+    at most ``max_tasks``). Gates do not hold leaf slots themselves.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        units_per_task: int,
+        *,
+        max_tasks: Optional[int] = None,
+    ) -> None:
+        self.limiter = limiter
+        self.units_per_task = max(1, units_per_task)
+        self.max_tasks = max_tasks
+        self.running = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def capacity(self) -> int:
+        capacity = max(1, self.limiter.limit // self.units_per_task)
+        if self.max_tasks is not None:
+            capacity = min(capacity, max(1, self.max_tasks))
+        return capacity
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        while self.running >= self.capacity:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                self._wake()
+                raise
+        self.running += 1
+        try:
+            yield
+        finally:
+            self.running -= 1
+            self._wake()
+
+    def _wake(self) -> None:
+        free = self.capacity - self.running
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done() or waiter.get_loop().is_closed():
+                continue
+            waiter.set_result(None)
+            free -= 1
+
+
+# Process-wide budget shared by every scenario, agent and Engine B call
+_adaptive_limiter: Optional[AdaptiveConcurrencyLimiter] = None
+
+
+def get_adaptive_limiter(config: Optional[AdaptiveLimitConfig] = None) -> AdaptiveConcurrencyLimiter:
+    """
+    Get the shared adaptive limiter.
+
+    ``config`` only applies when the limiter is first created.
+    """
+    global _adaptive_limiter
+    if _adaptive_limiter is None:
+        _adaptive_limiter = AdaptiveConcurrencyLimiter(config=config, name="shared")
+    return _adaptive_limiter
+
+
+def reset_adaptive_limiter() -> None:
+    """Drop the shared limiter (tests, config reloads)."""
+    global _adaptive_limiter
+    _adaptive_limiter = None
+
+
+__all__ = [
+    "AdaptiveConcurrencyLimiter",
+    "AdaptiveLimitConfig",
+    "Lease",
+    "TaskGate",
+    "get_adaptive_limiter",
+    "is_overload_error",
+    "reset_adaptive_limiter",
+]
@@ -17,6 +17,7 @@ from typing import AsyncIterator, Optional, Dict, Any
 
 import httpx
 
+from src.qnwis.llm.adaptive_limiter import get_adaptive_limiter
 from src.qnwis.llm.config import LLMConfig, get_llm_config
 from src.qnwis.llm.model_router import get_router, ModelConfig
 from src.qnwis.llm.exceptions import (
@@ -607,15 +608,17 @@ This analysis examines strategic development pathways for economic diversificati
             Complete generated text
         """
         response = ""
-        async for token in self.generate_stream(
-            prompt=prompt,
-            system=system,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            stop=stop,
-            extra=extra
-        ):
-            response += token
+        # Shared adaptive budget across scenarios, agents and Engine B
+        async with get_adaptive_limiter().slot("llm"):
+            async for token in self.generate_stream(
+                prompt=prompt,
+                system=system,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stop=stop,
+                extra=extra
+            ):
+                response += token
         return response
 
     async def ainvoke(
@@ -761,7 +764,8 @@ This analysis examines strategic development pathways for economic diversificati
         )
         
         try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
+            async with httpx.AsyncClient(timeout=timeout) as client, \
+                    get_adaptive_limiter().slot("llm"):
                 response = await client.post(url, json=payload, headers=headers)
                 
                 if response.status_code == 429:
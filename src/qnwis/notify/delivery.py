@@ -0,0 +1,180 @@
+"""
+Async delivery pipeline for the notification dispatcher.
+
+Each channel has a bounded queue drained by a small pool of workers, so a
+slow or failing channel neither blocks the others nor grows memory without
+bound: producers wait when a queue is full. Sends are retried with
+exponential backoff; synchronous channel handlers run in worker threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .models import Channel, Notification
+
+if TYPE_CHECKING:
+    from .dispatcher import NotificationDispatcher
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DeliveryStats:
+    """Counters for one pipeline."""
+
+    submitted: int = 0
+    admitted: int = 0
+    sent: int = 0
+    retries: int = 0
+    failed: int = 0
+
+
+def _is_retryable(result: str) -> bool:
+    """Transient failures are retried; configuration errors are not."""
+    return result.startswith("error:") and "not configured" not in result
+
+
+class DeliveryPipeline:
+    """
+    Per-channel async workers behind a dispatcher.
+
+    Gating (dedupe, rate limit, suppression) and ledger writes stay in the
+    dispatcher; the pipeline only moves admitted notifications to channels.
+    Bound to the event loop it was created on.
+    """
+
+    def __init__(
+        self,
+        dispatcher: NotificationDispatcher,
+        *,
+        queue_size: int = 1000,
+        workers_per_channel: int = 16,
+        max_retries: int = 2,
+        retry_backoff_s: float = 0.05,
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            dispatcher: Dispatcher providing gating, handlers and the ledger
+            queue_size: Bound of each channel queue
+            workers_per_channel: Concurrent sends per channel
+            max_retries: Retries after a failed send
+            retry_backoff_s: First retry delay (doubled per attempt)
+        """
+        self.dispatcher = dispatcher
+        self.queue_size = queue_size
+        self.workers_per_channel = workers_per_channel
+        self.max_retries = max_retries
+        self.retry_backoff_s = retry_backoff_s
+        self.loop = asyncio.get_running_loop()
+        self.stats = DeliveryStats()
+
+        self._queues: dict[Channel, asyncio.Queue[tuple[Notification, asyncio.Future[str]]]] = {}
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def submit(self, notification: Notification) -> dict[str, str]:
+        """
+        Gate, deliver to every channel, and persist one notification.
+
+        Returns:
+            Per-channel results, or {"status": ...} when not admitted
+        """
+        self.stats.submitted += 1
+        status = self.dispatcher.admit(notification)
+        if status is not None:
+            return {"status": status}
+        self.stats.admitted += 1
+
+        pending: list[tuple[Channel, asyncio.Future[str]]] = []
+        for channel in notification.channels:
+            future: asyncio.Future[str] = self.loop.create_future()
+            await self._queue(channel).put((notification, future))
+            pending.append((channel, future))
+
+        results: dict[str, str] = {}
+        for channel, future in pending:
+            results[channel.value] = await future
+
+        self.dispatcher._persist_to_ledger(notification, results)
+        return results
+
+    async def aclose(self) -> None:
+        """Wait for queued deliveries, then stop the workers."""
+        for queue in self._queues.values():
+            await queue.join()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
+
+    def _queue(self, channel: Channel) -> asyncio.Queue[tuple[Notification, asyncio.Future[str]]]:
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.queue_size)
+            self._queues[channel] = queue
+            for i in range(self.workers_per_channel):
+                self._workers.append(
+                    self.loop.create_task(
+                        self._worker(channel, queue), name=f"notify-{channel.value}-{i}"
+                    )
+                )
+        return queue
+
+    async def _worker(
+        self,
+        channel: Channel,
+        queue: asyncio.Queue[tuple[Notification, asyncio.Future[str]]],
+    ) -> None:
+        while True:
+            notification, future = await queue.get()
+            try:
+                result = await self._deliver(channel, notification)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_result("error: delivery cancelled")
+                raise
+            finally:
+                queue.task_done()
+
+    async def _deliver(self, channel: Channel, notification: Notification) -> str:
+        """Send with retries; failures become ``"error: ..."`` results."""
+        result = "error: not sent"
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.stats.retries += 1
+                await asyncio.sleep(self.retry_backoff_s * 2 ** (attempt - 1))
+            try:
+                result = await self._send(channel, notification)
+            except Exception as e:
+                logger.error(f"Failed to send to {channel} (attempt {attempt + 1}): {e}")
+                result = f"error: {e}"
+            if not _is_retryable(result):
+                break
+
+        if result.startswith("error:"):
+            self.stats.failed += 1
+        else:
+            self.stats.sent += 1
+        return result
+
+    async def _send(self, channel: Channel, notification: Notification) -> str:
+        dispatcher = self.dispatcher
+        handler = dispatcher._channel_handler(channel)
+        if not handler or dispatcher.dry_run:
+            # Dry runs and missing handlers never touch the network
+            return dispatcher._send_to_channel(channel, notification)
+        if inspect.iscoroutinefunction(handler.send):
+            return await handler.send(notification)
+        return await asyncio.to_thread(handler.send, notification)
+
+
+__all__ = ["DeliveryPipeline", "DeliveryStats"]
@@ -2,20 +2,30 @@
 Notification dispatcher with deduplication, rate-limiting, and multi-channel fan-out.
 
 All operations are deterministic and use injected timestamps for testability.
+Incidents go to the shared buffered ledger (see ``ledger``); dedupe keys and
+rate-limit windows are recovered from it on startup. ``dispatch_async`` and
+``dispatch_many`` deliver through per-channel async workers (see
+``delivery``).
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Protocol
 
+from .ledger import get_ledger
 from .models import Channel, Incident, IncidentState, Notification
 
 if TYPE_CHECKING:
     from ..utils.clock import Clock
+    from .delivery import DeliveryPipeline
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +46,7 @@ class NotificationDispatcher:
     - Suppression windows
     - Multi-channel fan-out with dry-run support
     - Audit ledger with HMAC integrity
+    - Async per-channel delivery with bounded queues and retries
     """
 
     def __init__(
@@ -45,6 +56,7 @@ class NotificationDispatcher:
         rate_limit_per_rule: int = 10,
         rate_limit_window_minutes: int = 60,
         dry_run: bool = True,
+        dedupe_ttl_minutes: int = 1440,
     ):
         """
         Initialize dispatcher.
@@ -55,6 +67,7 @@ class NotificationDispatcher:
             rate_limit_per_rule: Max notifications per rule in window
             rate_limit_window_minutes: Rate limit window duration
             dry_run: If True, no actual notifications are sent
+            dedupe_ttl_minutes: How long a notification id stays deduplicated
         """
         self.clock = clock
         self.ledger_dir = ledger_dir or Path("docs/audit/incidents")
@@ -62,14 +75,49 @@ class NotificationDispatcher:
         self.rate_limit_per_rule = rate_limit_per_rule
         self.rate_limit_window_minutes = rate_limit_window_minutes
         self.dry_run = dry_run
+        self.dedupe_ttl_minutes = dedupe_ttl_minutes
+        self.ledger = get_ledger(self.ledger_dir)
 
-        # In-memory state (would use Redis in production)
-        self._seen_keys: set[str] = set()
+        # In-memory state, recovered from the ledger
+        self._seen_keys: dict[str, float] = {}  # notification_id -> expires_at_ts
+        self._seen_order: deque[tuple[float, str]] = deque()
         self._rate_counters: dict[str, list[float]] = {}  # rule_id -> [timestamps]
         self._suppressions: dict[str, float] = {}  # rule_id -> suppress_until_ts
 
         # Channel handlers (lazy-loaded)
         self._channels: dict[Channel, NotificationChannel] = {}
+        self._pipeline: DeliveryPipeline | None = None
+
+        self._recover_state()
+
+    def _recover_state(self) -> None:
+        """Rebuild dedupe keys and rate-limit windows from recent ledger incidents."""
+        # Ledger times are wall-clock; rate/dedupe state uses clock.time()
+        now = self.clock.time()
+        offset = now - self.clock.now().timestamp()
+        dedupe_from = now - self.dedupe_ttl_minutes * 60
+        rate_from = now - self.rate_limit_window_minutes * 60
+        recent: list[tuple[float, Incident]] = []
+        for incident in self.ledger.incidents():
+            try:
+                created = datetime.fromisoformat(incident.created_at).timestamp() + offset
+            except ValueError:
+                continue
+            if dedupe_from <= created <= now:
+                recent.append((created, incident))
+
+        recent.sort(key=lambda item: item[0])
+        for created, incident in recent:
+            self._remember(incident.notification_id, created)
+            if created >= rate_from:
+                self._rate_counters.setdefault(incident.rule_id, []).append(created)
+        if recent:
+            logger.info(f"Recovered {len(recent)} recent notifications from ledger")
+
+    def _remember(self, key: str, seen_at: float) -> None:
+        expires_at = seen_at + self.dedupe_ttl_minutes * 60
+        self._seen_keys[key] = expires_at
+        self._seen_order.append((expires_at, key))
 
     def compute_idempotency_key(
         self,
@@ -118,28 +166,86 @@ class NotificationDispatcher:
         """
         logger.info(f"Dispatching notification {notification.notification_id} (dry_run={self.dry_run})")
 
-        # Step 1: Deduplication
+        # Steps 1-3: Deduplication, rate limit, suppression window
+        status = self.admit(notification)
+        if status is not None:
+            return {"status": status}
+
+        # Step 4: Fan-out
+        results = self._fanout(notification)
+
+        # Step 5: Persist
+        self._persist_to_ledger(notification, results)
+
+        return results
+
+    async def dispatch_async(self, notification: Notification) -> dict[str, str]:
+        """
+        Dispatch through the async delivery pipeline.
+
+        Same pipeline and results as :meth:`dispatch`; channels are sent
+        concurrently by per-channel workers, with retries.
+        """
+        return await self._get_pipeline().submit(notification)
+
+    async def dispatch_many(self, notifications: Iterable[Notification]) -> list[dict[str, str]]:
+        """
+        Dispatch a batch (e.g. an alert storm) through the async pipeline.
+
+        Returns:
+            Results in the order of ``notifications``
+        """
+        pipeline = self._get_pipeline()
+        return list(await asyncio.gather(*(pipeline.submit(n) for n in notifications)))
+
+    async def aclose(self) -> None:
+        """Drain and stop the async delivery workers and flush the ledger."""
+        if self._pipeline is not None:
+            await self._pipeline.aclose()
+            self._pipeline = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Write buffered ledger entries to disk."""
+        self.ledger.flush(fsync=True)
+
+    def register_channel(self, channel: Channel, handler: NotificationChannel) -> None:
+        """
+        Use ``handler`` for ``channel`` instead of the built-in channel.
+
+        Handlers may define ``send`` as a coroutine function.
+        """
+        self._channels[channel] = handler
+
+    def _get_pipeline(self) -> DeliveryPipeline:
+        from .delivery import DeliveryPipeline
+
+        loop = asyncio.get_running_loop()
+        if self._pipeline is None or self._pipeline.loop is not loop:
+            self._pipeline = DeliveryPipeline(self)
+        return self._pipeline
+
+    def admit(self, notification: Notification) -> str | None:
+        """
+        Run the dedupe, rate-limit and suppression checks.
+
+        Returns:
+            None if the notification should be sent, otherwise the status
+            ("deduplicated", "rate_limited" or "suppressed")
+        """
         if not self._check_dedupe(notification):
             logger.info(f"Notification {notification.notification_id} deduplicated (already seen)")
-            return {"status": "deduplicated"}
+            return "deduplicated"
 
-        # Step 2: Rate limit
         if not self._check_rate_limit(notification):
             logger.warning(f"Notification {notification.notification_id} rate-limited")
-            return {"status": "rate_limited"}
+            return "rate_limited"
 
-        # Step 3: Suppression window
         if self._is_suppressed(notification):
             logger.info(f"Notification {notification.notification_id} suppressed")
-            return {"status": "suppressed"}
+            return "suppressed"
 
-        # Step 4: Fan-out
-        results = self._fanout(notification)
-
-        # Step 5: Persist
-        self._persist_to_ledger(notification, results)
-
-        return results
+        return None
 
     def _check_dedupe(self, notification: Notification) -> bool:
         """
@@ -151,10 +257,16 @@ class NotificationDispatcher:
         Returns:
             True if unique, False if duplicate
         """
+        now = self.clock.time()
+        while self._seen_order and self._seen_order[0][0] <= now:
+            expires_at, expired = self._seen_order.popleft()
+            if self._seen_keys.get(expired) == expires_at:
+                del self._seen_keys[expired]
+
         key = notification.notification_id
         if key in self._seen_keys:
             return False
-        self._seen_keys.add(key)
+        self._remember(key, now)
         return True
 
     def _check_rate_limit(self, notification: Notification) -> bool:
@@ -238,11 +350,7 @@ class NotificationDispatcher:
         Returns:
             Status string
         """
-        # Lazy-load channel handler
-        if channel not in self._channels:
-            self._load_channel(channel)
-
-        handler = self._channels.get(channel)
+        handler = self._channel_handler(channel)
         if not handler:
             return "error: channel not configured"
 
@@ -253,6 +361,12 @@ class NotificationDispatcher:
         # Delegate to channel handler
         return handler.send(notification)
 
+    def _channel_handler(self, channel: Channel) -> NotificationChannel | None:
+        """Channel handler, lazy-loading built-in channels."""
+        if channel not in self._channels:
+            self._load_channel(channel)
+        return self._channels.get(channel)
+
     def _load_channel(self, channel: Channel) -> None:
         """
         Lazy-load channel handler.
@@ -298,19 +412,12 @@ class NotificationDispatcher:
                 metadata={"dispatch_results": results},
             )
 
-            # Write to JSONL ledger
-            ledger_file = self.ledger_dir / "incidents.jsonl"
-            with open(ledger_file, "a", encoding="utf-8") as f:
-                line = incident.model_dump_json() + "\n"
-                f.write(line)
-
-            # Compute and store HMAC (placeholder for signature)
+            # Append to the buffered JSONL ledger with its HMAC envelope
+            # (placeholder for signature); written out by the next flush
             envelope = self._create_envelope(incident)
-            envelope_file = self.ledger_dir / f"{incident.incident_id}.envelope.json"
-            with open(envelope_file, "w", encoding="utf-8") as f:
-                json.dump(envelope, f, indent=2)
+            self.ledger.append(incident, envelope, payload=envelope["payload"])
 
-            logger.info(f"Persisted incident {incident.incident_id} to ledger")
+            logger.debug(f"Persisted incident {incident.incident_id} to ledger")
         except Exception as e:
             logger.error(f"Failed to persist to ledger: {e}")
 
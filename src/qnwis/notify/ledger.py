@@ -0,0 +1,407 @@
+"""
+Buffered, segmented incident ledger shared by the dispatcher and resolver.
+
+The ledger is an append-only JSONL log of incident states. Appends go to an
+in-memory buffer that a background thread writes out in batches (one write
+per batch, ``fsync`` at most once per ``fsync_interval``). When the active
+segment grows past ``max_segment_bytes`` it is sealed as
+``incidents.<seq>.jsonl`` and a snapshot of the latest state per incident is
+written, so startup replays the snapshot plus the segments after it instead
+of the whole history.
+
+The in-memory index (incident id -> latest state) is versioned: readers keep
+a cursor and pick up only what changed since, including lines appended by
+other processes, which are tailed from the active segment.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from .models import Incident
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_SEGMENT = "incidents.jsonl"
+SNAPSHOT_FILE = "incidents.snapshot.jsonl"
+SEGMENT_PATTERN = "incidents.[0-9]*.jsonl"
+
+DEFAULT_MAX_SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def _segment_seq(path: Path) -> int:
+    return int(path.name.split(".")[1])
+
+
+class IncidentLedger:
+    """
+    Append-only incident ledger with batched writes and a versioned index.
+
+    Use :func:`get_ledger` to share one instance per directory within a
+    process; the dispatcher and resolver both do.
+    """
+
+    def __init__(
+        self,
+        ledger_dir: Path,
+        *,
+        flush_interval: float = 0.2,
+        fsync_interval: float = 1.0,
+        buffer_size: int = 512,
+        max_segment_bytes: int = DEFAULT_MAX_SEGMENT_BYTES,
+    ):
+        """
+        Open (and recover) the ledger in ``ledger_dir``.
+
+        Args:
+            ledger_dir: Directory holding segments, snapshot and envelopes
+            flush_interval: Seconds between background flushes
+            fsync_interval: Minimum seconds between fsyncs (0: every flush)
+            buffer_size: Buffered appends that wake the flusher early
+            max_segment_bytes: Active segment size that triggers rotation
+        """
+        self.ledger_dir = Path(ledger_dir)
+        self.ledger_dir.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.buffer_size = buffer_size
+        self.max_segment_bytes = max_segment_bytes
+
+        self._lock = threading.RLock()
+        self._index: OrderedDict[str, tuple[int, Incident]] = OrderedDict()
+        self._version = 0
+        self._buffer: list[tuple[bytes, dict[str, str] | None]] = []
+        self._file: Any = None
+        self._last_fsync = 0.0
+        self._dirty = False
+        # Tail position: inode and byte offset read so far in the active segment
+        self._read_inode: int | None = None
+        self._read_offset = 0
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._flusher: threading.Thread | None = None
+
+        self._recover()
+
+    @property
+    def active_path(self) -> Path:
+        return self.ledger_dir / ACTIVE_SEGMENT
+
+    @property
+    def version(self) -> int:
+        """Version of the latest change applied to the index."""
+        return self._version
+
+    # -- reads -------------------------------------------------------------
+
+    def get(self, incident_id: str) -> Incident | None:
+        """Latest state of an incident."""
+        entry = self._index.get(incident_id)
+        return entry[1] if entry else None
+
+    def incidents(self) -> list[Incident]:
+        """Latest state of every incident, least recently changed first."""
+        with self._lock:
+            return [incident for _, incident in self._index.values()]
+
+    def changes_since(self, cursor: int) -> tuple[list[Incident], int]:
+        """
+        Incidents changed after ``cursor``.
+
+        Walks the index from the most recently changed entry, so the cost is
+        proportional to the number of changes, not the ledger size.
+
+        Returns:
+            (changed incidents in change order, new cursor)
+        """
+        with self._lock:
+            changed = []
+            for version, incident in reversed(self._index.values()):
+                if version <= cursor:
+                    break
+                changed.append(incident)
+            changed.reverse()
+            return changed, self._version
+
+    # -- writes ------------------------------------------------------------
+
+    def append(
+        self,
+        incident: Incident,
+        envelope: dict[str, str] | None = None,
+        payload: str | None = None,
+    ) -> None:
+        """
+        Record an incident state (and optionally its signed envelope).
+
+        The index is updated immediately; the line is written by the next
+        flush.
+
+        Args:
+            incident: Incident state to record
+            envelope: Signed envelope to write alongside
+            payload: ``incident.model_dump_json()`` if already computed
+        """
+        line = ((payload or incident.model_dump_json()) + "\n").encode("utf-8")
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Incident ledger is closed")
+            self._apply(incident)
+            self._buffer.append((line, envelope))
+            pending = len(self._buffer)
+            if pending >= self.buffer_size * 4:
+                # Writer is falling behind: apply backpressure to the caller
+                self._flush_locked()
+                return
+        self._ensure_flusher()
+        if pending >= self.buffer_size:
+            self._wake.set()
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write buffered appends; ``fsync=True`` forces them to disk."""
+        with self._lock:
+            self._flush_locked(force_fsync=fsync)
+
+    def close(self) -> None:
+        """Flush, fsync and stop the background flusher."""
+        with self._lock:
+            if self._closed:
+                return
+            self._flush_locked(force_fsync=True)
+            self._closed = True
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._wake.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=5.0)
+
+    def refresh(self) -> int:
+        """
+        Apply lines appended by other processes since the last read.
+
+        Returns:
+            Number of lines applied
+        """
+        with self._lock:
+            try:
+                st = os.stat(self.active_path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and st.st_ino == self._read_inode and st.st_size == self._read_offset:
+                return 0
+
+            applied = 0
+            if self._read_inode is not None and (st is None or st.st_ino != self._read_inode):
+                # The segment we were tailing was sealed; finish it, then read
+                # any segments sealed after it.
+                sealed = sorted(self.ledger_dir.glob(SEGMENT_PATTERN), key=_segment_seq)
+                start = next(
+                    (i for i, p in enumerate(sealed) if os.stat(p).st_ino == self._read_inode),
+                    len(sealed),
+                )
+                for i, path in enumerate(sealed[start:]):
+                    applied += self._replay(path, self._read_offset if i == 0 else 0)[0]
+                self._read_inode, self._read_offset = None, 0
+
+            if st is not None:
+                count, offset = self._replay(self.active_path, self._read_offset)
+                applied += count
+                self._read_inode, self._read_offset = st.st_ino, offset
+            return applied
+
+    # -- internals ---------------------------------------------------------
+
+    def _apply(self, incident: Incident) -> None:
+        self._version += 1
+        self._index[incident.incident_id] = (self._version, incident)
+        self._index.move_to_end(incident.incident_id)
+
+    def _replay(self, path: Path, offset: int) -> tuple[int, int]:
+        """Apply complete lines of ``path`` from ``offset``; return (count, end offset)."""
+        count = 0
+        try:
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for raw in f:
+                    if not raw.endswith(b"\n"):
+                        break  # partial line from an in-flight write
+                    offset += len(raw)
+                    if not raw.strip():
+                        continue
+                    try:
+                        self._apply(Incident(**json.loads(raw)))
+                        count += 1
+                    except Exception as exc:
+                        logger.error(f"Skipping malformed ledger line in {path.name}: {exc}")
+        except FileNotFoundError:
+            pass
+        return count, offset
+
+    def _recover(self) -> None:
+        """Rebuild the index from the latest snapshot and the segments after it."""
+        snapshot_seq = 0
+        snapshot = self.ledger_dir / SNAPSHOT_FILE
+        if snapshot.exists():
+            try:
+                with open(snapshot, "rb") as f:
+                    header = json.loads(f.readline())
+                    snapshot_seq = int(header["segment"])
+                    for raw in f:
+                        if raw.strip():
+                            self._apply(Incident(**json.loads(raw)))
+            except Exception as exc:
+                logger.error(f"Ignoring unreadable ledger snapshot: {exc}")
+                self._index.clear()
+                snapshot_seq = 0
+
+        for path in sorted(self.ledger_dir.glob(SEGMENT_PATTERN), key=_segment_seq):
+            if _segment_seq(path) > snapshot_seq:
+                self._replay(path, 0)
+
+        if self.active_path.exists():
+            _, self._read_offset = self._replay(self.active_path, 0)
+            self._read_inode = os.stat(self.active_path).st_ino
+        if self._index:
+            logger.info(f"Recovered {len(self._index)} incidents from ledger")
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None and not self._closed:
+                    self._flusher = threading.Thread(
+                        target=self._run, name="incident-ledger", daemon=True
+                    )
+                    self._flusher.start()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as exc:  # pragma: no cover - disk errors
+                logger.error(f"Incident ledger flush failed: {exc}")
+
+    def _open_active(self) -> Any:
+        if self._file is not None:
+            try:
+                if os.stat(self.active_path).st_ino == os.fstat(self._file.fileno()).st_ino:
+                    return self._file
+            except FileNotFoundError:
+                pass
+            self._file.close()  # rotated by another process
+        self._file = open(self.active_path, "ab")
+        if self._file.tell() > 0:
+            with open(self.active_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write(b"\n")  # terminate a torn line from a crash
+        return self._file
+
+    def _flush_locked(self, force_fsync: bool = False) -> None:
+        if self._buffer:
+            batch, self._buffer = self._buffer, []
+            f = self._open_active()
+            start = f.seek(0, os.SEEK_END)
+            inode = os.fstat(f.fileno()).st_ino
+            f.write(b"".join(line for line, _ in batch))
+            f.flush()
+            if inode == self._read_inode and start == self._read_offset:
+                # Nothing foreign was appended in between: our own lines need
+                # no re-read on refresh.
+                self._read_offset = f.tell()
+            elif self._read_inode is None and start == 0:
+                self._read_inode, self._read_offset = inode, f.tell()
+            self._dirty = True
+
+            for _, envelope in batch:
+                if envelope is not None:
+                    self._write_envelope(envelope)
+
+        now = time.monotonic()
+        if self._dirty and self._file is not None and (
+            force_fsync or now - self._last_fsync >= self.fsync_interval
+        ):
+            os.fsync(self._file.fileno())
+            self._last_fsync = now
+            self._dirty = False
+
+        if self._file is not None and self._file.tell() >= self.max_segment_bytes:
+            self._rotate_locked()
+
+    def _write_envelope(self, envelope: dict[str, str]) -> None:
+        path = self.ledger_dir / f"{envelope['incident_id']}.envelope.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(envelope, f, indent=2)
+
+    def _rotate_locked(self) -> None:
+        """Seal the active segment and snapshot the index."""
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        sealed = sorted(self.ledger_dir.glob(SEGMENT_PATTERN), key=_segment_seq)
+        seq = _segment_seq(sealed[-1]) + 1 if sealed else 1
+        os.replace(self.active_path, self.ledger_dir / f"incidents.{seq:06d}.jsonl")
+        self._read_inode, self._read_offset = None, 0
+
+        tmp = self.ledger_dir / f"{SNAPSHOT_FILE}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(json.dumps({"segment": seq, "incidents": len(self._index)}).encode() + b"\n")
+            f.writelines(
+                (incident.model_dump_json() + "\n").encode("utf-8")
+                for _, incident in self._index.values()
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.ledger_dir / SNAPSHOT_FILE)
+        logger.info(f"Rotated incident ledger to segment {seq:06d}")
+
+
+_LEDGERS: dict[Path, IncidentLedger] = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+def get_ledger(ledger_dir: Path, **options: Any) -> IncidentLedger:
+    """
+    Shared ledger for ``ledger_dir`` (created on first use).
+
+    Options apply only when the ledger is created.
+    """
+    key = Path(ledger_dir).resolve()
+    with _LEDGERS_LOCK:
+        ledger = _LEDGERS.get(key)
+        if ledger is None or ledger._closed:
+            ledger = IncidentLedger(key, **options)
+            _LEDGERS[key] = ledger
+        return ledger
+
+
+def close_ledgers() -> None:
+    """Flush and close every shared ledger."""
+    with _LEDGERS_LOCK:
+        ledgers = list(_LEDGERS.values())
+        _LEDGERS.clear()
+    for ledger in ledgers:
+        ledger.close()
+
+
+atexit.register(close_ledgers)
+
+
+__all__ = [
+    "ACTIVE_SEGMENT",
+    "IncidentLedger",
+    "SNAPSHOT_FILE",
+    "close_ledgers",
+    "get_ledger",
+]
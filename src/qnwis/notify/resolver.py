@@ -7,11 +7,11 @@ Auto-resolves incidents after N consecutive green evaluations.
 
 from __future__ import annotations
 
-import json
 import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from .ledger import get_ledger
 from .models import Incident, IncidentState
 
 if TYPE_CHECKING:
@@ -50,52 +50,34 @@ class IncidentResolver:
         self.ledger_dir.mkdir(parents=True, exist_ok=True)
         self.auto_resolve_threshold = auto_resolve_threshold
 
-        # In-memory incident cache (would use database in production)
+        # In-memory incident cache, kept current from the shared ledger index
         self._incidents: dict[str, Incident] = {}
         self._store: dict[str, Incident] = self._incidents
-        self._ledger_offset = 0
+        self._ledger = get_ledger(self.ledger_dir)
+        self._ledger_cursor = 0
         self._load_incidents()
 
     def _load_incidents(self) -> None:
-        """Load incidents from ledger into memory."""
-        ledger_file = self.ledger_dir / "incidents.jsonl"
-        if not ledger_file.exists():
+        """Load incidents from the ledger index into memory."""
+        incidents = self._ledger.incidents()
+        self._ledger_cursor = self._ledger.version
+        for incident in incidents:
+            self._incidents[incident.incident_id] = incident
+        if incidents:
+            logger.info(f"Loaded {len(incidents)} incidents from ledger")
+        else:
             logger.info("No incident ledger found, starting fresh")
-            return
-
-        try:
-            with open(ledger_file, encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        incident = Incident(**data)
-                        self._incidents[incident.incident_id] = incident
-            self._ledger_offset = ledger_file.stat().st_size
-            logger.info(f"Loaded {len(self._incidents)} incidents from ledger")
-        except Exception as e:
-            logger.error(f"Failed to load incidents: {e}")
 
     def _refresh_from_ledger(self) -> None:
-        """Load newly appended ledger entries into memory."""
-        ledger_file = self.ledger_dir / "incidents.jsonl"
-        if not ledger_file.exists():
-            return
-
+        """Apply incidents changed since the last refresh (any writer, any process)."""
         try:
-            with open(ledger_file, encoding="utf-8") as f:
-                f.seek(self._ledger_offset)
-                for line in f:
-                    if line.strip():
-                        data = json.loads(line)
-                        incident = Incident(**data)
-                        self._incidents[incident.incident_id] = incident
+            self._ledger.refresh()
+            changed, self._ledger_cursor = self._ledger.changes_since(self._ledger_cursor)
         except Exception as exc:
             logger.error(f"Failed to refresh incidents: {exc}")
-        finally:
-            try:
-                self._ledger_offset = ledger_file.stat().st_size
-            except OSError:
-                self._ledger_offset = 0
+            return
+        for incident in changed:
+            self._incidents[incident.incident_id] = incident
 
     def _persist_incident(self, incident: Incident) -> None:
         """
@@ -105,14 +87,15 @@ class IncidentResolver:
             incident: Incident to persist
         """
         try:
-            ledger_file = self.ledger_dir / "incidents.jsonl"
-            with open(ledger_file, "a", encoding="utf-8") as f:
-                line = incident.model_dump_json() + "\n"
-                f.write(line)
+            self._ledger.append(incident)
             logger.debug(f"Persisted incident {incident.incident_id}")
         except Exception as e:
             logger.error(f"Failed to persist incident: {e}")
 
+    def flush(self) -> None:
+        """Write buffered ledger entries to disk."""
+        self._ledger.flush(fsync=True)
+
     def get_incident(self, incident_id: str) -> Incident | None:
         """
         Get incident by ID.
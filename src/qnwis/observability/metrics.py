@@ -56,6 +56,9 @@ class MetricsCollector:
         self.query_executions_total = defaultdict(int)  # {(complexity, status): count}
         self.citation_violations_total = defaultdict(int)  # {(): count}
 
+        # Materialized view refresh counters
+        self.mv_refresh_total = defaultdict(int)  # {(view, action): count}
+
         # Histograms (simplified - store all observations for percentile calculation)
         self.request_duration_seconds: list[tuple[dict[str, str], float]] = []
         self.agent_execution_duration_seconds: list[tuple[dict[str, str], float]] = []
@@ -68,6 +71,7 @@ class MetricsCollector:
         # LLM and Query histograms (Phase 2)
         self.llm_call_latency_ms: list[tuple[dict[str, str], float]] = []
         self.query_latency_ms: list[tuple[dict[str, str], float]] = []
+        self.mv_refresh_duration_seconds: list[tuple[dict[str, str], float]] = []
 
         # Gauges
         self.active_requests = 0
@@ -77,6 +81,7 @@ class MetricsCollector:
         self.dr_backup_bytes = 0
         self.continuity_nodes_healthy = 0
         self.continuity_quorum_reached = 0
+        self.mv_staleness_seconds: dict[str, float] = {}  # {view: seconds}
 
         # Metadata
         self.start_time = time.time()
@@ -375,6 +380,49 @@ class MetricsCollector:
             )
         lines.append("")
 
+        # Materialized view refresh counter
+        lines.append("# HELP qnwis_mv_refresh_total Materialized view refresh outcomes")
+        lines.append("# TYPE qnwis_mv_refresh_total counter")
+        for labels, count in self.mv_refresh_total.items():
+            label_str = self._format_labels(dict(labels))
+            lines.append(f"qnwis_mv_refresh_total{label_str} {count}")
+        lines.append("")
+
+        # Materialized view refresh duration histogram
+        lines.append("# HELP qnwis_mv_refresh_duration_seconds Materialized view refresh duration")
+        lines.append("# TYPE qnwis_mv_refresh_duration_seconds histogram")
+        mv_duration_by_labels: dict[tuple, list[float]] = defaultdict(list)
+        for labels, value in self.mv_refresh_duration_seconds:
+            mv_duration_by_labels[tuple(sorted(labels.items()))].append(value)
+
+        mv_buckets = [0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0]
+        for label_key, observations in mv_duration_by_labels.items():
+            label_dict = dict(label_key)
+            bucket_counts = self._calculate_histogram_buckets(observations, mv_buckets)
+
+            for bucket, count in bucket_counts.items():
+                label_str = self._format_labels({**label_dict, "le": bucket})
+                lines.append(
+                    f"qnwis_mv_refresh_duration_seconds_bucket{label_str} {count}"
+                )
+
+            label_str = self._format_labels(label_dict)
+            lines.append(
+                f"qnwis_mv_refresh_duration_seconds_sum{label_str} {sum(observations)}"
+            )
+            lines.append(
+                f"qnwis_mv_refresh_duration_seconds_count{label_str} {len(observations)}"
+            )
+        lines.append("")
+
+        # Materialized view staleness gauge
+        lines.append("# HELP qnwis_mv_staleness_seconds Seconds since the view was last refreshed")
+        lines.append("# TYPE qnwis_mv_staleness_seconds gauge")
+        for view, seconds in sorted(self.mv_staleness_seconds.items()):
+            label_str = self._format_labels({"view": view})
+            lines.append(f"qnwis_mv_staleness_seconds{label_str} {seconds}")
+        lines.append("")
+
         return "\n".join(lines)
 
     def get_summary(self) -> dict[str, Any]:
@@ -738,3 +786,23 @@ def record_query_execution(
         f"confidence={confidence:.2f}, violations={citation_violations}, "
         f"facts={facts_extracted}"
     )
+
+
+def record_mv_refresh(
+    view: str, action: str, duration_s: float, staleness_s: float
+) -> None:
+    """
+    Record one materialized view outcome of a refresh run.
+
+    Args:
+        view: Materialized view name
+        action: Outcome (created, rebuilt, refreshed, skipped, blocked, failed)
+        duration_s: Time spent creating or refreshing the view
+        staleness_s: Seconds since the view was last refreshed (0 if just refreshed)
+    """
+    collector = get_metrics_collector()
+    key = (("action", action), ("view", view))
+    collector.mv_refresh_total[key] += 1
+    if action in ("created", "rebuilt", "refreshed", "failed"):
+        collector.mv_refresh_duration_seconds.append(({"view": view}, duration_s))
+    collector.mv_staleness_seconds[view] = staleness_s
@@ -18,7 +18,7 @@ from jinja2 import Environment, FileSystemLoader, TemplateNotFound
 
 from ..utils.clock import Clock
 from .csrf import CSRFProtection
-from .sse import SSEStream
+from .sse import SSEBroadcastHub
 from .views import (
     alerts_list,
     dr_overview,
@@ -84,7 +84,7 @@ def create_ops_app(
     # Initialize app state
     app.state.clock = clock or Clock()
     app.state.csrf_protection = CSRFProtection(secret_key=secret_key)
-    app.state.sse_stream = SSEStream()
+    app.state.sse_stream = SSEBroadcastHub()
 
     # Initialize Jinja2 templates
     if not TEMPLATES_DIR.exists():
@@ -2,7 +2,7 @@
 Utilities to benchmark ops console performance for RG-5.
 
 Provides helpers shared by tests and QA gates to measure render latency,
-SSE enqueue throughput, and CSRF verification timing, persisting metrics
+SSE enqueue latency, SSE fan-out throughput, and CSRF verification timing, persisting metrics
 for downstream readiness review.
 """
 
@@ -25,7 +25,7 @@ from ..security import Principal
 from ..utils.clock import ManualClock
 from .app import create_ops_app
 from .csrf import CSRFProtection
-from .sse import SSEStream, create_incident_update_event
+from .sse import SSEBroadcastHub, SSEStream, create_incident_update_event
 
 SRC_ROOT = Path(__file__).resolve().parents[2]
 AUDIT_OPS_DIR = SRC_ROOT / "qnwis" / "docs" / "audit" / "ops"
@@ -111,7 +111,7 @@ def _measure_route(client: TestClient, path: str, iterations: int = 40) -> dict[
 
 
 def _measure_sse_enqueue(iterations: int = 200) -> dict[str, float]:
-    stream = SSEStream()
+    hub = SSEBroadcastHub()
     event = create_incident_update_event(
         incident_id="inc_perf",
         state="RESOLVED",
@@ -121,11 +121,13 @@ def _measure_sse_enqueue(iterations: int = 200) -> dict[str, float]:
     latencies: list[float] = []
 
     async def _run() -> None:
+        subscription = hub.subscribe()
         for _ in range(iterations):
             start = time.perf_counter()
-            await stream.send_event(event)
+            await hub.send_event(event)
             latencies.append((time.perf_counter() - start) * 1000)
-        await stream.close()
+            subscription.drain()
+        await hub.close()
 
     asyncio.run(_run())
     latencies.sort()
@@ -138,6 +140,69 @@ def _measure_sse_enqueue(iterations: int = 200) -> dict[str, float]:
     }
 
 
+def _measure_sse_fanout(subscribers: int = 1000, events: int = 50) -> dict[str, float]:
+    """
+    Broadcast incident updates to ``subscribers`` clients.
+
+    Compares the hub (frame once, share bytes) with the previous layout of
+    one ``SSEStream`` per client, where every stream formats every event.
+    """
+    sample = [
+        create_incident_update_event(
+            incident_id=f"inc_{idx % 16:03d}",
+            state="ACK" if idx % 2 else "RESOLVED",
+            actor="ops.console@test.qa",
+            timestamp=f"2024-01-01T12:{idx // 60:02d}:{idx % 60:02d}Z",
+        )
+        for idx in range(events)
+    ]
+    publish_ms: list[float] = []
+    result: dict[str, float] = {}
+
+    async def _hub() -> None:
+        hub = SSEBroadcastHub(buffer_size=events)
+        clients = [hub.subscribe() for _ in range(subscribers)]
+        start = time.perf_counter()
+        for event in sample:
+            t0 = time.perf_counter()
+            hub.publish(event)
+            publish_ms.append((time.perf_counter() - t0) * 1000)
+        sent = sum(len(client.drain()) for client in clients)
+        result["hub_total_ms"] = (time.perf_counter() - start) * 1000
+        result["bytes_per_subscriber"] = sent / subscribers
+        await hub.close()
+
+    async def _per_stream() -> None:
+        streams = [SSEStream() for _ in range(subscribers)]
+        start = time.perf_counter()
+        for event in sample:
+            for stream in streams:
+                await stream.send_event(event)
+        for stream in streams:
+            await stream.close()
+            async for _chunk in stream.stream():
+                pass
+        result["per_stream_total_ms"] = (time.perf_counter() - start) * 1000
+
+    asyncio.run(_hub())
+    asyncio.run(_per_stream())
+    publish_ms.sort()
+    deliveries = subscribers * events
+    return {
+        "subscribers": subscribers,
+        "events": events,
+        "publish_p50_ms": round(_percentile(publish_ms, 0.50), 4),
+        "publish_p95_ms": round(_percentile(publish_ms, 0.95), 4),
+        "hub_total_ms": round(result["hub_total_ms"], 3),
+        "hub_deliveries_per_s": round(deliveries / (result["hub_total_ms"] / 1000), 1),
+        "per_stream_total_ms": round(result["per_stream_total_ms"], 3),
+        "per_stream_deliveries_per_s": round(
+            deliveries / (result["per_stream_total_ms"] / 1000), 1
+        ),
+        "bytes_per_subscriber": round(result["bytes_per_subscriber"], 1),
+    }
+
+
 def _measure_csrf_latency(iterations: int = 200) -> dict[str, float]:
     csrf = CSRFProtection(secret_key="rg5_secret")
     clock = ManualClock(start=DEFAULT_START)
@@ -159,13 +224,14 @@ def _measure_csrf_latency(iterations: int = 200) -> dict[str, float]:
 
 
 def collect_ui_metrics(clock: ManualClock | None = None) -> dict[str, Any]:
-    """Collect render, SSE, and CSRF metrics."""
+    """Collect render, SSE enqueue/fan-out, and CSRF metrics."""
     if clock is None:
         clock = ManualClock("2025-01-01T00:00:00Z")
     client, _ = build_benchmark_app()
     incidents_metrics = _measure_route(client, "/incidents")
     detail_metrics = _measure_route(client, "/incidents/inc_000")
     sse_metrics = _measure_sse_enqueue()
+    fanout_metrics = _measure_sse_fanout()
     csrf_metrics = _measure_csrf_latency()
     return {
         "generated_at": clock.now(),
@@ -174,6 +240,7 @@ def collect_ui_metrics(clock: ManualClock | None = None) -> dict[str, Any]:
             "incident_detail": detail_metrics,
         },
         "sse": sse_metrics,
+        "sse_fanout": fanout_metrics,
         "csrf": {
             "verify": csrf_metrics,
             "verify_p95_ms": csrf_metrics["p95_ms"],
@@ -1,7 +1,9 @@
 """
 Server-Sent Events (SSE) for real-time incident and alert updates.
 
-Provides a dry-run SSE stream with heartbeats and event formatting.
+Provides a dry-run SSE stream with heartbeats and event formatting, and a
+broadcast hub that frames each event once and fans the bytes out to every
+subscriber through bounded per-subscriber buffers.
 No external message queue dependency - events are generated deterministically.
 """
 
@@ -10,15 +12,58 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from collections.abc import AsyncIterator
-from dataclasses import dataclass
-from typing import Any
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass, field, replace
+from typing import Any, Literal
 
 logger = logging.getLogger(__name__)
 
 # Heartbeat interval in seconds
 HEARTBEAT_INTERVAL = 30
 
+# Hub defaults: pending frames per subscriber, frames kept per channel for
+# Last-Event-ID replay, and channels whose replay log is retained.
+DEFAULT_BUFFER_SIZE = 256
+DEFAULT_REPLAY_SIZE = 128
+DEFAULT_MAX_CHANNELS = 1024
+DEFAULT_CHANNEL = "default"
+
+HEARTBEAT_FRAME = b": heartbeat\n\n"
+
+SlowConsumerPolicy = Literal["drop_oldest", "coalesce"]
+
+
+def encode_frame(
+    data: str,
+    *,
+    event: str | None = None,
+    id: str | None = None,
+    retry: int | None = None,
+) -> bytes:
+    """
+    Frame an already-serialized payload as SSE protocol bytes.
+
+    Args:
+        data: Payload text; each line becomes a ``data:`` field
+        event: Optional event type
+        id: Optional event ID for reconnection
+        retry: Optional retry interval in milliseconds
+
+    Returns:
+        UTF-8 encoded SSE message terminated by a blank line
+    """
+    lines = []
+    if id:
+        lines.append(f"id: {id}")
+    if retry:
+        lines.append(f"retry: {retry}")
+    if event:
+        lines.append(f"event: {event}")
+    for line in data.split("\n"):
+        lines.append(f"data: {line}")
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
 
 @dataclass(frozen=True)
 class SSEEvent:
@@ -30,12 +75,15 @@ class SSEEvent:
         data: JSON-serializable event data
         id: Optional event ID for reconnection
         retry: Optional retry interval in milliseconds
+        coalesce_key: Optional key; under the hub's "coalesce" policy a slow
+            subscriber keeps only the newest pending event per key
     """
 
     event: str
     data: dict[str, Any]
     id: str | None = None
     retry: int | None = None
+    coalesce_key: str | None = field(default=None, compare=False)
 
     def format(self) -> str:
         """
@@ -62,6 +110,15 @@ class SSEEvent:
         # Terminate with double newline
         return "\n".join(lines) + "\n\n"
 
+    def encode(self) -> bytes:
+        """
+        Encode event as SSE protocol bytes.
+
+        Returns:
+            UTF-8 encoded form of :meth:`format`
+        """
+        return self.format().encode("utf-8")
+
 
 class SSEStream:
     """
@@ -134,6 +191,357 @@ class SSEStream:
             self._closed = True
 
 
+@dataclass(frozen=True, slots=True)
+class _Frame:
+    """Pre-framed event shared by every subscriber of a channel."""
+
+    id: str
+    key: str | None
+    payload: bytes
+
+
+class _Channel:
+    """Subscribers, replay log and ID sequence for one hub channel."""
+
+    __slots__ = ("subscribers", "replay", "seq", "closed")
+
+    def __init__(self, replay_size: int) -> None:
+        self.subscribers: set[SSESubscription] = set()
+        self.replay: deque[_Frame] = deque(maxlen=replay_size)
+        self.seq = 0
+        self.closed = False
+
+
+class SSESubscription:
+    """
+    One client's view of a hub channel.
+
+    Pending frames live in a bounded ring buffer. When a slow consumer fills
+    it, "drop_oldest" discards the oldest frame; "coalesce" first discards an
+    older frame with the same coalesce key (superseded state) and only then
+    falls back to dropping the oldest.
+    """
+
+    def __init__(
+        self,
+        hub: SSEBroadcastHub,
+        channel: str,
+        buffer_size: int,
+        policy: SlowConsumerPolicy,
+    ) -> None:
+        self.channel = channel
+        self.policy = policy
+        self.dropped = 0
+        self._hub = hub
+        self._buffer_size = buffer_size
+        self._pending: deque[_Frame] = deque()
+        self._wake = asyncio.Event()
+        self._heartbeat_due = False
+        self._closed = False
+
+    @property
+    def pending(self) -> int:
+        """Number of frames waiting to be sent."""
+        return len(self._pending)
+
+    def _push(self, frame: _Frame) -> None:
+        if len(self._pending) >= self._buffer_size:
+            self._evict(frame.key)
+        self._pending.append(frame)
+        self._wake.set()
+
+    def _evict(self, key: str | None) -> None:
+        self.dropped += 1
+        if self.policy == "coalesce" and key is not None:
+            for idx, queued in enumerate(self._pending):
+                if queued.key == key:
+                    del self._pending[idx]
+                    return
+        self._pending.popleft()
+
+    def _heartbeat(self) -> None:
+        self._heartbeat_due = True
+        self._wake.set()
+
+    def _finish(self) -> None:
+        self._closed = True
+        self._wake.set()
+
+    def drain(self) -> bytes:
+        """Take every pending frame as one chunk without waiting."""
+        chunk = b"".join(frame.payload for frame in self._pending)
+        self._pending.clear()
+        return chunk
+
+    def close(self) -> None:
+        """Detach from the hub; iteration ends once pending frames are sent."""
+        if not self._closed:
+            self._finish()
+        self._hub._unsubscribe(self)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        """
+        Yield pending frames (batched) and hub heartbeats until closed.
+
+        Yields:
+            SSE protocol bytes
+        """
+        try:
+            while True:
+                if self._pending:
+                    self._heartbeat_due = False
+                    yield self.drain()
+                    continue
+                if self._closed:
+                    return
+                if self._heartbeat_due:
+                    self._heartbeat_due = False
+                    yield HEARTBEAT_FRAME
+                    continue
+                self._wake.clear()
+                await self._wake.wait()
+        finally:
+            self.close()
+
+
+class SSEBroadcastHub:
+    """
+    Broadcast hub for SSE fan-out.
+
+    Each published event is framed once into bytes shared by all subscribers
+    of its channel, kept in a short replay log for ``Last-Event-ID``
+    reconnects, and pushed into per-subscriber bounded buffers. A single
+    heartbeat task per hub keeps idle connections alive.
+
+    Not thread-safe: publish and subscribe from the event loop thread.
+    """
+
+    def __init__(
+        self,
+        heartbeat_interval: float = HEARTBEAT_INTERVAL,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        replay_size: int = DEFAULT_REPLAY_SIZE,
+        policy: SlowConsumerPolicy = "coalesce",
+        max_channels: int = DEFAULT_MAX_CHANNELS,
+    ) -> None:
+        """
+        Initialize broadcast hub.
+
+        Args:
+            heartbeat_interval: Seconds between heartbeats to idle subscribers
+            buffer_size: Default pending-frame bound per subscriber
+            replay_size: Frames kept per channel for reconnect replay
+            policy: Default slow-consumer policy for new subscribers
+            max_channels: Channels retained (least recently used evicted)
+        """
+        if buffer_size < 1 or replay_size < 0:
+            raise ValueError("buffer_size must be >= 1 and replay_size >= 0")
+        self._heartbeat_interval = heartbeat_interval
+        self._buffer_size = buffer_size
+        self._replay_size = replay_size
+        self._policy = policy
+        self._max_channels = max_channels
+        self._channels: OrderedDict[str, _Channel] = OrderedDict()
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        self._closed = False
+
+    def _channel(self, name: str) -> _Channel:
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = _Channel(self._replay_size)
+            self._channels[name] = channel
+            self._evict_channels()
+        else:
+            self._channels.move_to_end(name)
+        return channel
+
+    def _evict_channels(self) -> None:
+        for name in list(self._channels):
+            if len(self._channels) <= self._max_channels:
+                return
+            if not self._channels[name].subscribers:
+                del self._channels[name]
+
+    def _publish(
+        self,
+        channel_name: str,
+        event_id: str | None,
+        key: str | None,
+        encode: Callable[[str], bytes],
+    ) -> str | None:
+        if self._closed:
+            return None
+        channel = self._channel(channel_name)
+        if channel.closed:
+            return None
+        channel.seq += 1
+        frame_id = event_id or str(channel.seq)
+        frame = _Frame(frame_id, key, encode(frame_id))
+        channel.replay.append(frame)
+        for subscriber in channel.subscribers:
+            subscriber._push(frame)
+        return frame_id
+
+    def publish(self, event: SSEEvent, *, channel: str = DEFAULT_CHANNEL) -> str | None:
+        """
+        Frame an event once and fan it out to the channel's subscribers.
+
+        Events without an ID get the channel's next sequence number so that
+        clients can resume with ``Last-Event-ID``.
+
+        Args:
+            event: SSE event to broadcast
+            channel: Target channel
+
+        Returns:
+            Event ID used on the wire, or None if the hub/channel is closed
+        """
+        return self._publish(
+            channel,
+            event.id,
+            event.coalesce_key,
+            lambda frame_id: (event if event.id else replace(event, id=frame_id)).encode(),
+        )
+
+    def publish_data(
+        self,
+        data: str,
+        *,
+        event: str | None = None,
+        channel: str = DEFAULT_CHANNEL,
+        coalesce_key: str | None = None,
+    ) -> str | None:
+        """
+        Broadcast an already-serialized JSON payload.
+
+        Args:
+            data: Serialized payload
+            event: Optional event type
+            channel: Target channel
+            coalesce_key: Optional key for the "coalesce" policy
+
+        Returns:
+            Event ID used on the wire, or None if the hub/channel is closed
+        """
+        return self._publish(
+            channel,
+            None,
+            coalesce_key,
+            lambda frame_id: encode_frame(data, event=event, id=frame_id),
+        )
+
+    async def send_event(self, event: SSEEvent) -> None:
+        """
+        Broadcast an event on the default channel (``SSEStream`` compatible).
+
+        Args:
+            event: SSE event to send
+        """
+        self.publish(event)
+
+    def subscribe(
+        self,
+        *,
+        channel: str = DEFAULT_CHANNEL,
+        last_event_id: str | None = None,
+        buffer_size: int | None = None,
+        policy: SlowConsumerPolicy | None = None,
+    ) -> SSESubscription:
+        """
+        Attach a subscriber, replaying frames missed since ``last_event_id``.
+
+        If ``last_event_id`` is no longer in the replay log the whole log is
+        replayed; the client can detect the gap from the event IDs.
+
+        Args:
+            channel: Channel to follow
+            last_event_id: Value of the client's ``Last-Event-ID`` header
+            buffer_size: Pending-frame bound (defaults to the hub's)
+            policy: Slow-consumer policy (defaults to the hub's)
+
+        Returns:
+            Subscription to iterate for SSE bytes
+        """
+        ch = self._channel(channel)
+        subscription = SSESubscription(
+            self, channel, buffer_size or self._buffer_size, policy or self._policy
+        )
+        if last_event_id:
+            replay = list(ch.replay)
+            for idx, frame in enumerate(replay):
+                if frame.id == last_event_id:
+                    replay = replay[idx + 1 :]
+                    break
+            for frame in replay:
+                subscription._push(frame)
+        if self._closed or ch.closed:
+            subscription._finish()
+            return subscription
+        ch.subscribers.add(subscription)
+        self._ensure_heartbeat()
+        return subscription
+
+    def _unsubscribe(self, subscription: SSESubscription) -> None:
+        channel = self._channels.get(subscription.channel)
+        if channel is not None:
+            channel.subscribers.discard(subscription)
+
+    def has_channel(self, channel: str) -> bool:
+        """Whether a channel is known (live or retained for replay)."""
+        return channel in self._channels
+
+    def subscriber_count(self, channel: str | None = None) -> int:
+        """Number of live subscribers on one channel or across the hub."""
+        if channel is not None:
+            ch = self._channels.get(channel)
+            return len(ch.subscribers) if ch else 0
+        return sum(len(ch.subscribers) for ch in self._channels.values())
+
+    def close_channel(self, channel: str) -> None:
+        """
+        End a channel: subscribers finish after their pending frames.
+
+        The replay log is kept so late reconnects can still catch up.
+        """
+        ch = self._channels.get(channel)
+        if ch is None:
+            return
+        ch.closed = True
+        for subscription in list(ch.subscribers):
+            subscription._finish()
+        ch.subscribers.clear()
+
+    async def close(self) -> None:
+        """Close every channel and stop the heartbeat task."""
+        self._closed = True
+        for name in list(self._channels):
+            self.close_channel(name)
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    def _ensure_heartbeat(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = self._heartbeat_task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._heartbeat_task = loop.create_task(self._heartbeat_loop())
+
+    async def _heartbeat_loop(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(self._heartbeat_interval)
+            subscribers = [
+                sub for ch in self._channels.values() for sub in ch.subscribers
+            ]
+            if not subscribers:
+                break
+            for subscription in subscribers:
+                subscription._heartbeat()
+
+
 def create_incident_update_event(
     incident_id: str,
     state: str,
@@ -161,6 +569,7 @@ def create_incident_update_event(
             "timestamp": timestamp,
         },
         id=f"incident_{incident_id}_{timestamp}",
+        coalesce_key=f"incident_{incident_id}",
     )
 
 
@@ -195,8 +604,11 @@ def create_alert_fired_event(
 
 
 __all__ = [
+    "SSEBroadcastHub",
     "SSEEvent",
     "SSEStream",
+    "SSESubscription",
+    "encode_frame",
     "create_incident_update_event",
     "create_alert_fired_event",
 ]
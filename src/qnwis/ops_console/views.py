@@ -22,7 +22,7 @@ from ..security import Principal, require_roles
 from ..security.rbac import allowed_roles
 from ..utils.clock import Clock
 from .csrf import get_csrf_protection, verify_csrf_token
-from .sse import SSEStream, create_incident_update_event
+from .sse import SSEBroadcastHub, create_incident_update_event
 
 logger = logging.getLogger(__name__)
 REPO_ROOT = Path(__file__).resolve().parents[3]
@@ -108,11 +108,11 @@ def get_incident_resolver(request: Request) -> IncidentResolver:
     return cast(IncidentResolver, request.app.state.incident_resolver)
 
 
-def get_sse_stream(request: Request) -> SSEStream:
-    """Get or create SSE stream for live updates."""
+def get_sse_stream(request: Request) -> SSEBroadcastHub:
+    """Get or create the SSE broadcast hub for live updates."""
     if not hasattr(request.app.state, "sse_stream"):
-        request.app.state.sse_stream = SSEStream()
-    return cast(SSEStream, request.app.state.sse_stream)
+        request.app.state.sse_stream = SSEBroadcastHub()
+    return cast(SSEBroadcastHub, request.app.state.sse_stream)
 
 
 async def ops_index(
@@ -570,12 +570,16 @@ async def incidents_stream(
     """
     SSE stream for live incident updates.
 
-    Sends server-sent events when incidents change state.
+    Sends server-sent events when incidents change state. Every operator
+    subscribes to the shared hub; reconnecting clients resume from their
+    ``Last-Event-ID``.
     """
-    sse_stream = get_sse_stream(request)
+    subscription = get_sse_stream(request).subscribe(
+        last_event_id=request.headers.get("last-event-id"),
+    )
 
     return StreamingResponse(
-        sse_stream.stream(),
+        subscription,
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -1,14 +1,21 @@
 """
-Multi-agent council orchestration with sequential execution.
+Multi-agent council orchestration.
 
 Provides deterministic council execution with optional LangGraph orchestration.
-Falls back to sequential execution when LangGraph is unavailable.
+The queries every agent declares are prefetched concurrently into one shared,
+deduplicated result set, then agents run concurrently; reports keep agent
+order so output is unchanged. The graph is compiled once per agent factory.
+Falls back to direct execution when LangGraph is unavailable.
 """
 
 from __future__ import annotations
 
+import copy
+import logging
 import os
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Protocol, TypedDict
 
@@ -16,9 +23,13 @@ from ..agents.base import AgentReport, DataClient
 from ..agents.labour_economist import LabourEconomistAgent
 from ..agents.national_strategy import NationalStrategyAgent
 from ..agents.pattern_detective import PatternDetectiveAgent
+from ..data.deterministic.models import QueryResult
+from .graph_cache import get_compiled_graph
 from .synthesis import CouncilReport, synthesize
 from .verification import VerificationIssue, verify_report
 
+logger = logging.getLogger(__name__)
+
 
 class Agent(Protocol):
     """Protocol for agent implementations."""
@@ -36,10 +47,77 @@ class CouncilConfig:
     Attributes:
         queries_dir: Path to deterministic query definitions (None for default)
         ttl_s: Cache TTL in seconds for data client
+        max_workers: Concurrent prefetches/agents (1 runs agents sequentially)
     """
 
     queries_dir: str | None = None
     ttl_s: int = 300
+    max_workers: int = 8
+
+
+class SharedQueryClient(DataClient):
+    """
+    DataClient shared by every agent of one council run.
+
+    Each query id executes at most once per run, however many agents ask
+    for it and whether it was prefetched or not; every caller receives its
+    own copy of the result, or the same exception.
+    """
+
+    def __init__(self, queries_dir: str | None = None, ttl_s: int = 300) -> None:
+        super().__init__(queries_dir=queries_dir, ttl_s=ttl_s)
+        self._results: dict[str, Future[QueryResult]] = {}
+        self._results_lock = threading.Lock()
+
+    def run(self, query_id: str) -> QueryResult:
+        with self._results_lock:
+            future = self._results.get(query_id)
+            owner = future is None
+            if future is None:
+                future = Future()
+                self._results[query_id] = future
+        if owner:
+            try:
+                future.set_result(super().run(query_id))
+            except Exception as exc:  # noqa: BLE001 - re-raised to every caller
+                future.set_exception(exc)
+        return copy.deepcopy(future.result())
+
+    def prefetch(self, query_ids: Iterable[str], max_workers: int) -> list[str]:
+        """
+        Execute the given query ids concurrently into the shared result set.
+
+        Failures are kept and re-raised to the agent that later asks for the
+        query, exactly as if it had run the query itself.
+
+        Returns:
+            Deduplicated query ids, in first-declared order
+        """
+        unique = list(dict.fromkeys(query_ids))
+
+        def fetch(query_id: str) -> None:
+            try:
+                self.run(query_id)
+            except Exception as exc:  # noqa: BLE001 - surfaced on agent access
+                logger.debug("Prefetch of %s failed: %s", query_id, exc)
+
+        if max_workers <= 1 or len(unique) <= 1:
+            for query_id in unique:
+                fetch(query_id)
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(unique))) as pool:
+                list(pool.map(fetch, unique))
+        return unique
+
+
+def _declared_queries(agents: list[Agent]) -> list[str]:
+    """Query ids agents declare via an optional ``declared_queries()``."""
+    query_ids: list[str] = []
+    for agent in agents:
+        declared = getattr(agent, "declared_queries", None)
+        if callable(declared):
+            query_ids.extend(declared())
+    return query_ids
 
 
 def default_agents(client: DataClient) -> list[Agent]:
@@ -75,12 +153,12 @@ def _apply_rate_limit(ttl_s: int) -> tuple[int, bool]:
     return ttl_s, False
 
 
-def _run_agents(agents: list[Agent]) -> list[AgentReport]:
-    """Execute agents deterministically and collect their reports."""
-    reports: list[AgentReport] = []
-    for agent in agents:
-        reports.append(agent.run())
-    return reports
+def _run_agents(agents: list[Agent], max_workers: int = 1) -> list[AgentReport]:
+    """Execute agents (concurrently when max_workers > 1); reports keep agent order."""
+    if max_workers <= 1 or len(agents) <= 1:
+        return [agent.run() for agent in agents]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(agents))) as pool:
+        return list(pool.map(lambda agent: agent.run(), agents))
 
 
 def _verify_reports(reports: list[AgentReport]) -> dict[str, list[VerificationIssue]]:
@@ -140,6 +218,7 @@ class _CouncilState(TypedDict, total=False):
 
     config: CouncilConfig
     ttl_s: int
+    client: SharedQueryClient
     agents: list[Agent]
     reports: list[AgentReport]
     verification: dict[str, list[VerificationIssue]]
@@ -152,7 +231,9 @@ def build_council_graph(make_agents: Callable[[DataClient], list[Agent]]) -> Any
     """
     Build a LangGraph pipeline for council execution if LangGraph is available.
 
-    The graph mirrors sequential execution steps: plan → run → verify → synthesize → report.
+    The graph mirrors direct execution steps:
+    plan → prefetch → run → verify → synthesize → report.
+    Use ``_council_graph`` to get the compiled graph cached per factory.
 
     Args:
         make_agents: Factory function used to build the agent list.
@@ -170,12 +251,19 @@ def build_council_graph(make_agents: Callable[[DataClient], list[Agent]]) -> Any
 
     def plan_step(state: _CouncilState) -> _CouncilState:
         cfg = state["config"]
-        client = DataClient(queries_dir=cfg.queries_dir, ttl_s=state["ttl_s"])
+        client = SharedQueryClient(queries_dir=cfg.queries_dir, ttl_s=state["ttl_s"])
+        state["client"] = client
         state["agents"] = make_agents(client)
         return state
 
+    def prefetch_step(state: _CouncilState) -> _CouncilState:
+        state["client"].prefetch(
+            _declared_queries(state["agents"]), state["config"].max_workers
+        )
+        return state
+
     def run_step(state: _CouncilState) -> _CouncilState:
-        state["reports"] = _run_agents(state["agents"])
+        state["reports"] = _run_agents(state["agents"], state["config"].max_workers)
         return state
 
     def verify_step(state: _CouncilState) -> _CouncilState:
@@ -195,13 +283,15 @@ def build_council_graph(make_agents: Callable[[DataClient], list[Agent]]) -> Any
         return state
 
     graph.add_node("plan", plan_step)
+    graph.add_node("prefetch", prefetch_step)
     graph.add_node("run", run_step)
     graph.add_node("verify", verify_step)
     graph.add_node("synthesize", synthesize_step)
     graph.add_node("report", report_step)
 
     graph.add_edge(START, "plan")
-    graph.add_edge("plan", "run")
+    graph.add_edge("plan", "prefetch")
+    graph.add_edge("prefetch", "run")
     graph.add_edge("run", "verify")
     graph.add_edge("verify", "synthesize")
     graph.add_edge("synthesize", "report")
@@ -210,17 +300,23 @@ def build_council_graph(make_agents: Callable[[DataClient], list[Agent]]) -> Any
     return graph.compile()
 
 
-def _run_sequential(
+def _council_graph(make_agents: Callable[[DataClient], list[Agent]]) -> Any:
+    """Compiled council graph, built once per agent factory."""
+    return get_compiled_graph(build_council_graph, make_agents=make_agents)
+
+
+def _run_direct(
     config: CouncilConfig,
     make_agents: Callable[[DataClient], list[Agent]],
     ttl_s: int,
     *,
     rate_limit_applied: bool,
 ) -> dict[str, Any]:
-    """Sequential fallback execution when LangGraph is unavailable."""
-    client = DataClient(queries_dir=config.queries_dir, ttl_s=ttl_s)
+    """Direct execution of the graph steps when LangGraph is unavailable."""
+    client = SharedQueryClient(queries_dir=config.queries_dir, ttl_s=ttl_s)
     agents = make_agents(client)
-    reports = _run_agents(agents)
+    client.prefetch(_declared_queries(agents), config.max_workers)
+    reports = _run_agents(agents, config.max_workers)
     verification = _verify_reports(reports)
     council = synthesize(reports)
     return _assemble_response(
@@ -234,14 +330,15 @@ def run_council(
     config: CouncilConfig, make_agents: Callable[[DataClient], list[Agent]] = default_agents
 ) -> dict[str, Any]:
     """
-    Execute deterministic council run with sequential agent execution.
+    Execute deterministic council run.
 
     This is the primary entry point for council orchestration. It creates
-    a data client, initializes agents, runs them sequentially, verifies
-    outputs, and synthesizes a unified council report.
+    a shared data client, initializes agents, prefetches their declared
+    queries, runs them concurrently, verifies outputs, and synthesizes a
+    unified council report.
 
     Args:
-        config: CouncilConfig with queries_dir and ttl_s
+        config: CouncilConfig with queries_dir, ttl_s and max_workers
         make_agents: Factory function to create agent list (default: default_agents)
 
     Returns:
@@ -252,9 +349,9 @@ def run_council(
     ttl_s, rate_limit_applied = _apply_rate_limit(config.ttl_s)
 
     try:
-        graph_app = build_council_graph(make_agents)
+        graph_app = _council_graph(make_agents)
     except ImportError:
-        return _run_sequential(
+        return _run_direct(
             config,
             make_agents,
             ttl_s,
@@ -270,7 +367,7 @@ def run_council(
     result: dict[str, Any] | None = final_state.get("result")
     if result is None:
         # Safety net: fall back if graph execution failed to materialize a result.
-        return _run_sequential(
+        return _run_direct(
             config,
             make_agents,
             ttl_s,
@@ -0,0 +1,647 @@
+"""
+Persistent, freshness-aware fact store shared across workflow runs.
+
+Prefetch and extraction used to re-fetch the same World Bank/ILO/LMIS
+indicators for every question. This module keeps normalized facts keyed by
+``(source, indicator, country, period, dimensions)`` so later runs can reuse
+them:
+
+- PostgreSQL-backed table (``qnwis_fact_store``) with an in-process read cache
+- One indexed query per lookup, covering a whole set of indicators
+- Per-source freshness SLAs checked with ``qnwis.data.freshness``
+- Per-source hit ratio and API-calls-avoided counters via ``MetricsObserver``
+- Negative entries for series the API returned empty, kept for a short TTL
+
+The unit of freshness is a *series*: every fact one API call returned for
+``(source, indicator, country)``. Callers look up the series they need, fetch
+only the missing or stale ones and write them back with ``put_series``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from ..data.freshness.verifier import check_asof_freshness
+from .metrics import MetricsObserver, ensure_observer
+
+logger = logging.getLogger(__name__)
+
+FACT_STORE_TABLE = "qnwis_fact_store"
+
+# Maximum age (days since fetch) before a stored series is refetched.
+DEFAULT_FRESHNESS_SLA_DAYS: dict[str, int] = {
+    "world_bank": 30,
+    "ilo": 30,
+    "imf": 30,
+    "fao": 30,
+    "gcc_stat": 7,
+    "lmis": 1,
+}
+FALLBACK_SLA_DAYS = 1
+
+# How long an empty API result is trusted before the series is asked for again.
+NEGATIVE_TTL_SECONDS = 6 * 3600
+
+_CREATE_TABLE_SQL = f"""
+CREATE TABLE IF NOT EXISTS {FACT_STORE_TABLE} (
+    source TEXT NOT NULL,
+    indicator TEXT NOT NULL,
+    country TEXT NOT NULL,
+    period TEXT NOT NULL,
+    dimensions TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (source, indicator, country, period, dimensions)
+)
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class FactKey:
+    """Normalized identity of one stored fact."""
+
+    source: str
+    indicator: str
+    country: str = "QAT"
+    period: str = ""
+    dimensions: tuple[tuple[str, str], ...] = ()
+
+    @property
+    def series(self) -> tuple[str, str, str]:
+        return (self.source, self.indicator, self.country)
+
+
+def normalize_dimensions(dimensions: Mapping[str, Any] | None) -> tuple[tuple[str, str], ...]:
+    """Canonical, order-independent form of a dimensions mapping."""
+    if not dimensions:
+        return ()
+    return tuple(sorted((str(k), str(v)) for k, v in dimensions.items() if v is not None))
+
+
+def fact_key(
+    source: str,
+    fact: Mapping[str, Any],
+    *,
+    indicator: str | None = None,
+    country: str = "QAT",
+    dimension_fields: Sequence[str] = ("sex", "age_group", "sector"),
+) -> FactKey:
+    """
+    Derive a ``FactKey`` from a fact dict as produced by the fetchers.
+
+    Args:
+        source: Source key (e.g. ``"world_bank"``)
+        fact: Fact dict
+        indicator: Series indicator; defaults to ``indicator_code``/``metric``
+        country: Country code the series was fetched for
+        dimension_fields: Fact fields that distinguish facts within a period
+    """
+    period = fact.get("period", fact.get("year"))
+    return FactKey(
+        source=source,
+        indicator=str(indicator or fact.get("indicator_code") or fact.get("metric") or ""),
+        country=country,
+        period="" if period is None else str(period),
+        dimensions=normalize_dimensions({f: fact.get(f) for f in dimension_fields}),
+    )
+
+
+@dataclass(slots=True)
+class StoredSeries:
+    """Facts for one ``(source, indicator, country)`` series (empty: negative entry)."""
+
+    facts: list[dict[str, Any]]
+    fetched_at: datetime
+
+
+@dataclass(slots=True)
+class FactLookup:
+    """Result of a store lookup for a set of series."""
+
+    facts: list[dict[str, Any]] = field(default_factory=list)
+    hits: list[tuple[str, str]] = field(default_factory=list)
+    missing: list[tuple[str, str]] = field(default_factory=list)
+
+    def missing_indicators(self, country: str = "QAT") -> list[str]:
+        return [indicator for indicator, c in self.missing if c == country]
+
+
+@dataclass(slots=True)
+class SourceStoreStats:
+    """Cumulative reuse statistics for one source."""
+
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    api_calls_avoided: int = 0
+    series_written: int = 0
+    facts_written: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "api_calls_avoided": self.api_calls_avoided,
+            "series_written": self.series_written,
+            "facts_written": self.facts_written,
+        }
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    return datetime.fromisoformat(str(value))
+
+
+class FactStore:
+    """
+    Normalized fact store with per-source freshness SLAs.
+
+    Reads go through a bounded in-process cache before the database; writes
+    replace whole series so stale periods never linger. Database failures
+    are logged and degrade to cache-only behaviour, so callers simply see
+    misses and fall back to the APIs.
+    """
+
+    def __init__(
+        self,
+        engine: Any | None,
+        *,
+        sla_days: Mapping[str, int] | None = None,
+        observer: MetricsObserver | None = None,
+        max_cached_series: int = 4096,
+        negative_ttl_s: float = NEGATIVE_TTL_SECONDS,
+    ) -> None:
+        """
+        Args:
+            engine: SQLAlchemy (sync) engine, or None for an in-process store
+            sla_days: Per-source freshness SLA overrides (days since fetch)
+            observer: Optional metrics observer
+            max_cached_series: Bound on the in-process read cache
+            negative_ttl_s: Seconds an empty series is reused before refetching
+        """
+        self.engine = engine
+        self.sla_days = {**DEFAULT_FRESHNESS_SLA_DAYS, **(sla_days or {})}
+        self.observer = ensure_observer(observer)
+        self.max_cached_series = max_cached_series
+        self.negative_ttl_s = negative_ttl_s
+        self._cache: OrderedDict[tuple[str, str, str], StoredSeries] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: dict[str, SourceStoreStats] = {}
+        self._schema_ready = False
+        self._db_disabled = engine is None
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    def _ensure_schema(self) -> bool:
+        if self._db_disabled:
+            return False
+        if self._schema_ready:
+            return True
+        from sqlalchemy import text
+
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text(_CREATE_TABLE_SQL))
+        except Exception as exc:
+            logger.warning("Fact store disabled, cannot create %s: %s", FACT_STORE_TABLE, exc)
+            self._db_disabled = True
+            return False
+        self._schema_ready = True
+        return True
+
+    # ------------------------------------------------------------------
+    # Freshness
+    # ------------------------------------------------------------------
+
+    def sla_for(self, source: str) -> int:
+        return self.sla_days.get(source, FALLBACK_SLA_DAYS)
+
+    def is_fresh(self, source: str, fetched_at: datetime, now: datetime | None = None) -> bool:
+        return not check_asof_freshness(fetched_at, self.sla_for(source), now)
+
+    def _reusable(self, source: str, stored: StoredSeries, now: datetime) -> bool:
+        if not stored.facts:
+            return (now - stored.fetched_at).total_seconds() < self.negative_ttl_s
+        return self.is_fresh(source, stored.fetched_at, now)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def lookup(
+        self,
+        source: str,
+        indicators: Iterable[str],
+        countries: Iterable[str] = ("QAT",),
+        *,
+        calls_per_series: int = 1,
+        now: datetime | None = None,
+    ) -> FactLookup:
+        """
+        Return fresh stored facts for every ``indicator x country`` series.
+
+        Series not in the read cache are loaded with a single indexed query.
+
+        Args:
+            source: Source key
+            indicators: Indicator codes to look up
+            countries: Country codes to look up
+            calls_per_series: API calls one series costs to fetch, used for
+                the api_calls_avoided counter
+            now: Reference time for freshness checks (defaults to utcnow)
+
+        Returns:
+            FactLookup with reusable facts, hit series and missing series
+        """
+        now = now or datetime.utcnow()
+        wanted = [
+            (indicator, country)
+            for indicator in dict.fromkeys(indicators)
+            for country in dict.fromkeys(countries)
+        ]
+        series: dict[tuple[str, str], StoredSeries] = {}
+        with self._lock:
+            for indicator, country in wanted:
+                cached = self._cache.get((source, indicator, country))
+                if cached is not None:
+                    self._cache.move_to_end((source, indicator, country))
+                    series[(indicator, country)] = cached
+
+        unresolved = [pair for pair in wanted if pair not in series]
+        if unresolved:
+            loaded = self._load(source, unresolved)
+            with self._lock:
+                for pair, stored in loaded.items():
+                    self._remember((source, *pair), stored)
+            series.update(loaded)
+
+        result = FactLookup()
+        stale = 0
+        for pair in wanted:
+            stored = series.get(pair)
+            if stored is not None and self._reusable(source, stored, now):
+                result.hits.append(pair)
+                result.facts.extend({**f, "cached": True} for f in stored.facts)
+            else:
+                if stored is not None:
+                    stale += 1
+                result.missing.append(pair)
+
+        with self._lock:
+            stats = self._stats.setdefault(source, SourceStoreStats())
+            stats.stale += stale
+            stats.hits += len(result.hits)
+            stats.misses += len(result.missing)
+            stats.api_calls_avoided += len(result.hits) * calls_per_series
+        tags = {"source": source}
+        if result.hits:
+            self.observer.increment("fact_store.hit", tags=tags)
+        if result.missing:
+            self.observer.increment("fact_store.miss", tags=tags)
+        return result
+
+    def _load(
+        self, source: str, pairs: Sequence[tuple[str, str]]
+    ) -> dict[tuple[str, str], StoredSeries]:
+        if not self._ensure_schema():
+            return {}
+        from sqlalchemy import bindparam, text
+
+        indicators = sorted({indicator for indicator, _ in pairs})
+        countries = sorted({country for _, country in pairs})
+        query = text(
+            f"SELECT indicator, country, payload, fetched_at FROM {FACT_STORE_TABLE} "
+            "WHERE source = :source AND indicator IN :indicators AND country IN :countries"
+        ).bindparams(
+            bindparam("indicators", expanding=True),
+            bindparam("countries", expanding=True),
+        )
+        start = time.perf_counter()
+        try:
+            with self.engine.connect() as conn:
+                rows = conn.execute(
+                    query,
+                    {"source": source, "indicators": indicators, "countries": countries},
+                ).fetchall()
+        except Exception as exc:
+            logger.error("Fact store lookup failed for %s: %s", source, exc)
+            return {}
+        self.observer.timing(
+            "fact_store.lookup_ms", (time.perf_counter() - start) * 1000, tags={"source": source}
+        )
+
+        wanted = set(pairs)
+        loaded: dict[tuple[str, str], StoredSeries] = {}
+        for indicator, country, payload, fetched_at in rows:
+            pair = (indicator, country)
+            if pair not in wanted:
+                continue
+            fact = json.loads(payload) if isinstance(payload, str) else payload
+            fetched = _parse_timestamp(fetched_at)
+            stored = loaded.setdefault(pair, StoredSeries(facts=[], fetched_at=fetched))
+            if fact is not None:  # None payload: negative entry
+                stored.facts.append(dict(fact))
+            stored.fetched_at = min(stored.fetched_at, fetched)
+        return loaded
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def put_series(
+        self,
+        source: str,
+        series: Mapping[tuple[str, str], Sequence[Mapping[str, Any]]],
+        *,
+        dimension_fields: Sequence[str] = ("sex", "age_group", "sector"),
+        fetched_at: datetime | None = None,
+    ) -> int:
+        """
+        Replace stored series with freshly fetched facts.
+
+        A series with no facts is stored as a negative entry, reused for
+        ``negative_ttl_s`` so an indicator the API has no data for is not
+        requested on every run.
+
+        Args:
+            source: Source key
+            series: ``{(indicator, country): facts}`` as returned by the API
+            dimension_fields: Fact fields that distinguish facts within a period
+            fetched_at: Fetch time (defaults to utcnow)
+
+        Returns:
+            Number of facts written
+        """
+        series = {pair: [dict(f) for f in facts] for pair, facts in series.items()}
+        if not series:
+            return 0
+        fetched_at = fetched_at or datetime.utcnow()
+
+        rows: list[dict[str, Any]] = []
+        negative = 0
+        for (indicator, country), facts in series.items():
+            if not facts:
+                negative += 1
+                rows.append({
+                    "source": source,
+                    "indicator": indicator,
+                    "country": country,
+                    "period": "",
+                    "dimensions": "[]",
+                    "payload": "null",
+                    "fetched_at": fetched_at,
+                })
+                continue
+            seen: set[FactKey] = set()
+            for seq, fact in enumerate(facts):
+                key = fact_key(
+                    source, fact, indicator=indicator, country=country,
+                    dimension_fields=dimension_fields,
+                )
+                if key in seen:
+                    # Facts without a period/dimension (e.g. LMIS table rows)
+                    # are told apart by their position in the series
+                    key = FactKey(*key.series, key.period, (*key.dimensions, ("_seq", str(seq))))
+                seen.add(key)
+                rows.append({
+                    "source": key.source,
+                    "indicator": key.indicator,
+                    "country": key.country,
+                    "period": key.period,
+                    "dimensions": json.dumps(key.dimensions),
+                    "payload": json.dumps(fact, default=str),
+                    "fetched_at": fetched_at,
+                })
+
+        facts_written = len(rows) - negative
+        with self._lock:
+            for (indicator, country), facts in series.items():
+                self._remember(
+                    (source, indicator, country), StoredSeries(facts=facts, fetched_at=fetched_at)
+                )
+            stats = self._stats.setdefault(source, SourceStoreStats())
+            stats.series_written += len(series)
+            stats.facts_written += facts_written
+        if self._ensure_schema():
+            self._write(source, list(series), rows)
+        return facts_written
+
+    def _write(
+        self, source: str, pairs: list[tuple[str, str]], rows: list[dict[str, Any]]
+    ) -> None:
+        from sqlalchemy import text
+
+        start = time.perf_counter()
+        try:
+            with self.engine.begin() as conn:
+                for indicator, country in pairs:
+                    conn.execute(
+                        text(
+                            f"DELETE FROM {FACT_STORE_TABLE} WHERE source = :source "
+                            "AND indicator = :indicator AND country = :country"
+                        ),
+                        {"source": source, "indicator": indicator, "country": country},
+                    )
+                conn.execute(
+                    text(
+                        f"INSERT INTO {FACT_STORE_TABLE} "
+                        "(source, indicator, country, period, dimensions, payload, fetched_at) "
+                        "VALUES (:source, :indicator, :country, :period, :dimensions, "
+                        ":payload, :fetched_at)"
+                    ),
+                    rows,
+                )
+        except Exception as exc:
+            logger.error("Fact store write failed for %s: %s", source, exc)
+            self.observer.increment("fact_store.write_failures", tags={"source": source})
+            return
+        self.observer.timing(
+            "fact_store.write_ms", (time.perf_counter() - start) * 1000, tags={"source": source}
+        )
+
+    def _remember(self, series_key: tuple[str, str, str], stored: StoredSeries) -> None:
+        self._cache[series_key] = stored
+        self._cache.move_to_end(series_key)
+        while len(self._cache) > self.max_cached_series:
+            self._cache.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Async wrappers (database work runs in a worker thread)
+    # ------------------------------------------------------------------
+
+    async def lookup_async(
+        self,
+        source: str,
+        indicators: Iterable[str],
+        countries: Iterable[str] = ("QAT",),
+        *,
+        calls_per_series: int = 1,
+    ) -> FactLookup:
+        return await asyncio.to_thread(
+            self.lookup, source, list(indicators), list(countries),
+            calls_per_series=calls_per_series,
+        )
+
+    async def put_series_async(
+        self,
+        source: str,
+        series: Mapping[tuple[str, str], Sequence[Mapping[str, Any]]],
+        **kwargs: Any,
+    ) -> int:
+        return await asyncio.to_thread(self.put_series, source, series, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+
+    def clear_cache(self) -> None:
+        """Drop the in-process read cache (the database is untouched)."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-source hit ratio, stale counts and API calls avoided."""
+        with self._lock:
+            return {source: stats.as_dict() for source, stats in self._stats.items()}
+
+
+def group_by_series(
+    facts: Iterable[Mapping[str, Any]],
+    *,
+    country: str = "QAT",
+    indicator_field: str = "metric",
+) -> dict[tuple[str, str], list[dict[str, Any]]]:
+    """Group fetched facts into ``{(indicator, country): facts}`` for ``put_series``."""
+    grouped: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for fact in facts:
+        indicator = fact.get(indicator_field)
+        if indicator is None:
+            continue
+        grouped.setdefault((str(indicator), country), []).append(dict(fact))
+    return grouped
+
+
+async def fetch_world_bank_series(
+    connector: Any,
+    indicators: Sequence[str],
+    countries: Sequence[str] = ("QAT",),
+    *,
+    store: FactStore | None = None,
+    max_concurrency: int = 8,
+    refresh: Iterable[str] = (),
+) -> list[dict[str, Any]]:
+    """
+    Store-first World Bank fetch: reuse fresh series, call the API for gaps.
+
+    Each ``indicator x country`` series costs one ``get_indicator`` call.
+    Missing series are fetched concurrently and written back to the store;
+    series the API returns empty are stored as negative entries.
+
+    Args:
+        connector: ``WorldBankAPI`` instance
+        indicators: Indicator codes
+        countries: ISO3 country codes
+        store: Fact store (defaults to the process-wide store)
+        max_concurrency: Concurrent API calls for gap filling
+        refresh: Indicator codes to refetch even if the stored series is fresh
+
+    Returns:
+        One record per indicator, country and year with ``indicator_code``,
+        ``indicator_name``, ``country``, ``year`` and ``value``
+    """
+    store = store or get_fact_store()
+    lookup = await store.lookup_async("world_bank", indicators, countries)
+    refresh = set(refresh)
+    missing = [*lookup.missing, *(pair for pair in lookup.hits if pair[0] in refresh)]
+    records = [
+        fact for fact in lookup.facts
+        if fact.get("indicator_code") not in refresh
+    ]
+    if not missing:
+        return records
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch(indicator: str, country: str) -> list[dict[str, Any]]:
+        async with semaphore:
+            data = await connector.get_indicator(indicator, country)
+        name = data.get("indicator_name") or indicator
+        return [
+            {
+                "indicator_code": indicator,
+                "indicator_name": name,
+                "country": country,
+                "year": int(year),
+                "value": value,
+            }
+            for year, value in (data.get("values") or {}).items()
+        ]
+
+    results = await asyncio.gather(
+        *(fetch(indicator, country) for indicator, country in missing),
+        return_exceptions=True,
+    )
+    fetched: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    for pair, result in zip(missing, results):
+        if isinstance(result, BaseException):
+            logger.warning("World Bank fetch failed for %s/%s: %s", *pair, result)
+            continue
+        fetched[pair] = result
+        records.extend(result)
+
+    if fetched:
+        await store.put_series_async("world_bank", fetched)
+    return records
+
+
+_default_store: FactStore | None = None
+_default_lock = threading.Lock()
+
+
+def get_fact_store() -> FactStore:
+    """Process-wide fact store backed by the deterministic data engine."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                try:
+                    from ..data.deterministic.engine import get_engine
+
+                    engine = get_engine()
+                except Exception as exc:
+                    logger.warning("Fact store running without PostgreSQL: %s", exc)
+                    engine = None
+                _default_store = FactStore(engine)
+    return _default_store
+
+
+__all__ = [
+    "DEFAULT_FRESHNESS_SLA_DAYS",
+    "FACT_STORE_TABLE",
+    "FactKey",
+    "FactLookup",
+    "FactStore",
+    "NEGATIVE_TTL_SECONDS",
+    "SourceStoreStats",
+    "StoredSeries",
+    "fact_key",
+    "fetch_world_bank_series",
+    "get_fact_store",
+    "group_by_series",
+    "normalize_dimensions",
+]
@@ -0,0 +1,83 @@
+"""
+Process-wide cache of compiled LangGraph workflows.
+
+Building a ``StateGraph`` and calling ``compile()`` validates every node and
+edge; doing that per request (``run_workflow_stream``) or per scenario batch
+(``parallel_execution_node``) repeats identical work. Compiled graphs hold no
+per-run state, so one instance per builder/configuration is reused.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+GraphKey = Tuple[str, Tuple[Tuple[str, Hashable], ...]]
+
+_graphs: Dict[GraphKey, Any] = {}
+_build_ms: Dict[GraphKey, float] = {}
+_lock = threading.Lock()
+
+
+def graph_key(builder: Callable[..., Any], config: Dict[str, Hashable]) -> GraphKey:
+    """Cache key: builder identity plus its (hashable) configuration."""
+    name = f"{builder.__module__}.{builder.__qualname__}"
+    return name, tuple(sorted(config.items()))
+
+
+def get_compiled_graph(builder: Callable[..., Any], **config: Hashable) -> Any:
+    """
+    Return the compiled graph for ``builder(**config)``, building it once.
+
+    Args:
+        builder: Function returning a compiled graph
+            (e.g. ``create_intelligence_graph``)
+        **config: Builder keyword arguments; part of the cache key
+
+    Returns:
+        Shared compiled graph
+    """
+    key = graph_key(builder, config)
+    graph = _graphs.get(key)
+    if graph is not None:
+        return graph
+
+    with _lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            start = time.perf_counter()
+            graph = builder(**config)
+            _build_ms[key] = (time.perf_counter() - start) * 1000
+            _graphs[key] = graph
+            logger.info("Compiled graph cached: %s (%.1fms)", key[0], _build_ms[key])
+    return graph
+
+
+def clear_graph_cache() -> None:
+    """Drop all cached graphs (tests, hot reload of node code)."""
+    with _lock:
+        _graphs.clear()
+        _build_ms.clear()
+
+
+def graph_cache_info() -> Dict[str, Any]:
+    """Cached graph keys with their one-time build cost."""
+    return {
+        "size": len(_graphs),
+        "graphs": [
+            {"builder": key[0], "config": dict(key[1]), "build_ms": _build_ms.get(key)}
+            for key in _graphs
+        ],
+    }
+
+
+__all__ = [
+    "clear_graph_cache",
+    "get_compiled_graph",
+    "graph_cache_info",
+    "graph_key",
+]
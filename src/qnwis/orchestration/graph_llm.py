@@ -29,6 +29,7 @@ from ..agents.scenario_agent import ScenarioAgent
 from ..agents.base import AgentReport, DataClient
 from ..llm.client import LLMClient
 from ..classification.classifier import Classifier
+from ..synthesis.incremental import SynthesisDraft
 from .citation_injector import CitationInjector
 from src.qnwis.orchestration.prefetch_apis import get_complete_prefetch
 
@@ -41,6 +42,7 @@ class WorkflowState(TypedDict):
     question: str
     classification: Optional[Dict[str, Any]]
     prefetch: Optional[Dict[str, Any]]
+    prefetch_runs: Optional[List[Any]]  # PrefetchRuns with sources still running; cancelled at workflow end
     rag_context: Optional[Dict[str, Any]]
     # CRITICAL: extracted_facts must be in TypedDict or LangGraph strips it!
     extracted_facts: Optional[List[Dict[str, Any]]]  # Facts from prefetch for debates
@@ -54,6 +56,7 @@ class WorkflowState(TypedDict):
     # Agent Selection
     selected_agents: Optional[list]
     agent_reports: list  # List of AgentReport objects
+    synthesis_draft: Optional[Any]  # SynthesisDraft: per-agent digests built as reports land
     debate_results: Optional[Dict[str, Any]]  # Multi-agent debate outcomes
     critique_results: Optional[Dict[str, Any]]  # Devil's advocate critique
     deterministic_result: Optional[str]  # Result from TimeMachine/Predictor/Scenario
@@ -68,6 +71,26 @@ class WorkflowState(TypedDict):
     scenario_name: Optional[str]  # NSIC: Scenario name for logging
 
 
+GRAPH_SYNTHESIS_SYSTEM_PROMPT = (
+    "You are an expert labour market analyst for Qatar's Ministry of Labour. "
+    "Provide concise, data-driven executive summaries."
+)
+
+# Fixed head of the synthesize-node prompt; question and findings follow it.
+GRAPH_SYNTHESIS_PROMPT_PREFIX = """Synthesize the analysis below into a comprehensive executive summary for the question that follows.
+
+Provide a ministerial-grade synthesis that:
+1. EXECUTIVE SUMMARY (3 sentences max)
+2. THE RECOMMENDATION: What should be done?
+3. CONFIDENCE LEVEL: X% (based on evidence quality)
+4. KEY DECISIVE FACTORS (3-5 bullet points)
+5. CRITICAL RISKS (if any red flags were identified)
+6. RECOMMENDED NEXT STEPS (with priority)
+
+Be decisive. Use specific numbers from the analysis.
+"""
+
+
 class LLMWorkflow:
     """
     LangGraph workflow orchestrating LLM-powered agents.
@@ -443,9 +466,26 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
         query = state.get("question") or state.get("query", "")
 
         prefetch = get_complete_prefetch()
+        event_callback = state.get("event_callback")
+        extracted_facts: List[Dict[str, Any]] = []
+
+        async def _on_late_facts(source_name: str, late_facts: List[Dict[str, Any]]) -> None:
+            # Slow sources finish after the node returns; extend the same list
+            # object held in state so downstream nodes see the late facts.
+            extracted_facts.extend(late_facts)
+            if event_callback:
+                await event_callback(
+                    "prefetch",
+                    "update",
+                    {"source": source_name, "new_facts": late_facts, "fact_count": len(extracted_facts)},
+                )
 
         try:
-            extracted_facts = await prefetch.fetch_all_sources(query)
+            run = await prefetch.fetch_all_sources_run(query, on_late_facts=_on_late_facts)
+            extracted_facts.extend(run.facts)
+            prefetch_runs = state.get("prefetch_runs")
+            if run.pending and prefetch_runs is not None:
+                prefetch_runs.append(run)
 
             extraction_confidence = 0.85 if len(extracted_facts) > 10 else 0.60
             reasoning = f"Extracted {len(extracted_facts)} facts from multiple sources"
@@ -457,13 +497,16 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                 "prefetch": {
                     "fact_count": len(extracted_facts),
                     "facts": extracted_facts,
+                    "time_to_first_fact_ms": run.time_to_first_fact_ms,
+                    "time_to_coverage_ms": run.time_to_coverage_ms,
+                    "pending_sources": list(run.pending),
                 },
                 "extracted_facts": extracted_facts,
                 "extraction_confidence": extraction_confidence,
                 "reasoning_chain": reasoning_chain,
             }
 
-            if event_callback := state.get("event_callback"):
+            if event_callback:
                 await event_callback(
                     "prefetch",
                     "complete",
@@ -865,6 +908,10 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                 agents_to_invoke = list(self.agents.keys())
 
             reports: list[AgentReport] = []
+            # Draft key (selector name) per report, matching the runners' add()
+            report_keys: list[str] = []
+            # Condense each report for synthesis as soon as its agent finishes
+            synthesis_draft = SynthesisDraft()
 
             event_cb = state.get("event_callback")
             # Placeholder for upcoming debate context until Phase 5 populates it
@@ -909,6 +956,7 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                                 timeout=7200.0
                             )
                             report.agent = getattr(report, "agent", display_name) or display_name
+                            synthesis_draft.add(report, agent=name)
                             latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
                             if event_cb:
                                 await event_cb(
@@ -944,6 +992,7 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                                 self.deterministic_agents[name],
                                 question,
                             )
+                            synthesis_draft.add(report, agent=name)
                             latency_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
                             if event_cb:
                                 await event_cb(
@@ -1006,6 +1055,7 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                 if getattr(report, "agent", None) != agent_name:
                     report.agent = agent_name
                 reports.append(report)
+                report_keys.append(agent_name)
 
                 if getattr(report, "narrative", None):
                     state[f"{agent_name}_analysis"] = report.narrative
@@ -1058,12 +1108,14 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
                 
                 logger.info(f"Built citation map from {len(extracted_facts)} facts across {len(prefetch_data)} sources")
 
-            for report in reports:
+            for draft_key, report in zip(report_keys, reports):
                 # CRITICAL FIX: Inject into narrative field (this is what UI displays!)
                 if hasattr(report, 'narrative') and report.narrative:
                     original_narrative = report.narrative
                     cited_narrative = injector.inject_citations(original_narrative, prefetch_data)
                     report.narrative = cited_narrative
+                    if cited_narrative != original_narrative:
+                        synthesis_draft.add(report, agent=draft_key)
                     logger.info(f"Injected citations into narrative: {len(original_narrative)} -> {len(cited_narrative)} chars")
                     logger.info(f"Citations present in narrative: {'[Per extraction:' in cited_narrative}")
 
@@ -1105,6 +1157,7 @@ Use `agent.apply(scenario_spec)` with your scenario definition.
             return {
                 **state,
                 "agent_reports": reports,
+                "synthesis_draft": synthesis_draft,
                 "reasoning_chain": reasoning_chain,
             }
         
@@ -2073,15 +2126,12 @@ OUTPUT FORMAT (JSON):
                     "reasoning_chain": reasoning_chain,
                 }
 
-            # LLM agent synthesis path
+            # LLM agent synthesis path: prompt over the compact per-agent digests
             reports = state.get("agent_reports", [])
-
-            # Build synthesis prompt
-            findings_text = "\n\n".join([
-                f"**Agent {report.agent}**:\n{report.narrative if hasattr(report, 'narrative') else str(report)}"
-                for report in reports
-                if report
-            ])
+            draft = state.get("synthesis_draft")
+            if not draft:
+                draft = SynthesisDraft.from_reports(reports)
+            findings_text = draft.render_digests()
             
             # Include debate synthesis if available (from legendary debate)
             debate_synthesis = state.get("debate_synthesis", "")
@@ -2113,7 +2163,9 @@ OUTPUT FORMAT (JSON):
             n_facts = len(extracted_facts) if isinstance(extracted_facts, list) else 0
             n_sources = len(set(f.get("source", "") for f in extracted_facts if isinstance(f, dict))) if extracted_facts else 0
 
-            synthesis_prompt = f"""Synthesize the following analysis into a comprehensive executive summary for the question: \"{question}\"
+            # Static instructions first so the provider can reuse the cached prefix
+            synthesis_prompt = f"""{GRAPH_SYNTHESIS_PROMPT_PREFIX}
+QUESTION: \"{question}\"
 
 ## Data Foundation
 - {n_facts} verified facts from {n_sources} data sources
@@ -2123,23 +2175,13 @@ Agent Findings:
 {debate_section}
 {critique_section}
 
-Provide a ministerial-grade synthesis that:
-1. EXECUTIVE SUMMARY (3 sentences max)
-2. THE RECOMMENDATION: What should be done?
-3. CONFIDENCE LEVEL: X% (based on evidence quality)
-4. KEY DECISIVE FACTORS (3-5 bullet points)
-5. CRITICAL RISKS (if any red flags were identified)
-6. RECOMMENDED NEXT STEPS (with priority)
-
-Be decisive. Use specific numbers from the analysis.
-
 Synthesis:"""
 
             # Generate synthesis with streaming
             synthesis_text = ""
             async for token in self.llm_client.generate_stream(
                 prompt=synthesis_prompt,
-                system="You are an expert labour market analyst for Qatar's Ministry of Labour. Provide concise, data-driven executive summaries."
+                system=GRAPH_SYNTHESIS_SYSTEM_PROMPT
             ):
                 synthesis_text += token
                 if state.get("event_callback"):
@@ -2230,6 +2272,7 @@ Synthesis:"""
             "question": question,
             "classification": None,
             "prefetch": None,
+            "prefetch_runs": [],
             "rag_context": None,
             "extracted_facts": [],  # CRITICAL: Must be in initial state for LangGraph
             "extraction_confidence": None,
@@ -2256,7 +2299,10 @@ Synthesis:"""
             "scenario_name": scenario_name or question[:50],
         }
         
-        final_state = await self.graph.ainvoke(initial_state)
+        try:
+            final_state = await self.graph.ainvoke(initial_state)
+        finally:
+            _cancel_prefetch_runs(initial_state["prefetch_runs"])
         
         # Add total latency
         start_time = datetime.fromisoformat(final_state["metadata"]["start_time"])
@@ -2286,6 +2332,7 @@ Synthesis:"""
             "question": question,
             "classification": None,
             "prefetch": None,
+            "prefetch_runs": [],
             "rag_context": None,
             "selected_agents": None,
             "agent_reports": [],
@@ -2326,6 +2373,14 @@ Synthesis:"""
             if event_callback:
                 await event_callback("error", "error", {"error": str(e)}, 0)
             raise e
+        finally:
+            _cancel_prefetch_runs(initial_state["prefetch_runs"])
+
+
+def _cancel_prefetch_runs(runs: List[Any]) -> None:
+    """Stop prefetch sources still running once the workflow has finished."""
+    for run in runs:
+        run.cancel()
 
 
 def build_workflow(
@@ -271,6 +271,7 @@ class MasterDataExtractor:
         facts = []
         try:
             from src.data.apis.world_bank_api import WorldBankAPI
+            from .fact_store import fetch_world_bank_series
             
             api = WorldBankAPI()
             
@@ -317,24 +318,19 @@ class MasterDataExtractor:
             
             countries = ["QAT", "SAU", "ARE", "KWT", "BHR", "OMN"]
             
-            for indicator_code, indicator_name in all_indicators.items():
-                for country in countries:
-                    try:
-                        data = await api.get_indicator(indicator_code, country)
-                        if data.get("values"):
-                            for year, value in data["values"].items():
-                                facts.append({
-                                    "metric": indicator_code,
-                                    "description": indicator_name,
-                                    "value": value,
-                                    "year": int(year),
-                                    "country": country,
-                                    "source": "World Bank API",
-                                    "source_priority": 95,
-                                    "confidence": 0.98,
-                                })
-                    except:
-                        continue
+            # Fact store first; only missing/stale series hit the API
+            records = await fetch_world_bank_series(api, list(all_indicators), countries)
+            for record in records:
+                facts.append({
+                    "metric": record["indicator_code"],
+                    "description": all_indicators[record["indicator_code"]],
+                    "value": record["value"],
+                    "year": int(record["year"]),
+                    "country": record["country"],
+                    "source": "World Bank API",
+                    "source_priority": 95,
+                    "confidence": 0.98,
+                })
             
             await api.close()
             logger.info(f"   World Bank: {len(facts)} facts")
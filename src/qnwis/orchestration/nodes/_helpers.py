@@ -143,6 +143,10 @@ async def execute_agent_analysis(
     try:
         llm_client = create_llm_client(state)
         extracted_facts = state.get("extracted_facts", [])
+        late_facts = state.get("late_facts") or []
+        if late_facts:
+            # Prefetch sources that finished after the extraction node returned
+            extracted_facts = [*extracted_facts, *late_facts]
         
         # Validate input data
         if not extracted_facts:
@@ -191,16 +191,34 @@ async def data_extraction_node(state: IntelligenceState) -> IntelligenceState:
     sources_queried = []
     sources_failed = []
 
+    # Slow prefetch sources finish after this node returns. Their facts go
+    # into the late_facts list held in state (keep_first keeps the same
+    # object), so agent nodes that run later still pick them up.
+    late_facts = state.get("late_facts")
+    if late_facts is None:
+        late_facts = state["late_facts"] = []
+    emit_fn = state.get("emit_event_fn")
+
+    async def _on_late_facts(source_name: str, facts: List[Dict[str, Any]]) -> None:
+        late_facts.extend(facts)
+        if emit_fn:
+            await emit_fn(
+                "extraction",
+                "update",
+                {"source": source_name, "new_facts": facts, "late_fact_count": len(late_facts)},
+            )
+
     # 1. Use the existing prefetch layer (which already has comprehensive extraction)
     prefetch = get_complete_prefetch()
     
     try:
         logger.info("📊 Phase 1: Prefetch layer extraction...")
-        prefetch_facts = await prefetch.fetch_all_sources(query)
-        # Guard against None return
-        if prefetch_facts is None:
-            logger.warning("⚠️ Prefetch returned None, using empty list")
-            prefetch_facts = []
+        run = await prefetch.fetch_all_sources_run(query, on_late_facts=_on_late_facts)
+        prefetch_facts = run.facts
+        # The workflow cancels sources still running once it finishes
+        prefetch_runs = state.get("prefetch_runs")
+        if run.pending and prefetch_runs is not None:
+            prefetch_runs.append(run)
         all_facts.extend(prefetch_facts)
         
         # Track sources
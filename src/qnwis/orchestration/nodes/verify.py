@@ -735,6 +735,33 @@ def verify_structure(
             verification_error = f"Verification engine exception: {type(exc).__name__}: {exc}"
             warnings.append(verification_error)
 
+    # Compute confidence score (Step 22) - happens even on verification failures
+    confidence_breakdown: ConfidenceBreakdown | None = None
+    if verification_summary is not None:
+        confidence_rules = _load_confidence_rules()
+        if confidence_rules is not None:
+            prev_score_value = workflow_state.metadata.get("confidence_previous_score")
+            previous_score = _coerce_previous_score(prev_score_value)
+            if previous_score is None:
+                prior_breakdown = workflow_state.metadata.get("confidence_breakdown")
+                if isinstance(prior_breakdown, dict):
+                    previous_score = _coerce_previous_score(prior_breakdown.get("score"))
+
+            confidence_breakdown = _compute_confidence(
+                verification_summary,
+                config,
+                confidence_rules,
+                previous_score=previous_score,
+            )
+            if confidence_breakdown is not None:
+                # Attach confidence to metadata for format node
+                verification_metadata["confidence_breakdown"] = confidence_breakdown.model_dump()
+                verification_metadata["confidence_dashboard_payload"] = confidence_breakdown.dashboard_payload
+                verification_metadata["confidence_previous_score"] = confidence_breakdown.score
+                log_messages.append(
+                    f"Confidence: {confidence_breakdown.score}/100 ({confidence_breakdown.band})"
+                )
+
     # Generate audit trail (Layer 4) even on WARNING/ERROR to capture provenance
     audit_manifest_dict: dict[str, Any] | None = None
     audit_id: str | None = None
@@ -747,6 +774,11 @@ def verify_structure(
                 "agents": workflow_state.metadata.get("agents", []),
                 "timings": workflow_state.metadata.get("timings", {}),
                 "cache_stats": workflow_state.metadata.get("cache_stats", {}),
+                "confidence": (
+                    {"score": confidence_breakdown.score, "band": confidence_breakdown.band}
+                    if confidence_breakdown is not None
+                    else None
+                ),
                 "params": filter_sensitive_params(
                     workflow_state.task.params if workflow_state.task else {}
                 ),
@@ -819,33 +851,6 @@ def verify_structure(
                 f"Audit trail generation failed: {type(exc).__name__}: {exc}"
             )
 
-    # Compute confidence score (Step 22) - happens even on verification failures
-    confidence_breakdown: ConfidenceBreakdown | None = None
-    if verification_summary is not None:
-        confidence_rules = _load_confidence_rules()
-        if confidence_rules is not None:
-            prev_score_value = workflow_state.metadata.get("confidence_previous_score")
-            previous_score = _coerce_previous_score(prev_score_value)
-            if previous_score is None:
-                prior_breakdown = workflow_state.metadata.get("confidence_breakdown")
-                if isinstance(prior_breakdown, dict):
-                    previous_score = _coerce_previous_score(prior_breakdown.get("score"))
-
-            confidence_breakdown = _compute_confidence(
-                verification_summary,
-                config,
-                confidence_rules,
-                previous_score=previous_score,
-            )
-            if confidence_breakdown is not None:
-                # Attach confidence to metadata for format node
-                verification_metadata["confidence_breakdown"] = confidence_breakdown.model_dump()
-                verification_metadata["confidence_dashboard_payload"] = confidence_breakdown.dashboard_payload
-                verification_metadata["confidence_previous_score"] = confidence_breakdown.score
-                log_messages.append(
-                    f"Confidence: {confidence_breakdown.score}/100 ({confidence_breakdown.band})"
-                )
-
     # If verification found errors, fail the workflow but still attach audit metadata
     if verification_error:
         metrics.increment("agent.verify.failure", tags={"reason": "verification_errors"})
@@ -14,16 +14,20 @@ ENHANCED: Now calls Engine B compute services per scenario for:
 
 import asyncio
 import logging
-import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 import torch
-import httpx
+
+# Absolute import (as in llm.client) so scenarios and LLM calls share one budget
+from src.qnwis.llm.adaptive_limiter import get_adaptive_limiter
+from src.nsic.engine_b.transport import EngineBTransport, get_engine_b_transport
+from .scenario_state import ScenarioStateBase
 
 logger = logging.getLogger(__name__)
 
-# Engine B Configuration
-ENGINE_B_URL = os.getenv("ENGINE_B_URL", "http://localhost:8001")
+# Engine B is reached through the shared transport: HTTP to ENGINE_B_URL by
+# default, or ENGINE_B_TRANSPORT=inprocess to call the compute services on a
+# local process pool.
 
 
 class ParallelDebateExecutor:
@@ -33,14 +37,17 @@ class ParallelDebateExecutor:
     If GPUs are available, distributes scenarios across GPUs 0-5.
     Otherwise, runs all scenarios on CPU using asyncio concurrency.
     
-    ENTERPRISE STABILITY FIX: Uses semaphore to limit concurrent scenarios.
-    This prevents Azure OpenAI rate limit errors (429 Too Many Requests).
-    Running 6 scenarios × 4 agents = 24 concurrent calls overwhelms rate limits.
-    With max_concurrent_scenarios=2, we limit to 8 concurrent calls maximum.
+    ENTERPRISE STABILITY: Scenario admission is sized from the shared adaptive
+    concurrency budget (``llm.adaptive_limiter``). Each scenario runs ~4 agents,
+    and the limit starts at 8, so two scenarios run at once initially; the
+    limit grows while latency and 429/timeout rates stay healthy and backs off
+    (down to one scenario) when they degrade. ``max_concurrent`` remains
+    available as a hard upper bound.
     """
     
-    # Enterprise rate limiting config
-    MAX_CONCURRENT_SCENARIOS = 2  # Run at most 2 scenarios simultaneously
+    # Concurrent LLM calls a single scenario issues (financial, market,
+    # operations, research agents)
+    AGENTS_PER_SCENARIO = 4
     SCENARIO_DELAY_SECONDS = 1.0  # Small delay between scenario starts
     
     def __init__(self, num_parallel: int = 6, event_callback=None, max_concurrent: int = None):
@@ -50,14 +57,19 @@ class ParallelDebateExecutor:
         Args:
             num_parallel: Total number of scenarios to run (default 6)
             event_callback: Optional async callback for emitting events to frontend
-            max_concurrent: Max scenarios running simultaneously (default 2 for enterprise stability)
+            max_concurrent: Optional hard cap on scenarios running simultaneously
+                (default: sized adaptively from the shared concurrency budget)
         """
         self.num_parallel = num_parallel
         self.event_callback = event_callback
-        self.max_concurrent = max_concurrent or self.MAX_CONCURRENT_SCENARIOS
         
-        # Enterprise rate limiting semaphore
-        self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        # Shared adaptive budget: scenarios are admitted in proportion to the
+        # live LLM concurrency limit; agents and Engine B hold leaf slots
+        self._limiter = get_adaptive_limiter()
+        self._scenario_gate = self._limiter.gate(
+            units_per_task=self.AGENTS_PER_SCENARIO,
+            max_tasks=max_concurrent,
+        )
         
         # Check GPU availability
         self.gpu_available = torch.cuda.is_available()
@@ -66,7 +78,7 @@ class ParallelDebateExecutor:
         if self.gpu_available:
             logger.info(f"✅ Parallel executor initialized with {self.gpu_count} GPUs")
             logger.info(f"   Total scenarios: {num_parallel}")
-            logger.info(f"   Max concurrent: {self.max_concurrent} (enterprise rate limiting)")
+            logger.info(f"   Max concurrent: {self.max_concurrent} (adaptive, shared LLM budget)")
             logger.info(f"   GPU distribution: Scenarios across GPUs 0-5")
             
             # Log GPU details
@@ -79,7 +91,12 @@ class ParallelDebateExecutor:
                     logger.warning(f"   GPU {i}: Could not get info - {e}")
         else:
             logger.warning("⚠️ No GPUs detected - parallel execution will use CPU")
-            logger.info(f"   Max concurrent scenarios: {self.max_concurrent} (prevents API rate limits)")
+            logger.info(f"   Max concurrent scenarios: {self.max_concurrent} (adaptive, shared LLM budget)")
+    
+    @property
+    def max_concurrent(self) -> int:
+        """Scenarios currently admitted at once (follows the adaptive limit)."""
+        return self._scenario_gate.capacity
     
     async def execute_scenarios(
         self, 
@@ -104,6 +121,10 @@ class ParallelDebateExecutor:
         logger.info(f"Starting parallel execution of {len(scenarios)} scenarios")
         start_time = datetime.now()
         
+        # Freeze the heavy base sections ONCE; every scenario branch shares them
+        # (copy-on-write) instead of deep-copying the whole state
+        state_base = ScenarioStateBase(initial_state)
+        
         # Start ResearchSynthesizer in parallel - runs while scenarios execute
         research_task = asyncio.create_task(
             self._run_research_synthesizer(initial_state.get("query", "policy analysis"))
@@ -131,15 +152,15 @@ class ParallelDebateExecutor:
             )
         
         # ENTERPRISE STABILITY: Rate-limited scenario execution
-        # Uses semaphore to limit concurrent scenarios and prevent API rate limit errors
+        # Scenarios are admitted from the shared adaptive budget to prevent API rate limit errors
         logger.info(
             f"🚦 Starting rate-limited execution: {len(scenarios)} scenarios, "
-            f"max {self.max_concurrent} concurrent (prevents Azure rate limits)"
+            f"{self.max_concurrent} concurrent now, adaptive limit {self._limiter.limit} LLM calls"
         )
         
         async def run_with_rate_limit(scenario, index):
-            """Run a single scenario with semaphore-based rate limiting."""
-            async with self._semaphore:
+            """Run a single scenario once the shared budget admits it."""
+            async with self._scenario_gate.admit():
                 # Small staggered delay to prevent burst
                 if index > 0:
                     await asyncio.sleep(self.SCENARIO_DELAY_SECONDS * (index % self.max_concurrent))
@@ -150,7 +171,7 @@ class ParallelDebateExecutor:
                 result = await self._run_scenario(
                     scenario=scenario,
                     workflow=base_workflow,
-                    base_state=initial_state,
+                    base_state=state_base,
                     gpu_id=gpu_id,
                     scenario_index=index,
                     total_scenarios=len(scenarios)
@@ -166,7 +187,7 @@ class ParallelDebateExecutor:
         ]
         
         # Execute with controlled concurrency
-        logger.info(f"🚦 Launching {len(tasks)} scenarios with {self.max_concurrent} concurrent limit...")
+        logger.info(f"🚦 Launching {len(tasks)} scenarios with adaptive concurrency ({self.max_concurrent} now)...")
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Separate successful and failed results
@@ -359,7 +380,7 @@ Evidence confidence: {synthesis.confidence_level.upper()}
         self,
         scenario: Dict[str, Any],
         workflow: Any,
-        base_state: Dict[str, Any],
+        base_state: Union[Dict[str, Any], ScenarioStateBase],
         gpu_id: Optional[int],
         scenario_index: int,
         total_scenarios: int = 6
@@ -370,7 +391,7 @@ Evidence confidence: {synthesis.confidence_level.upper()}
         Args:
             scenario: Scenario definition with assumptions
             workflow: LangGraph workflow instance
-            base_state: Base state dictionary to clone
+            base_state: Shared base state (or a plain state dict to share)
             gpu_id: GPU ID to use (0-5) or None for CPU
             scenario_index: Index of this scenario in the list
             
@@ -405,8 +426,11 @@ Evidence confidence: {synthesis.confidence_level.upper()}
             }
         )
         
+        if not isinstance(base_state, ScenarioStateBase):
+            base_state = ScenarioStateBase(base_state)
+        
         try:
-            # Clone base state and inject scenario
+            # Branch the shared base state and inject scenario
             scenario_state = self._prepare_scenario_state(
                 base_state=base_state,
                 scenario=scenario,
@@ -423,24 +447,23 @@ Evidence confidence: {synthesis.confidence_level.upper()}
             result = await workflow.ainvoke(scenario_state)
             logger.warning(f"✅ workflow.ainvoke completed for scenario: {scenario_name}")
             
-            # Remove non-serializable fields (functions, callbacks)
-            # These cannot be sent over SSE
-            non_serializable_fields = ['event_callback', 'emit_event_fn']
-            for field in non_serializable_fields:
-                result.pop(field, None)
-            
-            # Add scenario metadata to result
-            result['scenario_metadata'] = scenario
-            result['scenario_id'] = scenario_id
-            result['scenario_name'] = scenario_name
-            result['scenario_gpu'] = gpu_id
-            
             # Run Engine B compute for this scenario
             logger.info(f"🔢 Running Engine B quantitative compute for: {scenario_name}")
             engine_b_results = await self.run_engine_b_for_scenario(
                 scenario=scenario,
                 extracted_facts=result.get('extracted_facts', [])
             )
+            
+            # Keep only this scenario's changes; shared sections are referenced,
+            # not copied. Non-serializable fields (functions, callbacks) are
+            # dropped by the diff - they cannot be sent over SSE.
+            result = base_state.materialize(base_state.diff(result))
+            
+            # Add scenario metadata to result
+            result['scenario_metadata'] = scenario
+            result['scenario_id'] = scenario_id
+            result['scenario_name'] = scenario_name
+            result['scenario_gpu'] = gpu_id
             result['engine_b_results'] = engine_b_results
             
             result['scenario_execution_time'] = (datetime.now() - start_time).total_seconds()
@@ -487,7 +510,7 @@ Evidence confidence: {synthesis.confidence_level.upper()}
     
     def _prepare_scenario_state(
         self,
-        base_state: Dict[str, Any],
+        base_state: Union[Dict[str, Any], ScenarioStateBase],
         scenario: Dict[str, Any],
         scenario_id: str,
         gpu_id: Optional[int]
@@ -496,23 +519,23 @@ Evidence confidence: {synthesis.confidence_level.upper()}
         Prepare state for scenario execution.
         
         Args:
-            base_state: Base state to clone
+            base_state: Shared base state (or a plain state dict to share)
             scenario: Scenario definition
             scenario_id: Unique scenario identifier
             gpu_id: GPU ID assigned to this scenario
             
         Returns:
-            Cloned state with scenario injected
+            Branched state with scenario injected
         """
-        # Deep copy state to ensure isolation
-        import copy
-        scenario_state = copy.deepcopy(base_state)
+        if not isinstance(base_state, ScenarioStateBase):
+            base_state = ScenarioStateBase(base_state)
         
-        # CRITICAL: Remove event emitters from scenario states
+        # Copy-on-write branch: heavy sections (facts, RAG context, data
+        # tables) are shared read-only; top-level containers are private.
+        # CRITICAL: Event emitters are excluded from scenario states.
         # Internal scenario events (debate, critique, etc.) should NOT bubble up 
         # to the main event stream - they would cause stage ordering confusion
-        scenario_state.pop('emit_event_fn', None)
-        scenario_state.pop('event_callback', None)
+        scenario_state = base_state.branch()
         
         # Inject scenario information
         scenario_state['scenario'] = scenario
@@ -730,6 +753,19 @@ Evidence confidence: {synthesis.confidence_level.upper()}
         logger.warning("   No base value found in facts, using default 100000")
         return 100000  # Default
     
+    async def _post_engine_b(
+        self,
+        transport: EngineBTransport,
+        path: str,
+        payload: Dict[str, Any]
+    ) -> Any:
+        """Call Engine B holding a slot of the shared concurrency budget."""
+        async with self._limiter.slot("engine_b") as lease:
+            resp = await transport.post(path, payload)
+            if resp.status_code in (429, 503):
+                lease.mark_overloaded()
+            return resp
+    
     async def run_engine_b_for_scenario(
         self,
         scenario: Dict[str, Any],
@@ -769,299 +805,299 @@ Evidence confidence: {synthesis.confidence_level.upper()}
             adjusted_facts = self.apply_assumptions_to_facts(extracted_facts, assumptions)
             engine_b_results["adjusted_facts_sample"] = dict(list(adjusted_facts.items())[:5])
             
-            async with httpx.AsyncClient(timeout=30.0) as client:
+            transport = get_engine_b_transport()
+            
+            # FIXED: Dynamic variable mapping - use ACTUAL extracted data!
+            # Map common fact patterns to formula variables
+            growth_rate = self._find_growth_rate(adjusted_facts)
+            base_value = self._find_base_value(adjusted_facts)
+            
+            logger.info(f"   Dynamic mapping: growth_rate={growth_rate}, base_value={base_value}")
+            
+            # 1. Monte Carlo Simulation
+            try:
+                # FIXED: Apply scenario assumptions to distribution parameters
+                # Different scenarios use different assumption keys - check all of them
+                # Positive multipliers (increase expected outcome)
+                growth_effect = assumptions.get("growth_multiplier", 1.0)
+                value_effect = assumptions.get("value_multiplier", 1.0)
                 
-                # FIXED: Dynamic variable mapping - use ACTUAL extracted data!
-                # Map common fact patterns to formula variables
-                growth_rate = self._find_growth_rate(adjusted_facts)
-                base_value = self._find_base_value(adjusted_facts)
+                # CRITICAL FIX: Convert string assumption values to numeric multipliers
+                def str_to_multiplier(value, positive_words=None, negative_words=None):
+                    """Convert string assumption values to numeric multipliers."""
+                    if isinstance(value, (int, float)):
+                        return float(value)
+                    if isinstance(value, str):
+                        val_lower = value.lower()
+                        # Positive modifiers (increase effect)
+                        if any(w in val_lower for w in (positive_words or ["high", "strong", "accelerat", "fast", "intense", "severe"])):
+                            return 1.5
+                        # Negative modifiers (decrease effect)
+                        if any(w in val_lower for w in (negative_words or ["low", "weak", "slow", "mild", "minimal"])):
+                            return 0.6
+                        # Neutral
+                        if any(w in val_lower for w in ["steady", "stable", "moderate", "normal", "base"]):
+                            return 1.0
+                    return 1.0  # Default neutral
                 
-                logger.info(f"   Dynamic mapping: growth_rate={growth_rate}, base_value={base_value}")
+                # Scenario-specific effects (convert to growth impact)
+                if "disruption_factor" in assumptions:
+                    # Disruption can boost or hurt - use as multiplier
+                    growth_effect *= str_to_multiplier(assumptions["disruption_factor"])
+                if "disruption_level" in assumptions:
+                    growth_effect *= str_to_multiplier(assumptions["disruption_level"])
+                if "competition_intensity" in assumptions:
+                    # Competition typically reduces success probability
+                    comp_val = str_to_multiplier(assumptions["competition_intensity"])
+                    growth_effect *= (2.0 - comp_val)  # e.g., 1.5 (intense) -> 0.5 multiplier
+                if "regional_competition" in assumptions:
+                    comp_val = str_to_multiplier(assumptions["regional_competition"])
+                    growth_effect *= (2.0 - comp_val)
+                if "shock_severity" in assumptions:
+                    # Shocks reduce expected outcomes
+                    value_effect *= str_to_multiplier(assumptions["shock_severity"], 
+                                                      negative_words=["severe", "high", "major"])  # severe shock = LOW multiplier
+                if "policy_intensity" in assumptions:
+                    # Higher policy intensity can accelerate growth
+                    growth_effect *= str_to_multiplier(assumptions["policy_intensity"])
+                if "policy_rate" in assumptions:
+                    growth_effect *= str_to_multiplier(assumptions["policy_rate"])
+                if "price_level" in assumptions:
+                    value_effect *= str_to_multiplier(assumptions["price_level"])
+                if "demand_level" in assumptions:
+                    growth_effect *= str_to_multiplier(assumptions["demand_level"])
+                if "transition_speed" in assumptions:
+                    growth_effect *= str_to_multiplier(assumptions["transition_speed"])
+                if "skills_mismatch" in assumptions:
+                    # Skills mismatch is negative - severe mismatch hurts growth
+                    mismatch = str_to_multiplier(assumptions["skills_mismatch"])
+                    growth_effect *= (2.0 - mismatch)  # severe (1.5) -> 0.5 multiplier
+                if "risk_factor" in assumptions:
+                    # Higher risk reduces expected value
+                    risk_val = str_to_multiplier(assumptions["risk_factor"])
+                    value_effect *= (1.0 / risk_val) if risk_val > 0 else 0.5
                 
-                # 1. Monte Carlo Simulation
-                try:
-                    # FIXED: Apply scenario assumptions to distribution parameters
-                    # Different scenarios use different assumption keys - check all of them
-                    # Positive multipliers (increase expected outcome)
-                    growth_effect = assumptions.get("growth_multiplier", 1.0)
-                    value_effect = assumptions.get("value_multiplier", 1.0)
-                    
-                    # CRITICAL FIX: Convert string assumption values to numeric multipliers
-                    def str_to_multiplier(value, positive_words=None, negative_words=None):
-                        """Convert string assumption values to numeric multipliers."""
-                        if isinstance(value, (int, float)):
-                            return float(value)
-                        if isinstance(value, str):
-                            val_lower = value.lower()
-                            # Positive modifiers (increase effect)
-                            if any(w in val_lower for w in (positive_words or ["high", "strong", "accelerat", "fast", "intense", "severe"])):
-                                return 1.5
-                            # Negative modifiers (decrease effect)
-                            if any(w in val_lower for w in (negative_words or ["low", "weak", "slow", "mild", "minimal"])):
-                                return 0.6
-                            # Neutral
-                            if any(w in val_lower for w in ["steady", "stable", "moderate", "normal", "base"]):
-                                return 1.0
-                        return 1.0  # Default neutral
-                    
-                    # Scenario-specific effects (convert to growth impact)
-                    if "disruption_factor" in assumptions:
-                        # Disruption can boost or hurt - use as multiplier
-                        growth_effect *= str_to_multiplier(assumptions["disruption_factor"])
-                    if "disruption_level" in assumptions:
-                        growth_effect *= str_to_multiplier(assumptions["disruption_level"])
-                    if "competition_intensity" in assumptions:
-                        # Competition typically reduces success probability
-                        comp_val = str_to_multiplier(assumptions["competition_intensity"])
-                        growth_effect *= (2.0 - comp_val)  # e.g., 1.5 (intense) -> 0.5 multiplier
-                    if "regional_competition" in assumptions:
-                        comp_val = str_to_multiplier(assumptions["regional_competition"])
-                        growth_effect *= (2.0 - comp_val)
-                    if "shock_severity" in assumptions:
-                        # Shocks reduce expected outcomes
-                        value_effect *= str_to_multiplier(assumptions["shock_severity"], 
-                                                          negative_words=["severe", "high", "major"])  # severe shock = LOW multiplier
-                    if "policy_intensity" in assumptions:
-                        # Higher policy intensity can accelerate growth
-                        growth_effect *= str_to_multiplier(assumptions["policy_intensity"])
-                    if "policy_rate" in assumptions:
-                        growth_effect *= str_to_multiplier(assumptions["policy_rate"])
-                    if "price_level" in assumptions:
-                        value_effect *= str_to_multiplier(assumptions["price_level"])
-                    if "demand_level" in assumptions:
-                        growth_effect *= str_to_multiplier(assumptions["demand_level"])
-                    if "transition_speed" in assumptions:
-                        growth_effect *= str_to_multiplier(assumptions["transition_speed"])
-                    if "skills_mismatch" in assumptions:
-                        # Skills mismatch is negative - severe mismatch hurts growth
-                        mismatch = str_to_multiplier(assumptions["skills_mismatch"])
-                        growth_effect *= (2.0 - mismatch)  # severe (1.5) -> 0.5 multiplier
-                    if "risk_factor" in assumptions:
-                        # Higher risk reduces expected value
-                        risk_val = str_to_multiplier(assumptions["risk_factor"])
-                        value_effect *= (1.0 / risk_val) if risk_val > 0 else 0.5
-                    
-                    # CRITICAL FIX: Apply type-based defaults if no specific assumptions matched
-                    # This ensures different scenario types produce different success rates
-                    scenario_type = scenario.get("type", "").lower()
-                    scenario_name_lower = scenario_name.lower()
-                    
-                    if growth_effect == 1.0 and value_effect == 1.0:
-                        # No assumptions were applied - use scenario type/name to differentiate
-                        if "optimistic" in scenario_type or "acceleration" in scenario_name_lower or "leadership" in scenario_name_lower:
-                            growth_effect, value_effect = 1.4, 1.2
-                            logger.info(f"   Type-based: OPTIMISTIC -> growth=1.4, value=1.2")
-                        elif "pessimistic" in scenario_type or "shock" in scenario_name_lower or "retrenchment" in scenario_name_lower:
-                            growth_effect, value_effect = 0.6, 0.7
-                            logger.info(f"   Type-based: PESSIMISTIC -> growth=0.6, value=0.7")
-                        elif "disruption" in scenario_type or "black swan" in scenario_name_lower or "automation" in scenario_name_lower:
-                            growth_effect, value_effect = 0.75, 0.8
-                            logger.info(f"   Type-based: DISRUPTION -> growth=0.75, value=0.8")
-                        elif "competition" in scenario_type or "competitive" in scenario_name_lower or "outpace" in scenario_name_lower:
-                            growth_effect, value_effect = 0.8, 0.85
-                            logger.info(f"   Type-based: COMPETITION -> growth=0.8, value=0.85")
-                        elif "pivot" in scenario_name_lower or "tourism" in scenario_name_lower:
-                            growth_effect, value_effect = 1.1, 1.05
-                            logger.info(f"   Type-based: PIVOT -> growth=1.1, value=1.05")
-                        elif "base" in scenario_type or "gradual" in scenario_name_lower:
-                            growth_effect, value_effect = 1.0, 1.0
-                            logger.info(f"   Type-based: BASE -> growth=1.0, value=1.0")
-                        else:
-                            # Unknown scenario type - apply slight variation based on hash
-                            hash_val = hash(scenario_name) % 5
-                            growth_effect = 0.8 + (hash_val * 0.1)  # 0.8 to 1.2
-                            value_effect = 0.85 + (hash_val * 0.08)  # 0.85 to 1.17
-                            logger.info(f"   Type-based: UNKNOWN (hash={hash_val}) -> growth={growth_effect:.2f}, value={value_effect:.2f}")
-                    
-                    # Apply effects to base values
-                    growth_mean = growth_rate * growth_effect
-                    value_mean = base_value * value_effect
-                    
-                    logger.info(f"   Scenario effects: growth_effect={growth_effect:.2f}, value_effect={value_effect:.2f}")
-                    
-                    # FIXED: success_condition must use 'result' not 'outcome'
-                    # The Monte Carlo service evaluates: eval("result > threshold", {"result": simulated_values})
-                    success_threshold = value_mean * 1.2  # 20% growth target
-                    
-                    mc_payload = {
-                        "variables": {
-                            "growth_rate": {
-                                "distribution": "normal", 
-                                "mean": growth_mean, 
-                                "std": abs(growth_mean) * 0.3  # 30% std deviation
-                            },
-                            "base_value": {
-                                "distribution": "normal", 
-                                "mean": value_mean, 
-                                "std": value_mean * 0.1
-                            },
-                        },
-                        "formula": "base_value * (1 + growth_rate) ** 5",
-                        "success_condition": f"result > {success_threshold}",  # FIXED: Use 'result' not 'outcome'
-                        "n_simulations": 10000
-                    }
-                    resp = await client.post(f"{ENGINE_B_URL}/compute/monte_carlo", json=mc_payload)
-                    if resp.status_code == 200:
-                        raw_mc = resp.json()
-                        # CRITICAL FIX: Include BOTH field names for frontend and backend compatibility
-                        # Engine B returns: success_rate, mean_result, std_result
-                        # Synthesis expects: success_probability
-                        # Frontend expects: success_rate
-                        mc_success = raw_mc.get("success_rate", 0)
-                        engine_b_results["monte_carlo"] = {
-                            "success_rate": mc_success,  # ADDED: Frontend needs this exact name
-                            "success_probability": mc_success,  # Backend/synthesis uses this
-                            "mean": raw_mc.get("mean_result", raw_mc.get("mean", 0)),
-                            "mean_result": raw_mc.get("mean_result", raw_mc.get("mean", 0)),  # Alias
-                            "std": raw_mc.get("std_result", raw_mc.get("std", 0)),
-                            "std_result": raw_mc.get("std_result", raw_mc.get("std", 0)),  # Alias
-                            "percentiles": raw_mc.get("percentiles", {}),
-                            "var_95": raw_mc.get("var_95", 0),
-                            "cvar_95": raw_mc.get("cvar_95", 0),
-                            "n_simulations": raw_mc.get("n_simulations", 10000),
-                            "gpu_used": raw_mc.get("gpu_used", False),
-                        }
-                        logger.info(f"  ✓ Monte Carlo complete for {scenario_name}: {mc_success:.1%} success")
+                # CRITICAL FIX: Apply type-based defaults if no specific assumptions matched
+                # This ensures different scenario types produce different success rates
+                scenario_type = scenario.get("type", "").lower()
+                scenario_name_lower = scenario_name.lower()
+                
+                if growth_effect == 1.0 and value_effect == 1.0:
+                    # No assumptions were applied - use scenario type/name to differentiate
+                    if "optimistic" in scenario_type or "acceleration" in scenario_name_lower or "leadership" in scenario_name_lower:
+                        growth_effect, value_effect = 1.4, 1.2
+                        logger.info(f"   Type-based: OPTIMISTIC -> growth=1.4, value=1.2")
+                    elif "pessimistic" in scenario_type or "shock" in scenario_name_lower or "retrenchment" in scenario_name_lower:
+                        growth_effect, value_effect = 0.6, 0.7
+                        logger.info(f"   Type-based: PESSIMISTIC -> growth=0.6, value=0.7")
+                    elif "disruption" in scenario_type or "black swan" in scenario_name_lower or "automation" in scenario_name_lower:
+                        growth_effect, value_effect = 0.75, 0.8
+                        logger.info(f"   Type-based: DISRUPTION -> growth=0.75, value=0.8")
+                    elif "competition" in scenario_type or "competitive" in scenario_name_lower or "outpace" in scenario_name_lower:
+                        growth_effect, value_effect = 0.8, 0.85
+                        logger.info(f"   Type-based: COMPETITION -> growth=0.8, value=0.85")
+                    elif "pivot" in scenario_name_lower or "tourism" in scenario_name_lower:
+                        growth_effect, value_effect = 1.1, 1.05
+                        logger.info(f"   Type-based: PIVOT -> growth=1.1, value=1.05")
+                    elif "base" in scenario_type or "gradual" in scenario_name_lower:
+                        growth_effect, value_effect = 1.0, 1.0
+                        logger.info(f"   Type-based: BASE -> growth=1.0, value=1.0")
                     else:
-                        logger.warning(f"  Monte Carlo returned {resp.status_code}: {resp.text[:200]}")
-                except Exception as e:
-                    logger.warning(f"  Monte Carlo failed for {scenario_name}: {e}")
+                        # Unknown scenario type - apply slight variation based on hash
+                        hash_val = hash(scenario_name) % 5
+                        growth_effect = 0.8 + (hash_val * 0.1)  # 0.8 to 1.2
+                        value_effect = 0.85 + (hash_val * 0.08)  # 0.85 to 1.17
+                        logger.info(f"   Type-based: UNKNOWN (hash={hash_val}) -> growth={growth_effect:.2f}, value={value_effect:.2f}")
                 
-                # 2. Sensitivity Analysis
-                try:
-                    # FIXED: Use meaningful policy driver names (domain agnostic)
-                    # Extract relevant policy drivers from scenario assumptions
-                    policy_intensity = assumptions.get("policy_intensity", assumptions.get("growth_multiplier", 1.0))
-                    implementation_efficiency = assumptions.get("implementation_efficiency", 0.85)
-                    success_factor = adjusted_facts.get("success_factor", adjusted_facts.get("retention_rate", 0.80))
-                    
-                    # CRITICAL: Variable names in base_values MUST match the formula!
-                    sens_base = {
-                        "annual_growth_rate": growth_rate,
-                        "initial_capital": base_value,
-                        "policy_effectiveness": policy_intensity,
-                        "implementation_success": success_factor,
-                        "resource_efficiency": implementation_efficiency,
-                    }
-                    
-                    # FIXED: Formula must use EXACTLY the same variable names as base_values
-                    sens_payload = {
-                        "base_values": sens_base,
-                        "formula": "initial_capital * (1 + annual_growth_rate) ** 5 * policy_effectiveness * resource_efficiency",
-                        "ranges": {
-                            "annual_growth_rate": {"low": growth_rate * 0.5, "high": growth_rate * 1.5},
-                            "initial_capital": {"low": base_value * 0.8, "high": base_value * 1.2},
-                            "policy_effectiveness": {"low": policy_intensity * 0.7, "high": policy_intensity * 1.3},
-                            "resource_efficiency": {"low": implementation_efficiency * 0.8, "high": implementation_efficiency * 1.2},
+                # Apply effects to base values
+                growth_mean = growth_rate * growth_effect
+                value_mean = base_value * value_effect
+                
+                logger.info(f"   Scenario effects: growth_effect={growth_effect:.2f}, value_effect={value_effect:.2f}")
+                
+                # FIXED: success_condition must use 'result' not 'outcome'
+                # The Monte Carlo service evaluates: eval("result > threshold", {"result": simulated_values})
+                success_threshold = value_mean * 1.2  # 20% growth target
+                
+                mc_payload = {
+                    "variables": {
+                        "growth_rate": {
+                            "distribution": "normal", 
+                            "mean": growth_mean, 
+                            "std": abs(growth_mean) * 0.3  # 30% std deviation
                         },
-                        "n_steps": 10
+                        "base_value": {
+                            "distribution": "normal", 
+                            "mean": value_mean, 
+                            "std": value_mean * 0.1
+                        },
+                    },
+                    "formula": "base_value * (1 + growth_rate) ** 5",
+                    "success_condition": f"result > {success_threshold}",  # FIXED: Use 'result' not 'outcome'
+                    "n_simulations": 10000
+                }
+                resp = await self._post_engine_b(transport, "/compute/monte_carlo", mc_payload)
+                if resp.status_code == 200:
+                    raw_mc = resp.json()
+                    # CRITICAL FIX: Include BOTH field names for frontend and backend compatibility
+                    # Engine B returns: success_rate, mean_result, std_result
+                    # Synthesis expects: success_probability
+                    # Frontend expects: success_rate
+                    mc_success = raw_mc.get("success_rate", 0)
+                    engine_b_results["monte_carlo"] = {
+                        "success_rate": mc_success,  # ADDED: Frontend needs this exact name
+                        "success_probability": mc_success,  # Backend/synthesis uses this
+                        "mean": raw_mc.get("mean_result", raw_mc.get("mean", 0)),
+                        "mean_result": raw_mc.get("mean_result", raw_mc.get("mean", 0)),  # Alias
+                        "std": raw_mc.get("std_result", raw_mc.get("std", 0)),
+                        "std_result": raw_mc.get("std_result", raw_mc.get("std", 0)),  # Alias
+                        "percentiles": raw_mc.get("percentiles", {}),
+                        "var_95": raw_mc.get("var_95", 0),
+                        "cvar_95": raw_mc.get("cvar_95", 0),
+                        "n_simulations": raw_mc.get("n_simulations", 10000),
+                        "gpu_used": raw_mc.get("gpu_used", False),
                     }
-                    resp = await client.post(f"{ENGINE_B_URL}/compute/sensitivity", json=sens_payload)
-                    if resp.status_code == 200:
-                        raw_sens = resp.json()
-                        # Transform Engine B format to frontend format
-                        # Frontend expects: [{driver, label, contribution, direction}]
-                        
-                        # Domain-agnostic mapping: technical variable -> policy driver name
-                        DRIVER_LABELS = {
-                            "annual_growth_rate": "Economic Growth Rate",
-                            "initial_capital": "Initial Investment",
-                            "policy_effectiveness": "Policy Implementation Strength",
-                            "implementation_success": "Implementation Success Rate",
-                            "resource_efficiency": "Resource Utilization Efficiency",
-                            "growth_rate": "Annual Growth Rate",
-                            "base_value": "Base Economic Value",
-                        }
-                        
-                        transformed_sensitivity = []
-                        if raw_sens.get("parameter_impacts"):
-                            total_swing = sum(p.get("swing", 0) for p in raw_sens["parameter_impacts"])
-                            for param in raw_sens["parameter_impacts"]:
-                                contribution = param.get("swing", 0) / total_swing if total_swing > 0 else 0
-                                var_name = param.get("name", "")
-                                # Use human-readable label from mapping, or create one
-                                label = DRIVER_LABELS.get(var_name, var_name.replace("_", " ").title())
-                                transformed_sensitivity.append({
-                                    "driver": var_name,
-                                    "label": label,
-                                    "contribution": contribution,
-                                    "direction": param.get("direction", "positive")
-                                })
-                        engine_b_results["sensitivity"] = transformed_sensitivity
-                        logger.info(f"  ✓ Sensitivity analysis complete for {scenario_name} ({len(transformed_sensitivity)} drivers)")
-                    else:
-                        logger.warning(f"  Sensitivity returned {resp.status_code}: {resp.text[:200]}")
-                except Exception as e:
-                    logger.warning(f"  Sensitivity failed for {scenario_name}: {e}")
+                    logger.info(f"  ✓ Monte Carlo complete for {scenario_name}: {mc_success:.1%} success")
+                else:
+                    logger.warning(f"  Monte Carlo returned {resp.status_code}: {resp.text[:200]}")
+            except Exception as e:
+                logger.warning(f"  Monte Carlo failed for {scenario_name}: {e}")
+            
+            # 2. Sensitivity Analysis
+            try:
+                # FIXED: Use meaningful policy driver names (domain agnostic)
+                # Extract relevant policy drivers from scenario assumptions
+                policy_intensity = assumptions.get("policy_intensity", assumptions.get("growth_multiplier", 1.0))
+                implementation_efficiency = assumptions.get("implementation_efficiency", 0.85)
+                success_factor = adjusted_facts.get("success_factor", adjusted_facts.get("retention_rate", 0.80))
                 
-                # 3. Forecasting
-                try:
-                    # Build historical series from facts if available
-                    historical = []
-                    for key in ["2019", "2020", "2021", "2022", "2023"]:
-                        if key in adjusted_facts:
-                            historical.append(adjusted_facts[key])
-                    
-                    if len(historical) < 5:
-                        # Generate synthetic historical based on base value and growth
-                        historical = [
-                            base_value * (1 + growth_rate) ** (i - 5)
-                            for i in range(5)
-                        ]
-                    
-                    # Apply scenario assumption to forecast
-                    forecast_growth = growth_rate * assumptions.get("growth_multiplier", 1.0)
-                    
-                    forecast_payload = {
-                        "historical_values": historical,
-                        "forecast_horizon": 7,
-                        "method": "auto",
-                        "confidence_level": 0.95
-                    }
-                    resp = await client.post(f"{ENGINE_B_URL}/compute/forecast", json=forecast_payload)
-                    if resp.status_code == 200:
-                        engine_b_results["forecasting"] = resp.json()
-                        logger.info(f"  ✓ Forecasting complete for {scenario_name}")
-                    else:
-                        logger.warning(f"  Forecasting returned {resp.status_code}: {resp.text[:200]}")
-                except Exception as e:
-                    logger.warning(f"  Forecasting failed for {scenario_name}: {e}")
+                # CRITICAL: Variable names in base_values MUST match the formula!
+                sens_base = {
+                    "annual_growth_rate": growth_rate,
+                    "initial_capital": base_value,
+                    "policy_effectiveness": policy_intensity,
+                    "implementation_success": success_factor,
+                    "resource_efficiency": implementation_efficiency,
+                }
                 
-                # 4. Threshold Analysis
-                try:
-                    # Apply scenario to threshold parameters
-                    target_value = adjusted_facts.get("target", base_value * 1.5)
+                # FIXED: Formula must use EXACTLY the same variable names as base_values
+                sens_payload = {
+                    "base_values": sens_base,
+                    "formula": "initial_capital * (1 + annual_growth_rate) ** 5 * policy_effectiveness * resource_efficiency",
+                    "ranges": {
+                        "annual_growth_rate": {"low": growth_rate * 0.5, "high": growth_rate * 1.5},
+                        "initial_capital": {"low": base_value * 0.8, "high": base_value * 1.2},
+                        "policy_effectiveness": {"low": policy_intensity * 0.7, "high": policy_intensity * 1.3},
+                        "resource_efficiency": {"low": implementation_efficiency * 0.8, "high": implementation_efficiency * 1.2},
+                    },
+                    "n_steps": 10
+                }
+                resp = await self._post_engine_b(transport, "/compute/sensitivity", sens_payload)
+                if resp.status_code == 200:
+                    raw_sens = resp.json()
+                    # Transform Engine B format to frontend format
+                    # Frontend expects: [{driver, label, contribution, direction}]
                     
-                    threshold_payload = {
-                        "sweep_variable": "target_rate",
-                        "sweep_range": [0.05, 0.30],  # 5% to 30%
-                        "fixed_variables": {
-                            "available_supply": base_value * assumptions.get("supply_multiplier", 1.0),
-                            "total_demand": adjusted_facts.get("total_jobs", 1850000)
-                        },
-                        "constraints": [
-                            {
-                                "expression": "available_supply < total_demand * target_rate",
-                                "threshold_type": "boundary",
-                                "target": 0.0,
-                                "description": "supply_constraint",
-                                "severity": "warning"
-                            }
-                        ],
-                        "resolution": 100
+                    # Domain-agnostic mapping: technical variable -> policy driver name
+                    DRIVER_LABELS = {
+                        "annual_growth_rate": "Economic Growth Rate",
+                        "initial_capital": "Initial Investment",
+                        "policy_effectiveness": "Policy Implementation Strength",
+                        "implementation_success": "Implementation Success Rate",
+                        "resource_efficiency": "Resource Utilization Efficiency",
+                        "growth_rate": "Annual Growth Rate",
+                        "base_value": "Base Economic Value",
                     }
-                    resp = await client.post(f"{ENGINE_B_URL}/compute/thresholds", json=threshold_payload)
-                    if resp.status_code == 200:
-                        engine_b_results["thresholds"] = resp.json()
-                        logger.info(f"  ✓ Threshold analysis complete for {scenario_name}")
-                    else:
-                        logger.warning(f"  Thresholds returned {resp.status_code}: {resp.text[:200]}")
-                except Exception as e:
-                    logger.warning(f"  Thresholds failed for {scenario_name}: {e}")
+                    
+                    transformed_sensitivity = []
+                    if raw_sens.get("parameter_impacts"):
+                        total_swing = sum(p.get("swing", 0) for p in raw_sens["parameter_impacts"])
+                        for param in raw_sens["parameter_impacts"]:
+                            contribution = param.get("swing", 0) / total_swing if total_swing > 0 else 0
+                            var_name = param.get("name", "")
+                            # Use human-readable label from mapping, or create one
+                            label = DRIVER_LABELS.get(var_name, var_name.replace("_", " ").title())
+                            transformed_sensitivity.append({
+                                "driver": var_name,
+                                "label": label,
+                                "contribution": contribution,
+                                "direction": param.get("direction", "positive")
+                            })
+                    engine_b_results["sensitivity"] = transformed_sensitivity
+                    logger.info(f"  ✓ Sensitivity analysis complete for {scenario_name} ({len(transformed_sensitivity)} drivers)")
+                else:
+                    logger.warning(f"  Sensitivity returned {resp.status_code}: {resp.text[:200]}")
+            except Exception as e:
+                logger.warning(f"  Sensitivity failed for {scenario_name}: {e}")
+            
+            # 3. Forecasting
+            try:
+                # Build historical series from facts if available
+                historical = []
+                for key in ["2019", "2020", "2021", "2022", "2023"]:
+                    if key in adjusted_facts:
+                        historical.append(adjusted_facts[key])
+                
+                if len(historical) < 5:
+                    # Generate synthetic historical based on base value and growth
+                    historical = [
+                        base_value * (1 + growth_rate) ** (i - 5)
+                        for i in range(5)
+                    ]
                 
-                engine_b_results["status"] = "complete"
-                logger.info(f"✅ Engine B compute complete for scenario: {scenario_name}")
+                # Apply scenario assumption to forecast
+                forecast_growth = growth_rate * assumptions.get("growth_multiplier", 1.0)
                 
+                forecast_payload = {
+                    "historical_values": historical,
+                    "forecast_horizon": 7,
+                    "method": "auto",
+                    "confidence_level": 0.95
+                }
+                resp = await self._post_engine_b(transport, "/compute/forecast", forecast_payload)
+                if resp.status_code == 200:
+                    engine_b_results["forecasting"] = resp.json()
+                    logger.info(f"  ✓ Forecasting complete for {scenario_name}")
+                else:
+                    logger.warning(f"  Forecasting returned {resp.status_code}: {resp.text[:200]}")
+            except Exception as e:
+                logger.warning(f"  Forecasting failed for {scenario_name}: {e}")
+            
+            # 4. Threshold Analysis
+            try:
+                # Apply scenario to threshold parameters
+                target_value = adjusted_facts.get("target", base_value * 1.5)
+                
+                threshold_payload = {
+                    "sweep_variable": "target_rate",
+                    "sweep_range": [0.05, 0.30],  # 5% to 30%
+                    "fixed_variables": {
+                        "available_supply": base_value * assumptions.get("supply_multiplier", 1.0),
+                        "total_demand": adjusted_facts.get("total_jobs", 1850000)
+                    },
+                    "constraints": [
+                        {
+                            "expression": "available_supply < total_demand * target_rate",
+                            "threshold_type": "boundary",
+                            "target": 0.0,
+                            "description": "supply_constraint",
+                            "severity": "warning"
+                        }
+                    ],
+                    "resolution": 100
+                }
+                resp = await self._post_engine_b(transport, "/compute/thresholds", threshold_payload)
+                if resp.status_code == 200:
+                    engine_b_results["thresholds"] = resp.json()
+                    logger.info(f"  ✓ Threshold analysis complete for {scenario_name}")
+                else:
+                    logger.warning(f"  Thresholds returned {resp.status_code}: {resp.text[:200]}")
+            except Exception as e:
+                logger.warning(f"  Thresholds failed for {scenario_name}: {e}")
+            
+            engine_b_results["status"] = "complete"
+            logger.info(f"✅ Engine B compute complete for scenario: {scenario_name}")
+            
         except Exception as e:
             logger.error(f"❌ Engine B failed for {scenario_name}: {e}")
             engine_b_results["status"] = "failed"
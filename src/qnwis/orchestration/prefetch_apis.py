@@ -5,7 +5,7 @@ Integrates: MoL LMIS, GCC-STAT, World Bank, Semantic Scholar, Brave, Perplexity
 import asyncio
 import os
 import functools
-from typing import Any, Awaitable, Callable, Dict, Iterable, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from datetime import datetime
 import aiohttp
@@ -16,6 +16,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from .data_quality import calculate_data_quality, identify_missing_data
+from .fact_store import fetch_world_bank_series, get_fact_store, group_by_series
+from .prefetch_persistence import PrefetchFactWriter
+from .prefetch_scheduler import LateFactsCallback, PrefetchRun, PrefetchScheduler
 
 import json
 import logging
@@ -348,6 +351,18 @@ class QatarOpenDataAPI(QatarOpenDataScraperV2):
 
 
 
+# LMIS endpoints fetched by _fetch_lmis_comprehensive:
+# (metric, connector method, leading args, source_priority, confidence, label)
+LMIS_ENDPOINTS = (
+    ("qatar_main_indicator", "get_qatar_main_indicators", (), 99, 0.98, "Main indicators"),
+    ("sector_growth_nds3", "get_sector_growth", ("NDS3",), 98, 0.95, "Sector growth (NDS3)"),
+    ("top_skills_sector", "get_top_skills_by_sector", ("NDS3",), 97, 0.93, "Top skills"),
+    ("emerging_decaying_skills", "get_emerging_decaying_skills", (), 96, 0.92, "Emerging skills"),
+    ("expat_dominated_occupations", "get_expat_dominated_occupations", (), 95, 0.94, "Expat occupations"),
+    ("best_paid_occupations", "get_best_paid_occupations", (), 94, 0.93, "Best paid occupations"),
+)
+
+
 class CompletePrefetchLayer:
     """Prefetch data from ALL available sources for agent analysis."""
     
@@ -508,12 +523,43 @@ class CompletePrefetchLayer:
         # Add PostgreSQL writer for caching
         from ..data.deterministic.engine import get_engine
         self.pg_engine = get_engine()
+        # Bulk, write-behind persistence so prefetch never waits on inserts
+        self.fact_writer = PrefetchFactWriter(self.pg_engine)
+        # Freshness-aware fact store shared with the extraction orchestrators
+        self.fact_store = get_fact_store()
         _safe_print(f"🔑 PostgreSQL: {'✅'}")
+        
+        # Tiered scheduler: learned per-source budgets and circuit breakers
+        # persist across queries on this (singleton) layer
+        self.scheduler = PrefetchScheduler()
     
-    async def fetch_all_sources(self, query: str) -> List[Dict[str, Any]]:
+    async def fetch_all_sources(
+        self,
+        query: str,
+        on_late_facts: Optional[LateFactsCallback] = None,
+    ) -> List[Dict[str, Any]]:
         """
         Fetch from ALL sources in parallel based on query keywords.
         Returns comprehensive fact list for agent analysis.
+        
+        See fetch_all_sources_run for early-return semantics.
+        """
+        run = await self.fetch_all_sources_run(query, on_late_facts=on_late_facts)
+        return run.facts
+    
+    async def fetch_all_sources_run(
+        self,
+        query: str,
+        on_late_facts: Optional[LateFactsCallback] = None,
+    ) -> PrefetchRun:
+        """
+        Fetch from ALL sources and return the scheduler run.
+        
+        Sources run under PrefetchScheduler latency budgets and circuit
+        breakers. When ``on_late_facts`` is given, this returns as soon as
+        tier-1 sources and the coverage threshold are satisfied; slower
+        sources keep running and deliver their facts through the callback.
+        Without it, every scheduled source is awaited.
         """
         import logging
         logger = logging.getLogger(__name__)
@@ -522,16 +568,13 @@ class CompletePrefetchLayer:
         logger.warning(f"FETCH_ALL_SOURCES QUERY LENGTH: {len(query)}")
         logger.warning(f"FETCH_ALL_SOURCES QUERY FIRST 200 CHARS: {repr(query[:200])}")
         
-        facts: List[Dict[str, Any]] = []
         query_lower = query.lower()
-        tasks: List[Callable[[], Awaitable[List[Dict[str, Any]]]]] = []
-        added_methods: set[str] = set()
+        tasks: Dict[str, Callable[[], Awaitable[List[Dict[str, Any]]]]] = {}
 
         def add_task(factory: Callable[[], Awaitable[List[Dict[str, Any]]]], name: str) -> None:
             """Add coroutine factory if not already scheduled."""
-            if name not in added_methods:
-                tasks.append(factory)
-                added_methods.add(name)
+            if name not in tasks:
+                tasks[name] = factory
                 logger.info(f"📌 Added task: {name}")
 
         # ========================================================================
@@ -898,19 +941,32 @@ class CompletePrefetchLayer:
         if self.perplexity_api_key:
             add_task(lambda: self._fetch_perplexity_smart(query), "perplexity_smart")
 
-        if tasks:
-            _safe_print(f"\n🚀 Executing {len(tasks)} unique parallel API calls...")
-            coros = [factory() for factory in tasks]
-            results = await asyncio.gather(*coros, return_exceptions=True)
-
-            for result in results:
-                if isinstance(result, list) and not isinstance(result, Exception):
-                    facts.extend(result)
-                elif isinstance(result, Exception):
-                    _safe_print(f"⚠️  Task failed with exception: {result}")
+        _safe_print(f"\n🚀 Executing {len(tasks)} unique parallel API calls...")
+        run = await self.scheduler.run(
+            tasks,
+            on_late_facts=on_late_facts,
+            early_return=on_late_facts is not None,
+        )
+
+        for outcome in run.outcomes.values():
+            if outcome.status in ("error", "timeout", "skipped"):
+                _safe_print(
+                    f"⚠️  Task {outcome.name} {outcome.status}"
+                    + (f": {outcome.error}" if outcome.error else "")
+                )
+        if run.pending:
+            _safe_print(
+                f"⏩ Returning early after {run.time_to_coverage_ms:.0f}ms; "
+                f"{len(run.pending)} sources continue in background: {', '.join(run.pending)}"
+            )
 
-        _safe_print(f"\n📊 Total facts extracted: {len(facts)}")
-        return facts
+        for source, stats in self.fact_store.get_stats().items():
+            _safe_print(
+                f"♻️  Fact store {source}: hit ratio {stats['hit_ratio']:.0%}, "
+                f"{stats['api_calls_avoided']} API calls avoided"
+            )
+        _safe_print(f"\n📊 Total facts extracted: {len(run.facts)}")
+        return run
     
     # ================== MoL LMIS (REAL DATA FROM POSTGRESQL) ==================
     
@@ -923,6 +979,12 @@ class CompletePrefetchLayer:
         """
         _safe_print("📊 MoL Data: Fetching verified data from PostgreSQL...")
         
+        # Synchronous SQLAlchemy work runs off the event loop so parallel
+        # sources keep making progress
+        return await asyncio.to_thread(self._query_mol_facts)
+    
+    def _query_mol_facts(self) -> List[Dict[str, Any]]:
+        """Blocking PostgreSQL reads backing _fetch_mol_data."""
         facts = []
         try:
             from sqlalchemy import text
@@ -2470,12 +2532,17 @@ class CompletePrefetchLayer:
         
         return []
     
+    async def _query_postgres_cache_async(self, source: str, country: str = "QAT") -> List[Dict]:
+        """Run _query_postgres_cache in a worker thread so it never blocks the event loop."""
+        return await asyncio.to_thread(self._query_postgres_cache, source, country)
+    
     async def _fetch_world_bank_dashboard(self) -> List[Dict[str, Any]]:
         """
-        Fetch Qatar dashboard from World Bank - CACHE-FIRST STRATEGY
+        Fetch Qatar dashboard from World Bank - FACT-STORE-FIRST STRATEGY
         
-        PERFORMANCE: Queries PostgreSQL cache first (128 records in <100ms)
-        Only calls API if cache is empty or stale
+        PERFORMANCE: Fresh indicators are reused from the fact store; only
+        missing or stale indicators are fetched from the API (concurrently).
+        Falls back to the legacy PostgreSQL cache if the API yields nothing.
         
         This is the MOST CRITICAL API addition:
         - Sector GDP breakdown (tourism %, manufacturing %, services %)
@@ -2488,66 +2555,92 @@ class CompletePrefetchLayer:
             return []
         
         try:
-            # CACHE-FIRST: Try PostgreSQL cache before API
-            cached_facts = self._query_postgres_cache("world_bank", "QAT")
-            
-            if cached_facts and len(cached_facts) >= 100:  # Have sufficient cached data (128 rows)
-                # VALIDATION: Check if cached data looks realistic for Qatar
-                # Qatar's unemployment rate should be < 5% (it's actually ~0.1%)
-                suspicious_values = [f for f in cached_facts if 'UEM' in str(f.get('metric', '')) and f.get('value', 0) > 5]
-                if suspicious_values:
-                    _safe_print(f"⚠️ World Bank: Cache has {len(suspicious_values)} suspicious unemployment values > 5% - REFRESHING from API")
-                    # Don't use cache - fall through to API fetch
-                else:
-                    _safe_print(f"✅ World Bank: Using {len(cached_facts)} cached indicators from PostgreSQL (<100ms)")
-                    return cached_facts
+            descriptions = self.world_bank_connector.CRITICAL_INDICATORS
             
-            # Cache miss or insufficient data - fetch from API
-            _safe_print("📡 World Bank: Cache miss, fetching from API (this takes ~2 minutes)...")
+            def latest_by_indicator(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+                latest: Dict[str, Dict[str, Any]] = {}
+                for record in records:
+                    if record.get("value") is None:
+                        continue
+                    current = latest.get(record["indicator_code"])
+                    if current is None or int(record["year"]) > int(current["year"]):
+                        latest[record["indicator_code"]] = record
+                return latest
             
-            # Get sector GDP breakdown first (CRITICAL gap fix)
-            sector_gdp = await self.world_bank_connector.get_sector_gdp_breakdown("QAT")
+            records = await fetch_world_bank_series(
+                self.world_bank_connector, list(descriptions), ["QAT"], store=self.fact_store
+            )
+            latest = latest_by_indicator(records)
             
-            facts = []
+            # VALIDATION: Qatar's unemployment rate should be < 5% (it's actually ~0.1%).
+            # Stored values above that are treated as corrupt and refetched from the API.
+            suspicious = [
+                code for code, record in latest.items()
+                if "UEM" in code and record.get("cached") and record["value"] > 5
+            ]
+            if suspicious:
+                _safe_print(f"⚠️ World Bank: Store has {len(suspicious)} suspicious unemployment values > 5% - REFRESHING from API")
+                records = await fetch_world_bank_series(
+                    self.world_bank_connector, list(descriptions), ["QAT"],
+                    store=self.fact_store, refresh=suspicious,
+                )
+                latest = latest_by_indicator(records)
             
-            # Add sector GDP data
-            if "sector_breakdown" in sector_gdp:
-                for sector_name, data in sector_gdp["sector_breakdown"].items():
-                    if "percentage_of_gdp" in data:
-                        facts.append({
-                            "metric": f"{sector_name.lower()}_gdp_percentage",
-                            "value": data["percentage_of_gdp"],
-                            "sector": sector_name,
-                            "source": "World Bank Indicators API",
-                            "source_priority": 98,
-                            "confidence": 0.99,
-                            "raw_text": f"{sector_name} sector: {data['percentage_of_gdp']}% of GDP",
-                            "timestamp": datetime.now().isoformat(),
-                            "note": "FILLS CRITICAL GAP - sector GDP previously unavailable"
-                        })
+            if not latest:
+                cached_facts = await self._query_postgres_cache_async("world_bank", "QAT")
+                if cached_facts:
+                    _safe_print(f"✅ World Bank: API unavailable, using {len(cached_facts)} cached indicators from PostgreSQL")
+                return cached_facts
+            
+            reused = sum(1 for record in latest.values() if record.get("cached"))
+            _safe_print(
+                f"✅ World Bank: {reused} indicators reused from fact store, "
+                f"{len(latest) - reused} fetched from API"
+            )
             
-            # Get full dashboard for other indicators
-            dashboard = await self.world_bank_connector.get_qatar_dashboard()
+            facts = []
             
-            for indicator_code, data in dashboard.items():
-                if "error" not in data and data.get("latest_value") is not None:
+            # Sector GDP breakdown (CRITICAL gap fix) derived from the sector indicators
+            sectors = {
+                "NV.IND.TOTL.ZS": "Industry",
+                "NV.SRV.TOTL.ZS": "Services",
+                "NV.AGR.TOTL.ZS": "Agriculture",
+            }
+            for code, sector_name in sectors.items():
+                record = latest.get(code)
+                if record is not None:
                     facts.append({
-                        "metric": indicator_code,
-                        "value": data["latest_value"],
-                        "year": data.get("latest_year"),
-                        "description": data.get("description", indicator_code),
+                        "metric": f"{sector_name.lower()}_gdp_percentage",
+                        "value": record["value"],
+                        "sector": sector_name,
                         "source": "World Bank Indicators API",
                         "source_priority": 98,
-                        "country": "Qatar",
                         "confidence": 0.99,
-                        "raw_text": f"{data.get('description', indicator_code)}: {data['latest_value']} ({data.get('latest_year', 'N/A')})",
-                        "timestamp": datetime.now().isoformat()
+                        "raw_text": f"{sector_name} sector: {record['value']}% of GDP",
+                        "timestamp": datetime.now().isoformat(),
+                        "note": "FILLS CRITICAL GAP - sector GDP previously unavailable"
                     })
             
+            for indicator_code, record in latest.items():
+                description = descriptions.get(indicator_code, indicator_code)
+                facts.append({
+                    "metric": indicator_code,
+                    "value": record["value"],
+                    "year": record["year"],
+                    "description": description,
+                    "source": "World Bank Indicators API",
+                    "source_priority": 98,
+                    "country": "Qatar",
+                    "confidence": 0.99,
+                    "cached": bool(record.get("cached")),
+                    "raw_text": f"{description}: {record['value']} ({record['year']})",
+                    "timestamp": datetime.now().isoformat()
+                })
+            
             _safe_print(f"   Retrieved {len(facts)} World Bank indicators (including SECTOR GDP)")
             
-            # Write to PostgreSQL for caching
-            self._write_facts_to_postgres(facts, "world_bank")
+            # Write newly fetched facts to PostgreSQL (write-behind, does not block return)
+            self.fact_writer.enqueue([f for f in facts if not f.get("cached")], "world_bank")
             
             return facts
             
@@ -2565,7 +2658,7 @@ class CompletePrefetchLayer:
         
         try:
             # Query PostgreSQL cache for specific indicators
-            cached_facts = self._query_postgres_cache("world_bank", country)
+            cached_facts = await self._query_postgres_cache_async("world_bank", country)
             
             if not cached_facts:
                 return []
@@ -2633,11 +2726,16 @@ class CompletePrefetchLayer:
         
         try:
             # Check cache first (we already have 6 GCC countries!)
-            cached_facts = self._query_postgres_cache("ilo", country)
+            cached_facts = await self._query_postgres_cache_async("ilo", country)
             if cached_facts and len(cached_facts) >= 1:
                 _safe_print(f"✅ ILO: Using {len(cached_facts)} cached indicators from PostgreSQL (<100ms)")
                 return cached_facts
             
+            lookup = await self.fact_store.lookup_async("ilo", ["employment_total"], [country])
+            if not lookup.missing:
+                _safe_print(f"✅ ILO: Using {len(lookup.facts)} indicators from fact store")
+                return lookup.facts
+            
             _safe_print("📡 ILO: Fetching international labor benchmarks...")
             
             # Fetch employment stats
@@ -2659,6 +2757,10 @@ class CompletePrefetchLayer:
                 })
             
             _safe_print(f"   Retrieved {len(facts)} ILO indicators")
+            series = group_by_series(facts, country=country)
+            if not employment:
+                series[("employment_total", country)] = []  # negative entry: no data upstream
+            await self.fact_store.put_series_async("ilo", series)
             return facts
             
         except Exception as e:
@@ -2685,115 +2787,43 @@ class CompletePrefetchLayer:
         
         try:
             _safe_print("🏛️ LMIS: Fetching official Qatar labor market data...")
-            facts = []
-            
-            # 1. Main indicators (critical for any labor query)
-            try:
-                df = self.lmis_connector.get_qatar_main_indicators(lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "qatar_main_indicator",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 99,
-                            "confidence": 0.98,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Main indicators: {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Main indicators error: {e}")
-            
-            # 2. Sector growth (NDS3 strategic clusters)
-            try:
-                df = self.lmis_connector.get_sector_growth("NDS3", lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "sector_growth_nds3",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 98,
-                            "confidence": 0.95,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Sector growth (NDS3): {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Sector growth error: {e}")
-            
-            # 3. Top skills by sector
-            try:
-                df = self.lmis_connector.get_top_skills_by_sector("NDS3", lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "top_skills_sector",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 97,
-                            "confidence": 0.93,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Top skills: {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Top skills error: {e}")
-            
-            # 4. Emerging and decaying skills
-            try:
-                df = self.lmis_connector.get_emerging_decaying_skills(lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "emerging_decaying_skills",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 96,
-                            "confidence": 0.92,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Emerging skills: {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Emerging skills error: {e}")
             
-            # 5. Expat dominated occupations
-            try:
-                df = self.lmis_connector.get_expat_dominated_occupations(lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "expat_dominated_occupations",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 95,
-                            "confidence": 0.94,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Expat occupations: {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Expat occupations error: {e}")
+            # One store series per endpoint and language; only stale/missing
+            # endpoints are called
+            series_ids = {f"{endpoint[0]}:{lang}": endpoint for endpoint in LMIS_ENDPOINTS}
+            lookup = await self.fact_store.lookup_async("lmis", list(series_ids), ["QAT"])
+            facts = list(lookup.facts)
+            if lookup.hits:
+                _safe_print(f"   ♻️ Reused {len(lookup.hits)} LMIS endpoints from fact store ({len(facts)} records)")
+            
+            fetched: Dict[tuple, List[Dict[str, Any]]] = {}
+            for series_id in lookup.missing_indicators("QAT"):
+                metric, method_name, args, priority, confidence, label = series_ids[series_id]
+                try:
+                    df = await asyncio.to_thread(getattr(self.lmis_connector, method_name), *args, lang)
+                    if df is not None and not df.empty:
+                        records = [
+                            {
+                                "metric": metric,
+                                "data": row.to_dict(),
+                                "source": "LMIS (Ministry of Labour Qatar)",
+                                "source_type": "official_government",
+                                "source_priority": priority,
+                                "confidence": confidence,
+                                "cached": False
+                            }
+                            for _, row in df.iterrows()
+                        ]
+                        facts.extend(records)
+                        fetched[(series_id, "QAT")] = records
+                        _safe_print(f"   ✅ {label}: {len(df)} records")
+                    elif df is not None:
+                        fetched[(series_id, "QAT")] = []  # negative entry: no data upstream
+                except Exception as e:
+                    _safe_print(f"   ⚠️ {label} error: {e}")
             
-            # 6. Best paid occupations
-            try:
-                df = self.lmis_connector.get_best_paid_occupations(lang)
-                if df is not None and not df.empty:
-                    for _, row in df.iterrows():
-                        facts.append({
-                            "metric": "best_paid_occupations",
-                            "data": row.to_dict(),
-                            "source": "LMIS (Ministry of Labour Qatar)",
-                            "source_type": "official_government",
-                            "source_priority": 94,
-                            "confidence": 0.93,
-                            "cached": False
-                        })
-                    _safe_print(f"   ✅ Best paid occupations: {len(df)} records")
-            except Exception as e:
-                _safe_print(f"   ⚠️ Best paid occupations error: {e}")
+            if fetched:
+                await self.fact_store.put_series_async("lmis", fetched)
             
             _safe_print(f"🏛️ LMIS TOTAL: {len(facts)} official records retrieved")
             return facts
@@ -3176,82 +3206,24 @@ class CompletePrefetchLayer:
     
     def _write_facts_to_postgres(self, facts: List[Dict], source: str):
         """
-        Write prefetched facts to PostgreSQL for caching
+        Write prefetched facts to PostgreSQL for caching (blocking)
         
         Uses EXISTING tables (world_bank_indicators, ilo_labour_data, etc.)
+        with one multi-row INSERT per chunk instead of one INSERT per fact.
+        Async callers should prefer ``self.fact_writer.enqueue``.
         """
-        from sqlalchemy import text
-        from datetime import datetime
         import logging
         
         logger = logging.getLogger(__name__)
         
-        if not facts:
-            return
-        
         try:
-            with self.pg_engine.begin() as conn:
-                for fact in facts:
-                    # Determine target table based on source
-                    if source == "world_bank":
-                        conn.execute(
-                            text("""
-                                INSERT INTO world_bank_indicators 
-                                (country_code, country_name, indicator_code, indicator_name, year, value, created_at)
-                                VALUES (:country, :country_name, :code, :name, :year, :value, :created)
-                                ON CONFLICT (country_code, indicator_code, year) DO NOTHING
-                            """),
-                            {
-                                "country": "QAT",  # Always use 3-letter code for country_code column
-                                "country_name": fact.get("country_name", "Qatar"),
-                                "code": fact.get("indicator_code", fact.get("metric")),
-                                "name": fact.get("indicator_name", fact.get("description", "")),
-                                "year": fact.get("year", datetime.now().year),
-                                "value": fact.get("value", 0.0),
-                                "created": datetime.utcnow()
-                            }
-                        )
-                    elif source == "ilo":
-                        conn.execute(
-                            text("""
-                                INSERT INTO ilo_labour_data 
-                                (country_code, indicator_code, year, value, sex, age_group, created_at)
-                                VALUES (:country, :code, :year, :value, :sex, :age, :created)
-                                ON CONFLICT (country_code, indicator_code, year, sex, age_group) DO NOTHING
-                            """),
-                            {
-                                "country": fact.get("country", "QAT"),
-                                "code": fact.get("indicator_code", fact.get("metric")),
-                                "year": fact.get("year", datetime.now().year),
-                                "value": fact.get("value", 0.0),
-                                "sex": fact.get("sex", "Total"),
-                                "age": fact.get("age_group", "Total"),
-                                "created": datetime.utcnow()
-                            }
-                        )
-                    elif source == "fao":
-                        conn.execute(
-                            text("""
-                                INSERT INTO fao_data 
-                                (country_code, indicator_code, indicator_name, year, value, unit, created_at)
-                                VALUES (:country, :code, :name, :year, :value, :unit, :created)
-                                ON CONFLICT (country_code, indicator_code, year) DO NOTHING
-                            """),
-                            {
-                                "country": fact.get("country", "QAT"),
-                                "code": fact.get("indicator_code", fact.get("metric")),
-                                "name": fact.get("indicator_name", fact.get("description", "")),
-                                "year": fact.get("year", datetime.now().year),
-                                "value": fact.get("value", 0.0),
-                                "unit": fact.get("unit", ""),
-                                "created": datetime.utcnow()
-                            }
-                        )
+            self.fact_writer.write_batch(facts, source)
         except Exception as e:
             logger.error(f"Failed to write {source} facts to PostgreSQL: {e}")
     
     async def close(self):
-        """Close all API connectors"""
+        """Flush pending fact writes and close all API connectors"""
+        await self.fact_writer.close()
         if self.imf_connector:
             await self.imf_connector.close()
         if self.un_comtrade_connector:
@@ -0,0 +1,344 @@
+"""
+Write-behind, batched persistence for prefetched API facts.
+
+CompletePrefetchLayer used to persist facts with one ``INSERT ... ON CONFLICT``
+per fact on the caller's event loop. This module replaces that with:
+
+- Per-table multi-row ``INSERT ... VALUES (...), (...) ON CONFLICT DO NOTHING``
+  statements, chunked to stay under driver parameter limits
+- A write-behind queue so prefetch returns without waiting on Postgres
+- All blocking database work executed in a worker thread
+- Per-source batch-size and latency metrics via ``MetricsObserver``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from .metrics import MetricsObserver, ensure_observer
+
+logger = logging.getLogger(__name__)
+
+# Postgres allows 65535 bind parameters per statement; stay well below it.
+MAX_ROWS_PER_STATEMENT = 500
+
+
+@dataclass(frozen=True, slots=True)
+class FactTableSpec:
+    """Target table and row mapping for one fact source."""
+
+    table: str
+    columns: tuple[str, ...]
+    conflict_columns: tuple[str, ...]
+    to_row: Callable[[Mapping[str, Any], datetime], dict[str, Any]]
+
+
+def _world_bank_row(fact: Mapping[str, Any], now: datetime) -> dict[str, Any]:
+    return {
+        "country_code": "QAT",  # Always use 3-letter code for country_code column
+        "country_name": fact.get("country_name", "Qatar"),
+        "indicator_code": fact.get("indicator_code", fact.get("metric")),
+        "indicator_name": fact.get("indicator_name", fact.get("description", "")),
+        "year": fact.get("year", now.year),
+        "value": fact.get("value", 0.0),
+        "created_at": now,
+    }
+
+
+def _ilo_row(fact: Mapping[str, Any], now: datetime) -> dict[str, Any]:
+    return {
+        "country_code": fact.get("country", "QAT"),
+        "indicator_code": fact.get("indicator_code", fact.get("metric")),
+        "year": fact.get("year", now.year),
+        "value": fact.get("value", 0.0),
+        "sex": fact.get("sex", "Total"),
+        "age_group": fact.get("age_group", "Total"),
+        "created_at": now,
+    }
+
+
+def _fao_row(fact: Mapping[str, Any], now: datetime) -> dict[str, Any]:
+    return {
+        "country_code": fact.get("country", "QAT"),
+        "indicator_code": fact.get("indicator_code", fact.get("metric")),
+        "indicator_name": fact.get("indicator_name", fact.get("description", "")),
+        "year": fact.get("year", now.year),
+        "value": fact.get("value", 0.0),
+        "unit": fact.get("unit", ""),
+        "created_at": now,
+    }
+
+
+FACT_TABLES: dict[str, FactTableSpec] = {
+    "world_bank": FactTableSpec(
+        table="world_bank_indicators",
+        columns=(
+            "country_code", "country_name", "indicator_code", "indicator_name",
+            "year", "value", "created_at",
+        ),
+        conflict_columns=("country_code", "indicator_code", "year"),
+        to_row=_world_bank_row,
+    ),
+    "ilo": FactTableSpec(
+        table="ilo_labour_data",
+        columns=(
+            "country_code", "indicator_code", "year", "value", "sex", "age_group", "created_at",
+        ),
+        conflict_columns=("country_code", "indicator_code", "year", "sex", "age_group"),
+        to_row=_ilo_row,
+    ),
+    "fao": FactTableSpec(
+        table="fao_data",
+        columns=(
+            "country_code", "indicator_code", "indicator_name", "year", "value", "unit",
+            "created_at",
+        ),
+        conflict_columns=("country_code", "indicator_code", "year"),
+        to_row=_fao_row,
+    ),
+}
+
+
+def build_bulk_upsert(spec: FactTableSpec, row_count: int) -> str:
+    """
+    Build a multi-row ``INSERT ... ON CONFLICT DO NOTHING`` statement.
+
+    Parameters are named ``<column>_<row>`` so a single flat dict binds them.
+
+    Args:
+        spec: Target table spec
+        row_count: Number of VALUES tuples
+
+    Returns:
+        SQL text with named bind parameters
+    """
+    tuples = ", ".join(
+        "(" + ", ".join(f":{col}_{i}" for col in spec.columns) + ")"
+        for i in range(row_count)
+    )
+    return (
+        f"INSERT INTO {spec.table} ({', '.join(spec.columns)}) VALUES {tuples} "
+        f"ON CONFLICT ({', '.join(spec.conflict_columns)}) DO NOTHING"
+    )
+
+
+@dataclass(slots=True)
+class SourceWriteStats:
+    """Cumulative write statistics for one source."""
+
+    batches: int = 0
+    rows: int = 0
+    statements: int = 0
+    failures: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "statements": self.statements,
+            "failures": self.failures,
+            "avg_batch_size": self.rows / self.batches if self.batches else 0.0,
+            "avg_latency_ms": self.total_ms / self.batches if self.batches else 0.0,
+            "max_latency_ms": self.max_ms,
+        }
+
+
+@dataclass(slots=True)
+class _PendingWrite:
+    source: str
+    facts: list[dict[str, Any]]
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class PrefetchFactWriter:
+    """
+    Bulk, write-behind persistence of prefetched facts.
+
+    ``enqueue`` returns immediately; a background task coalesces pending
+    facts per source and writes them with one statement per chunk of
+    ``MAX_ROWS_PER_STATEMENT`` rows in a single transaction.
+    """
+
+    def __init__(
+        self,
+        engine: Any,
+        *,
+        observer: MetricsObserver | None = None,
+        max_rows_per_statement: int = MAX_ROWS_PER_STATEMENT,
+    ) -> None:
+        """
+        Args:
+            engine: SQLAlchemy (sync) engine
+            observer: Optional metrics observer
+            max_rows_per_statement: Chunk size for multi-row inserts
+        """
+        self.engine = engine
+        self.observer = ensure_observer(observer)
+        self.max_rows_per_statement = max_rows_per_statement
+        self._queue: asyncio.Queue[_PendingWrite] | None = None
+        self._worker: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stats: dict[str, SourceWriteStats] = {}
+
+    # ------------------------------------------------------------------
+    # Synchronous bulk path
+    # ------------------------------------------------------------------
+
+    def write_batch(self, facts: Sequence[Mapping[str, Any]], source: str) -> int:
+        """
+        Persist facts for one source in a single transaction (blocking).
+
+        Args:
+            facts: Fact dicts as produced by the prefetch fetchers
+            source: Source key in ``FACT_TABLES``
+
+        Returns:
+            Number of rows submitted
+        """
+        spec = FACT_TABLES.get(source)
+        if spec is None or not facts:
+            return 0
+
+        from sqlalchemy import text
+
+        now = datetime.utcnow()
+        rows = [spec.to_row(fact, now) for fact in facts]
+        stats = self._stats.setdefault(source, SourceWriteStats())
+        start = time.perf_counter()
+        statements = 0
+        try:
+            with self.engine.begin() as conn:
+                for offset in range(0, len(rows), self.max_rows_per_statement):
+                    chunk = rows[offset:offset + self.max_rows_per_statement]
+                    params = {
+                        f"{col}_{i}": row[col]
+                        for i, row in enumerate(chunk)
+                        for col in spec.columns
+                    }
+                    conn.execute(text(build_bulk_upsert(spec, len(chunk))), params)
+                    statements += 1
+        except Exception:
+            stats.failures += 1
+            self.observer.increment("prefetch.persist.failures", tags={"source": source})
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+
+        stats.batches += 1
+        stats.rows += len(rows)
+        stats.statements += statements
+        tags = {"source": source}
+        self.observer.timing("prefetch.persist.latency_ms", elapsed_ms, tags=tags)
+        self.observer.timing("prefetch.persist.batch_size", float(len(rows)), tags=tags)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Write-behind path
+    # ------------------------------------------------------------------
+
+    def enqueue(self, facts: Sequence[Mapping[str, Any]], source: str) -> None:
+        """
+        Schedule facts for background persistence and return immediately.
+
+        Falls back to a blocking write when no event loop is running.
+        """
+        if not facts or source not in FACT_TABLES:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._safe_write(list(facts), source)
+            return
+
+        # The prefetch layer is a process singleton that may outlive an event
+        # loop, so the worker is (re)bound to whichever loop is current.
+        if (
+            self._queue is None
+            or self._worker is None
+            or self._worker.done()
+            or self._loop is not loop
+        ):
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(), name="prefetch-fact-writer")
+        self._queue.put_nowait(_PendingWrite(source=source, facts=[dict(f) for f in facts]))
+        self.observer.increment("prefetch.persist.enqueued", tags={"source": source})
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            first = await self._queue.get()
+            pending = [first]
+            # Coalesce everything already queued into one write per source
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+
+            by_source: dict[str, list[dict[str, Any]]] = {}
+            for item in pending:
+                by_source.setdefault(item.source, []).extend(item.facts)
+                self.observer.timing(
+                    "prefetch.persist.queue_delay_ms",
+                    (time.perf_counter() - item.enqueued_at) * 1000,
+                    tags={"source": item.source},
+                )
+
+            for source, facts in by_source.items():
+                await asyncio.to_thread(self._safe_write, facts, source)
+            for _ in pending:
+                self._queue.task_done()
+
+    def _safe_write(self, facts: list[dict[str, Any]], source: str) -> None:
+        try:
+            self.write_batch(facts, source)
+        except Exception as exc:
+            logger.error("Failed to write %s facts to PostgreSQL: %s", source, exc)
+
+    async def drain(self) -> None:
+        """Wait until every enqueued fact has been written."""
+        if (
+            self._queue is not None
+            and self._worker is not None
+            and not self._worker.done()
+            and self._loop is asyncio.get_running_loop()
+        ):
+            await self._queue.join()
+
+    async def close(self) -> None:
+        """Flush pending writes and stop the background worker."""
+        await self.drain()
+        if self._worker is not None and self._loop is asyncio.get_running_loop():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    @property
+    def pending(self) -> int:
+        """Number of enqueued write requests not yet persisted."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-source write statistics."""
+        return {source: stats.as_dict() for source, stats in self._stats.items()}
+
+
+__all__ = [
+    "FACT_TABLES",
+    "FactTableSpec",
+    "MAX_ROWS_PER_STATEMENT",
+    "PrefetchFactWriter",
+    "SourceWriteStats",
+    "build_bulk_upsert",
+]
@@ -0,0 +1,463 @@
+"""
+Tiered prefetch scheduler with learned per-source latency budgets.
+
+``CompletePrefetchLayer.fetch_all_sources`` used to ``asyncio.gather`` every
+triggered source, so the slowest external API set the floor for every query.
+This scheduler instead:
+
+- Assigns each ``_fetch_*`` task a priority tier (1 = authoritative/cached,
+  2 = specialised APIs, 3 = search/LLM-backed enrichment)
+- Bounds each source by a latency budget derived from an EWMA estimate of
+  its p95 latency, cancelling it when the budget is exceeded
+- Returns as soon as all tier-1 sources have finished and a coverage
+  threshold of scheduled sources is met, leaving the rest running in the
+  background and delivering their facts through a callback
+- Skips sources whose circuit breaker is open after repeated failures
+- Records time-to-first-fact and time-to-coverage
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+from .metrics import MetricsObserver, ensure_observer
+
+logger = logging.getLogger(__name__)
+
+FactList = list[dict[str, Any]]
+FetchFactory = Callable[[], Awaitable[FactList]]
+LateFactsCallback = Callable[[str, FactList], Awaitable[None]]
+
+# Task names as registered by CompletePrefetchLayer.fetch_all_sources.
+# Anything not listed is treated as tier 2.
+SOURCE_TIERS: dict[str, int] = {
+    # Tier 1: official / Postgres-cached sources agents depend on
+    "lmis_comprehensive": 1,
+    "mol_data": 1,
+    "world_bank_dashboard": 1,
+    "world_bank": 1,
+    "ilo_benchmarks": 1,
+    "gcc_stat": 1,
+    "imf_dashboard": 1,
+    # Tier 2: specialised international APIs
+    "unctad_investment": 2,
+    "fao_food_security": 2,
+    "unwto_tourism": 2,
+    "iea_energy": 2,
+    "escwa_trade": 2,
+    "comtrade_food": 2,
+    "fred_benchmarks": 2,
+    "knowledge_graph": 2,
+    # Tier 3: search and LLM-backed enrichment
+    "semantic_labor": 3,
+    "semantic_policy": 3,
+    "semantic_smart": 3,
+    "perplexity_gcc": 3,
+    "perplexity_policy": 3,
+    "perplexity_energy": 3,
+    "perplexity_food_security": 3,
+    "perplexity_smart": 3,
+    "brave_economic": 3,
+}
+
+# Budget ceiling per tier before any latency history exists (seconds).
+# Tier 1 is the exception: the caller waits on it anyway, so learned history
+# may raise its budget up to TIER1_MAX_BUDGET_S.
+DEFAULT_TIER_BUDGETS_S: dict[int, float] = {1: 30.0, 2: 20.0, 3: 45.0}
+TIER1_MAX_BUDGET_S = 120.0
+
+
+def tier_for(name: str) -> int:
+    """Return the priority tier for a prefetch task name (default 2, e.g. ``adp_*``)."""
+    return SOURCE_TIERS.get(name, 2)
+
+
+@dataclass(slots=True)
+class LatencyEstimator:
+    """
+    EWMA estimate of a source's latency distribution.
+
+    Tracks an exponentially weighted mean and variance; p95 is approximated
+    as ``mean + 1.645 * std``, which is adequate for budget setting and
+    needs O(1) state per source.
+    """
+
+    alpha: float = 0.2
+    mean_s: float | None = None
+    var_s: float = 0.0
+    samples: int = 0
+
+    def observe(self, latency_s: float) -> None:
+        self.samples += 1
+        if self.mean_s is None:
+            self.mean_s = latency_s
+            return
+        delta = latency_s - self.mean_s
+        self.mean_s += self.alpha * delta
+        self.var_s = (1 - self.alpha) * (self.var_s + self.alpha * delta * delta)
+
+    @property
+    def p95_s(self) -> float | None:
+        if self.mean_s is None:
+            return None
+        return self.mean_s + 1.645 * math.sqrt(self.var_s)
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker; retries the source after a cooldown."""
+
+    failure_threshold: int = 3
+    cooldown_s: float = 300.0
+    failures: int = 0
+    opened_at: float | None = None
+
+    def allow(self, now: float) -> bool:
+        if self.opened_at is None:
+            return True
+        # Half-open after the cooldown: the next outcome closes or re-opens it
+        return now - self.opened_at >= self.cooldown_s
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self, now: float) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = now
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "open"
+
+
+@dataclass(slots=True)
+class SourceOutcome:
+    """Result of one source within a prefetch run."""
+
+    name: str
+    tier: int
+    status: str  # ok | error | timeout | skipped | cancelled
+    facts: FactList = field(default_factory=list)
+    latency_ms: float = 0.0
+    budget_s: float = 0.0
+    late: bool = False
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class PrefetchRun:
+    """
+    Outcome of ``PrefetchScheduler.run``.
+
+    ``facts`` holds everything available at early return; sources still
+    running continue in ``background`` and deliver via the late callback.
+    """
+
+    facts: FactList
+    outcomes: dict[str, SourceOutcome]
+    time_to_first_fact_ms: float | None
+    time_to_coverage_ms: float | None
+    pending: list[str]
+    background: asyncio.Task[None] | None = None
+    pending_tasks: dict[str, asyncio.Task[SourceOutcome]] = field(default_factory=dict)
+
+    async def wait_all(self) -> FactList:
+        """Wait for background sources and return their facts."""
+        if self.background is None:
+            return []
+        await self.background
+        return [
+            fact
+            for name in self.pending
+            for fact in self.outcomes[name].facts
+        ]
+
+    def cancel(self) -> None:
+        """Cancel any sources still running in the background."""
+        for name, task in self.pending_tasks.items():
+            if not task.done():
+                task.cancel()
+                self.outcomes[name] = SourceOutcome(name, tier_for(name), "cancelled", late=True)
+        if self.background is not None and not self.background.done():
+            self.background.cancel()
+
+
+class PrefetchScheduler:
+    """
+    Run prefetch sources by tier with learned latency budgets.
+
+    One scheduler instance should live as long as the prefetch layer so
+    latency history and circuit breakers persist across queries.
+    """
+
+    def __init__(
+        self,
+        *,
+        coverage_threshold: float = 0.7,
+        budget_multiplier: float = 1.5,
+        min_budget_s: float = 2.0,
+        tier_budgets_s: Mapping[int, float] | None = None,
+        tier1_max_budget_s: float = TIER1_MAX_BUDGET_S,
+        failure_threshold: int = 3,
+        cooldown_s: float = 300.0,
+        observer: MetricsObserver | None = None,
+    ) -> None:
+        """
+        Args:
+            coverage_threshold: Fraction of scheduled sources that must finish
+                (together with all tier-1 sources) before early return
+            budget_multiplier: Learned budget = p95 * multiplier
+            min_budget_s: Lower bound on any learned budget
+            tier_budgets_s: Upper bound / default budget per tier (for tier 1
+                only the default; learned history may exceed it)
+            tier1_max_budget_s: Hard upper bound on a learned tier-1 budget
+            failure_threshold: Consecutive failures before a breaker opens
+            cooldown_s: Time an open breaker waits before a probe
+            observer: Optional metrics observer
+        """
+        if not 0.0 <= coverage_threshold <= 1.0:
+            raise ValueError("coverage_threshold must be in [0, 1]")
+        self.coverage_threshold = coverage_threshold
+        self.budget_multiplier = budget_multiplier
+        self.min_budget_s = min_budget_s
+        self.tier_budgets_s = dict(tier_budgets_s or DEFAULT_TIER_BUDGETS_S)
+        self.tier1_max_budget_s = tier1_max_budget_s
+        self.failure_threshold = failure_threshold
+        self.cooldown_s = cooldown_s
+        self.observer = ensure_observer(observer)
+        self._latency: dict[str, LatencyEstimator] = {}
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    # ------------------------------------------------------------------
+    # Budgets and breakers
+    # ------------------------------------------------------------------
+
+    def budget_for(self, name: str) -> float:
+        """
+        Latency budget (seconds) for a source.
+
+        Tiers 2 and 3 are capped at their tier ceiling. Early return waits on
+        every tier-1 source regardless, so cutting one off at the ceiling only
+        throws away facts the caller is already waiting for; a tier-1 source
+        whose p95 is above the ceiling gets a budget up to
+        ``tier1_max_budget_s`` instead.
+        """
+        tier = tier_for(name)
+        ceiling = self.tier_budgets_s.get(tier, max(self.tier_budgets_s.values()))
+        estimator = self._latency.get(name)
+        if estimator is None or estimator.p95_s is None:
+            return ceiling
+        learned = max(self.min_budget_s, estimator.p95_s * self.budget_multiplier)
+        if tier == 1:
+            return min(self.tier1_max_budget_s, learned)
+        return min(ceiling, learned)
+
+    def breaker_for(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.cooldown_s)
+            self._breakers[name] = breaker
+        return breaker
+
+    def source_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-source latency estimate, budget and breaker state."""
+        names = set(self._latency) | set(self._breakers)
+        stats: dict[str, dict[str, Any]] = {}
+        for name in sorted(names):
+            estimator = self._latency.get(name)
+            breaker = self._breakers.get(name)
+            stats[name] = {
+                "tier": tier_for(name),
+                "ewma_ms": (estimator.mean_s or 0.0) * 1000 if estimator else None,
+                "p95_ms": (estimator.p95_s or 0.0) * 1000 if estimator else None,
+                "samples": estimator.samples if estimator else 0,
+                "budget_s": self.budget_for(name),
+                "breaker": breaker.state if breaker else "closed",
+            }
+        return stats
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _run_source(self, name: str, factory: FetchFactory) -> SourceOutcome:
+        tier = tier_for(name)
+        budget = self.budget_for(name)
+        t0 = time.perf_counter()
+        breaker = self.breaker_for(name)
+        try:
+            result = await asyncio.wait_for(factory(), timeout=budget)
+        except asyncio.TimeoutError:
+            breaker.record_failure(time.monotonic())
+            # A timeout is still a latency observation (a lower bound)
+            self._latency.setdefault(name, LatencyEstimator()).observe(budget)
+            self.observer.increment("prefetch.source.timeout", tags={"source": name})
+            return SourceOutcome(name, tier, "timeout", latency_ms=budget * 1000, budget_s=budget)
+        except Exception as exc:  # noqa: BLE001 - one source must not sink the run
+            breaker.record_failure(time.monotonic())
+            self.observer.increment("prefetch.source.error", tags={"source": name})
+            return SourceOutcome(
+                name, tier, "error",
+                latency_ms=(time.perf_counter() - t0) * 1000, budget_s=budget, error=str(exc),
+            )
+
+        latency_s = time.perf_counter() - t0
+        breaker.record_success()
+        self._latency.setdefault(name, LatencyEstimator()).observe(latency_s)
+        self.observer.timing("prefetch.source.latency_ms", latency_s * 1000, tags={"source": name})
+        facts = result if isinstance(result, list) else []
+        return SourceOutcome(name, tier, "ok", facts=facts, latency_ms=latency_s * 1000,
+                             budget_s=budget)
+
+    async def run(
+        self,
+        tasks: Mapping[str, FetchFactory],
+        *,
+        on_late_facts: LateFactsCallback | None = None,
+        early_return: bool = True,
+    ) -> PrefetchRun:
+        """
+        Execute prefetch sources.
+
+        Args:
+            tasks: Task name -> coroutine factory
+            on_late_facts: Awaited with (name, facts) for each source that
+                finishes after early return
+            early_return: If False, wait for every source (still applying
+                budgets and breakers)
+
+        Returns:
+            PrefetchRun with facts available at return time
+        """
+        started = time.perf_counter()
+        now = time.monotonic()
+        outcomes: dict[str, SourceOutcome] = {}
+        running: dict[asyncio.Task[SourceOutcome], str] = {}
+
+        for name, factory in tasks.items():
+            if not self.breaker_for(name).allow(now):
+                outcomes[name] = SourceOutcome(name, tier_for(name), "skipped",
+                                               error="circuit open")
+                self.observer.increment("prefetch.source.skipped", tags={"source": name})
+                continue
+            task = asyncio.create_task(self._run_source(name, factory), name=f"prefetch:{name}")
+            running[task] = name
+
+        scheduled = len(running)
+        tier1 = {name for name in running.values() if tier_for(name) == 1}
+        needed = math.ceil(self.coverage_threshold * scheduled)
+        facts: FactList = []
+        first_fact_ms: float | None = None
+        coverage_ms: float | None = None
+        done_count = 0
+
+        pending_tasks = set(running)
+        try:
+            while pending_tasks:
+                done, pending_tasks = await asyncio.wait(
+                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    outcome = _outcome_of(task, running[task])
+                    outcomes[outcome.name] = outcome
+                    tier1.discard(outcome.name)
+                    done_count += 1
+                    if outcome.facts:
+                        if first_fact_ms is None:
+                            first_fact_ms = (time.perf_counter() - started) * 1000
+                        facts.extend(outcome.facts)
+                if coverage_ms is None and not tier1 and done_count >= needed:
+                    coverage_ms = (time.perf_counter() - started) * 1000
+                    if early_return:
+                        break
+        except BaseException:
+            # Caller cancelled (or failed) mid-wait: don't leave sources running.
+            for task in pending_tasks:
+                task.cancel()
+            raise
+
+        if coverage_ms is None and scheduled:
+            coverage_ms = (time.perf_counter() - started) * 1000
+
+        pending_names = [running[t] for t in pending_tasks]
+        background: asyncio.Task[None] | None = None
+        if pending_tasks:
+            background = asyncio.create_task(
+                self._finish_late(
+                    {task: running[task] for task in pending_tasks}, outcomes, on_late_facts
+                ),
+                name="prefetch:late-sources",
+            )
+
+        if first_fact_ms is not None:
+            self.observer.timing("prefetch.time_to_first_fact_ms", first_fact_ms)
+        if coverage_ms is not None:
+            self.observer.timing("prefetch.time_to_coverage_ms", coverage_ms)
+
+        return PrefetchRun(
+            facts=facts,
+            outcomes=outcomes,
+            time_to_first_fact_ms=first_fact_ms,
+            time_to_coverage_ms=coverage_ms,
+            pending=pending_names,
+            background=background,
+            pending_tasks={running[t]: t for t in pending_tasks},
+        )
+
+    async def _finish_late(
+        self,
+        pending: dict[asyncio.Task[SourceOutcome], str],
+        outcomes: dict[str, SourceOutcome],
+        on_late_facts: LateFactsCallback | None,
+    ) -> None:
+        remaining = set(pending)
+        try:
+            while remaining:
+                done, remaining = await asyncio.wait(
+                    remaining, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    outcome = _outcome_of(task, pending[task])
+                    outcome.late = True
+                    outcomes[outcome.name] = outcome
+                    if outcome.facts and on_late_facts is not None:
+                        try:
+                            await on_late_facts(outcome.name, outcome.facts)
+                        except Exception as exc:  # noqa: BLE001
+                            logger.warning(
+                                "Late prefetch callback failed for %s: %s", outcome.name, exc
+                            )
+        except BaseException:
+            for task in remaining:
+                task.cancel()
+            raise
+
+
+def _outcome_of(task: asyncio.Task[SourceOutcome], name: str) -> SourceOutcome:
+    """Outcome of a finished source task; one cancelled from outside counts as cancelled."""
+    if task.cancelled():
+        return SourceOutcome(name, tier_for(name), "cancelled")
+    return task.result()
+
+
+__all__ = [
+    "CircuitBreaker",
+    "DEFAULT_TIER_BUDGETS_S",
+    "LatencyEstimator",
+    "PrefetchRun",
+    "PrefetchScheduler",
+    "SOURCE_TIERS",
+    "SourceOutcome",
+    "TIER1_MAX_BUDGET_S",
+    "tier_for",
+]
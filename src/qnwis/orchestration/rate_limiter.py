@@ -10,6 +10,8 @@ import time
 import logging
 from typing import Any, Callable
 
+from ..utils.rate_limit_core import Limit, RateLimitCore
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,20 +20,27 @@ class RateLimitedExecutor:
     Rate limiter for API calls.
     
     Enforces maximum requests per minute to prevent 429 errors from Claude API.
-    Uses semaphore + time-based tracking for rate limiting.
+    Uses a semaphore for concurrency and a token bucket on the shared
+    rate-limit core (pass a Redis-backed core to share the budget across
+    workers).
     """
     
-    def __init__(self, max_requests_per_minute: int = 50):
+    def __init__(
+        self, max_requests_per_minute: int = 50, core: RateLimitCore | None = None
+    ):
         """
         Initialize rate limiter.
         
         Args:
             max_requests_per_minute: Maximum API requests allowed per minute.
                                      Default 50 for standard Claude API tier.
+            core: Rate-limit core; defaults to an in-process one
         """
         self.max_requests_per_minute = max_requests_per_minute
         self.semaphore = asyncio.Semaphore(20)  # Conservative concurrent limit
-        self.request_times = []
+        self.core = core or RateLimitCore()
+        self.limits = (Limit.per("rpm", max_requests_per_minute, 60),)
+        self.request_times = []  # last 60s of call times, for stats
         logger.info(f"Rate limiter initialized: {max_requests_per_minute} req/min limit")
     
     async def execute_with_rate_limit(
@@ -61,28 +70,21 @@ class RateLimitedExecutor:
         """
         Enforce rate limit by sleeping if necessary.
         
-        Tracks request times in a sliding window and sleeps if we're
-        about to exceed the rate limit.
+        Waits for a token from the per-minute bucket: the first
+        ``max_requests_per_minute`` calls pass at once, later ones are
+        spaced at the sustained rate.
         """
-        now = time.time()
-        
-        # Remove requests older than 60 seconds (sliding window)
-        self.request_times = [t for t in self.request_times if now - t < 60]
-        
-        # Check if we need to wait
-        if len(self.request_times) >= self.max_requests_per_minute:
-            # Calculate sleep time to stay under limit
-            oldest_request = self.request_times[0]
-            sleep_time = 60 - (now - oldest_request) + 0.1  # +0.1s buffer
-            
+        waited = await self.core.wait("llm", self.limits)
+        if waited:
             logger.info(
-                f"Rate limit: {len(self.request_times)}/{self.max_requests_per_minute} "
-                f"requests in last 60s. Sleeping {sleep_time:.2f}s..."
+                f"Rate limit: {self.max_requests_per_minute} req/min budget spent. "
+                f"Waited {waited:.2f}s"
             )
-            await asyncio.sleep(sleep_time)
         
         # Record this request
-        self.request_times.append(time.time())
+        now = time.time()
+        self.request_times = [t for t in self.request_times if now - t < 60]
+        self.request_times.append(now)
 
 
 # Global singleton instance
@@ -0,0 +1,249 @@
+"""
+Structural-sharing state for parallel scenario branches.
+
+ParallelDebateExecutor used to ``copy.deepcopy`` the full workflow state for
+every scenario, duplicating prefetched facts, RAG context and data tables
+that scenarios only read. This module freezes those heavy sections once and
+hands every branch references to the same immutable objects:
+
+- ``freeze`` converts nested dicts/lists into ``FrozenDict``/``FrozenList``
+  (still ``dict``/``list`` instances, so readers and JSON encoding work)
+- ``ScenarioStateBase.branch`` builds a scenario state whose top-level
+  containers are private (nodes may append/assign) while elements are shared
+- ``ScenarioStateBase.diff`` reduces a finished branch to a ``StateOverlay``
+  holding only what the scenario assigned or appended, so merges walk the
+  overlay instead of whole states
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+# Heavy, read-only-in-scenarios sections shared by reference across branches.
+SHARED_SECTIONS: tuple[str, ...] = (
+    "extracted_facts",
+    "rag_context",
+    "structured_inputs",
+    "calculated_results",
+    "scenario_baselines",
+    "semantic_routing",
+    "feasibility_analysis",
+    "feasibility_check",
+    "agent_reports",
+    "conversation_history",
+)
+
+# Callables that must never be copied into (or bubble up from) a branch.
+EXCLUDED_KEYS: tuple[str, ...] = ("emit_event_fn", "event_callback")
+
+# Result key carrying a JSON-serializable summary of the overlay.
+DELTA_KEY = "scenario_delta"
+
+_MISSING = object()
+
+
+def _readonly(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"{type(self).__name__} is shared across scenarios and read-only")
+
+
+class FrozenDict(dict):
+    """Read-only ``dict`` shared between scenario branches."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    __ior__ = _readonly
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FrozenDict:
+        # Immutable, so sharing is always safe
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (dict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only ``list`` shared between scenario branches."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+    __iadd__ = __imul__ = _readonly
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> FrozenList:
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (list, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dicts and lists into their frozen counterparts.
+
+    Already-frozen values are returned as-is; other objects (strings,
+    numbers, models, arrays) are shared by reference.
+    """
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(v) for v in value)
+    if isinstance(value, tuple):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+@dataclass(slots=True)
+class StateOverlay:
+    """Per-scenario changes relative to the shared base."""
+
+    assigned: dict[str, Any] = field(default_factory=dict)
+    appended: dict[str, list[Any]] = field(default_factory=dict)
+
+    def summary(self) -> dict[str, Any]:
+        """JSON-serializable description stored under ``DELTA_KEY``."""
+        return {
+            "assigned": sorted(self.assigned),
+            "appended": {key: len(items) for key, items in self.appended.items()},
+        }
+
+
+def _has_prefix(items: list[Any], prefix: list[Any]) -> bool:
+    if len(items) < len(prefix):
+        return False
+    return all(a is b or a == b for a, b in zip(prefix, items))
+
+
+class ScenarioStateBase:
+    """
+    Immutable base state shared by all scenario branches of one query.
+
+    Build once per ``execute_scenarios`` call; ``branch`` is then O(number of
+    top-level keys + length of shared lists) instead of O(state size).
+    """
+
+    def __init__(
+        self,
+        base_state: Mapping[str, Any],
+        *,
+        shared_keys: Iterable[str] = SHARED_SECTIONS,
+        exclude_keys: Iterable[str] = EXCLUDED_KEYS,
+    ) -> None:
+        excluded = set(exclude_keys)
+        shared = set(shared_keys) - excluded
+        self.shared: dict[str, Any] = {
+            key: freeze(value) for key, value in base_state.items() if key in shared
+        }
+        self.private: dict[str, Any] = {
+            key: value
+            for key, value in base_state.items()
+            if key not in shared and key not in excluded
+        }
+        # Snapshot private sections so later mutation of the caller's state
+        # (or of a branch) cannot leak into other branches
+        self.private = copy.deepcopy(self.private)
+
+    def branch(self, **overrides: Any) -> dict[str, Any]:
+        """Create a scenario state sharing the frozen sections."""
+        state = copy.deepcopy(self.private)
+        for key, value in self.shared.items():
+            # Private top-level containers so nodes can append/assign;
+            # the (frozen) elements stay shared
+            if isinstance(value, list):
+                state[key] = list(value)
+            elif isinstance(value, dict):
+                state[key] = dict(value)
+            else:
+                state[key] = value
+        state.update(overrides)
+        return state
+
+    def base_value(self, key: str) -> Any:
+        if key in self.shared:
+            return self.shared[key]
+        return self.private.get(key, _MISSING)
+
+    def diff(self, result: Mapping[str, Any]) -> StateOverlay:
+        """
+        Reduce a finished branch to the changes it made.
+
+        Lists that still start with the base list contribute only their new
+        tail; every other changed or new key is recorded as assigned.
+        """
+        overlay = StateOverlay()
+        for key, value in result.items():
+            if key in EXCLUDED_KEYS:
+                continue
+            base = self.base_value(key)
+            if base is _MISSING:
+                overlay.assigned[key] = value
+                continue
+            if value is base:
+                continue
+            if isinstance(value, list) and isinstance(base, list) and _has_prefix(value, base):
+                if len(value) > len(base):
+                    overlay.appended[key] = value[len(base):]
+                continue
+            if isinstance(value, dict) and isinstance(base, dict) and len(value) == len(base):
+                if all(k in base and (v is base[k] or v == base[k]) for k, v in value.items()):
+                    continue
+            elif value == base:
+                continue
+            overlay.assigned[key] = value
+        return overlay
+
+    def materialize(self, overlay: StateOverlay) -> dict[str, Any]:
+        """
+        Full state view for an overlay.
+
+        Shared sections are referenced, not copied; ``DELTA_KEY`` records
+        which keys the scenario changed so merges can use ``appended_items``.
+        """
+        state: dict[str, Any] = {**copy.deepcopy(self.private), **self.shared}
+        for key, items in overlay.appended.items():
+            state[key] = list(self.base_value(key)) + list(items)
+        state.update(overlay.assigned)
+        state[DELTA_KEY] = overlay.summary()
+        return state
+
+
+def appended_items(result: Mapping[str, Any], key: str) -> list[Any]:
+    """
+    Items a scenario appended to ``key``.
+
+    Falls back to the whole list for results produced without an overlay.
+    """
+    items = result.get(key) or []
+    delta = result.get(DELTA_KEY)
+    if not isinstance(delta, Mapping):
+        return list(items)
+    count = delta.get("appended", {}).get(key, 0)
+    if not count:
+        return [] if key not in delta.get("assigned", ()) else list(items)
+    return list(items[-count:])
+
+
+__all__ = [
+    "DELTA_KEY",
+    "EXCLUDED_KEYS",
+    "FrozenDict",
+    "FrozenList",
+    "SHARED_SECTIONS",
+    "ScenarioStateBase",
+    "StateOverlay",
+    "appended_items",
+    "freeze",
+]
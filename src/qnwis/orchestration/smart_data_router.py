@@ -760,6 +760,7 @@ class IntelligentExtractionOrchestrator:
         facts = []
         try:
             from src.data.apis.world_bank_api import WorldBankAPI
+            from .fact_store import fetch_world_bank_series
             
             api = WorldBankAPI()
             
@@ -789,29 +790,32 @@ class IntelligentExtractionOrchestrator:
                 ],
             }
             
-            indicators = indicators_by_domain.get(domain, indicators_by_domain["economy"])
+            indicators = dict(indicators_by_domain.get(domain, indicators_by_domain["economy"]))
             countries = ["QAT", "SAU", "ARE", "KWT", "BHR", "OMN"]
             
-            for indicator_code, indicator_name in indicators:
-                for country in countries:
-                    try:
-                        data = await api.get_indicator(
-                            indicator_code=indicator_code,
-                            country_code=country
-                        )
-                        if data and data.get("latest_value"):
-                            facts.append({
-                                "metric": indicator_code,
-                                "description": indicator_name,
-                                "value": data["latest_value"],
-                                "year": data.get("latest_year"),
-                                "country": country,
-                                "source": "World Bank API",
-                                "source_type": "authoritative",
-                                "confidence": 0.98,
-                            })
-                    except:
-                        continue
+            # Fact store first; only missing/stale series hit the API
+            records = await fetch_world_bank_series(api, list(indicators), countries)
+            await api.close()
+            
+            latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+            for record in records:
+                if record.get("value") is None:
+                    continue
+                key = (record["indicator_code"], record["country"])
+                if key not in latest or int(record["year"]) > int(latest[key]["year"]):
+                    latest[key] = record
+            
+            for (indicator_code, country), record in latest.items():
+                facts.append({
+                    "metric": indicator_code,
+                    "description": indicators[indicator_code],
+                    "value": record["value"],
+                    "year": record["year"],
+                    "country": country,
+                    "source": "World Bank API",
+                    "source_type": "authoritative",
+                    "confidence": 0.98,
+                })
             
             logger.info(f"World Bank: Extracted {len(facts)} facts")
             
@@ -69,6 +69,8 @@ class IntelligenceState(TypedDict, total=False):
 
     # Data Extraction (from prefetch/cache)
     extracted_facts: Annotated[List[Dict[str, Any]], merge_lists]
+    late_facts: Annotated[List[Dict[str, Any]], keep_first]  # Filled in place by prefetch sources that finish after extraction
+    prefetch_runs: Annotated[Optional[List[Any]], keep_first]  # PrefetchRuns with sources still running; cancelled at workflow end
     scenario_baselines: Annotated[Optional[Dict[str, Any]], take_last]  # For scenario generator
     data_sources: Annotated[List[str], merge_lists]
     data_quality_score: Annotated[float, take_last]  # 0.0 to 1.0
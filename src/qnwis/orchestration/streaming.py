@@ -9,15 +9,16 @@ Supports feature-flag based switching between:
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from datetime import datetime, timezone
-from typing import Any, AsyncIterator, Dict, Optional
+from datetime import date, datetime, timezone
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 
 from .feature_flags import use_langgraph_workflow
+from .graph_cache import get_compiled_graph
 from .workflow import run_intelligence_query
 
 logger = logging.getLogger(__name__)
-logger.info("📦 streaming.py MODULE LOADED!")
 
 
 class WorkflowEvent:
@@ -56,44 +57,135 @@ class WorkflowEvent:
         }
 
 
-def _is_json_serializable(obj: Any) -> bool:
-    """Check if an object is JSON serializable."""
-    import json
-    try:
-        json.dumps(obj)
-        return True
-    except (TypeError, ValueError):
-        return False
+# Keys never forwarded to clients (callbacks and task handles injected into workflow state)
+_EXCLUDED_KEYS = frozenset({"event_callback", "emit_event_fn", "prefetch_runs"})
+
+_SKIP = object()
+
+
+def _encode_scalar(value: Any) -> Any:
+    return value
+
+
+def _encode_dict(value: Dict[Any, Any]) -> Dict[str, Any]:
+    result = {}
+    for k, v in value.items():
+        if k in _EXCLUDED_KEYS:
+            continue
+        if not isinstance(k, str):
+            # json/orjson only accept str keys; stringify simple scalars
+            if k is None or isinstance(k, (int, float, bool)):
+                k = json.dumps(k)
+            else:
+                continue
+        encoded = _encode(v)
+        if encoded is not _SKIP:
+            result[k] = encoded
+    return result
+
+
+def _encode_sequence(value: Any) -> list:
+    result = []
+    for item in value:
+        encoded = _encode(item)
+        if encoded is not _SKIP:
+            result.append(encoded)
+    return result
+
+
+def _encode_datetime(value: Any) -> str:
+    return value.isoformat()
+
+
+_ENCODERS: Dict[type, Callable[[Any], Any]] = {
+    str: _encode_scalar,
+    int: _encode_scalar,
+    float: _encode_scalar,
+    bool: _encode_scalar,
+    type(None): _encode_scalar,
+    dict: _encode_dict,
+    list: _encode_sequence,
+    tuple: _encode_sequence,
+    datetime: _encode_datetime,
+    date: _encode_datetime,
+}
+
+# Checked in order for subclasses (str enums, FrozenDict, numpy float64, ...)
+_BASE_ENCODERS = (
+    (bool, _encode_scalar),
+    (str, _encode_scalar),
+    (int, _encode_scalar),
+    (float, _encode_scalar),
+    (dict, _encode_dict),
+    (list, _encode_sequence),
+    (tuple, _encode_sequence),
+    (datetime, _encode_datetime),
+    (date, _encode_datetime),
+)
+
+
+def _encode(value: Any) -> Any:
+    """
+    Single-pass, type-dispatched conversion to JSON-native values.
+
+    Output is accepted by both ``json`` and ``orjson``; values that cannot be
+    represented (callables, arbitrary objects) become ``_SKIP`` and are dropped
+    by the enclosing container instead of being probed with ``json.dumps``.
+    """
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+    for base, encoder in _BASE_ENCODERS:
+        if isinstance(value, base):
+            return encoder(value)
+    if type(value).__module__ == "numpy" and hasattr(value, "item"):
+        # numpy scalars (int64, bool_) -> Python scalars
+        return _encode(value.item())
+    return _SKIP
 
 
 def _sanitize_dict(d: Dict[str, Any]) -> Dict[str, Any]:
     """Remove non-serializable values from a dictionary recursively."""
     if not isinstance(d, dict):
         return d
-    
-    result = {}
-    for k, v in d.items():
-        # Skip known non-serializable fields
-        if k in ('event_callback', 'emit_event_fn'):
-            continue
-        # Skip functions and callables
-        if callable(v):
-            continue
-        # Recursively handle nested dicts
-        if isinstance(v, dict):
-            result[k] = _sanitize_dict(v)
-        elif isinstance(v, list):
-            result[k] = [_sanitize_dict(item) if isinstance(item, dict) else item 
-                        for item in v if not callable(item)]
-        else:
-            # Only include serializable values
-            if _is_json_serializable(v):
-                result[k] = v
-    return result
+    return _encode_dict(d)
+
+
+def _fingerprint(value: Any) -> Tuple[int, int]:
+    """Identity + size; catches reassignment and in-place list/dict growth."""
+    try:
+        size = len(value) if isinstance(value, (list, dict, str)) else -1
+    except TypeError:
+        size = -1
+    return id(value), size
+
+
+def _changed_keys(
+    node_output: Dict[str, Any], fingerprints: Dict[str, Tuple[int, int]]
+) -> Dict[str, Any]:
+    """
+    Keys of ``node_output`` that differ from what was last seen, updating
+    ``fingerprints``. Nodes often return the whole (mutated) state, so this
+    is what makes events carry only what a node actually changed.
+    """
+    delta = {}
+    for key, value in node_output.items():
+        fp = _fingerprint(value)
+        if fingerprints.get(key) != fp:
+            fingerprints[key] = fp
+            delta[key] = value
+    return delta
 
 
-def _payload_for_stage(stage: str, state: Dict[str, Any]) -> Dict[str, Any]:
-    """Return a compact payload for UI consumption."""
+def _payload_for_stage(
+    stage: str, state: Dict[str, Any], delta: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Return a compact payload for UI consumption.
+
+    ``delta`` holds the keys the node changed; stages without a dedicated
+    payload emit just those instead of re-sending the full fact list.
+    """
 
     if stage == "classifier":
         return {
@@ -391,6 +483,12 @@ def _payload_for_stage(stage: str, state: Dict[str, Any]) -> Dict[str, Any]:
             "word_count": len(final_synth.split()) if final_synth else 0,
             "stats": stats,  # For LegendaryBriefing component
         }
+    if delta is not None:
+        payload = _sanitize_dict(delta)
+        if "extracted_facts" in delta:
+            payload["facts_count"] = len(delta["extracted_facts"] or [])
+        payload["changed_keys"] = sorted(delta)
+        return payload
     # Default: return extracted_facts and final_synthesis if available
     default_payload = {}
     if state.get("extracted_facts"):
@@ -409,7 +507,8 @@ async def run_workflow_stream(
     classifier: Optional[Any] = None,
     provider: str = None,  # Uses QNWIS_LLM_PROVIDER from env
     request_id: Optional[str] = None,
-    debate_depth: str = "legendary"  # User-selected: standard=25-40, deep=50-100, legendary=100-150
+    debate_depth: str = "legendary",  # User-selected: standard=25-40, deep=50-100, legendary=100-150
+    graph: Optional[Any] = None,
 ) -> AsyncIterator[WorkflowEvent]:
     """
     Run the LangGraph workflow and emit stage events in execution order.
@@ -427,27 +526,26 @@ async def run_workflow_stream(
         provider: LLM provider
         request_id: Request ID for logging
         debate_depth: Controls debate turns - standard/deep/legendary
+        graph: Compiled graph override (recorded runs, benchmarks); defaults
+            to the process-wide cached intelligence graph
 
     Yields:
         WorkflowEvent objects
     """
 
-    # DIAGNOSTIC - REMOVE AFTER VERIFICATION
     import os
-    import sys
-    logger.critical("🔥🔥🔥 STREAMING.PY FUNCTION EXECUTING - FRESH CODE! 🔥🔥🔥")
-    logger.critical(f"🔥 Python PID: {os.getpid()}, Bytecode tag: {sys.implementation.cache_tag}")
-    # END DIAGNOSTIC
 
-    logger.info(f"🚀 run_workflow_stream CALLED! QNWIS_WORKFLOW_IMPL={os.getenv('QNWIS_WORKFLOW_IMPL', 'NOT SET')}")
-    logger.info(f"🎯 use_langgraph_workflow()={use_langgraph_workflow()}")
+    logger.info(
+        "🚀 run_workflow_stream CALLED! QNWIS_WORKFLOW_IMPL=%s",
+        os.getenv("QNWIS_WORKFLOW_IMPL", "NOT SET"),
+    )
     
     # Feature flag: Use new modular workflow if enabled
     if use_langgraph_workflow():
         logger.info("Using NEW modular LangGraph workflow (workflow.py) with LIVE streaming")
 
         # Import workflow components
-        from .workflow import create_intelligence_graph
+        from .workflow import cancel_prefetch_runs, create_intelligence_graph
         from .state import IntelligenceState
 
         # Create event queue for real-time debate turn streaming
@@ -466,16 +564,18 @@ async def run_workflow_stream(
                 latency_ms=latency_ms
             )
             await event_queue.put(event)
-            logger.info(f"📤 Queued debate event: {stage} - {status}")  # Changed to INFO level
+            logger.debug("📤 Queued debate event: %s - %s", stage, status)
 
         # Initialize state with emit callback
-        logger.info(f"🎚️ Debate depth set to: {debate_depth}")
+        logger.info("🎚️ Debate depth set to: %s", debate_depth)
         initial_state: IntelligenceState = {
             "query": question,
             "complexity": "",
             "debate_depth": debate_depth,  # User-selected: standard/deep/legendary
             "agent_reports": [],
             "extracted_facts": [],
+            "late_facts": [],  # Filled in place by slow prefetch sources
+            "prefetch_runs": [],  # Cancelled when the workflow task ends
             "data_sources": [],
             "data_quality_score": 0.0,
             "financial_analysis": None,
@@ -507,53 +607,59 @@ async def run_workflow_stream(
             "scenario_results": None,
         }
 
-        # CRITICAL DEBUG - Log initial state
-        logger.warning(f"🔍 INITIAL STATE query = {repr(initial_state.get('query', 'NOT_FOUND'))}")
-        logger.warning(f"🔍 INITIAL STATE query length = {len(initial_state.get('query', ''))}")
-        logger.warning(f"🔍 INITIAL STATE enable_parallel = {initial_state.get('enable_parallel_scenarios')}")
+        logger.debug(
+            "🔍 INITIAL STATE query=%r enable_parallel=%s",
+            question,
+            initial_state.get("enable_parallel_scenarios"),
+        )
         
-        graph = create_intelligence_graph()
+        # Compiled once per process and reused across requests
+        if graph is None:
+            graph = get_compiled_graph(create_intelligence_graph)
         
         # CRITICAL: We need to accumulate state because astream yields PARTIAL updates
-        accumulated_state = initial_state.copy()
+        accumulated_state = dict(initial_state)
+        fingerprints = {key: _fingerprint(value) for key, value in initial_state.items()}
 
         # Run workflow in background task
         async def run_workflow():
-            nonlocal workflow_complete, accumulated_state
+            nonlocal workflow_complete
             try:
                 async for event in graph.astream(initial_state):
-                    logger.info(f"📨 LangGraph event received: type={type(event)}, value={str(event)[:200]}")
-                    
                     # Guard against None events from LangGraph
                     if event is None:
                         logger.warning("⚠️ Received None event from LangGraph astream, skipping")
                         continue
                     if not isinstance(event, dict):
-                        logger.warning(f"⚠️ Received non-dict event from LangGraph: {type(event)}, value={event}")
+                        logger.warning("⚠️ Received non-dict event from LangGraph: %s", type(event))
                         continue
                     
                     # Forward node completion events to queue
                     for node_name, node_output in event.items():
-                        logger.info(f"📦 Processing node '{node_name}': output_type={type(node_output)}")
-                        # CRITICAL: Merge partial state into accumulated state
+                        # Only the keys this node changed travel through the
+                        # queue; the consumer applies them to its own view
+                        delta = {}
                         if isinstance(node_output, dict):
-                            accumulated_state.update(node_output)
-                            logger.info(f"🔄 Node '{node_name}' updated keys: {list(node_output.keys())[:5]}")
-                        # Send the FULL accumulated state, not just partial update
-                        await event_queue.put(("node_complete", node_name, accumulated_state.copy()))
+                            delta = _changed_keys(node_output, fingerprints)
+                            accumulated_state.update(delta)
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("📦 Node '%s' changed keys: %s", node_name, sorted(delta))
+                        await event_queue.put(("node_complete", node_name, delta))
             except Exception as e:
-                import traceback
-                full_tb = traceback.format_exc()
-                logger.error(f"Workflow execution error: {e}")
-                logger.error(f"Full traceback:\n{full_tb}")
+                logger.error("Workflow execution error: %s", e, exc_info=True)
                 await event_queue.put(("error", str(e), None))
             finally:
+                cancel_prefetch_runs(initial_state["prefetch_runs"])
                 workflow_complete = True
-                await event_queue.put(("done", None, accumulated_state.copy()))
+                await event_queue.put(("done", None, None))
 
         # Start workflow in background
         workflow_task = asyncio.create_task(run_workflow())
 
+        # Consumer-side view of the state, advanced one node delta at a time
+        # (replaces a full state copy per node event)
+        state_view = dict(initial_state)
+
         # Stream events from queue as they arrive (real-time!)
         first_agent_emitted = False
         rag_emitted = False
@@ -574,7 +680,7 @@ async def run_workflow_stream(
             # Handle different event types
             if isinstance(queue_item, WorkflowEvent):
                 # Direct event from emit_event_fn (e.g., debate turns)
-                logger.info(f"🎪 Yielding debate event to SSE: {queue_item.stage}")
+                logger.debug("🎪 Yielding debate event to SSE: %s", queue_item.stage)
                 yield queue_item
                 continue
 
@@ -596,9 +702,11 @@ async def run_workflow_stream(
 
             # Node completion event
             node_name = data1
-            node_output = data2
+            node_delta = data2
+            state_view.update(node_delta)
+            node_output = state_view
 
-            logger.info(f"Node '{node_name}' completed, emitting event")
+            logger.debug("Node '%s' completed, emitting event", node_name)
 
             # Define next stage mapping for emitting "running" events
             # Parallel path: parallel_exec → aggregate → debate → critique → verify → meta_synthesis → done
@@ -728,7 +836,7 @@ async def run_workflow_stream(
             yield WorkflowEvent(
                 stage=stage,
                 status="complete",
-                payload=_payload_for_stage(node_name, node_output),
+                payload=_payload_for_stage(node_name, node_output, node_delta),
             )
             
             # When parallel_exec completes, also mark agents as complete
@@ -757,21 +865,16 @@ async def run_workflow_stream(
         await workflow_task
 
         # DEBUG: Log available state keys for synthesis
-        logger.info("=" * 60)
-        logger.info("STATE BEFORE FINAL SYNTHESIS EVENTS:")
-        for key in ["final_synthesis", "meta_synthesis", "synthesis", "debate_synthesis", 
-                    "conversation_history", "debate_results", "critique_results"]:
-            value = accumulated_state.get(key)
-            if value:
-                if isinstance(value, str):
-                    logger.info(f"  ✓ {key}: {len(value)} chars")
-                elif isinstance(value, list):
-                    logger.info(f"  ✓ {key}: {len(value)} items")
+        if logger.isEnabledFor(logging.DEBUG):
+            for key in ["final_synthesis", "meta_synthesis", "synthesis", "debate_synthesis",
+                        "conversation_history", "debate_results", "critique_results"]:
+                value = accumulated_state.get(key)
+                if not value:
+                    logger.debug("  ✗ %s: MISSING or EMPTY", key)
+                elif isinstance(value, (str, list)):
+                    logger.debug("  ✓ %s: %d %s", key, len(value), "chars" if isinstance(value, str) else "items")
                 elif isinstance(value, dict):
-                    logger.info(f"  ✓ {key}: {list(value.keys())[:5]}...")
-            else:
-                logger.warning(f"  ✗ {key}: MISSING or EMPTY")
-        logger.info("=" * 60)
+                    logger.debug("  ✓ %s: %s...", key, list(value.keys())[:5])
 
         # Emit final synthesis events with FULL accumulated state
         # CRITICAL: Check multiple possible keys where synthesis might be stored
@@ -782,7 +885,7 @@ async def run_workflow_stream(
             accumulated_state.get("debate_synthesis") or  # debate stores here
             ""
         )
-        logger.info(f"✅ Final synthesis length: {len(final_synthesis)} chars")
+        logger.info("✅ Final synthesis length: %d chars", len(final_synthesis))
         
         # Build synthesis stats for LegendaryBriefing component
         debate_results = accumulated_state.get("debate_results", {}) or {}
@@ -34,7 +34,9 @@ from .nodes.synthesis_legendary import legendary_synthesis_node_sync as legendar
 from .nodes.synthesis_strategic import strategic_synthesis_node
 # Import parallel scenario analysis components
 from .nodes.scenario_generator import ScenarioGenerator
+from .graph_cache import get_compiled_graph
 from .parallel_executor import ParallelDebateExecutor
+from .scenario_state import appended_items
 from .nodes.meta_synthesis import meta_synthesis_node
 from .state import IntelligenceState
 
@@ -206,8 +208,8 @@ async def parallel_execution_node(state: IntelligenceState) -> IntelligenceState
         # Create parallel executor with event callback
         executor = ParallelDebateExecutor(num_parallel=6, event_callback=event_callback)
         
-        # Build base workflow (single-scenario workflow without scenario generation)
-        base_workflow = build_base_workflow()
+        # Base workflow (single-scenario, no scenario generation) is compiled once per process
+        base_workflow = get_compiled_graph(build_base_workflow)
         
         # Execute scenarios in parallel (await directly - we're already in async context)
         # Also runs ResearchSynthesizer in parallel for PhD-level literature review
@@ -282,14 +284,15 @@ async def aggregate_scenarios_for_debate_node(state: IntelligenceState) -> Intel
         
         # CRITICAL: Extract internal agent reports from scenario
         # These contain the actual agent analyses that critique needs
-        scenario_agent_reports = result.get('agent_reports', [])
+        # Only reports this scenario added - the base ones are shared by all
+        scenario_agent_reports = appended_items(result, 'agent_reports')
         if scenario_agent_reports:
             for sar in scenario_agent_reports:
                 if isinstance(sar, dict) and sar.get('report'):
                     # Add scenario context to each report
                     sar_copy = dict(sar)
                     if isinstance(sar_copy.get('report'), dict):
-                        sar_copy['report']['scenario'] = scenario_name
+                        sar_copy['report'] = {**sar_copy['report'], 'scenario': scenario_name}
                     agent_reports.append(sar_copy)
                     logger.debug(f"  Added agent report: {sar.get('agent')}")
         
@@ -326,8 +329,8 @@ async def aggregate_scenarios_for_debate_node(state: IntelligenceState) -> Intel
         if i < len(agent_fields):
             state[agent_fields[i]] = f"[{scenario_name}] {synthesis[:1500] if synthesis else 'Analysis complete'}"
         
-        # Aggregate facts from scenarios
-        scenario_facts = result.get('extracted_facts', [])
+        # Aggregate facts from scenarios (only facts the scenario added)
+        scenario_facts = appended_items(result, 'extracted_facts')
         if scenario_facts:
             all_facts.extend(scenario_facts)
         
@@ -356,11 +359,10 @@ async def aggregate_scenarios_for_debate_node(state: IntelligenceState) -> Intel
         scenario_name = result.get('scenario_name', f'Scenario {i+1}')
         
         # Collect conversation history
-        scenario_history = result.get('conversation_history', [])
+        scenario_history = appended_items(result, 'conversation_history')
         for msg in scenario_history:
             if isinstance(msg, dict):
-                msg['scenario'] = scenario_name
-                all_conversation_history.append(msg)
+                all_conversation_history.append({**msg, 'scenario': scenario_name})
         
         # Collect debate statistics
         scenario_debate = result.get('debate_results', {})
@@ -766,6 +768,8 @@ async def run_intelligence_query(query: str) -> IntelligenceState:
         "complexity": "",
         "agent_reports": [],
         "extracted_facts": [],
+        "late_facts": [],
+        "prefetch_runs": [],
         "data_sources": [],
         "data_quality_score": 0.0,
         "financial_analysis": None,
@@ -794,11 +798,20 @@ async def run_intelligence_query(query: str) -> IntelligenceState:
         "scenario_metadata": None,
     }
 
-    graph = create_intelligence_graph()
+    graph = get_compiled_graph(create_intelligence_graph)
 
     start_time = datetime.now()
-    result = await graph.ainvoke(initial_state)
+    try:
+        result = await graph.ainvoke(initial_state)
+    finally:
+        cancel_prefetch_runs(initial_state["prefetch_runs"])
     result["execution_time"] = (datetime.now() - start_time).total_seconds()
 
     return result
 
+
+def cancel_prefetch_runs(runs: list) -> None:
+    """Stop prefetch sources still running once the workflow has finished."""
+    for run in runs:
+        run.cancel()
+
@@ -0,0 +1,301 @@
+"""
+Matrix core for batch pattern mining.
+
+Aligns every series of a cohort into one time x series array so that all
+driver/outcome pairs of a lookback window are scored together: vectorized
+standardization for Pearson, column-wise average ranks for Spearman,
+sliding-window slopes for stability, and p-values with multiple-testing
+correction over the whole batch. Shorter windows are suffix views of the
+longest one, so series are extracted and aligned only once.
+
+The batch functions mirror the pure-Python references in ``metrics``
+(same tie handling, zero-variance and short-series conventions).
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.special import stdtr
+
+if TYPE_CHECKING:
+    from .miner import SeriesPoint
+
+Correction = Literal["fdr_bh", "bonferroni", "none"]
+
+STABILITY_WINDOWS: tuple[int, ...] = (3, 6, 12)
+
+
+@dataclass(frozen=True)
+class SeriesMatrix:
+    """
+    Series aligned on the union of their dates.
+
+    ``values`` and ``adjusted`` are (dates x columns) arrays with NaN where a
+    series has no observation (or no seasonally adjusted value).
+    """
+
+    dates: tuple[date, ...]
+    columns: tuple[str, ...]
+    values: np.ndarray
+    adjusted: np.ndarray
+
+    @classmethod
+    def from_series(cls, series: Mapping[str, Sequence[SeriesPoint]]) -> SeriesMatrix:
+        """
+        Build the matrix from date-sorted series.
+
+        Duplicate dates keep the last point, as date-keyed alignment does.
+        """
+        dates = tuple(sorted({point.date for points in series.values() for point in points}))
+        index = {dt: i for i, dt in enumerate(dates)}
+        values = np.full((len(dates), len(series)), np.nan)
+        adjusted = np.full((len(dates), len(series)), np.nan)
+        for col, points in enumerate(series.values()):
+            for point in points:
+                row = index[point.date]
+                values[row, col] = point.value
+                adjusted[row, col] = (
+                    np.nan if point.seasonally_adjusted is None else point.seasonally_adjusted
+                )
+        return cls(dates, tuple(series), values, adjusted)
+
+    def since(self, start: date) -> SeriesMatrix:
+        """View of the rows dated on or after ``start`` (no copy)."""
+        first = bisect_left(self.dates, start)
+        return SeriesMatrix(
+            self.dates[first:], self.columns, self.values[first:], self.adjusted[first:]
+        )
+
+
+@dataclass(frozen=True)
+class PairScores:
+    """Scores for the drivers of one outcome in one window (``n == 0``: not scored)."""
+
+    drivers: tuple[str, ...]
+    effect: np.ndarray
+    n: np.ndarray
+    stability: np.ndarray
+    p_value: np.ndarray
+    seasonally_adjusted: np.ndarray
+
+    @property
+    def scored(self) -> np.ndarray:
+        """Mask of drivers with enough aligned observations."""
+        return self.n > 0
+
+
+def rank_columns(x: np.ndarray) -> np.ndarray:
+    """
+    1-based ranks of each column, averaging ties (see ``metrics._rank_values``).
+
+    Args:
+        x: (n, k) array without NaN
+
+    Returns:
+        (n, k) array of ranks
+    """
+    n = x.shape[0]
+    order = np.argsort(x, axis=0, kind="stable")
+    ordered = np.take_along_axis(x, order, axis=0)
+    position = np.broadcast_to(np.arange(n)[:, None], x.shape)
+
+    starts = np.ones(x.shape, dtype=bool)
+    starts[1:] = ordered[1:] != ordered[:-1]
+    ends = np.ones(x.shape, dtype=bool)
+    ends[:-1] = starts[1:]
+
+    first = np.maximum.accumulate(np.where(starts, position, 0), axis=0)
+    last = np.minimum.accumulate(np.where(ends, position, n)[::-1], axis=0)[::-1]
+
+    ranks = np.empty(x.shape)
+    np.put_along_axis(ranks, order, (first + last) / 2.0 + 1.0, axis=0)
+    return ranks
+
+
+def correlate_columns(
+    x: np.ndarray,
+    y: np.ndarray,
+    method: Literal["pearson", "spearman"] = "spearman",
+) -> np.ndarray:
+    """
+    Correlation of every column of ``x`` with ``y``, clamped to [-1, 1].
+
+    Constant columns (or a constant ``y``) score 0.0, as in ``metrics.pearson``.
+
+    Args:
+        x: (n, k) driver values
+        y: (n,) outcome values
+        method: "pearson" or "spearman"
+
+    Returns:
+        (k,) correlations
+    """
+    n, k = x.shape
+    if n < 2:
+        return np.zeros(k)
+    constant = np.ptp(x, axis=0) == 0.0
+    if np.ptp(y) == 0.0:
+        return np.zeros(k)
+    if method == "spearman":
+        x = rank_columns(x)
+        y = rank_columns(y[:, None])[:, 0]
+
+    xc = x - x.mean(axis=0)
+    yc = y - y.mean()
+    denom = np.sqrt((xc * xc).sum(axis=0) * (yc @ yc))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = (xc.T @ yc) / denom
+    r[constant | ~np.isfinite(r)] = 0.0
+    return np.clip(r, -1.0, 1.0)
+
+
+def stability_columns(
+    x: np.ndarray, windows: tuple[int, ...] = STABILITY_WINDOWS
+) -> np.ndarray:
+    """
+    ``metrics.stability`` for every column of ``x``.
+
+    Slopes of all overlapping windows come from strided views of the
+    column block, one matrix product per window size.
+
+    Returns:
+        (k,) stability scores in [0, 1]; 0.5 when the series is too short
+    """
+    n, k = x.shape
+    if n < max(windows):
+        return np.full(k, 0.5)
+
+    slopes = []
+    for w in windows:
+        t = np.arange(w, dtype=float)
+        t -= t.mean()
+        views = sliding_window_view(x, w, axis=0)  # (n - w + 1, k, w)
+        slopes.append(views @ t / (t @ t))
+    stacked = np.concatenate(slopes, axis=0)
+    if stacked.shape[0] < 2:
+        return np.full(k, 0.5)
+    variance_sum = ((stacked - stacked.mean(axis=0)) ** 2).sum(axis=0)
+    return np.clip(1.0 / (1.0 + variance_sum), 0.0, 1.0)
+
+
+def correlation_pvalues(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """
+    Two-sided p-values for correlations via the t-statistic with n - 2 df.
+
+    Pairs with fewer than three observations get p = 1.0.
+    """
+    r = np.asarray(r, dtype=float)
+    n = np.asarray(n, dtype=float)
+    df = n - 2.0
+    p = np.ones(np.broadcast(r, n).shape)
+    valid = df > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.abs(r) * np.sqrt(df / np.maximum(1.0 - r * r, 0.0))
+    exact = valid & (np.abs(r) >= 1.0)
+    p[exact] = 0.0
+    rest = valid & ~exact
+    p[rest] = 2.0 * stdtr(df[rest], -t[rest])
+    return np.clip(p, 0.0, 1.0)
+
+
+def adjust_pvalues(p: np.ndarray, method: Correction = "fdr_bh") -> np.ndarray:
+    """
+    Correct p-values for the number of tests in the batch.
+
+    "fdr_bh" returns Benjamini-Hochberg q-values, "bonferroni" multiplies
+    by the batch size. Ties are ordered by position, so results are
+    deterministic.
+    """
+    p = np.asarray(p, dtype=float)
+    m = p.size
+    if m == 0 or method == "none":
+        return p.copy()
+    if method == "bonferroni":
+        return np.minimum(p * m, 1.0)
+    if method != "fdr_bh":
+        raise ValueError(f"Unknown correction: {method}")
+    order = np.lexsort((np.arange(m), p))
+    scaled = p[order] * m / np.arange(1, m + 1)
+    q_sorted = np.minimum.accumulate(scaled[::-1])[::-1]
+    q = np.empty(m)
+    q[order] = np.minimum(q_sorted, 1.0)
+    return q
+
+
+def score_drivers(
+    matrix: SeriesMatrix,
+    outcome: str,
+    drivers: Iterable[str],
+    min_support: int,
+    method: Literal["pearson", "spearman"] = "spearman",
+) -> PairScores:
+    """
+    Score every driver against the outcome over the matrix rows.
+
+    Each pair uses the dates both series share. Seasonally adjusted values
+    are used when at least ``min_support`` shared dates carry them. Drivers
+    with the same row mask are scored as one block.
+
+    Returns:
+        PairScores aligned with ``drivers``; ``n`` is 0 for pairs with
+        fewer than ``min_support`` shared dates
+    """
+    names = tuple(drivers)
+    k = len(names)
+    effect = np.zeros(k)
+    n_used = np.zeros(k, dtype=int)
+    stability = np.full(k, 0.5)
+    p_value = np.ones(k)
+    used_sa = np.zeros(k, dtype=bool)
+    if k == 0:
+        return PairScores(names, effect, n_used, stability, p_value, used_sa)
+
+    index = {name: i for i, name in enumerate(matrix.columns)}
+    o = index[outcome]
+    cols = np.array([index[name] for name in names])
+    raw_mask = ~np.isnan(matrix.values[:, cols]) & ~np.isnan(matrix.values[:, [o]])
+    sa_mask = ~np.isnan(matrix.adjusted[:, cols]) & ~np.isnan(matrix.adjusted[:, [o]])
+    raw_n = raw_mask.sum(axis=0)
+    sa_n = sa_mask.sum(axis=0)
+
+    eligible = raw_n >= min_support
+    used_sa[:] = eligible & (sa_n >= min_support)
+
+    groups: dict[tuple[bool, bytes], list[int]] = {}
+    for j in np.flatnonzero(eligible):
+        mask = sa_mask[:, j] if used_sa[j] else raw_mask[:, j]
+        groups.setdefault((bool(used_sa[j]), mask.tobytes()), []).append(int(j))
+
+    for (sa, _), members in groups.items():
+        source = matrix.adjusted if sa else matrix.values
+        mask = (sa_mask if sa else raw_mask)[:, members[0]]
+        x = source[mask][:, cols[members]]
+        y = source[mask, o]
+        effect[members] = correlate_columns(x, y, method)
+        stability[members] = stability_columns(x)
+        n_used[members] = x.shape[0]
+
+    scored = n_used > 0
+    p_value[scored] = correlation_pvalues(effect[scored], n_used[scored])
+    return PairScores(names, effect, n_used, stability, p_value, used_sa)
+
+
+__all__ = [
+    "Correction",
+    "PairScores",
+    "STABILITY_WINDOWS",
+    "SeriesMatrix",
+    "adjust_pvalues",
+    "correlate_columns",
+    "correlation_pvalues",
+    "rank_columns",
+    "score_drivers",
+    "stability_columns",
+]
@@ -9,13 +9,18 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, timedelta
+from functools import lru_cache
 from typing import Literal
 
+import numpy as np
+
 from ..data.deterministic.models import QueryResult
 from . import metrics
+from .matrix import Correction, PairScores, SeriesMatrix, adjust_pvalues, score_drivers
 
 # Type definitions for domain vocabulary
 Window = Literal[3, 6, 12, 24]
+VALID_WINDOWS: tuple[int, ...] = (3, 6, 12, 24)
 Outcome = Literal["retention_rate", "qatarization_rate"]
 Driver = Literal[
     "avg_salary",
@@ -26,6 +31,19 @@ Driver = Literal[
 ]
 
 
+_VALUE_FIELDS = ("value", "rate", "salary", "retention_rate", "qatarization_rate")
+_SA_FIELDS = ("value_sa", "seasonally_adjusted", "season_adjusted", "sa_value")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date | None:
+    """Parse an ISO date, memoized since cohorts share the same calendar."""
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
 @dataclass(frozen=True)
 class SeriesPoint:
     """Represents a single time-series observation."""
@@ -96,6 +114,8 @@ class PatternFinding:
     cohort: str  # e.g., sector or band label
     n: int  # number of observations used for effect
     seasonally_adjusted: bool = False  # True when SA series powered the effect
+    p_value: float | None = None  # two-sided test of zero correlation
+    q_value: float | None = None  # p-value corrected across the mined batch
 
 
 class PatternMiner:
@@ -103,7 +123,10 @@ class PatternMiner:
     Deterministic pattern mining engine.
 
     Extracts and ranks driver-outcome relationships across cohorts and time windows.
-    All computations are reproducible and bounded in complexity.
+    All computations are reproducible and bounded in complexity. Each mining
+    call scores its drivers, cohorts and windows as one batch on aligned
+    series matrices (see ``patterns.matrix``) and corrects the resulting
+    p-values for the size of that batch.
     """
 
     def __init__(
@@ -111,6 +134,8 @@ class PatternMiner:
         flat_threshold: float = 0.15,
         nonlinear_threshold: float = 0.3,
         max_cohorts: int = 30,
+        correction: Correction = "fdr_bh",
+        max_q_value: float | None = None,
     ):
         """
         Initialize pattern miner with classification thresholds.
@@ -119,10 +144,16 @@ class PatternMiner:
             flat_threshold: |effect| below this is classified as "flat"
             nonlinear_threshold: effect variance above this suggests nonlinearity
             max_cohorts: Maximum cohorts to process (safety limit)
+            correction: Multiple-testing correction applied per batch
+                ("fdr_bh", "bonferroni" or "none")
+            max_q_value: Drop findings whose corrected p-value exceeds this
+                (None keeps all non-flat findings)
         """
         self.flat_threshold = flat_threshold
         self.nonlinear_threshold = nonlinear_threshold
         self.max_cohorts = max_cohorts
+        self.correction = correction
+        self.max_q_value = max_q_value
 
     def mine_stable_relations(
         self,
@@ -145,78 +176,41 @@ class PatternMiner:
             List of PatternFinding objects, ranked by strength
         """
         start_date = end_date - timedelta(days=spec.window * 30)
-        findings: list[PatternFinding] = []
 
         # Get outcome time series
         outcome_result = timeseries_data.get(spec.outcome)
         if not outcome_result or not outcome_result.rows:
-            return findings
+            return []
 
         outcome_series = self._extract_series(
             outcome_result, start_date, end_date, spec.sector
         )
 
         if len(outcome_series) < spec.min_support:
-            return findings
+            return []
 
-        # Analyze each driver
+        series: dict[str, list[SeriesPoint]] = {spec.outcome: outcome_series}
+        drivers: list[str] = []
         for driver in spec.drivers:
             driver_result = timeseries_data.get(driver)
             if not driver_result or not driver_result.rows:
                 continue
 
-            driver_series = self._extract_series(
-                driver_result, start_date, end_date, spec.sector
-            )
-
-            if not driver_series:
-                continue
-
-            aligned = self._align_series(driver_series, outcome_series)
-            if aligned.count < spec.min_support:
-                continue
-
-            aligned_driver, aligned_outcome, used_sa = aligned.select_for_effect(
-                spec.min_support
-            )
-
-            if len(aligned_driver) < spec.min_support:
-                continue
-
-            # Compute effect size
-            if spec.method == "pearson":
-                effect = metrics.pearson(aligned_driver, aligned_outcome)
-            else:
-                effect = metrics.spearman(aligned_driver, aligned_outcome)
-            effect = max(-1.0, min(1.0, effect))
-
-            # Compute quality metrics
-            support_score = metrics.support(len(aligned_driver), spec.min_support)
-            stability_score = metrics.stability(aligned_driver)
-
-            # Classify direction
-            direction = self._classify_direction(effect)
-
-            # Only include non-flat patterns
-            if direction != "flat":
-                finding = PatternFinding(
-                    driver=driver,
-                    effect=effect,
-                    support=support_score,
-                    stability=stability_score,
-                    direction=direction,
-                    cohort=spec.sector or "all",
-                    n=len(aligned_driver),
-                    seasonally_adjusted=used_sa,
+            if driver not in series:
+                series[driver] = self._extract_series(
+                    driver_result, start_date, end_date, spec.sector
                 )
-                findings.append(finding)
-
-        # Rank by (support, stability, |effect|) descending + deterministic tie-breaker
-        findings.sort(
-            key=lambda f: (-f.support, -f.stability, -abs(f.effect), f.driver)
+            if series[driver]:
+                drivers.append(driver)
+
+        scores = score_drivers(
+            SeriesMatrix.from_series(series),
+            spec.outcome,
+            drivers,
+            spec.min_support,
+            spec.method,
         )
-
-        return findings
+        return self._rank_batch([(spec.sector or "all", scores)], spec.min_support)
 
     def mine_seasonal_effects(
         self,
@@ -336,66 +330,126 @@ class PatternMiner:
         Returns:
             List of findings across cohorts/windows, ranked by strength
         """
-        findings: list[PatternFinding] = []
-
-        # Limit cohorts for safety
-        cohorts_to_scan = cohorts[: self.max_cohorts]
+        return self.screen_drivers_across_cohorts(
+            [driver], outcome, cohorts, end_date, windows, timeseries_data, min_support
+        )
 
-        for cohort in cohorts_to_scan:
-            cohort_data = timeseries_data.get(cohort, {})
-            outcome_result = cohort_data.get(outcome)
-            driver_result = cohort_data.get(driver)
+    def screen_drivers_across_cohorts(
+        self,
+        drivers: list[str],
+        outcome: str,
+        cohorts: list[str],
+        end_date: date,
+        windows: list[int],
+        timeseries_data: dict[str, dict[str, QueryResult]],
+        min_support: int,
+        method: Literal["pearson", "spearman"] = "spearman",
+    ) -> list[PatternFinding]:
+        """
+        Screen many drivers vs outcome across cohorts and windows in one batch.
 
-            if not outcome_result or not driver_result:
-                continue
+        Series are extracted once per cohort for the longest window and
+        aligned into a matrix; shorter windows are views of it. Corrected
+        p-values account for every driver/cohort/window test in the batch.
 
-            for window in windows:
-                if window not in [3, 6, 12, 24]:
-                    continue  # Only valid windows
+        Args:
+            drivers: Driver variables to screen
+            outcome: Outcome variable
+            cohorts: List of cohort labels (e.g., sectors)
+            end_date: Analysis end date
+            windows: List of lookback windows in months
+            timeseries_data: Nested map: cohort -> variable -> QueryResult
+            min_support: Minimum observations
+            method: Correlation method (Spearman is robust to outliers)
 
-                start_date = end_date - timedelta(days=window * 30)
+        Returns:
+            List of findings across cohorts/windows, ranked by strength
+        """
+        valid_windows = [w for w in windows if w in VALID_WINDOWS]
+        if not valid_windows:
+            return []
+        history_start = end_date - timedelta(days=max(valid_windows) * 30)
 
-                outcome_series = self._extract_series(
-                    outcome_result, start_date, end_date, None
-                )
-                driver_series = self._extract_series(
-                    driver_result, start_date, end_date, None
-                )
+        batch: list[tuple[str, PairScores]] = []
 
-                if not outcome_series or not driver_series:
-                    continue
+        # Limit cohorts for safety
+        for cohort in cohorts[: self.max_cohorts]:
+            cohort_data = timeseries_data.get(cohort, {})
+            outcome_result = cohort_data.get(outcome)
+            if not outcome_result:
+                continue
 
-                aligned = self._align_series(driver_series, outcome_series)
-                if aligned.count < min_support:
+            series = {
+                outcome: self._extract_series(outcome_result, history_start, end_date, None)
+            }
+            available: list[str] = []
+            for driver in drivers:
+                driver_result = cohort_data.get(driver)
+                if not driver_result:
                     continue
+                if driver not in series:
+                    series[driver] = self._extract_series(
+                        driver_result, history_start, end_date, None
+                    )
+                available.append(driver)
+            if not available:
+                continue
 
-                aligned_driver, aligned_outcome, used_sa = aligned.select_for_effect(
-                    min_support
+            matrix = SeriesMatrix.from_series(series)
+            for window in valid_windows:
+                window_start = end_date - timedelta(days=window * 30)
+                scores = score_drivers(
+                    matrix.since(window_start), outcome, available, min_support, method
                 )
+                batch.append((f"{cohort}_w{window}", scores))
 
-                if len(aligned_driver) < min_support:
-                    continue
+        return self._rank_batch(batch, min_support)
 
-                # Compute Spearman (robust to outliers)
-                effect = metrics.spearman(aligned_driver, aligned_outcome)
-                effect = max(-1.0, min(1.0, effect))
-                support_score = metrics.support(len(aligned_driver), min_support)
-                stability_score = metrics.stability(aligned_driver)
+    def _rank_batch(
+        self,
+        batch: list[tuple[str, PairScores]],
+        min_support: int,
+    ) -> list[PatternFinding]:
+        """
+        Turn scored pairs into ranked findings.
 
-                direction = self._classify_direction(effect)
+        Applies the multiple-testing correction over every scored pair of the
+        batch, drops flat (and, if configured, non-significant) patterns, and
+        ranks by (support, stability, |effect|) with a deterministic
+        tie-breaker.
+        """
+        p_values = [scores.p_value[scores.scored] for _, scores in batch]
+        q_values = adjust_pvalues(
+            np.concatenate(p_values) if p_values else np.empty(0), self.correction
+        )
 
-                if direction != "flat":
-                    finding = PatternFinding(
-                        driver=driver,  # type: ignore[arg-type]
+        findings: list[PatternFinding] = []
+        offset = 0
+        for cohort, scores in batch:
+            for j in np.flatnonzero(scores.scored):
+                q_value = float(q_values[offset])
+                offset += 1
+                effect = float(scores.effect[j])
+                direction = self._classify_direction(effect)
+                if direction == "flat":
+                    continue
+                if self.max_q_value is not None and q_value > self.max_q_value:
+                    continue
+                n = int(scores.n[j])
+                findings.append(
+                    PatternFinding(
+                        driver=scores.drivers[j],  # type: ignore[arg-type]
                         effect=effect,
-                        support=support_score,
-                        stability=stability_score,
+                        support=metrics.support(n, min_support),
+                        stability=float(scores.stability[j]),
                         direction=direction,
-                        cohort=f"{cohort}_w{window}",
-                        n=len(aligned_driver),
-                        seasonally_adjusted=used_sa,
+                        cohort=cohort,
+                        n=n,
+                        seasonally_adjusted=bool(scores.seasonally_adjusted[j]),
+                        p_value=float(scores.p_value[j]),
+                        q_value=q_value,
                     )
-                    findings.append(finding)
+                )
 
         findings.sort(
             key=lambda f: (-f.support, -f.stability, -abs(f.effect), f.driver)
@@ -425,22 +479,21 @@ class PatternMiner:
         series: list[tuple[date, SeriesPoint]] = []
 
         for row in result.rows:
-            date_str = row.data.get("date") or row.data.get("month")
+            data = row.data
+            date_str = data.get("date") or data.get("month")
             if not date_str:
                 continue
 
-            if sector is not None and row.data.get("sector") != sector:
+            if sector is not None and data.get("sector") != sector:
+                continue
+
+            dt = _parse_date(str(date_str))
+            if dt is None or not start_date <= dt <= end_date:
                 continue
 
             value_field = None
-            for candidate in (
-                "value",
-                "rate",
-                "salary",
-                "retention_rate",
-                "qatarization_rate",
-            ):
-                if row.data.get(candidate) is not None:
+            for candidate in _VALUE_FIELDS:
+                if data.get(candidate) is not None:
                     value_field = candidate
                     break
 
@@ -448,42 +501,30 @@ class PatternMiner:
                 continue
 
             try:
-                value = float(row.data[value_field])
+                value = float(data[value_field])
             except (TypeError, ValueError):
                 continue
 
             # Seasonally adjusted variants (value_sa, {field}_sa, etc.)
             sa_value = None
-            sa_candidates = []
-            if value_field:
-                sa_candidates.append(f"{value_field}_sa")
-            sa_candidates.extend(
-                ["value_sa", "seasonally_adjusted", "season_adjusted", "sa_value"]
-            )
-            for sa_field in sa_candidates:
-                if sa_field in row.data and row.data[sa_field] is not None:
+            for sa_field in (f"{value_field}_sa", *_SA_FIELDS):
+                if data.get(sa_field) is not None:
                     try:
-                        sa_value = float(row.data[sa_field])
+                        sa_value = float(data[sa_field])
                         break
                     except (TypeError, ValueError):
                         sa_value = None
 
-            try:
-                dt = date.fromisoformat(str(date_str))
-            except (ValueError, TypeError):
-                continue
-
-            if start_date <= dt <= end_date:
-                series.append(
-                    (
-                        dt,
-                        SeriesPoint(
-                            date=dt,
-                            value=value,
-                            seasonally_adjusted=sa_value,
-                        ),
-                    )
+            series.append(
+                (
+                    dt,
+                    SeriesPoint(
+                        date=dt,
+                        value=value,
+                        seasonally_adjusted=sa_value,
+                    ),
                 )
+            )
 
         series.sort(key=lambda x: x[0])
         return [point for _, point in series]
@@ -0,0 +1,244 @@
+"""
+Benchmark for the pooled async API transport.
+
+Pulls 20 World Bank indicators for all six GCC countries (120 requests)
+from a local mock server with a fixed response latency, once through
+``UDCGlobalDataIntegrator.get_multiple_indicators`` (pooled per-host
+client, concurrent fan-out under the host budget) and once through the
+previous path: serial requests, a fresh ``httpx.Client`` per country and a
+0.1 s pause after each. Both must return the same frames.
+
+``run_cache_benchmark`` repeats the pull through the on-disk response cache:
+cold (every request a miss), warm (served from disk) and after expiry
+(conditional requests answered with 304, frames reused from snapshots).
+
+Run: ``python -m src.qnwis.perf.api_bench``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from src.data.apis._cache import CachePolicy, ResponseCache
+from src.data.apis._http import send_with_retry
+from src.data.apis._transport import AsyncTransport, HostBudget
+from src.data.apis.world_bank import UDCGlobalDataIntegrator, _client
+
+GCC_COUNTRIES = ["QAT", "SAU", "ARE", "KWT", "BHR", "OMN"]
+INDICATORS = [
+    *UDCGlobalDataIntegrator.QATAR_ECONOMIC_INDICATORS,
+    *UDCGlobalDataIntegrator.TOURISM_INDICATORS,
+    *UDCGlobalDataIntegrator.LABOR_INDICATORS,
+    "SP.POP.TOTL",
+    "NY.GDP.PCAP.CD",
+    "FP.CPI.TOTL.ZG",
+    "SL.UEM.TOTL.FE.ZS",
+    "SL.TLF.CACT.FE.ZS",
+    "SE.TER.ENRR",
+    "GC.DOD.TOTL.GD.ZS",
+    "NE.EXP.GNFS.ZS",
+    "NE.IMP.GNFS.ZS",
+]
+
+
+def indicator_payload(country: str, indicator: str, date: str) -> list[Any]:
+    """World Bank-shaped ``[metadata, rows]`` with deterministic values."""
+    start, _, end = date.partition(":")
+    years = range(int(start), int(end or start) + 1)
+    seed = sum(map(ord, country + indicator))
+    rows = [
+        {
+            "date": str(year),
+            "value": round(seed * 1.5 + year % 100, 2),
+            "indicator": {"id": indicator, "value": f"Indicator {indicator}"},
+            "country": {"id": country, "value": country},
+        }
+        for year in years
+    ]
+    return [{"page": 1, "pages": 1, "per_page": 100, "total": len(rows)}, rows]
+
+
+@contextmanager
+def mock_world_bank(latency_s: float = 0.02) -> Iterator[str]:
+    """Serve the indicator endpoint on localhost (with ETags); yields the base URL."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server naming
+            parts = urlsplit(self.path)
+            segments = parts.path.strip("/").split("/")  # v2/country/QAT/indicator/X
+            query = parse_qs(parts.query)
+            body = json.dumps(
+                indicator_payload(segments[2], segments[4], query.get("date", ["2018:2023"])[0])
+            ).encode()
+            etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+            time.sleep(latency_s)
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/v2"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def legacy_get_indicator(base_url: str, indicator: str, countries: list[str], date: str) -> pd.DataFrame:
+    """The previous serial loop, kept as parity reference."""
+    records: list[dict[str, Any]] = []
+    for country in countries:
+        with _client() as client:
+            response, _ = send_with_retry(
+                client,
+                "GET",
+                f"{base_url}/country/{country}/indicator/{indicator}",
+                params={"format": "json", "date": date, "per_page": 100},
+                max_retries=3,
+            )
+            data = response.json()
+            if len(data) > 1 and data[1]:
+                for record in data[1]:
+                    if record.get("value") is not None:
+                        records.append(
+                            {
+                                "country": country,
+                                "year": int(record["date"]),
+                                "value": float(record["value"]),
+                                "indicator": indicator,
+                                "indicator_name": record.get("indicator", {}).get("value", ""),
+                            }
+                        )
+        time.sleep(0.1)
+    return pd.DataFrame(records)
+
+
+def run_benchmark(
+    latency_s: float = 0.02, budget: HostBudget | None = None
+) -> dict[str, Any]:
+    """
+    Pull the GCC-wide indicator set through both paths.
+
+    Returns:
+        Seconds per path, request count and whether the frames match
+    """
+    with mock_world_bank(latency_s) as base_url, tempfile.TemporaryDirectory() as tmp:
+        transport = AsyncTransport(
+            default_budget=budget or HostBudget(max_concurrency=8, requests_per_second=50.0)
+        )
+        integrator = UDCGlobalDataIntegrator(output_dir=Path(tmp), transport=transport)
+        integrator.base_url = base_url
+
+        start = time.perf_counter()
+        pooled = integrator.get_multiple_indicators(INDICATORS, GCC_COUNTRIES, 2018, 2023)
+        pooled_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        legacy = {}
+        for indicator in INDICATORS:
+            legacy[indicator] = legacy_get_indicator(base_url, indicator, GCC_COUNTRIES, "2018:2023")
+            time.sleep(0.1)
+        legacy_s = time.perf_counter() - start
+
+    frames_match = pooled.keys() == legacy.keys() and all(
+        pooled[key].reset_index(drop=True).equals(legacy[key]) for key in legacy
+    )
+    return {
+        "requests": len(INDICATORS) * len(GCC_COUNTRIES),
+        "pooled_s": pooled_s,
+        "legacy_s": legacy_s,
+        "speedup": legacy_s / pooled_s,
+        "frames_match": frames_match,
+    }
+
+
+def run_cache_benchmark(latency_s: float = 0.02) -> dict[str, Any]:
+    """
+    Pull the indicator set cold, warm and after expiry through the response cache.
+
+    Returns:
+        Seconds per pass, cache counters and whether every pass returned the same frames
+    """
+    now = [time.time()]
+    with mock_world_bank(latency_s) as base_url, tempfile.TemporaryDirectory() as tmp:
+        cache = ResponseCache(
+            Path(tmp) / "cache",
+            policies={},
+            default_policy=CachePolicy(max_age=3600),
+            clock=lambda: now[0],
+        )
+        transport = AsyncTransport(
+            default_budget=HostBudget(max_concurrency=8, requests_per_second=50.0), cache=cache
+        )
+        integrator = UDCGlobalDataIntegrator(output_dir=Path(tmp), transport=transport)
+        integrator.base_url = base_url
+
+        timings: dict[str, float] = {}
+        frames = []
+        for label in ("cold_s", "warm_s", "revalidated_s"):
+            if label == "revalidated_s":
+                now[0] += 7200
+            start = time.perf_counter()
+            frames.append(integrator.get_multiple_indicators(INDICATORS, GCC_COUNTRIES, 2018, 2023))
+            timings[label] = time.perf_counter() - start
+
+    first = frames[0]
+    frames_match = all(
+        other.keys() == first.keys() and all(other[k].equals(first[k]) for k in first)
+        for other in frames[1:]
+    )
+    return {
+        "requests": len(INDICATORS) * len(GCC_COUNTRIES),
+        **timings,
+        **cache.stats_snapshot(),
+        "frames_match": frames_match,
+    }
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in {**run_benchmark(), **run_cache_benchmark()}.items():
+        print(f"{key:>14}: {value:,.2f}" if isinstance(value, float) else f"{key:>14}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = [
+    "GCC_COUNTRIES",
+    "INDICATORS",
+    "indicator_payload",
+    "legacy_get_indicator",
+    "mock_world_bank",
+    "run_benchmark",
+    "run_cache_benchmark",
+]
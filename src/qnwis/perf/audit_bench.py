@@ -0,0 +1,158 @@
+"""
+Benchmark for sustained audit-trail indexing under concurrent workflows.
+
+Each workflow thread indexes a stream of audit manifests and periodically
+searches the index, as verify nodes and the audit CLI do. Three paths are
+compared on the same database schema:
+
+- ``legacy``: a new ``sqlite3`` connection and a commit per manifest
+- ``pooled``: ``SQLiteAuditTrailStore`` with per-thread connections
+- ``write_behind``: pooled store with group commits
+
+Run: ``python -m src.qnwis.perf.audit_bench``
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..verification.audit_store import (
+    CONNECTION_PRAGMAS,
+    SQLiteAuditTrailStore,
+    _ManifestRecord,
+    _write_records,
+    close_audit_stores,
+)
+from ..verification.audit_trail import AuditManifest
+
+AGENTS = ("labour_economist", "pattern_detective", "nationalization", "skills", "alert_center")
+
+
+def synthetic_manifest(workflow: int, seq: int, base: datetime | None = None) -> AuditManifest:
+    """Audit manifest shaped like a verify-node run."""
+    base = base or datetime(2025, 1, 1, tzinfo=UTC)
+    audit_id = f"wf{workflow:02d}-{seq:05d}"
+    query_ids = [f"q_{(seq + k) % 40:02d}" for k in range(4)]
+    return AuditManifest(
+        audit_id=audit_id,
+        created_at=(base + timedelta(seconds=workflow * 100_000 + seq)).isoformat(),
+        request_id=f"req-{workflow:02d}-{seq // 5:04d}",
+        registry_version="v1.0",
+        code_version="bench",
+        data_sources=["qnwis_labor", "wb_labor"],
+        query_ids=query_ids,
+        freshness={"qnwis_labor": "2024-12-31", "wb_labor": "2024-12-31"},
+        citations={"ok": True, "total_numbers": 12, "cited_numbers": 12},
+        verification={"ok": seq % 7 != 0, "issues_count": seq % 3, "stats": {"L2/ok": 5}},
+        orchestration={
+            "routing": "bench",
+            "agents": [AGENTS[seq % len(AGENTS)], AGENTS[(seq + workflow) % len(AGENTS)]],
+            "confidence": {"score": 40 + (seq * 7) % 60, "band": "MEDIUM"},
+        },
+        reproducibility={"snippet": "# replay", "params_hash": "x" * 16},
+        pack_root=f"/tmp/audit_packs/{audit_id}",
+        digest_sha256="a" * 64,
+    )
+
+
+def legacy_upsert(db_path: Path, manifest: AuditManifest) -> None:
+    """Connect-per-call upsert with its own commit, as the store used to."""
+    with sqlite3.connect(str(db_path), timeout=30.0) as conn:
+        for pragma in CONNECTION_PRAGMAS[:2]:
+            conn.execute(pragma)
+        _write_records(conn, [_ManifestRecord(manifest)])
+    conn.close()
+
+
+def _run_workflows(
+    write: Any,
+    search: Any,
+    workflows: int,
+    per_workflow: int,
+    search_every: int,
+) -> float:
+    barrier = threading.Barrier(workflows + 1)
+    errors: list[BaseException] = []
+
+    def workflow(index: int) -> None:
+        try:
+            barrier.wait()
+            for seq in range(per_workflow):
+                write(synthetic_manifest(index, seq))
+                if search_every and seq % search_every == search_every - 1:
+                    search(index, seq)
+        except BaseException as exc:  # pragma: no cover - surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=workflow, args=(i,)) for i in range(workflows)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        raise errors[0]
+    return elapsed
+
+
+def run_benchmark(
+    workflows: int = 8,
+    per_workflow: int = 250,
+    search_every: int = 25,
+) -> dict[str, Any]:
+    """
+    Index ``workflows * per_workflow`` manifests per path and report throughput.
+
+    Returns:
+        Manifests per second for each path and the row counts written
+    """
+    total = workflows * per_workflow
+    results: dict[str, Any] = {"workflows": workflows, "manifests": total}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("legacy", "pooled", "write_behind"):
+            db_path = Path(tmp) / f"{mode}.db"
+            store = SQLiteAuditTrailStore(str(db_path), write_behind=mode == "write_behind")
+
+            def search(index: int, seq: int, store: SQLiteAuditTrailStore = store) -> None:
+                store.search(query_id=f"q_{seq % 40:02d}", limit=10)
+                store.search(agent=AGENTS[index % len(AGENTS)], min_confidence=80, limit=10)
+
+            if mode == "legacy":
+                def write(manifest: AuditManifest, db_path: Path = db_path) -> None:
+                    legacy_upsert(db_path, manifest)
+            else:
+                write = store.upsert
+
+            elapsed = _run_workflows(write, search, workflows, per_workflow, search_every)
+            start = time.perf_counter()
+            store.flush()  # queued manifests count toward the run
+            elapsed_total = elapsed + time.perf_counter() - start
+            count = len(store.search(limit=total + 1))
+            results[f"{mode}_per_s"] = total / elapsed_total if elapsed_total else float("inf")
+            results[f"{mode}_rows"] = count
+            store.close()
+        close_audit_stores()
+
+    results["speedup"] = results["write_behind_per_s"] / results["legacy_per_s"]
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in run_benchmark().items():
+        print(f"{key:>18}: {value:,.1f}" if isinstance(value, float) else f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["legacy_upsert", "run_benchmark", "synthetic_manifest"]
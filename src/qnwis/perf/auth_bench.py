@@ -0,0 +1,163 @@
+"""
+Benchmark for per-request authentication overhead.
+
+Compares the previous code paths with the cached ones in ``security.auth``:
+
+- jwt: full signature verification per request vs. the verified-token cache
+- bad_key: a client retrying a few unknown API keys, one Redis GET per attempt
+  vs. the negative cache
+- listing: ``SCAN`` plus one ``GET`` per key vs. pipelined ``MGET`` batches
+
+Redis is fakeredis with a fixed per-command round-trip delay. Reports mean
+microseconds per request (per listing for ``listing``) and Redis round-trips.
+
+Run: ``python -m src.qnwis.perf.auth_bench``
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+from ..security.auth import (
+    API_KEY_PREFIX,
+    ApiKeyRecord,
+    ApiKeyStore,
+    AuthProvider,
+    JWTConfig,
+    Principal,
+    _hash_key,
+    decode_jwt,
+)
+from .ratelimit_bench import latent_redis
+
+SALT = "bench-salt"
+
+
+def legacy_authenticate_jwt(config: JWTConfig, token: str) -> Principal:
+    """The previous ``AuthProvider.authenticate_jwt``, kept as reference."""
+    payload = decode_jwt(
+        token,
+        config.secret,
+        algorithms=[config.algorithm],
+        audience=config.audience,
+        issuer=config.issuer,
+        leeway=config.leeway_seconds,
+    )
+    roles = tuple(payload.roles) if payload.roles else ("analyst",)
+    return Principal(
+        subject=payload.sub, roles=roles, ratelimit_id=payload.ratelimit_id or payload.sub
+    )
+
+
+def legacy_resolve(redis: Any, records: dict[str, ApiKeyRecord], candidate: str) -> Principal:
+    """The previous ``ApiKeyStore.resolve`` lookup, kept as reference."""
+    key_hash = _hash_key(candidate, SALT)
+    record = records.get(key_hash)
+    if not record:
+        blob = redis.get(f"{API_KEY_PREFIX}{key_hash}")
+        if blob:
+            record = ApiKeyStore._deserialize(blob)
+            records[key_hash] = record
+    if not record:
+        raise ValueError("Invalid API key")
+    return record.principal
+
+
+def legacy_list(redis: Any) -> list[ApiKeyRecord]:
+    """The previous ``ApiKeyStore.list_records`` Redis path, kept as reference."""
+    records = []
+    for raw_key in redis.scan_iter(match=f"{API_KEY_PREFIX}*"):
+        blob = redis.get(raw_key)
+        if blob:
+            records.append(ApiKeyStore._deserialize(blob))
+    return records
+
+
+def _per_call(fn: Callable[[int], Any], calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        try:
+            fn(i)
+        except ValueError:
+            pass
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def run_benchmark(
+    requests: int = 2000,
+    tokens: int = 50,
+    bad_keys: int = 10,
+    n_keys: int = 500,
+    rtt_s: float = 0.0002,
+) -> dict[str, dict[str, float]]:
+    """
+    Time the legacy and cached paths.
+
+    Returns:
+        Per scenario: legacy/cached microseconds and Redis round-trips per call
+    """
+    config = JWTConfig(secret="bench-secret-of-at-least-32-bytes!")
+    provider = AuthProvider(jwt_config=config, salt=SALT, env={})
+    jwts = [provider.create_token(f"user{i}", ["analyst"]) for i in range(tokens)]
+    results: dict[str, dict[str, float]] = {
+        "jwt": {
+            "legacy_us": _per_call(
+                lambda i: legacy_authenticate_jwt(config, jwts[i % tokens]), requests
+            ),
+            "cached_us": _per_call(lambda i: provider.authenticate_jwt(jwts[i % tokens]), requests),
+        }
+    }
+
+    redis = latent_redis(rtt_s, blocking=True)
+    counter = type(redis)
+    store = ApiKeyStore(salt=SALT, redis_client=redis)
+    try:
+        candidates = [f"wrong-{i}" for i in range(bad_keys)]
+        records: dict[str, ApiKeyRecord] = {}
+        counter.round_trips = 0
+        legacy_us = _per_call(
+            lambda i: legacy_resolve(redis, records, candidates[i % bad_keys]), requests
+        )
+        legacy_trips = counter.round_trips
+        counter.round_trips = 0
+        cached_us = _per_call(lambda i: store.resolve(candidates[i % bad_keys]), requests)
+        results["bad_key"] = {
+            "legacy_us": legacy_us,
+            "cached_us": cached_us,
+            "legacy_round_trips": legacy_trips / requests,
+            "cached_round_trips": counter.round_trips / requests,
+        }
+
+        principal = Principal(subject="svc", roles=("analyst",))
+        for i in range(n_keys):
+            store.add_key(plaintext=f"key-{i}", principal=principal)
+        counter.round_trips = 0
+        legacy_us = _per_call(lambda _: legacy_list(redis), 3)
+        legacy_trips = counter.round_trips / 3
+        counter.round_trips = 0
+        cached_us = _per_call(lambda _: store.list_records(), 3)
+        results["listing"] = {
+            "legacy_us": legacy_us,
+            "cached_us": cached_us,
+            "legacy_round_trips": legacy_trips,
+            "cached_round_trips": counter.round_trips / 3,
+        }
+    finally:
+        store.close()
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(label)
+        for key, value in stats.items():
+            print(f"  {key:>20}: {value:,.2f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["legacy_authenticate_jwt", "legacy_list", "legacy_resolve", "run_benchmark"]
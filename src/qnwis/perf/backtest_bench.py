@@ -0,0 +1,124 @@
+"""
+Benchmark for the one-pass baseline backtest.
+
+Compares ``choose_baseline`` (all four baselines through
+``backtest_baselines``) with the previous per-fold refit, which sliced the
+history and re-ran each baseline for every origin (O(n^2) per method), on a
+synthetic monthly series.
+
+Run: ``python -m src.qnwis.perf.backtest_bench``
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from typing import Any
+
+import numpy as np
+
+from ..forecast.backtest import (
+    DEFAULT_MIN_TRAIN,
+    EPSILON,
+    ForecastFn,
+    _clean_series,
+    baseline_methods,
+    choose_baseline,
+)
+
+
+def legacy_rolling_origin_backtest(
+    series: list[float],
+    method: ForecastFn,
+    horizon: int = 1,
+    min_train: int = DEFAULT_MIN_TRAIN,
+    **method_kwargs: Any,
+) -> dict[str, float]:
+    """The previous refit-per-fold backtest, kept as parity reference."""
+    clean_series = _clean_series(series)
+    if len(clean_series) < min_train + horizon:
+        return {"mae": float("nan"), "mape": float("nan"), "rmse": float("nan"), "n": 0}
+
+    errors: list[float] = []
+    abs_pct_errors: list[float] = []
+    squared_errors: list[float] = []
+    for t in range(min_train, len(clean_series) - horizon + 1):
+        train = clean_series[:t]
+        actual = clean_series[t : t + horizon]
+        try:
+            forecast = method(train, horizon=horizon, **method_kwargs)
+        except Exception:
+            continue
+        if not forecast or forecast[0] is None:
+            continue
+        yhat = forecast[0]
+        y = actual[0]
+        if not math.isfinite(yhat) or not math.isfinite(y):
+            continue
+        error = y - yhat
+        errors.append(abs(error))
+        squared_errors.append(error**2)
+        abs_pct_errors.append(abs(error) / max(EPSILON, abs(y)) * 100.0)
+
+    if not errors:
+        return {"mae": float("nan"), "mape": float("nan"), "rmse": float("nan"), "n": 0}
+    mae = sum(errors) / len(errors)
+    rmse = math.sqrt(sum(squared_errors) / len(squared_errors))
+    mape = sum(abs_pct_errors) / len(abs_pct_errors) if abs_pct_errors else float("nan")
+    return {
+        "mae": round(mae, 4),
+        "mape": round(mape, 4) if math.isfinite(mape) else float("nan"),
+        "rmse": round(rmse, 4),
+        "n": len(errors),
+    }
+
+
+def synthetic_series(n: int, seed: int = 7) -> list[float]:
+    """Trend + annual seasonality + noise, like a monthly LMIS indicator."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    values = 100.0 + 0.05 * t + 8.0 * np.sin(2 * np.pi * t / 12) + rng.normal(0, 2.0, n)
+    return values.tolist()
+
+
+def run_benchmark(n_points: int = 10_000, season: int = 12) -> dict[str, Any]:
+    """
+    Time method selection over ``n_points`` with both backtest engines.
+
+    Returns:
+        Seconds for each engine, speedup, and whether all leaderboard
+        metrics matched exactly
+    """
+    series = synthetic_series(n_points)
+
+    start = time.perf_counter()
+    selection = choose_baseline(series, season=season)
+    engine_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    legacy = {
+        name: legacy_rolling_origin_backtest(series, func, horizon=1, **kwargs)
+        for name, (func, kwargs) in baseline_methods(season).items()
+    }
+    legacy_s = time.perf_counter() - start
+
+    return {
+        "points": n_points,
+        "method": selection.method,
+        "engine_s": engine_s,
+        "legacy_s": legacy_s,
+        "speedup": legacy_s / engine_s if engine_s else float("inf"),
+        "parity": all(selection.leaderboard.get(name) == metrics for name, metrics in legacy.items()),
+    }
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in run_benchmark().items():
+        print(f"{key:>10}: {value:.3f}" if isinstance(value, float) else f"{key:>10}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["legacy_rolling_origin_backtest", "run_benchmark", "synthetic_series"]
@@ -0,0 +1,140 @@
+"""
+End-to-end council and Minister briefing latency.
+
+Requires PostgreSQL: ``DATABASE_URL`` must point at a populated database.
+The default agents' query ids resolve to the SQL definitions in
+``data/queries``, which take precedence over the CSV specs with the same
+id, and those statements do not run on SQLite. Without a database the
+benchmark fails instead of reporting numbers.
+
+Also generates the synthetic LMIS CSVs into a temp directory and points the
+CSV catalog at them for CSV-backed specs, then times (median of ``repeat``):
+
+- legacy: the previous path, emulated -- council graph built and compiled
+  per call, one plain DataClient, agents run one after another, then (for
+  the briefing) a fresh QueryRegistry load and triangulation after the
+  council
+- current: ``run_council`` / ``build_briefing`` -- compiled graph reused,
+  declared queries prefetched once into a shared result set, agents run
+  concurrently, triangulation overlapped with the council
+
+``ttl_s=0`` disables the deterministic query cache so every query really
+executes; the default TTL shows the warm-cache case.
+
+Run: ``python -m src.qnwis.perf.council_bench``
+"""
+
+from __future__ import annotations
+
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..agents.base import DataClient
+from ..briefing.minister import build_briefing
+from ..data.connectors import csv_catalog as csvcat
+from ..data.deterministic import cache_access
+from ..data.deterministic.registry import QueryRegistry
+from ..data.synthetic.seed_lmis import generate_synthetic_lmis
+from ..orchestration.council import (
+    CouncilConfig,
+    _assemble_response,
+    _verify_reports,
+    build_council_graph,
+    default_agents,
+    run_council,
+)
+from ..orchestration.graph_cache import clear_graph_cache
+from ..orchestration.synthesis import synthesize
+from ..verification.triangulation import run_triangulation
+
+QUERIES_DIR = "src/qnwis/data/queries"
+
+
+def legacy_council(config: CouncilConfig) -> dict[str, Any]:
+    """The previous ``run_council`` work, kept as reference."""
+    try:
+        build_council_graph(default_agents)
+    except ImportError:
+        pass
+    client = DataClient(queries_dir=config.queries_dir, ttl_s=config.ttl_s)
+    reports = [agent.run() for agent in default_agents(client)]
+    return _assemble_response(
+        synthesize(reports), _verify_reports(reports), rate_limit_applied=False
+    )
+
+
+def legacy_briefing(queries_dir: str, ttl_s: int) -> Any:
+    """The previous ``build_briefing`` data path: council, then triangulation."""
+    council = legacy_council(CouncilConfig(queries_dir=queries_dir, ttl_s=ttl_s))
+    registry = QueryRegistry(queries_dir)
+    registry.load_all()
+    return council, run_triangulation(registry, ttl_s=ttl_s)
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    samples = []
+    before = dict(cache_access.COUNTERS)
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    lookups = sum(cache_access.COUNTERS[k] - before.get(k, 0) for k in ("hits", "misses"))
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "max_ms": max(samples) * 1000,
+        "query_calls_per_run": lookups / repeat,
+    }
+
+
+def run_benchmark(repeat: int = 5, ttls: tuple[int, ...] = (0, 300)) -> dict[str, dict[str, float]]:
+    """
+    Time council and briefing on both paths for each TTL.
+
+    Returns:
+        ``{"<path>_<target>_ttl<N>": {p50_ms, max_ms, query_calls_per_run}}``
+    """
+    results: dict[str, dict[str, float]] = {}
+    old_base = csvcat.BASE
+    with tempfile.TemporaryDirectory() as tmp:
+        generate_synthetic_lmis(tmp)
+        csvcat.BASE = Path(tmp)
+        try:
+            for ttl in ttls:
+                config = CouncilConfig(queries_dir=QUERIES_DIR, ttl_s=ttl)
+                # Warm imports and the compiled graph once so both paths start even.
+                clear_graph_cache()
+                run_council(config)
+                results[f"legacy_council_ttl{ttl}"] = _measure(
+                    lambda config=config: legacy_council(config), repeat
+                )
+                results[f"current_council_ttl{ttl}"] = _measure(
+                    lambda config=config: run_council(config), repeat
+                )
+                results[f"legacy_briefing_ttl{ttl}"] = _measure(
+                    lambda ttl=ttl: legacy_briefing(QUERIES_DIR, ttl), repeat
+                )
+                results[f"current_briefing_ttl{ttl}"] = _measure(
+                    lambda ttl=ttl: build_briefing(QUERIES_DIR, ttl), repeat
+                )
+        finally:
+            csvcat.BASE = old_base
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(
+            f"{label:>26}: p50 {stats['p50_ms']:8.1f} ms  max {stats['max_ms']:8.1f} ms  "
+            f"query calls/run {stats['query_calls_per_run']:.0f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["legacy_briefing", "legacy_council", "run_benchmark"]
@@ -0,0 +1,148 @@
+"""
+Benchmark for query history reads at 1M entries.
+
+Writes a legacy ``query_history.jsonl`` of ``entries`` lines, then times:
+
+- legacy: the previous ``QueryHistory`` reads (parse the whole file for
+  ``get_recent``, substring scan of the latest 1000 for ``search``, full
+  re-parse of the latest 10000 for ``get_stats``)
+- sqlite: the same calls on the SQLite store after its one-off bulk import
+
+Reports milliseconds per call (median of ``repeat``) and the import time.
+
+Run: ``python -m src.qnwis.perf.history_bench``
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ..ui.history.query_history import QueryHistory
+
+PROVIDERS = ("anthropic", "openai", "stub")
+TOPICS = (
+    "unemployment rate",
+    "Qatarization in banking",
+    "معدل البطالة بين الشباب",
+    "salary growth in energy",
+    "توظيف المرأة القطرية",
+)
+
+
+def write_legacy_history(path: Path, entries: int) -> None:
+    """Synthetic JSONL history in the previous on-disk format."""
+    with open(path, "w", encoding="utf-8") as handle:
+        for i in range(entries):
+            entry = {
+                "timestamp": f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T{i % 24:02d}:00:00Z",
+                "question": f"{TOPICS[i % len(TOPICS)]} sector {i % 997} year {2015 + i % 10}",
+                "request_id": f"req-{i}",
+                "provider": PROVIDERS[i % len(PROVIDERS)],
+                "response_time_ms": float(50 + i % 900),
+                "result_summary": None,
+            }
+            handle.write(json.dumps(entry) + "\n")
+
+
+def legacy_recent(path: Path, limit: int = 20) -> list[dict[str, Any]]:
+    """The previous ``get_recent``, kept as reference."""
+    with open(path, encoding="utf-8") as handle:
+        entries = [json.loads(line) for line in handle if line.strip()]
+    entries.reverse()
+    return entries[:limit]
+
+
+def legacy_search(path: Path, text: str, limit: int = 10) -> list[dict[str, Any]]:
+    """The previous ``search``, kept as reference."""
+    needle = text.lower()
+    return [q for q in legacy_recent(path, 1000) if needle in q["question"].lower()][:limit]
+
+
+def legacy_stats(path: Path) -> dict[str, Any]:
+    """The previous ``get_stats``, kept as reference."""
+    queries = legacy_recent(path, 10000)
+    times = [q["response_time_ms"] for q in queries if q.get("response_time_ms") is not None]
+    providers: dict[str, int] = {}
+    for q in queries:
+        providers[q.get("provider", "unknown")] = providers.get(q.get("provider", "unknown"), 0) + 1
+    return {
+        "total_queries": len(queries),
+        "avg_response_time_ms": sum(times) / len(times) if times else 0,
+        "providers": providers,
+    }
+
+
+def _ms(fn: Callable[[], Any], repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run_benchmark(
+    entries: int = 1_000_000, repeat: int = 5, workdir: Path | None = None
+) -> dict[str, dict[str, float]]:
+    """
+    Time recent/search/stats on both backends.
+
+    Returns:
+        Per backend: ms per call for recent, search and stats, plus total_queries
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(workdir or tmp)
+        legacy_file = root / "legacy.jsonl"
+        write_legacy_history(legacy_file, entries)
+        results: dict[str, dict[str, float]] = {
+            "legacy": {
+                "recent_ms": _ms(lambda: legacy_recent(legacy_file), repeat),
+                "search_ms": _ms(lambda: legacy_search(legacy_file, "sector 42 "), repeat),
+                "stats_ms": _ms(lambda: legacy_stats(legacy_file), repeat),
+                # the previous stats only ever counted the latest 10000
+                "total_queries": len(legacy_recent(legacy_file, entries)),
+            }
+        }
+
+        store_dir = root / "store"
+        store_dir.mkdir()
+        legacy_file.rename(store_dir / "query_history.jsonl")
+        start = time.perf_counter()
+        history = QueryHistory(str(store_dir))
+        import_s = time.perf_counter() - start
+        results["sqlite"] = {
+            "import_s": import_s,
+            "recent_ms": _ms(lambda: history.get_recent(), repeat),
+            "search_ms": _ms(lambda: history.search("sector 42"), repeat),
+            "search_arabic_ms": _ms(lambda: history.search("البطاله الشباب"), repeat),
+            "stats_ms": _ms(history.get_stats, repeat),
+            "total_queries": history.get_stats()["total_queries"],
+        }
+        history.store.close()
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(label)
+        for key, value in stats.items():
+            print(f"  {key:>18}: {value:,.3f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = [
+    "legacy_recent",
+    "legacy_search",
+    "legacy_stats",
+    "run_benchmark",
+    "write_legacy_history",
+]
@@ -0,0 +1,192 @@
+"""
+Load test for notification dispatch under alert storms.
+
+Pushes a storm of incidents (default 10,000, i.e. a minute at 10k/min)
+through ``NotificationDispatcher.dispatch_many`` (async per-channel workers,
+buffered ledger) and through the previous path: sequential channel sends
+and one ledger open/write plus one envelope file per incident. Channels are
+local stubs with a fixed send latency.
+
+Run: ``python -m src.qnwis.perf.notify_bench``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from ..notify.dispatcher import NotificationDispatcher
+from ..notify.models import Channel, Incident, IncidentState, Notification, Severity
+from ..utils.clock import ManualClock
+
+STORM_START = datetime(2025, 1, 1, tzinfo=UTC)
+
+
+class StubChannel:
+    """Local channel that sleeps ``latency_s`` per send; every ``fail_every``-th call fails."""
+
+    def __init__(self, latency_s: float = 0.0, fail_every: int = 0):
+        self.latency_s = latency_s
+        self.fail_every = fail_every
+        self.calls = 0
+        self.delivered: list[str] = []
+
+    def _result(self, notification: Notification) -> str:
+        self.calls += 1
+        if self.fail_every and self.calls % self.fail_every == 0:
+            raise ConnectionError("stub channel unavailable")
+        self.delivered.append(notification.notification_id)
+        return "success"
+
+    async def send(self, notification: Notification) -> str:
+        if self.latency_s:
+            await asyncio.sleep(self.latency_s)
+        return self._result(notification)
+
+
+class SyncStubChannel(StubChannel):
+    """Blocking variant, as the built-in HTTP/SMTP channels are."""
+
+    def send(self, notification: Notification) -> str:  # type: ignore[override]
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self._result(notification)
+
+
+class LegacyDispatcher(NotificationDispatcher):
+    """Previous persistence: one ledger open/write and one envelope file per incident."""
+
+    def _persist_to_ledger(self, notification: Notification, results: dict[str, str]) -> None:
+        incident = Incident(
+            incident_id=notification.notification_id,
+            notification_id=notification.notification_id,
+            rule_id=notification.rule_id,
+            severity=notification.severity,
+            state=IncidentState.OPEN,
+            message=notification.message,
+            scope=notification.scope,
+            window_start=notification.window_start,
+            window_end=notification.window_end,
+            created_at=notification.timestamp,
+            updated_at=notification.timestamp,
+            metadata={"dispatch_results": results},
+        )
+        with open(self.ledger_dir / "incidents.jsonl", "a", encoding="utf-8") as f:
+            f.write(incident.model_dump_json() + "\n")
+        envelope = self._create_envelope(incident)
+        with open(self.ledger_dir / f"{incident.incident_id}.envelope.json", "w", encoding="utf-8") as f:
+            json.dump(envelope, f, indent=2)
+
+
+def storm(n_incidents: int, n_rules: int = 500, duplicate_every: int = 10) -> list[Notification]:
+    """Storm notifications over ``n_rules`` rules; every ``duplicate_every``-th repeats an id."""
+    notifications = []
+    for i in range(n_incidents):
+        key = i - 1 if duplicate_every and i % duplicate_every == duplicate_every - 1 else i
+        notifications.append(
+            Notification(
+                notification_id=f"storm_{key:06d}",
+                rule_id=f"rule_{i % n_rules:04d}",
+                severity=Severity.WARNING,
+                message=f"Storm alert {i}",
+                scope={"level": "sector", "code": f"{i % 20:02d}"},
+                window_start="2025-01-01T00:00:00Z",
+                window_end="2025-01-01T00:01:00Z",
+                channels=[Channel.EMAIL, Channel.TEAMS, Channel.WEBHOOK],
+                timestamp=STORM_START.isoformat(),
+            )
+        )
+    return notifications
+
+
+def make_dispatcher(
+    ledger_dir: Path,
+    channels: dict[Channel, Any],
+    cls: type[NotificationDispatcher] = NotificationDispatcher,
+    rate_limit_per_rule: int = 100,
+) -> NotificationDispatcher:
+    dispatcher = cls(
+        clock=ManualClock(start=STORM_START),
+        ledger_dir=ledger_dir,
+        rate_limit_per_rule=rate_limit_per_rule,
+        dry_run=False,
+    )
+    for channel, handler in channels.items():
+        dispatcher.register_channel(channel, handler)
+    return dispatcher
+
+
+def run_benchmark(n_incidents: int = 10_000, latency_s: float = 0.002) -> dict[str, Any]:
+    """
+    Dispatch the same storm through both paths.
+
+    Returns:
+        Seconds and incidents/minute per path, outcome counts and ledger lines
+    """
+    notifications = storm(n_incidents)
+    results: dict[str, Any] = {"incidents": n_incidents}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        async_dir = Path(tmp) / "async"
+        dispatcher = make_dispatcher(
+            async_dir, {c: StubChannel(latency_s) for c in Channel}
+        )
+
+        async def run() -> list[dict[str, str]]:
+            outcomes = await dispatcher.dispatch_many(notifications)
+            await dispatcher.aclose()
+            return outcomes
+
+        start = time.perf_counter()
+        outcomes = asyncio.run(run())
+        async_s = time.perf_counter() - start
+
+        # The sequential path pays every send in turn; time a slice and scale
+        legacy_n = min(n_incidents, 500)
+        legacy = make_dispatcher(
+            Path(tmp) / "legacy", {c: SyncStubChannel(latency_s) for c in Channel}, LegacyDispatcher
+        )
+        start = time.perf_counter()
+        for notification in notifications[:legacy_n]:
+            legacy.dispatch(notification)
+        legacy_s = (time.perf_counter() - start) * n_incidents / legacy_n
+
+        ledger_lines = sum(1 for _ in open(async_dir / "incidents.jsonl", encoding="utf-8"))
+
+    results.update(
+        {
+            "async_s": async_s,
+            "legacy_s_est": legacy_s,
+            "async_per_min": n_incidents / async_s * 60,
+            "legacy_per_min_est": n_incidents / legacy_s * 60,
+            "delivered": sum(1 for o in outcomes if "status" not in o),
+            "deduplicated": sum(1 for o in outcomes if o.get("status") == "deduplicated"),
+            "rate_limited": sum(1 for o in outcomes if o.get("status") == "rate_limited"),
+            "ledger_lines": ledger_lines,
+        }
+    )
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in run_benchmark().items():
+        print(f"{key:>18}: {value:,.1f}" if isinstance(value, float) else f"{key:>18}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = [
+    "LegacyDispatcher",
+    "StubChannel",
+    "SyncStubChannel",
+    "make_dispatcher",
+    "run_benchmark",
+    "storm",
+]
@@ -0,0 +1,180 @@
+"""
+Benchmark for the API rate-limit check at 5k requests/second.
+
+Drives an open-loop arrival stream through the auth middleware's limiter
+call on one event loop, with an in-process Redis stand-in (fakeredis plus a
+fixed per-command round-trip delay):
+
+- legacy: the previous ``_consume_redis`` (four blocking commands per request,
+  stalling the loop for every round-trip)
+- core: ``RateLimiter.aconsume``, one awaited atomic script call per request
+- core + lease: the same with tokens pre-claimed in batches of 8
+
+Reports latency from scheduled arrival to completion and Redis round-trips
+per request. fakeredis executes scripts in-process, so the stand-in server's
+CPU is charged to the same loop (a real Redis runs elsewhere). Needs
+``fakeredis[lua]``.
+
+Run: ``python -m src.qnwis.perf.ratelimit_bench``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from typing import Any
+
+from ..security.auth import Principal
+from ..security.ratelimit import RateLimiter
+
+LEGACY_PREFIX = "qnwis:ratelimit"
+
+
+def latent_redis(rtt_s: float, *, blocking: bool) -> Any:
+    """fakeredis client that counts commands and adds ``rtt_s`` to each."""
+    import fakeredis
+    from redis.asyncio import BlockingConnectionPool
+
+    if blocking:
+
+        class Blocking(fakeredis.FakeRedis):
+            round_trips = 0
+
+            def execute_command(self, *args: Any, **kwargs: Any) -> Any:
+                Blocking.round_trips += 1
+                time.sleep(rtt_s)
+                return super().execute_command(*args, **kwargs)
+
+            def pipeline(self, *args: Any, **kwargs: Any) -> Any:
+                pipe = super().pipeline(*args, **kwargs)
+                execute = pipe.execute
+
+                def send(*exec_args: Any, **exec_kwargs: Any) -> Any:
+                    Blocking.round_trips += 1  # one write, one read for the whole batch
+                    time.sleep(rtt_s)
+                    return execute(*exec_args, **exec_kwargs)
+
+                pipe.execute = send
+                return pipe
+
+        return Blocking(decode_responses=True)
+
+    class NonBlocking(fakeredis.FakeAsyncRedis):
+        round_trips = 0
+
+        async def execute_command(self, *args: Any, **kwargs: Any) -> Any:
+            NonBlocking.round_trips += 1
+            await asyncio.sleep(rtt_s)
+            return await super().execute_command(*args, **kwargs)
+
+    # Same pool shape as ``async_redis_client``
+    return NonBlocking(
+        decode_responses=True, connection_pool_class=BlockingConnectionPool, max_connections=50
+    )
+
+
+def legacy_consume(redis: Any, ratelimit_id: str, burst: int, daily: int, cost: int = 1) -> bool:
+    """The previous fixed-window Redis path, kept as reference."""
+    now = int(time.time())
+    second_window = f"{LEGACY_PREFIX}:rps:{ratelimit_id}:{now}"
+    second_count = redis.incrby(second_window, cost)
+    redis.expire(second_window, 1)
+    if second_count > burst:
+        return False
+    day = datetime.now(UTC).strftime("%Y%m%d")
+    daily_key = f"{LEGACY_PREFIX}:daily:{ratelimit_id}:{day}"
+    daily_count = redis.incrby(daily_key, cost)
+    redis.expire(daily_key, 86400)
+    return daily_count <= daily
+
+
+async def drive(
+    check: Callable[[Principal], Awaitable[bool]],
+    principals: list[Principal],
+    rps: int,
+    seconds: float,
+) -> dict[str, float]:
+    """Open-loop arrivals at ``rps``; each request runs ``check`` then yields once."""
+    latencies: list[float] = []
+    allowed = 0
+
+    async def request(principal: Principal, due: float) -> None:
+        nonlocal allowed
+        ok = await check(principal)
+        allowed += ok
+        await asyncio.sleep(0)  # the handler
+        latencies.append(time.perf_counter() - due)
+
+    total = int(rps * seconds)
+    start = time.perf_counter()
+    tasks: list[asyncio.Task[None]] = []
+    for i in range(total):
+        due = start + i / rps
+        if (delay := due - time.perf_counter()) > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(request(principals[i % len(principals)], due)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "achieved_rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "allowed": allowed,
+    }
+
+
+def run_benchmark(
+    rps: int = 5000, seconds: float = 1.0, rtt_s: float = 0.0002, n_principals: int = 50
+) -> dict[str, dict[str, float]]:
+    """
+    Run the three limiter paths at ``rps`` for ``seconds``.
+
+    Returns:
+        Per path: achieved rate, p50/p99 latency (ms), allowed count, round-trips/request
+    """
+    principals = [
+        Principal(subject=f"svc{i}", roles=("analyst",), ratelimit_id=f"svc{i}")
+        for i in range(n_principals)
+    ]
+    limits = {"rps": 1000, "burst": 3000, "daily": 1_000_000}  # overhead, not denials
+    total = int(rps * seconds)
+    results: dict[str, dict[str, float]] = {}
+
+    blocking = latent_redis(rtt_s, blocking=True)
+
+    async def legacy(principal: Principal) -> bool:
+        return legacy_consume(blocking, principal.ratelimit_id, limits["burst"], limits["daily"])
+
+    results["legacy"] = asyncio.run(drive(legacy, principals, rps, seconds))
+    results["legacy"]["round_trips_per_request"] = type(blocking).round_trips / total
+
+    for label, lease in (("core", 0), ("core_lease8", 8)):
+        redis = latent_redis(rtt_s, blocking=False)
+        limiter = RateLimiter(**limits, lease_size=lease)
+        limiter._core = type(limiter._core)(redis=redis, prefix=label, lease_size=lease)
+
+        async def check(principal: Principal, limiter: RateLimiter = limiter) -> bool:
+            return (await limiter.aconsume(principal)).allowed
+
+        results[label] = asyncio.run(drive(check, principals, rps, seconds))
+        results[label]["round_trips_per_request"] = type(redis).round_trips / total
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(label)
+        for key, value in stats.items():
+            print(f"  {key:>24}: {value:,.3f}" if isinstance(value, float) else f"  {key:>24}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["drive", "latent_redis", "legacy_consume", "run_benchmark"]
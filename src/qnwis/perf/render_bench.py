@@ -0,0 +1,135 @@
+"""
+Benchmark for chart export under concurrent load.
+
+Sends 200 concurrent PNG export requests for a handful of distinct charts
+through a 40-thread pool (the size of the threadpool FastAPI runs sync
+endpoints on):
+
+- legacy: the previous ``png_salary_yoy`` body, drawing every request with
+  pyplot in the request thread and hashing the bytes for the ETag
+- cold: ``ChartRenderService`` with an empty cache; each distinct chart is
+  rendered once in the pre-warmed pool, concurrent duplicates wait for it
+- warm: the same requests again, served from the cache
+- conditional: clients revalidating with If-None-Match, answered from the
+  ETag memo without building a spec
+
+Run: ``python -m src.qnwis.perf.render_bench``
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import statistics
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from ..ui.render import ChartRenderService, ChartSpec, RenderStats
+
+THREADS = 40
+
+
+def series(chart: int) -> tuple[list[int], list[float]]:
+    """Deterministic YoY series for chart number ``chart``."""
+    years = list(range(2015, 2025))
+    return years, [round(((chart + 3) * (year - 2010)) % 17 - 5.5, 2) for year in years]
+
+
+def legacy_png(sector: str, xs: list[int], ys: list[float]) -> tuple[bytes, str]:
+    """The previous ``png_salary_yoy`` rendering, kept as reference."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(6, 3), dpi=150)
+    ax.plot(xs, ys, marker="o")
+    ax.set_title(f"Salary YoY - {sector}")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("YoY %")
+    ax.grid(True, alpha=0.3)
+    buf = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png")
+    plt.close(fig)
+    data = buf.getvalue()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def spec(chart: int) -> ChartSpec:
+    xs, ys = series(chart)
+    return ChartSpec(
+        "line", "png", f"Salary YoY - sector{chart}", tuple(xs), tuple(ys), "Year", "YoY %"
+    )
+
+
+def _drive(handler: Callable[[int], Any], requests: int, charts: int) -> dict[str, float]:
+    latencies: list[float] = []
+
+    def one(i: int) -> None:
+        start = time.perf_counter()
+        handler(i % charts)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "wall_s": elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def run_benchmark(
+    requests: int = 200, charts: int = 10, workers: int = 2
+) -> dict[str, dict[str, float]]:
+    """
+    Run the legacy and service paths.
+
+    Returns:
+        Per path: wall time, p50/p99 latency (ms); service paths add cache stats
+    """
+    results: dict[str, dict[str, float]] = {}
+    legacy_png("warm-up", *series(0))  # same import/font warm-up as the pool gets
+    results["legacy"] = _drive(lambda c: legacy_png(f"sector{c}", *series(c)), requests, charts)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        service = ChartRenderService(cache_dir=cache_dir, workers=workers)
+        service.warm()
+        try:
+            for label in ("cold", "warm"):
+                service.stats = RenderStats()
+                results[label] = _drive(
+                    lambda c: service.render(spec(c), key=("bench", c)), requests, charts
+                )
+                results[label].update(service.stats.snapshot())
+
+            def conditional(c: int) -> None:
+                if service.known_etag(("bench", c)) is None:
+                    raise AssertionError("ETag memo missed")
+                service.record_not_modified()
+
+            results["conditional"] = _drive(conditional, requests, charts)
+        finally:
+            service.shutdown()
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(label)
+        for key, value in stats.items():
+            print(f"  {key:>16}: {value:,.3f}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["legacy_png", "run_benchmark", "series", "spec"]
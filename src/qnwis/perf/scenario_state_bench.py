@@ -0,0 +1,107 @@
+"""
+Benchmark for parallel scenario state setup: deepcopy vs copy-on-write branches.
+
+Builds a synthetic workflow state (prefetched facts, RAG chunks, data tables)
+and, for each scenario count, times and traces peak memory of:
+
+- deepcopy: ``copy.deepcopy`` of the full state per scenario (the previous
+  ``ParallelDebateExecutor`` behaviour)
+- cow: ``ScenarioStateBase.branch`` per scenario, sharing frozen sections
+
+Run: ``python -m src.qnwis.perf.scenario_state_bench``
+"""
+
+from __future__ import annotations
+
+import copy
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from ..orchestration.scenario_state import ScenarioStateBase
+
+
+def _synthetic_state(n_facts: int = 5000, n_chunks: int = 200) -> dict[str, Any]:
+    return {
+        "query": "What is the impact of Qatarization targets on private sector hiring?",
+        "extracted_facts": [
+            {
+                "metric": f"indicator_{i}",
+                "value": float(i),
+                "year": 2015 + i % 10,
+                "source": "World Bank Indicators API",
+                "confidence": 0.95,
+                "raw_text": f"Indicator {i}: value {i} reported for Qatar " * 4,
+                "dimensions": {"sex": "Total", "age_group": "15+"},
+            }
+            for i in range(n_facts)
+        ],
+        "rag_context": [
+            {"doc": f"report_{i}.pdf", "text": "Labour market narrative. " * 80, "score": 0.5}
+            for i in range(n_chunks)
+        ],
+        "structured_inputs": {"tables": {f"t{i}": list(range(200)) for i in range(50)}},
+        "reasoning_chain": ["classified", "extracted", "scenarios generated"],
+        "warnings": [],
+        "errors": [],
+        "metadata": {"llm_provider": "azure"},
+    }
+
+
+def _measure(fn: Callable[[], Any]) -> tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    keep = fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del keep
+    return elapsed, peak
+
+
+def run_benchmark(
+    scenario_counts: Iterable[int] = (6, 12, 24), n_facts: int = 5000
+) -> list[dict[str, Any]]:
+    """
+    Compare per-query setup time and peak traced memory of deepcopy vs branch.
+
+    Returns:
+        One row per scenario count with seconds and peak MiB for both modes
+    """
+    base_state = _synthetic_state(n_facts)
+    rows = []
+    for count in scenario_counts:
+        deep_s, deep_peak = _measure(
+            lambda count=count: [copy.deepcopy(base_state) for _ in range(count)]
+        )
+
+        def build_branches(count: int = count) -> list[dict[str, Any]]:
+            base = ScenarioStateBase(base_state)
+            return [base.branch(scenario_id=f"s{i}") for i in range(count)]
+
+        cow_s, cow_peak = _measure(build_branches)
+        rows.append({
+            "scenarios": count,
+            "deepcopy_s": deep_s,
+            "deepcopy_peak_mib": deep_peak / 2**20,
+            "cow_s": cow_s,
+            "cow_peak_mib": cow_peak / 2**20,
+        })
+    return rows
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    print(f"{'scenarios':>9} {'deepcopy s':>11} {'deepcopy MiB':>13} {'cow s':>8} {'cow MiB':>8}")
+    for row in run_benchmark():
+        print(
+            f"{row['scenarios']:>9} {row['deepcopy_s']:>11.3f} {row['deepcopy_peak_mib']:>13.1f}"
+            f" {row['cow_s']:>8.3f} {row['cow_peak_mib']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["run_benchmark"]
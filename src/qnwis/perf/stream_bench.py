@@ -0,0 +1,165 @@
+"""
+Replay benchmark for the SSE workflow stream.
+
+Replays a recorded 40-node LangGraph run through ``run_workflow_stream`` and
+reports time-to-first-SSE-byte and CPU time per emitted event, next to an
+emulation of the previous per-event work (full state copy, ``str(event)``
+logging, full-fact default payloads and ``json.dumps`` probing per value).
+
+Run: ``python -m src.qnwis.perf.stream_bench``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+from ..orchestration.graph_cache import clear_graph_cache, get_compiled_graph
+
+AGENTS = ("financial", "market", "operations", "research")
+
+
+class RecordedGraph:
+    """Stands in for a compiled graph by replaying recorded ``astream`` updates."""
+
+    def __init__(self, updates: List[Dict[str, Any]], delay_s: float = 0.0):
+        self.updates = updates
+        self.delay_s = delay_s
+
+    async def astream(self, initial_state: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        for update in self.updates:
+            if self.delay_s:
+                await asyncio.sleep(self.delay_s)
+            yield update
+
+
+def record_run(n_facts: int = 2000, n_scenarios: int = 9) -> List[Dict[str, Any]]:
+    """
+    Synthetic recording of a 40-node parallel-path run.
+
+    Like the real nodes, each node returns the whole (mutated) state, so a
+    naive consumer re-sends every key on every event.
+    """
+    state: Dict[str, Any] = {
+        "query": "How will Qatarization targets affect private sector hiring?",
+        "extracted_facts": [
+            {"metric": f"indicator_{i}", "value": float(i), "year": 2015 + i % 10,
+             "source": "World Bank Indicators API", "confidence": 0.95}
+            for i in range(n_facts)
+        ],
+        "reasoning_chain": [],
+        "warnings": [],
+        "metadata": {"llm_provider": "azure"},
+    }
+    updates = []
+
+    def step(node: str, **changes: Any) -> None:
+        state["reasoning_chain"].append(f"{node} complete")
+        state.update(changes)
+        # Snapshot what the node returned at that point of the run
+        updates.append({node: {**state, "reasoning_chain": list(state["reasoning_chain"])}})
+
+    step("classifier", complexity="complex")
+    step("feasibility_check", feasibility_check={"verdict": "feasible"})
+    step("scenario_gen", scenarios=[{"id": f"s{i}", "name": f"Scenario {i}"} for i in range(n_scenarios)])
+    for i in range(n_scenarios):
+        for agent in AGENTS:
+            step(f"scenario_{i}_{agent}", **{f"{agent}_analysis_s{i}": f"{agent} analysis " * 50})
+    step("arithmetic_validator", arithmetic_validation={"passed": True})
+    return updates[:40]
+
+
+def _legacy_is_serializable(value: Any) -> bool:
+    try:
+        json.dumps(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def _legacy_event_cost(updates: List[Dict[str, Any]]) -> Tuple[float, int]:
+    """CPU seconds spent by the previous per-node pipeline (emulated)."""
+    start = time.process_time()
+    accumulated: Dict[str, Any] = {}
+    events = 0
+    for event in updates:
+        _ = str(event)[:200]
+        for node_output in event.values():
+            accumulated.update(node_output)
+            snapshot = accumulated.copy()
+            payload = {
+                "extracted_facts": snapshot.get("extracted_facts"),
+                "facts_count": len(snapshot.get("extracted_facts") or []),
+            }
+            payload = {k: v for k, v in payload.items() if _legacy_is_serializable(v)}
+            json.dumps({"stage": "node", "payload": payload})
+            events += 1
+    return time.process_time() - start, events
+
+
+async def _stream_cost(updates: List[Dict[str, Any]]) -> Dict[str, float]:
+    from ..orchestration.streaming import run_workflow_stream
+
+    graph = RecordedGraph(updates)
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    ttfb_ms = None
+    events = 0
+    async for event in run_workflow_stream("benchmark", graph=graph):
+        data = f"data: {json.dumps(event.to_dict())}\n\n"
+        if ttfb_ms is None and data:
+            ttfb_ms = (time.perf_counter() - start_wall) * 1000
+        events += 1
+    cpu_s = time.process_time() - start_cpu
+    return {"ttfb_ms": ttfb_ms or 0.0, "events": events, "cpu_ms_per_event": cpu_s * 1000 / max(events, 1)}
+
+
+def _compile_cost() -> Dict[str, float]:
+    from ..orchestration.workflow import create_intelligence_graph
+
+    clear_graph_cache()
+    start = time.perf_counter()
+    get_compiled_graph(create_intelligence_graph)
+    cold_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    get_compiled_graph(create_intelligence_graph)
+    warm_ms = (time.perf_counter() - start) * 1000
+    return {"compile_cold_ms": cold_ms, "compile_warm_ms": warm_ms}
+
+
+def run_benchmark(n_facts: int = 2000, include_compile: bool = True) -> Dict[str, Any]:
+    """
+    Replay a recorded 40-node run and measure the streaming pipeline.
+
+    Returns:
+        TTFB and CPU/event for the current pipeline, the emulated legacy
+        CPU/event, and (optionally) cold vs cached graph compile time.
+    """
+    os.environ.setdefault("QNWIS_WORKFLOW_IMPL", "langgraph")
+    updates = record_run(n_facts=n_facts)
+
+    legacy_cpu_s, legacy_events = _legacy_event_cost(updates)
+    stream = asyncio.run(_stream_cost(updates))
+    result: Dict[str, Any] = {
+        "nodes": len(updates),
+        **stream,
+        "legacy_cpu_ms_per_node_event": legacy_cpu_s * 1000 / max(legacy_events, 1),
+    }
+    if include_compile:
+        result.update(_compile_cost())
+    return result
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for key, value in run_benchmark().items():
+        print(f"{key:>30}: {value:.2f}" if isinstance(value, float) else f"{key:>30}: {value}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["RecordedGraph", "record_run", "run_benchmark"]
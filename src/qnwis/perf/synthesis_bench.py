@@ -0,0 +1,212 @@
+"""
+Time-to-first-token and token volume for council synthesis.
+
+Five synthetic agents finish at staggered times; a deterministic stub LLM
+models prefill latency per uncached prompt token (with a prefix cache, as
+providers that cache prompt prefixes do) and a fixed per-token decode rate.
+Compares, per run:
+
+- current: wait for every report, then ``synthesize_stream`` over the full
+  ``_build_synthesis_prompt``
+- incremental: ``synthesize_incremental`` fed in completion order, final
+  pass over the per-agent digests behind the fixed prompt prefix; with and
+  without the streamed draft preview
+
+Two runs per path with different questions show the warm prefix cache.
+
+Run: ``python -m src.qnwis.perf.synthesis_bench``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from ..agents.base import AgentReport, Insight
+from ..synthesis.engine import SynthesisEngine
+from ..synthesis.incremental import iter_completed
+
+# Seconds after start at which each synthetic agent report lands.
+AGENT_FINISH_S = (0.05, 0.09, 0.14, 0.2, 0.3)
+QUESTIONS = (
+    "Which sectors drive attrition among Qatari nationals in 2024?",
+    "How should wage subsidies be targeted to raise private-sector Qatarization?",
+)
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4
+
+
+class StubLLM:
+    """
+    Deterministic streaming LLM with a prefix-cache latency model.
+
+    Prefill costs ``prefill_s_per_token`` per uncached prompt token; the
+    longest prefix shared with an earlier prompt counts as cached. Output
+    is a fixed token sequence decoded at ``decode_s_per_token``.
+    """
+
+    def __init__(
+        self,
+        *,
+        base_s: float = 0.01,
+        prefill_s_per_token: float = 0.00001,
+        decode_s_per_token: float = 0.0002,
+        output_tokens: int = 200,
+    ) -> None:
+        self.base_s = base_s
+        self.prefill_s_per_token = prefill_s_per_token
+        self.decode_s_per_token = decode_s_per_token
+        self.output_tokens = output_tokens
+        self._seen: list[str] = []
+        self.calls: list[dict[str, int]] = []
+
+    def _cached_chars(self, text: str) -> int:
+        best = 0
+        for seen in self._seen:
+            n = 0
+            for a, b in zip(seen, text):
+                if a != b:
+                    break
+                n += 1
+            best = max(best, n)
+        return best
+
+    async def generate_stream(self, *, prompt: str, system: str = "", **_: Any) -> AsyncIterator[str]:
+        text = f"{system}\n{prompt}"
+        cached = self._cached_chars(text)
+        self._seen.append(text)
+        self.calls.append({
+            "prompt_tokens": _tokens(text),
+            "cached_tokens": cached // 4,
+            "output_tokens": self.output_tokens,
+        })
+        await asyncio.sleep(self.base_s + self.prefill_s_per_token * _tokens(text[cached:]))
+        for i in range(self.output_tokens):
+            if i:
+                await asyncio.sleep(self.decode_s_per_token)
+            yield f"tok{i} "
+
+
+def synthetic_report(idx: int) -> AgentReport:
+    """Agent report roughly the size of a live LLM agent's output."""
+    findings = [
+        Insight(
+            title=f"Finding {idx}.{k}: sector shift in {['energy', 'health', 'construction', 'finance', 'retail', 'ict'][k]}",
+            summary=(
+                f"Agent {idx} observes that employment in segment {k} moved by {1.5 * k + idx:.1f}% "
+                "year on year, with Qatari participation diverging from expatriate trends. "
+                * 3
+            ),
+            metrics={f"m{idx}_{k}_{j}": round(0.37 * (idx + 1) * (k + j + 1), 2) for j in range(4)},
+            warnings=[f"Data for segment {k} is provisional"] if k % 2 else [],
+        )
+        for k in range(6)
+    ]
+    narrative = " ".join(
+        f"Paragraph {p}: agent {idx} weighs labour supply, wage pressure and nationalization "
+        f"targets across sectors, citing {p + 3} indicators and prior-year baselines."
+        for p in range(40)
+    )
+    return AgentReport(
+        agent=f"Agent{idx}",
+        findings=findings,
+        narrative=narrative,
+        warnings=["Survey wave 2024Q2 not yet reconciled"],
+    )
+
+
+def _agent_tasks(reports: list[AgentReport]) -> list[asyncio.Task[AgentReport]]:
+    async def finish(report: AgentReport, at: float) -> AgentReport:
+        await asyncio.sleep(at)
+        return report
+
+    return [
+        asyncio.create_task(finish(report, at))
+        for report, at in zip(reports, AGENT_FINISH_S)
+    ]
+
+
+async def _current(engine: SynthesisEngine, question: str, reports: list[AgentReport]) -> AsyncIterator[str]:
+    done = await asyncio.gather(*_agent_tasks(reports))
+    async for token in engine.synthesize_stream(question, list(done)):
+        yield token
+
+
+async def _incremental(
+    engine: SynthesisEngine, question: str, reports: list[AgentReport], preview: bool
+) -> AsyncIterator[str]:
+    async for token in engine.synthesize_incremental(
+        question, iter_completed(_agent_tasks(reports)), preview=preview
+    ):
+        yield token
+
+
+async def _measure(
+    stream: Callable[[SynthesisEngine, str, list[AgentReport]], AsyncIterator[str]],
+) -> list[dict[str, float]]:
+    llm = StubLLM()
+    engine = SynthesisEngine(llm)  # type: ignore[arg-type]
+    reports = [synthetic_report(i) for i in range(len(AGENT_FINISH_S))]
+    runs = []
+    for question in QUESTIONS:
+        start = time.perf_counter()
+        first_any = first_llm = None
+        n_calls = len(llm.calls)
+        async for _ in stream(engine, question, reports):
+            now = time.perf_counter() - start
+            if first_any is None:
+                first_any = now
+            if first_llm is None and len(llm.calls) > n_calls:
+                first_llm = now
+        total = time.perf_counter() - start
+        call = llm.calls[-1]
+        runs.append({
+            "ttft_ms": (first_any or total) * 1000,
+            "llm_ttft_ms": (first_llm or total) * 1000,
+            "total_ms": total * 1000,
+            "prompt_tokens": call["prompt_tokens"],
+            "uncached_prompt_tokens": call["prompt_tokens"] - call["cached_tokens"],
+            "total_tokens": call["prompt_tokens"] + call["output_tokens"],
+        })
+    return runs
+
+
+def run_benchmark() -> dict[str, dict[str, float]]:
+    """
+    Run each synthesis path twice (cold, then warm prefix cache).
+
+    Returns:
+        ``{"<path>_<cold|warm>": {ttft_ms, llm_ttft_ms, total_ms,
+        prompt_tokens, uncached_prompt_tokens, total_tokens}}``
+    """
+    paths = {
+        "current": _current,
+        "incremental": lambda e, q, r: _incremental(e, q, r, preview=False),
+        "incremental_preview": lambda e, q, r: _incremental(e, q, r, preview=True),
+    }
+    results: dict[str, dict[str, float]] = {}
+    for label, stream in paths.items():
+        cold, warm = asyncio.run(_measure(stream))
+        results[f"{label}_cold"] = cold
+        results[f"{label}_warm"] = warm
+    return results
+
+
+def main() -> None:  # pragma: no cover - manual benchmark entry point
+    for label, stats in run_benchmark().items():
+        print(
+            f"{label:>25}: ttft {stats['ttft_ms']:6.1f} ms  llm ttft {stats['llm_ttft_ms']:6.1f} ms  "
+            f"total {stats['total_ms']:6.1f} ms  prompt {stats['prompt_tokens']:6d} tok "
+            f"(uncached {stats['uncached_prompt_tokens']:6d})  total {stats['total_tokens']:6d} tok"
+        )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
+
+
+__all__ = ["StubLLM", "run_benchmark", "synthetic_report"]
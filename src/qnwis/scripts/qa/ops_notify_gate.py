@@ -14,6 +14,7 @@ from __future__ import annotations
 import hashlib
 import json
 import subprocess
+import tempfile
 import time
 from pathlib import Path
 from typing import Any
@@ -212,8 +213,10 @@ class RG4OpsNotificationsGate:
 
         try:
             clock = Clock()
-            dispatcher = NotificationDispatcher(clock=clock, dry_run=True)
-            resolver = IncidentResolver(clock=clock)
+            # Fresh ledger: dedupe state survives restarts via the shared one
+            ledger_dir = Path(tempfile.mkdtemp(prefix="notify_accuracy_"))
+            dispatcher = NotificationDispatcher(clock=clock, ledger_dir=ledger_dir, dry_run=True)
+            resolver = IncidentResolver(clock=clock, ledger_dir=ledger_dir)
 
             # Golden fixture: Create notification
             notification = Notification(
@@ -271,7 +274,11 @@ class RG4OpsNotificationsGate:
 
         try:
             clock = Clock()
-            dispatcher = NotificationDispatcher(clock=clock, dry_run=True)
+            dispatcher = NotificationDispatcher(
+                clock=clock,
+                ledger_dir=Path(tempfile.mkdtemp(prefix="notify_perf_")),
+                dry_run=True,
+            )
 
             # Dispatch 100 notifications
             latencies = []
@@ -370,6 +377,7 @@ class RG4OpsNotificationsGate:
 
             # Dispatch to create ledger entry
             dispatcher.dispatch(notification)
+            dispatcher.flush()
 
             # Verify ledger file exists
             ledger_file = ledger_dir / "incidents.jsonl"
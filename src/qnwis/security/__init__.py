@@ -5,8 +5,10 @@ from .auth import (
     ApiKeyRecord,
     ApiKeyStore,
     AuthProvider,
+    CredentialCache,
     JWTConfig,
     Principal,
+    RevocationChannel,
     TokenPayload,
     create_jwt_token,
     decode_jwt,
@@ -37,8 +39,10 @@ __all__ = [
     "ApiKeyRecord",
     "ApiKeyStore",
     "AuthProvider",
+    "CredentialCache",
     "JWTConfig",
     "Principal",
+    "RevocationChannel",
     "TokenPayload",
     "create_jwt_token",
     "decode_jwt",
@@ -4,6 +4,11 @@ Authentication primitives for the QNWIS API.
 Supports JWT bearer tokens and salted API keys that can be stored in Redis or an
 in-memory fallback. All helpers avoid embedding secrets in logs and expose a
 `Principal` dataclass for downstream RBAC/rate limiting layers.
+
+Verified credentials are cached per worker, keyed by a digest of the token or
+key (never the secret itself), until the credential expires or a short
+maximum age passes. Unknown API keys are negatively cached. Revocations are
+broadcast over Redis pub/sub so every worker drops its cached entry at once.
 """
 
 from __future__ import annotations
@@ -14,8 +19,10 @@ import json
 import logging
 import os
 import secrets
+import threading
 import time
-from collections.abc import Iterable, Mapping, Sequence
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from typing import Any
@@ -24,6 +31,7 @@ import jwt
 from pydantic import BaseModel, Field
 
 from ..utils.clock import Clock
+from ..utils.rate_limit_core import async_redis_client
 
 try:  # pragma: no cover - optional dependency
     import redis  # type: ignore
@@ -32,6 +40,13 @@ except Exception:  # pragma: no cover
 
 logger = logging.getLogger(__name__)
 
+API_KEY_PREFIX = "qnwis:api_keys:"
+REVOKED_PREFIX = "qnwis:auth:revoked:"
+REVOCATION_CHANNEL = "qnwis:auth:revocations"
+CREDENTIAL_CACHE_TTL_S = 300.0
+NEGATIVE_CACHE_TTL_S = 30.0
+LIST_BATCH = 500
+
 
 class TokenPayload(BaseModel):
     """Validated JWT payload."""
@@ -156,6 +171,138 @@ def _hash_key(key: str, salt: str) -> str:
     return digest.hexdigest()
 
 
+def _token_digest(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class CredentialCache:
+    """
+    Bounded LRU of verified credentials keyed by digest.
+
+    Each entry carries its own expiry; callers pass the current time so the
+    cache follows whichever clock the credential's expiry is expressed in.
+    """
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str, now: float) -> Any | None:
+        """Cached value for ``digest``, or None when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            if now >= entry[0]:
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+            return entry[1]
+
+    def put(self, digest: str, value: Any, expires_at: float) -> None:
+        """Cache ``value`` until ``expires_at``, evicting the least recently used."""
+        with self._lock:
+            self._entries[digest] = (expires_at, value)
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, digest: str) -> None:
+        with self._lock:
+            self._entries.pop(digest, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RevocationChannel:
+    """
+    Fan-out of credential events (``kind:digest``) to every worker's caches.
+
+    With Redis, events go over pub/sub and a daemon thread delivers them to
+    the subscribed handlers; persisted revocations live under
+    ``REVOKED_PREFIX`` until the credential would have expired anyway.
+    Without Redis, events are delivered in-process.
+    """
+
+    def __init__(self, redis_client: Any | None = None, async_redis: Any | None = None) -> None:
+        self._redis = redis_client
+        self._aredis = async_redis
+        self._handlers: list[Callable[[str, str], None]] = []
+        self._thread: Any | None = None
+
+    def subscribe(self, handler: Callable[[str, str], None]) -> None:
+        """Call ``handler(kind, digest)`` for every event."""
+        self._handlers.append(handler)
+        if self._redis is None or self._thread is not None:
+            return
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{REVOCATION_CHANNEL: self._on_message})
+            self._thread = pubsub.run_in_thread(
+                sleep_time=1.0, daemon=True, exception_handler=self._on_error
+            )
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.warning(
+                "Revocation channel unavailable; cached credentials expire after %.0fs: %s",
+                CREDENTIAL_CACHE_TTL_S,
+                exc,
+            )
+
+    def publish(self, kind: str, digest: str) -> None:
+        if self._redis is None:
+            self._dispatch(kind, digest)
+            return
+        try:
+            self._redis.publish(REVOCATION_CHANNEL, f"{kind}:{digest}")
+        except Exception as exc:  # pragma: no cover - network failure
+            logger.warning("Failed to publish %s revocation: %s", kind, exc)
+        self._dispatch(kind, digest)  # do not wait for our own echo
+
+    def revoke(self, kind: str, digest: str, ttl_seconds: int) -> None:
+        """Persist a revocation for ``ttl_seconds`` and broadcast it."""
+        if self._redis is not None and ttl_seconds > 0:
+            self._redis.set(f"{REVOKED_PREFIX}{kind}:{digest}", "1", ex=ttl_seconds)
+        self.publish(kind, digest)
+
+    def is_revoked(self, kind: str, digest: str) -> bool:
+        if self._redis is None:
+            return False
+        return bool(self._redis.exists(f"{REVOKED_PREFIX}{kind}:{digest}"))
+
+    async def ais_revoked(self, kind: str, digest: str) -> bool:
+        if self._aredis is None:
+            return self.is_revoked(kind, digest)
+        return bool(await self._aredis.exists(f"{REVOKED_PREFIX}{kind}:{digest}"))
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def _on_message(self, message: Mapping[str, Any]) -> None:
+        kind, _, digest = str(message["data"]).partition(":")
+        self._dispatch(kind, digest)
+
+    def _on_error(self, exc: Exception, pubsub: Any, thread: Any) -> None:  # pragma: no cover
+        logger.warning(
+            "Revocation listener stopped; cached credentials expire after %.0fs: %s",
+            CREDENTIAL_CACHE_TTL_S,
+            exc,
+        )
+        thread.stop()
+        self._thread = None
+
+    def _dispatch(self, kind: str, digest: str) -> None:
+        for handler in self._handlers:
+            handler(kind, digest)
+
+
 @dataclass
 class ApiKeyRecord:
     """Persisted metadata for hashed API keys."""
@@ -174,6 +321,10 @@ class ApiKeyRecord:
 class ApiKeyStore:
     """
     API key registry backed by Redis when available, or in-memory dict fallback.
+
+    Keys read from Redis are cached for ``CREDENTIAL_CACHE_TTL_S`` and hashes
+    with no record for ``NEGATIVE_CACHE_TTL_S``; revocations and new keys are
+    broadcast so other workers drop stale entries immediately.
     """
 
     def __init__(
@@ -182,11 +333,20 @@ class ApiKeyStore:
         salt: str,
         redis_url: str | None = None,
         clock: Clock | None = None,
+        redis_client: Any | None = None,
+        async_redis: Any | None = None,
     ) -> None:
         self._salt = salt
         self._clock = clock or Clock()
-        self._redis = _load_redis_client(redis_url)
+        self._redis = redis_client if redis_client is not None else _load_redis_client(redis_url)
+        if async_redis is None and self._redis is not None:
+            async_redis = async_redis_client(redis_url)
+        self._aredis = async_redis
         self._records: dict[str, ApiKeyRecord] = {}
+        self._cache = CredentialCache()
+        self._negative = CredentialCache(max_entries=50_000)
+        self.revocations = RevocationChannel(self._redis, self._aredis)
+        self.revocations.subscribe(self._on_event)
 
     def _serialize(self, record: ApiKeyRecord) -> str:
         data = {
@@ -224,11 +384,12 @@ class ApiKeyStore:
 
     def _store(self, record: ApiKeyRecord, ttl_seconds: int | None) -> None:
         if self._redis:
-            key = f"qnwis:api_keys:{record.key_hash}"
+            key = f"{API_KEY_PREFIX}{record.key_hash}"
             self._redis.set(key, self._serialize(record))
             if ttl_seconds:
                 self._redis.expire(key, int(ttl_seconds))
         self._records[record.key_hash] = record
+        self.revocations.publish("added", record.key_hash)
 
     def add_key(
         self,
@@ -247,56 +408,122 @@ class ApiKeyStore:
         self._store(record, ttl_seconds)
         return record
 
-    def resolve(self, candidate: str) -> Principal:
-        """Validate plaintext key and return associated principal."""
-        key_hash = _hash_key(candidate, self._salt)
-        record = self._records.get(key_hash)
-
-        if not record and self._redis:
-            blob = self._redis.get(f"qnwis:api_keys:{key_hash}")
-            if blob:
-                record = self._deserialize(blob)
-                self._records[key_hash] = record
+    def _cached(self, key_hash: str) -> tuple[ApiKeyRecord | None, bool]:
+        """Return (record, known); ``known`` is False when Redis must be asked."""
+        now = self._now()
+        record = self._records.get(key_hash) or self._cache.get(key_hash, now)
+        if record is not None:
+            return record, True
+        return None, self._redis is None or self._negative.get(key_hash, now) is not None
+
+    def _remember(self, key_hash: str, blob: str | None) -> ApiKeyRecord | None:
+        now = self._now()
+        if not blob:
+            self._negative.put(key_hash, True, now + NEGATIVE_CACHE_TTL_S)
+            return None
+        record = self._deserialize(blob)
+        expires_at = now + CREDENTIAL_CACHE_TTL_S
+        if record.expires_at:
+            expires_at = min(expires_at, record.expires_at)
+        self._cache.put(key_hash, record, expires_at)
+        return record
 
+    def _check(self, key_hash: str, record: ApiKeyRecord | None) -> bool:
+        """Raise for unknown keys; return True when the key has expired."""
         if not record or not hmac.compare_digest(record.key_hash, key_hash):
             raise ValueError("Invalid API key")
-
         if record.expires_at and self._now() > record.expires_at:
-            self._records.pop(key_hash, None)
+            self._forget(key_hash)
+            return True
+        return False
+
+    def resolve(self, candidate: str) -> Principal:
+        """Validate plaintext key and return associated principal."""
+        key_hash = _hash_key(candidate, self._salt)
+        record, known = self._cached(key_hash)
+        if not known:
+            record = self._remember(key_hash, self._redis.get(f"{API_KEY_PREFIX}{key_hash}"))
+
+        if self._check(key_hash, record):
             if self._redis:
-                self._redis.delete(f"qnwis:api_keys:{key_hash}")
+                self._redis.delete(f"{API_KEY_PREFIX}{key_hash}")
             raise ValueError("API key expired")
+        return record.principal
+
+    async def aresolve(self, candidate: str) -> Principal:
+        """``resolve`` with the Redis lookup awaited instead of blocking."""
+        if self._aredis is None:
+            return self.resolve(candidate)
+        key_hash = _hash_key(candidate, self._salt)
+        record, known = self._cached(key_hash)
+        if not known:
+            blob = await self._aredis.get(f"{API_KEY_PREFIX}{key_hash}")
+            record = self._remember(key_hash, blob)
 
+        if self._check(key_hash, record):
+            await self._aredis.delete(f"{API_KEY_PREFIX}{key_hash}")
+            raise ValueError("API key expired")
         return record.principal
 
+    def _merge(self, blobs: Iterable[str | None]) -> list[ApiKeyRecord]:
+        for blob in blobs:
+            if blob:
+                record = self._deserialize(blob)
+                self._records[record.key_hash] = record
+        return sorted(self._records.values(), key=lambda r: r.created_at)
+
     def list_records(self) -> list[ApiKeyRecord]:
         """Return cached records (without exposing plaintext)."""
-        if self._redis:
-            for raw_key in self._redis.scan_iter(match="qnwis:api_keys:*"):  # pragma: no cover - redis path
-                blob = self._redis.get(raw_key)
-                if blob:
-                    record = self._deserialize(blob)
-                    self._records[record.key_hash] = record
-        return sorted(self._records.values(), key=lambda r: r.created_at)
+        if not self._redis:
+            return self._merge(())
+        keys = list(self._redis.scan_iter(match=f"{API_KEY_PREFIX}*", count=LIST_BATCH))
+        pipe = self._redis.pipeline(transaction=False)
+        for start in range(0, len(keys), LIST_BATCH):
+            pipe.mget(keys[start : start + LIST_BATCH])
+        return self._merge(blob for batch in pipe.execute() for blob in batch)
+
+    async def alist_records(self) -> list[ApiKeyRecord]:
+        """``list_records`` over the async client: one SCAN pass, then pipelined MGETs."""
+        if self._aredis is None:
+            return self.list_records()
+        keys = [
+            key async for key in self._aredis.scan_iter(match=f"{API_KEY_PREFIX}*", count=LIST_BATCH)
+        ]
+        pipe = self._aredis.pipeline(transaction=False)
+        for start in range(0, len(keys), LIST_BATCH):
+            pipe.mget(keys[start : start + LIST_BATCH])
+        return self._merge(blob for batch in await pipe.execute() for blob in batch)
 
     def revoke(self, key_id: str) -> bool:
         """Remove key matching short identifier or full hash."""
-        target = None
-        if key_id in self._records:
-            target = key_id
-        else:
-            for key_hash in list(self._records.keys()):
-                if self._records[key_hash].key_id == key_id:
-                    target = key_hash
-                    break
+        records = self.list_records() if self._redis else list(self._records.values())
+        target = next(
+            (r.key_hash for r in records if key_id in (r.key_hash, r.key_id)),
+            None,
+        )
         if not target:
             return False
 
-        self._records.pop(target, None)
+        self._forget(target)
         if self._redis:
-            self._redis.delete(f"qnwis:api_keys:{target}")
+            self._redis.delete(f"{API_KEY_PREFIX}{target}")
+        self.revocations.publish("key", target)
         return True
 
+    def close(self) -> None:
+        """Stop the revocation listener."""
+        self.revocations.close()
+
+    def _forget(self, key_hash: str) -> None:
+        self._records.pop(key_hash, None)
+        self._cache.discard(key_hash)
+
+    def _on_event(self, kind: str, key_hash: str) -> None:
+        if kind == "key":
+            self._forget(key_hash)
+        elif kind == "added":
+            self._negative.discard(key_hash)
+
 
 class AuthProvider:
     """High-level façade for JWT and API key authentication."""
@@ -309,11 +536,17 @@ class AuthProvider:
         redis_url: str | None = None,
         clock: Clock | None = None,
         env: Mapping[str, str] | None = None,
+        key_store: ApiKeyStore | None = None,
     ) -> None:
         self.jwt_config = jwt_config or JWTConfig.from_env()
         salt_value = salt or os.getenv("QNWIS_API_KEY_SALT") or self.jwt_config.secret
         self._clock = clock or Clock()
-        self._key_store = ApiKeyStore(salt=salt_value, redis_url=redis_url or os.getenv("QNWIS_REDIS_URL"), clock=self._clock)
+        self._key_store = key_store or ApiKeyStore(
+            salt=salt_value, redis_url=redis_url or os.getenv("QNWIS_REDIS_URL"), clock=self._clock
+        )
+        self._jwt_cache = CredentialCache()
+        self._revoked_jwts = CredentialCache()
+        self._key_store.revocations.subscribe(self._on_event)
         self._load_env_keys(env or os.environ)
 
     def _load_env_keys(self, env: Mapping[str, str]) -> None:
@@ -353,9 +586,11 @@ class AuthProvider:
             payload["ratelimit_id"] = ratelimit_id
         return jwt.encode(payload, self.jwt_config.secret, algorithm=self.jwt_config.algorithm)
 
-    def authenticate_jwt(self, token: str) -> Principal:
-        """Validate JWT and return principal."""
-        payload = decode_jwt(
+    def _wall(self) -> float:
+        return self._clock.now().timestamp()
+
+    def _verify_jwt(self, token: str) -> TokenPayload:
+        return decode_jwt(
             token,
             self.jwt_config.secret,
             algorithms=[self.jwt_config.algorithm],
@@ -363,14 +598,70 @@ class AuthProvider:
             issuer=self.jwt_config.issuer,
             leeway=self.jwt_config.leeway_seconds,
         )
+
+    def _cache_jwt(self, digest: str, token: str) -> Principal:
+        payload = self._verify_jwt(token)
         roles = tuple(payload.roles) if payload.roles else ("analyst",)
         ratelimit_id = payload.ratelimit_id or payload.sub
-        return Principal(subject=payload.sub, roles=roles, ratelimit_id=ratelimit_id)
+        principal = Principal(subject=payload.sub, roles=roles, ratelimit_id=ratelimit_id)
+        # Expires with the token (decode re-applies the leeway afterwards)
+        expires_at = min(payload.exp, self._wall() + CREDENTIAL_CACHE_TTL_S)
+        self._jwt_cache.put(digest, principal, expires_at)
+        return principal
+
+    def authenticate_jwt(self, token: str) -> Principal:
+        """Validate JWT and return principal (verified signatures are cached per token)."""
+        digest = _token_digest(token)
+        now = self._wall()
+        principal = self._jwt_cache.get(digest, now)
+        if principal is not None:
+            return principal
+        revocations = self._key_store.revocations
+        if self._revoked_jwts.get(digest, now) or revocations.is_revoked("jwt", digest):
+            raise ValueError("Token revoked")
+        return self._cache_jwt(digest, token)
+
+    async def aauthenticate_jwt(self, token: str) -> Principal:
+        """``authenticate_jwt`` with the shared revocation lookup awaited."""
+        digest = _token_digest(token)
+        now = self._wall()
+        principal = self._jwt_cache.get(digest, now)
+        if principal is not None:
+            return principal
+        if self._revoked_jwts.get(digest, now) or await self._key_store.revocations.ais_revoked(
+            "jwt", digest
+        ):
+            raise ValueError("Token revoked")
+        return self._cache_jwt(digest, token)
+
+    def revoke_token(self, token: str) -> bool:
+        """Revoke a JWT on every worker until it expires; False if it is not valid."""
+        try:
+            payload = self._verify_jwt(token)
+        except jwt.PyJWTError:
+            return False
+        digest = _token_digest(token)
+        expires_at = payload.exp + self.jwt_config.leeway_seconds
+        self._revoked_jwts.put(digest, True, expires_at)
+        self._key_store.revocations.revoke("jwt", digest, int(expires_at - self._wall()) + 1)
+        return True
+
+    def _on_event(self, kind: str, digest: str) -> None:
+        if kind == "jwt":
+            self._jwt_cache.discard(digest)
+            now = self._wall()
+            if self._revoked_jwts.get(digest, now) is None:
+                # Remote revocation: Redis keeps the durable record, this spares the lookup
+                self._revoked_jwts.put(digest, True, now + CREDENTIAL_CACHE_TTL_S)
 
     def authenticate_api_key(self, key: str) -> Principal:
         """Validate API key via store backend."""
         return self._key_store.resolve(key)
 
+    async def aauthenticate_api_key(self, key: str) -> Principal:
+        """Validate API key without blocking the event loop on Redis."""
+        return await self._key_store.aresolve(key)
+
     def issue_api_key(
         self,
         *,
@@ -417,8 +708,10 @@ __all__ = [
     "ApiKeyRecord",
     "ApiKeyStore",
     "AuthProvider",
+    "CredentialCache",
     "JWTConfig",
     "Principal",
+    "RevocationChannel",
     "TokenPayload",
     "create_jwt_token",
     "decode_jwt",
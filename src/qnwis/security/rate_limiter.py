@@ -1,97 +1,39 @@
-"""Rate limiting with Redis backend and in-memory fallback."""
+"""Per-client request limits on the shared GCRA core (Redis or in-memory)."""
 
 from __future__ import annotations
 
-import threading
+import math
 import time
 from typing import Tuple
 
 from fastapi import HTTPException, Request
 
+from ..utils.rate_limit_core import Decision, Limit, RateLimitCore, async_redis_client
 from .security_settings import get_security_settings
 
-try:
-    import redis  # type: ignore
-except ImportError:
-    redis = None  # optional
-
-
-class _InMemoryStore:
-    """In-memory rate limit store for development/testing."""
-
-    def __init__(self):
-        """Initialize in-memory store."""
-        self._lock = threading.Lock()
-        self._buckets = {}  # key -> (count, reset_ts)
-
-    def incr(self, key: str, window: int) -> Tuple[int, int]:
-        """
-        Increment counter for key.
-
-        Args:
-            key: Rate limit key
-            window: Time window in seconds
-
-        Returns:
-            Tuple of (count, ttl)
-        """
-        now = int(time.time())
-        with self._lock:
-            count, reset = self._buckets.get(key, (0, now + window))
-            if now >= reset:
-                count, reset = 0, now + window
-            count += 1
-            self._buckets[key] = (count, reset)
-            return count, max(0, reset - now)
-
-
-class _RedisStore:
-    """Redis-backed rate limit store for production."""
-
-    def __init__(self, url: str):
-        """
-        Initialize Redis store.
-
-        Args:
-            url: Redis connection URL
-        """
-        self._r = redis.Redis.from_url(url, decode_responses=True)
-
-    def incr(self, key: str, window: int) -> Tuple[int, int]:
-        """
-        Increment counter for key.
-
-        Args:
-            key: Rate limit key
-            window: Time window in seconds
-
-        Returns:
-            Tuple of (count, ttl)
-        """
-        p = self._r.pipeline()
-        p.incr(key, 1)
-        p.expire(key, window, nx=True)
-        count, _ = p.execute()
-        ttl = self._r.ttl(key)
-        return int(count), max(0, ttl)
-
 
 class RateLimiter:
-    """Rate limiter with sliding window algorithm."""
+    """``max_req`` requests per ``window`` seconds per key, as a token bucket."""
 
     def __init__(self):
         """Initialize rate limiter with configured backend."""
         cfg = get_security_settings()
         self.window = cfg.rate_limit_window_sec
         self.max_req = cfg.rate_limit_max_requests
-        if cfg.redis_url and redis is not None:
-            self.store = _RedisStore(cfg.redis_url)
-        else:
-            self.store = _InMemoryStore()
+        self.core = RateLimitCore(redis=async_redis_client(cfg.redis_url), prefix="rl")
+
+    def _limits(self) -> tuple[Limit]:
+        # Built per call: tests and operators adjust max_req/window in place
+        return (Limit.per("window", self.max_req, self.window),)
+
+    def _verdict(self, decision: Decision) -> Tuple[bool, int, int]:
+        count = self.max_req - decision.remaining[0]
+        wait = decision.reset_after[0] if decision.allowed else decision.retry_after
+        return decision.allowed, count if decision.allowed else count + 1, math.ceil(wait)
 
     def check(self, key: str) -> Tuple[bool, int, int]:
         """
-        Check if request is within rate limit.
+        Check if request is within rate limit (in-process buckets).
 
         Args:
             key: Rate limit key (typically client IP + path)
@@ -99,8 +41,11 @@ class RateLimiter:
         Returns:
             Tuple of (allowed, count, ttl)
         """
-        count, ttl = self.store.incr(key, self.window)
-        return (count <= self.max_req, count, ttl)
+        return self._verdict(self.core.acquire_local(key, self._limits()))
+
+    async def acheck(self, key: str) -> Tuple[bool, int, int]:
+        """``check`` against the shared backend without blocking the event loop."""
+        return self._verdict(await self.core.acquire(key, self._limits()))
 
 
 limiter = RateLimiter()
@@ -123,7 +68,7 @@ async def rate_limit(request: Request):
         if request.client
         else "unknown"
     )
-    ok, count, ttl = limiter.check(f"rl:{client}:{request.url.path}")
+    ok, count, ttl = await limiter.acheck(f"rl:{client}:{request.url.path}")
     limit = get_security_settings().rate_limit_max_requests
     remaining = max(0, limit - count)
     reset_epoch = str(int(time.time()) + ttl)
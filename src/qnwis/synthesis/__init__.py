@@ -5,5 +5,6 @@ Provides LLM-based synthesis of agent reports into coherent answers.
 """
 
 from src.qnwis.synthesis.engine import SynthesisEngine
+from src.qnwis.synthesis.incremental import SynthesisDraft, iter_completed
 
-__all__ = ["SynthesisEngine"]
+__all__ = ["SynthesisDraft", "SynthesisEngine", "iter_completed"]
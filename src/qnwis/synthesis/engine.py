@@ -5,10 +5,11 @@ Uses LLM to synthesize agent reports into coherent, ministerial-quality answers.
 """
 
 import logging
-from typing import List, AsyncIterator
+from typing import AsyncIterable, List, AsyncIterator
 
 from src.qnwis.agents.base import AgentReport
 from src.qnwis.llm.client import LLMClient
+from src.qnwis.synthesis.incremental import SynthesisDraft
 
 logger = logging.getLogger(__name__)
 
@@ -197,6 +198,58 @@ class SynthesisEngine:
                 if report.narrative:
                     yield f"**{report.agent}**: {report.narrative}\n\n"
     
+    async def synthesize_incremental(
+        self,
+        question: str,
+        reports: AsyncIterable[AgentReport],
+        *,
+        preview: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Synthesize agent findings while reports are still arriving.
+        
+        Each report is condensed into a digest as it lands; with ``preview``
+        the digest is streamed straight away, so the first text reaches the
+        reader after the fastest agent rather than the slowest. The final
+        LLM pass runs over the compact digests behind a fixed prompt prefix.
+        
+        Args:
+            question: Original user question
+            reports: Reports in completion order (see ``iter_completed``)
+            preview: Stream each agent digest before the final pass
+            
+        Yields:
+            Draft blocks (if ``preview``) followed by synthesis text tokens
+        """
+        draft = SynthesisDraft()
+        async for report in reports:
+            digest = draft.add(report)
+            if preview and digest is not None:
+                yield ("## Draft Findings\n\n" if len(draft) == 1 else "") + digest.text + "\n\n"
+        
+        if not draft:
+            yield "No agent findings available to synthesize."
+            return
+        
+        logger.info(f"Starting incremental synthesis over {len(draft)} agent digests")
+        if preview:
+            yield "---\n\n"
+        
+        try:
+            async for token in self.llm.generate_stream(
+                prompt=draft.build_prompt(question),
+                system=SYNTHESIS_SYSTEM_PROMPT,
+                temperature=0.4,
+                max_tokens=3000
+            ):
+                yield token
+        
+        except Exception as e:
+            logger.error(f"Synthesis failed: {e}", exc_info=True)
+            # Fallback to the structured draft (already streamed with preview)
+            if not preview:
+                yield draft.render()
+    
     async def synthesize(
         self,
         question: str,
@@ -0,0 +1,282 @@
+"""
+Incremental synthesis over per-agent digests.
+
+Each agent report is condensed into a compact digest (headline, findings,
+metrics, warnings) as soon as it lands, and a structured draft is kept up
+to date from those digests. The final LLM pass then runs over the digests
+only, behind a fixed prompt prefix that is byte-identical across runs so
+providers with prefix caching can reuse it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from collections.abc import AsyncIterator, Awaitable, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from src.qnwis.agents.base import AgentReport
+
+logger = logging.getLogger(__name__)
+
+MAX_FINDINGS = 5
+MAX_METRICS = 8
+MAX_WARNINGS = 3
+HEADLINE_CHARS = 320
+SUMMARY_CHARS = 240
+
+# Static part of every incremental synthesis prompt. Keep variable content
+# (question, digests) out of it: any change here invalidates provider-side
+# prompt caches.
+SYNTHESIS_PROMPT_PREFIX = "\n".join([
+    "TASK: Synthesize the condensed agent digests below into a coherent answer.",
+    "",
+    "SYNTHESIS INSTRUCTIONS:",
+    "1. Provide an executive summary (2-3 sentences)",
+    "2. Synthesize key findings by theme",
+    "3. Include specific metrics and evidence",
+    "4. Provide actionable recommendations",
+    "5. Note any data quality concerns",
+    "",
+    "Each digest lists an agent's headline, its top findings, key metrics and",
+    "warnings. Use only the figures given in the digests.",
+    "",
+    "Write your synthesis in clear, professional markdown format.",
+    "",
+])
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    if len(text) <= limit:
+        return text
+    return text[: limit - 1].rstrip() + "…"
+
+
+def _headline(narrative: str | None) -> str:
+    """Leading sentences of the narrative, up to ``HEADLINE_CHARS``."""
+    if not narrative:
+        return ""
+    text = " ".join(narrative.split())
+    out = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{out} {sentence}".strip()
+        if len(candidate) > HEADLINE_CHARS:
+            break
+        out = candidate
+    return out or _clip(text, HEADLINE_CHARS)
+
+
+def _finding_fields(finding: Any) -> tuple[str, str, dict[str, Any], list[str]]:
+    # Graph agents may hand back findings as plain dicts after citation injection.
+    if isinstance(finding, dict):
+        return (
+            str(finding.get("title", "")),
+            str(finding.get("summary") or finding.get("analysis") or ""),
+            dict(finding.get("metrics") or {}),
+            list(finding.get("warnings") or []),
+        )
+    return (
+        getattr(finding, "title", "") or "",
+        getattr(finding, "summary", "") or "",
+        dict(getattr(finding, "metrics", None) or {}),
+        list(getattr(finding, "warnings", None) or []),
+    )
+
+
+@dataclass(frozen=True)
+class AgentDigest:
+    """
+    Compact, prompt-ready summary of one agent report.
+
+    Attributes:
+        agent: Agent name
+        headline: Leading sentences of the narrative
+        findings: (title, clipped summary) pairs
+        metrics: (name, value) pairs across findings, first occurrence wins
+        warnings: Deduplicated agent- and finding-level warnings
+        text: Rendered markdown block
+    """
+
+    agent: str
+    headline: str
+    findings: tuple[tuple[str, str], ...]
+    metrics: tuple[tuple[str, Any], ...]
+    warnings: tuple[str, ...]
+    text: str
+
+    @property
+    def tokens(self) -> int:
+        """Rough token count of the rendered block (chars / 4)."""
+        return len(self.text) // 4
+
+
+def digest_report(report: AgentReport, *, agent: str | None = None) -> AgentDigest | None:
+    """
+    Condense a report into an :class:`AgentDigest`.
+
+    Args:
+        report: Agent report
+        agent: Name to file the digest under (defaults to ``report.agent``)
+
+    Returns:
+        Digest, or None when the report has neither findings nor narrative
+    """
+    name = agent or report.agent
+    findings: list[tuple[str, str]] = []
+    metrics: dict[str, Any] = {}
+    warnings: dict[str, None] = dict.fromkeys(report.warnings or [])
+    for finding in report.findings or []:
+        title, summary, finding_metrics, finding_warnings = _finding_fields(finding)
+        if len(findings) < MAX_FINDINGS:
+            findings.append((title, _clip(summary, SUMMARY_CHARS)))
+        for key, value in finding_metrics.items():
+            if len(metrics) < MAX_METRICS:
+                metrics.setdefault(key, value)
+        warnings.update(dict.fromkeys(finding_warnings))
+    headline = _headline(getattr(report, "narrative", None))
+    if not findings and not headline:
+        return None
+
+    lines = [f"### {name}"]
+    if headline:
+        lines.append(f"**Headline**: {headline}")
+    for title, summary in findings:
+        lines.append(f"- **{title}**: {summary}" if title else f"- {summary}")
+    if metrics:
+        lines.append(
+            "Key metrics: " + "; ".join(f"{key}={value}" for key, value in metrics.items())
+        )
+    kept_warnings = tuple(list(warnings)[:MAX_WARNINGS])
+    if kept_warnings:
+        lines.append("⚠️ Warnings: " + "; ".join(kept_warnings))
+
+    return AgentDigest(
+        agent=name,
+        headline=headline,
+        findings=tuple(findings),
+        metrics=tuple(metrics.items()),
+        warnings=kept_warnings,
+        text="\n".join(lines),
+    )
+
+
+class SynthesisDraft:
+    """
+    Structured draft assembled from agent digests as reports arrive.
+
+    Digests are keyed by agent; adding a report for an agent that is
+    already present replaces its digest in place (e.g. after citation
+    injection rewrote the narrative).
+    """
+
+    def __init__(self) -> None:
+        self._digests: dict[str, AgentDigest] = {}
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    @classmethod
+    def from_reports(cls, reports: Iterable[AgentReport]) -> SynthesisDraft:
+        """Build a draft from already-completed reports."""
+        draft = cls()
+        for report in reports:
+            if report:
+                draft.add(report)
+        return draft
+
+    @property
+    def digests(self) -> list[AgentDigest]:
+        """Digests in arrival order."""
+        return list(self._digests.values())
+
+    def add(self, report: AgentReport, *, agent: str | None = None) -> AgentDigest | None:
+        """
+        Digest a report and fold it into the draft.
+
+        Args:
+            report: Newly completed agent report
+            agent: Name to file the digest under (defaults to ``report.agent``)
+
+        Returns:
+            The digest, or None if the report had nothing to contribute
+        """
+        digest = digest_report(report, agent=agent)
+        if digest is not None:
+            self._digests[digest.agent] = digest
+        return digest
+
+    def render_digests(self) -> str:
+        """All digests as one markdown block."""
+        return "\n\n".join(digest.text for digest in self._digests.values())
+
+    def render(self) -> str:
+        """
+        Structured draft: findings by agent, key metrics, data quality.
+
+        Returns:
+            Markdown draft usable as a preview or as a fallback answer
+        """
+        parts = ["## Draft Findings", "", self.render_digests()]
+        metrics = [
+            f"- {digest.agent}: {key} = {value}"
+            for digest in self._digests.values()
+            for key, value in digest.metrics[:3]
+        ]
+        if metrics:
+            parts.extend(["", "## Key Metrics", "", *metrics])
+        warnings = list(dict.fromkeys(w for d in self._digests.values() for w in d.warnings))
+        if warnings:
+            parts.extend(["", "## Data Quality Concerns", "", *(f"- {w}" for w in warnings)])
+        return "\n".join(parts)
+
+    def build_prompt(self, question: str) -> str:
+        """
+        Final-pass prompt: cached prefix, then question and digests.
+
+        Args:
+            question: Original user question
+
+        Returns:
+            User prompt for the synthesis LLM call
+        """
+        return (
+            f"{SYNTHESIS_PROMPT_PREFIX}\n"
+            f"USER QUESTION: {question}\n\n"
+            f"AGENT DIGESTS:\n\n{self.render_digests()}\n"
+        )
+
+
+async def iter_completed(
+    pending: Iterable[Awaitable[AgentReport | None]],
+) -> AsyncIterator[AgentReport]:
+    """
+    Yield agent reports in completion order, skipping failed agents.
+
+    Args:
+        pending: Awaitables that each resolve to a report (or None)
+
+    Yields:
+        Reports as they complete
+    """
+    for next_done in asyncio.as_completed(list(pending)):
+        try:
+            report = await next_done
+        except Exception as exc:
+            logger.warning("Agent failed before synthesis: %s", exc)
+            continue
+        if report is not None:
+            yield report
+
+
+__all__ = [
+    "AgentDigest",
+    "SYNTHESIS_PROMPT_PREFIX",
+    "SynthesisDraft",
+    "digest_report",
+    "iter_completed",
+]
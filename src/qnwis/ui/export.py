@@ -3,6 +3,8 @@ PNG and CSV export utilities for QNWIS UI.
 
 Provides matplotlib-based PNG chart generation and CSV table exports.
 All functions work on synthetic data via DataAPI with deterministic output.
+Charts are rendered through the shared ``ChartRenderService``, so unchanged
+data is served from the render cache.
 """
 
 from __future__ import annotations
@@ -12,15 +14,10 @@ import csv
 import hashlib
 import io
 
-import matplotlib
+from ..data.api.client import DataAPI
+from .render import ChartSpec, get_render_service
 
-matplotlib.use("Agg")  # headless, deterministic backend
-import matplotlib.pyplot as plt  # noqa: E402
-
-from ..data.api.client import DataAPI  # noqa: E402
-
-plt.rcParams["figure.dpi"] = 150
-plt.rcParams["savefig.dpi"] = 150
+SVG_SIZE = (720.0, 360.0)
 
 
 def _etag_bytes(payload: bytes) -> str:
@@ -36,6 +33,55 @@ def _etag_bytes(payload: bytes) -> str:
     return hashlib.sha256(payload).hexdigest()
 
 
+def salary_yoy_spec(api: DataAPI, sector: str, fmt: str = "png") -> ChartSpec:
+    """
+    Chart spec for the YoY salary line chart of ``sector``.
+
+    Args:
+        api: DataAPI instance for querying data
+        sector: Sector name to query
+        fmt: ``png`` or ``svg``
+
+    Returns:
+        ChartSpec ready for ``ChartRenderService.render``
+    """
+    pts = [p for p in api.yoy_salary_by_sector(sector) if p.get("yoy_percent") is not None]
+    return ChartSpec(
+        kind="line",
+        fmt=fmt,
+        title=f"Salary YoY - {sector}",
+        x=tuple(p["year"] for p in pts),
+        y=tuple(p.get("y", p.get("yoy_percent")) for p in pts),
+        xlabel="Year",
+        ylabel="YoY %",
+        size=(6.0, 3.0) if fmt == "png" else SVG_SIZE,
+    )
+
+
+def sector_employment_spec(api: DataAPI, year: int, fmt: str = "png") -> ChartSpec:
+    """
+    Chart spec for the employees-by-sector bar chart of ``year``.
+
+    Args:
+        api: DataAPI instance for querying data
+        year: Target year for employment data
+        fmt: ``png`` or ``svg``
+
+    Returns:
+        ChartSpec ready for ``ChartRenderService.render``
+    """
+    rows = api.sector_employment(year)
+    return ChartSpec(
+        kind="bar",
+        fmt=fmt,
+        title=f"Sector Employment - {year}",
+        x=tuple(r.sector for r in rows),
+        y=tuple(r.employees for r in rows),
+        ylabel="Employees",
+        size=(7.0, 3.5) if fmt == "png" else SVG_SIZE,
+    )
+
+
 def png_salary_yoy(api: DataAPI, sector: str) -> tuple[bytes, str]:
     """
     Render YoY salary series to PNG chart.
@@ -53,26 +99,8 @@ def png_salary_yoy(api: DataAPI, sector: str) -> tuple[bytes, str]:
         >>> png_data.startswith(b"\\x89PNG")
         True
     """
-    pts = api.yoy_salary_by_sector(sector)
-    xs = [p["year"] for p in pts if p.get("yoy_percent") is not None]
-    ys = [
-        p.get("y", p.get("yoy_percent")) for p in pts if p.get("yoy_percent") is not None
-    ]
-
-    fig, ax = plt.subplots(figsize=(6, 3), dpi=150)
-    ax.plot(xs, ys, marker="o")
-    ax.set_title(f"Salary YoY - {sector}")
-    ax.set_xlabel("Year")
-    ax.set_ylabel("YoY %")
-    ax.grid(True, alpha=0.3)
-
-    buf = io.BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-
-    data = buf.getvalue()
-    return data, _etag_bytes(data)
+    chart = get_render_service().render(salary_yoy_spec(api, sector))
+    return chart.body, chart.etag
 
 
 def png_sector_employment_bar(api: DataAPI, year: int) -> tuple[bytes, str]:
@@ -92,25 +120,8 @@ def png_sector_employment_bar(api: DataAPI, year: int) -> tuple[bytes, str]:
         >>> png_data.startswith(b"\\x89PNG")
         True
     """
-    rows = api.sector_employment(year)
-    cats = [r.sector for r in rows]
-    vals = [r.employees for r in rows]
-
-    fig, ax = plt.subplots(figsize=(7, 3.5), dpi=150)
-    ax.bar(cats, vals)
-    ax.set_title(f"Sector Employment - {year}")
-    ax.set_ylabel("Employees")
-    ax.set_xticks(range(len(cats)))
-    ax.set_xticklabels(cats, rotation=30, ha="right")
-    ax.grid(axis="y", alpha=0.3)
-
-    buf = io.BytesIO()
-    fig.tight_layout()
-    fig.savefig(buf, format="png")
-    plt.close(fig)
-
-    data = buf.getvalue()
-    return data, _etag_bytes(data)
+    chart = get_render_service().render(sector_employment_spec(api, year))
+    return chart.body, chart.etag
 
 
 def csv_sector_employment(api: DataAPI, year: int) -> tuple[bytes, str]:
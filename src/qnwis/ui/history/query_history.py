@@ -2,14 +2,17 @@
 Query History Tracking for QNWIS (M3).
 
 Stores and retrieves user query history for analytics and convenience.
+History lives in SQLite (see ``sqlite_store``); a legacy
+``query_history.jsonl`` in the storage directory is imported on start-up.
 """
 
-import json
 import logging
-from datetime import datetime
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .sqlite_store import SQLiteHistoryStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +36,9 @@ class QueryHistory:
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         self.history_file = self.storage_dir / "query_history.jsonl"
+        self.store = SQLiteHistoryStore(self.storage_dir / "query_history.db")
+        if self.history_file.exists():
+            self.store.import_jsonl(self.history_file)
         logger.info(f"QueryHistory initialized: {storage_dir}")
     
     def add_query(
@@ -41,7 +47,9 @@ class QueryHistory:
         request_id: str,
         provider: str = "anthropic",
         response_time_ms: Optional[float] = None,
-        result_summary: Optional[str] = None
+        result_summary: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
     ) -> None:
         """
         Add query to history.
@@ -52,49 +60,45 @@ class QueryHistory:
             provider: LLM provider used
             response_time_ms: Response time in milliseconds
             result_summary: Brief summary of results
+            user_id: Requesting user, if known
+            status: Outcome (e.g. "success", "error")
         """
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.now(UTC).replace(tzinfo=None).isoformat() + "Z",
             "question": question,
             "request_id": request_id,
             "provider": provider,
             "response_time_ms": response_time_ms,
-            "result_summary": result_summary
+            "result_summary": result_summary,
+            "user_id": user_id,
+            "status": status
         }
         
         try:
-            with open(self.history_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry) + '\n')
+            self.store.add(entry)
             logger.debug(f"Added query to history: {request_id}")
         except Exception as e:
             logger.error(f"Failed to add query to history: {e}")
     
-    def get_recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+    def get_recent(
+        self,
+        limit: int = 20,
+        user_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
         """
         Get recent queries.
         
         Args:
             limit: Maximum number of queries to return
+            user_id: Only queries by this user
+            status: Only queries with this status
             
         Returns:
             List of query entries (most recent first)
         """
-        if not self.history_file.exists():
-            return []
-        
-        entries = []
-        
         try:
-            with open(self.history_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        entry = json.loads(line)
-                        entries.append(entry)
-            
-            # Return most recent first
-            entries.reverse()
-            return entries[:limit]
-        
+            return self.store.recent(limit, user_id=user_id, status=status)
         except Exception as e:
             logger.error(f"Failed to read history: {e}")
             return []
@@ -103,6 +107,10 @@ class QueryHistory:
         """
         Search query history.
         
+        Matches questions containing every word of ``query_text`` (as a word
+        prefix), most recent first. Arabic spelling variants and diacritics
+        are ignored.
+        
         Args:
             query_text: Text to search for
             limit: Maximum results
@@ -110,15 +118,11 @@ class QueryHistory:
         Returns:
             Matching query entries
         """
-        all_queries = self.get_recent(limit=1000)
-        
-        query_text_lower = query_text.lower()
-        matches = [
-            q for q in all_queries
-            if query_text_lower in q.get("question", "").lower()
-        ]
-        
-        return matches[:limit]
+        try:
+            return self.store.search(query_text, limit)
+        except Exception as e:
+            logger.error(f"Failed to search history: {e}")
+            return []
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -127,41 +131,14 @@ class QueryHistory:
         Returns:
             Statistics dictionary
         """
-        all_queries = self.get_recent(limit=10000)
-        
-        if not all_queries:
+        stats = self.store.stats()
+        if not stats["total_queries"]:
             return {
                 "total_queries": 0,
                 "avg_response_time_ms": 0,
                 "providers": {}
             }
-        
-        # Calculate statistics
-        total = len(all_queries)
-        
-        response_times = [
-            q["response_time_ms"]
-            for q in all_queries
-            if q.get("response_time_ms") is not None
-        ]
-        
-        avg_response = (
-            sum(response_times) / len(response_times)
-            if response_times else 0
-        )
-        
-        providers = {}
-        for q in all_queries:
-            provider = q.get("provider", "unknown")
-            providers[provider] = providers.get(provider, 0) + 1
-        
-        return {
-            "total_queries": total,
-            "avg_response_time_ms": avg_response,
-            "providers": providers,
-            "oldest_query": all_queries[-1].get("timestamp") if all_queries else None,
-            "newest_query": all_queries[0].get("timestamp") if all_queries else None
-        }
+        return stats
     
     def render_recent_history(self, limit: int = 10) -> str:
         """
@@ -0,0 +1,334 @@
+"""
+SQLite backend for query history.
+
+Queries live in one table indexed by timestamp, user and status, with a
+contentless FTS5 index over the question text. Statistics come from a
+``query_rollups`` table (per day, provider and status) that an insert trigger
+keeps current, so neither searches nor stats scan the history.
+
+Questions are indexed after Arabic normalisation (harakat and tatweel removed;
+alef, yeh, waw-hamza and teh marbuta variants folded) with the ``unicode61``
+tokenizer. Searches match token prefixes rather than stems, since a stemmer
+for one script mangles the other (and Porter stems a bare query word
+differently from the same word inside a longer one).
+
+Connections are per thread, in WAL mode with ``synchronous=NORMAL``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-16000;",
+)
+BUSY_TIMEOUT_S = 30.0
+IMPORT_BATCH_SIZE = 50_000
+
+COLUMNS = (
+    "timestamp",
+    "question",
+    "request_id",
+    "provider",
+    "user_id",
+    "status",
+    "response_time_ms",
+    "result_summary",
+)
+
+_ARABIC_MARKS = re.compile("[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]")
+_ARABIC_FOLD = str.maketrans(
+    {"أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ئ": "ي", "ؤ": "و", "ة": "ه"}
+)
+_TOKEN = re.compile(r"\w+")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS queries (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        question TEXT NOT NULL,
+        request_id TEXT,
+        provider TEXT,
+        user_id TEXT,
+        status TEXT,
+        response_time_ms REAL,
+        result_summary TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_queries_timestamp ON queries(timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_queries_user ON queries(user_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_queries_status ON queries(status, timestamp)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS queries_fts USING fts5(
+        question, content='', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS query_rollups (
+        day TEXT NOT NULL,
+        provider TEXT NOT NULL,
+        status TEXT NOT NULL,
+        queries INTEGER NOT NULL,
+        timed INTEGER NOT NULL,
+        response_ms_sum REAL NOT NULL,
+        PRIMARY KEY (day, provider, status)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS queries_rollup AFTER INSERT ON queries BEGIN
+        INSERT INTO query_rollups VALUES (
+            substr(new.timestamp, 1, 10),
+            coalesce(new.provider, 'unknown'),
+            coalesce(new.status, 'unknown'),
+            1,
+            new.response_time_ms IS NOT NULL,
+            coalesce(new.response_time_ms, 0)
+        )
+        ON CONFLICT (day, provider, status) DO UPDATE SET
+            queries = queries + 1,
+            timed = timed + excluded.timed,
+            response_ms_sum = response_ms_sum + excluded.response_ms_sum;
+    END
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS history_meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+)
+
+_INSERT_SQL = (
+    f"INSERT INTO queries (id, {', '.join(COLUMNS)}) VALUES (?, {', '.join('?' * len(COLUMNS))})"
+)
+_SELECT_SQL = f"SELECT {', '.join(COLUMNS)} FROM queries"
+
+
+def normalize_text(text: str) -> str:
+    """Fold Arabic spelling variants and strip diacritics for indexing and search."""
+    return _ARABIC_MARKS.sub("", text or "").translate(_ARABIC_FOLD)
+
+
+def match_expression(query: str) -> str:
+    """FTS5 query matching every token of ``query`` as a prefix."""
+    return " ".join(f'"{token}"*' for token in _TOKEN.findall(normalize_text(query)))
+
+
+def _row(values: tuple[Any, ...]) -> dict[str, Any]:
+    entry = dict(zip(COLUMNS, values, strict=True))
+    # Entries written before user/status tracking carried neither key
+    if entry["user_id"] is None:
+        del entry["user_id"]
+    if entry["status"] is None:
+        del entry["status"]
+    return entry
+
+
+class SQLiteHistoryStore:
+    """Query history in a single SQLite file."""
+
+    def __init__(self, db_path: Path | str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._init_schema()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=BUSY_TIMEOUT_S)
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            conn.create_function("qh_normalize", 1, normalize_text, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        with conn:
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise RuntimeError(
+                    "Query history schema is newer than supported "
+                    f"(db={version}, code={SCHEMA_VERSION})."
+                )
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version={SCHEMA_VERSION};")
+
+    # -- writes -------------------------------------------------------------------
+
+    def add(self, entry: dict[str, Any]) -> None:
+        """Insert one entry (keys from ``COLUMNS``; missing keys are NULL)."""
+        conn = self._conn()
+        with self._write_lock, conn:
+            cursor = conn.execute(_INSERT_SQL, (None, *(entry.get(c) for c in COLUMNS)))
+            conn.execute(
+                "INSERT INTO queries_fts (rowid, question) VALUES (?, qh_normalize(?))",
+                (cursor.lastrowid, entry.get("question", "")),
+            )
+
+    def import_jsonl(self, path: Path | str) -> int:
+        """
+        Import complete lines of a legacy JSONL history in one transaction.
+
+        The byte offset reached is recorded, so importing the same file again
+        only picks up lines appended since.
+
+        Returns:
+            Number of entries imported
+        """
+        path = Path(path)
+        meta_key = f"jsonl_offset:{path.resolve()}"
+        conn = self._conn()
+        with self._write_lock, conn:
+            row = conn.execute(
+                "SELECT value FROM history_meta WHERE key = ?", (meta_key,)
+            ).fetchone()
+            offset = int(row[0]) if row else 0
+            if not path.exists() or path.stat().st_size <= offset:
+                return 0
+            first_id = (conn.execute("SELECT max(id) FROM queries").fetchone()[0] or 0) + 1
+            with open(path, "rb") as handle:
+                handle.seek(offset)
+                reader = _JsonlReader(handle, offset, first_id)
+                batch: list[tuple[Any, ...]] = []
+                for values in reader:
+                    batch.append(values)
+                    if len(batch) >= IMPORT_BATCH_SIZE:
+                        conn.executemany(_INSERT_SQL, batch)
+                        batch.clear()
+                conn.executemany(_INSERT_SQL, batch)
+            conn.execute(
+                "INSERT INTO queries_fts (rowid, question) "
+                "SELECT id, qh_normalize(question) FROM queries WHERE id >= ?",
+                (first_id,),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO history_meta (key, value) VALUES (?, ?)",
+                (meta_key, str(reader.offset)),
+            )
+        if reader.skipped:
+            logger.warning("Skipped %d malformed history lines in %s", reader.skipped, path)
+        logger.info("Imported %d history entries from %s", reader.imported, path)
+        return reader.imported
+
+    # -- reads --------------------------------------------------------------------
+
+    def recent(
+        self, limit: int = 20, *, user_id: str | None = None, status: str | None = None
+    ) -> list[dict[str, Any]]:
+        """Most recent entries first, optionally for one user and/or status."""
+        clauses, params = self._filters(user_id, status)
+        rows = self._conn().execute(
+            f"{_SELECT_SQL}{clauses} ORDER BY id DESC LIMIT ?", (*params, limit)
+        )
+        return [_row(values) for values in rows]
+
+    def search(self, text: str, limit: int = 10) -> list[dict[str, Any]]:
+        """Most recent entries whose question contains every token of ``text`` (as prefixes)."""
+        expression = match_expression(text)
+        if not expression:
+            return self.recent(limit)
+        rows = self._conn().execute(
+            f"{_SELECT_SQL} WHERE id IN "
+            "(SELECT rowid FROM queries_fts WHERE queries_fts MATCH ? ORDER BY rowid DESC LIMIT ?) "
+            "ORDER BY id DESC",
+            (expression, limit),
+        )
+        return [_row(values) for values in rows]
+
+    def stats(self) -> dict[str, Any]:
+        """Totals from the rollups, plus oldest/newest timestamps from the index."""
+        conn = self._conn()
+        providers: dict[str, int] = {}
+        statuses: dict[str, int] = {}
+        total = timed = 0
+        response_sum = 0.0
+        for provider, status, queries, timed_n, ms_sum in conn.execute(
+            "SELECT provider, status, sum(queries), sum(timed), sum(response_ms_sum) "
+            "FROM query_rollups GROUP BY provider, status"
+        ):
+            providers[provider] = providers.get(provider, 0) + queries
+            statuses[status] = statuses.get(status, 0) + queries
+            total += queries
+            timed += timed_n
+            response_sum += ms_sum
+        oldest, newest = conn.execute(
+            "SELECT min(timestamp), max(timestamp) FROM queries"
+        ).fetchone()
+        return {
+            "total_queries": total,
+            "avg_response_time_ms": response_sum / timed if timed else 0,
+            "providers": providers,
+            "statuses": statuses,
+            "oldest_query": oldest,
+            "newest_query": newest,
+        }
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _filters(user_id: str | None, status: str | None) -> tuple[str, tuple[Any, ...]]:
+        conditions, params = [], []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        return (f" WHERE {' AND '.join(conditions)}" if conditions else ""), tuple(params)
+
+
+class _JsonlReader:
+    """Yields insert rows from complete JSONL lines, tracking the byte offset reached."""
+
+    def __init__(self, handle: Any, offset: int, first_id: int):
+        self.handle = handle
+        self.offset = offset
+        self.next_id = first_id
+        self.imported = 0
+        self.skipped = 0
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        for line in self.handle:
+            if not line.endswith(b"\n"):
+                break  # partial line still being written
+            self.offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                values = tuple(entry.get(c) for c in COLUMNS)
+            except (ValueError, AttributeError):
+                self.skipped += 1
+                continue
+            if not isinstance(values[1], str) or not isinstance(values[0], str):
+                self.skipped += 1
+                continue
+            yield (self.next_id, *values)
+            self.next_id += 1
+            self.imported += 1
+
+
+__all__ = ["SQLiteHistoryStore", "match_expression", "normalize_text"]
@@ -0,0 +1,416 @@
+"""
+Chart rendering service with a content-addressed render cache.
+
+Charts are described by a ``ChartSpec`` (kind, format, data series and render
+parameters). The spec is hashed before anything is drawn; the digest is both
+the cache key and the ETag, so unchanged data is never re-rendered and
+conditional requests can be answered from the hash alone.
+
+Rendered bytes live in an in-memory LRU backed by a disk directory. PNG misses
+render in a process pool whose workers import matplotlib (Agg) and draw a
+throwaway figure at start-up, so the first real request does not pay for font
+and backend initialisation. SVG is pure Python and renders inline. Concurrent
+requests for the same digest share one render.
+
+Environment:
+    QNWIS_CHART_CACHE_DIR: Disk cache directory (default ``data/cache/charts``)
+    QNWIS_RENDER_WORKERS: Render processes (default ``min(2, cpu_count)``; 0 renders inline)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Bump when chart styling changes so cached renders are not reused
+RENDERER_VERSION = "1"
+DEFAULT_CACHE_DIR = Path("data/cache/charts")
+MEDIA_TYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+@dataclass(frozen=True)
+class ChartSpec:
+    """Everything that determines a rendered chart's bytes."""
+
+    kind: str  # "line" | "bar"
+    fmt: str  # "png" | "svg"
+    title: str
+    x: tuple[Any, ...]
+    y: tuple[float | None, ...]
+    xlabel: str = ""
+    ylabel: str = ""
+    size: tuple[float, float] = (6.0, 3.0)  # inches for PNG, pixels for SVG
+    dpi: int = 150
+
+    def digest(self) -> str:
+        """SHA-256 of the spec and renderer version (cache key and ETag)."""
+        blob = json.dumps([RENDERER_VERSION, asdict(self)], sort_keys=True, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.fmt]
+
+
+@dataclass(frozen=True)
+class RenderedChart:
+    """Rendered bytes with their ETag (the spec digest)."""
+
+    body: bytes
+    etag: str
+    media_type: str
+
+
+# -- renderers (module level so worker processes can unpickle them) ----------
+
+
+def _render_png(spec: ChartSpec) -> bytes:
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.size, dpi=spec.dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
+    if spec.kind == "line":
+        points = [(x, y) for x, y in zip(spec.x, spec.y, strict=True) if y is not None]
+        ax.plot([x for x, _ in points], [y for _, y in points], marker="o")
+        ax.grid(True, alpha=0.3)
+    else:
+        ax.bar(list(spec.x), list(spec.y))
+        ax.set_xticks(range(len(spec.x)))
+        ax.set_xticklabels(list(spec.x), rotation=30, ha="right")
+        ax.grid(axis="y", alpha=0.3)
+    ax.set_title(spec.title)
+    if spec.xlabel:
+        ax.set_xlabel(spec.xlabel)
+    if spec.ylabel:
+        ax.set_ylabel(spec.ylabel)
+
+    buf = io.BytesIO()
+    fig.tight_layout()
+    fig.savefig(buf, format="png", dpi=spec.dpi)
+    return buf.getvalue()
+
+
+def _render_svg(spec: ChartSpec) -> bytes:
+    from .svg import bar_chart_svg, line_chart_svg
+
+    width, height = int(spec.size[0]), int(spec.size[1])
+    if spec.kind == "line":
+        points = [{"x": x, "y": y} for x, y in zip(spec.x, spec.y, strict=True)]
+        svg = line_chart_svg(spec.title, points, width=width, height=height)
+    else:
+        svg = bar_chart_svg(
+            spec.title, [str(c) for c in spec.x], list(spec.y), width=width, height=height
+        )
+    return svg.encode("utf-8")
+
+
+def render_chart(spec: ChartSpec) -> bytes:
+    """Render ``spec`` in the current process."""
+    if spec.fmt == "png":
+        return _render_png(spec)
+    if spec.fmt == "svg":
+        return _render_svg(spec)
+    raise ValueError(f"Unsupported chart format: {spec.fmt}")
+
+
+def _warm_worker() -> None:
+    """Pool initializer: load the Agg backend and font cache once per process."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    _render_png(ChartSpec("line", "png", "warm-up", (0, 1), (0.0, 1.0), size=(1.0, 1.0), dpi=10))
+
+
+# -- cache ---------------------------------------------------------------------
+
+
+class RenderCache:
+    """Byte-bounded LRU of rendered charts, spilled to ``cache_dir`` when set."""
+
+    def __init__(self, cache_dir: Path | str | None = None, max_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _path(self, cache_dir: Path, name: str) -> Path:
+        return cache_dir / name[:2] / name
+
+    def get(self, digest: str, fmt: str) -> tuple[bytes | None, str]:
+        """Return (bytes, tier) where tier is ``memory``, ``disk`` or ``miss``."""
+        name = f"{digest}.{fmt}"
+        with self._lock:
+            body = self._entries.get(name)
+            if body is not None:
+                self._entries.move_to_end(name)
+                return body, "memory"
+        if self.cache_dir is not None:
+            try:
+                body = self._path(self.cache_dir, name).read_bytes()
+            except OSError:
+                return None, "miss"
+            self._remember(name, body)
+            return body, "disk"
+        return None, "miss"
+
+    def put(self, digest: str, fmt: str, body: bytes) -> None:
+        name = f"{digest}.{fmt}"
+        self._remember(name, body)
+        if self.cache_dir is None:
+            return
+        path = self._path(self.cache_dir, name)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not write chart cache entry %s: %s", path, exc)
+
+    def _remember(self, name: str, body: bytes) -> None:
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[name] = body
+            self._size += len(body)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+
+@dataclass
+class RenderStats:
+    """Counters for hit ratio and render latency."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    coalesced: int = 0
+    renders: int = 0
+    not_modified: int = 0
+    render_seconds: float = 0.0
+    render_seconds_max: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def snapshot(self) -> dict[str, float]:
+        with self._lock:
+            served = self.memory_hits + self.disk_hits + self.coalesced + self.renders
+            hits = served - self.renders
+            mean = self.render_seconds / self.renders if self.renders else 0.0
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "coalesced": self.coalesced,
+                "renders": self.renders,
+                "not_modified": self.not_modified,
+                "hit_ratio": hits / served if served else 0.0,
+                "render_ms_mean": mean * 1000,
+                "render_ms_max": self.render_seconds_max * 1000,
+            }
+
+
+# -- service -----------------------------------------------------------------
+
+
+class ChartRenderService:
+    """
+    Content-addressed chart rendering.
+
+    Typical endpoint use::
+
+        etag = service.known_etag(key)            # no data access
+        if etag and client_has(etag): return 304
+        chart = service.render(build_spec(api), key=key, ttl_s=ttl_s)
+    """
+
+    def __init__(
+        self,
+        *,
+        cache_dir: Path | str | None = None,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        workers: int | None = None,
+        clock: Any = time.monotonic,
+    ) -> None:
+        """
+        Initialize service.
+
+        Args:
+            cache_dir: Disk tier for rendered bytes; None keeps them in memory only
+            max_memory_bytes: Size bound of the in-memory LRU
+            workers: Render processes for PNG; 0 renders inline
+            clock: Monotonic time source for the request-key ETag memo
+        """
+        self.cache = RenderCache(cache_dir, max_memory_bytes)
+        self.workers = min(2, os.cpu_count() or 1) if workers is None else workers
+        self.stats = RenderStats()
+        self._clock = clock
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._inflight: dict[str, Future[bytes]] = {}
+        self._inflight_lock = threading.Lock()
+        self._etags: OrderedDict[Any, tuple[float, str]] = OrderedDict()
+        self._etags_lock = threading.Lock()
+
+    # -- conditional requests -------------------------------------------------
+
+    def known_etag(self, key: Any) -> str | None:
+        """ETag last rendered for a request ``key``, while its data TTL lasts."""
+        with self._etags_lock:
+            entry = self._etags.get(key)
+            if entry is None:
+                return None
+            if self._clock() >= entry[0]:
+                del self._etags[key]
+                return None
+            return entry[1]
+
+    def record_not_modified(self) -> None:
+        with self.stats._lock:
+            self.stats.not_modified += 1
+
+    def _remember_etag(self, key: Any, etag: str, ttl_s: float) -> None:
+        with self._etags_lock:
+            self._etags[key] = (self._clock() + ttl_s, etag)
+            self._etags.move_to_end(key)
+            while len(self._etags) > 10_000:
+                self._etags.popitem(last=False)
+
+    # -- rendering --------------------------------------------------------------
+
+    def render(self, spec: ChartSpec, *, key: Any = None, ttl_s: float = 60.0) -> RenderedChart:
+        """
+        Return the chart for ``spec`` from cache, an in-flight render, or a new render.
+
+        Args:
+            spec: Chart description
+            key: Request identity (route + params) to remember the ETag under
+            ttl_s: How long ``known_etag(key)`` may vouch for the data
+        """
+        digest = spec.digest()
+        body, tier = self.cache.get(digest, spec.fmt)
+        if body is None:
+            body, tier = self._render_once(digest, spec)
+        with self.stats._lock:
+            if tier == "memory":
+                self.stats.memory_hits += 1
+            elif tier == "disk":
+                self.stats.disk_hits += 1
+            elif tier == "coalesced":
+                self.stats.coalesced += 1
+        if key is not None:
+            self._remember_etag(key, digest, ttl_s)
+        return RenderedChart(body=body, etag=digest, media_type=spec.media_type)
+
+    def _render_once(self, digest: str, spec: ChartSpec) -> tuple[bytes, str]:
+        with self._inflight_lock:
+            pending = self._inflight.get(digest)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[digest] = Future()
+        if not owner:
+            return pending.result(), "coalesced"
+
+        started = time.perf_counter()
+        try:
+            body = self._render(spec)
+            self.cache.put(digest, spec.fmt, body)
+            pending.set_result(body)
+        except BaseException as exc:
+            pending.set_exception(exc)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(digest, None)
+        elapsed = time.perf_counter() - started
+        with self.stats._lock:
+            self.stats.renders += 1
+            self.stats.render_seconds += elapsed
+            self.stats.render_seconds_max = max(self.stats.render_seconds_max, elapsed)
+        return body, "render"
+
+    def _render(self, spec: ChartSpec) -> bytes:
+        pool = self._executor() if spec.fmt == "png" else None
+        if pool is None:
+            return render_chart(spec)
+        try:
+            return pool.submit(render_chart, spec).result()
+        except BrokenProcessPool as exc:
+            logger.warning("Chart render pool failed (%s); rendering inline", exc)
+            self.workers = 0
+            self.shutdown()
+            return render_chart(spec)
+
+    def _executor(self) -> ProcessPoolExecutor | None:
+        if self.workers <= 0:
+            return None
+        with self._pool_lock:
+            if self._pool is None:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_warm_worker,
+                    )
+                except (OSError, NotImplementedError) as exc:  # pragma: no cover - sandboxed hosts
+                    logger.warning("Chart render pool unavailable (%s); rendering inline", exc)
+                    self.workers = 0
+                    return None
+            return self._pool
+
+    def warm(self) -> None:
+        """Start the render processes now instead of on the first miss."""
+        pool = self._executor()
+        if pool is not None:
+            for future in [pool.submit(_warm_worker) for _ in range(self.workers)]:
+                future.result()
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+
+_service: ChartRenderService | None = None
+_service_lock = threading.Lock()
+
+
+def get_render_service() -> ChartRenderService:
+    """Process-wide render service configured from the environment."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            workers = os.getenv("QNWIS_RENDER_WORKERS")
+            _service = ChartRenderService(
+                cache_dir=os.getenv("QNWIS_CHART_CACHE_DIR") or DEFAULT_CACHE_DIR,
+                workers=int(workers) if workers else None,
+            )
+        return _service
+
+
+__all__ = [
+    "ChartRenderService",
+    "ChartSpec",
+    "RenderCache",
+    "RenderStats",
+    "RenderedChart",
+    "get_render_service",
+    "render_chart",
+]
@@ -1,16 +1,19 @@
 """
 Simple per-process token bucket rate limiting middleware.
 
-Enforces a fixed requests-per-second ceiling using an in-memory token bucket.
+Enforces a fixed requests-per-second ceiling using an in-memory token bucket
+on the shared rate-limit core.
 """
 
 from __future__ import annotations
 
-import time
+import math
 
 from starlette.responses import JSONResponse
 from starlette.types import ASGIApp, Receive, Scope, Send
 
+from .rate_limit_core import Limit, RateLimitCore
+
 
 class RateLimitMiddleware:
     """ASGI middleware implementing a naive per-process token bucket."""
@@ -27,9 +30,8 @@ class RateLimitMiddleware:
             raise ValueError("Rate must be greater than zero.")
         self.app = app
         self._rate = rate
-        self._capacity = max(1.0, rate)
-        self._tokens = self._capacity
-        self._last_refill = time.perf_counter()
+        self._limits = (Limit("rps", rate, max(1, int(rate))),)
+        self._core = RateLimitCore()
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
@@ -41,17 +43,12 @@ class RateLimitMiddleware:
             await self.app(scope, receive, send)
             return
 
-        now = time.perf_counter()
-        elapsed = now - self._last_refill
-        self._tokens = min(self._capacity, self._tokens + elapsed * self._rate)
-        self._last_refill = now
-
-        if self._tokens >= 1.0:
-            self._tokens -= 1.0
+        decision = self._core.acquire_local("process", self._limits)
+        if decision.allowed:
             await self.app(scope, receive, send)
             return
 
-        retry_after = max(1, int(1 / self._rate))
+        retry_after = max(1, math.ceil(decision.retry_after))
         response = JSONResponse(
             status_code=429,
             content={"detail": "Rate limit exceeded"},
@@ -0,0 +1,352 @@
+"""
+Shared rate-limiting core: GCRA over Redis or process memory.
+
+Every limiter in QNWIS (API principal limits, per-route limits, LLM call
+pacing, connector request budgets) delegates its decision here.
+
+The algorithm is GCRA (generic cell rate algorithm): each key stores a single
+"theoretical arrival time" (TAT) and behaves exactly like a token bucket of
+capacity ``burst`` refilled at ``rate`` tokens/second. Several limits (e.g. a
+per-second burst and a daily quota) are checked and updated all-or-nothing.
+
+With Redis, a decision is one atomic ``EVALSHA`` round-trip on an async
+connection pool, timed by the Redis server clock so every instance agrees.
+An optional lease cache pre-claims small batches of tokens so most requests
+are decided locally; unused leased tokens expire, so leasing can under-admit
+slightly but never over-admits. If Redis is unreachable the core falls back to
+the in-memory buckets and retries Redis after a cool-down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFIX = "qnwis:rl"
+REDIS_RETRY_S = 30.0
+MAX_LOCAL_KEYS = 10_000
+_EPS = 1e-9
+
+# KEYS: one TAT key per limit. ARGV: cost, then (interval, burst) per limit.
+# Returns {denied (1-based limit index, 0 = allowed), retry_after, reset_after...}
+# with floats as strings (Lua numbers are truncated to integers on return).
+GCRA_LUA = """
+if redis.replicate_commands then pcall(redis.replicate_commands) end
+local t = redis.call("TIME")
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local tats, news = {}, {}
+local denied, retry = 0, 0
+for i = 1, #KEYS do
+  local interval = tonumber(ARGV[2 * i])
+  local burst = tonumber(ARGV[2 * i + 1])
+  local tat = tonumber(redis.call("GET", KEYS[i]) or "0")
+  if tat < now then tat = now end
+  local new_tat = tat + interval * cost
+  local allow_at = new_tat - interval * burst
+  tats[i] = tat
+  news[i] = new_tat
+  if denied == 0 and allow_at > now + 1e-9 then
+    denied = i
+    retry = allow_at - now
+  end
+end
+local out = {denied, string.format("%.6f", retry)}
+for i = 1, #KEYS do
+  local tat = tats[i]
+  if denied == 0 then
+    tat = news[i]
+    redis.call("SET", KEYS[i], string.format("%.6f", tat), "PX", math.ceil((tat - now) * 1000) + 1000)
+  end
+  out[#out + 1] = string.format("%.6f", tat - now)
+end
+return out
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    """A token bucket: ``burst`` capacity refilled at ``rate`` tokens/second."""
+
+    name: str
+    rate: float
+    burst: int
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0 or self.burst < 1:
+            raise ValueError(f"Limit {self.name!r} needs rate > 0 and burst >= 1")
+
+    @classmethod
+    def per(cls, name: str, count: int, period_s: float, burst: int | None = None) -> Limit:
+        """``count`` tokens per ``period_s`` (burst defaults to ``count``)."""
+        return cls(name, count / period_s, burst or count)
+
+    @property
+    def interval(self) -> float:
+        return 1.0 / self.rate
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of one acquire across all limits of a key."""
+
+    allowed: bool
+    remaining: tuple[int, ...]
+    reset_after: tuple[float, ...]
+    retry_after: float = 0.0
+    denied_by: str | None = None
+    backend: str = "memory"
+
+
+def _decide(
+    limits: Sequence[Limit],
+    cost: int,
+    denied: int,
+    retry_after: float,
+    resets: Sequence[float],
+    backend: str,
+) -> Decision:
+    remaining = tuple(
+        max(0, math.floor(limit.burst - reset * limit.rate + _EPS))
+        for limit, reset in zip(limits, resets, strict=True)
+    )
+    return Decision(
+        allowed=denied == 0,
+        remaining=remaining,
+        reset_after=tuple(resets),
+        retry_after=retry_after,
+        denied_by=limits[denied - 1].name if denied else None,
+        backend=backend,
+    )
+
+
+def gcra(
+    tats: Sequence[float | None], now: float, limits: Sequence[Limit], cost: int
+) -> tuple[int, float, list[float], list[float]]:
+    """
+    One GCRA step; mirrors ``GCRA_LUA``.
+
+    Returns:
+        (denied 1-based limit index or 0, retry_after, reset_after per limit, TATs to store)
+    """
+    current: list[float] = []
+    proposed: list[float] = []
+    denied, retry = 0, 0.0
+    for i, (tat, limit) in enumerate(zip(tats, limits, strict=True), start=1):
+        tat = now if tat is None or tat < now else tat
+        new_tat = tat + limit.interval * cost
+        allow_at = new_tat - limit.interval * limit.burst
+        current.append(tat)
+        proposed.append(new_tat)
+        if not denied and allow_at > now + _EPS:
+            denied, retry = i, allow_at - now
+    stored = current if denied else proposed
+    return denied, retry, [tat - now for tat in stored], stored
+
+
+@dataclass
+class _Lease:
+    tokens: int
+    expires_at: float
+    remaining: tuple[int, ...]
+    reset_after: tuple[float, ...]
+
+
+class RateLimitCore:
+    """
+    Multi-limit GCRA decisions over Redis (async, atomic) or process memory.
+
+    One instance is shared by a limiter adapter; keys are caller-defined
+    (principal id, client IP + path, ``"llm"``...).
+    """
+
+    def __init__(
+        self,
+        *,
+        redis: Any | None = None,
+        prefix: str = DEFAULT_PREFIX,
+        lease_size: int = 0,
+        lease_ttl_s: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize core.
+
+        Args:
+            redis: ``redis.asyncio`` client (or compatible); None for memory only
+            prefix: Redis key prefix
+            lease_size: Tokens pre-claimed per Redis call (0/1 disables leasing)
+            lease_ttl_s: How long leased tokens stay usable locally
+            clock: Monotonic time source for the memory backend and leases
+        """
+        self.prefix = prefix
+        self.lease_size = lease_size
+        self.lease_ttl_s = lease_ttl_s
+        self._clock = clock
+        self._redis = redis
+        self._script = redis.register_script(GCRA_LUA) if redis is not None else None
+        self._redis_down_until = 0.0
+        self._tats: dict[str, list[float | None]] = {}
+        self._leases: dict[str, _Lease] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_url(cls, redis_url: str | None, **kwargs: Any) -> RateLimitCore:
+        """Core on an async Redis pool at ``redis_url``; memory only when unset or unavailable."""
+        return cls(redis=async_redis_client(redis_url), **kwargs)
+
+    @property
+    def distributed(self) -> bool:
+        return self._script is not None
+
+    # -- decisions ------------------------------------------------------------
+
+    def acquire_local(self, key: str, limits: Sequence[Limit], cost: int = 1) -> Decision:
+        """Decide against the in-process buckets only (safe from sync code)."""
+        now = self._clock()
+        with self._lock:
+            tats = self._tats.get(key)
+            if tats is None or len(tats) != len(limits):
+                tats = [None] * len(limits)
+            denied, retry, resets, stored = gcra(tats, now, limits, cost)
+            if len(self._tats) >= MAX_LOCAL_KEYS and key not in self._tats:
+                self._prune(now)
+            self._tats[key] = list(stored)
+        return _decide(limits, cost, denied, retry, resets, "memory")
+
+    async def acquire(self, key: str, limits: Sequence[Limit], cost: int = 1) -> Decision:
+        """Decide for ``cost`` tokens of ``key``: leased, Redis or memory."""
+        if self._script is None or self._clock() < self._redis_down_until:
+            return self.acquire_local(key, limits, cost)
+
+        batch = min(self.lease_size, *(limit.burst for limit in limits))
+        if batch <= cost:
+            return await self._acquire_redis(key, limits, cost)
+
+        lease = self._leases.get(key)
+        now = self._clock()
+        if lease is not None and lease.tokens >= cost and now < lease.expires_at:
+            lease.tokens -= cost
+            return Decision(
+                allowed=True,
+                remaining=tuple(r + lease.tokens for r in lease.remaining),
+                reset_after=lease.reset_after,
+                backend="lease",
+            )
+
+        decision = await self._acquire_redis(key, limits, batch)
+        if decision.allowed and decision.backend == "redis":
+            self._leases[key] = _Lease(
+                tokens=batch - cost,
+                expires_at=self._clock() + self.lease_ttl_s,
+                remaining=decision.remaining,
+                reset_after=decision.reset_after,
+            )
+            return Decision(
+                allowed=True,
+                remaining=tuple(r + batch - cost for r in decision.remaining),
+                reset_after=decision.reset_after,
+                backend="redis",
+            )
+        if decision.backend != "redis":
+            return decision
+        # Near the limit: a full batch does not fit, claim exactly what is needed
+        self._leases.pop(key, None)
+        return await self._acquire_redis(key, limits, cost)
+
+    async def wait(self, key: str, limits: Sequence[Limit], cost: int = 1) -> float:
+        """Sleep until ``cost`` tokens are granted; returns seconds waited."""
+        if any(cost > limit.burst for limit in limits):
+            raise ValueError(f"cost {cost} exceeds the burst of a limit for {key!r}")
+        waited = 0.0
+        while True:
+            decision = await self.acquire(key, limits, cost)
+            if decision.allowed:
+                return waited
+            await asyncio.sleep(decision.retry_after)
+            waited += decision.retry_after
+
+    async def reset(self, key: str, limits: Sequence[Limit]) -> None:
+        """Forget all state for ``key``."""
+        with self._lock:
+            self._tats.pop(key, None)
+            self._leases.pop(key, None)
+        if self._redis is not None:
+            try:
+                await self._redis.delete(*self._keys(key, limits))
+            except Exception as exc:
+                logger.warning("Rate-limit reset for %s failed: %s", key, exc)
+
+    def _prune(self, now: float) -> None:
+        """Drop keys whose buckets have refilled completely (same as never seen)."""
+        idle = [k for k, tats in self._tats.items() if all(t is None or t <= now for t in tats)]
+        for k in idle:
+            del self._tats[k]
+
+    # -- redis ------------------------------------------------------------------
+
+    def _keys(self, key: str, limits: Sequence[Limit]) -> list[str]:
+        # Hash tag keeps all limits of a key on one Redis Cluster slot
+        return [f"{self.prefix}:{{{key}}}:{limit.name}" for limit in limits]
+
+    async def _acquire_redis(self, key: str, limits: Sequence[Limit], cost: int) -> Decision:
+        args: list[Any] = [cost]
+        for limit in limits:
+            args.extend((repr(limit.interval), limit.burst))
+        try:
+            raw = await self._script(keys=self._keys(key, limits), args=args)
+        except Exception as exc:
+            self._redis_down_until = self._clock() + REDIS_RETRY_S
+            logger.warning(
+                "Redis rate-limit backend unavailable (%s); using in-memory limits for %.0fs",
+                exc,
+                REDIS_RETRY_S,
+            )
+            return self.acquire_local(key, limits, cost)
+        denied, retry, *resets = raw
+        return _decide(
+            limits, cost, int(denied), float(retry), [float(r) for r in resets], "redis"
+        )
+
+
+def async_redis_client(redis_url: str | None, max_connections: int = 50) -> Any | None:
+    """
+    ``redis.asyncio`` client for ``redis_url``, or None (unset or package missing).
+
+    The pool blocks briefly for a free connection under bursts instead of
+    failing, so only a genuinely unreachable server triggers the fallback.
+    """
+    if not redis_url:
+        return None
+    try:
+        import redis.asyncio as aioredis
+    except ImportError:  # pragma: no cover - optional dependency
+        logger.warning("redis package not installed; rate limits are per-process")
+        return None
+    pool = aioredis.BlockingConnectionPool.from_url(
+        redis_url,
+        decode_responses=True,
+        max_connections=max_connections,
+        timeout=0.5,
+        socket_connect_timeout=0.5,
+        socket_timeout=0.5,
+    )
+    return aioredis.Redis(connection_pool=pool)
+
+
+__all__ = [
+    "Decision",
+    "GCRA_LUA",
+    "Limit",
+    "RateLimitCore",
+    "async_redis_client",
+    "gcra",
+]
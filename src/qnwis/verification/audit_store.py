@@ -2,21 +2,326 @@
 Storage backends for audit trail persistence and retrieval.
 
 Provides SQLite database indexing and filesystem-based storage for audit manifests.
+
+The SQLite store keeps one connection per thread (WAL, ``synchronous=NORMAL``)
+instead of reconnecting per call, and can hand writes to a background writer
+that group-commits queued manifests in a single transaction. Query IDs, agents,
+timestamps, request IDs and confidence are indexed columns so searches run in
+SQL rather than deserializing every manifest.
 """
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import shutil
 import sqlite3
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
 
 from .audit_trail import AuditManifest
 
 logger = logging.getLogger(__name__)
 
-SCHEMA_VERSION = 1
+SCHEMA_VERSION = 2
+
+# Per-connection tuning: WAL lets readers run alongside the writer, NORMAL
+# sync is durable across application crashes in WAL mode.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA foreign_keys=ON;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-8000;",
+)
+BUSY_TIMEOUT_S = 30.0
+
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL_S = 0.05
+# Longest a read or close waits for queued write-behind manifests.
+FLUSH_TIMEOUT_S = BUSY_TIMEOUT_S
+
+_MANIFEST_COLUMNS = (
+    "audit_id, created_at, request_id, registry_version, code_version, "
+    "data_sources, query_ids, freshness, citations_ok, verification_ok, "
+    "digest_sha256, hmac_sha256, pack_root, manifest_json, confidence"
+)
+
+_UPSERT_SQL = f"""
+    INSERT INTO audit_manifests ({_MANIFEST_COLUMNS})
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(audit_id) DO UPDATE SET
+        created_at=excluded.created_at,
+        request_id=excluded.request_id,
+        registry_version=excluded.registry_version,
+        code_version=excluded.code_version,
+        data_sources=excluded.data_sources,
+        query_ids=excluded.query_ids,
+        freshness=excluded.freshness,
+        citations_ok=excluded.citations_ok,
+        verification_ok=excluded.verification_ok,
+        digest_sha256=excluded.digest_sha256,
+        hmac_sha256=excluded.hmac_sha256,
+        pack_root=excluded.pack_root,
+        manifest_json=excluded.manifest_json,
+        confidence=excluded.confidence
+"""
+
+
+def manifest_confidence(manifest: AuditManifest) -> float | None:
+    """
+    Confidence score recorded in the manifest, if any.
+
+    Reads ``verification["confidence"]`` or ``orchestration["confidence"]``,
+    either a number or a Step 22 breakdown with a ``score`` key.
+    """
+    for section in (manifest.verification, manifest.orchestration):
+        value = section.get("confidence") if isinstance(section, dict) else None
+        if isinstance(value, dict):
+            value = value.get("score")
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def manifest_agents(manifest: AuditManifest) -> list[str]:
+    """Distinct agent names from the orchestration metadata."""
+    agents = manifest.orchestration.get("agents", []) if manifest.orchestration else []
+    if isinstance(agents, (str, dict)):
+        agents = [agents]
+    names: list[str] = []
+    for agent in agents or []:
+        name = agent.get("name") if isinstance(agent, dict) else agent
+        if isinstance(name, str) and name and name not in names:
+            names.append(name)
+    return names
+
+
+class _ManifestRecord:
+    """Column values for one manifest plus its query/agent index rows."""
+
+    __slots__ = ("audit_id", "row", "query_ids", "agents")
+
+    def __init__(self, manifest: AuditManifest):
+        pack_root = manifest.pack_root or ""
+        if not pack_root and manifest.pack_paths.get("manifest"):
+            pack_root = str(Path(manifest.pack_paths["manifest"]).parent)
+
+        self.audit_id = manifest.audit_id
+        self.row = (
+            manifest.audit_id,
+            manifest.created_at,
+            manifest.request_id,
+            manifest.registry_version,
+            manifest.code_version,
+            json.dumps(manifest.data_sources),
+            json.dumps(manifest.query_ids),
+            json.dumps(manifest.freshness),
+            int(manifest.citations.get("ok", False)),
+            int(manifest.verification.get("ok", False)),
+            manifest.digest_sha256,
+            manifest.hmac_sha256,
+            pack_root,
+            json.dumps(manifest.to_dict(), ensure_ascii=False),
+            manifest_confidence(manifest),
+        )
+        self.query_ids = sorted(set(manifest.query_ids))
+        self.agents = manifest_agents(manifest)
+
+    @property
+    def manifest_json(self) -> str:
+        return self.row[13]
+
+
+def _write_records(conn: sqlite3.Connection, records: Sequence[_ManifestRecord]) -> None:
+    """Upsert manifests and refresh their index rows in one transaction."""
+    ids = [(record.audit_id,) for record in records]
+    with conn:
+        conn.executemany(_UPSERT_SQL, [record.row for record in records])
+        conn.executemany("DELETE FROM audit_query_ids WHERE audit_id = ?", ids)
+        conn.executemany("DELETE FROM audit_agents WHERE audit_id = ?", ids)
+        conn.executemany(
+            "INSERT INTO audit_query_ids (query_id, audit_id) VALUES (?, ?)",
+            [(qid, record.audit_id) for record in records for qid in record.query_ids],
+        )
+        conn.executemany(
+            "INSERT INTO audit_agents (agent, audit_id) VALUES (?, ?)",
+            [(agent, record.audit_id) for record in records for agent in record.agents],
+        )
+
+
+class _ConnectionPool:
+    """One tuned SQLite connection per thread for a database file."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path), timeout=BUSY_TIMEOUT_S, check_same_thread=False
+            )
+            for pragma in CONNECTION_PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:  # pragma: no cover - best effort
+                pass
+        self._local = threading.local()
+
+
+class _GroupCommitWriter:
+    """
+    Write-behind queue that commits pending manifests in batches.
+
+    Repeated upserts of the same audit ID before a flush are coalesced. A
+    batch is written when ``batch_size`` manifests are pending or after
+    ``flush_interval`` seconds; producers block once ``max_pending`` is
+    reached so the queue cannot grow without bound.
+    """
+
+    def __init__(
+        self,
+        pool: _ConnectionPool,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_S,
+        max_pending: int | None = None,
+    ):
+        self._pool = pool
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending or self.batch_size * 8
+        self._cond = threading.Condition()
+        self._pending: dict[str, _ManifestRecord] = {}
+        self._inflight: dict[str, _ManifestRecord] = {}
+        self._submitted = 0
+        self._committed = 0
+        self._closed = False
+        self._flush_waiters = 0
+        self.batches = 0
+        self.failures = 0
+        self._thread = threading.Thread(
+            target=self._run, name=f"audit-writer:{pool.db_path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, record: _ManifestRecord) -> None:
+        with self._cond:
+            while len(self._pending) >= self.max_pending and not self._closed:
+                self._cond.wait()
+            if self._closed:
+                raise RuntimeError("Audit store writer is closed")
+            self._pending.pop(record.audit_id, None)
+            self._pending[record.audit_id] = record
+            self._submitted += 1
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify_all()
+
+    def lookup(self, audit_id: str) -> _ManifestRecord | None:
+        with self._cond:
+            return self._pending.get(audit_id) or self._inflight.get(audit_id)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until everything submitted so far is committed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._submitted
+            self._flush_waiters += 1
+            self._cond.notify_all()
+            try:
+                while self._committed < target:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+    def _next_batch(self) -> tuple[dict[str, _ManifestRecord], int] | None:
+        """Block until a batch is due; None once closed and drained."""
+        with self._cond:
+            deadline: float | None = None
+            while not self._closed:
+                if len(self._pending) >= self.batch_size or (
+                    self._pending and self._flush_waiters
+                ):
+                    break
+                if self._pending:
+                    # Give concurrent producers one interval to fill the batch
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_interval
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                else:
+                    self._cond.wait()
+            if not self._pending:
+                return None
+            batch, self._pending = self._pending, {}
+            self._inflight = batch
+            self._cond.notify_all()  # wake producers blocked on max_pending
+            return batch, self._submitted - self._committed
+
+    def _run(self) -> None:
+        while (due := self._next_batch()) is not None:
+            batch, submissions = due
+            try:
+                _write_records(self._pool.connection(), list(batch.values()))
+                self.batches += 1
+            except Exception as exc:
+                # Keep the writer alive: a dead thread would never advance
+                # _committed and every flush would hang.
+                self.failures += 1
+                logger.warning(
+                    "Audit store group commit of %d manifests failed: %s", len(batch), exc
+                )
+            finally:
+                with self._cond:
+                    self._inflight = {}
+                    self._committed += submissions
+                    self._cond.notify_all()
+
+
+# Write-behind writers by database file, shared by every store instance in the
+# process so reads through any instance see queued writes.
+_WRITERS: dict[Path, _GroupCommitWriter] = {}
+_WRITERS_LOCK = threading.Lock()
+
+
+def _pending_writer(db_path: Path) -> _GroupCommitWriter | None:
+    return _WRITERS.get(db_path)
 
 
 class SQLiteAuditTrailStore:
@@ -25,28 +330,55 @@ class SQLiteAuditTrailStore:
 
     Maintains an index of audit manifests with key metadata for fast queries.
     Full manifests are still stored on disk; this provides search capabilities.
+
+    With ``write_behind=True`` :meth:`upsert` only queues the manifest and a
+    background writer group-commits queued manifests. Reads through any store
+    on the same file flush the queue first, so callers still read their own
+    writes. The pack on disk remains the source of truth if the process dies
+    before a flush.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        write_behind: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_S,
+    ):
         """
         Initialize SQLite store.
 
         Args:
             db_path: Path to SQLite database file (will be created if needed)
+            write_behind: Queue upserts for group commit instead of committing each
+            batch_size: Manifests per group commit
+            flush_interval: Maximum seconds a queued manifest waits for its batch
         """
-        self.db_path = Path(db_path)
+        self.db_path = Path(db_path).resolve()
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = _ConnectionPool(self.db_path)
 
         # Create schema if needed
         self._init_schema()
+
+        self._writer: _GroupCommitWriter | None = None
+        if write_behind:
+            with _WRITERS_LOCK:
+                writer = _WRITERS.get(self.db_path)
+                if writer is None:
+                    writer = _GroupCommitWriter(self._pool, batch_size, flush_interval)
+                    _WRITERS[self.db_path] = writer
+            self._writer = writer
         logger.info("SQLite audit store initialized: %s", self.db_path)
 
+    def _conn(self) -> sqlite3.Connection:
+        return self._pool.connection()
+
     def _init_schema(self) -> None:
         """Create or migrate schema and ensure WAL mode is enabled."""
-        with sqlite3.connect(str(self.db_path)) as conn:
-            # Enable WAL for concurrent readers/writers
-            conn.execute("PRAGMA journal_mode=WAL;")
-            conn.execute("PRAGMA synchronous=NORMAL;")
+        conn = self._conn()
+        with conn:
             current_version = conn.execute("PRAGMA user_version;").fetchone()[0]
 
             if current_version == 0:
@@ -88,7 +420,8 @@ class SQLiteAuditTrailStore:
                 digest_sha256 TEXT NOT NULL,
                 hmac_sha256 TEXT,
                 pack_root TEXT NOT NULL,
-                manifest_json TEXT NOT NULL
+                manifest_json TEXT NOT NULL,
+                confidence REAL
             )
             """
         )
@@ -110,6 +443,30 @@ class SQLiteAuditTrailStore:
             ON audit_manifests(verification_ok)
             """
         )
+        self._create_index_tables(conn)
+
+    def _create_index_tables(self, conn: sqlite3.Connection) -> None:
+        """Create the v2 confidence index and query/agent lookup tables."""
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_confidence
+            ON audit_manifests(confidence)
+            """
+        )
+        for table, column in (("audit_query_ids", "query_id"), ("audit_agents", "agent")):
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    {column} TEXT NOT NULL,
+                    audit_id TEXT NOT NULL
+                        REFERENCES audit_manifests(audit_id) ON DELETE CASCADE,
+                    PRIMARY KEY ({column}, audit_id)
+                ) WITHOUT ROWID
+                """
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_audit_id ON {table}(audit_id)"
+            )
 
     def _migrate_schema(
         self,
@@ -122,6 +479,31 @@ class SQLiteAuditTrailStore:
             self._create_schema(conn)
             return
 
+        if current_version == 1 and target_version == 2:
+            conn.execute("ALTER TABLE audit_manifests ADD COLUMN confidence REAL")
+            self._create_index_tables(conn)
+            rows = conn.execute("SELECT manifest_json FROM audit_manifests").fetchall()
+            records = []
+            for (manifest_json,) in rows:
+                try:
+                    records.append(_ManifestRecord(AuditManifest.from_dict(json.loads(manifest_json))))
+                except Exception as exc:
+                    logger.warning("Skipping unreadable manifest during migration: %s", exc)
+            # Already inside the migration transaction
+            conn.executemany(
+                "UPDATE audit_manifests SET confidence = ? WHERE audit_id = ?",
+                [(record.row[-1], record.audit_id) for record in records],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO audit_query_ids (query_id, audit_id) VALUES (?, ?)",
+                [(qid, record.audit_id) for record in records for qid in record.query_ids],
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO audit_agents (agent, audit_id) VALUES (?, ?)",
+                [(agent, record.audit_id) for record in records for agent in record.agents],
+            )
+            return
+
         raise RuntimeError(
             f"No migration path from version {current_version} to {target_version}"
         )
@@ -133,58 +515,64 @@ class SQLiteAuditTrailStore:
         Args:
             manifest: AuditManifest to store
         """
-        manifest_dict = manifest.to_dict()
-        manifest_json = json.dumps(manifest_dict, ensure_ascii=False)
+        record = _ManifestRecord(manifest)
+        if self._writer is not None:
+            self._writer.submit(record)
+            logger.debug("Queued audit manifest: %s", manifest.audit_id)
+            return
 
-        pack_root = manifest.pack_root or ""
-        if not pack_root and manifest.pack_paths.get("manifest"):
-            pack_root = str(Path(manifest.pack_paths["manifest"]).parent)
+        _write_records(self._conn(), [record])
+        logger.debug("Upserted audit manifest: %s", manifest.audit_id)
 
-        payload = (
-            manifest.audit_id,
-            manifest.created_at,
-            manifest.request_id,
-            manifest.registry_version,
-            manifest.code_version,
-            json.dumps(manifest.data_sources),
-            json.dumps(manifest.query_ids),
-            json.dumps(manifest.freshness),
-            int(manifest.citations.get("ok", False)),
-            int(manifest.verification.get("ok", False)),
-            manifest.digest_sha256,
-            manifest.hmac_sha256,
-            pack_root,
-            manifest_json,
-        )
+    def upsert_many(self, manifests: Iterable[AuditManifest]) -> None:
+        """
+        Insert or update several manifests in one transaction.
 
-        with sqlite3.connect(str(self.db_path)) as conn:
-            conn.execute(
-                """
-                INSERT INTO audit_manifests (
-                    audit_id, created_at, request_id, registry_version, code_version,
-                    data_sources, query_ids, freshness,
-                    citations_ok, verification_ok,
-                    digest_sha256, hmac_sha256, pack_root, manifest_json
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(audit_id) DO UPDATE SET
-                    created_at=excluded.created_at,
-                    request_id=excluded.request_id,
-                    registry_version=excluded.registry_version,
-                    code_version=excluded.code_version,
-                    data_sources=excluded.data_sources,
-                    query_ids=excluded.query_ids,
-                    freshness=excluded.freshness,
-                    citations_ok=excluded.citations_ok,
-                    verification_ok=excluded.verification_ok,
-                    digest_sha256=excluded.digest_sha256,
-                    hmac_sha256=excluded.hmac_sha256,
-                    pack_root=excluded.pack_root,
-                    manifest_json=excluded.manifest_json
-                """,
-                payload,
+        Args:
+            manifests: AuditManifests to store
+        """
+        records = [_ManifestRecord(manifest) for manifest in manifests]
+        if records:
+            _write_records(self._conn(), records)
+        logger.debug("Upserted %d audit manifests", len(records))
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Commit manifests queued by write-behind stores on this database.
+
+        Returns:
+            False if the timeout expired before the queue drained
+        """
+        writer = _pending_writer(self.db_path)
+        return writer.flush(timeout) if writer is not None else True
+
+    def close(self) -> None:
+        """Flush queued writes and close this store's connections."""
+        self._flush_pending()
+        self._pool.close()
+
+    def _flush_pending(self) -> None:
+        """Flush before a read, waiting at most ``FLUSH_TIMEOUT_S``."""
+        if not self.flush(FLUSH_TIMEOUT_S):
+            logger.warning(
+                "Audit store write-behind queue not drained after %.0fs; "
+                "reading without the queued manifests",
+                FLUSH_TIMEOUT_S,
             )
 
-        logger.debug("Upserted audit manifest: %s", manifest.audit_id)
+    def _fetch_manifests(self, sql: str, params: Sequence[Any] = ()) -> list[AuditManifest]:
+        self._flush_pending()
+        rows = self._conn().execute(sql, params).fetchall()
+
+        manifests = []
+        for row in rows:
+            try:
+                manifest_data = json.loads(row[0])
+                manifests.append(AuditManifest.from_dict(manifest_data))
+            except Exception as exc:
+                logger.warning("Failed to deserialize manifest: %s", exc)
+
+        return manifests
 
     def get(self, audit_id: str) -> AuditManifest | None:
         """
@@ -196,12 +584,15 @@ class SQLiteAuditTrailStore:
         Returns:
             AuditManifest if found, None otherwise
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            cursor = conn.execute(
-                "SELECT manifest_json FROM audit_manifests WHERE audit_id = ?",
-                (audit_id,),
-            )
-            row = cursor.fetchone()
+        writer = _pending_writer(self.db_path)
+        record = writer.lookup(audit_id) if writer is not None else None
+        if record is not None:
+            return AuditManifest.from_dict(json.loads(record.manifest_json))
+
+        row = self._conn().execute(
+            "SELECT manifest_json FROM audit_manifests WHERE audit_id = ?",
+            (audit_id,),
+        ).fetchone()
 
         if not row:
             return None
@@ -219,26 +610,14 @@ class SQLiteAuditTrailStore:
         Returns:
             List of AuditManifest objects, newest first
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            cursor = conn.execute(
-                """
-                SELECT manifest_json FROM audit_manifests
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (limit,),
-            )
-            rows = cursor.fetchall()
-
-        manifests = []
-        for row in rows:
-            try:
-                manifest_data = json.loads(row[0])
-                manifests.append(AuditManifest.from_dict(manifest_data))
-            except Exception as exc:
-                logger.warning("Failed to deserialize manifest: %s", exc)
-
-        return manifests
+        return self._fetch_manifests(
+            """
+            SELECT manifest_json FROM audit_manifests
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
 
     def delete(self, audit_id: str) -> None:
         """
@@ -247,7 +626,8 @@ class SQLiteAuditTrailStore:
         Args:
             audit_id: Identifier to delete.
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
+        self._flush_pending()
+        with self._conn() as conn:
             conn.execute(
                 "DELETE FROM audit_manifests WHERE audit_id = ?",
                 (audit_id,),
@@ -264,26 +644,14 @@ class SQLiteAuditTrailStore:
         Returns:
             List of matching AuditManifest objects
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            cursor = conn.execute(
-                """
-                SELECT manifest_json FROM audit_manifests
-                WHERE request_id = ?
-                ORDER BY created_at DESC
-                """,
-                (request_id,),
-            )
-            rows = cursor.fetchall()
-
-        manifests = []
-        for row in rows:
-            try:
-                manifest_data = json.loads(row[0])
-                manifests.append(AuditManifest.from_dict(manifest_data))
-            except Exception as exc:
-                logger.warning("Failed to deserialize manifest: %s", exc)
-
-        return manifests
+        return self._fetch_manifests(
+            """
+            SELECT manifest_json FROM audit_manifests
+            WHERE request_id = ?
+            ORDER BY created_at DESC
+            """,
+            (request_id,),
+        )
 
     def list_failed_verifications(self, limit: int = 50) -> list[AuditManifest]:
         """
@@ -295,27 +663,169 @@ class SQLiteAuditTrailStore:
         Returns:
             List of AuditManifest objects with verification_ok=False
         """
-        with sqlite3.connect(str(self.db_path)) as conn:
-            cursor = conn.execute(
-                """
-                SELECT manifest_json FROM audit_manifests
-                WHERE verification_ok = 0
-                ORDER BY created_at DESC
-                LIMIT ?
-                """,
-                (limit,),
+        return self._fetch_manifests(
+            """
+            SELECT manifest_json FROM audit_manifests
+            WHERE verification_ok = 0
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            (limit,),
+        )
+
+    def search(
+        self,
+        *,
+        query_id: str | None = None,
+        agent: str | None = None,
+        request_id: str | None = None,
+        since: str | None = None,
+        until: str | None = None,
+        min_confidence: float | None = None,
+        max_confidence: float | None = None,
+        verification_ok: bool | None = None,
+        limit: int = 50,
+    ) -> list[AuditManifest]:
+        """
+        Search manifests on indexed columns, newest first.
+
+        All filters are optional and combined with AND.
+
+        Args:
+            query_id: Manifests that used this query ID
+            agent: Manifests whose orchestration ran this agent
+            request_id: Original request identifier
+            since: Earliest created_at (ISO 8601, inclusive)
+            until: Latest created_at (ISO 8601, exclusive)
+            min_confidence: Lowest confidence score (inclusive)
+            max_confidence: Highest confidence score (inclusive)
+            verification_ok: Filter on verification outcome
+            limit: Maximum number of manifests to return
+
+        Returns:
+            List of matching AuditManifest objects
+        """
+        clauses: list[str] = []
+        params: list[Any] = []
+        if query_id is not None:
+            clauses.append(
+                "audit_id IN (SELECT audit_id FROM audit_query_ids WHERE query_id = ?)"
             )
-            rows = cursor.fetchall()
+            params.append(query_id)
+        if agent is not None:
+            clauses.append("audit_id IN (SELECT audit_id FROM audit_agents WHERE agent = ?)")
+            params.append(agent)
+        for clause, value in (
+            ("request_id = ?", request_id),
+            ("created_at >= ?", since),
+            ("created_at < ?", until),
+            ("confidence >= ?", min_confidence),
+            ("confidence <= ?", max_confidence),
+            ("verification_ok = ?", None if verification_ok is None else int(verification_ok)),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(limit)
+        return self._fetch_manifests(
+            f"""
+            SELECT manifest_json FROM audit_manifests
+            {where}
+            ORDER BY created_at DESC
+            LIMIT ?
+            """,
+            params,
+        )
 
-        manifests = []
-        for row in rows:
-            try:
-                manifest_data = json.loads(row[0])
-                manifests.append(AuditManifest.from_dict(manifest_data))
-            except Exception as exc:
-                logger.warning("Failed to deserialize manifest: %s", exc)
+    def compact(
+        self,
+        older_than: datetime | str,
+        *,
+        batch_size: int = 500,
+        checkpoint: bool = True,
+    ) -> list[str]:
+        """
+        Remove manifests created before the retention cutoff.
 
-        return manifests
+        Deletes in short transactions of ``batch_size`` rows so concurrent
+        writers are not blocked for the whole sweep, then checkpoints the WAL.
+
+        Args:
+            older_than: Cutoff timestamp (datetime or ISO 8601 string)
+            batch_size: Rows deleted per transaction
+            checkpoint: Truncate the WAL file after compaction
+
+        Returns:
+            Audit IDs that were removed
+        """
+        if isinstance(older_than, datetime):
+            if older_than.tzinfo is None:
+                older_than = older_than.replace(tzinfo=UTC)
+            cutoff = older_than.astimezone(UTC).isoformat()
+        else:
+            cutoff = older_than
+
+        self._flush_pending()
+        conn = self._conn()
+        removed: list[str] = []
+        while True:
+            with conn:
+                ids = [
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT audit_id FROM audit_manifests WHERE created_at < ? LIMIT ?",
+                        (cutoff, batch_size),
+                    )
+                ]
+                if not ids:
+                    break
+                conn.executemany(
+                    "DELETE FROM audit_manifests WHERE audit_id = ?", [(i,) for i in ids]
+                )
+            removed.extend(ids)
+
+        if removed and checkpoint:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE);")
+        logger.info("Compacted %d audit manifest record(s) older than %s", len(removed), cutoff)
+        return removed
+
+
+def get_audit_store(db_path: str) -> SQLiteAuditTrailStore:
+    """
+    Process-wide write-behind store for a database file.
+
+    Used by ``AuditTrail.write_pack`` so workflows share pooled connections
+    and one group-commit writer instead of opening the database per pack.
+    """
+    path = Path(db_path).resolve()
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = SQLiteAuditTrailStore(str(path), write_behind=True)
+            _STORES[path] = store
+    return store
+
+
+def close_audit_stores() -> None:
+    """Flush and close every shared store and write-behind writer."""
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+        _STORES.clear()
+    with _WRITERS_LOCK:
+        writers = list(_WRITERS.values())
+        _WRITERS.clear()
+    for writer in writers:
+        writer.flush(FLUSH_TIMEOUT_S)
+        writer.close()
+    for store in stores:
+        store._pool.close()
+
+
+_STORES: dict[Path, SQLiteAuditTrailStore] = {}
+_STORES_LOCK = threading.Lock()
+atexit.register(close_audit_stores)
 
 
 class FileSystemAuditTrailStore:
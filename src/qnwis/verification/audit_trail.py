@@ -236,6 +236,8 @@ class AuditTrail:
             "timings": orchestration_meta.get("timings", {}),
             "cache_stats": orchestration_meta.get("cache_stats", {}),
         }
+        if orchestration_meta.get("confidence") is not None:
+            orchestration_dict["confidence"] = orchestration_meta["confidence"]
 
         # Reproducibility snippet
         snippet = reproducibility_snippet(query_ids, registry_version)
@@ -455,10 +457,10 @@ class AuditTrail:
         # Index in SQLite if configured
         if self.sqlite_path:
             try:
-                from .audit_store import SQLiteAuditTrailStore
+                from .audit_store import get_audit_store
 
-                store = SQLiteAuditTrailStore(str(self.sqlite_path))
-                store.upsert(final_manifest)
+                # Shared write-behind store: pooled connections, group commits
+                get_audit_store(str(self.sqlite_path)).upsert(final_manifest)
                 logger.debug("Indexed audit pack in SQLite: %s", manifest.audit_id)
             except Exception as exc:
                 logger.warning("Failed to index in SQLite: %s", exc)
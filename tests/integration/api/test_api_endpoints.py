@@ -27,6 +27,9 @@ class ExhaustedLimiter:
             daily_remaining=100,
         )
 
+    async def aconsume(self, principal, cost: int = 1) -> RateLimitResult:
+        return self.consume(principal, cost)
+
 
 def _scenario_spec(name: str, sector: str) -> dict[str, object]:
     return {
@@ -124,18 +124,19 @@ class TestMVRefreshJob:
         assert any("idx_retention_date" in sql for sql in index_calls)
         assert any("idx_salary_sector" in sql for sql in index_calls)
 
-    def test_job_calls_refresh_concurrently(
+    def test_job_populates_new_views_without_concurrently(
         self, mock_db: MagicMock, mv_definitions_yaml: str
     ) -> None:
-        """Job calls REFRESH MATERIALIZED VIEW CONCURRENTLY for each MV."""
+        """Newly created MVs get a plain REFRESH (CONCURRENTLY needs a populated view)."""
         refresh_mv_main(mock_db, mv_definitions_yaml)
 
         # Check that REFRESH calls were made
         refresh_calls = [
             call_args[0][0]
             for call_args in mock_db.execute_sql.call_args_list
-            if "REFRESH MATERIALIZED VIEW CONCURRENTLY" in call_args[0][0]
+            if "REFRESH MATERIALIZED VIEW" in call_args[0][0]
         ]
+        assert not any("CONCURRENTLY" in sql for sql in refresh_calls)
 
         assert len(refresh_calls) == 2
 
@@ -212,7 +213,7 @@ class TestMVRefreshJob:
 
         # First MV operations should be in sequence: CREATE, REFRESH, INDEXes
         assert "CREATE MATERIALIZED VIEW" in call_list[0][0][0]
-        assert "REFRESH MATERIALIZED VIEW CONCURRENTLY" in call_list[1][0][0]
+        assert call_list[1][0][0] == "REFRESH MATERIALIZED VIEW mv_retention_monthly;"
         assert "CREATE INDEX" in call_list[2][0][0]
 
     def test_job_passes_params_to_render_select(
@@ -40,6 +40,7 @@ def test_burnrate_alert_triggers_notification(tmp_path: Path, monkeypatch):
 
     # Emit notification via helper
     emit_notifications([decision], [rule], dispatcher, clock)
+    dispatcher.flush()  # ledger writes are buffered
 
     # Verify ledger entry written
     ledger_file = ledger_dir / "incidents.jsonl"
@@ -0,0 +1,191 @@
+"""
+Unit tests for shared-fetch batch evaluation.
+
+Grouped, vectorized decisions are checked against the per-rule path, and
+the real-time alert system against its previous threshold semantics.
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.qnwis.alerts.engine import AlertEngine, plan_rule_groups, rule_group_key
+from src.qnwis.alerts.real_time_alerts import RealTimeAlertSystem
+from src.qnwis.alerts.rules import (
+    AlertRule,
+    ScopeConfig,
+    Severity,
+    TriggerConfig,
+    TriggerOperator,
+    TriggerType,
+    WindowConfig,
+)
+from src.qnwis.perf.alert_bench import synthetic_provider, synthetic_rules
+
+
+def make_rule(rule_id, trigger_type=TriggerType.THRESHOLD, op=TriggerOperator.LT, value=0.5,
+              metric="retention", code="construction", months=6, enabled=True):
+    return AlertRule(
+        rule_id=rule_id,
+        metric=metric,
+        scope=ScopeConfig(level="sector", code=code),
+        window=WindowConfig(months=months),
+        trigger=TriggerConfig(type=trigger_type, op=op, value=value),
+        horizon=12,
+        severity=Severity.LOW,
+        enabled=enabled,
+    )
+
+
+@pytest.fixture
+def engine():
+    return AlertEngine()
+
+
+class TestPlanner:
+    """Grouping of rules by series identity."""
+
+    def test_groups_by_metric_scope_and_window(self):
+        rules = [
+            make_rule("a"),
+            make_rule("b", op=TriggerOperator.GT),
+            make_rule("c", months=12),
+            make_rule("d", code="finance"),
+            make_rule("e", enabled=False),
+            make_rule("f", trigger_type=TriggerType.YOY_DELTA_PCT),
+        ]
+        groups = plan_rule_groups(rules)
+        assert list(groups.values()) == [[0, 1, 5], [2], [3]]
+        assert rule_group_key(rules[0]) == ("retention", "sector", "construction", 6)
+
+
+class TestSharedFetch:
+    """Shared-fetch batches match the per-rule path."""
+
+    def test_matches_per_rule_path(self, engine):
+        rules = synthetic_rules(600)
+        provider = synthetic_provider(latency_s=0.0)
+
+        shared = engine.batch_evaluate(rules, provider, shared_fetch=True)
+        stats = engine.last_batch_stats
+        legacy = engine.batch_evaluate(rules, provider)
+
+        assert shared == legacy
+        assert stats.fetches == stats.groups < engine.last_batch_stats.fetches
+        assert stats.dedup_ratio == pytest.approx(stats.rules / stats.groups)
+
+    @pytest.mark.parametrize(
+        "series",
+        [
+            [],
+            [0.4, float("nan"), 0.6],
+            [0.4, 0.5],  # shorter than window and YoY
+            [1.0] * 14,  # YoY on a flat series
+            [0.0] * 13,  # YoY base of zero
+            [1.7, 1.2, -0.3, 0.9, 0.8, 0.6, 0.5, 0.4, 0.4, 0.3, 0.2, 0.1, 0.0, 0.2],
+        ],
+    )
+    def test_edge_series_match(self, engine, series):
+        rules = [
+            make_rule(f"{t.value}-{op.value}", trigger_type=t, op=op, value=v, months=3)
+            for t in (TriggerType.THRESHOLD, TriggerType.YOY_DELTA_PCT,
+                      TriggerType.SLOPE_WINDOW, TriggerType.BREAK_EVENT)
+            for op in TriggerOperator
+            for v in (0.0, 0.5, 1.0)
+        ]
+        # Dedupe ids across values
+        rules = [r.model_copy(update={"rule_id": f"{r.rule_id}-{i}"}) for i, r in enumerate(rules)]
+
+        def provider(rule):
+            return list(series), []
+
+        shared = engine.batch_evaluate(rules, provider, shared_fetch=True)
+        assert shared == engine.batch_evaluate(rules, provider)
+
+    def test_provider_errors_are_per_group(self, engine):
+        rules = [make_rule("a"), make_rule("b"), make_rule("c", code="finance")]
+
+        def provider(rule):
+            if rule.scope.code == "finance":
+                raise ValueError("No data")
+            return [0.6, 0.4], []
+
+        decisions = engine.batch_evaluate(rules, provider, shared_fetch=True)
+        assert [d.triggered for d in decisions] == [True, True, False]
+        assert decisions[2].message == "Evaluation error: No data"
+
+    def test_disabled_rules_are_not_fetched(self, engine):
+        calls = []
+
+        def provider(rule):
+            calls.append(rule.rule_id)
+            return [0.4], []
+
+        decisions = engine.batch_evaluate(
+            [make_rule("off", enabled=False), make_rule("on")], provider, shared_fetch=True
+        )
+        assert decisions[0].message == "Rule disabled"
+        assert calls == ["on"]
+
+    def test_groups_are_fetched_concurrently(self, engine):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def provider(rule):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return [0.4], []
+
+        rules = [make_rule(f"r{i}", code=f"s{i}") for i in range(6)]
+        engine.batch_evaluate(rules, provider, shared_fetch=True, max_workers=4)
+        assert 1 < peak <= 4
+
+    def test_clamp_rates_can_be_disabled(self, engine):
+        rule = make_rule("rate", metric="unemployment_rate", op=TriggerOperator.GT, value=5.0)
+
+        clamped = engine.batch_evaluate([rule], lambda r: ([6.0], []), shared_fetch=True)
+        raw = engine.batch_evaluate(
+            [rule], lambda r: ([6.0], []), shared_fetch=True, clamp_rates=False
+        )
+        assert clamped[0].triggered is False
+        assert raw[0].triggered is True
+
+
+class TestRealTimeAlerts:
+    """Real-time thresholds run through the engine batch."""
+
+    def test_check_metrics_matches_threshold_semantics(self):
+        system = RealTimeAlertSystem()
+        system.set_threshold("unemployment_rate", max_value=5.0)
+        system.set_threshold("qatarization_rate", min_value=25.0)
+        system.set_threshold("band", min_value=1.0, max_value=0.5)  # both breached
+
+        alerts = system.check_metrics({
+            "unemployment_rate": 6.5,
+            "qatarization_rate": [30.0, 24.0],
+            "band": 0.75,
+            "untracked": 100.0,
+        })
+
+        assert [a.message for a in alerts] == [
+            "unemployment_rate exceeded maximum threshold: 6.5 > 5.0",
+            "qatarization_rate fell below minimum threshold: 24.0 < 25.0",
+            "band fell below minimum threshold: 0.75 < 1.0",
+        ]
+        assert system.get_active_alerts() == alerts
+
+    def test_check_metric_delegates(self):
+        system = RealTimeAlertSystem()
+        system.set_threshold("attrition_rate", max_value=15.0)
+        assert system.check_metric("attrition_rate", 15.0) is None
+        assert system.check_metric("missing", 1.0) is None
+        alert = system.check_metric("attrition_rate", 16)
+        assert alert.threshold_value == 15.0
+        assert alert.message == "attrition_rate exceeded maximum threshold: 16 > 15.0"
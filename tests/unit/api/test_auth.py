@@ -10,6 +10,7 @@ from qnwis.security.auth import (
     JWTConfig,
     Principal,
     TokenPayload,
+    _token_digest,
     decode_jwt,
 )
 from qnwis.utils.clock import Clock
@@ -79,3 +80,141 @@ def test_auth_provider_jwt(monkeypatch):
     principal = provider.authenticate_jwt(token)
     assert principal.subject == "user-1"
     assert "analyst" in principal.roles
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def _redis_store(server, **kwargs):
+    import fakeredis
+
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    return ApiKeyStore(salt="salt", redis_client=client, **kwargs)
+
+
+def test_authenticate_jwt_verifies_each_token_once(monkeypatch):
+    from qnwis.security import auth
+
+    provider = AuthProvider(jwt_config=JWTConfig(secret="secret"), env={})
+    token = provider.create_token("user-1", ["analyst"])
+    calls = []
+    real_decode = auth.decode_jwt
+    monkeypatch.setattr(auth, "decode_jwt", lambda *a, **k: calls.append(1) or real_decode(*a, **k))
+
+    assert provider.authenticate_jwt(token) == provider.authenticate_jwt(token)
+    assert len(calls) == 1
+
+
+def test_cached_jwt_expires_with_token():
+    clock = FixedClock()
+    clock.now_value = datetime.now(UTC)
+    config = JWTConfig(secret="secret", leeway_seconds=0)
+    provider = AuthProvider(jwt_config=config, clock=clock, env={})
+    token = provider.create_token("user-1", ["analyst"], ttl_minutes=1)
+    provider.authenticate_jwt(token)
+
+    clock.now_value += timedelta(minutes=2)
+    assert provider._jwt_cache.get(_token_digest(token), clock.now_value.timestamp()) is None
+
+
+def test_revoked_jwt_is_rejected_by_other_workers(redis_server):
+    server = redis_server
+    config = JWTConfig(secret="secret")
+    workers = [
+        AuthProvider(jwt_config=config, env={}, key_store=_redis_store(server)) for _ in range(2)
+    ]
+    token = workers[0].create_token("user-1", ["analyst"])
+    assert workers[1].authenticate_jwt(token).subject == "user-1"
+
+    assert workers[0].revoke_token(token)
+    _wait_for(lambda: workers[1]._jwt_cache.get(_token_digest(token), 0) is None)
+    with pytest.raises(ValueError, match="revoked"):
+        workers[1].authenticate_jwt(token)
+
+    late_worker = AuthProvider(jwt_config=config, env={}, key_store=_redis_store(redis_server))
+    with pytest.raises(ValueError, match="revoked"):
+        late_worker.authenticate_jwt(token)
+    for worker in (*workers, late_worker):
+        worker._key_store.close()
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "revocation was not delivered"
+        time.sleep(0.05)
+
+
+def test_unknown_keys_are_negatively_cached(redis_server):
+    store = _redis_store(redis_server)
+    calls = []
+    real_get = store._redis.get
+    store._redis.get = lambda key: calls.append(key) or real_get(key)
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            store.resolve("wrong")
+    assert len(calls) == 1
+
+    other = _redis_store(redis_server)
+    principal = Principal(subject="svc", roles=("analyst",))
+    other.add_key(plaintext="wrong", principal=principal)
+    _wait_for(lambda: store._negative.get(next(iter(other._records)), 0) is None)
+    assert store.resolve("wrong") == principal
+    store.close()
+    other.close()
+
+
+def test_revocation_reaches_other_workers(redis_server):
+    issuer, worker = _redis_store(redis_server), _redis_store(redis_server)
+    record = issuer.add_key(plaintext="plain", principal=Principal(subject="svc"))
+    assert worker.resolve("plain").subject == "svc"
+
+    assert issuer.revoke(record.key_id)
+    _wait_for(lambda: worker._cache.get(record.key_hash, 0) is None)
+    with pytest.raises(ValueError):
+        worker.resolve("plain")
+    issuer.close()
+    worker.close()
+
+
+def test_list_records_batches_redis_reads(redis_server):
+    store = _redis_store(redis_server)
+    for i in range(7):
+        store.add_key(plaintext=f"key-{i}", principal=Principal(subject=f"svc{i}"))
+    reader = _redis_store(redis_server)
+    reader._redis.get = lambda key: pytest.fail("list_records issued a GET per key")
+
+    assert [r.principal.subject for r in reader.list_records()] == [f"svc{i}" for i in range(7)]
+    store.close()
+    reader.close()
+
+
+async def test_async_lookups_share_the_store(redis_server):
+    import fakeredis
+
+    def async_client():
+        return fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+
+    store = _redis_store(redis_server, async_redis=async_client())
+    store.add_key(plaintext="plain", principal=Principal(subject="svc"))
+    reader = _redis_store(redis_server, async_redis=async_client())
+
+    assert (await reader.aresolve("plain")).subject == "svc"
+    with pytest.raises(ValueError):
+        await reader.aresolve("wrong")
+    assert [r.principal.subject for r in await reader.alist_records()] == ["svc"]
+    store.close()
+    reader.close()
+
+
+def test_auth_benchmark_smoke():
+    pytest.importorskip("fakeredis")
+    from qnwis.perf.auth_bench import run_benchmark
+
+    results = run_benchmark(requests=50, tokens=5, bad_keys=5, n_keys=20, rtt_s=0.0)
+    assert results["bad_key"]["cached_round_trips"] < results["bad_key"]["legacy_round_trips"]
+    assert results["listing"]["cached_round_trips"] < results["listing"]["legacy_round_trips"]
@@ -0,0 +1,79 @@
+"""
+Unit tests for resuming a council SSE stream after the client drops.
+"""
+
+import asyncio
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from src.qnwis.api.routers import council_llm
+from src.qnwis.orchestration.streaming import WorkflowEvent
+
+
+@pytest.fixture
+def stub_workflow(monkeypatch):
+    """Workflow that emits three stages, waiting on a gate before finishing."""
+    gate = asyncio.Event()
+
+    async def fake_stream(**_):
+        yield WorkflowEvent("classify", "complete", {"n": 1})
+        yield WorkflowEvent("prefetch", "complete", {"n": 2})
+        await gate.wait()
+        yield WorkflowEvent("done", "complete", {"n": 3})
+
+    monkeypatch.setattr(council_llm, "run_workflow_stream", fake_stream)
+    monkeypatch.setattr(council_llm, "DataClient", lambda: None)
+    monkeypatch.setattr(council_llm, "LLMClient", lambda **_: None)
+    monkeypatch.setattr(council_llm, "Classifier", lambda: None)
+    return gate
+
+
+async def _open_run():
+    req = council_llm.CouncilRequest(question="How is attrition trending?", provider="anthropic")
+    response = await council_llm.council_stream_llm(req)
+    return response.headers["x-request-id"], response.body_iterator
+
+
+async def _read_until(stream, stage):
+    frames = []
+    async for chunk in stream:
+        frames.append(chunk.decode() if isinstance(chunk, bytes) else chunk)
+        if f'"stage":"{stage}"' in frames[-1]:
+            break
+    return frames
+
+
+async def test_dropped_client_resumes_full_run(stub_workflow):
+    request_id, first = await _open_run()
+    seen = await _read_until(first, "prefetch")
+    await first.aclose()  # client disconnects mid-run
+    last_id = re.findall(r"^id: (\S+)$", "".join(seen), re.M)[-1]
+
+    await asyncio.sleep(0.01)
+    producer = council_llm._PRODUCERS[f"council:{request_id}"]
+    assert not producer.cancelled()
+
+    resumed = await council_llm.council_stream_resume(
+        request_id, SimpleNamespace(headers={"last-event-id": last_id})
+    )
+    stub_workflow.set()
+    rest = "".join(await _read_until(resumed.body_iterator, "done"))
+
+    assert '"stage":"done"' in rest
+    assert '"stage":"prefetch"' not in rest
+    await producer
+    assert not producer.cancelled()
+
+
+async def test_abandoned_run_is_cancelled_after_grace(stub_workflow, monkeypatch):
+    monkeypatch.setattr(council_llm, "RESUME_GRACE_SECONDS", 0.01)
+    request_id, first = await _open_run()
+    await _read_until(first, "prefetch")
+    producer = council_llm._PRODUCERS[f"council:{request_id}"]
+    await first.aclose()
+
+    assert not producer.done()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(producer, timeout=1)
@@ -1,4 +1,6 @@
-from qnwis.security import Principal
+import pytest
+
+from qnwis.security import Principal, ratelimit
 from qnwis.security.ratelimit import RateLimiter
 from qnwis.utils.clock import Clock
 
@@ -42,3 +44,25 @@ def test_rate_limiter_refills_tokens():
     clock.advance(1.5)
     refreshed = limiter.consume(principal)
     assert refreshed.allowed
+
+
+async def test_aconsume_shares_limits_across_instances(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        ratelimit,
+        "async_redis_client",
+        lambda url: fakeredis.FakeAsyncRedis(server=server, decode_responses=True),
+    )
+    first = RateLimiter(rps=1, burst=2, daily=10, redis_url="redis://shared")
+    second = RateLimiter(rps=1, burst=2, daily=10, redis_url="redis://shared")
+    principal = Principal(subject="svc", roles=("analyst",), ratelimit_id="svc")
+
+    assert (await first.aconsume(principal)).allowed
+    allowed = await second.aconsume(principal)
+    assert allowed.allowed and allowed.daily_remaining == 8
+    denied = await first.aconsume(principal)
+    assert not denied.allowed
+    assert denied.reason == "rps_limit_exceeded"
+    assert 0 < denied.reset_after <= 1.0
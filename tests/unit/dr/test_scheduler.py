@@ -0,0 +1,165 @@
+"""Unit tests for DR cron parsing and the backup scheduler."""
+
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.qnwis.dr.models import CatchUpPolicy, ScheduleSpec
+from src.qnwis.dr.scheduler import BackupScheduler, CronParser
+from src.qnwis.perf.cron_bench import (
+    brute_force_next_run,
+    random_cron,
+    random_schedules,
+    simulate_heap,
+    simulate_legacy,
+)
+from src.qnwis.utils.clock import ManualClock
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+HORIZON = timedelta(days=8)
+
+
+def schedule(schedule_id: str, cron_expr: str, **kwargs) -> ScheduleSpec:
+    return ScheduleSpec(schedule_id=schedule_id, spec_id="spec", cron_expr=cron_expr, **kwargs)
+
+
+class TestNextRun:
+    """Field-wise next-match arithmetic against the minute-by-minute scan."""
+
+    def test_matches_brute_force_on_random_expressions(self) -> None:
+        rng = random.Random(2024)
+        for _ in range(300):
+            parser = CronParser(random_cron(rng))
+            after = START + timedelta(minutes=rng.randrange(4 * 525_600), seconds=rng.randrange(60))
+            expected = brute_force_next_run(parser, after, HORIZON)
+            try:
+                actual = parser.next_run(after)
+            except ValueError:
+                assert expected is None, parser.expr
+                continue
+            if expected is None:
+                assert actual > after + HORIZON and parser.matches(actual), parser.expr
+            else:
+                assert actual == expected, (parser.expr, after)
+
+    def test_dense_expressions_match_at_every_boundary(self) -> None:
+        # Walks across hour, day, month and year ends in 7-minute steps
+        exprs = ["*/7 * * * *", "59 23 * * *", "0 0 1 * *", "30 */5 28-31 * 0-4"]
+        for expr in exprs:
+            parser = CronParser(expr)
+            for minutes in range(-180, 180, 7):
+                after = datetime(2024, 12, 31, 23, 0, tzinfo=UTC) + timedelta(minutes=minutes)
+                assert parser.next_run(after) == brute_force_next_run(parser, after, timedelta(days=40))
+
+    @pytest.mark.parametrize(
+        ("expr", "after", "expected"),
+        [
+            ("0 0 1 1 *", datetime(2024, 12, 31, 23, 59), datetime(2025, 1, 1, 0, 0)),
+            ("0 12 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29, 12, 0)),
+            ("0 9 13 * 4", datetime(2024, 1, 1), datetime(2024, 9, 13, 9, 0)),  # Friday 13th
+            ("15 2 * * *", datetime(2024, 5, 1, 2, 15, 42), datetime(2024, 5, 2, 2, 15)),
+            ("0 0 31 * *", datetime(2024, 4, 1), datetime(2024, 5, 31, 0, 0)),
+        ],
+    )
+    def test_carries_across_fields(self, expr: str, after: datetime, expected: datetime) -> None:
+        assert CronParser(expr).next_run(after) == expected
+
+    def test_keeps_timezone(self) -> None:
+        assert CronParser("0 2 * * *").next_run(START) == datetime(2024, 1, 1, 2, 0, tzinfo=UTC)
+
+    def test_never_matching_expression_raises(self) -> None:
+        with pytest.raises(ValueError, match="never matches"):
+            CronParser("0 0 31 2 *").next_run(START)
+
+
+class TestBackupScheduler:
+    """Heap ordering and missed-run catch-up."""
+
+    def test_next_wakeup_is_earliest_enabled_schedule(self) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock)
+        scheduler.add_schedule(schedule("daily", "0 2 * * *"))
+        scheduler.add_schedule(schedule("hourly", "30 * * * *"))
+        scheduler.add_schedule(schedule("off", "*/5 * * * *", enabled=False))
+
+        assert scheduler.next_wakeup() == START.replace(minute=30)
+        scheduler.remove_schedule("hourly")
+        assert scheduler.next_wakeup() == START.replace(hour=2)
+
+    def test_get_due_jobs_until_updated(self) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock)
+        scheduler.add_schedule(schedule("daily", "0 2 * * *"))
+
+        assert scheduler.get_due_jobs() == []
+        clock.advance(2 * 3600)
+        assert [s.schedule_id for s in scheduler.get_due_jobs()] == ["daily"]
+        assert [s.schedule_id for s in scheduler.get_due_jobs()] == ["daily"]
+
+        updated = scheduler.update_next_run("daily")
+        assert updated is not None
+        assert updated.next_run_at == "2024-01-02T02:00:00+00:00"
+        assert scheduler.get_due_jobs() == []
+
+    def test_existing_next_run_at_is_honoured(self) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock)
+        scheduler.add_schedule(schedule("s", "0 2 * * *", next_run_at="2024-01-01T00:10:00Z"))
+        clock.advance(600)
+        assert [s.schedule_id for s in scheduler.get_due_jobs()] == ["s"]
+
+    @pytest.mark.parametrize(
+        ("policy", "expected"),
+        [
+            (CatchUpPolicy.SKIP, []),
+            (CatchUpPolicy.ONCE, [(datetime(2024, 1, 1, 1, 0, tzinfo=UTC), True)]),
+            (
+                CatchUpPolicy.ALL,
+                [(datetime(2024, 1, 1, h, 0, tzinfo=UTC), True) for h in range(1, 5)],
+            ),
+        ],
+    )
+    def test_catch_up_after_outage(self, policy: CatchUpPolicy, expected: list) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock)
+        scheduler.add_schedule(schedule("hourly", "0 * * * *", catch_up=policy))
+        assert [(r.scheduled_for, r.late) for r in scheduler.pop_due()] == [(START, False)]
+
+        clock.advance(4 * 3600 + 20 * 60)  # down from 00:00 to 04:20
+        runs = scheduler.pop_due()
+        assert [(r.scheduled_for, r.late) for r in runs] == expected
+        assert scheduler.next_wakeup() == datetime(2024, 1, 1, 5, 0, tzinfo=UTC)
+
+    def test_skip_runs_fire_time_within_grace(self) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock, misfire_grace_seconds=120)
+        scheduler.add_schedule(schedule("s", "*/10 * * * *", catch_up=CatchUpPolicy.SKIP))
+        scheduler.pop_due()
+
+        clock.advance(41 * 60)  # 00:10 .. 00:30 missed, 00:40 one minute ago
+        runs = scheduler.pop_due()
+        assert [r.scheduled_for for r in runs] == [START.replace(minute=40)]
+        assert scheduler.next_wakeup() == START.replace(minute=50)
+
+    def test_catch_up_all_is_bounded_per_poll(self) -> None:
+        clock = ManualClock(start=START)
+        scheduler = BackupScheduler(clock, max_catch_up=5)
+        scheduler.add_schedule(schedule("s", "* * * * *", catch_up=CatchUpPolicy.ALL))
+        clock.advance(11 * 60 + 30)
+
+        assert len(scheduler.pop_due()) == 5
+        assert len(scheduler.pop_due()) == 5
+        assert [r.scheduled_for for r in scheduler.pop_due()] == [
+            START.replace(minute=10),
+            START.replace(minute=11),
+        ]
+        assert scheduler.pop_due() == []
+
+    def test_heap_releases_same_runs_as_polling_scan(self) -> None:
+        schedules = random_schedules(150, seed=7)
+        heap_runs, wakeups = simulate_heap(schedules, minutes=720)
+        assert sorted(heap_runs) == sorted(simulate_legacy(schedules, minutes=720))
+        assert wakeups <= 720
@@ -0,0 +1,134 @@
+"""
+Unit tests for the one-pass backtest engine.
+
+Checks exact parity with the previous refit-per-fold backtest.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+import pytest
+
+from src.qnwis.forecast.backtest import (
+    backtest_baselines,
+    baseline_methods,
+    choose_baseline,
+    rolling_origin_backtest,
+)
+from src.qnwis.forecast.baselines import (
+    ewma_forecast,
+    robust_trend_forecast,
+    rolling_mean_forecast,
+    seasonal_naive,
+)
+from src.qnwis.forecast.early_warning import backtest_band_breaches
+from src.qnwis.perf.backtest_bench import legacy_rolling_origin_backtest, synthetic_series
+
+
+def _same(a: dict[str, float], b: dict[str, float]) -> bool:
+    """Exact equality, treating NaN metrics as equal."""
+    for key in ("mae", "mape", "rmse", "n"):
+        if isinstance(a[key], float) and math.isnan(a[key]):
+            if not math.isnan(b[key]):
+                return False
+        elif a[key] != b[key]:
+            return False
+    return True
+
+
+SERIES = {
+    "seasonal_trend": synthetic_series(180),
+    "linear": [10.0 + i * 0.5 for i in range(60)],
+    "flat": [15.0] * 40,
+    "near_zero": [0.0, 0.001, 0.002, 0.001, 0.0] * 10,
+    "with_nan": [float("nan") if i % 7 == 0 else float(i % 13) for i in range(80)],
+}
+
+
+class TestParity:
+    """Engine metrics equal the per-fold refit exactly."""
+
+    @pytest.mark.parametrize("series_name", sorted(SERIES))
+    @pytest.mark.parametrize("method_name", sorted(baseline_methods()))
+    @pytest.mark.parametrize("horizon,min_train", [(1, 24), (3, 20), (1, 6)])
+    def test_baselines(self, series_name: str, method_name: str, horizon: int, min_train: int) -> None:
+        func, kwargs = baseline_methods()[method_name]
+        series = SERIES[series_name]
+        expected = legacy_rolling_origin_backtest(series, func, horizon=horizon, min_train=min_train, **kwargs)
+        actual = rolling_origin_backtest(series, func, horizon=horizon, min_train=min_train, **kwargs)
+        assert _same(actual, expected), (actual, expected)
+
+    @pytest.mark.parametrize(
+        "func,kwargs",
+        [
+            (ewma_forecast, {"alpha": 1.5}),
+            (rolling_mean_forecast, {"window": 0}),
+            (robust_trend_forecast, {"window": 1}),
+            (seasonal_naive, {"season": 0}),
+        ],
+    )
+    def test_unsupported_parameters_fall_back(self, func, kwargs) -> None:
+        series = SERIES["seasonal_trend"]
+        expected = legacy_rolling_origin_backtest(series, func, horizon=1, min_train=24, **kwargs)
+        actual = rolling_origin_backtest(series, func, horizon=1, min_train=24, **kwargs)
+        assert _same(actual, expected)
+
+    def test_choose_baseline_leaderboard(self) -> None:
+        series = SERIES["seasonal_trend"]
+        selection = choose_baseline(series, season=12)
+        for name, (func, kwargs) in baseline_methods(12).items():
+            assert selection.leaderboard[name] == legacy_rolling_origin_backtest(series, func, **kwargs)
+        assert selection.backtest is not None
+
+
+class TestBacktestResult:
+    """Error tensor and vectorized summary."""
+
+    def test_tensor_shapes(self) -> None:
+        result = backtest_baselines(SERIES["seasonal_trend"], horizon=6, min_train=24)
+        folds = 180 - 6 + 1 - 24
+        assert result.forecasts.shape == (folds, 4, 6)
+        assert result.actuals.shape == (folds, 6)
+        assert result.errors.shape == (folds, 4, 6)
+
+    def test_multi_step_paths_match_baselines(self) -> None:
+        series = SERIES["seasonal_trend"]
+        result = backtest_baselines(series, horizon=6, min_train=24)
+        fold = 40
+        t = int(result.origins[fold])
+        for k, name in enumerate(result.methods):
+            func, kwargs = baseline_methods()[name]
+            expected = np.array(func(series[:t], horizon=6, **kwargs), dtype=float)
+            np.testing.assert_array_equal(result.forecasts[fold, k], expected)
+
+    def test_summary_matches_metrics(self) -> None:
+        result = backtest_baselines(SERIES["seasonal_trend"], horizon=2, min_train=24)
+        summary = result.summary()
+        for name in result.methods:
+            metrics = result.metrics(name, step=1)
+            assert summary[name]["n"][0] == metrics["n"]
+            assert summary[name]["mae"][0] == pytest.approx(metrics["mae"], abs=1e-4)
+            assert 0.0 <= summary[name]["coverage"][1] <= 1.0
+
+    def test_too_short_series(self) -> None:
+        result = backtest_baselines([1.0, 2.0, 3.0], min_train=24)
+        assert result.origins.size == 0
+        assert result.metrics("ewma")["n"] == 0
+
+
+class TestBacktestBandBreaches:
+    """Band breach rate over backtest folds."""
+
+    def test_breach_rate(self) -> None:
+        series = [10.0] * 30 + [20.0] * 5
+        result = backtest_baselines(series, {"ewma": (ewma_forecast, {"alpha": 0.3})}, min_train=24)
+        history = backtest_band_breaches(result, "ewma", half_width=1.0)
+        assert history["n"] == 11
+        assert history["breaches"] == 5
+        assert history["breach_rate"] == round(5 / 11, 4)
+
+    def test_unknown_method(self) -> None:
+        result = backtest_baselines(SERIES["flat"], min_train=24)
+        assert backtest_band_breaches(result, "arima", half_width=1.0)["n"] == 0
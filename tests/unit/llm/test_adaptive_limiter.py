@@ -0,0 +1,191 @@
+"""
+Tests for the adaptive (AIMD) concurrency limiter.
+
+The simulation uses a stub LLM whose latency grows once concurrency passes
+its capacity and which returns 429s beyond a hard ceiling.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from src.qnwis.llm.adaptive_limiter import (
+    AdaptiveConcurrencyLimiter,
+    AdaptiveLimitConfig,
+    get_adaptive_limiter,
+    is_overload_error,
+    reset_adaptive_limiter,
+)
+from src.qnwis.llm.exceptions import LLMRateLimitError
+
+
+class StubLLM:
+    """Latency grows linearly with load above ``capacity``; 429 above ``ceiling``."""
+
+    def __init__(self, capacity: int, ceiling: int | None = None, base_s: float = 0.002):
+        self.capacity = capacity
+        self.ceiling = ceiling
+        self.base_s = base_s
+        self.active = 0
+        self.peak = 0
+        self.rate_limited = 0
+
+    async def call(self) -> str:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.ceiling is not None and self.active > self.ceiling:
+                self.rate_limited += 1
+                await asyncio.sleep(self.base_s / 2)
+                raise LLMRateLimitError("429 Too Many Requests")
+            overload = max(0, self.active - self.capacity)
+            await asyncio.sleep(self.base_s * (1 + overload))
+            return "ok"
+        finally:
+            self.active -= 1
+
+
+async def _drive(limiter, llm, calls: int, workers: int = 48) -> list[int]:
+    """Run ``calls`` stub requests from ``workers`` clients; return limit history."""
+    remaining = iter(range(calls))
+    history = []
+
+    async def worker():
+        for _ in remaining:
+            try:
+                async with limiter.slot("llm"):
+                    await llm.call()
+            except LLMRateLimitError:
+                pass
+            history.append(limiter.limit)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return history
+
+
+def _config(**overrides) -> AdaptiveLimitConfig:
+    params = dict(initial_limit=2, min_limit=1, max_limit=40, window=10)
+    params.update(overrides)
+    return AdaptiveLimitConfig(**params)
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_while_backend_is_healthy():
+    limiter = AdaptiveConcurrencyLimiter(_config())
+    llm = StubLLM(capacity=32)
+
+    await _drive(limiter, llm, calls=600)
+
+    assert limiter.limit > 8
+    assert limiter.metrics.increases > 0
+    assert llm.peak <= limiter.config.max_limit
+
+
+@pytest.mark.asyncio
+async def test_limit_converges_below_latency_knee():
+    limiter = AdaptiveConcurrencyLimiter(_config(initial_limit=24, latency_tolerance=2.5))
+    llm = StubLLM(capacity=6, base_s=0.004)
+
+    history = await _drive(limiter, llm, calls=800)
+
+    tail = history[-200:]
+    assert limiter.metrics.decreases > 0
+    # Oscillates around the knee instead of staying at the initial 24
+    assert max(tail) <= 14
+    assert min(tail) >= 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limits_trigger_multiplicative_backoff():
+    limiter = AdaptiveConcurrencyLimiter(_config(initial_limit=20))
+    llm = StubLLM(capacity=100, ceiling=5)
+
+    history = await _drive(limiter, llm, calls=600)
+
+    assert limiter.metrics.total_overloads > 0
+    assert max(history[-100:]) <= 8
+    # Once converged, the 429 rate stays low
+    late_errors_before = llm.rate_limited
+    await _drive(limiter, llm, calls=200)
+    assert llm.rate_limited - late_errors_before < 40
+
+
+@pytest.mark.asyncio
+async def test_one_backoff_per_congestion_event():
+    limiter = AdaptiveConcurrencyLimiter(_config(initial_limit=16, window=1000))
+    leases = [await limiter.acquire() for _ in range(16)]
+
+    for lease in leases:
+        limiter.release(lease, error=LLMRateLimitError("429"))
+
+    assert limiter.metrics.decreases == 1
+    assert limiter.limit == 11
+
+
+@pytest.mark.asyncio
+async def test_waiters_queue_and_export_delay():
+    limiter = AdaptiveConcurrencyLimiter(_config(initial_limit=1, window=1000))
+    first = await limiter.acquire("scenario")
+
+    waiter = asyncio.create_task(limiter.acquire("engine_b"))
+    await asyncio.sleep(0.02)
+    assert limiter.get_metrics()["queued"] == 1
+    assert limiter.get_metrics()["in_flight_by_kind"] == {"scenario": 1}
+
+    limiter.release(first)
+    second = await waiter
+    metrics = limiter.get_metrics()
+    assert metrics["in_flight"] == 1
+    assert metrics["queue_delay_ms_p95"] >= 15
+    limiter.release(second)
+
+
+@pytest.mark.asyncio
+async def test_gate_capacity_follows_shared_limit():
+    limiter = AdaptiveConcurrencyLimiter(_config(initial_limit=8))
+    gate = limiter.gate(units_per_task=4)
+    capped = limiter.gate(units_per_task=1, max_tasks=3)
+    assert gate.capacity == 2
+    assert capped.capacity == 3
+
+    running = []
+
+    async def scenario(i):
+        async with gate.admit():
+            running.append(gate.running)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(scenario(i) for i in range(6)))
+    assert max(running) == 2
+
+    limiter._limit = 16
+    assert gate.capacity == 4
+
+
+def test_default_limit_admits_two_scenarios():
+    gate = AdaptiveConcurrencyLimiter().gate(units_per_task=4)
+    assert gate.capacity == 2
+
+
+def test_overload_classification():
+    class HTTPStatusError(Exception):
+        def __init__(self, status):
+            self.response = type("R", (), {"status_code": status})()
+
+    class ReadTimeout(Exception):
+        pass
+
+    assert is_overload_error(LLMRateLimitError("x"))
+    assert is_overload_error(asyncio.TimeoutError())
+    assert is_overload_error(HTTPStatusError(429))
+    assert is_overload_error(ReadTimeout())
+    assert not is_overload_error(HTTPStatusError(400))
+    assert not is_overload_error(ValueError("bad output"))
+
+
+def test_shared_limiter_singleton():
+    reset_adaptive_limiter()
+    assert get_adaptive_limiter() is get_adaptive_limiter()
+    reset_adaptive_limiter()
@@ -6,7 +6,8 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from src.qnwis.data.materialized.postgres import PostgresMaterializer
+from src.qnwis.data.materialized.planner import checksum_watermark, postgres_watermark
+from src.qnwis.data.materialized.postgres import PostgresMaterializer, SQLAlchemyAdapter
 
 
 @pytest.fixture
@@ -55,7 +56,7 @@ class TestPostgresMaterializer:
 
         # Check REFRESH call
         refresh_call = calls[1][0][0]
-        assert refresh_call == "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_retention;"
+        assert refresh_call == "REFRESH MATERIALIZED VIEW mv_retention;"
 
         # Check index creation calls
         index_call_1 = calls[2][0][0]
@@ -67,8 +68,8 @@ class TestPostgresMaterializer:
     def test_refresh_calls_refresh_concurrently(
         self, materializer: PostgresMaterializer, mock_db: MagicMock
     ) -> None:
-        """refresh executes REFRESH MATERIALIZED VIEW CONCURRENTLY."""
-        materializer.refresh("mv_test")
+        """refresh(concurrently=True) executes REFRESH MATERIALIZED VIEW CONCURRENTLY."""
+        materializer.refresh("mv_test", concurrently=True)
 
         mock_db.execute_sql.assert_called_once_with(
             "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_test;"
@@ -161,7 +162,7 @@ class TestPostgresMaterializer:
         assert "SELECT * FROM employees" in call_list[0][0][0]
 
         # Second call: REFRESH
-        assert call_list[1][0][0] == "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_test;"
+        assert call_list[1][0][0] == "REFRESH MATERIALIZED VIEW mv_test;"
 
         # Third and fourth calls: CREATE INDEX
         assert call_list[2][0][0] == "CREATE INDEX IF NOT EXISTS idx1 ON mv_test(col1);"
@@ -174,7 +175,7 @@ class TestPostgresMaterializer:
         materializer.refresh("mv_test_2024_q1")
 
         mock_db.execute_sql.assert_called_once_with(
-            "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_test_2024_q1;"
+            "REFRESH MATERIALIZED VIEW mv_test_2024_q1;"
         )
 
     def test_drop_with_special_chars_in_name(
@@ -206,3 +207,54 @@ class TestPostgresMaterializer:
         assert "idx_a ON mv_test(col_a)" in index_calls[0][0][0]
         assert "idx_b ON mv_test(col_b)" in index_calls[1][0][0]
         assert "idx_c ON mv_test(col_c)" in index_calls[2][0][0]
+
+    def test_create_with_unique_index_populates_before_concurrent_refreshes(
+        self, materializer: PostgresMaterializer, mock_db: MagicMock
+    ) -> None:
+        """A unique index is built before a plain first populate."""
+        materializer.create_or_replace(
+            "mv_test",
+            "SELECT * FROM employees",
+            ["idx_a ON mv_test(col_a)"],
+            unique_index="uq_mv_test ON mv_test(id)",
+        )
+
+        calls = [c[0][0] for c in mock_db.execute_sql.call_args_list]
+        assert calls[1] == "CREATE UNIQUE INDEX IF NOT EXISTS uq_mv_test ON mv_test(id);"
+        assert calls[2] == "REFRESH MATERIALIZED VIEW mv_test;"
+        assert calls[3] == "CREATE INDEX IF NOT EXISTS idx_a ON mv_test(col_a);"
+
+    def test_refresh_defaults_to_blocking(
+        self, materializer: PostgresMaterializer, mock_db: MagicMock
+    ) -> None:
+        """refresh without a unique index in play issues a plain refresh."""
+        materializer.refresh("mv_test")
+
+        mock_db.execute_sql.assert_called_once_with("REFRESH MATERIALIZED VIEW mv_test;")
+
+
+class TestSQLAlchemyAdapter:
+    """Test the engine-backed adapter used by the refresh planner."""
+
+    def test_execute_and_fetch_all_round_trip(self, tmp_path) -> None:
+        """execute_sql commits; fetch_all returns plain tuples."""
+        from sqlalchemy import create_engine
+
+        adapter = SQLAlchemyAdapter(create_engine(f"sqlite:///{tmp_path / 'mv.db'}"))
+        adapter.execute_sql("CREATE TABLE employees (sector TEXT, n INTEGER)")
+        adapter.execute_sql("INSERT INTO employees VALUES ('energy', 3), ('health', 5)")
+
+        rows = adapter.fetch_all("SELECT sector, n FROM employees ORDER BY sector")
+        assert rows == [("energy", 3), ("health", 5)]
+        assert checksum_watermark(adapter, "employees").startswith("2:")
+
+    def test_postgres_watermark_reads_count_and_xmin(self) -> None:
+        """The Postgres probe runs through fetch_all on the adapter's engine."""
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.execute.return_value.fetchall.return_value = [(12, 9041)]
+
+        assert postgres_watermark(SQLAlchemyAdapter(engine), "employees") == "12:9041"
+        sql = str(conn.execute.call_args[0][0])
+        assert "max(xmin::text::bigint)" in sql
+        assert "FROM employees" in sql
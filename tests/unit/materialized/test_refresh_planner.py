@@ -0,0 +1,280 @@
+"""
+Unit tests for the dependency-aware materialized view refresh planner.
+
+Runs against a SQLite-backed adapter double that emulates Postgres
+materialized views with plain tables.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.qnwis.data.materialized.planner import (
+    AdapterPool,
+    RefreshState,
+    build_refresh_plan,
+    checksum_watermark,
+    extract_relations,
+    run_refresh,
+)
+from src.qnwis.data.materialized.registry import MaterializedSpecError
+from src.qnwis.observability.metrics import get_metrics_collector
+
+_CREATE_RE = re.compile(
+    r"CREATE MATERIALIZED VIEW IF NOT EXISTS (\w+) AS\s*(.*?)\s*WITH NO DATA;", re.S
+)
+_REFRESH_RE = re.compile(r"REFRESH MATERIALIZED VIEW (CONCURRENTLY )?(\w+);")
+_DROP_RE = re.compile(r"DROP MATERIALIZED VIEW IF EXISTS (\w+);")
+
+
+class SQLiteMVAdapter:
+    """Adapter double: materialized views become tables refreshed by re-insert."""
+
+    def __init__(self, path: Path, definitions: dict[str, str], log: list[str]) -> None:
+        self.conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        self.definitions = definitions
+        self.log = log
+        self.fail_on: set[str] = set()
+
+    def execute_sql(self, sql: str) -> None:
+        self.log.append(sql)
+        if m := _CREATE_RE.search(sql):
+            name, body = m.groups()
+            self.definitions[name] = body
+            self.conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} AS SELECT * FROM ({body}) WHERE 0"
+            )
+        elif m := _REFRESH_RE.search(sql):
+            name = m.group(2)
+            if name in self.fail_on:
+                raise RuntimeError(f"refresh of {name} failed")
+            self.conn.execute(f"DELETE FROM {name}")
+            self.conn.execute(f"INSERT INTO {name} SELECT * FROM ({self.definitions[name]})")
+        elif m := _DROP_RE.search(sql):
+            self.conn.execute(f"DROP TABLE IF EXISTS {m.group(1)}")
+        else:
+            self.conn.execute(sql)
+        self.conn.commit()
+
+    def fetch_all(self, sql: str) -> list[tuple[Any, ...]]:
+        return self.conn.execute(sql).fetchall()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+SPECS = [
+    {
+        "name": "mv_sector_totals",
+        "sql_id": "sector_totals",
+        "params": {},
+        "refresh_cron": "0 1 * * *",
+        "indexes": [],
+        "unique_index": "uq_mv_sector_totals ON mv_sector_totals(sector)",
+    },
+    {
+        "name": "mv_top_sectors",
+        "sql_id": "top_sectors",
+        "params": {},
+        "refresh_cron": "0 1 * * *",
+        "indexes": ["idx_mv_top_sectors ON mv_top_sectors(total)"],
+    },
+    {
+        "name": "mv_company_count",
+        "sql_id": "company_count",
+        "params": {},
+        "refresh_cron": "0 1 * * *",
+        "indexes": [],
+    },
+]
+
+QUERIES = {
+    "sector_totals": "SELECT sector, SUM(headcount) AS total FROM employment GROUP BY sector",
+    "top_sectors": "SELECT sector, total FROM mv_sector_totals WHERE total > 10",
+    "company_count": "SELECT COUNT(*) AS n FROM companies",
+}
+
+
+def _render(spec: dict[str, Any]) -> str:
+    return QUERIES[spec["sql_id"]]
+
+
+@pytest.fixture
+def adapter(tmp_path: Path) -> SQLiteMVAdapter:
+    db = SQLiteMVAdapter(tmp_path / "lmis.db", {}, [])
+    db.execute_sql("CREATE TABLE employment (sector TEXT, headcount INTEGER)")
+    db.execute_sql("CREATE TABLE companies (id INTEGER PRIMARY KEY, name TEXT)")
+    db.execute_sql("INSERT INTO employment VALUES ('energy', 30), ('health', 5)")
+    db.execute_sql("INSERT INTO companies (name) VALUES ('qp'), ('hmc')")
+    db.log.clear()
+    yield db
+    db.close()
+
+
+def _actions(outcomes: list[Any]) -> dict[str, str]:
+    return {o.name: o.action for o in outcomes}
+
+
+class TestPlan:
+    """DAG derivation from rendered SQL."""
+
+    def test_extract_relations_skips_ctes_and_extract(self) -> None:
+        sql = (
+            "WITH recent AS (SELECT * FROM employment WHERE EXTRACT(YEAR FROM ts) > 2020) "
+            "SELECT r.sector FROM recent r JOIN public.sectors s ON s.id = r.sector"
+        )
+        assert extract_relations(sql) == ["employment", "public.sectors"]
+
+    def test_levels_follow_view_dependencies(self) -> None:
+        plan = build_refresh_plan(SPECS, _render)
+
+        assert plan.levels == [["mv_sector_totals", "mv_company_count"], ["mv_top_sectors"]]
+        assert plan.nodes["mv_top_sectors"].depends_on == ("mv_sector_totals",)
+        assert plan.nodes["mv_top_sectors"].sources == ()
+        assert plan.nodes["mv_sector_totals"].sources == ("employment",)
+        assert plan.dependents("mv_sector_totals") == {"mv_top_sectors"}
+
+    def test_cycle_raises(self) -> None:
+        specs = [
+            {**SPECS[0], "name": "mv_a", "sql_id": "a", "depends_on": ["mv_b"]},
+            {**SPECS[0], "name": "mv_b", "sql_id": "b", "depends_on": ["mv_a"]},
+        ]
+        with pytest.raises(MaterializedSpecError, match="cycle"):
+            build_refresh_plan(specs, lambda s: "SELECT 1 FROM dual")
+
+    def test_unknown_dependency_raises(self) -> None:
+        specs = [{**SPECS[0], "depends_on": ["mv_missing"]}]
+        with pytest.raises(MaterializedSpecError, match="unknown MV 'mv_missing'"):
+            build_refresh_plan(specs, _render)
+
+
+class TestRefresh:
+    """Watermark skipping, concurrent refresh and rebuilds on the SQLite double."""
+
+    def test_unchanged_sources_are_skipped(
+        self, adapter: SQLiteMVAdapter, tmp_path: Path
+    ) -> None:
+        plan = build_refresh_plan(SPECS, _render)
+        state_path = tmp_path / "state.json"
+
+        first = run_refresh(
+            plan, adapter, state=RefreshState(state_path), probe=checksum_watermark
+        )
+        assert set(_actions(first).values()) == {"created"}
+        assert adapter.fetch_all("SELECT * FROM mv_top_sectors") == [("energy", 30)]
+
+        adapter.log.clear()
+        second = run_refresh(
+            plan, adapter, state=RefreshState(state_path), probe=checksum_watermark
+        )
+        assert set(_actions(second).values()) == {"skipped"}
+        assert not [sql for sql in adapter.log if "MATERIALIZED" in sql]
+
+    def test_changed_source_refreshes_view_and_dependents(
+        self, adapter: SQLiteMVAdapter, tmp_path: Path
+    ) -> None:
+        plan = build_refresh_plan(SPECS, _render)
+        state_path = tmp_path / "state.json"
+        run_refresh(plan, adapter, state=RefreshState(state_path), probe=checksum_watermark)
+
+        adapter.execute_sql("UPDATE employment SET headcount = 50 WHERE sector = 'health'")
+        adapter.log.clear()
+        outcomes = run_refresh(
+            plan, adapter, state=RefreshState(state_path), probe=checksum_watermark
+        )
+
+        assert _actions(outcomes) == {
+            "mv_sector_totals": "refreshed",
+            "mv_company_count": "skipped",
+            "mv_top_sectors": "refreshed",
+        }
+        refreshes = [sql for sql in adapter.log if sql.startswith("REFRESH")]
+        assert refreshes == [
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY mv_sector_totals;",
+            "REFRESH MATERIALIZED VIEW mv_top_sectors;",
+        ]
+        assert sorted(adapter.fetch_all("SELECT * FROM mv_top_sectors")) == [
+            ("energy", 30),
+            ("health", 50),
+        ]
+
+    def test_definition_change_rebuilds_dependents_first_dropped(
+        self, adapter: SQLiteMVAdapter, tmp_path: Path
+    ) -> None:
+        state_path = tmp_path / "state.json"
+        run_refresh(
+            build_refresh_plan(SPECS, _render),
+            adapter,
+            state=RefreshState(state_path),
+            probe=checksum_watermark,
+        )
+
+        changed = dict(QUERIES, sector_totals=QUERIES["sector_totals"] + " HAVING SUM(headcount) > 0")
+        plan = build_refresh_plan(SPECS, lambda s: changed[s["sql_id"]])
+        adapter.log.clear()
+        outcomes = run_refresh(
+            plan, adapter, state=RefreshState(state_path), probe=checksum_watermark
+        )
+
+        drops = [sql for sql in adapter.log if sql.startswith("DROP")]
+        assert drops == [
+            "DROP MATERIALIZED VIEW IF EXISTS mv_top_sectors;",
+            "DROP MATERIALIZED VIEW IF EXISTS mv_sector_totals;",
+        ]
+        assert _actions(outcomes)["mv_sector_totals"] == "rebuilt"
+        assert _actions(outcomes)["mv_top_sectors"] == "rebuilt"
+        assert _actions(outcomes)["mv_company_count"] == "skipped"
+
+    def test_parallel_pool_isolates_failures(
+        self, adapter: SQLiteMVAdapter, tmp_path: Path
+    ) -> None:
+        db_path = tmp_path / "lmis.db"
+        created: list[SQLiteMVAdapter] = []
+        lock = threading.Lock()
+
+        def connect() -> SQLiteMVAdapter:
+            worker = SQLiteMVAdapter(db_path, adapter.definitions, adapter.log)
+            worker.fail_on = {"mv_sector_totals"}
+            with lock:
+                created.append(worker)
+            return worker
+
+        pool = AdapterPool(connect, size=2)
+        outcomes = run_refresh(build_refresh_plan(SPECS, _render), adapter, pool=pool)
+        pool.close()
+
+        actions = _actions(outcomes)
+        assert actions["mv_sector_totals"] == "failed"
+        assert actions["mv_top_sectors"] == "blocked"
+        assert actions["mv_company_count"] == "created"
+        assert 1 <= len(created) <= 2
+        assert adapter.fetch_all("SELECT n FROM mv_company_count") == [(2,)]
+
+    def test_metrics_record_duration_and_staleness(
+        self, adapter: SQLiteMVAdapter, tmp_path: Path
+    ) -> None:
+        plan = build_refresh_plan(SPECS, _render)
+        state_path = tmp_path / "state.json"
+        now = [1000.0]
+        for _ in range(2):
+            run_refresh(
+                plan,
+                adapter,
+                state=RefreshState(state_path),
+                probe=checksum_watermark,
+                clock=lambda: now[0],
+            )
+            now[0] += 600.0
+
+        collector = get_metrics_collector()
+        assert collector.mv_staleness_seconds["mv_company_count"] == pytest.approx(600.0)
+        assert collector.mv_refresh_total[(("action", "skipped"), ("view", "mv_top_sectors"))] >= 1
+        text = collector.export_prometheus_text()
+        assert 'qnwis_mv_staleness_seconds{view="mv_company_count"} 600.0' in text
+        assert "qnwis_mv_refresh_duration_seconds_count" in text
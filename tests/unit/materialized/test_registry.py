@@ -198,3 +198,41 @@ class TestMaterializedRegistry:
 
         with pytest.raises(MaterializedSpecError, match="indexes must be a list"):
             MaterializedRegistry(str(yaml_file))
+
+    def test_optional_planner_fields_validated(self, tmp_path: Path) -> None:
+        """unique_index, depends_on and sources are type-checked when present."""
+        base = {
+            "name": "test",
+            "sql_id": "query",
+            "params": {},
+            "refresh_cron": "0 2 * * *",
+            "indexes": [],
+        }
+        cases = [
+            ({"unique_index": "uq_no_on_clause"}, "unique_index must be"),
+            ({"depends_on": "mv_other"}, "depends_on must be a list"),
+            ({"sources": [1, 2]}, "sources must be a list"),
+        ]
+        for i, (extra, message) in enumerate(cases):
+            yaml_file = tmp_path / f"optional_{i}.yml"
+            yaml_file.write_text(yaml.dump([{**base, **extra}]))
+            with pytest.raises(MaterializedSpecError, match=message):
+                MaterializedRegistry(str(yaml_file))
+
+        valid = {
+            **base,
+            "unique_index": "uq_test ON test(id)",
+            "depends_on": ["mv_other"],
+            "sources": ["employment"],
+        }
+        yaml_file = tmp_path / "optional_valid.yml"
+        yaml_file.write_text(yaml.dump([valid]))
+        assert MaterializedRegistry(str(yaml_file)).specs[0]["unique_index"] == "uq_test ON test(id)"
+
+    def test_shipped_definitions_refresh_concurrently(self) -> None:
+        """Every shipped view declares a unique index so refreshes avoid blocking readers."""
+        path = Path(__file__).resolve().parents[3] / "src/qnwis/data/materialized/definitions.yml"
+        registry = MaterializedRegistry(str(path))
+        assert registry.specs
+        for spec in registry.specs:
+            assert spec.get("unique_index"), spec["name"]
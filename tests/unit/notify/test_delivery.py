@@ -0,0 +1,148 @@
+"""Unit tests for async notification delivery, including an alert-storm load test."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.qnwis.notify.ledger import close_ledgers
+from src.qnwis.notify.models import Channel
+from src.qnwis.perf.notify_bench import StubChannel, SyncStubChannel, make_dispatcher, storm
+
+
+@pytest.fixture(autouse=True)
+def _close_shared_ledgers():
+    yield
+    close_ledgers()
+
+
+def run(dispatcher, notifications):
+    async def main():
+        try:
+            return await dispatcher.dispatch_many(notifications)
+        finally:
+            await dispatcher.aclose()
+
+    return asyncio.run(main())
+
+
+class TestDeliveryPipeline:
+    """Fan-out, retries and parity with the synchronous path."""
+
+    def test_matches_sync_dispatch(self, tmp_path: Path) -> None:
+        notifications = storm(40, n_rules=4, duplicate_every=5)
+        channels = {c: StubChannel() for c in Channel}
+        sync_channels = {c: SyncStubChannel() for c in Channel}
+
+        async_dispatcher = make_dispatcher(tmp_path / "a", channels, rate_limit_per_rule=6)
+        async_results = run(async_dispatcher, notifications)
+        sync = make_dispatcher(tmp_path / "s", sync_channels, rate_limit_per_rule=6)
+        sync_results = [sync.dispatch(n) for n in notifications]
+
+        assert async_results == sync_results
+        assert {"deduplicated", "rate_limited"} <= {r.get("status") for r in async_results}
+
+    def test_channels_are_sent_concurrently(self, tmp_path: Path) -> None:
+        channels = {c: StubChannel(latency_s=0.05) for c in Channel}
+        dispatcher = make_dispatcher(tmp_path, channels)
+
+        start = time.perf_counter()
+        results = run(dispatcher, storm(20, duplicate_every=0))
+        elapsed = time.perf_counter() - start
+
+        # 20 notifications x 3 channels x 50 ms would take 3 s sequentially
+        assert elapsed < 1.0
+        assert all(r == {"email": "success", "teams": "success", "webhook": "success"} for r in results)
+
+    def test_transient_failures_are_retried(self, tmp_path: Path) -> None:
+        class FlakyChannel(StubChannel):
+            """Fails the first attempt of every notification."""
+
+            def __init__(self):
+                super().__init__()
+                self.attempted: set[str] = set()
+
+            async def send(self, notification):
+                if notification.notification_id not in self.attempted:
+                    self.attempted.add(notification.notification_id)
+                    self.calls += 1
+                    raise ConnectionError("timeout")
+                return await super().send(notification)
+
+        flaky = FlakyChannel()
+        dispatcher = make_dispatcher(
+            tmp_path, {Channel.EMAIL: flaky, Channel.TEAMS: StubChannel(), Channel.WEBHOOK: StubChannel()}
+        )
+
+        results = run(dispatcher, storm(10, duplicate_every=0))
+        assert all(r["email"] == "success" for r in results)
+        assert len(flaky.delivered) == 10 and flaky.calls == 20
+
+    def test_persistent_failures_are_reported(self, tmp_path: Path) -> None:
+        down = StubChannel(fail_every=1)
+        dispatcher = make_dispatcher(
+            tmp_path, {Channel.EMAIL: down, Channel.TEAMS: StubChannel(), Channel.WEBHOOK: StubChannel()}
+        )
+
+        async def main():
+            pipeline_results = await dispatcher.dispatch_many(storm(3, duplicate_every=0))
+            stats = dispatcher._pipeline.stats
+            await dispatcher.aclose()
+            return pipeline_results, stats
+
+        results, stats = asyncio.run(main())
+        assert all(r["email"] == "error: stub channel unavailable" for r in results)
+        assert all(r["teams"] == "success" for r in results)
+        assert down.calls == 3 * 3  # first attempt + 2 retries
+        assert stats.failed == 3 and stats.retries == 6
+
+    def test_queues_are_bounded(self, tmp_path: Path) -> None:
+        dispatcher = make_dispatcher(tmp_path, {c: StubChannel(latency_s=0.001) for c in Channel})
+
+        async def main():
+            from src.qnwis.notify.delivery import DeliveryPipeline
+
+            dispatcher._pipeline = DeliveryPipeline(dispatcher, queue_size=5, workers_per_channel=1)
+            peak = 0
+
+            async def watch():
+                nonlocal peak
+                while True:
+                    peak = max([peak, *(q.qsize() for q in dispatcher._pipeline._queues.values())])
+                    await asyncio.sleep(0)
+
+            watcher = asyncio.create_task(watch())
+            await dispatcher.dispatch_many(storm(60, duplicate_every=0))
+            watcher.cancel()
+            await dispatcher.aclose()
+            return peak
+
+        assert asyncio.run(main()) <= 5
+
+
+class TestAlertStorm:
+    """10k incidents/min through stub channels."""
+
+    def test_storm_of_10k_incidents(self, tmp_path: Path) -> None:
+        channels = {c: StubChannel(latency_s=0.001) for c in Channel}
+        dispatcher = make_dispatcher(tmp_path, channels)
+        notifications = storm(10_000)
+
+        start = time.perf_counter()
+        results = run(dispatcher, notifications)
+        elapsed = time.perf_counter() - start
+
+        delivered = [r for r in results if "status" not in r]
+        assert elapsed < 60.0  # sustains at least 10k incidents/min
+        assert len(delivered) == 9_000
+        assert sum(r.get("status") == "deduplicated" for r in results) == 1_000
+        assert all(len(c.delivered) == 9_000 for c in channels.values())
+
+        lines = (tmp_path / "incidents.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 9_000
+        assert len({json.loads(line)["incident_id"] for line in lines}) == 9_000
+        assert (tmp_path / "storm_000000.envelope.json").exists()
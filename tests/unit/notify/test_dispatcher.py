@@ -261,6 +261,7 @@ class TestNotificationDispatcher:
         )
 
         dispatcher.dispatch(notification)
+        dispatcher.flush()  # ledger writes are buffered
 
         # Check ledger file
         ledger_file = temp_ledger / "incidents.jsonl"
@@ -0,0 +1,179 @@
+"""Unit tests for the buffered incident ledger."""
+
+from __future__ import annotations
+
+import json
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src.qnwis.notify.dispatcher import NotificationDispatcher
+from src.qnwis.notify.ledger import SNAPSHOT_FILE, IncidentLedger, close_ledgers, get_ledger
+from src.qnwis.notify.models import Channel, Incident, IncidentState, Notification, Severity
+from src.qnwis.notify.resolver import IncidentResolver
+from src.qnwis.utils.clock import ManualClock
+
+
+def make_incident(idx: int, state: IncidentState = IncidentState.OPEN, rule: str = "rule_a") -> Incident:
+    return Incident(
+        incident_id=f"inc_{idx:04d}",
+        notification_id=f"inc_{idx:04d}",
+        rule_id=rule,
+        severity=Severity.WARNING,
+        state=state,
+        message=f"Incident {idx}",
+        window_start="2024-01-01T00:00:00Z",
+        window_end="2024-01-01T23:59:59Z",
+        created_at="2024-01-15T11:00:00+00:00",
+        updated_at="2024-01-15T11:00:00+00:00",
+    )
+
+
+def read_lines(path: Path) -> list[dict]:
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+@pytest.fixture(autouse=True)
+def _close_shared_ledgers():
+    yield
+    close_ledgers()
+
+
+class TestIncidentLedger:
+    """Batching, rotation and recovery."""
+
+    def test_appends_are_buffered_until_flush(self, tmp_path: Path) -> None:
+        ledger = IncidentLedger(tmp_path, flush_interval=60.0)
+        ledger.append(make_incident(1))
+        assert ledger.get("inc_0001") is not None
+        assert not (tmp_path / "incidents.jsonl").exists()
+
+        ledger.flush()
+        assert [row["incident_id"] for row in read_lines(tmp_path / "incidents.jsonl")] == ["inc_0001"]
+        ledger.close()
+
+    def test_background_flusher_writes_batches(self, tmp_path: Path) -> None:
+        ledger = IncidentLedger(tmp_path, flush_interval=0.01, buffer_size=8)
+        for i in range(50):
+            ledger.append(make_incident(i))
+        ledger._flusher.join(timeout=0.2)  # wait for a few intervals
+        ledger.close()
+        assert len(read_lines(tmp_path / "incidents.jsonl")) == 50
+
+    def test_changes_since_returns_only_new_states(self, tmp_path: Path) -> None:
+        ledger = IncidentLedger(tmp_path)
+        for i in range(5):
+            ledger.append(make_incident(i))
+        _, cursor = ledger.changes_since(0)
+
+        ledger.append(make_incident(2, IncidentState.ACK))
+        ledger.append(make_incident(9))
+        changed, cursor2 = ledger.changes_since(cursor)
+
+        assert [(i.incident_id, i.state) for i in changed] == [
+            ("inc_0002", IncidentState.ACK),
+            ("inc_0009", IncidentState.OPEN),
+        ]
+        assert ledger.changes_since(cursor2) == ([], cursor2)
+        ledger.close()
+
+    def test_rotation_and_snapshot_recovery(self, tmp_path: Path) -> None:
+        ledger = IncidentLedger(tmp_path, max_segment_bytes=2_000)
+        for i in range(40):
+            ledger.append(make_incident(i % 10, IncidentState.ACK if i >= 30 else IncidentState.OPEN))
+            ledger.flush()
+        ledger.append(make_incident(99))
+        ledger.close()
+
+        sealed = sorted(tmp_path.glob("incidents.0*.jsonl"))
+        assert sealed and (tmp_path / SNAPSHOT_FILE).exists()
+        # Every line is in exactly one segment
+        total = sum(len(read_lines(p)) for p in [*sealed, tmp_path / "incidents.jsonl"])
+        assert total == 41
+
+        recovered = IncidentLedger(tmp_path)
+        assert len(recovered.incidents()) == 11
+        assert all(recovered.get(f"inc_{i:04d}").state == IncidentState.ACK for i in range(10))
+        recovered.close()
+
+    def test_torn_tail_line_is_skipped(self, tmp_path: Path) -> None:
+        good = make_incident(1).model_dump_json()
+        (tmp_path / "incidents.jsonl").write_text(good + "\n" + '{"incident_id": "torn', encoding="utf-8")
+
+        ledger = IncidentLedger(tmp_path)
+        assert [i.incident_id for i in ledger.incidents()] == ["inc_0001"]
+        ledger.append(make_incident(2))
+        ledger.close()
+
+        reopened = IncidentLedger(tmp_path)
+        assert {i.incident_id for i in reopened.incidents()} == {"inc_0001", "inc_0002"}
+        reopened.close()
+
+    def test_refresh_tails_other_writers(self, tmp_path: Path) -> None:
+        reader = IncidentLedger(tmp_path)
+        writer = IncidentLedger(tmp_path, max_segment_bytes=1_500)  # stands in for another process
+
+        writer.append(make_incident(1))
+        writer.flush()
+        assert reader.refresh() == 1
+
+        for i in range(2, 12):  # crosses a rotation
+            writer.append(make_incident(i))
+            writer.flush()
+        reader.refresh()
+        assert {i.incident_id for i in reader.incidents()} == {f"inc_{i:04d}" for i in range(1, 12)}
+        assert reader.refresh() == 0
+        writer.close()
+        reader.close()
+
+
+class TestLedgerConsumers:
+    """Dispatcher and resolver share and recover from the ledger."""
+
+    def notification(self, idx: int, clock: ManualClock, rule: str = "rule_a") -> Notification:
+        return Notification(
+            notification_id=f"n_{idx:03d}",
+            rule_id=rule,
+            severity=Severity.WARNING,
+            message=f"Alert {idx}",
+            window_start="2024-01-01T00:00:00Z",
+            window_end="2024-01-01T23:59:59Z",
+            channels=[Channel.EMAIL],
+            timestamp=clock.now_iso(),
+        )
+
+    def test_resolver_sees_dispatched_incidents_before_flush(self, tmp_path: Path) -> None:
+        clock = ManualClock(start=datetime(2024, 1, 15, tzinfo=UTC))
+        dispatcher = NotificationDispatcher(clock=clock, ledger_dir=tmp_path)
+        resolver = IncidentResolver(clock=clock, ledger_dir=tmp_path)
+
+        dispatcher.dispatch(self.notification(1, clock))
+        assert resolver.get_incident("n_001") is not None
+        assert resolver.acknowledge("n_001").state == IncidentState.ACK
+        assert get_ledger(tmp_path).get("n_001").state == IncidentState.ACK
+
+    def test_dedupe_and_rate_limits_survive_restart(self, tmp_path: Path) -> None:
+        clock = ManualClock(start=datetime(2024, 1, 15, tzinfo=UTC))
+        dispatcher = NotificationDispatcher(clock=clock, ledger_dir=tmp_path, rate_limit_per_rule=2)
+        dispatcher.dispatch(self.notification(1, clock))
+        dispatcher.dispatch(self.notification(2, clock))
+        close_ledgers()  # process exit
+
+        restarted = NotificationDispatcher(clock=clock, ledger_dir=tmp_path, rate_limit_per_rule=2)
+        assert restarted.dispatch(self.notification(1, clock)) == {"status": "deduplicated"}
+        assert restarted.dispatch(self.notification(3, clock)) == {"status": "rate_limited"}
+        assert "email" in restarted.dispatch(self.notification(4, clock, rule="rule_b"))
+
+    def test_dedupe_keys_expire(self, tmp_path: Path) -> None:
+        clock = ManualClock(start=datetime(2024, 1, 15, tzinfo=UTC))
+        dispatcher = NotificationDispatcher(
+            clock=clock, ledger_dir=tmp_path, dedupe_ttl_minutes=10, rate_limit_per_rule=100
+        )
+        note = self.notification(1, clock)
+        assert "email" in dispatcher.dispatch(note)
+        clock.advance(timedelta(minutes=5).total_seconds())
+        assert dispatcher.dispatch(note) == {"status": "deduplicated"}
+        clock.advance(timedelta(minutes=6).total_seconds())
+        assert "email" in dispatcher.dispatch(note)
+        assert len(dispatcher._seen_keys) == 1
@@ -1,7 +1,8 @@
 """
 Unit tests for Server-Sent Events (SSE) module.
 
-Tests event formatting, streaming, heartbeats, and event helpers.
+Tests event formatting, streaming, heartbeats, the broadcast hub, and event
+helpers.
 """
 
 from __future__ import annotations
@@ -12,8 +13,11 @@ import contextlib
 import pytest
 
 from src.qnwis.ops_console.sse import (
+    HEARTBEAT_FRAME,
+    SSEBroadcastHub,
     SSEEvent,
     SSEStream,
+    encode_frame,
     create_alert_fired_event,
     create_incident_update_event,
 )
@@ -315,3 +319,134 @@ async def test_stream_with_different_intervals(heartbeat_interval: int):
 
     assert len(output) >= 1
     assert f'"interval": {heartbeat_interval}' in output[0]
+
+
+class TestSSEBroadcastHub:
+    """Test shared-frame fan-out, slow-consumer policies and replay."""
+
+    def _update(self, incident_id: str, state: str, ts: str) -> SSEEvent:
+        return create_incident_update_event(
+            incident_id=incident_id, state=state, timestamp=ts
+        )
+
+    def test_subscribers_receive_identical_frames(self):
+        """Event is framed once; every subscriber gets the same bytes."""
+        hub = SSEBroadcastHub()
+        subs = [hub.subscribe() for _ in range(3)]
+        event = self._update("inc_1", "ACK", "2024-01-01T12:00:00Z")
+
+        hub.publish(event)
+
+        chunks = [sub.drain() for sub in subs]
+        assert chunks[0] == event.encode()
+        assert len(set(chunks)) == 1
+
+    def test_events_without_id_get_sequence_ids(self):
+        """Hub assigns per-channel sequence IDs for replay."""
+        hub = SSEBroadcastHub()
+        sub = hub.subscribe(channel="run")
+
+        first = hub.publish_data('{"stage": "classify"}', channel="run")
+        second = hub.publish(SSEEvent(event="stage", data={"n": 2}), channel="run")
+
+        assert (first, second) == ("1", "2")
+        assert sub.drain() == (
+            encode_frame('{"stage": "classify"}', id="1")
+            + b'id: 2\nevent: stage\ndata: {"n": 2}\n\n'
+        )
+
+    def test_channels_are_isolated(self):
+        """Subscribers only see their own channel."""
+        hub = SSEBroadcastHub()
+        a = hub.subscribe(channel="a")
+        b = hub.subscribe(channel="b")
+
+        hub.publish_data("{}", channel="a")
+
+        assert a.pending == 1
+        assert b.pending == 0
+
+    def test_drop_oldest_bounds_slow_consumer(self):
+        """Full buffer drops the oldest frame."""
+        hub = SSEBroadcastHub(buffer_size=2, policy="drop_oldest")
+        sub = hub.subscribe()
+
+        for i in range(4):
+            hub.publish(self._update(f"inc_{i}", "ACK", f"t{i}"))
+
+        assert sub.pending == 2
+        assert sub.dropped == 2
+        chunk = sub.drain()
+        assert b"inc_2" in chunk and b"inc_3" in chunk
+        assert b"inc_0" not in chunk
+
+    def test_coalesce_keeps_latest_state_per_incident(self):
+        """Coalesce drops a superseded update for the same incident first."""
+        hub = SSEBroadcastHub(buffer_size=2, policy="coalesce")
+        sub = hub.subscribe()
+
+        hub.publish(self._update("inc_a", "ACK", "t0"))
+        hub.publish(self._update("inc_b", "ACK", "t1"))
+        hub.publish(self._update("inc_a", "RESOLVED", "t2"))
+
+        chunk = sub.drain()
+        assert sub.dropped == 1
+        assert b"incident_inc_a_t0" not in chunk
+        assert chunk.index(b"inc_b") < chunk.index(b"incident_inc_a_t2")
+
+    def test_last_event_id_replays_missed_frames(self):
+        """Reconnect replays only frames after Last-Event-ID."""
+        hub = SSEBroadcastHub(replay_size=10)
+        for i in range(3):
+            hub.publish(self._update(f"inc_{i}", "ACK", f"t{i}"))
+
+        sub = hub.subscribe(last_event_id="incident_inc_0_t0")
+
+        chunk = sub.drain()
+        assert b"inc_0" not in chunk
+        assert b"inc_1" in chunk and b"inc_2" in chunk
+
+    def test_unknown_last_event_id_replays_whole_log(self):
+        """Expired Last-Event-ID replays everything still retained."""
+        hub = SSEBroadcastHub(replay_size=2)
+        for i in range(3):
+            hub.publish(self._update(f"inc_{i}", "ACK", f"t{i}"))
+
+        sub = hub.subscribe(last_event_id="incident_inc_0_t0")
+
+        chunk = sub.drain()
+        assert b"inc_1" in chunk and b"inc_2" in chunk
+
+    def test_closed_channel_keeps_replay(self):
+        """Late reconnect to a finished channel gets the replay and ends."""
+        hub = SSEBroadcastHub()
+        hub.publish_data('{"stage": "done"}', channel="run")
+        hub.close_channel("run")
+
+        assert hub.publish_data("{}", channel="run") is None
+        sub = hub.subscribe(channel="run", last_event_id="0")
+        assert b"done" in sub.drain()
+        assert hub.subscriber_count("run") == 0
+
+    @pytest.mark.asyncio
+    async def test_iteration_heartbeat_and_close(self):
+        """One hub heartbeat reaches idle subscribers; close ends iteration."""
+        hub = SSEBroadcastHub(heartbeat_interval=0.05)
+        subs = [hub.subscribe() for _ in range(2)]
+        outputs: list[list[bytes]] = [[], []]
+
+        async def collect(idx: int) -> None:
+            async for chunk in subs[idx]:
+                outputs[idx].append(chunk)
+
+        tasks = [asyncio.create_task(collect(i)) for i in range(2)]
+        await asyncio.sleep(0.08)
+        await hub.send_event(self._update("inc_1", "ACK", "t0"))
+        await asyncio.sleep(0)
+        await hub.close()
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=2.0)
+
+        for output in outputs:
+            assert output[0] == HEARTBEAT_FRAME
+            assert b"inc_1" in output[-1]
+        assert hub.subscriber_count() == 0
@@ -0,0 +1,222 @@
+"""
+Unit tests for the freshness-aware fact store.
+
+Uses a SQLite engine in place of PostgreSQL.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from src.qnwis.data.freshness.verifier import check_asof_freshness
+from src.qnwis.orchestration.fact_store import (
+    FactStore,
+    fact_key,
+    fetch_world_bank_series,
+    group_by_series,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'facts.db'}")
+    yield eng
+    eng.dispose()
+
+
+def _select_counter(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def _series(indicator, country="QAT", years=(2021, 2022)):
+    return {
+        (indicator, country): [
+            {"metric": indicator, "year": year, "value": float(year)} for year in years
+        ]
+    }
+
+
+class FakeWorldBank:
+    """WorldBankAPI double counting get_indicator calls."""
+
+    def __init__(self, values=None):
+        self.calls = []
+        self.values = {"2022": 1.0, "2023": 2.0} if values is None else values
+
+    async def get_indicator(self, indicator_code, country_code="QAT"):
+        self.calls.append((indicator_code, country_code))
+        return {"indicator_name": f"name {indicator_code}", "values": self.values}
+
+
+def test_check_asof_freshness():
+    now = datetime(2025, 1, 31)
+    assert check_asof_freshness(datetime(2025, 1, 20), 30, now) == []
+    assert check_asof_freshness("2024-12-01", 30, now) == ["stale_data:61>30"]
+    assert check_asof_freshness(None, 30, now) == ["freshness_unknown"]
+    assert check_asof_freshness("2025-01-01", -1, now) == ["freshness_invalid_sla"]
+
+
+def test_fact_key_normalizes_dimensions():
+    a = fact_key("ilo", {"metric": "EMP", "year": 2022, "sex": "F", "age_group": "15+"})
+    b = fact_key("ilo", {"age_group": "15+", "sex": "F", "year": 2022, "metric": "EMP"})
+    assert a == b
+    assert a.period == "2022"
+    assert a.series == ("ilo", "EMP", "QAT")
+
+
+def test_round_trip_through_database(engine):
+    store = FactStore(engine)
+    assert store.put_series("world_bank", _series("GDP")) == 2
+
+    fresh = FactStore(engine)
+    lookup = fresh.lookup("world_bank", ["GDP", "POP"])
+    assert lookup.hits == [("GDP", "QAT")]
+    assert lookup.missing == [("POP", "QAT")]
+    assert sorted(f["year"] for f in lookup.facts) == [2021, 2022]
+    assert all(f["cached"] for f in lookup.facts)
+
+
+def test_lookup_uses_single_query_and_read_cache(engine):
+    store = FactStore(engine)
+    for indicator in ["A", "B", "C"]:
+        store.put_series("world_bank", _series(indicator, country="SAU"))
+
+    reader = FactStore(engine)
+    reader._ensure_schema()
+    selects = _select_counter(engine)
+    reader.lookup("world_bank", ["A", "B", "C"], ["SAU"])
+    assert len(selects) == 1
+
+    lookup = reader.lookup("world_bank", ["A", "B", "C"], ["SAU"])
+    assert len(selects) == 1
+    assert len(lookup.hits) == 3
+
+
+def test_stale_series_are_reported_missing(engine):
+    store = FactStore(engine, sla_days={"lmis": 1})
+    store.put_series("lmis", _series("main"), fetched_at=datetime.utcnow() - timedelta(days=3))
+
+    lookup = store.lookup("lmis", ["main"])
+    assert lookup.missing == [("main", "QAT")]
+    assert store.get_stats()["lmis"]["stale"] == 1
+
+
+def test_put_series_replaces_previous_periods(engine):
+    store = FactStore(engine)
+    store.put_series("world_bank", _series("GDP", years=(2020, 2021)))
+    store.put_series("world_bank", _series("GDP", years=(2023,)))
+
+    lookup = FactStore(engine).lookup("world_bank", ["GDP"])
+    assert [f["year"] for f in lookup.facts] == [2023]
+
+
+def test_rows_without_period_are_kept(engine):
+    store = FactStore(engine)
+    rows = [{"metric": "skills", "data": {"rank": i}} for i in range(5)]
+    assert store.put_series("lmis", {("skills:en", "QAT"): rows}) == 5
+
+    lookup = FactStore(engine).lookup("lmis", ["skills:en"])
+    assert sorted(f["data"]["rank"] for f in lookup.facts) == list(range(5))
+
+
+def test_stats_hit_ratio_and_calls_avoided(engine):
+    store = FactStore(engine)
+    store.put_series("world_bank", _series("GDP"))
+    store.lookup("world_bank", ["GDP", "POP"], calls_per_series=2)
+
+    stats = store.get_stats()["world_bank"]
+    assert stats["hit_ratio"] == 0.5
+    assert stats["api_calls_avoided"] == 2
+
+
+def test_unavailable_database_degrades_to_cache_only(tmp_path):
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'facts.db'}")
+    store = FactStore(broken)
+
+    assert store.lookup("world_bank", ["GDP"]).missing == [("GDP", "QAT")]
+    store.put_series("world_bank", _series("GDP"))
+    assert store.lookup("world_bank", ["GDP"]).hits == [("GDP", "QAT")]
+
+
+def test_group_by_series():
+    grouped = group_by_series(
+        [{"metric": "a", "value": 1}, {"metric": "a", "value": 2}, {"value": 3}],
+        country="SAU",
+    )
+    assert list(grouped) == [("a", "SAU")]
+    assert len(grouped[("a", "SAU")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_world_bank_series_only_fetches_gaps(engine):
+    store = FactStore(engine)
+    api = FakeWorldBank()
+
+    first = await fetch_world_bank_series(api, ["GDP", "POP"], ["QAT", "SAU"], store=store)
+    assert len(api.calls) == 4
+    assert len(first) == 8
+
+    api.calls.clear()
+    second = await fetch_world_bank_series(api, ["GDP", "POP", "UEM"], ["QAT"], store=store)
+    assert api.calls == [("UEM", "QAT")]
+    assert len(second) == 6
+
+    stats = store.get_stats()["world_bank"]
+    assert stats["api_calls_avoided"] == 2
+    assert stats["hits"] == 2
+    assert stats["misses"] == 5
+
+
+@pytest.mark.asyncio
+async def test_empty_api_result_is_stored_as_negative_entry(engine):
+    store = FactStore(engine, negative_ttl_s=3600)
+    api = FakeWorldBank(values={})
+
+    assert await fetch_world_bank_series(api, ["GONE"], store=store) == []
+    assert len(api.calls) == 1
+
+    # Reused from the database by a fresh process, within the TTL
+    reader = FactStore(engine, negative_ttl_s=3600)
+    assert await fetch_world_bank_series(api, ["GONE"], store=reader) == []
+    assert len(api.calls) == 1
+
+    expired = FactStore(engine, negative_ttl_s=3600)
+    lookup = expired.lookup("world_bank", ["GONE"], now=datetime.utcnow() + timedelta(hours=2))
+    assert lookup.missing == [("GONE", "QAT")]
+
+
+@pytest.mark.asyncio
+async def test_fetch_world_bank_series_refreshes_flagged_indicators(engine):
+    store = FactStore(engine)
+    api = FakeWorldBank()
+    await fetch_world_bank_series(api, ["SL.UEM.TOTL.ZS", "GDP"], store=store)
+    api.calls.clear()
+
+    records = await fetch_world_bank_series(
+        api, ["SL.UEM.TOTL.ZS", "GDP"], store=store, refresh=["SL.UEM.TOTL.ZS"]
+    )
+
+    assert api.calls == [("SL.UEM.TOTL.ZS", "QAT")]
+    uem = [r for r in records if r["indicator_code"] == "SL.UEM.TOTL.ZS"]
+    assert len(uem) == 2 and not any(r.get("cached") for r in uem)
+
+
+def test_stats_are_consistent_under_concurrent_lookups(engine):
+    from concurrent.futures import ThreadPoolExecutor
+
+    store = FactStore(engine)
+    store.put_series("world_bank", _series("GDP"))
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda _: store.lookup("world_bank", ["GDP", "POP"]), range(400)))
+
+    stats = store.get_stats()["world_bank"]
+    assert stats["hits"] == 400
+    assert stats["misses"] == 400
@@ -0,0 +1,153 @@
+"""
+Unit tests for batched, write-behind prefetch fact persistence.
+
+Uses a SQLite engine (which supports multi-row VALUES and ON CONFLICT DO
+NOTHING) in place of PostgreSQL.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from src.qnwis.orchestration.prefetch_persistence import (
+    FACT_TABLES,
+    PrefetchFactWriter,
+    build_bulk_upsert,
+)
+
+
+class RecordingObserver:
+    """Metrics observer capturing emitted samples."""
+
+    def __init__(self):
+        self.counters = []
+        self.timings = []
+
+    def increment(self, name, *, tags=None):
+        self.counters.append((name, dict(tags or {})))
+
+    def timing(self, name, value_ms, *, tags=None):
+        self.timings.append((name, value_ms, dict(tags or {})))
+
+
+@pytest.fixture
+def engine(tmp_path):
+    eng = create_engine(f"sqlite:///{tmp_path / 'facts.db'}")
+    with eng.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE world_bank_indicators (country_code TEXT, country_name TEXT,"
+            " indicator_code TEXT, indicator_name TEXT, year INTEGER, value REAL,"
+            " created_at TIMESTAMP, UNIQUE (country_code, indicator_code, year))"
+        ))
+        conn.execute(text(
+            "CREATE TABLE ilo_labour_data (country_code TEXT, indicator_code TEXT,"
+            " year INTEGER, value REAL, sex TEXT, age_group TEXT, created_at TIMESTAMP,"
+            " UNIQUE (country_code, indicator_code, year, sex, age_group))"
+        ))
+    yield eng
+    eng.dispose()
+
+
+def _statement_counter(engine):
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT"):
+            statements.append(statement)
+
+    return statements
+
+
+def _wb_facts(n, year=2023):
+    return [
+        {"metric": f"IND.{i}", "indicator_name": f"Indicator {i}", "year": year, "value": float(i)}
+        for i in range(n)
+    ]
+
+
+def test_build_bulk_upsert_has_one_tuple_per_row():
+    sql = build_bulk_upsert(FACT_TABLES["ilo"], 3)
+    assert sql.count("(:country_code_") == 3
+    assert "ON CONFLICT (country_code, indicator_code, year, sex, age_group) DO NOTHING" in sql
+
+
+def test_write_batch_uses_chunked_multi_row_inserts(engine):
+    statements = _statement_counter(engine)
+    writer = PrefetchFactWriter(engine, max_rows_per_statement=50)
+
+    assert writer.write_batch(_wb_facts(120), "world_bank") == 120
+
+    assert len(statements) == 3
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM world_bank_indicators")).scalar()
+    assert count == 120
+
+
+def test_write_batch_ignores_conflicts(engine):
+    writer = PrefetchFactWriter(engine)
+    writer.write_batch(_wb_facts(10), "world_bank")
+    writer.write_batch(_wb_facts(15), "world_bank")
+
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM world_bank_indicators")).scalar()
+        value = conn.execute(text(
+            "SELECT value FROM world_bank_indicators WHERE indicator_code = 'IND.3'"
+        )).scalar()
+    assert count == 15
+    assert value == 3.0
+
+
+def test_write_batch_unknown_source_is_noop(engine):
+    writer = PrefetchFactWriter(engine)
+    assert writer.write_batch(_wb_facts(3), "unknown") == 0
+    assert writer.get_stats() == {}
+
+
+def test_stats_and_metrics_per_source(engine):
+    observer = RecordingObserver()
+    writer = PrefetchFactWriter(engine, observer=observer)
+    writer.write_batch(_wb_facts(4), "world_bank")
+    writer.write_batch([{"metric": "EMP", "year": 2022, "value": 1.0}], "ilo")
+
+    stats = writer.get_stats()
+    assert stats["world_bank"]["rows"] == 4
+    assert stats["world_bank"]["avg_batch_size"] == 4.0
+    assert stats["ilo"]["batches"] == 1
+    names = {(name, tags["source"]) for name, _, tags in observer.timings}
+    assert ("prefetch.persist.latency_ms", "world_bank") in names
+    assert ("prefetch.persist.batch_size", "ilo") in names
+
+
+@pytest.mark.asyncio
+async def test_enqueue_is_write_behind_and_coalesces(engine):
+    statements = _statement_counter(engine)
+    writer = PrefetchFactWriter(engine)
+
+    writer.enqueue(_wb_facts(5, year=2021), "world_bank")
+    writer.enqueue(_wb_facts(5, year=2022), "world_bank")
+    # Nothing written synchronously
+    assert statements == []
+
+    await writer.close()
+
+    assert len(statements) == 1
+    assert writer.get_stats()["world_bank"]["rows"] == 10
+
+
+@pytest.mark.asyncio
+async def test_enqueue_failure_is_logged_not_raised(engine):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE ilo_labour_data"))
+    writer = PrefetchFactWriter(engine)
+
+    writer.enqueue([{"metric": "EMP", "year": 2022, "value": 1.0}], "ilo")
+    await writer.drain()
+
+    assert writer.get_stats()["ilo"]["failures"] == 1
+    await writer.close()
+
+
+def test_enqueue_without_loop_writes_synchronously(engine):
+    writer = PrefetchFactWriter(engine)
+    writer.enqueue(_wb_facts(2), "world_bank")
+    assert writer.get_stats()["world_bank"]["rows"] == 2
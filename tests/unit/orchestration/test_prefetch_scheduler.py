@@ -0,0 +1,267 @@
+"""
+Unit tests for the tiered prefetch scheduler.
+
+Covers early return on tier-1 + coverage, late fact delivery, latency
+budgets learned from history, timeouts/cancellation and circuit breakers.
+"""
+
+import asyncio
+
+import pytest
+
+from src.qnwis.orchestration.prefetch_scheduler import (
+    CircuitBreaker,
+    LatencyEstimator,
+    PrefetchScheduler,
+    tier_for,
+)
+
+
+def _source(name, delay, n_facts=1):
+    async def fetch():
+        await asyncio.sleep(delay)
+        return [{"source": name, "value": i} for i in range(n_facts)]
+
+    return fetch
+
+
+def _failing(exc=RuntimeError("boom")):
+    async def fetch():
+        raise exc
+
+    return fetch
+
+
+def test_tier_lookup_defaults_to_two():
+    assert tier_for("lmis_comprehensive") == 1
+    assert tier_for("perplexity_smart") == 3
+    assert tier_for("adp_labor") == 2
+
+
+def test_latency_estimator_tracks_p95_above_mean():
+    est = LatencyEstimator()
+    for latency in [0.1, 0.2, 0.1, 0.3, 0.1]:
+        est.observe(latency)
+    assert est.samples == 5
+    assert est.p95_s > est.mean_s > 0.1
+
+
+def test_circuit_breaker_opens_and_recovers():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_s=10)
+    breaker.record_failure(now=0)
+    assert breaker.allow(now=1)
+    breaker.record_failure(now=1)
+    assert breaker.state == "open"
+    assert not breaker.allow(now=5)
+    assert breaker.allow(now=11)
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+@pytest.mark.asyncio
+async def test_early_return_after_tier1_and_coverage():
+    late = []
+
+    async def on_late(name, facts):
+        late.append((name, len(facts)))
+
+    scheduler = PrefetchScheduler(coverage_threshold=0.5)
+    run = await scheduler.run(
+        {
+            "lmis_comprehensive": _source("lmis", 0.01),
+            "world_bank_dashboard": _source("wb", 0.02),
+            "perplexity_smart": _source("pplx", 0.3),
+            "semantic_smart": _source("s2", 0.3),
+        },
+        on_late_facts=on_late,
+    )
+
+    assert {f["source"] for f in run.facts} == {"lmis", "wb"}
+    assert sorted(run.pending) == ["perplexity_smart", "semantic_smart"]
+    assert run.time_to_first_fact_ms is not None
+    assert run.time_to_coverage_ms < 250
+
+    late_facts = await run.wait_all()
+    assert len(late_facts) == 2
+    assert sorted(name for name, _ in late) == ["perplexity_smart", "semantic_smart"]
+    assert all(run.outcomes[name].late for name in run.pending)
+
+
+@pytest.mark.asyncio
+async def test_waits_for_slow_tier1_even_when_coverage_met():
+    scheduler = PrefetchScheduler(coverage_threshold=0.1)
+    run = await scheduler.run(
+        {
+            "semantic_smart": _source("s2", 0.0),
+            "brave_economic": _source("brave", 0.0),
+            "mol_data": _source("mol", 0.05),
+        },
+        on_late_facts=lambda name, facts: asyncio.sleep(0),
+    )
+    assert "mol" in {f["source"] for f in run.facts}
+
+
+@pytest.mark.asyncio
+async def test_without_early_return_all_sources_awaited():
+    scheduler = PrefetchScheduler(coverage_threshold=0.0)
+    run = await scheduler.run(
+        {"mol_data": _source("mol", 0.0), "perplexity_smart": _source("pplx", 0.05)},
+        early_return=False,
+    )
+    assert run.pending == []
+    assert len(run.facts) == 2
+
+
+@pytest.mark.asyncio
+async def test_source_exceeding_budget_is_cancelled():
+    scheduler = PrefetchScheduler(tier_budgets_s={1: 0.05, 2: 0.05, 3: 0.05})
+    run = await scheduler.run({"mol_data": _source("mol", 1.0)}, early_return=False)
+
+    outcome = run.outcomes["mol_data"]
+    assert outcome.status == "timeout"
+    assert run.facts == []
+
+
+@pytest.mark.asyncio
+async def test_budget_learned_from_history():
+    scheduler = PrefetchScheduler(min_budget_s=0.01, budget_multiplier=2.0)
+    assert scheduler.budget_for("mol_data") == 30.0
+
+    for _ in range(3):
+        await scheduler.run({"mol_data": _source("mol", 0.02)}, early_return=False)
+
+    budget = scheduler.budget_for("mol_data")
+    assert 0.01 <= budget < 1.0
+    assert scheduler.source_stats()["mol_data"]["samples"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failing_source_trips_breaker_and_is_skipped():
+    scheduler = PrefetchScheduler(failure_threshold=2, cooldown_s=60)
+    for _ in range(2):
+        run = await scheduler.run({"gcc_stat": _failing()}, early_return=False)
+        assert run.outcomes["gcc_stat"].status == "error"
+
+    run = await scheduler.run({"gcc_stat": _source("gcc", 0.0)}, early_return=False)
+    assert run.outcomes["gcc_stat"].status == "skipped"
+    assert run.facts == []
+
+
+@pytest.mark.asyncio
+async def test_cancel_background_sources():
+    scheduler = PrefetchScheduler(coverage_threshold=0.0)
+    run = await scheduler.run(
+        {"mol_data": _source("mol", 0.0), "semantic_smart": _source("s2", 5.0)},
+        on_late_facts=lambda name, facts: asyncio.sleep(0),
+    )
+    assert run.pending == ["semantic_smart"]
+
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run.background
+    assert run.outcomes["semantic_smart"].status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_stops_running_sources():
+    started = asyncio.Event()
+    stopped = []
+
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            stopped.append("semantic_smart")
+            raise
+        return []
+
+    scheduler = PrefetchScheduler()
+    caller = asyncio.create_task(scheduler.run({"semantic_smart": slow}, early_return=False))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert stopped == ["semantic_smart"]
+
+
+@pytest.mark.asyncio
+async def test_graph_prefetch_node_hands_pending_run_to_workflow(monkeypatch):
+    from src.qnwis.orchestration import graph_llm
+
+    scheduler = PrefetchScheduler(coverage_threshold=0.0)
+
+    class Layer:
+        async def fetch_all_sources_run(self, query, on_late_facts=None):
+            return await scheduler.run(
+                {"mol_data": _source("mol", 0.0), "semantic_smart": _source("s2", 5.0)},
+                on_late_facts=on_late_facts,
+            )
+
+    monkeypatch.setattr(graph_llm, "get_complete_prefetch", lambda: Layer())
+    runs = []
+    await graph_llm.LLMWorkflow._prefetch_node(None, {"question": "q", "prefetch_runs": runs})
+    assert [run.pending for run in runs] == [["semantic_smart"]]
+
+    graph_llm._cancel_prefetch_runs(runs)
+    with pytest.raises(asyncio.CancelledError):
+        await runs[0].background
+    assert runs[0].outcomes["semantic_smart"].status == "cancelled"
+
+
+def test_learned_budget_can_raise_tier1_above_ceiling_only():
+    scheduler = PrefetchScheduler(
+        min_budget_s=0.01,
+        budget_multiplier=2.0,
+        tier_budgets_s={1: 0.02, 2: 0.02, 3: 0.02},
+        tier1_max_budget_s=1.0,
+    )
+    for name in ("mol_data", "fao_food_security"):
+        scheduler._latency[name] = LatencyEstimator(mean_s=0.1, samples=5)
+
+    assert scheduler.budget_for("mol_data") == pytest.approx(0.2)
+    assert scheduler.budget_for("fao_food_security") == 0.02
+
+    scheduler._latency["mol_data"] = LatencyEstimator(mean_s=10.0, samples=5)
+    assert scheduler.budget_for("mol_data") == 1.0
+
+
+@pytest.mark.asyncio
+async def test_extraction_node_returns_early_and_hands_pending_run_to_workflow(monkeypatch):
+    from src.qnwis.orchestration.nodes import extraction
+
+    scheduler = PrefetchScheduler(coverage_threshold=0.0)
+
+    class Layer:
+        async def fetch_all_sources_run(self, query, on_late_facts=None):
+            return await scheduler.run(
+                {"mol_data": _source("mol", 0.0), "semantic_smart": _source("s2", 0.05)},
+                on_late_facts=on_late_facts,
+            )
+
+    async def no_semantic_routing(query):
+        return None
+
+    async def no_missing_sources(*_):
+        return []
+
+    monkeypatch.setattr(extraction, "get_complete_prefetch", lambda: Layer())
+    monkeypatch.setattr(extraction, "analyze_query_semantically", no_semantic_routing)
+    monkeypatch.setattr(extraction, "_extract_missing_sources", no_missing_sources)
+    events = []
+
+    async def emit(stage, status, payload=None, latency_ms=None):
+        events.append((stage, status, payload["source"]))
+
+    state = {"query": "q", "late_facts": [], "prefetch_runs": [], "emit_event_fn": emit}
+    result = await extraction.data_extraction_node(state)
+
+    assert [fact["source"] for fact in result["extracted_facts"]] == ["mol"]
+    [run] = state["prefetch_runs"]
+    assert run.pending == ["semantic_smart"]
+
+    await run.background
+    assert [fact["source"] for fact in state["late_facts"]] == ["s2"]
+    assert events == [("extraction", "update", "semantic_smart")]
@@ -0,0 +1,110 @@
+"""
+Unit tests for copy-on-write scenario state.
+
+Covers branch isolation, frozen shared sections, overlay diff/materialize
+and the deepcopy vs branch memory benchmark.
+"""
+
+import copy
+
+import pytest
+
+from src.qnwis.orchestration.scenario_state import (
+    DELTA_KEY,
+    FrozenDict,
+    FrozenList,
+    ScenarioStateBase,
+    appended_items,
+    freeze,
+)
+from src.qnwis.perf.scenario_state_bench import run_benchmark
+
+
+def _state():
+    return {
+        "query": "Test",
+        "extracted_facts": [{"metric": "gdp", "value": 1.0}],
+        "rag_context": {"chunks": [{"text": "a"}]},
+        "reasoning_chain": ["classified"],
+        "warnings": [],
+        "emit_event_fn": lambda *args: None,
+    }
+
+
+def test_freeze_blocks_mutation_but_stays_dict_and_list():
+    frozen = freeze({"a": [1, {"b": 2}]})
+    assert isinstance(frozen, dict) and isinstance(frozen, FrozenDict)
+    assert isinstance(frozen["a"], FrozenList)
+    with pytest.raises(TypeError):
+        frozen["c"] = 3
+    with pytest.raises(TypeError):
+        frozen["a"].append(3)
+    with pytest.raises(TypeError):
+        frozen["a"][1]["b"] = 5
+    assert copy.deepcopy(frozen) is frozen
+    assert type(copy.copy(frozen)) is dict
+
+
+def test_branches_share_facts_and_isolate_private_sections():
+    base = ScenarioStateBase(_state())
+    one, two = base.branch(scenario_name="one"), base.branch(scenario_name="two")
+
+    assert "emit_event_fn" not in one
+    assert one["extracted_facts"][0] is two["extracted_facts"][0]
+
+    one["reasoning_chain"].append("scenario one")
+    one["extracted_facts"].append({"metric": "new"})
+    assert two["reasoning_chain"] == ["classified"]
+    assert len(two["extracted_facts"]) == 1
+    assert len(base.shared["extracted_facts"]) == 1
+
+
+def test_caller_mutation_does_not_leak_into_branches():
+    state = _state()
+    base = ScenarioStateBase(state)
+    state["reasoning_chain"].append("late")
+    assert base.branch()["reasoning_chain"] == ["classified"]
+
+
+def test_diff_and_materialize_keep_only_changes():
+    base = ScenarioStateBase(_state())
+    result = base.branch(scenario_name="oil")
+    result["reasoning_chain"].append("oil shock")
+    result["extracted_facts"].append({"metric": "oil"})
+    result["final_synthesis"] = "done"
+    result["emit_event_fn"] = print
+
+    overlay = base.diff(result)
+    assert overlay.appended == {
+        "reasoning_chain": ["oil shock"],
+        "extracted_facts": [{"metric": "oil"}],
+    }
+    assert set(overlay.assigned) == {"scenario_name", "final_synthesis"}
+
+    merged = base.materialize(overlay)
+    assert merged["reasoning_chain"] == ["classified", "oil shock"]
+    assert merged["rag_context"] is base.shared["rag_context"]
+    assert "emit_event_fn" not in merged
+    assert appended_items(merged, "extracted_facts") == [{"metric": "oil"}]
+    assert appended_items(merged, "warnings") == []
+
+
+def test_diff_records_replaced_lists_as_assigned():
+    base = ScenarioStateBase(_state())
+    result = base.branch()
+    result["reasoning_chain"] = ["rewritten"]
+
+    merged = base.materialize(base.diff(result))
+    assert merged[DELTA_KEY]["assigned"] == ["reasoning_chain"]
+    assert appended_items(merged, "reasoning_chain") == ["rewritten"]
+
+
+def test_appended_items_without_overlay_returns_whole_list():
+    assert appended_items({"agent_reports": [1, 2]}, "agent_reports") == [1, 2]
+
+
+def test_branching_uses_less_memory_than_deepcopy():
+    rows = run_benchmark(scenario_counts=(6, 12, 24), n_facts=500)
+    assert [row["scenarios"] for row in rows] == [6, 12, 24]
+    for row in rows:
+        assert row["cow_peak_mib"] < row["deepcopy_peak_mib"]
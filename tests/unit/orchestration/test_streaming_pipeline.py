@@ -0,0 +1,101 @@
+"""
+Unit tests for the streaming event pipeline.
+
+Covers the compiled-graph cache, the type-dispatched sanitizer and
+delta-only node events replayed from a recorded run.
+"""
+
+from datetime import date, datetime
+from enum import Enum
+
+import numpy as np
+import pytest
+
+from src.qnwis.orchestration.graph_cache import (
+    clear_graph_cache,
+    get_compiled_graph,
+    graph_cache_info,
+)
+from src.qnwis.orchestration.streaming import (
+    _changed_keys,
+    _fingerprint,
+    _sanitize_dict,
+    run_workflow_stream,
+)
+from src.qnwis.perf.stream_bench import RecordedGraph, record_run, run_benchmark
+
+
+class Color(str, Enum):
+    RED = "red"
+
+
+def test_graph_cache_builds_once_per_config():
+    calls = []
+
+    def builder(depth="standard"):
+        calls.append(depth)
+        return object()
+
+    clear_graph_cache()
+    first = get_compiled_graph(builder)
+    assert get_compiled_graph(builder) is first
+    assert get_compiled_graph(builder, depth="deep") is not first
+    assert calls == ["standard", "deep"]
+    assert graph_cache_info()["size"] == 2
+    clear_graph_cache()
+
+
+def test_sanitize_single_pass_drops_unserializable():
+    payload = _sanitize_dict({
+        "emit_event_fn": print,
+        "callback": lambda: None,
+        "when": datetime(2025, 1, 2, 3, 4),
+        "day": date(2025, 1, 2),
+        "np": np.int64(7),
+        "color": Color.RED,
+        "nested": {"obj": object(), "ok": [1, (2, 3), {4: "four"}, print]},
+    })
+    assert payload == {
+        "when": "2025-01-02T03:04:00",
+        "day": "2025-01-02",
+        "np": 7,
+        "color": Color.RED,
+        "nested": {"ok": [1, [2, 3], {"4": "four"}]},
+    }
+
+
+def test_changed_keys_detects_reassignment_and_in_place_growth():
+    chain = ["a"]
+    state = {"chain": chain, "facts": [1, 2], "score": 0.5}
+    fingerprints = {k: _fingerprint(v) for k, v in state.items()}
+
+    chain.append("b")
+    delta = _changed_keys({**state, "score": 0.9, "new": 1}, fingerprints)
+    assert sorted(delta) == ["chain", "new", "score"]
+    assert _changed_keys({**state, "score": delta["score"], "new": delta["new"]}, fingerprints) == {}
+
+
+@pytest.mark.asyncio
+async def test_recorded_run_emits_only_changed_keys(monkeypatch):
+    monkeypatch.setenv("QNWIS_WORKFLOW_IMPL", "langgraph")
+    updates = record_run(n_facts=50)
+    assert len(updates) == 40
+
+    events = [
+        event async for event in run_workflow_stream("q", graph=RecordedGraph(updates))
+    ]
+    node_events = {e.stage: e for e in events if e.stage.startswith("scenario_3_")}
+    payload = node_events["scenario_3_market"].payload
+    assert payload["changed_keys"] == ["market_analysis_s3", "reasoning_chain"]
+    assert "extracted_facts" not in payload
+
+    done = [e for e in events if e.stage == "done"][0]
+    assert len(done.payload["extracted_facts"]) == 50
+
+
+def test_benchmark_replay_reports_ttfb_and_cpu_per_event():
+    result = run_benchmark(n_facts=200, include_compile=False)
+    assert result["nodes"] == 40
+    assert result["events"] > 40
+    assert result["ttfb_ms"] > 0
+    assert result["cpu_ms_per_event"] > 0
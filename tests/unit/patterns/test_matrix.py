@@ -0,0 +1,163 @@
+"""
+Unit tests for the batch pattern mining core.
+
+Batch statistics are checked against the pure-Python references in
+``patterns.metrics`` and batch screening against the per-pair loop.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from src.qnwis.patterns import metrics
+from src.qnwis.patterns.matrix import (
+    SeriesMatrix,
+    adjust_pvalues,
+    correlate_columns,
+    correlation_pvalues,
+    rank_columns,
+    score_drivers,
+    stability_columns,
+)
+from src.qnwis.patterns.miner import PatternMiner, SeriesPoint
+from src.qnwis.perf.pattern_bench import legacy_screen, synthetic_cohorts
+
+
+@pytest.fixture
+def block() -> np.ndarray:
+    rng = np.random.default_rng(3)
+    x = rng.normal(size=(24, 6))
+    x[:, 1] = np.round(x[:, 1])  # ties
+    x[:, 2] = 4.0  # constant
+    return x
+
+
+class TestBatchStatistics:
+    """Vectorized statistics match the scalar references."""
+
+    def test_rank_columns_averages_ties(self, block):
+        ranks = rank_columns(block)
+        for j in range(block.shape[1]):
+            assert ranks[:, j].tolist() == metrics._rank_values(block[:, j].tolist())
+
+    @pytest.mark.parametrize("method", ["pearson", "spearman"])
+    def test_correlate_columns(self, block, method):
+        y = np.linspace(0.0, 1.0, 24) + block[:, 0]
+        reference = metrics.pearson if method == "pearson" else metrics.spearman
+        expected = [reference(block[:, j].tolist(), y.tolist()) for j in range(block.shape[1])]
+        np.testing.assert_allclose(correlate_columns(block, y, method), expected, atol=1e-12)
+        assert correlate_columns(block, y, method)[2] == 0.0
+
+    def test_constant_outcome_scores_zero(self, block):
+        assert correlate_columns(block, np.ones(24)).tolist() == [0.0] * 6
+
+    def test_stability_columns(self, block):
+        expected = [metrics.stability(block[:, j].tolist()) for j in range(block.shape[1])]
+        np.testing.assert_allclose(stability_columns(block), expected, atol=1e-12)
+        assert stability_columns(block[:8]).tolist() == [0.5] * 6
+
+    def test_pvalues_match_scipy(self, block):
+        y = block[:, 0] + block[:, 3]
+        r = correlate_columns(block, y, "pearson")
+        p = correlation_pvalues(r, np.full(6, 24))
+        for j in (0, 1, 3):
+            assert p[j] == pytest.approx(stats.pearsonr(block[:, j], y).pvalue, rel=1e-9)
+        assert correlation_pvalues(np.array([1.0, 0.5]), np.array([10, 2])).tolist() == [0.0, 1.0]
+
+    def test_benjamini_hochberg(self):
+        p = np.array([0.01, 0.04, 0.03, 0.04, 0.5])
+        # Step-up: q_(i) = min_{j >= i} p_(j) * m / j
+        np.testing.assert_allclose(adjust_pvalues(p), [0.05, 0.05, 0.05, 0.05, 0.5])
+        np.testing.assert_allclose(adjust_pvalues(p, "bonferroni"), [0.05, 0.2, 0.15, 0.2, 1.0])
+        assert adjust_pvalues(p, "none").tolist() == p.tolist()
+        with pytest.raises(ValueError):
+            adjust_pvalues(p, "holm")  # type: ignore[arg-type]
+
+
+class TestSeriesMatrix:
+    """Alignment and window views."""
+
+    def make_points(self, start, values, sa=None, step=1):
+        return [
+            SeriesPoint(
+                date=start + timedelta(days=30 * step * i),
+                value=v,
+                seasonally_adjusted=None if sa is None else sa[i],
+            )
+            for i, v in enumerate(values)
+        ]
+
+    def test_alignment_and_window_view(self):
+        start = date(2024, 1, 1)
+        matrix = SeriesMatrix.from_series({
+            "outcome": self.make_points(start, [1.0, 2.0, 3.0, 4.0]),
+            "driver": self.make_points(start, [5.0, 6.0], step=2),
+        })
+        assert len(matrix.dates) == 4
+        assert np.isnan(matrix.values[1, 1])
+
+        recent = matrix.since(start + timedelta(days=60))
+        assert recent.values.base is not None  # view, not a copy
+        assert recent.values[:, 0].tolist() == [3.0, 4.0]
+
+    def test_score_drivers_masks_and_adjustment(self):
+        start = date(2024, 1, 1)
+        outcome = [float(i) for i in range(12)]
+        matrix = SeriesMatrix.from_series({
+            "outcome": self.make_points(start, outcome, sa=[v * 2 for v in outcome]),
+            "sa_driver": self.make_points(start, [5.0] * 12, sa=[float(i) for i in range(12)]),
+            "gappy": self.make_points(start, outcome[:6]),
+            "raw": self.make_points(start, [-v for v in outcome]),
+        })
+        scores = score_drivers(matrix, "outcome", ["sa_driver", "gappy", "raw"], min_support=10)
+        assert scores.seasonally_adjusted.tolist() == [True, False, False]
+        assert scores.scored.tolist() == [True, False, True]
+        assert scores.effect[0] == pytest.approx(1.0)
+        assert scores.effect[2] == pytest.approx(-1.0)
+
+
+class TestBatchScreening:
+    """Batch screening reproduces the per-pair loop."""
+
+    def test_matches_legacy_screen(self):
+        drivers, data = synthetic_cohorts(12, 4, months=30)
+        miner = PatternMiner()
+        args = (drivers, "outcome", list(data), date(2024, 12, 31), [3, 6, 12, 24], data, 3)
+
+        batch = miner.screen_drivers_across_cohorts(*args)
+        legacy = legacy_screen(miner, *args)
+
+        assert [(f.cohort, f.driver) for f in batch] == [(f.cohort, f.driver) for f in legacy]
+        for new, old in zip(batch, legacy):
+            assert new.effect == pytest.approx(old.effect, abs=1e-12)
+            assert new.stability == pytest.approx(old.stability, abs=1e-12)
+            assert (new.support, new.n, new.direction) == (old.support, old.n, old.direction)
+
+    def test_correction_and_significance_filter(self):
+        drivers, data = synthetic_cohorts(12, 4, months=30)
+        args = (drivers, "outcome", list(data), date(2024, 12, 31), [12, 24], data, 3)
+
+        findings = PatternMiner().screen_drivers_across_cohorts(*args)
+        assert all(f.q_value >= f.p_value for f in findings)
+
+        strict = PatternMiner(max_q_value=0.01).screen_drivers_across_cohorts(*args)
+        assert strict and len(strict) < len(findings)
+        assert all(f.q_value <= 0.01 for f in strict)
+
+        bonferroni = PatternMiner(correction="bonferroni").screen_drivers_across_cohorts(*args)
+        assert all(
+            b.q_value >= f.q_value for b, f in zip(bonferroni, findings)
+        )
+
+    def test_single_driver_screen_uses_batch(self):
+        drivers, data = synthetic_cohorts(3, 2, months=24)
+        miner = PatternMiner()
+        single = miner.screen_driver_across_cohorts(
+            drivers[0], "outcome", list(data), date(2024, 12, 31), [6, 12], data, 3
+        )
+        assert {f.driver for f in single} <= {drivers[0]}
+        assert all(f.q_value is not None for f in single)
@@ -0,0 +1,246 @@
+"""Unit tests for the on-disk API response cache.
+
+Verifies:
+- Miss, hit and conditional revalidation (If-None-Match / 304)
+- Stale-while-revalidate and stale-if-error windows
+- Offline replay and CacheMissError
+- Frame snapshots reused for unchanged bodies
+- World Bank connector served entirely from the cache
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+import pandas as pd
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from data.apis._cache import (
+    CACHE_STATUS_HEADER,
+    AsyncCachingTransport,
+    CacheMissError,
+    CachePolicy,
+    CachingTransport,
+    ResponseCache,
+)
+from data.apis._transport import AsyncTransport
+from data.apis.world_bank import UDCGlobalDataIntegrator
+
+URL = "https://api.example.org/v1/series"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Origin:
+    """Mock origin with an ETag that honours If-None-Match."""
+
+    def __init__(self, body: bytes = b'{"value": 1}', etag: str = '"v1"') -> None:
+        self.body = body
+        self.etag = etag
+        self.status: int | None = None
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.status is not None:
+            return httpx.Response(self.status)
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        return httpx.Response(200, headers={"ETag": self.etag}, content=self.body)
+
+
+def make_cache(tmp_path: Path, policy: CachePolicy, **kwargs) -> tuple[ResponseCache, FakeClock]:
+    clock = FakeClock()
+    cache = ResponseCache(tmp_path, policies={}, default_policy=policy, clock=clock, **kwargs)
+    return cache, clock
+
+
+def sync_client(cache: ResponseCache, origin: Origin) -> httpx.Client:
+    return httpx.Client(transport=CachingTransport(httpx.MockTransport(origin), cache))
+
+
+def test_miss_then_hit(tmp_path: Path) -> None:
+    cache, _ = make_cache(tmp_path, CachePolicy(max_age=60))
+    origin = Origin()
+    with sync_client(cache, origin) as client:
+        first = client.get(URL, params={"b": 2, "a": 1})
+        second = client.get(URL, params={"a": 1, "b": 2})
+
+    assert first.headers[CACHE_STATUS_HEADER] == "MISS"
+    assert second.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert second.json() == {"value": 1}
+    assert len(origin.requests) == 1
+    assert cache.stats_snapshot()["hits"] == 1
+    assert cache.stats_snapshot()["misses"] == 1
+
+
+def test_expired_entry_is_revalidated_with_etag(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60))
+    origin = Origin()
+    with sync_client(cache, origin) as client:
+        client.get(URL)
+        clock.now += 120
+        response = client.get(URL)
+        clock.now += 30
+        fresh_again = client.get(URL)
+
+    assert origin.requests[1].headers["if-none-match"] == '"v1"'
+    assert response.headers[CACHE_STATUS_HEADER] == "REVALIDATED"
+    assert response.json() == {"value": 1}
+    assert fresh_again.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert cache.stats_snapshot()["revalidated"] == 1
+
+
+def test_stale_while_revalidate_refreshes_in_background(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60, stale_while_revalidate=600))
+    origin = Origin()
+
+    async def scenario() -> httpx.Response:
+        transport = AsyncCachingTransport(httpx.MockTransport(origin), cache)
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get(URL)
+            clock.now += 120
+            origin.body, origin.etag = b'{"value": 2}', '"v2"'
+            stale = await client.get(URL)
+        return stale  # closing the client waits for the revalidation
+
+    stale = asyncio.run(scenario())
+    assert stale.headers[CACHE_STATUS_HEADER] == "STALE"
+    assert stale.json() == {"value": 1}
+
+    with sync_client(cache, origin) as client:
+        refreshed = client.get(URL)
+    assert refreshed.headers[CACHE_STATUS_HEADER] == "HIT"
+    assert refreshed.json() == {"value": 2}
+    assert len(origin.requests) == 2
+
+
+def test_stale_entry_served_when_origin_fails(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60, stale_if_error=3600))
+    origin = Origin()
+    with sync_client(cache, origin) as client:
+        client.get(URL)
+        clock.now += 120
+        origin.status = 503
+        response = client.get(URL)
+        clock.now += 7200
+        expired = client.get(URL)
+
+    assert response.headers[CACHE_STATUS_HEADER] == "STALE-IF-ERROR"
+    assert response.json() == {"value": 1}
+    assert expired.status_code == 503
+    assert cache.stats_snapshot()["stale_on_error"] == 1
+
+
+def test_stale_entry_served_when_origin_unreachable(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60, stale_if_error=3600))
+    cache.put(URL, b'{"value": 1}')
+    clock.now += 120
+
+    def unreachable(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("Name or service not known", request=request)
+
+    with httpx.Client(transport=CachingTransport(httpx.MockTransport(unreachable), cache)) as client:
+        assert client.get(URL).json() == {"value": 1}
+        with pytest.raises(httpx.ConnectError):
+            client.get(URL, params={"other": 1})
+
+
+def test_no_store_and_non_get_bypass_the_cache(tmp_path: Path) -> None:
+    cache, _ = make_cache(tmp_path, CachePolicy(max_age=60))
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(200, headers={"Cache-Control": "no-store"}, json={"ok": True})
+
+    with httpx.Client(transport=CachingTransport(httpx.MockTransport(handler), cache)) as client:
+        client.get(URL)
+        client.get(URL)
+        client.post(URL, json={})
+
+    assert calls == ["GET", "GET", "POST"]
+    assert cache.lookup(httpx.Request("GET", URL)) is None
+
+
+def test_offline_replays_and_raises_on_miss(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60), offline=True)
+    cache.put(URL, '{"value": 7}', params={"year": 2023})
+    clock.now += 10 * 365 * 86_400  # age does not matter offline
+
+    def no_network(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("offline cache touched the network")
+
+    with httpx.Client(transport=CachingTransport(httpx.MockTransport(no_network), cache)) as client:
+        assert client.get(URL, params={"year": 2023}).json() == {"value": 7}
+        with pytest.raises(CacheMissError):
+            client.get(URL, params={"year": 2024})
+
+
+def test_frame_snapshot_reused_until_body_changes(tmp_path: Path) -> None:
+    cache, clock = make_cache(tmp_path, CachePolicy(max_age=60))
+    origin = Origin(body=b'[{"country": "QAT", "year": 2023, "value": 1.5}]')
+    parses = 0
+
+    def parse(response: httpx.Response) -> pd.DataFrame:
+        nonlocal parses
+        parses += 1
+        return pd.DataFrame(response.json())
+
+    with sync_client(cache, origin) as client:
+        first = cache.frame(client.get(URL), parse)
+        clock.now += 120
+        revalidated = cache.frame(client.get(URL), parse)
+        clock.now += 120
+        origin.body, origin.etag = b'[{"country": "QAT", "year": 2024, "value": 2.5}]', '"v2"'
+        changed = cache.frame(client.get(URL), parse)
+
+    assert parses == 2
+    assert revalidated.equals(first)
+    assert list(revalidated.dtypes) == list(first.dtypes)
+    assert changed["year"].tolist() == [2024]
+    assert cache.stats_snapshot()["frame_hits"] == 1
+    assert len(list(tmp_path.rglob("*.frame*"))) == 1
+
+
+def test_world_bank_replays_offline(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, offline=True)
+    for country, value in [("QAT", 2.1), ("SAU", 5.6)]:
+        cache.put(
+            f"https://api.worldbank.org/v2/country/{country}/indicator/SL.UEM.TOTL.ZS",
+            f'[{{"page": 1}}, [{{"date": "2023", "value": {value}, '
+            f'"indicator": {{"value": "Unemployment"}}}}]]',
+            params={"format": "json", "date": "2023", "per_page": 100},
+        )
+
+    def no_network(request: httpx.Request) -> httpx.Response:
+        raise AssertionError("offline replay touched the network")
+
+    transport = AsyncTransport(transport=httpx.MockTransport(no_network), cache=cache)
+    integrator = UDCGlobalDataIntegrator(output_dir=tmp_path / "out", transport=transport)
+    integrator.base_url = "https://api.worldbank.org/v2"
+
+    frame = integrator.get_indicator("SL.UEM.TOTL.ZS", countries=["QAT", "SAU"], year=2023)
+    assert frame["country"].tolist() == ["QAT", "SAU"]
+    assert frame["value"].tolist() == [2.1, 5.6]
+
+    again = integrator.get_indicator("SL.UEM.TOTL.ZS", countries=["QAT", "SAU"], year=2023)
+    assert again.equals(frame)
+    assert cache.stats_snapshot() == {
+        "hits": 4,
+        "stale": 0,
+        "revalidated": 0,
+        "misses": 0,
+        "stale_on_error": 0,
+        "frame_hits": 2,
+    }
@@ -0,0 +1,119 @@
+"""Unit tests for the shared async API transport.
+
+Verifies:
+- send_with_retry semantics (5xx retried, 4xx raised)
+- Per-host concurrency and rate budgets
+- Pooled clients reused across sync calls
+- LMIS cache fallback through the transport
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+# Add src directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from data.apis import _transport
+from data.apis._transport import AsyncTransport, HostBudget, run_sync
+from data.apis.lmis_mol_api import LMISAPIClient
+
+URL = "https://api.example.org/v1/series"
+
+
+def test_server_errors_are_retried() -> None:
+    statuses = iter([503, 502, 200])
+    transport = AsyncTransport(
+        transport=httpx.MockTransport(lambda request: httpx.Response(next(statuses), json={"ok": True}))
+    )
+
+    response, metadata = run_sync(transport.request("GET", URL, backoff=0.0))
+    assert response.json() == {"ok": True}
+    assert metadata.retries == 2 and not metadata.rate_limited
+
+
+def test_client_errors_are_raised_without_retry() -> None:
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(404)
+
+    transport = AsyncTransport(transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        run_sync(transport.request("GET", URL))
+    assert calls == 1
+
+
+def test_concurrency_is_capped_per_host() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    transport = AsyncTransport(
+        default_budget=HostBudget(max_concurrency=2, requests_per_second=0),
+        budgets={"b.example.org": HostBudget(max_concurrency=5, requests_per_second=0)},
+        transport=httpx.MockTransport(handler),
+    )
+
+    async def fan_out() -> None:
+        await asyncio.gather(
+            *(transport.request("GET", f"https://{host}/x") for host in ["a.example.org", "b.example.org"] * 20)
+        )
+
+    run_sync(fan_out())
+    assert peak == {"a.example.org": 2, "b.example.org": 5}
+
+
+def test_rate_budget_spaces_requests() -> None:
+    transport = AsyncTransport(
+        default_budget=HostBudget(max_concurrency=1, requests_per_second=50.0),
+        transport=httpx.MockTransport(lambda request: httpx.Response(200)),
+    )
+
+    async def burst() -> None:
+        await asyncio.gather(*(transport.request("GET", URL) for _ in range(6)))
+
+    start = time.perf_counter()
+    run_sync(burst())
+    # One request from the bucket, five more at 20 ms intervals
+    assert time.perf_counter() - start >= 0.09
+
+
+def test_sync_calls_share_one_pooled_client() -> None:
+    transport = AsyncTransport(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    run_sync(transport.request("GET", URL))
+    run_sync(transport.request("GET", URL + "/2"))
+
+    pools = transport._pools[_transport._background_loop()]
+    assert list(pools) == ["api.example.org"]
+
+
+def test_run_sync_rejects_calls_from_transport_loop() -> None:
+    async def nested() -> None:
+        run_sync(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="transport loop"):
+        run_sync(nested())
+
+
+def test_lmis_falls_back_to_cache_on_auth_failure() -> None:
+    transport = AsyncTransport(transport=httpx.MockTransport(lambda request: httpx.Response(401)))
+    client = LMISAPIClient(api_token="token", transport=transport)
+    client._cache = {"sample_data": {"main_indicators": [{"GDP": 825.7}]}}
+
+    df = client.get_qatar_main_indicators()
+    assert df["GDP"].tolist() == [825.7]
+    assert df["source"].tolist() == ["LMIS_MOL"]
@@ -3,13 +3,14 @@
 Verifies:
 - Base URL configurable from environment
 - Timeout handling
-- raise_for_status() called
+- HTTP errors raised
+- Concurrent per-country fetches
 - No hardcoded secrets
 """
 
+import asyncio
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
 
 import httpx
 import pandas as pd
@@ -18,6 +19,7 @@ import pytest
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
+from data.apis._transport import AsyncTransport
 from data.apis.world_bank import UDCGlobalDataIntegrator, _client, _get_base_url
 
 
@@ -47,105 +49,109 @@ def test_client_configuration() -> None:
     client.close()
 
 
+def mock_transport(handler) -> AsyncTransport:
+    """Transport whose requests are answered by ``handler`` instead of the network."""
+    return AsyncTransport(transport=httpx.MockTransport(handler))
+
+
 def test_get_indicator_with_mocked_api(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test get_indicator with mocked World Bank API response."""
-    # Mock API response
-    mock_response = Mock(spec=httpx.Response)
-    mock_response.status_code = 200
-    mock_response.json.return_value = [
-        {"page": 1, "total": 2},  # Metadata
-        [  # Data
-            {
-                "date": "2023",
-                "value": 180.5,
-                "indicator": {"value": "GDP"},
-                "country": {"value": "Qatar"},
-            },
-            {
-                "date": "2022",
-                "value": 175.2,
-                "indicator": {"value": "GDP"},
-                "country": {"value": "Qatar"},
-            },
-        ],
-    ]
-
-    with patch("data.apis.world_bank.httpx.Client") as MockClient:
-        mock_client_instance = MagicMock()
-        mock_client_instance.__enter__.return_value = mock_client_instance
-        mock_client_instance.__exit__.return_value = None
-        mock_client_instance.request.return_value = mock_response
-        MockClient.return_value = mock_client_instance
-
-        integrator = UDCGlobalDataIntegrator()
-        df = integrator.get_indicator(
-            indicator="NY.GDP.MKTP.CD",
-            countries=["QAT"],
-            year=2023,
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json=[
+                {"page": 1, "total": 2},  # Metadata
+                [  # Data
+                    {
+                        "date": "2023",
+                        "value": 180.5,
+                        "indicator": {"value": "GDP"},
+                        "country": {"value": "Qatar"},
+                    },
+                    {
+                        "date": "2022",
+                        "value": 175.2,
+                        "indicator": {"value": "GDP"},
+                        "country": {"value": "Qatar"},
+                    },
+                ],
+            ],
         )
 
-        # Verify raise_for_status was called
-        mock_response.raise_for_status.assert_called()
+    integrator = UDCGlobalDataIntegrator(transport=mock_transport(handler))
+    df = integrator.get_indicator(
+        indicator="NY.GDP.MKTP.CD",
+        countries=["QAT"],
+        year=2023,
+    )
+
+    # Verify request shape
+    assert len(requests) == 1
+    assert requests[0].url.path.endswith("/country/QAT/indicator/NY.GDP.MKTP.CD")
+    assert requests[0].headers["User-Agent"] == "QNWIS-WorldBankClient/1.0"
 
-        # Verify DataFrame structure
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) == 2
-        assert "country" in df.columns
-        assert "year" in df.columns
-        assert "value" in df.columns
-        assert df.attrs["request_metadata"]["endpoint"] == "world_bank_indicator"
+    # Verify DataFrame structure
+    assert isinstance(df, pd.DataFrame)
+    assert len(df) == 2
+    assert "country" in df.columns
+    assert "year" in df.columns
+    assert "value" in df.columns
+    assert df.attrs["request_metadata"]["endpoint"] == "world_bank_indicator"
 
 
 def test_get_indicator_raises_on_http_error() -> None:
     """Test that HTTP errors are properly raised."""
-    mock_response = Mock(spec=httpx.Response)
-    mock_response.status_code = 500
-    mock_response.raise_for_status.side_effect = httpx.HTTPStatusError(
-        "Server error", request=Mock(), response=mock_response
+    integrator = UDCGlobalDataIntegrator(
+        transport=mock_transport(lambda request: httpx.Response(500))
     )
 
-    with patch("data.apis.world_bank.httpx.Client") as MockClient:
-        mock_client_instance = MagicMock()
-        mock_client_instance.__enter__.return_value = mock_client_instance
-        mock_client_instance.__exit__.return_value = None
-        mock_client_instance.request.return_value = mock_response
-        MockClient.return_value = mock_client_instance
+    with pytest.raises(httpx.HTTPStatusError):
+        integrator.get_indicator(
+            indicator="NY.GDP.MKTP.CD",
+            countries=["QAT"],
+        )
+
+
+def test_get_indicator_fetches_countries_concurrently() -> None:
+    """Countries are requested in parallel and returned in request order."""
+    in_flight = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.02)
+        in_flight -= 1
+        country = request.url.path.split("/")[-3]
+        return httpx.Response(200, json=[{}, [{"date": "2023", "value": len(country)}]])
 
-        integrator = UDCGlobalDataIntegrator()
+    integrator = UDCGlobalDataIntegrator(transport=mock_transport(handler))
+    df = integrator.get_indicator("SP.POP.TOTL", countries=["QAT", "SAU", "ARE", "KWT"])
 
-        with pytest.raises(httpx.HTTPStatusError):
-            integrator.get_indicator(
-                indicator="NY.GDP.MKTP.CD",
-                countries=["QAT"],
-            )
+    assert list(df["country"]) == ["QAT", "SAU", "ARE", "KWT"]
+    assert peak > 1
 
 
 def test_get_multiple_indicators() -> None:
     """Test get_multiple_indicators returns dict of DataFrames."""
-    mock_response = Mock(spec=httpx.Response)
-    mock_response.status_code = 200
-    mock_response.json.return_value = [
-        {},
-        [
-            {"date": "2023", "value": 100.0, "indicator": {"value": "Test"}},
-        ],
-    ]
-
-    with patch("data.apis.world_bank.httpx.Client") as MockClient:
-        mock_client_instance = MagicMock()
-        mock_client_instance.__enter__.return_value = mock_client_instance
-        mock_client_instance.__exit__.return_value = None
-        mock_client_instance.request.return_value = mock_response
-        MockClient.return_value = mock_client_instance
-
-        integrator = UDCGlobalDataIntegrator()
-        result = integrator.get_multiple_indicators(
-            indicators=["NY.GDP.MKTP.CD", "NY.GDP.MKTP.KD.ZG"],
-            countries=["QAT"],
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json=[{}, [{"date": "2023", "value": 100.0, "indicator": {"value": "Test"}}]]
         )
 
-        assert isinstance(result, dict)
-        assert len(result) == 2
+    integrator = UDCGlobalDataIntegrator(transport=mock_transport(handler))
+    result = integrator.get_multiple_indicators(
+        indicators=["NY.GDP.MKTP.CD", "NY.GDP.MKTP.KD.ZG"],
+        countries=["QAT"],
+    )
+
+    assert isinstance(result, dict)
+    assert len(result) == 2
 
 
 def test_timeout_respected() -> None:
@@ -0,0 +1,176 @@
+"""
+Unit tests for the NSIC embeddings server micro-batcher.
+
+Tests that EmbeddingBatcher:
+- Coalesces concurrent requests into few encode calls
+- Preserves per-request ordering
+- Encodes only cache misses
+- Propagates encoder errors to every waiting request
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.nsic.servers.embedding_batcher import EmbeddingBatcher, StubEncoder, run_benchmark
+
+
+class DictCache:
+    """In-memory stand-in for EmbeddingCache.get_batch/set_batch."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get_batch(self, texts):
+        results = [self.store.get(t) for t in texts]
+        return results, [i for i, r in enumerate(results) if r is None]
+
+    def set_batch(self, texts, embeddings):
+        for i, text in enumerate(texts):
+            self.store[text] = np.array(embeddings[i])
+        return len(texts)
+
+
+class RecordingEncoder(StubEncoder):
+    """Stub encoder that records each batch it receives."""
+
+    def __init__(self, **kwargs):
+        super().__init__(dim=8, call_overhead_ms=0.0, per_text_ms=0.0, **kwargs)
+        self.batches = []
+
+    def __call__(self, texts, task="default"):
+        self.batches.append((task, list(texts)))
+        return super().__call__(texts, task)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_batched():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encode_fn=encoder, max_batch_size=64, max_latency_ms=20)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(
+            *(batcher.submit([f"text {i}"]) for i in range(20))
+        )
+    finally:
+        await batcher.stop()
+
+    assert len(encoder.batches) < 20
+    for i, emb in enumerate(results):
+        assert emb.shape == (1, 8)
+        np.testing.assert_allclose(emb[0], encoder([f"text {i}"])[0])
+
+
+@pytest.mark.asyncio
+async def test_batch_size_limit_respected():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encode_fn=encoder, max_batch_size=4, max_latency_ms=20)
+    await batcher.start()
+    try:
+        await asyncio.gather(*(batcher.submit(["a", "b"]) for _ in range(6)))
+    finally:
+        await batcher.stop()
+
+    assert all(len(texts) <= 4 for _, texts in encoder.batches)
+    assert batcher.get_metrics()["texts"] == 12
+
+
+@pytest.mark.asyncio
+async def test_tasks_are_encoded_separately():
+    encoder = RecordingEncoder()
+    batcher = EmbeddingBatcher(encode_fn=encoder, max_latency_ms=20)
+    await batcher.start()
+    try:
+        query, docs = await asyncio.gather(
+            batcher.submit(["q"], task="query"),
+            batcher.submit(["d1", "d2"], task="document"),
+        )
+    finally:
+        await batcher.stop()
+
+    assert {task for task, _ in encoder.batches} == {"query", "document"}
+    assert query.shape == (1, 8)
+    assert docs.shape == (2, 8)
+
+
+@pytest.mark.asyncio
+async def test_only_cache_misses_are_encoded():
+    encoder = RecordingEncoder()
+    cache = DictCache()
+    cache.set_batch(["cached"], encoder(["cached"]))
+    encoder.batches.clear()
+
+    batcher = EmbeddingBatcher(encode_fn=encoder, cache=cache, max_latency_ms=5)
+    await batcher.start()
+    try:
+        result = await batcher.submit(["cached", "new", "new"])
+    finally:
+        await batcher.stop()
+
+    assert encoder.batches == [("default", ["new"])]
+    assert result.shape == (3, 8)
+    np.testing.assert_allclose(result[1], result[2])
+    assert "new" in cache.store
+    assert batcher.get_metrics()["cache_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_encoder_error_propagates_to_all_requests():
+    def failing_encoder(texts, task):
+        raise RuntimeError("model crashed")
+
+    batcher = EmbeddingBatcher(encode_fn=failing_encoder, max_latency_ms=20)
+    await batcher.start()
+    try:
+        results = await asyncio.gather(
+            batcher.submit(["a"]), batcher.submit(["b"]), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert batcher.get_metrics()["errors"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_submit_requires_running_batcher():
+    batcher = EmbeddingBatcher(encode_fn=RecordingEncoder())
+    with pytest.raises(RuntimeError):
+        await batcher.submit(["a"])
+
+
+@pytest.mark.asyncio
+async def test_benchmark_batched_faster_than_unbatched():
+    encoder = StubEncoder(dim=16, call_overhead_ms=5.0, per_text_ms=0.05)
+    result = await run_benchmark(
+        requests=60, concurrency=30, encoder=encoder, max_latency_ms=2.0
+    )
+
+    assert result["batcher"]["batches"] < 60
+    assert result["batched_s"] < result["unbatched_s"]
+
+
+@pytest.mark.asyncio
+async def test_server_stats_count_texts_encoded_through_batcher(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.nsic.servers import embeddings_server
+
+    service = SimpleNamespace(
+        model_name="stub", device="cpu", embedding_dim=8, _encode_calls=0, _total_texts=0
+    )
+    batcher = EmbeddingBatcher(encode_fn=RecordingEncoder(), cache=DictCache())
+    monkeypatch.setattr(embeddings_server, "embedding_service", service)
+    monkeypatch.setattr(embeddings_server, "batcher", batcher)
+    monkeypatch.setattr(embeddings_server, "get_gpu_memory", lambda: 0.0)
+    await batcher.start()
+    try:
+        await batcher.submit(["a", "b", "c"])
+        await batcher.submit(["a"])  # cache hit, not re-encoded
+        stats = await embeddings_server.get_stats()
+    finally:
+        await batcher.stop()
+
+    assert stats.total_texts_encoded == 3
+    assert stats.encode_calls == 1
@@ -0,0 +1,162 @@
+"""
+Unit tests for EmbeddingCache segment-file storage.
+
+Tests that storage="segment":
+- Round-trips embeddings through bulk set_batch/get_batch
+- Reports misses in the same shape as the diskcache backend
+- Persists across reopen and supports float16 rows
+- Compacts overwritten rows and honors the size budget
+- Migrates existing diskcache entries on first open
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from src.nsic.rag.embedding_cache import EmbeddingCache
+from src.nsic.rag.segment_store import SegmentEmbeddingStore
+
+
+def _embeddings(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+@pytest.fixture
+def segment_cache(tmp_path):
+    cache = EmbeddingCache(cache_dir=tmp_path, storage="segment")
+    yield cache
+    cache.close()
+
+
+def test_set_batch_get_batch_round_trip(segment_cache):
+    texts = [f"chunk {i}" for i in range(50)]
+    embs = _embeddings(50)
+
+    assert segment_cache.set_batch(texts, embs) == 50
+
+    results, missing = segment_cache.get_batch(texts + ["unknown"])
+    assert missing == [50]
+    assert results[50] is None
+    np.testing.assert_allclose(np.array(results[:50]), embs)
+    assert len(segment_cache) == 50
+    assert "chunk 3" in segment_cache
+
+
+def test_single_get_and_set(segment_cache):
+    emb = _embeddings(1)[0]
+    assert segment_cache.get("alpha") is None
+    assert segment_cache.set("alpha", emb)
+    np.testing.assert_allclose(segment_cache.get("alpha"), emb)
+
+    stats = segment_cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["storage"] == "segment"
+
+
+def test_overwrite_returns_latest(segment_cache):
+    segment_cache.set_batch(["a"], _embeddings(1, seed=1))
+    newer = _embeddings(1, seed=2)
+    segment_cache.set_batch(["a"], newer)
+
+    np.testing.assert_allclose(segment_cache.get("a"), newer[0])
+    assert len(segment_cache) == 1
+
+
+def test_persists_across_reopen_and_float16(tmp_path):
+    embs = _embeddings(10)
+    texts = [f"t{i}" for i in range(10)]
+    with EmbeddingCache(cache_dir=tmp_path, storage="segment", dtype="float16") as cache:
+        cache.set_batch(texts, embs)
+
+    with EmbeddingCache(cache_dir=tmp_path, storage="segment") as cache:
+        results, missing = cache.get_batch(texts)
+        assert missing == []
+        assert cache.segments.dtype == np.float16
+        np.testing.assert_allclose(np.array(results), embs, atol=1e-2)
+
+
+def test_segment_rotation(tmp_path):
+    store = SegmentEmbeddingStore(tmp_path, segment_max_rows=8)
+    keys = [f"k{i}" for i in range(20)]
+    embs = _embeddings(20)
+    store.put_many(keys, embs)
+
+    assert len(list(tmp_path.glob("seg_*.bin"))) == 3
+    matrix, found = store.get_many(keys)
+    assert found.all()
+    np.testing.assert_allclose(matrix, embs)
+    store.close()
+
+
+def test_two_stores_on_one_directory_get_distinct_rows(tmp_path):
+    a = SegmentEmbeddingStore(tmp_path, segment_max_rows=4)
+    b = SegmentEmbeddingStore(tmp_path, segment_max_rows=4)
+    ones, twos = np.ones((1, 16)), np.full((1, 16), 2.0)
+
+    a.put_many(["k1"], ones)
+    b.put_many(["k2"], twos)
+    a.put_many([f"a{i}" for i in range(4)], _embeddings(4))
+
+    for store in (a, b):
+        matrix, found = store.get_many(["k1", "k2"])
+        assert found.all()
+        np.testing.assert_allclose(matrix[0], ones[0])
+        np.testing.assert_allclose(matrix[1], twos[0])
+    np.testing.assert_allclose(b.get_many(["a3"])[0][0], _embeddings(4)[3])
+    a.close()
+    b.close()
+
+
+def test_compaction_drops_dead_rows_and_evicts_oldest(tmp_path):
+    dim = 16
+    row_bytes = dim * 4
+    store = SegmentEmbeddingStore(tmp_path, max_size_bytes=100 * row_bytes)
+
+    store.put_many([f"k{i}" for i in range(60)], _embeddings(60, dim))
+    store.put_many([f"k{i}" for i in range(60)], _embeddings(60, dim, seed=1))
+    # 120 rows written > 100-row budget: compaction keeps the newest 60 live rows
+    assert len(store) == 60
+    assert store._data_bytes() == 60 * row_bytes
+
+    store.put_many([f"n{i}" for i in range(60)], _embeddings(60, dim, seed=2))
+    assert store._data_bytes() <= 100 * row_bytes
+    _, found = store.get_many(["k0", "n59"])
+    assert not found[0]
+    assert found[1]
+    store.close()
+
+
+def test_migrates_existing_diskcache_entries(tmp_path):
+    pytest.importorskip("diskcache")
+    texts = [f"legacy {i}" for i in range(5)]
+    embs = _embeddings(5)
+    with EmbeddingCache(cache_dir=tmp_path) as legacy:
+        legacy.set_batch(texts, embs)
+
+    with EmbeddingCache(cache_dir=tmp_path, storage="segment") as cache:
+        results, missing = cache.get_batch(texts)
+        assert missing == []
+        np.testing.assert_allclose(np.array(results), embs, rtol=1e-6)
+        assert cache.segments.get_meta("migrated_from_diskcache") == "5"
+
+
+def test_bulk_ingestion_throughput(tmp_path):
+    """20k rows should ingest and gather in well under a second each."""
+    n, dim = 20000, 384
+    texts = [f"corpus chunk {i}" for i in range(n)]
+    embs = _embeddings(n, dim)
+
+    with EmbeddingCache(cache_dir=tmp_path, storage="segment") as cache:
+        start = time.perf_counter()
+        cache.set_batch(texts, embs)
+        write_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results, missing = cache.get_batch(texts)
+        read_s = time.perf_counter() - start
+
+    assert missing == []
+    assert write_s < 5.0
+    assert read_s < 5.0
@@ -0,0 +1,136 @@
+"""
+Unit tests for the Engine B transports.
+
+The in-process transport must return what the REST endpoints return for the
+same request models.
+"""
+
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.nsic.engine_b.api import app
+from src.nsic.engine_b.operations import CorrelationRequest, OPERATIONS, create_services, execute
+from src.nsic.engine_b.transport import (
+    HTTPTransport,
+    InProcessTransport,
+    _pack_arrays,
+    _release,
+    _unpack_arrays,
+    get_engine_b_transport,
+    reset_engine_b_transports,
+    scenario_requests,
+)
+
+# Deterministic result fields per path (timings and sampled values excluded)
+STABLE_FIELDS = {
+    "/compute/monte_carlo": ["n_simulations"],
+    "/compute/sensitivity": ["base_result", "top_drivers", "n_parameters"],
+    "/compute/forecast": ["trend", "method_used", "n_historical"],
+    "/compute/thresholds": ["risk_level", "safe_range", "n_constraints"],
+}
+
+
+def _correlation_payload(n=600):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=n)
+    return {
+        "data": {"x": x.tolist(), "y": (2 * x + rng.normal(size=n)).tolist()},
+        "target_variable": "y",
+        "methods": ["pearson"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_inprocess_matches_rest_endpoints():
+    transport = InProcessTransport(max_workers=1, use_processes=False)
+    try:
+        with TestClient(app) as client:
+            for path, payload in scenario_requests(2):
+                rest = client.post(path, json=payload)
+                local = await transport.post(path, payload)
+                assert rest.status_code == local.status_code == 200
+                # Compare as they would arrive over the wire (tuples -> lists)
+                local_body = json.loads(local.text)
+                assert set(rest.json()) == set(local_body)
+                for field in STABLE_FIELDS[path]:
+                    assert rest.json()[field] == local_body[field], (path, field)
+    finally:
+        await transport.aclose()
+
+
+@pytest.mark.asyncio
+async def test_inprocess_status_codes():
+    transport = InProcessTransport(max_workers=1, use_processes=False)
+    try:
+        invalid = await transport.post("/compute/forecast", {"historical_values": [1.0]})
+        assert invalid.status_code == 422
+        assert "historical_values" in invalid.text
+
+        missing = await transport.post("/compute/unknown", {})
+        assert missing.status_code == 404
+
+        # Series of different lengths fail inside the service
+        failed = await transport.post("/compute/correlation", {
+            "data": {"x": [1.0, 2.0, 3.0], "y": [1.0]},
+        })
+        assert failed.status_code == 500
+    finally:
+        await transport.aclose()
+
+
+def test_shared_memory_round_trip():
+    op = OPERATIONS["correlation"]
+    request = CorrelationRequest.model_validate(_correlation_payload())
+
+    stripped, arrays, block = _pack_arrays(op, request, min_values=100)
+    try:
+        assert stripped.data is None
+        assert [segment[1:] for segment in arrays.segments] == [("x", 600), ("y", 600)]
+        restored = _unpack_arrays(stripped, arrays)
+    finally:
+        _release(block)
+
+    np.testing.assert_array_equal(restored.data["x"], request.data["x"])
+    np.testing.assert_array_equal(restored.data["y"], request.data["y"])
+
+
+def test_small_arrays_are_not_packed():
+    op = OPERATIONS["forecasting"]
+    request = OPERATIONS["forecasting"].request_model.model_validate({"historical_values": [1.0, 2.0]})
+    assert _pack_arrays(op, request, min_values=100) == (request, None, None)
+
+
+@pytest.mark.asyncio
+async def test_process_pool_with_shared_memory():
+    payload = _correlation_payload()
+    transport = InProcessTransport(max_workers=1, shm_min_values=100)
+    try:
+        resp = await transport.post("/compute/correlation", payload)
+    finally:
+        await transport.aclose()
+
+    assert resp.status_code == 200
+    expected = execute("correlation", CorrelationRequest.model_validate(payload), create_services())
+    assert resp.json()["correlation_matrix"]["x"] == pytest.approx(expected["correlation_matrix"]["x"])
+    assert resp.json()["n_observations"] == 600
+
+
+def test_transport_selection(monkeypatch):
+    reset_engine_b_transports()
+    try:
+        monkeypatch.delenv("ENGINE_B_TRANSPORT", raising=False)
+        assert isinstance(get_engine_b_transport(), HTTPTransport)
+        assert isinstance(get_engine_b_transport(default="inprocess"), InProcessTransport)
+
+        monkeypatch.setenv("ENGINE_B_TRANSPORT", "inprocess")
+        shared = get_engine_b_transport()
+        assert isinstance(shared, InProcessTransport)
+        assert get_engine_b_transport() is shared
+
+        monkeypatch.setenv("ENGINE_B_TRANSPORT", "bogus")
+        assert isinstance(get_engine_b_transport(), HTTPTransport)
+    finally:
+        reset_engine_b_transports()
@@ -380,5 +380,96 @@ def test_run_council_rate_limit_env(monkeypatch):
     assert captured["ttl_s"] >= 60
 
 
+def test_shared_client_runs_each_query_once(monkeypatch):
+    """Prefetched and overlapping agent queries execute once per council run."""
+    import threading
+
+    calls: list[str] = []
+    lock = threading.Lock()
+
+    def counting_run(self, query_id: str):
+        with lock:
+            calls.append(query_id)
+        return _mock_query_result(query_id)
+
+    monkeypatch.setattr("src.qnwis.agents.base.DataClient.run", counting_run)
+
+    result = run_council(CouncilConfig(max_workers=4))
+
+    assert sorted(calls) == sorted(set(calls))
+    assert set(calls) == {
+        "syn_employment_share_by_gender_latest",
+        "syn_unemployment_gcc_latest",
+    }
+    assert result["council"]["agents"] == [
+        "LabourEconomist",
+        "PatternDetective",
+        "NationalStrategy",
+    ]
+
+
+def test_shared_client_returns_copies_and_replays_errors(monkeypatch):
+    """Each caller gets its own result copy; a failed prefetch re-raises on access."""
+    from src.qnwis.orchestration.council import SharedQueryClient
+
+    def flaky_run(self, query_id: str):
+        if query_id == "broken":
+            raise KeyError(query_id)
+        return _mock_query_result(query_id)
+
+    monkeypatch.setattr("src.qnwis.agents.base.DataClient.run", flaky_run)
+
+    client = SharedQueryClient()
+    assert client.prefetch(["ok", "broken", "ok"], max_workers=4) == ["ok", "broken"]
+
+    first = client.run("ok")
+    first.rows.clear()
+    assert len(client.run("ok").rows) == 1
+    with pytest.raises(KeyError):
+        client.run("broken")
+
+
+def test_concurrent_agents_match_sequential(monkeypatch):
+    """Concurrent agent execution yields the same payload as max_workers=1."""
+
+    def mock_run(self, query_id: str):
+        return _mock_query_result(query_id)
+
+    monkeypatch.setattr("src.qnwis.agents.base.DataClient.run", mock_run)
+
+    sequential = run_council(CouncilConfig(max_workers=1))
+    concurrent = run_council(CouncilConfig(max_workers=8))
+    assert concurrent == sequential
+
+
+def test_council_graph_compiled_once_per_factory(monkeypatch):
+    """run_council reuses the compiled graph for the same agent factory."""
+    from src.qnwis.orchestration import council as council_mod
+    from src.qnwis.orchestration.graph_cache import clear_graph_cache
+
+    builds: list[object] = []
+
+    class FakeGraph:
+        def invoke(self, state):
+            return {"result": {"council": {}, "verification": {}, "rate_limit_applied": False}}
+
+    def fake_build(make_agents):
+        builds.append(make_agents)
+        return FakeGraph()
+
+    clear_graph_cache()
+    monkeypatch.setattr(council_mod, "build_council_graph", fake_build)
+
+    def other_agents(client: DataClient):
+        return []
+
+    for _ in range(3):
+        run_council(CouncilConfig())
+    run_council(CouncilConfig(), make_agents=other_agents)
+
+    assert builds == [default_agents, other_agents]
+    clear_graph_cache()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Unit tests for the SQLite-backed query history.
+
+Tests recent/search/stats, Arabic normalisation, rollups and the legacy
+JSONL import.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src.qnwis.ui.history.query_history import QueryHistory
+from src.qnwis.ui.history.sqlite_store import SQLiteHistoryStore, normalize_text
+
+
+def _legacy_line(i: int, provider: str = "anthropic") -> str:
+    return json.dumps(
+        {
+            "timestamp": f"2024-01-{1 + i % 28:02d}T10:00:00Z",
+            "question": f"What is the unemployment rate in sector {i}?",
+            "request_id": f"req-{i}",
+            "provider": provider,
+            "response_time_ms": 100.0 * (i + 1),
+            "result_summary": None,
+        }
+    )
+
+
+def test_recent_returns_latest_first_with_filters(tmp_path: Path) -> None:
+    history = QueryHistory(str(tmp_path))
+    for i in range(5):
+        history.add_query(
+            f"Question {i}", f"req-{i}", user_id="alice" if i % 2 else "bob", status="success"
+        )
+    history.add_query("Failed question", "req-x", user_id="alice", status="error")
+
+    assert [q["request_id"] for q in history.get_recent(limit=3)] == ["req-x", "req-4", "req-3"]
+    assert [q["request_id"] for q in history.get_recent(user_id="bob")] == [
+        "req-4",
+        "req-2",
+        "req-0",
+    ]
+    assert [q["request_id"] for q in history.get_recent(status="error")] == ["req-x"]
+
+
+def test_search_matches_words_and_prefixes(tmp_path: Path) -> None:
+    history = QueryHistory(str(tmp_path))
+    history.add_query("Unemployment rate for Qatari women", "r1")
+    history.add_query("Employment growth in construction", "r2")
+    history.add_query("Salary trends in energy", "r3")
+
+    assert [q["request_id"] for q in history.search("employ")] == ["r2"]
+    assert [q["request_id"] for q in history.search("qatari UNEMPLOYMENT")] == ["r1"]
+    assert history.search("healthcare") == []
+    assert [q["request_id"] for q in history.search("", limit=1)] == ["r3"]
+
+
+def test_search_ignores_arabic_diacritics_and_variants(tmp_path: Path) -> None:
+    history = QueryHistory(str(tmp_path))
+    history.add_query("ما هو مُعَدَّل البطالة في قطر؟", "ar1")
+    history.add_query("توظيف المرأة القطرية", "ar2")
+
+    assert [q["request_id"] for q in history.search("معدل البطاله")] == ["ar1"]
+    assert [q["request_id"] for q in history.search("القطريه")] == ["ar2"]
+    assert normalize_text("إحصاءات") == normalize_text("احصاءات")
+
+
+def test_stats_are_rolled_up_incrementally(tmp_path: Path) -> None:
+    history = QueryHistory(str(tmp_path))
+    assert history.get_stats()["total_queries"] == 0
+
+    history.add_query("q1", "r1", provider="anthropic", response_time_ms=100.0)
+    history.add_query("q2", "r2", provider="openai", response_time_ms=300.0, status="error")
+    history.add_query("q3", "r3", provider="anthropic")
+
+    stats = history.get_stats()
+    assert stats["total_queries"] == 3
+    assert stats["avg_response_time_ms"] == 200.0
+    assert stats["providers"] == {"anthropic": 2, "openai": 1}
+    assert stats["statuses"] == {"unknown": 2, "error": 1}
+    assert stats["oldest_query"] <= stats["newest_query"]
+
+
+def test_legacy_jsonl_imported_once(tmp_path: Path) -> None:
+    legacy = tmp_path / "query_history.jsonl"
+    legacy.write_text("\n".join(_legacy_line(i) for i in range(50)) + "\nnot json\n")
+
+    history = QueryHistory(str(tmp_path))
+    assert history.get_stats()["total_queries"] == 50
+    assert history.get_recent(limit=1)[0]["request_id"] == "req-49"
+    assert history.get_recent(limit=1)[0].keys() == json.loads(_legacy_line(0)).keys()
+    assert [q["request_id"] for q in history.search("sector 7")][:1] == ["req-7"]
+
+    with legacy.open("a") as handle:
+        handle.write(_legacy_line(50, provider="openai") + "\n" + _legacy_line(51))  # partial
+    reopened = QueryHistory(str(tmp_path))
+    assert reopened.get_stats()["providers"] == {"anthropic": 50, "openai": 1}
+    assert reopened.store.import_jsonl(legacy) == 0
+
+
+def test_store_survives_reopen(tmp_path: Path) -> None:
+    store = SQLiteHistoryStore(tmp_path / "h.db")
+    store.add({"timestamp": "2024-01-01T00:00:00Z", "question": "persisted"})
+    store.close()
+
+    assert SQLiteHistoryStore(tmp_path / "h.db").search("persisted")[0]["question"] == "persisted"
+
+
+def test_history_benchmark_smoke(tmp_path: Path) -> None:
+    from src.qnwis.perf.history_bench import run_benchmark
+
+    results = run_benchmark(entries=2000, workdir=tmp_path)
+    assert results["sqlite"]["total_queries"] == results["legacy"]["total_queries"] == 2000
@@ -0,0 +1,187 @@
+"""
+Unit tests for incremental synthesis.
+
+Tests per-agent digests, the progressive draft, the cached prompt prefix,
+pipelined streaming in SynthesisEngine and the stub-LLM benchmark.
+"""
+
+import asyncio
+
+import pytest
+
+from src.qnwis.agents.base import AgentReport, Insight
+from src.qnwis.perf.synthesis_bench import StubLLM, run_benchmark, synthetic_report
+from src.qnwis.synthesis.engine import SynthesisEngine, _build_synthesis_prompt
+from src.qnwis.synthesis.incremental import (
+    MAX_FINDINGS,
+    MAX_WARNINGS,
+    SYNTHESIS_PROMPT_PREFIX,
+    SynthesisDraft,
+    digest_report,
+    iter_completed,
+)
+
+
+def _report(agent: str, narrative: str = "Attrition is rising. Wages lag.", n: int = 2) -> AgentReport:
+    return AgentReport(
+        agent=agent,
+        findings=[
+            Insight(
+                title=f"{agent} finding {i}",
+                summary=f"Summary {i}",
+                metrics={f"rate_{i}": 0.1 * (i + 1)},
+                warnings=["stale data"],
+            )
+            for i in range(n)
+        ],
+        narrative=narrative,
+        warnings=["partial coverage"],
+    )
+
+
+class FailingLLM:
+    async def generate_stream(self, **_):
+        raise RuntimeError("provider down")
+        yield  # pragma: no cover
+
+
+def test_digest_condenses_report():
+    report = _report("Economist", narrative="One. " * 200, n=8)
+
+    digest = digest_report(report)
+
+    assert digest.agent == "Economist"
+    assert len(digest.findings) == MAX_FINDINGS
+    assert digest.warnings == ("partial coverage", "stale data")
+    assert dict(digest.metrics)["rate_0"] == pytest.approx(0.1)
+    assert len(digest.headline) <= 320
+    assert digest.text.startswith("### Economist")
+    assert len(digest.warnings) <= MAX_WARNINGS
+
+
+def test_digest_accepts_dict_findings_and_skips_empty_reports():
+    report = AgentReport(agent="Skills", findings=[])
+    report.findings = [{"title": "Gap", "summary": "ICT shortage", "metrics": {"gap": 12}}]
+
+    assert "ICT shortage" in digest_report(report).text
+    assert digest_report(AgentReport(agent="Empty")) is None
+
+
+def test_draft_replaces_digest_for_same_agent():
+    draft = SynthesisDraft()
+    draft.add(_report("Economist"), agent="economist")
+    draft.add(_report("Skills"))
+    draft.add(_report("Economist", narrative="Cited [Per extraction: x]."), agent="economist")
+
+    assert [d.agent for d in draft.digests] == ["economist", "Skills"]
+    assert "Per extraction" in draft.render_digests()
+    rendered = draft.render()
+    assert "## Key Metrics" in rendered
+    assert "## Data Quality Concerns" in rendered
+
+
+def test_prompt_starts_with_cached_prefix_and_is_smaller():
+    reports = [synthetic_report(i) for i in range(3)]
+    draft = SynthesisDraft.from_reports(reports)
+
+    first = draft.build_prompt("Question one?")
+    second = draft.build_prompt("Question two?")
+
+    assert first.startswith(SYNTHESIS_PROMPT_PREFIX)
+    assert second.startswith(SYNTHESIS_PROMPT_PREFIX)
+    assert len(first) < len(_build_synthesis_prompt("Question one?", reports)) / 2
+
+
+@pytest.mark.asyncio
+async def test_iter_completed_yields_in_completion_order():
+    async def finish(agent, delay):
+        await asyncio.sleep(delay)
+        return None if agent == "none" else _report(agent)
+
+    order = [
+        r.agent
+        async for r in iter_completed([finish("slow", 0.03), finish("none", 0.0), finish("fast", 0.01)])
+    ]
+
+    assert order == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_incremental_streams_preview_before_llm():
+    llm = StubLLM(base_s=0, prefill_s_per_token=0, decode_s_per_token=0, output_tokens=3)
+    engine = SynthesisEngine(llm)
+
+    async def reports():
+        yield _report("Economist")
+        assert not llm.calls  # preview is out before the final pass starts
+        yield _report("Skills")
+
+    chunks = [c async for c in engine.synthesize_incremental("Why?", reports())]
+
+    assert chunks[0].startswith("## Draft Findings\n\n### Economist")
+    assert chunks[1].startswith("### Skills")
+    assert chunks[2:] == ["---\n\n", "tok0 ", "tok1 ", "tok2 "]
+    assert len(llm.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_incremental_falls_back_to_draft_on_llm_error():
+    engine = SynthesisEngine(FailingLLM())
+
+    async def reports():
+        yield _report("Economist")
+
+    text = "".join(
+        [c async for c in engine.synthesize_incremental("Why?", reports(), preview=False)]
+    )
+
+    assert text.startswith("## Draft Findings")
+    assert "Economist finding 0" in text
+
+
+@pytest.mark.asyncio
+async def test_graph_agents_node_refreshes_cited_digest_under_runner_key(monkeypatch):
+    from types import SimpleNamespace
+
+    from src.qnwis.orchestration import graph_llm
+
+    class CitingInjector:
+        def inject_citations(self, text, _data):
+            return text + " [Per extraction: LMIS]"
+
+    class PinnedNameReport(AgentReport):
+        """Report whose agent name differs from the selector key and stays put."""
+
+        def __setattr__(self, name, value):
+            if name == "agent" and "agent" in self.__dict__:
+                return
+            super().__setattr__(name, value)
+
+    class SkillsLike:
+        async def run(self, question, context, debate_context=""):
+            return PinnedNameReport(
+                agent="Skills",
+                findings=[Insight(title="Gap", summary="ICT shortage")],
+                narrative="Shortage of 12 engineers.",
+            )
+
+    monkeypatch.setattr(graph_llm, "CitationInjector", CitingInjector)
+    workflow = SimpleNamespace(agents={"skills": SkillsLike()}, deterministic_agents={}, agent_key_map={})
+    workflow._normalize_agent_name = lambda name: graph_llm.LLMWorkflow._normalize_agent_name(workflow, name)
+
+    state = await graph_llm.LLMWorkflow._agents_node(
+        workflow, {"question": "Why?", "selected_agents": ["skills"]}
+    )
+
+    draft = state["synthesis_draft"]
+    assert [d.agent for d in draft.digests] == ["skills"]
+    assert "Per extraction" in draft.digests[0].headline
+
+
+def test_benchmark_reports_ttft_and_tokens():
+    result = run_benchmark()
+
+    current, preview = result["current_warm"], result["incremental_preview_warm"]
+    assert preview["ttft_ms"] < current["ttft_ms"]
+    assert result["incremental_warm"]["prompt_tokens"] < current["prompt_tokens"]
+    assert result["incremental_warm"]["uncached_prompt_tokens"] < result["incremental_cold"]["uncached_prompt_tokens"]
@@ -0,0 +1,125 @@
+"""
+Unit tests for the chart render service.
+
+Tests content-addressed caching, ETag memo, in-flight coalescing and the
+process pool renderer.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from src.qnwis.ui import render
+from src.qnwis.ui.render import ChartRenderService, ChartSpec, render_chart
+from src.qnwis.ui.svg import bar_chart_svg
+
+LINE = ChartSpec("line", "png", "Salary YoY - Energy", (2021, 2022, 2023), (1.5, None, 2.5))
+BAR = ChartSpec(
+    "bar", "svg", "Sector Employment - 2024", ("Energy", "Retail"), (10, 20), size=(720, 360)
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_digest_covers_data_and_parameters() -> None:
+    assert LINE.digest() == ChartSpec(**{**LINE.__dict__}).digest()
+    assert LINE.digest() != ChartSpec(**{**LINE.__dict__, "y": (1.5, None, 2.6)}).digest()
+    assert LINE.digest() != ChartSpec(**{**LINE.__dict__, "dpi": 100}).digest()
+
+
+def test_renderers_match_formats() -> None:
+    assert render_chart(LINE).startswith(b"\x89PNG")
+    assert render_chart(BAR) == bar_chart_svg(BAR.title, ["Energy", "Retail"], [10, 20]).encode()
+
+
+def test_second_render_is_a_memory_hit(tmp_path: Path) -> None:
+    service = ChartRenderService(cache_dir=tmp_path, workers=0)
+    first = service.render(BAR)
+    second = service.render(BAR)
+
+    assert first == second
+    assert first.etag == BAR.digest()
+    stats = service.stats.snapshot()
+    assert (stats["renders"], stats["memory_hits"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_disk_tier_survives_a_restart(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    ChartRenderService(cache_dir=tmp_path, workers=0).render(LINE)
+    monkeypatch.setattr(render, "render_chart", lambda spec: pytest.fail("re-rendered"))
+
+    restarted = ChartRenderService(cache_dir=tmp_path, workers=0)
+    assert restarted.render(LINE).body.startswith(b"\x89PNG")
+    assert restarted.stats.snapshot()["disk_hits"] == 1
+
+
+def test_memory_tier_is_bounded() -> None:
+    service = ChartRenderService(workers=0, max_memory_bytes=1)
+    service.render(BAR)
+    service.render(ChartSpec(**{**BAR.__dict__, "title": "Other"}))
+    assert len(service.cache._entries) == 1
+
+
+def test_known_etag_expires_with_data_ttl() -> None:
+    clock = FakeClock()
+    service = ChartRenderService(workers=0, clock=clock)
+    service.render(BAR, key=("svg", "sector-employment"), ttl_s=60)
+
+    assert service.known_etag(("svg", "sector-employment")) == BAR.digest()
+    clock.now += 61
+    assert service.known_etag(("svg", "sector-employment")) is None
+
+
+def test_concurrent_requests_share_one_render(monkeypatch: pytest.MonkeyPatch) -> None:
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_render(spec: ChartSpec) -> bytes:
+        calls.append(spec)
+        started.set()
+        release.wait(5)
+        return b"chart"
+
+    monkeypatch.setattr(render, "render_chart", slow_render)
+    service = ChartRenderService(workers=0)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(service.render(BAR))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    started.wait(5)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert {r.body for r in results} == {b"chart"}
+    assert service.stats.snapshot()["renders"] == 1
+
+
+def test_process_pool_renders_png() -> None:
+    service = ChartRenderService(workers=1)
+    try:
+        service.warm()
+        chart = service.render(LINE)
+    finally:
+        service.shutdown()
+    assert chart.body == render_chart(LINE)
+    assert chart.media_type == "image/png"
+
+
+def test_render_benchmark_smoke() -> None:
+    from src.qnwis.perf.render_bench import run_benchmark
+
+    results = run_benchmark(requests=12, charts=3, workers=0)
+    assert results["cold"]["renders"] == 3
+    assert results["warm"]["hit_ratio"] == 1.0
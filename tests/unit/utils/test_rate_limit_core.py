@@ -0,0 +1,139 @@
+"""Unit tests for the shared GCRA rate-limit core."""
+
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from src.qnwis.utils.rate_limit_core import Limit, RateLimitCore, async_redis_client
+
+SLOW = Limit("burst", rate=0.001, burst=3)  # refill is negligible during a test
+DAILY = Limit.per("daily", 5, 86400)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def fake_redis():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting in fakeredis
+    return fakeredis.FakeAsyncRedis(server=fakeredis.FakeServer(), decode_responses=True)
+
+
+class TestMemoryBackend:
+    def test_burst_then_refill(self) -> None:
+        clock = FakeClock()
+        core = RateLimitCore(clock=clock)
+        limits = (Limit("rps", rate=2, burst=2),)
+
+        assert [core.acquire_local("k", limits).remaining for _ in range(2)] == [(1,), (0,)]
+        denied = core.acquire_local("k", limits)
+        assert not denied.allowed and denied.denied_by == "rps"
+        assert denied.retry_after == pytest.approx(0.5)
+
+        clock.now += 0.5
+        assert core.acquire_local("k", limits).allowed
+        assert not core.acquire_local("k", limits).allowed
+
+    def test_limits_are_all_or_nothing(self) -> None:
+        core = RateLimitCore(clock=FakeClock())
+        limits = (Limit("rps", rate=100, burst=100), Limit.per("daily", 2, 86400))
+
+        assert core.acquire_local("k", limits).remaining == (99, 1)
+        assert core.acquire_local("k", limits).remaining == (98, 0)
+        denied = core.acquire_local("k", limits)
+        assert denied.denied_by == "daily"
+        assert denied.remaining == (98, 0)  # the rps bucket was not charged
+
+    def test_keys_are_independent(self) -> None:
+        core = RateLimitCore(clock=FakeClock())
+        limits = (Limit("rps", rate=1, burst=1),)
+        assert core.acquire_local("a", limits).allowed
+        assert core.acquire_local("b", limits).allowed
+        assert not core.acquire_local("a", limits).allowed
+
+    async def test_wait_spaces_calls_at_the_rate(self) -> None:
+        core = RateLimitCore()
+        limits = (Limit("rps", rate=40, burst=1),)
+        start = time.monotonic()
+        waits = [await core.wait("k", limits) for _ in range(4)]
+        assert waits[0] == 0.0
+        assert time.monotonic() - start == pytest.approx(0.075, abs=0.05)
+
+    async def test_wait_rejects_cost_above_burst(self) -> None:
+        with pytest.raises(ValueError, match="exceeds the burst"):
+            await RateLimitCore().wait("k", (Limit("rps", rate=1, burst=2),), cost=3)
+
+
+class TestRedisBackend:
+    async def test_matches_memory_decisions(self, fake_redis) -> None:
+        redis_core = RateLimitCore(redis=fake_redis)
+        memory_core = RateLimitCore()
+        limits = (SLOW, DAILY)
+
+        for _ in range(5):
+            remote = await redis_core.acquire("p", limits)
+            local = memory_core.acquire_local("p", limits)
+            assert remote.backend == "redis"
+            assert (remote.allowed, remote.remaining, remote.denied_by) == (
+                local.allowed,
+                local.remaining,
+                local.denied_by,
+            )
+
+    async def test_state_is_shared_between_instances(self, fake_redis) -> None:
+        first, second = RateLimitCore(redis=fake_redis), RateLimitCore(redis=fake_redis)
+        results = [await core.acquire("p", (SLOW,)) for core in (first, second, first, second)]
+        assert [r.allowed for r in results] == [True, True, True, False]
+
+    async def test_leases_never_over_admit(self, fake_redis) -> None:
+        limits = (Limit("burst", rate=0.001, burst=10),)
+        cores = [RateLimitCore(redis=fake_redis, lease_size=4) for _ in range(2)]
+
+        decisions = [await cores[i % 2].acquire("p", limits) for i in range(30)]
+        assert sum(d.allowed for d in decisions) == 10
+        assert [d.backend for d in decisions[:4]] == ["redis", "redis", "lease", "lease"]
+
+    async def test_lease_expires(self, fake_redis) -> None:
+        clock = FakeClock()
+        core = RateLimitCore(redis=fake_redis, lease_size=4, lease_ttl_s=0.5, clock=clock)
+        limits = (Limit("burst", rate=0.001, burst=8),)
+
+        assert (await core.acquire("p", limits)).backend == "redis"
+        assert (await core.acquire("p", limits)).backend == "lease"
+        clock.now += 1.0
+        assert (await core.acquire("p", limits)).backend == "redis"  # 2 leased tokens lost
+        assert sum([(await core.acquire("p", limits)).allowed for _ in range(8)]) == 3
+
+    async def test_reset_clears_remote_state(self, fake_redis) -> None:
+        core = RateLimitCore(redis=fake_redis)
+        for _ in range(3):
+            await core.acquire("p", (SLOW,))
+        await core.reset("p", (SLOW,))
+        assert (await core.acquire("p", (SLOW,))).remaining == (2,)
+
+    async def test_unreachable_redis_falls_back_to_memory(self) -> None:
+        pytest.importorskip("redis")
+        core = RateLimitCore(redis=async_redis_client("redis://127.0.0.1:1/0"))
+        assert core.distributed
+
+        decisions = [await core.acquire("p", (SLOW,)) for _ in range(4)]
+        assert [d.backend for d in decisions] == ["memory"] * 4
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+
+
+def test_benchmark_lease_cuts_round_trips(fake_redis) -> None:
+    from src.qnwis.perf.ratelimit_bench import run_benchmark
+
+    results = run_benchmark(rps=500, seconds=0.2, n_principals=5)
+    assert {stats["allowed"] for stats in results.values()} == {100}
+    assert results["legacy"]["round_trips_per_request"] == 4
+    assert results["core"]["round_trips_per_request"] < 1.1
+    assert results["core_lease8"]["round_trips_per_request"] < 0.3
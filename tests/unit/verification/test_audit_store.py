@@ -4,7 +4,10 @@ Unit tests for audit trail storage backends.
 Tests SQLite indexing and filesystem storage for audit manifests.
 """
 
+import json
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
 import pytest
@@ -12,6 +15,8 @@ import pytest
 from src.qnwis.verification.audit_store import (
     FileSystemAuditTrailStore,
     SQLiteAuditTrailStore,
+    close_audit_stores,
+    get_audit_store,
 )
 from src.qnwis.verification.audit_trail import AuditManifest
 
@@ -242,6 +247,174 @@ class TestSQLiteAuditTrailStore:
         assert recent[2].audit_id == "audit-002"
 
 
+def _variant(manifest: AuditManifest, index: int, **overrides) -> AuditManifest:
+    data = manifest.to_dict()
+    data["audit_id"] = f"audit-{index:03d}"
+    data["created_at"] = f"2024-01-{10 + index:02d}T10:00:00Z"
+    data.update(overrides)
+    return AuditManifest.from_dict(data)
+
+
+class TestSQLiteAuditSearch:
+    """Tests for indexed search, group commits and retention."""
+
+    def test_search_on_indexed_columns(
+        self,
+        temp_db_path: Path,
+        sample_manifest: AuditManifest,
+    ) -> None:
+        """Query ID, agent, time and confidence filters run in SQL."""
+        store = SQLiteAuditTrailStore(str(temp_db_path))
+        store.upsert_many(
+            _variant(
+                sample_manifest,
+                i,
+                query_ids=[f"q_{i % 2}"],
+                orchestration={"agents": [f"agent_{i % 3}"], "confidence": {"score": 10 * i}},
+            )
+            for i in range(6)
+        )
+
+        assert [m.audit_id for m in store.search(query_id="q_1")] == [
+            "audit-005", "audit-003", "audit-001"
+        ]
+        assert [m.audit_id for m in store.search(agent="agent_0")] == ["audit-003", "audit-000"]
+        assert [m.audit_id for m in store.search(min_confidence=20, max_confidence=30)] == [
+            "audit-003", "audit-002"
+        ]
+        assert [
+            m.audit_id
+            for m in store.search(since="2024-01-12", until="2024-01-14", query_id="q_0")
+        ] == ["audit-002"]
+        assert len(store.search(limit=2)) == 2
+
+        # Re-indexing replaces the lookup rows
+        store.upsert(_variant(sample_manifest, 1, query_ids=["q_9"]))
+        assert [m.audit_id for m in store.search(query_id="q_1")] == ["audit-005", "audit-003"]
+        store.close()
+
+    def test_write_behind_group_commit(
+        self,
+        temp_db_path: Path,
+        sample_manifest: AuditManifest,
+    ) -> None:
+        """Queued writes are batched and visible through any store instance."""
+        store = SQLiteAuditTrailStore(str(temp_db_path), write_behind=True, flush_interval=5.0)
+        try:
+            threads = [
+                threading.Thread(
+                    target=lambda k=k: [
+                        store.upsert(_variant(sample_manifest, k * 10 + i)) for i in range(10)
+                    ]
+                )
+                for k in range(4)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            # A second, synchronous store flushes the shared queue before reading
+            reader = SQLiteAuditTrailStore(str(temp_db_path))
+            assert reader.get("audit-013") is not None
+            assert len(reader.list_recent(limit=100)) == 40
+            reader.close()
+        finally:
+            close_audit_stores()
+
+    def test_writer_survives_non_sqlite_errors(
+        self,
+        temp_db_path: Path,
+        sample_manifest: AuditManifest,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """A failed group commit of any kind still releases flushes and reads."""
+        from src.qnwis.verification import audit_store
+
+        def broken_write(conn, records):
+            raise TypeError("unserializable manifest")
+
+        store = SQLiteAuditTrailStore(str(temp_db_path), write_behind=True)
+        try:
+            monkeypatch.setattr(audit_store, "_write_records", broken_write)
+            store.upsert(_variant(sample_manifest, 1))
+            assert store.flush(timeout=5)
+            assert store.list_recent() == []
+
+            monkeypatch.undo()
+            store.upsert(_variant(sample_manifest, 2))
+            assert [m.audit_id for m in store.list_recent()] == ["audit-002"]
+        finally:
+            close_audit_stores()
+
+    def test_shared_store_is_write_behind(self, temp_db_path: Path) -> None:
+        """AuditTrail indexing reuses one store per database."""
+        try:
+            assert get_audit_store(str(temp_db_path)) is get_audit_store(str(temp_db_path))
+        finally:
+            close_audit_stores()
+
+    def test_compact_removes_expired(
+        self,
+        temp_db_path: Path,
+        sample_manifest: AuditManifest,
+    ) -> None:
+        """Retention compaction deletes old rows and their lookup rows."""
+        store = SQLiteAuditTrailStore(str(temp_db_path))
+        store.upsert_many(_variant(sample_manifest, i) for i in range(5))
+
+        removed = store.compact("2024-01-12", batch_size=1)
+        assert sorted(removed) == ["audit-000", "audit-001"]
+        assert [m.audit_id for m in store.list_recent()] == ["audit-004", "audit-003", "audit-002"]
+        assert store.search(query_id="labor_supply", limit=10)[-1].audit_id == "audit-002"
+        store.close()
+
+    def test_migrates_v1_database(
+        self,
+        temp_db_path: Path,
+        sample_manifest: AuditManifest,
+    ) -> None:
+        """Version 1 indexes gain the lookup tables with backfilled rows."""
+        conn = sqlite3.connect(str(temp_db_path))
+        conn.execute(
+            """
+            CREATE TABLE audit_manifests (
+                audit_id TEXT PRIMARY KEY, created_at TEXT NOT NULL,
+                request_id TEXT NOT NULL, registry_version TEXT NOT NULL,
+                code_version TEXT NOT NULL, data_sources TEXT NOT NULL,
+                query_ids TEXT NOT NULL, freshness TEXT NOT NULL,
+                citations_ok INTEGER NOT NULL, verification_ok INTEGER NOT NULL,
+                digest_sha256 TEXT NOT NULL, hmac_sha256 TEXT,
+                pack_root TEXT NOT NULL, manifest_json TEXT NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "INSERT INTO audit_manifests VALUES (?, ?, ?, ?, ?, '[]', '[]', '{}', 1, 1, ?, NULL, '', ?)",
+            (
+                sample_manifest.audit_id,
+                sample_manifest.created_at,
+                sample_manifest.request_id,
+                sample_manifest.registry_version,
+                sample_manifest.code_version,
+                sample_manifest.digest_sha256,
+                json.dumps(sample_manifest.to_dict()),
+            ),
+        )
+        conn.execute("PRAGMA user_version=1")
+        conn.commit()
+        conn.close()
+
+        store = SQLiteAuditTrailStore(str(temp_db_path))
+        assert [m.audit_id for m in store.search(query_id="unemployment_rate")] == [
+            sample_manifest.audit_id
+        ]
+        assert [m.audit_id for m in store.search(agent="pattern_detective")] == [
+            sample_manifest.audit_id
+        ]
+        store.close()
+
+
 class TestFileSystemAuditTrailStore:
     """Tests for filesystem storage backend."""
 